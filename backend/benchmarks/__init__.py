@@ -0,0 +1 @@
+# Este arquivo vazio marca o diretório como um pacote Python
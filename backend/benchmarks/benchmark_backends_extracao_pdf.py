@@ -0,0 +1,262 @@
+"""
+Benchmark de Backends de Extração de PDF - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+A extração de texto é a primeira etapa da ingestão de petições e documentos.
+Processos judiciais frequentemente têm centenas de páginas, e o motor de
+extração escolhido (BACKEND_EXTRACAO_PDF) impacta diretamente o tempo de
+upload percebido pelo advogado. Este script compara os backends disponíveis
+sobre um corpus de petições de exemplo, para que a troca de motor seja uma
+decisão baseada em evidência (velocidade E fidelidade do texto).
+
+MÉTRICAS REPORTADAS (por backend):
+- páginas/segundo: vazão de extração (média das repetições)
+- caracteres totais: volume de texto extraído
+- páginas idênticas (%): fração de páginas cujo texto normalizado é
+  IGUAL ao texto do backend de referência
+- similaridade média: razão média do difflib.SequenceMatcher em relação
+  ao backend de referência (1.0 = idêntico)
+
+NORMALIZAÇÃO:
+Antes de comparar, espaços em branco são colapsados. Motores diferentes
+quebram linhas de formas diferentes, e isso não afeta o RAG (o chunking
+e os embeddings são insensíveis a quebras de linha).
+
+USO (a partir do diretório backend/):
+```bash
+python -m benchmarks.benchmark_backends_extracao_pdf --corpus ./dados/amostras_peticoes
+python -m benchmarks.benchmark_backends_extracao_pdf --corpus ./amostras \\
+    --backends pypdf2 pypdfium2 --referencia pypdf2 --repeticoes 3
+```
+
+IMPORTANTE:
+Os nomes dos backends são passados explicitamente para o serviço, então
+este script NÃO depende do .env (nem da OPENAI_API_KEY).
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from src.servicos.servico_extracao_texto import (
+    BACKENDS_EXTRACAO_PDF,
+    ErroDeExtracaoDeTexto,
+    obter_backend_extracao_pdf,
+)
+
+
+# ==========================================
+# FUNÇÕES AUXILIARES
+# ==========================================
+
+def normalizar_texto_pagina(texto: str) -> str:
+    """
+    Colapsa espaços em branco para comparar textos de motores diferentes.
+
+    Args:
+        texto: Texto bruto de uma página
+
+    Returns:
+        str: Texto com sequências de espaços/quebras reduzidas a um espaço
+    """
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+def listar_pdfs_do_corpus(diretorio_corpus: str) -> List[Path]:
+    """
+    Lista (recursivamente) os arquivos PDF do corpus, em ordem estável.
+
+    Args:
+        diretorio_corpus: Diretório com as petições de exemplo
+
+    Returns:
+        List[Path]: Caminhos dos PDFs encontrados
+    """
+    return sorted(Path(diretorio_corpus).rglob("*.pdf"))
+
+
+def extrair_corpus_com_backend(
+    nome_backend: str,
+    arquivos_pdf: List[Path],
+    repeticoes: int
+) -> Dict[str, object]:
+    """
+    Extrai todas as páginas do corpus com um backend, medindo o tempo.
+
+    IMPLEMENTAÇÃO:
+    O tempo reportado é o MENOR entre as repetições (menos sensível a ruído
+    do sistema operacional). Os textos da última repetição são mantidos
+    para a comparação de fidelidade.
+
+    Args:
+        nome_backend: Nome do backend (ex: "pypdfium2")
+        arquivos_pdf: PDFs do corpus
+        repeticoes: Quantas vezes repetir a extração completa
+
+    Returns:
+        dict: {"tempo_segundos", "numero_paginas", "textos_por_arquivo"}
+    """
+    backend = obter_backend_extracao_pdf(nome_backend)
+
+    melhor_tempo = float("inf")
+    textos_por_arquivo: Dict[str, List[str]] = {}
+    numero_paginas = 0
+
+    for _ in range(repeticoes):
+        textos_por_arquivo = {}
+        numero_paginas = 0
+        inicio = time.perf_counter()
+
+        for caminho_pdf in arquivos_pdf:
+            textos_paginas, total_paginas = backend.extrair_textos_das_paginas(str(caminho_pdf))
+            textos_por_arquivo[str(caminho_pdf)] = textos_paginas
+            numero_paginas += total_paginas
+
+        melhor_tempo = min(melhor_tempo, time.perf_counter() - inicio)
+
+    return {
+        "tempo_segundos": melhor_tempo,
+        "numero_paginas": numero_paginas,
+        "textos_por_arquivo": textos_por_arquivo,
+    }
+
+
+def comparar_com_referencia(
+    textos_backend: Dict[str, List[str]],
+    textos_referencia: Dict[str, List[str]]
+) -> Dict[str, float]:
+    """
+    Compara, página a página, o texto de um backend com o da referência.
+
+    Args:
+        textos_backend: {arquivo: [texto_pagina, ...]} do backend avaliado
+        textos_referencia: {arquivo: [texto_pagina, ...]} do backend de referência
+
+    Returns:
+        dict: {"fracao_paginas_identicas", "similaridade_media"}
+    """
+    paginas_comparadas = 0
+    paginas_identicas = 0
+    soma_similaridades = 0.0
+
+    for caminho, paginas_referencia in textos_referencia.items():
+        paginas_backend = textos_backend.get(caminho, [])
+
+        for indice, texto_referencia in enumerate(paginas_referencia):
+            texto_avaliado = paginas_backend[indice] if indice < len(paginas_backend) else ""
+            a = normalizar_texto_pagina(texto_referencia)
+            b = normalizar_texto_pagina(texto_avaliado)
+
+            paginas_comparadas += 1
+            if a == b:
+                paginas_identicas += 1
+                soma_similaridades += 1.0
+            else:
+                soma_similaridades += difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+    if paginas_comparadas == 0:
+        return {"fracao_paginas_identicas": 0.0, "similaridade_media": 0.0}
+
+    return {
+        "fracao_paginas_identicas": paginas_identicas / paginas_comparadas,
+        "similaridade_media": soma_similaridades / paginas_comparadas,
+    }
+
+
+# ==========================================
+# EXECUÇÃO DO BENCHMARK
+# ==========================================
+
+def executar_benchmark(argumentos: argparse.Namespace) -> int:
+    """
+    Executa o benchmark e imprime a tabela comparativa.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso)
+    """
+    arquivos_pdf = listar_pdfs_do_corpus(argumentos.corpus)
+    if not arquivos_pdf:
+        print(f"❌ Nenhum PDF encontrado em: {argumentos.corpus}")
+        return 1
+
+    backends = list(dict.fromkeys([argumentos.referencia] + argumentos.backends))
+    print(f"📂 Corpus: {len(arquivos_pdf)} PDF(s) em {argumentos.corpus}")
+    print(f"⚙️  Backends: {', '.join(backends)} (referência: {argumentos.referencia})\n")
+
+    resultados: Dict[str, Dict[str, object]] = {}
+    for nome_backend in backends:
+        try:
+            resultados[nome_backend] = extrair_corpus_com_backend(
+                nome_backend, arquivos_pdf, argumentos.repeticoes
+            )
+        except ErroDeExtracaoDeTexto as erro:
+            print(f"⚠️  Backend '{nome_backend}' ignorado: {erro}")
+
+    if argumentos.referencia not in resultados:
+        print(f"❌ Backend de referência '{argumentos.referencia}' indisponível")
+        return 1
+
+    textos_referencia = resultados[argumentos.referencia]["textos_por_arquivo"]
+
+    cabecalho = f"{'backend':<12}{'páginas':>9}{'tempo (s)':>11}{'págs/s':>10}{'caracteres':>12}{'idênticas':>11}{'similaridade':>14}"
+    print(cabecalho)
+    print("-" * len(cabecalho))
+
+    for nome_backend, resultado in resultados.items():
+        comparacao = comparar_com_referencia(resultado["textos_por_arquivo"], textos_referencia)
+        tempo = resultado["tempo_segundos"]
+        paginas = resultado["numero_paginas"]
+        paginas_por_segundo = paginas / tempo if tempo > 0 else float("inf")
+        caracteres = sum(
+            len(texto)
+            for textos in resultado["textos_por_arquivo"].values()
+            for texto in textos
+        )
+
+        print(
+            f"{nome_backend:<12}{paginas:>9}{tempo:>11.3f}{paginas_por_segundo:>10.1f}"
+            f"{caracteres:>12}{comparacao['fracao_paginas_identicas']:>10.1%}"
+            f"{comparacao['similaridade_media']:>14.4f}"
+        )
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara backends de extração de texto de PDF (velocidade e fidelidade)"
+    )
+    parser.add_argument(
+        "--corpus",
+        required=True,
+        help="Diretório com PDFs de exemplo (busca recursiva por *.pdf)"
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(BACKENDS_EXTRACAO_PDF.keys()),
+        choices=list(BACKENDS_EXTRACAO_PDF.keys()),
+        help="Backends a comparar (padrão: todos)"
+    )
+    parser.add_argument(
+        "--referencia",
+        default="pypdf2",
+        choices=list(BACKENDS_EXTRACAO_PDF.keys()),
+        help="Backend cujo texto é usado como referência de fidelidade (padrão: pypdf2)"
+    )
+    parser.add_argument(
+        "--repeticoes",
+        type=int,
+        default=1,
+        help="Número de repetições da extração completa (usa o menor tempo)"
+    )
+
+    sys.exit(executar_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Benchmark de Busca Híbrida (BM25 + Vetorial) - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Consultas jurídicas citam identificadores exatos ("art. 482 da CLT",
+"Súmula 331 do TST", "CID M54.5"). A busca vetorial pura encontra o
+ASSUNTO certo, mas dentro do assunto não distingue o artigo ou a súmula
+citados. Este script mede se o modo híbrido (MODO_BUSCA_RAG=hibrida)
+coloca o chunk certo no top-k e quanto isso custa em latência, para
+decidir o modo padrão com base em evidência.
+
+MÉTRICAS REPORTADAS (por modo de busca):
+- recall@k: fração das consultas cujo chunk-alvo está entre os k primeiros
+- MRR: média de 1 / posição do chunk-alvo (0 se fora do top-k)
+- latência p50 / p95 (ms) de buscar_chunks_similares, SEM a chamada de
+  embedding (os embeddings das consultas são gerados antes, em lote)
+
+CORPUS SINTÉTICO:
+Documentos com chunks sobre poucos assuntos (rescisão, terceirização,
+perícia médica...), cada chunk citando um identificador único. Cada
+consulta pede um identificador e o chunk que o contém é o alvo.
+
+EMBEDDINGS:
+- --embeddings sinteticos (padrão, offline): vetor do ASSUNTO + ruído.
+  Modela o ponto fraco observado do ada-002: o assunto é capturado, o
+  identificador não. Útil para validar o pipeline sem custo.
+- --embeddings openai: embeddings reais (OPENAI_MODEL_EMBEDDING). Use
+  para a decisão final; consome créditos da API.
+
+USO (a partir do diretório backend/):
+```bash
+python -m benchmarks.benchmark_busca_hibrida
+python -m benchmarks.benchmark_busca_hibrida --documentos 200 --consultas 300 -k 5
+python -m benchmarks.benchmark_busca_hibrida --embeddings openai --documentos 30
+```
+
+IMPORTANTE:
+Usa ChromaDB (ou, com --backend numpy, a coleção NumPy de busca exata),
+catálogo e índices (lexical e de documentos) EM MEMÓRIA (não toca ./dados).
+As configurações são carregadas do .env (OPENAI_API_KEY só é usada
+com --embeddings openai).
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+import chromadb
+
+from src.servicos import (
+    servico_armazenamento_vetorial,
+    servico_banco_vetorial,
+    servico_catalogo_documentos,
+    servico_indice_documentos,
+    servico_indice_lexical,
+    servico_vetorizacao,
+)
+
+
+# ==========================================
+# CORPUS SINTÉTICO
+# ==========================================
+
+ASSUNTOS_JURIDICOS = {
+    "rescisao": "Dispensa do empregado e pagamento das verbas rescisórias conforme o {identificador}.",
+    "terceirizacao": "Responsabilidade subsidiária do tomador de serviços nos termos da {identificador}.",
+    "pericia_medica": "O laudo pericial constatou doença ocupacional classificada como {identificador}.",
+    "horas_extras": "Jornada excedente sem pagamento do adicional, violando o {identificador}.",
+    "processo": "Cumprimento de sentença nos autos do processo {identificador}.",
+}
+
+DIMENSAO_EMBEDDING_SINTETICO = 64
+
+
+def gerar_identificador(assunto: str, indice: int) -> str:
+    """
+    Gera um identificador jurídico único e realista para o assunto.
+    """
+    if assunto in ("rescisao", "horas_extras"):
+        return f"art. {100 + indice} da CLT"
+    if assunto == "terceirizacao":
+        return f"Súmula {200 + indice} do TST"
+    if assunto == "pericia_medica":
+        return f"CID M{10 + indice // 10}.{indice % 10}"
+    return f"{1000000 + indice}-{indice % 90 + 10}.2024.5.02.{indice % 9000 + 1000:04d}"
+
+
+def gerar_corpus(numero_documentos: int, chunks_por_documento: int, semente: int) -> List[Dict]:
+    """
+    Gera os chunks do corpus: [{"documento_id", "texto", "assunto", "identificador"}].
+    """
+    gerador = random.Random(semente)
+    assuntos = list(ASSUNTOS_JURIDICOS)
+    chunks = []
+    contador = 0
+    for indice_documento in range(numero_documentos):
+        documento_id = f"bench-{indice_documento:05d}"
+        for _ in range(chunks_por_documento):
+            assunto = gerador.choice(assuntos)
+            identificador = gerar_identificador(assunto, contador)
+            chunks.append({
+                "documento_id": documento_id,
+                "texto": ASSUNTOS_JURIDICOS[assunto].format(identificador=identificador),
+                "assunto": assunto,
+                "identificador": identificador,
+            })
+            contador += 1
+    return chunks
+
+
+def gerar_embeddings_sinteticos(
+    textos_e_assuntos: List[Tuple[str, str]],
+    semente: int
+) -> Dict[str, List[float]]:
+    """
+    Embedding = vetor do assunto + ruído (o identificador não é codificado).
+    """
+    gerador = random.Random(semente)
+    vetores_assunto = {
+        assunto: [gerador.gauss(0, 1) for _ in range(DIMENSAO_EMBEDDING_SINTETICO)]
+        for assunto in ASSUNTOS_JURIDICOS
+    }
+    return {
+        texto: [valor + gerador.gauss(0, 0.3) for valor in vetores_assunto[assunto]]
+        for texto, assunto in textos_e_assuntos
+    }
+
+
+# ==========================================
+# FUNÇÕES AUXILIARES
+# ==========================================
+
+def calcular_percentil(valores: List[float], percentil: float) -> float:
+    """
+    Percentil por interpolação linear (valores não vazios).
+    """
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * percentil
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def preparar_collection(chunks: List[Dict], embeddings_por_texto: Dict[str, List[float]], backend: str):
+    """
+    Cria a collection em memória e armazena o corpus pelo caminho real
+    (armazenar_chunks: ChromaDB + catálogo + índices lexical e de documentos).
+    """
+    servico_catalogo_documentos._instancia_catalogo = servico_catalogo_documentos.CatalogoDocumentos(":memory:")
+    servico_indice_lexical._instancia_indice_lexical = servico_indice_lexical.IndiceLexical(":memory:")
+    servico_indice_documentos._instancia_indice_documentos = servico_indice_documentos.IndiceDocumentos(":memory:")
+
+    if backend == "numpy":
+        collection = servico_armazenamento_vetorial.criar_colecao_em_memoria(
+            f"benchmark_{uuid.uuid4().hex}", servico_banco_vetorial.METRICA_DISTANCIA_CHROMADB
+        )
+    else:
+        collection = chromadb.EphemeralClient().create_collection(
+            name=f"benchmark_{uuid.uuid4().hex}",
+            embedding_function=None,
+            metadata={"hnsw:space": servico_banco_vetorial.METRICA_DISTANCIA_CHROMADB}
+        )
+
+    chunks_por_documento: Dict[str, List[Dict]] = {}
+    for chunk in chunks:
+        chunks_por_documento.setdefault(chunk["documento_id"], []).append(chunk)
+
+    ids_por_identificador = {}
+    for documento_id, chunks_documento in chunks_por_documento.items():
+        ids_chunks = servico_banco_vetorial.armazenar_chunks(
+            collection=collection,
+            chunks=[chunk["texto"] for chunk in chunks_documento],
+            embeddings=[embeddings_por_texto[chunk["texto"]] for chunk in chunks_documento],
+            metadados={
+                "documento_id": documento_id,
+                "nome_arquivo": f"{documento_id}.pdf",
+                "data_upload": "2025-01-01T00:00:00",
+                "tipo_documento": "pdf",
+            }
+        )
+        for id_chunk, chunk in zip(ids_chunks, chunks_documento):
+            ids_por_identificador[chunk["identificador"]] = id_chunk
+
+    return collection, ids_por_identificador
+
+
+# ==========================================
+# EXECUÇÃO DO BENCHMARK
+# ==========================================
+
+def executar_benchmark(argumentos: argparse.Namespace) -> int:
+    """
+    Executa o benchmark e imprime a tabela comparativa.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso)
+    """
+    chunks = gerar_corpus(argumentos.documentos, argumentos.chunks_por_documento, argumentos.semente)
+    gerador = random.Random(argumentos.semente)
+    alvos = gerador.sample(chunks, min(argumentos.consultas, len(chunks)))
+    consultas = [f"O que diz o {alvo['identificador']} neste caso?" for alvo in alvos]
+
+    # Embeddings do corpus e das consultas, gerados ANTES das medições
+    if argumentos.embeddings == "openai":
+        textos = [chunk["texto"] for chunk in chunks] + consultas
+        vetores = servico_vetorizacao.gerar_embeddings(textos, usar_cache=True)
+        embeddings_por_texto = dict(zip(textos, vetores))
+    else:
+        embeddings_por_texto = gerar_embeddings_sinteticos(
+            [(chunk["texto"], chunk["assunto"]) for chunk in chunks]
+            + [(consulta, alvo["assunto"]) for consulta, alvo in zip(consultas, alvos)],
+            argumentos.semente
+        )
+
+    collection, ids_por_identificador = preparar_collection(chunks, embeddings_por_texto, argumentos.backend)
+
+    # A busca gera o embedding da consulta; aqui ele já foi calculado acima,
+    # então a latência medida é só a da recuperação (ChromaDB + BM25 + fusão)
+    servico_vetorizacao.gerar_embeddings = lambda textos, usar_cache=True: [
+        embeddings_por_texto[texto] for texto in textos
+    ]
+
+    print(
+        f"Corpus: {len(chunks)} chunks em {argumentos.documentos} documentos | "
+        f"{len(consultas)} consultas | k={argumentos.k} | embeddings={argumentos.embeddings} | "
+        f"backend={argumentos.backend}"
+    )
+    cabecalho = f"{'modo':<12}{'recall@k':>10}{'MRR':>8}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+    print(cabecalho)
+    print("-" * len(cabecalho))
+
+    for modo_busca in servico_banco_vetorial.MODOS_BUSCA_RAG:
+        acertos = 0
+        soma_reciprocos = 0.0
+        latencias_ms: List[float] = []
+
+        for consulta, alvo in zip(consultas, alvos):
+            inicio = time.perf_counter()
+            resultados = servico_banco_vetorial.buscar_chunks_similares(
+                collection, consulta, k=argumentos.k, modo_busca=modo_busca
+            )
+            latencias_ms.append((time.perf_counter() - inicio) * 1000)
+
+            ids_resultados = [resultado["id"] for resultado in resultados]
+            id_alvo = ids_por_identificador[alvo["identificador"]]
+            if id_alvo in ids_resultados:
+                acertos += 1
+                soma_reciprocos += 1.0 / (ids_resultados.index(id_alvo) + 1)
+
+        print(
+            f"{modo_busca:<12}{acertos / len(consultas):>10.1%}{soma_reciprocos / len(consultas):>8.3f}"
+            f"{statistics.median(latencias_ms):>11.2f}{calcular_percentil(latencias_ms, 0.95):>11.2f}"
+        )
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara recall e latência da busca vetorial e da busca híbrida (BM25 + RRF)"
+    )
+    parser.add_argument("--documentos", type=int, default=100, help="Número de documentos sintéticos")
+    parser.add_argument("--chunks-por-documento", type=int, default=10, help="Chunks por documento")
+    parser.add_argument("--consultas", type=int, default=200, help="Número de consultas medidas")
+    parser.add_argument("-k", type=int, default=5, help="Resultados por consulta (top-k)")
+    parser.add_argument(
+        "--embeddings",
+        choices=["sinteticos", "openai"],
+        default="sinteticos",
+        help="Origem dos embeddings (sinteticos = offline, openai = API real)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["chromadb", "numpy"],
+        default="chromadb",
+        help="Armazenamento vetorial (numpy = busca exata em memória, ver BACKEND_BANCO_VETORIAL)"
+    )
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+
+    sys.exit(executar_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark de Busca Hierárquica (Documentos → Chunks) - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Com a base crescendo para milhares de processos, a busca direta passa a
+comparar a consulta com TODOS os chunks. A busca hierárquica
+(numero_documentos_pre_selecao) primeiro escolhe os documentos mais
+próximos pelo centroide e só então busca chunks dentro deles. Este script
+mede, para tamanhos crescentes de base, quanto cada estratégia custa em
+latência e quanto a pré-seleção perde (ou ganha) em recall.
+
+MÉTRICAS REPORTADAS (por tamanho de base e estratégia):
+- recall@k: fração das consultas cujo chunk-alvo está entre os k primeiros
+- latência p50 / p95 (ms) de buscar_chunks_similares, SEM a chamada de
+  embedding (os embeddings das consultas são gerados antes)
+
+CORPUS SINTÉTICO:
+Cada documento tem um "tema" próprio (vetor aleatório) e seus chunks são
+o tema + ruído. A consulta é um chunk-alvo + ruído. Modela processos
+distintos cujos trechos se parecem entre si, que é o caso em que a
+pré-seleção por documento ajuda.
+
+USO (a partir do diretório backend/):
+```bash
+python -m benchmarks.benchmark_busca_hierarquica
+python -m benchmarks.benchmark_busca_hierarquica --tamanhos 100 1000 5000 --pre-selecao 20
+```
+
+IMPORTANTE:
+Usa ChromaDB (ou, com --backend numpy, a coleção NumPy de busca exata),
+catálogo e índices (lexical e de documentos) EM MEMÓRIA (não toca ./dados)
+e não chama a OpenAI.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import chromadb
+
+from src.servicos import (
+    servico_armazenamento_vetorial,
+    servico_banco_vetorial,
+    servico_catalogo_documentos,
+    servico_indice_documentos,
+    servico_indice_lexical,
+    servico_vetorizacao,
+)
+from src.servicos.servico_armazenamento_vetorial import ArmazenamentoVetorial
+from benchmarks.benchmark_busca_hibrida import calcular_percentil
+
+
+# ==========================================
+# CORPUS SINTÉTICO
+# ==========================================
+
+DIMENSAO_EMBEDDING_SINTETICO = 64
+
+
+def gerar_vetor_ruidoso(gerador: random.Random, base: List[float], desvio: float) -> List[float]:
+    """
+    Retorna base + ruído gaussiano.
+    """
+    return [valor + gerador.gauss(0, desvio) for valor in base]
+
+
+def preparar_collection(
+    numero_documentos: int,
+    chunks_por_documento: int,
+    gerador: random.Random,
+    backend: str
+) -> Tuple[ArmazenamentoVetorial, Dict[str, List[float]]]:
+    """
+    Cria a collection em memória e armazena o corpus pelo caminho real
+    (armazenar_chunks: ChromaDB + catálogo + índices lexical e de documentos).
+
+    Returns:
+        (collection, embedding de cada chunk por id)
+    """
+    servico_catalogo_documentos._instancia_catalogo = servico_catalogo_documentos.CatalogoDocumentos(":memory:")
+    servico_indice_lexical._instancia_indice_lexical = servico_indice_lexical.IndiceLexical(":memory:")
+    servico_indice_documentos._instancia_indice_documentos = servico_indice_documentos.IndiceDocumentos(":memory:")
+
+    if backend == "numpy":
+        collection = servico_armazenamento_vetorial.criar_colecao_em_memoria(
+            f"benchmark_{uuid.uuid4().hex}", servico_banco_vetorial.METRICA_DISTANCIA_CHROMADB
+        )
+    else:
+        collection = chromadb.EphemeralClient().create_collection(
+            name=f"benchmark_{uuid.uuid4().hex}",
+            embedding_function=None,
+            metadata={"hnsw:space": servico_banco_vetorial.METRICA_DISTANCIA_CHROMADB}
+        )
+
+    embeddings_por_chunk: Dict[str, List[float]] = {}
+    for indice_documento in range(numero_documentos):
+        documento_id = f"bench-{indice_documento:06d}"
+        tema = [gerador.gauss(0, 1) for _ in range(DIMENSAO_EMBEDDING_SINTETICO)]
+        embeddings = [gerar_vetor_ruidoso(gerador, tema, 0.6) for _ in range(chunks_por_documento)]
+        ids_chunks = servico_banco_vetorial.armazenar_chunks(
+            collection=collection,
+            chunks=[f"Trecho {indice} do processo {documento_id}." for indice in range(chunks_por_documento)],
+            embeddings=embeddings,
+            metadados={
+                "documento_id": documento_id,
+                "nome_arquivo": f"{documento_id}.pdf",
+                "data_upload": "2025-01-01T00:00:00",
+                "tipo_documento": "pdf",
+            }
+        )
+        embeddings_por_chunk.update(zip(ids_chunks, embeddings))
+
+    return collection, embeddings_por_chunk
+
+
+# ==========================================
+# EXECUÇÃO DO BENCHMARK
+# ==========================================
+
+def medir_estrategia(
+    collection: ArmazenamentoVetorial,
+    consultas: List[Tuple[str, str]],
+    k: int,
+    numero_documentos_pre_selecao: Optional[int]
+) -> Tuple[float, List[float]]:
+    """
+    Executa as consultas com uma estratégia e retorna (recall@k, latências em ms).
+    """
+    acertos = 0
+    latencias_ms: List[float] = []
+    for consulta, id_alvo in consultas:
+        inicio = time.perf_counter()
+        resultados = servico_banco_vetorial.buscar_chunks_similares(
+            collection,
+            consulta,
+            k=k,
+            modo_busca="vetorial",
+            numero_documentos_pre_selecao=numero_documentos_pre_selecao
+        )
+        latencias_ms.append((time.perf_counter() - inicio) * 1000)
+        if id_alvo in [resultado["id"] for resultado in resultados]:
+            acertos += 1
+    return acertos / len(consultas), latencias_ms
+
+
+def executar_benchmark(argumentos: argparse.Namespace) -> int:
+    """
+    Executa o benchmark para cada tamanho de base e imprime a tabela.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso)
+    """
+    print(
+        f"{argumentos.chunks_por_documento} chunks por documento | {argumentos.consultas} consultas | "
+        f"k={argumentos.k} | pré-seleção={argumentos.pre_selecao} documentos | backend={argumentos.backend}"
+    )
+    cabecalho = f"{'documentos':>10}{'chunks':>9}  {'estratégia':<13}{'recall@k':>10}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+    print(cabecalho)
+    print("-" * len(cabecalho))
+
+    for numero_documentos in argumentos.tamanhos:
+        gerador = random.Random(argumentos.semente)
+        collection, embeddings_por_chunk = preparar_collection(
+            numero_documentos, argumentos.chunks_por_documento, gerador, argumentos.backend
+        )
+
+        ids_alvo = gerador.sample(sorted(embeddings_por_chunk), min(argumentos.consultas, len(embeddings_por_chunk)))
+        embeddings_por_consulta = {
+            f"consulta {indice}": gerar_vetor_ruidoso(gerador, embeddings_por_chunk[id_alvo], 0.3)
+            for indice, id_alvo in enumerate(ids_alvo)
+        }
+        consultas = list(zip(embeddings_por_consulta, ids_alvo))
+
+        # A latência medida é só a da recuperação (sem chamada de embedding)
+        servico_vetorizacao.gerar_embeddings = lambda textos, usar_cache=True: [
+            embeddings_por_consulta[texto] for texto in textos
+        ]
+
+        for estrategia, pre_selecao in (("direta", None), ("hierarquica", argumentos.pre_selecao)):
+            recall, latencias_ms = medir_estrategia(collection, consultas, argumentos.k, pre_selecao)
+            print(
+                f"{numero_documentos:>10}{collection.count():>9}  {estrategia:<13}{recall:>10.1%}"
+                f"{statistics.median(latencias_ms):>11.2f}{calcular_percentil(latencias_ms, 0.95):>11.2f}"
+            )
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara latência e recall da busca direta e da busca hierárquica por tamanho de base"
+    )
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[100, 500, 2000],
+        help="Números de documentos a medir (um corpus por tamanho)"
+    )
+    parser.add_argument("--chunks-por-documento", type=int, default=10, help="Chunks por documento")
+    parser.add_argument("--consultas", type=int, default=200, help="Consultas medidas por tamanho")
+    parser.add_argument("-k", type=int, default=5, help="Resultados por consulta (top-k)")
+    parser.add_argument("--pre-selecao", type=int, default=10, help="Documentos pré-selecionados")
+    parser.add_argument(
+        "--backend",
+        choices=["chromadb", "numpy"],
+        default="chromadb",
+        help="Armazenamento vetorial (numpy = busca exata em memória, ver BACKEND_BANCO_VETORIAL)"
+    )
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+
+    sys.exit(executar_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark de Extração de DOCX - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Contratos e contestações em Word chegam com centenas de páginas e muitas
+tabelas (partes, valores, cronogramas). A extração original montava o
+modelo de objetos completo do python-docx, percorria as tabelas depois do
+corpo (fora de ordem) e concatenava strings em laço. Este script compara
+essa implementação com o extrator em streaming do serviço
+(extrair_texto_de_docx), que lê word/document.xml com iterparse.
+
+MÉTRICAS REPORTADAS (por arquivo e no total):
+- tempo (s) de cada implementação (menor tempo entre as repetições)
+- aceleração (tempo python-docx / tempo streaming)
+- linhas em comum (%): fração das linhas não vazias do python-docx que
+  também aparecem no texto do streaming (a ORDEM muda de propósito:
+  tabelas agora ficam no lugar em que aparecem no documento)
+
+CORPUS:
+- --corpus <dir>: usa os .docx encontrados (busca recursiva)
+- --gerar-sintetico N: gera um contrato sintético com N cláusulas e uma
+  tabela a cada 10 cláusulas (útil quando não há corpus real à mão)
+
+USO (a partir do diretório backend/):
+```bash
+python -m benchmarks.benchmark_extracao_docx --corpus ./dados/amostras_contratos
+python -m benchmarks.benchmark_extracao_docx --gerar-sintetico 5000 --repeticoes 3
+```
+
+DEPENDÊNCIAS:
+python-docx (apenas para a implementação de referência e para gerar o
+documento sintético; o extrator em streaming usa só a biblioteca padrão).
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+try:
+    from docx import Document as DocxDocument
+except ImportError:
+    DocxDocument = None
+
+from src.servicos.servico_extracao_texto import extrair_texto_de_docx
+
+
+# ==========================================
+# IMPLEMENTAÇÃO DE REFERÊNCIA (python-docx)
+# ==========================================
+
+def extrair_texto_de_docx_python_docx(caminho_arquivo_docx: str) -> str:
+    """
+    Reproduz a extração original baseada em python-docx.
+
+    Parágrafos primeiro, depois todas as tabelas, com concatenação de
+    strings em laço (exatamente como o serviço fazia antes do streaming).
+    """
+    documento = DocxDocument(caminho_arquivo_docx)
+    texto_completo = ""
+
+    for paragrafo in documento.paragraphs:
+        texto_paragrafo = paragrafo.text
+        if texto_paragrafo.strip():
+            texto_completo += texto_paragrafo + "\n"
+
+    for indice_tabela, tabela in enumerate(documento.tables):
+        texto_completo += f"\n[TABELA {indice_tabela + 1}]\n"
+        for linha in tabela.rows:
+            textos_celulas = [celula.text.strip() for celula in linha.cells]
+            texto_completo += "\t".join(textos_celulas) + "\n"
+        texto_completo += f"[FIM TABELA {indice_tabela + 1}]\n\n"
+
+    return texto_completo.strip()
+
+
+def extrair_texto_de_docx_streaming(caminho_arquivo_docx: str) -> str:
+    """Extrator atual do serviço (iterparse sobre word/document.xml)."""
+    return extrair_texto_de_docx(caminho_arquivo_docx)["texto_extraido"]
+
+
+# ==========================================
+# FUNÇÕES AUXILIARES
+# ==========================================
+
+def gerar_contrato_sintetico(caminho_saida: Path, numero_clausulas: int) -> Path:
+    """
+    Gera um contrato .docx grande com cláusulas e tabelas intercaladas.
+
+    Args:
+        caminho_saida: Onde salvar o arquivo
+        numero_clausulas: Quantidade de cláusulas (parágrafos numerados)
+
+    Returns:
+        Path: Caminho do arquivo gerado
+    """
+    documento = DocxDocument()
+    documento.add_paragraph("CONTRATO DE PRESTAÇÃO DE SERVIÇOS")
+
+    for indice in range(1, numero_clausulas + 1):
+        documento.add_paragraph(
+            f"Cláusula {indice}ª - A CONTRATADA obriga-se a prestar os serviços descritos "
+            f"no Anexo {indice}, observados os prazos e as condições deste instrumento, "
+            f"sob pena de multa de {indice % 10 + 1}% sobre o valor da parcela."
+        )
+        if indice % 10 == 0:
+            tabela = documento.add_table(rows=3, cols=3)
+            for linha in range(3):
+                for coluna in range(3):
+                    tabela.cell(linha, coluna).text = f"Parcela {indice}-{linha}-{coluna}"
+
+    documento.save(str(caminho_saida))
+    return caminho_saida
+
+
+def medir_tempo(
+    funcao_extracao: Callable[[str], str],
+    caminho_arquivo: str,
+    repeticoes: int
+) -> Tuple[float, str]:
+    """
+    Executa a extração N vezes e retorna (menor tempo, texto extraído).
+    """
+    melhor_tempo = float("inf")
+    texto = ""
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        texto = funcao_extracao(caminho_arquivo)
+        melhor_tempo = min(melhor_tempo, time.perf_counter() - inicio)
+    return melhor_tempo, texto
+
+
+def calcular_fracao_linhas_em_comum(texto_referencia: str, texto_avaliado: str) -> float:
+    """
+    Fração das linhas não vazias da referência presentes no texto avaliado.
+    """
+    linhas_referencia = [linha.strip() for linha in texto_referencia.splitlines() if linha.strip()]
+    if not linhas_referencia:
+        return 1.0
+    linhas_avaliadas = {linha.strip() for linha in texto_avaliado.splitlines() if linha.strip()}
+    return sum(1 for linha in linhas_referencia if linha in linhas_avaliadas) / len(linhas_referencia)
+
+
+# ==========================================
+# EXECUÇÃO DO BENCHMARK
+# ==========================================
+
+def executar_benchmark(argumentos: argparse.Namespace) -> int:
+    """
+    Executa o benchmark e imprime a tabela comparativa.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso)
+    """
+    if DocxDocument is None:
+        print("❌ python-docx não instalado (necessário para a implementação de referência)")
+        return 1
+
+    arquivos_docx: List[Path] = []
+    diretorio_temporario = None
+
+    if argumentos.corpus:
+        arquivos_docx = sorted(Path(argumentos.corpus).rglob("*.docx"))
+    if argumentos.gerar_sintetico:
+        diretorio_temporario = tempfile.TemporaryDirectory()
+        arquivos_docx.append(
+            gerar_contrato_sintetico(
+                Path(diretorio_temporario.name) / "contrato_sintetico.docx",
+                argumentos.gerar_sintetico
+            )
+        )
+
+    if not arquivos_docx:
+        print("❌ Nenhum .docx para medir (use --corpus e/ou --gerar-sintetico)")
+        return 1
+
+    cabecalho = f"{'arquivo':<32}{'python-docx (s)':>17}{'streaming (s)':>15}{'aceleração':>12}{'linhas em comum':>17}"
+    print(cabecalho)
+    print("-" * len(cabecalho))
+
+    tempo_total_referencia = 0.0
+    tempo_total_streaming = 0.0
+
+    for caminho_docx in arquivos_docx:
+        tempo_referencia, texto_referencia = medir_tempo(
+            extrair_texto_de_docx_python_docx, str(caminho_docx), argumentos.repeticoes
+        )
+        tempo_streaming, texto_streaming = medir_tempo(
+            extrair_texto_de_docx_streaming, str(caminho_docx), argumentos.repeticoes
+        )
+        tempo_total_referencia += tempo_referencia
+        tempo_total_streaming += tempo_streaming
+
+        print(
+            f"{caminho_docx.name[:31]:<32}{tempo_referencia:>17.3f}{tempo_streaming:>15.3f}"
+            f"{tempo_referencia / tempo_streaming:>11.1f}x"
+            f"{calcular_fracao_linhas_em_comum(texto_referencia, texto_streaming):>17.1%}"
+        )
+
+    print("-" * len(cabecalho))
+    print(
+        f"{'TOTAL':<32}{tempo_total_referencia:>17.3f}{tempo_total_streaming:>15.3f}"
+        f"{tempo_total_referencia / tempo_total_streaming:>11.1f}x"
+    )
+
+    if diretorio_temporario is not None:
+        diretorio_temporario.cleanup()
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara a extração de DOCX via python-docx com o extrator em streaming"
+    )
+    parser.add_argument(
+        "--corpus",
+        help="Diretório com arquivos .docx de exemplo (busca recursiva)"
+    )
+    parser.add_argument(
+        "--gerar-sintetico",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Gera um contrato sintético com N cláusulas e inclui no benchmark"
+    )
+    parser.add_argument(
+        "--repeticoes",
+        type=int,
+        default=1,
+        help="Número de repetições por arquivo (usa o menor tempo)"
+    )
+
+    sys.exit(executar_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
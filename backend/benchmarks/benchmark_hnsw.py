@@ -0,0 +1,169 @@
+"""
+Benchmark dos Parâmetros HNSW do ChromaDB - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+A collection documentos_juridicos usa um índice HNSW cujos parâmetros
+(CHROMA_HNSW_* no .env) só valem na criação. Valores baixos deixam a
+busca rápida mas perdem chunks relevantes (recall); valores altos tornam
+a ingestão e a busca mais lentas. Este script mede o trade-off para o
+TAMANHO DA NOSSA BASE antes de fixar os valores, em vez de chutar.
+
+MÉTRICAS REPORTADAS (por combinação de M, construction_ef e search_ef):
+- inserção (vetores/s): throughput de collection.add em lotes
+- recall@k: fração dos k vizinhos exatos (força bruta em NumPy) que o
+  HNSW devolve, na média das consultas
+- latência p50 / p95 (ms) de collection.query (uma consulta por chamada)
+
+CORPUS SINTÉTICO:
+Vetores agrupados em "assuntos" (centro aleatório + ruído), parecido com
+chunks de processos que tratam dos mesmos temas. As consultas são pontos
+novos gerados da mesma forma. Use --dimensao 1536 para reproduzir o
+tamanho dos embeddings da OpenAI.
+
+USO (a partir do diretório backend/):
+```bash
+python -m benchmarks.benchmark_hnsw
+python -m benchmarks.benchmark_hnsw --vetores 50000 --dimensao 1536 --m 16 32 --search-ef 10 50 100
+```
+
+IMPORTANTE:
+Usa ChromaDB EM MEMÓRIA (não toca ./dados) e não chama a OpenAI.
+batch_size e sync_threshold vêm de CHROMA_HNSW_BATCH_SIZE e
+CHROMA_HNSW_SYNC_THRESHOLD (afetam a inserção, não o recall).
+"""
+
+import argparse
+import itertools
+import statistics
+import sys
+import time
+import uuid
+from typing import List
+
+import chromadb
+import numpy as np
+
+from src.servicos import servico_banco_vetorial
+from benchmarks.benchmark_busca_hibrida import calcular_percentil
+
+
+# ==========================================
+# CORPUS SINTÉTICO
+# ==========================================
+
+def gerar_vetores_agrupados(
+    gerador: np.random.Generator,
+    centros: np.ndarray,
+    quantidade: int
+) -> np.ndarray:
+    """
+    Gera vetores normalizados em torno de centros escolhidos ao acaso.
+    """
+    indices_centros = gerador.integers(0, len(centros), size=quantidade)
+    vetores = centros[indices_centros] + gerador.normal(0, 0.5, size=(quantidade, centros.shape[1]))
+    return (vetores / np.linalg.norm(vetores, axis=1, keepdims=True)).astype(np.float32)
+
+
+def calcular_vizinhos_exatos(corpus: np.ndarray, consultas: np.ndarray, k: int) -> List[set]:
+    """
+    Vizinhos exatos por similaridade de cosseno (referência do recall).
+    """
+    similaridades = consultas @ corpus.T
+    melhores = np.argpartition(-similaridades, k - 1, axis=1)[:, :k]
+    return [set(linha.tolist()) for linha in melhores]
+
+
+# ==========================================
+# EXECUÇÃO DO BENCHMARK
+# ==========================================
+
+def executar_benchmark(argumentos: argparse.Namespace) -> int:
+    """
+    Mede cada combinação de parâmetros e imprime a tabela.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso)
+    """
+    gerador = np.random.default_rng(argumentos.semente)
+    centros = gerador.normal(0, 1, size=(argumentos.assuntos, argumentos.dimensao))
+    corpus = gerar_vetores_agrupados(gerador, centros, argumentos.vetores)
+    consultas = gerar_vetores_agrupados(gerador, centros, argumentos.consultas)
+    vizinhos_exatos = calcular_vizinhos_exatos(corpus, consultas, argumentos.k)
+    ids_corpus = [str(indice) for indice in range(len(corpus))]
+
+    configuracoes = servico_banco_vetorial.configuracoes
+    print(
+        f"Corpus: {argumentos.vetores} vetores × {argumentos.dimensao} dimensões | "
+        f"{argumentos.consultas} consultas | k={argumentos.k} | "
+        f"batch_size={configuracoes.CHROMA_HNSW_BATCH_SIZE} sync_threshold={configuracoes.CHROMA_HNSW_SYNC_THRESHOLD}"
+    )
+    cabecalho = (
+        f"{'M':>4}{'constr_ef':>11}{'search_ef':>11}{'inserção (vet/s)':>18}"
+        f"{'recall@k':>10}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+    )
+    print(cabecalho)
+    print("-" * len(cabecalho))
+
+    cliente = chromadb.EphemeralClient()
+    for m, construction_ef, search_ef in itertools.product(
+        argumentos.m, argumentos.construction_ef, argumentos.search_ef
+    ):
+        collection = cliente.create_collection(
+            name=f"benchmark_{uuid.uuid4().hex}",
+            embedding_function=None,
+            metadata={
+                **servico_banco_vetorial.montar_metadados_hnsw(),
+                "hnsw:M": m,
+                "hnsw:construction_ef": construction_ef,
+                "hnsw:search_ef": search_ef,
+            }
+        )
+
+        inicio = time.perf_counter()
+        for posicao in range(0, len(corpus), argumentos.tamanho_lote):
+            collection.add(
+                ids=ids_corpus[posicao:posicao + argumentos.tamanho_lote],
+                embeddings=corpus[posicao:posicao + argumentos.tamanho_lote]
+            )
+        vetores_por_segundo = len(corpus) / (time.perf_counter() - inicio)
+
+        soma_recall = 0.0
+        latencias_ms: List[float] = []
+        for consulta, exatos in zip(consultas, vizinhos_exatos):
+            inicio = time.perf_counter()
+            resultado = collection.query(query_embeddings=[consulta], n_results=argumentos.k, include=[])
+            latencias_ms.append((time.perf_counter() - inicio) * 1000)
+            soma_recall += len(exatos & {int(id_vetor) for id_vetor in resultado["ids"][0]}) / argumentos.k
+
+        print(
+            f"{m:>4}{construction_ef:>11}{search_ef:>11}{vetores_por_segundo:>18.0f}"
+            f"{soma_recall / len(consultas):>10.1%}"
+            f"{statistics.median(latencias_ms):>11.2f}{calcular_percentil(latencias_ms, 0.95):>11.2f}"
+        )
+        cliente.delete_collection(collection.name)
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Mede recall@k, latência de busca e throughput de inserção para parâmetros HNSW do ChromaDB"
+    )
+    parser.add_argument("--vetores", type=int, default=20000, help="Tamanho do corpus sintético")
+    parser.add_argument("--dimensao", type=int, default=256, help="Dimensão dos vetores (1536 = OpenAI)")
+    parser.add_argument("--assuntos", type=int, default=50, help="Número de agrupamentos do corpus")
+    parser.add_argument("--consultas", type=int, default=200, help="Consultas medidas por combinação")
+    parser.add_argument("-k", type=int, default=10, help="Vizinhos por consulta (top-k)")
+    parser.add_argument("--m", type=int, nargs="+", default=[16, 32], help="Valores de hnsw:M")
+    parser.add_argument(
+        "--construction-ef", type=int, nargs="+", default=[100, 200], help="Valores de hnsw:construction_ef"
+    )
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100], help="Valores de hnsw:search_ef")
+    parser.add_argument("--tamanho-lote", type=int, default=1000, help="Vetores por collection.add")
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+
+    sys.exit(executar_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -88,10 +88,11 @@ from typing import Dict, Any, List, Optional
 import logging
 
 # Importar classe base de agentes
-from src.agentes.agente_base import AgenteBase, formatar_contexto_de_documentos
+from src.agentes.agente_base import AgenteBase
 
 # Importar gerenciador de LLM
 from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.triagem_relevancia import encontrar_palavras_chave
 
 
 # Configuração do logger para este módulo
@@ -171,7 +172,8 @@ class AgenteAdvogadoBase(AgenteBase):
         self.legislacao_principal: List[str] = []
         
         # Palavras-chave e termos técnicos da área de especialização
-        # Usado para validar se a pergunta é relevante para este agente
+        # Usado para validar se a pergunta é relevante para este agente e
+        # na triagem de relevância dos orquestradores (triagem_relevancia.py)
         # Exemplo: ["justa causa", "rescisão", "FGTS", "adicional noturno"]
         self.palavras_chave_especializacao: List[str] = []
         
@@ -182,6 +184,10 @@ class AgenteAdvogadoBase(AgenteBase):
         # Usar GPT-5-nano para análises jurídicas (mais preciso e atualizado)
         self.modelo_llm_padrao = "gpt-5-nano-2025-08-07"
         
+        # Documentos do caso como prefixo comum aos agentes da análise e
+        # instruções fixas na mensagem de sistema (cache de prompt do provedor)
+        self.usa_contexto_compartilhado = True
+        
         logger.info(f"Agente Advogado Base inicializado: '{self.nome_do_agente}'")
     
     def montar_prompt(
@@ -191,19 +197,18 @@ class AgenteAdvogadoBase(AgenteBase):
         metadados_adicionais: Optional[Dict[str, Any]] = None
     ) -> str:
         """
-        Monta o prompt base para advogados especialistas.
+        Monta o prompt completo do advogado especialista em um único texto.
         
-        ESTRUTURA DO PROMPT:
-        1. Contexto: Documentos fornecidos pelo coordenador (do RAG)
-        2. Identidade: Área de especialização e legislação relevante
-        3. Pergunta: O que o usuário perguntou
-        4. Instruções: Como estruturar a análise jurídica
-        5. Delegação: Chamar montar_prompt_especializado() da subclasse
+        ESTRUTURA DO PROMPT (mesma ordem das mensagens enviadas à API):
+        1. Contexto: Documentos do caso (formatar_contexto_do_caso, comum a todos os agentes)
+        2. Instruções fixas: Identidade, legislação, método de análise e a parte
+           especializada da área (montar_instrucoes_de_sistema)
+        3. Tarefa: Metadados da consulta e pergunta (montar_prompt_da_tarefa)
         
-        FLUXO:
-        Este método fornece a ESTRUTURA BASE comum a todos os advogados.
-        Para detalhes específicos da área jurídica, chama
-        montar_prompt_especializado() que deve ser implementado pela subclasse.
+        NOTA:
+        processar() não usa este texto: envia as três partes separadas (ver
+        AgenteBase.montar_prompt_do_agente) para aproveitar o cache de prompt
+        do provedor entre os agentes da mesma análise.
         
         Args:
             contexto_de_documentos: Trechos relevantes fornecidos pelo coordenador
@@ -213,23 +218,30 @@ class AgenteAdvogadoBase(AgenteBase):
         Returns:
             str: Prompt completo formatado para este advogado especialista
         """
-        # Formatar documentos de forma legível
-        documentos_formatados = formatar_contexto_de_documentos(contexto_de_documentos)
+        return self.montar_prompt_do_agente(
+            contexto_de_documentos,
+            pergunta_do_usuario,
+            metadados_adicionais
+        ).texto_completo()
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Instruções fixas do advogado especialista (mensagem de sistema).
         
-        # Extrair metadados relevantes
-        tipo_processo = "Não especificado"
-        urgencia = "normal"
-        if metadados_adicionais:
-            tipo_processo = metadados_adicionais.get("tipo_processo", "Não especificado")
-            urgencia = metadados_adicionais.get("urgencia", "normal")
+        CONTEÚDO:
+        Mensagem de sistema padrão + identidade, legislação principal e
+        instruções de análise jurídica comuns a todos os advogados + a parte
+        especializada da área (montar_instrucoes_especializadas).
         
+        Returns:
+            str: Mensagem de sistema deste advogado
+        """
         # Formatar legislação principal (se disponível)
         legislacao_formatada = "Não especificada"
         if self.legislacao_principal:
             legislacao_formatada = ", ".join(self.legislacao_principal)
         
-        # Construir prompt base comum
-        prompt_base = f"""
+        instrucoes_base = f"""
 # ANÁLISE JURÍDICA ESPECIALIZADA
 
 Você é um advogado especializado em **{self.area_especializacao}**.
@@ -240,16 +252,6 @@ Você é um advogado especializado em **{self.area_especializacao}**.
 - Legislação Principal: {legislacao_formatada}
 - Descrição: {self.descricao_do_agente}
 
-## CONTEXTO: DOCUMENTOS FORNECIDOS
-{documentos_formatados}
-
-## METADADOS DA CONSULTA:
-- Tipo de Processo: {tipo_processo}
-- Urgência: {urgencia}
-
-## PERGUNTA DO USUÁRIO:
-{pergunta_do_usuario}
-
 ---
 
 ## INSTRUÇÕES PARA SUA ANÁLISE JURÍDICA:
@@ -278,18 +280,59 @@ Você é um advogado especializado em **{self.area_especializacao}**.
 
 """
         
-        # Chamar método especializado da subclasse para adicionar
-        # instruções específicas da área jurídica
-        prompt_especializado = self.montar_prompt_especializado(
-            contexto_de_documentos,
-            pergunta_do_usuario,
-            metadados_adicionais
+        return (
+            self._montar_mensagem_de_sistema()
+            + instrucoes_base
+            + self.montar_instrucoes_especializadas()
         )
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt: metadados da consulta e pergunta do usuário.
+        
+        Args:
+            pergunta_do_usuario: Pergunta/solicitação original do usuário
+            metadados_adicionais: Informações extras (tipo processo, urgência, etc.)
+        
+        Returns:
+            str: Tarefa a ser respondida com base nos DOCUMENTOS DO CASO
+        """
+        # Extrair metadados relevantes
+        tipo_processo = "Não especificado"
+        urgencia = "normal"
+        if metadados_adicionais:
+            tipo_processo = metadados_adicionais.get("tipo_processo", "Não especificado")
+            urgencia = metadados_adicionais.get("urgencia", "normal")
+        
+        return f"""## CONTEXTO DA CONSULTA:
+- Tipo de Processo: {tipo_processo}
+- Urgência: {urgencia}
+
+## PERGUNTA DO USUÁRIO:
+{pergunta_do_usuario}
+
+Elabore seu parecer com base nos DOCUMENTOS DO CASO enviados no início da conversa.
+"""
+    
+    def montar_instrucoes_especializadas(self) -> str:
+        """
+        Instruções fixas da área jurídica (entram na mensagem de sistema).
         
-        # Combinar prompt base + prompt especializado
-        prompt_completo = prompt_base + prompt_especializado
+        IMPLEMENTAÇÃO PADRÃO:
+        Reaproveita montar_prompt_especializado() sem documentos e sem
+        pergunta, o que basta para as subclasses cuja parte especializada não
+        depende deles (Trabalhista, Previdenciário). Subclasses que incluem
+        documentos ou pergunta em montar_prompt_especializado() devem
+        sobrescrever este método com a parte fixa.
         
-        return prompt_completo
+        Returns:
+            str: Instruções especializadas sem dados do caso
+        """
+        return self.montar_prompt_especializado([], "", None)
     
     @abstractmethod
     def montar_prompt_especializado(
@@ -348,7 +391,9 @@ Você é um advogado especializado em **{self.area_especializacao}**.
         - Advogado Tributário recebe pergunta sobre "ICMS" → Alta relevância
         
         IMPLEMENTAÇÃO:
-        Verifica se a pergunta contém palavras-chave da área de especialização.
+        Verifica se a pergunta contém palavras-chave da área de especialização
+        (palavras inteiras, ver encontrar_palavras_chave). Os orquestradores
+        usam a mesma medida sobre os documentos do caso (triar_agentes).
         Subclasses podem sobrescrever para implementar lógica mais sofisticada.
         
         Args:
@@ -358,33 +403,30 @@ Você é um advogado especializado em **{self.area_especializacao}**.
             dict: {
                 "relevante": bool,
                 "confianca": float (0.0 a 1.0),
-                "razao": str (explicação)
+                "razao": str (explicação),
+                "palavras_encontradas": list[str]
             }
         """
-        # Converter pergunta para minúsculas para comparação
-        pergunta_lower = pergunta_do_usuario.lower()
-        
         # Se não há palavras-chave definidas, assumir que é relevante
         # (subclasse não configurou validação)
         if not self.palavras_chave_especializacao:
             return {
                 "relevante": True,
                 "confianca": 0.5,
-                "razao": "Nenhuma palavra-chave de especialização definida"
+                "razao": "Nenhuma palavra-chave de especialização definida",
+                "palavras_encontradas": []
             }
         
-        # Contar quantas palavras-chave aparecem na pergunta
-        palavras_encontradas = []
-        for palavra_chave in self.palavras_chave_especializacao:
-            if palavra_chave.lower() in pergunta_lower:
-                palavras_encontradas.append(palavra_chave)
+        # Palavras-chave que aparecem na pergunta
+        palavras_encontradas = encontrar_palavras_chave(pergunta_do_usuario, self.palavras_chave_especializacao)
         
         # Calcular confiança baseado na proporção de palavras-chave encontradas
         if len(palavras_encontradas) == 0:
             return {
                 "relevante": False,
                 "confianca": 0.0,
-                "razao": f"Nenhuma palavra-chave de {self.area_especializacao} encontrada"
+                "razao": f"Nenhuma palavra-chave de {self.area_especializacao} encontrada",
+                "palavras_encontradas": []
             }
         
         # Confiança = (palavras encontradas / total de palavras-chave)
@@ -393,7 +435,8 @@ Você é um advogado especializado em **{self.area_especializacao}**.
         return {
             "relevante": True,
             "confianca": min(confianca, 1.0),  # Limitar a 1.0
-            "razao": f"Palavras-chave encontradas: {', '.join(palavras_encontradas)}"
+            "razao": f"Palavras-chave encontradas: {', '.join(palavras_encontradas)}",
+            "palavras_encontradas": palavras_encontradas
         }
     
     def obter_informacoes_agente(self) -> Dict[str, Any]:
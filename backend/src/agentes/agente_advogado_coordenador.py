@@ -40,7 +40,8 @@ todas as tarefas diretamente, mas coordena outros agentes especializados.
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from functools import partial
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Importar classe base
@@ -48,12 +49,17 @@ from src.agentes.agente_base import AgenteBase, formatar_contexto_de_documentos
 
 # Importar serviço de banco vetorial para consultar RAG
 from src.servicos.servico_banco_vetorial import (
-    inicializar_chromadb,
+    obter_servico_banco_vetorial,
     buscar_chunks_similares
 )
 
 # Importar gerenciador de LLM
-from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.gerenciador_llm import CallbackDeFragmento, GerenciadorLLM
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+# Triagem de relevância dos especialistas selecionados
+from src.utilitarios.triagem_relevancia import DECISAO_PULAR, aplicar_triagem
 
 
 # Configuração do logger para este módulo
@@ -99,12 +105,18 @@ class AgenteAdvogadoCoordenador(AgenteBase):
     ```
     """
     
-    def __init__(self, gerenciador_llm: Optional[GerenciadorLLM] = None):
+    def __init__(
+        self,
+        gerenciador_llm: Optional[GerenciadorLLM] = None,
+        banco_vetorial: Optional[Tuple[Any, Any]] = None
+    ):
         """
         Inicializa o Agente Advogado Coordenador.
         
         Args:
             gerenciador_llm: Instância do GerenciadorLLM. Se None, cria uma nova.
+            banco_vetorial: (cliente, collection) do ChromaDB. Se None, usa o
+                singleton compartilhado (obter_servico_banco_vetorial).
         """
         super().__init__(gerenciador_llm)
         
@@ -119,12 +131,14 @@ class AgenteAdvogadoCoordenador(AgenteBase):
         self.modelo_llm_padrao = "gpt-5-nano-2025-08-07"  # Usar GPT-5-nano para análises jurídicas (mais preciso)
         self.temperatura_padrao = 0.3  # Temperatura baixa = mais objetivo e consistente
         
-        # Inicializar ChromaDB para consultas RAG
+        # ChromaDB para consultas RAG (instância compartilhada, sem reconectar)
         # NOTA: Inicialização pode falhar se ChromaDB não estiver configurado
         # Capturamos erro e registramos, mas não impedimos criação do agente
         try:
-            self.cliente_chromadb, self.collection_chromadb = inicializar_chromadb()
-            logger.info("✅ ChromaDB inicializado para consultas RAG")
+            self.cliente_chromadb, self.collection_chromadb = (
+                banco_vetorial if banco_vetorial is not None else obter_servico_banco_vetorial()
+            )
+            logger.info("✅ ChromaDB disponível para consultas RAG")
         except Exception as erro:
             logger.warning(
                 f"⚠️  ChromaDB não pôde ser inicializado: {erro}. "
@@ -253,7 +267,9 @@ Agora, proceda com sua análise jurídica:
         consulta: str,
         numero_de_resultados: int = 5,
         filtro_metadados: Optional[Dict[str, Any]] = None,
-        documento_ids: Optional[List[str]] = None
+        documento_ids: Optional[List[str]] = None,
+        lambda_mmr: Optional[float] = None,
+        busca_hierarquica: bool = False
     ) -> List[str]:
         """
         Consulta a base de conhecimento (RAG) para recuperar documentos relevantes.
@@ -276,7 +292,8 @@ Agora, proceda com sua análise jurídica:
         IMPLEMENTAÇÃO:
         1. Valida se ChromaDB está disponível
         2. Se documento_ids fornecido, adiciona filtro de metadados para limitar busca
-        3. Usa a função buscar_chunks_similares do servico_banco_vetorial
+        3. Usa a função buscar_chunks_similares do servico_banco_vetorial,
+           com diversificação MMR (evita chunks quase idênticos no contexto)
         4. Retorna lista de chunks (textos) mais relevantes
         
         Args:
@@ -286,6 +303,11 @@ Agora, proceda com sua análise jurídica:
             documento_ids: Lista opcional de IDs de documentos específicos para filtrar busca.
                           Se None ou vazio, busca em todos os documentos disponíveis.
                           Se fornecido, apenas chunks desses documentos são considerados.
+            lambda_mmr: Peso da relevância na diversificação MMR (0 a 1).
+                        None = RAG_LAMBDA_MMR do .env; 1.0 = sem diversificação.
+            busca_hierarquica: Se True, pré-seleciona os RAG_NUMERO_DOCUMENTOS_PRE_SELECAO
+                        documentos mais próximos da consulta e busca chunks só neles
+                        (recomendado para bases com muitos processos).
         
         Returns:
             List[str]: Lista de chunks de texto relevantes
@@ -338,17 +360,7 @@ Agora, proceda com sua análise jurídica:
             return []
         
         # NOVIDADE (TAREFA-022): Adicionar filtro de documento_ids se fornecido
-        # Mesclar com filtros existentes de metadados
-        filtro_final = filtro_metadados.copy() if filtro_metadados else {}
-        
-        if documento_ids and len(documento_ids) > 0:
-            # Adicionar filtro para limitar busca aos documentos especificados
-            # ChromaDB suporta filtro com operador "$in" para lista de valores
-            filtro_final["documento_id"] = {"$in": documento_ids}
-            logger.info(
-                f"🔍 Filtrando busca RAG por {len(documento_ids)} documento(s) específico(s): "
-                f"{documento_ids[:3]}{'...' if len(documento_ids) > 3 else ''}"
-            )
+        filtro_final = self._montar_filtro_rag(filtro_metadados, documento_ids)
         
         try:
             # Buscar chunks similares usando o serviço de banco vetorial
@@ -356,7 +368,9 @@ Agora, proceda com sua análise jurídica:
                 collection=self.collection_chromadb,
                 query=consulta,
                 k=numero_de_resultados,
-                filtro_metadados=filtro_final if filtro_final else None
+                filtro_metadados=filtro_final if filtro_final else None,
+                lambda_mmr=self._resolver_lambda_mmr(lambda_mmr),
+                numero_documentos_pre_selecao=self._resolver_pre_selecao(busca_hierarquica)
             )
             
             # Extrair apenas os textos dos chunks (ignorar metadados e distâncias)
@@ -377,12 +391,62 @@ Agora, proceda com sua análise jurídica:
             logger.warning("Continuando sem contexto RAG devido ao erro")
             return []
     
+    def _resolver_lambda_mmr(self, lambda_mmr: Optional[float]) -> Optional[float]:
+        """
+        Resolve o lambda do MMR: parâmetro do chamador ou RAG_LAMBDA_MMR do .env.
+        
+        Returns:
+            Optional[float]: None quando λ = 1.0 (ranking original, sem buscar
+            candidatos extras)
+        """
+        if lambda_mmr is None:
+            lambda_mmr = obter_configuracoes().RAG_LAMBDA_MMR
+        return None if lambda_mmr >= 1.0 else lambda_mmr
+    
+    def _resolver_pre_selecao(self, busca_hierarquica: bool) -> Optional[int]:
+        """
+        Número de documentos pré-selecionados na busca hierárquica (None = busca direta).
+        """
+        if not busca_hierarquica:
+            return None
+        return obter_configuracoes().RAG_NUMERO_DOCUMENTOS_PRE_SELECAO
+    
+    def _montar_filtro_rag(
+        self,
+        filtro_metadados: Optional[Dict[str, Any]],
+        documento_ids: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Mescla filtros de metadados com o filtro por documento_ids (TAREFA-022).
+        
+        Args:
+            filtro_metadados: Filtros opcionais de metadados
+            documento_ids: IDs de documentos para limitar a busca (None/vazio = todos)
+        
+        Returns:
+            Dict[str, Any]: Filtro final (vazio se não houver filtros)
+        """
+        filtro_final = filtro_metadados.copy() if filtro_metadados else {}
+        
+        if documento_ids and len(documento_ids) > 0:
+            # Adicionar filtro para limitar busca aos documentos especificados
+            # ChromaDB suporta filtro com operador "$in" para lista de valores
+            filtro_final["documento_id"] = {"$in": documento_ids}
+            logger.info(
+                f"🔍 Filtrando busca RAG por {len(documento_ids)} documento(s) específico(s): "
+                f"{documento_ids[:3]}{'...' if len(documento_ids) > 3 else ''}"
+            )
+        
+        return filtro_final
+    
     async def delegar_para_peritos(
         self,
         pergunta: str,
         contexto_de_documentos: List[str],
         peritos_selecionados: List[str],
-        metadados_adicionais: Optional[Dict[str, Any]] = None
+        metadados_adicionais: Optional[Dict[str, Any]] = None,
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None,
+        triagem_de_relevancia: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
         Delega análises especializadas para agentes peritos em paralelo.
@@ -404,15 +468,23 @@ Agora, proceda com sua análise jurídica:
         IMPLEMENTAÇÃO:
         1. Validar quais peritos foram solicitados
         2. Instanciar os agentes peritos
-        3. Criar tasks assíncronas para cada perito
-        4. Executar tasks em paralelo usando asyncio.gather()
-        5. Coletar e retornar todos os pareceres
+        3. Triagem de relevância (triar_agentes): peritos pouco aderentes à
+           pergunta e aos documentos não são executados; os de aderência
+           parcial rodam com o modelo rápido (se LLM_CASCATA_ATIVADA)
+        4. Criar tasks assíncronas para cada perito
+        5. Executar tasks em paralelo usando asyncio.gather()
+        6. Coletar e retornar todos os pareceres
         
         Args:
             pergunta: Pergunta a ser respondida pelos peritos
             contexto_de_documentos: Documentos relevantes (do RAG)
             peritos_selecionados: Lista de identificadores de peritos (ex: ["medico", "seguranca_trabalho"])
             metadados_adicionais: Informações extras para os peritos
+            ao_receber_fragmento: Callback de streaming (identificador_do_perito, fragmento);
+                                 recebe o texto de cada perito enquanto é gerado
+            triagem_de_relevancia: (Opcional) Recebe a decisão da triagem de cada
+                                   perito ("perito_<id>"); os ignorados não
+                                   aparecem no retorno
         
         Returns:
             Dict[str, Dict[str, Any]]: Pareceres de cada perito
@@ -464,7 +536,10 @@ Agora, proceda com sua análise jurídica:
         # Lista para armazenar as tasks assíncronas
         tasks_peritos = []
         
-        # Para cada perito solicitado, criar uma task
+        # Peritos disponíveis instanciados (passam pela triagem antes das tasks)
+        peritos: Dict[str, AgenteBase] = {}
+        
+        # Para cada perito solicitado, instanciar o agente
         for identificador_perito in peritos_selecionados:
             # Verificar se o perito está disponível
             if identificador_perito not in self.peritos_disponiveis:
@@ -486,17 +561,29 @@ Agora, proceda com sua análise jurídica:
             
             # Instanciar o agente perito
             ClasseDoPerito = self.peritos_disponiveis[identificador_perito]
-            perito = ClasseDoPerito(gerenciador_llm=self.gerenciador_llm)
+            peritos[identificador_perito] = ClasseDoPerito(gerenciador_llm=self.gerenciador_llm)
+        
+        triagem = aplicar_triagem(
+            peritos, "\n".join([pergunta] + list(contexto_de_documentos)), "perito", triagem_de_relevancia
+        )
+        
+        for identificador_perito, perito in peritos.items():
+            if triagem[identificador_perito].decisao == DECISAO_PULAR:
+                continue
             
             # Criar task assíncrona para processar
-            # NOTA: Como processar() é síncrono, usamos run_in_executor para torná-lo assíncrono
+            # NOTA: processar_async() chama o LLM com AsyncOpenAI (sem ocupar threads)
             task = asyncio.create_task(
                 self._processar_perito_async(
                     perito=perito,
                     identificador=identificador_perito,
                     contexto_de_documentos=contexto_de_documentos,
                     pergunta=pergunta,
-                    metadados_adicionais=metadados_adicionais
+                    metadados_adicionais=metadados_adicionais,
+                    ao_receber_fragmento=(
+                        partial(ao_receber_fragmento, identificador_perito) if ao_receber_fragmento else None
+                    ),
+                    modelo_customizado=triagem[identificador_perito].modelo
                 )
             )
             tasks_peritos.append((identificador_perito, task))
@@ -537,15 +624,18 @@ Agora, proceda com sua análise jurídica:
         identificador: str,
         contexto_de_documentos: List[str],
         pergunta: str,
-        metadados_adicionais: Optional[Dict[str, Any]]
+        metadados_adicionais: Optional[Dict[str, Any]],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        modelo_customizado: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Processa um perito de forma assíncrona.
         
         CONTEXTO:
         Esta é uma função auxiliar privada usada por delegar_para_peritos().
-        Ela converte a chamada síncrona processar() em uma chamada assíncrona
-        usando run_in_executor.
+        Ela aguarda perito.processar_async(), que chama o LLM de forma nativamente
+        assíncrona (AsyncOpenAI + asyncio.sleep no backoff): cada perito
+        em espera custa uma corrotina, não uma thread do executor.
         
         IMPORTANTE:
         Esta função NÃO deve ser chamada diretamente por código externo.
@@ -557,20 +647,21 @@ Agora, proceda com sua análise jurídica:
             contexto_de_documentos: Documentos relevantes
             pergunta: Pergunta para o perito
             metadados_adicionais: Metadados extras
+            ao_receber_fragmento: Callback de streaming deste agente (opcional)
+            modelo_customizado: Modelo definido pela triagem de relevância (opcional;
+                                agente rebaixado para o modelo rápido)
         
         Returns:
             Dict[str, Any]: Parecer do perito
         """
         logger.debug(f"Iniciando processamento assíncrono do perito '{identificador}'")
         
-        # Executar em thread pool para não bloquear o event loop
-        loop = asyncio.get_event_loop()
-        resultado = await loop.run_in_executor(
-            None,  # Use o executor padrão (ThreadPoolExecutor)
-            perito.processar,  # Função a ser executada
-            contexto_de_documentos,  # Arg 1
-            pergunta,  # Arg 2
-            metadados_adicionais  # Arg 3
+        resultado = await perito.processar_async(
+            contexto_de_documentos=contexto_de_documentos,
+            pergunta_do_usuario=pergunta,
+            metadados_adicionais=metadados_adicionais,
+            modelo_customizado=modelo_customizado,
+            ao_receber_fragmento=ao_receber_fragmento
         )
         
         return resultado
@@ -580,7 +671,9 @@ Agora, proceda com sua análise jurídica:
         pergunta: str,
         contexto_de_documentos: List[str],
         advogados_selecionados: List[str],
-        metadados_adicionais: Optional[Dict[str, Any]] = None
+        metadados_adicionais: Optional[Dict[str, Any]] = None,
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None,
+        triagem_de_relevancia: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
         Delega análises jurídicas especializadas para advogados especialistas em paralelo.
@@ -616,9 +709,12 @@ Agora, proceda com sua análise jurídica:
         IMPLEMENTAÇÃO:
         1. Validar quais advogados foram solicitados
         2. Instanciar os agentes advogados especialistas
-        3. Criar tasks assíncronas para cada advogado
-        4. Executar tasks em paralelo usando asyncio.gather()
-        5. Coletar e retornar todas as análises jurídicas
+        3. Triagem de relevância (triar_agentes): advogados pouco aderentes à
+           pergunta e aos documentos não são executados; os de aderência
+           parcial rodam com o modelo rápido (se LLM_CASCATA_ATIVADA)
+        4. Criar tasks assíncronas para cada advogado
+        5. Executar tasks em paralelo usando asyncio.gather()
+        6. Coletar e retornar todas as análises jurídicas
         
         Args:
             pergunta: Pergunta a ser respondida pelos advogados especialistas
@@ -626,6 +722,11 @@ Agora, proceda com sua análise jurídica:
             advogados_selecionados: Lista de identificadores de advogados 
                                    (ex: ["trabalhista", "previdenciario"])
             metadados_adicionais: Informações extras para os advogados
+            ao_receber_fragmento: Callback de streaming (identificador_do_advogado, fragmento);
+                                 recebe o texto de cada advogado enquanto é gerado
+            triagem_de_relevancia: (Opcional) Recebe a decisão da triagem de cada
+                                   advogado ("advogado_<id>"); os ignorados não
+                                   aparecem no retorno
         
         Returns:
             Dict[str, Dict[str, Any]]: Pareceres de cada advogado especialista
@@ -682,7 +783,10 @@ Agora, proceda com sua análise jurídica:
         # Lista para armazenar as tasks assíncronas
         tasks_advogados = []
         
-        # Para cada advogado solicitado, criar uma task
+        # Advogados disponíveis instanciados (passam pela triagem antes das tasks)
+        advogados: Dict[str, AgenteBase] = {}
+        
+        # Para cada advogado solicitado, instanciar o agente
         for identificador_advogado in advogados_selecionados:
             # Verificar se o advogado está disponível
             if identificador_advogado not in self.advogados_especialistas_disponiveis:
@@ -704,17 +808,29 @@ Agora, proceda com sua análise jurídica:
             
             # Instanciar o agente advogado especialista
             ClasseDoAdvogado = self.advogados_especialistas_disponiveis[identificador_advogado]
-            advogado_especialista = ClasseDoAdvogado(gerenciador_llm=self.gerenciador_llm)
+            advogados[identificador_advogado] = ClasseDoAdvogado(gerenciador_llm=self.gerenciador_llm)
+        
+        triagem = aplicar_triagem(
+            advogados, "\n".join([pergunta] + list(contexto_de_documentos)), "advogado", triagem_de_relevancia
+        )
+        
+        for identificador_advogado, advogado_especialista in advogados.items():
+            if triagem[identificador_advogado].decisao == DECISAO_PULAR:
+                continue
             
             # Criar task assíncrona para processar
-            # NOTA: Como processar() é síncrono, usamos run_in_executor para torná-lo assíncrono
+            # NOTA: processar_async() chama o LLM com AsyncOpenAI (sem ocupar threads)
             task = asyncio.create_task(
                 self._processar_advogado_async(
                     advogado=advogado_especialista,
                     identificador=identificador_advogado,
                     contexto_de_documentos=contexto_de_documentos,
                     pergunta=pergunta,
-                    metadados_adicionais=metadados_adicionais
+                    metadados_adicionais=metadados_adicionais,
+                    ao_receber_fragmento=(
+                        partial(ao_receber_fragmento, identificador_advogado) if ao_receber_fragmento else None
+                    ),
+                    modelo_customizado=triagem[identificador_advogado].modelo
                 )
             )
             tasks_advogados.append((identificador_advogado, task))
@@ -755,15 +871,18 @@ Agora, proceda com sua análise jurídica:
         identificador: str,
         contexto_de_documentos: List[str],
         pergunta: str,
-        metadados_adicionais: Optional[Dict[str, Any]]
+        metadados_adicionais: Optional[Dict[str, Any]],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        modelo_customizado: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Processa um advogado especialista de forma assíncrona.
         
         CONTEXTO:
         Esta é uma função auxiliar privada usada por delegar_para_advogados_especialistas().
-        Ela converte a chamada síncrona processar() em uma chamada assíncrona
-        usando run_in_executor.
+        Ela aguarda advogado.processar_async(), que chama o LLM de forma nativamente
+        assíncrona (AsyncOpenAI + asyncio.sleep no backoff): cada advogado especialista
+        em espera custa uma corrotina, não uma thread do executor.
         
         IMPORTANTE:
         Esta função NÃO deve ser chamada diretamente por código externo.
@@ -775,20 +894,21 @@ Agora, proceda com sua análise jurídica:
             contexto_de_documentos: Documentos relevantes
             pergunta: Pergunta para o advogado
             metadados_adicionais: Metadados extras
+            ao_receber_fragmento: Callback de streaming deste agente (opcional)
+            modelo_customizado: Modelo definido pela triagem de relevância (opcional;
+                                agente rebaixado para o modelo rápido)
         
         Returns:
             Dict[str, Any]: Parecer do advogado especialista
         """
         logger.debug(f"Iniciando processamento assíncrono do advogado especialista '{identificador}'")
         
-        # Executar em thread pool para não bloquear o event loop
-        loop = asyncio.get_event_loop()
-        resultado = await loop.run_in_executor(
-            None,  # Use o executor padrão (ThreadPoolExecutor)
-            advogado.processar,  # Função a ser executada
-            contexto_de_documentos,  # Arg 1
-            pergunta,  # Arg 2
-            metadados_adicionais  # Arg 3
+        resultado = await advogado.processar_async(
+            contexto_de_documentos=contexto_de_documentos,
+            pergunta_do_usuario=pergunta,
+            metadados_adicionais=metadados_adicionais,
+            modelo_customizado=modelo_customizado,
+            ao_receber_fragmento=ao_receber_fragmento
         )
         
         return resultado
@@ -799,7 +919,8 @@ Agora, proceda com sua análise jurídica:
         contexto_rag: List[str],
         pergunta_original: str,
         metadados_adicionais: Optional[Dict[str, Any]] = None,
-        pareceres_advogados_especialistas: Optional[Dict[str, Dict[str, Any]]] = None
+        pareceres_advogados_especialistas: Optional[Dict[str, Dict[str, Any]]] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None
     ) -> Dict[str, Any]:
         """
         Compila pareceres de peritos E advogados especialistas em uma resposta jurídica final coesa.
@@ -823,6 +944,9 @@ Agora, proceda com sua análise jurídica:
         3. Usa GPT-5-nano para gerar resposta jurídica integradora
         4. Retorna resposta estruturada com metadados completos
         
+        Dentro do event loop (OrquestradorMultiAgent) use compilar_resposta_async():
+        a chamada ao LLM desta versão é bloqueante.
+        
         DIFERENÇA ENTRE compilar_resposta() E processar():
         - processar(): Análise jurídica DIRETA (sem peritos nem advogados especialistas)
         - compilar_resposta(): Análise jurídica INTEGRANDO pareceres de peritos E advogados
@@ -834,6 +958,7 @@ Agora, proceda com sua análise jurídica:
             metadados_adicionais: Metadados extras
             pareceres_advogados_especialistas: (NOVO TAREFA-024) Dicionário com pareceres 
                                               de cada advogado especialista
+            ao_receber_fragmento: Callback de streaming da resposta compilada (opcional)
         
         Returns:
             Dict[str, Any]: Resposta compilada estruturada
@@ -880,6 +1005,80 @@ Agora, proceda com sua análise jurídica:
         print(resposta_final["parecer"])  # Análise jurídica completa e integrada
         ```
         """
+        pareceres_advogados_especialistas = pareceres_advogados_especialistas or {}
+        compilacao = self._preparar_compilacao(
+            pareceres_peritos, contexto_rag, pergunta_original, pareceres_advogados_especialistas
+        )
+        
+        # ===== ETAPA 4: CHAMAR LLM PARA COMPILAÇÃO =====
+        
+        try:
+            resposta_compilada = self.gerenciador_llm.chamar_llm(
+                **self._argumentos_da_chamada_llm_da_compilacao(compilacao["prompt"], ao_receber_fragmento)
+            )
+        except Exception as erro:
+            mensagem_erro = f"Erro ao compilar resposta: {str(erro)}"
+            logger.error(mensagem_erro, exc_info=True)
+            raise RuntimeError(mensagem_erro) from erro
+        
+        return self._montar_resposta_compilada(
+            compilacao, resposta_compilada, pareceres_peritos, pareceres_advogados_especialistas,
+            contexto_rag, pergunta_original, metadados_adicionais
+        )
+    
+    async def compilar_resposta_async(
+        self,
+        pareceres_peritos: Dict[str, Dict[str, Any]],
+        contexto_rag: List[str],
+        pergunta_original: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None,
+        pareceres_advogados_especialistas: Optional[Dict[str, Dict[str, Any]]] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de compilar_resposta() (mesmos parâmetros, mesmo retorno).
+        
+        CONTEXTO:
+        O OrquestradorMultiAgent compila a resposta dentro do event loop do
+        FastAPI. Com chamar_llm() a compilação bloqueava o loop inteiro (até
+        o timeout da chamada); aqui a chamada usa GerenciadorLLM.chamar_llm_async().
+        
+        Raises:
+            RuntimeError: Se a chamada ao LLM falhar
+        """
+        pareceres_advogados_especialistas = pareceres_advogados_especialistas or {}
+        compilacao = self._preparar_compilacao(
+            pareceres_peritos, contexto_rag, pergunta_original, pareceres_advogados_especialistas
+        )
+        
+        try:
+            resposta_compilada = await self.gerenciador_llm.chamar_llm_async(
+                **self._argumentos_da_chamada_llm_da_compilacao(compilacao["prompt"], ao_receber_fragmento)
+            )
+        except Exception as erro:
+            mensagem_erro = f"Erro ao compilar resposta: {str(erro)}"
+            logger.error(mensagem_erro, exc_info=True)
+            raise RuntimeError(mensagem_erro) from erro
+        
+        return self._montar_resposta_compilada(
+            compilacao, resposta_compilada, pareceres_peritos, pareceres_advogados_especialistas,
+            contexto_rag, pergunta_original, metadados_adicionais
+        )
+    
+    def _preparar_compilacao(
+        self,
+        pareceres_peritos: Dict[str, Dict[str, Any]],
+        contexto_rag: List[str],
+        pergunta_original: str,
+        pareceres_advogados_especialistas: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Separa pareceres com sucesso/erro e monta o prompt de compilação.
+        
+        Returns:
+            dict com "prompt", "peritos_com_sucesso", "peritos_com_erro",
+            "advogados_com_sucesso" e "advogados_com_erro"
+        """
         logger.info(
             f"📝 Compilando resposta final | "
             f"Peritos consultados: {list(pareceres_peritos.keys())} | "
@@ -931,10 +1130,6 @@ Agora, proceda com sua análise jurídica:
         advogados_com_erro = []
         pareceres_advogados_formatados_lista = []
         
-        # Garantir que pareceres_advogados_especialistas não seja None
-        if pareceres_advogados_especialistas is None:
-            pareceres_advogados_especialistas = {}
-        
         for identificador, parecer_data in pareceres_advogados_especialistas.items():
             if parecer_data.get("erro", False):
                 advogados_com_erro.append(identificador)
@@ -1049,23 +1244,52 @@ Compilar os pareceres técnicos E jurídicos acima em uma **resposta jurídica f
 Agora, proceda com a compilação:
 """
         
-        # ===== ETAPA 4: CHAMAR LLM PARA COMPILAÇÃO =====
-        
-        try:
-            resposta_compilada = self.gerenciador_llm.chamar_llm(
-                prompt=prompt_compilacao,
-                modelo=self.modelo_llm_padrao,
-                temperatura=self.temperatura_padrao,
-                mensagens_de_sistema=(
-                    "Você é um advogado coordenador responsável por integrar "
-                    "pareceres técnicos de múltiplos especialistas em uma "
-                    "resposta jurídica coesa, fundamentada e conclusiva."
-                ),
-            )
-        except Exception as erro:
-            mensagem_erro = f"Erro ao compilar resposta: {str(erro)}"
-            logger.error(mensagem_erro, exc_info=True)
-            raise RuntimeError(mensagem_erro) from erro
+        return {
+            "prompt": prompt_compilacao,
+            "peritos_com_sucesso": peritos_com_sucesso,
+            "peritos_com_erro": peritos_com_erro,
+            "advogados_com_sucesso": advogados_com_sucesso,
+            "advogados_com_erro": advogados_com_erro,
+        }
+    
+    def _argumentos_da_chamada_llm_da_compilacao(
+        self,
+        prompt_compilacao: str,
+        ao_receber_fragmento: Optional[CallbackDeFragmento]
+    ) -> Dict[str, Any]:
+        """
+        Argumentos de chamar_llm()/chamar_llm_async() para a compilação.
+        """
+        return dict(
+            prompt=prompt_compilacao,
+            modelo=self.modelo_llm_padrao,
+            temperatura=self.temperatura_padrao,
+            mensagens_de_sistema=(
+                "Você é um advogado coordenador responsável por integrar "
+                "pareceres técnicos de múltiplos especialistas em uma "
+                "resposta jurídica coesa, fundamentada e conclusiva."
+            ),
+            ao_receber_fragmento=ao_receber_fragmento,
+            agente=self.nome_do_agente,
+        )
+    
+    def _montar_resposta_compilada(
+        self,
+        compilacao: Dict[str, Any],
+        resposta_compilada: str,
+        pareceres_peritos: Dict[str, Dict[str, Any]],
+        pareceres_advogados_especialistas: Dict[str, Dict[str, Any]],
+        contexto_rag: List[str],
+        pergunta_original: str,
+        metadados_adicionais: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Calcula a confiança e formata a resposta compilada (ETAPAS 5 e 6).
+        """
+        peritos_com_sucesso = compilacao["peritos_com_sucesso"]
+        peritos_com_erro = compilacao["peritos_com_erro"]
+        advogados_com_sucesso = compilacao["advogados_com_sucesso"]
+        advogados_com_erro = compilacao["advogados_com_erro"]
         
         # ===== ETAPA 5: CALCULAR CONFIANÇA DA COMPILAÇÃO =====
         
@@ -23,20 +23,123 @@ DESIGN PATTERN:
 Esta classe usa o padrão Template Method: define o esqueleto do algoritmo
 (método processar), mas delega partes específicas para subclasses
 (método montar_prompt).
+
+LAYOUT DO PROMPT (cache de prompt do provedor):
+Agentes com usa_contexto_compartilhado=True enviam o prompt em três partes
+(PromptDoAgente): os documentos do caso, formatados de forma idêntica para
+todos os agentes (formatar_contexto_do_caso), as instruções fixas do agente
+como mensagem de sistema e, por último, a tarefa (metadados + pergunta).
+Como o provedor reaproveita prefixos idênticos, os agentes de uma mesma
+análise deixam de pagar o processamento integral da petição a cada chamada.
+
+CASCATA DE MODELOS (LLM_CASCATA_*):
+Com a cascata ativada, processar() chama primeiro um modelo menor/mais
+rápido, que termina a resposta com uma autoavaliação. A resposta só vai para
+o modelo principal do agente quando o modelo rápido pede escalonamento, falha
+ou a confiança heurística (_calcular_confianca) fica abaixo do mínimo. O nível
+que respondeu fica em metadados["cascata"].
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import logging
+import re
 
 # Importar o gerenciador de LLM para comunicação com OpenAI
-from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.configuracao.configuracoes import obter_configuracoes
+from src.utilitarios.gerenciador_llm import CallbackDeFragmento, GerenciadorLLM
+from src.utilitarios.orcamento_prompt import (
+    SECAO_DOCUMENTOS,
+    SECAO_PARECERES,
+    MontadorPromptComOrcamento,
+    ResultadoOrcamentoPrompt,
+    SecaoDoPrompt,
+)
 
 # Configuração do logger para este módulo
 logger = logging.getLogger(__name__)
 
 
+# ==============================================================================
+# CASCATA DE MODELOS
+# ==============================================================================
+
+# Nível da cascata que respondeu (metadados["cascata"]["nivel"])
+NIVEL_CASCATA_RAPIDO = "rapido"
+NIVEL_CASCATA_PRINCIPAL = "principal"
+
+# Autoavaliação pedida ao modelo rápido na última linha da resposta
+AUTOAVALIACAO_SUFICIENTE = "SUFICIENTE"
+AUTOAVALIACAO_ESCALAR = "ESCALAR"
+
+# Motivos de escalonamento para o modelo principal
+MOTIVO_ESCALONAMENTO_AUTOAVALIACAO = "autoavaliacao"
+MOTIVO_ESCALONAMENTO_CONFIANCA_BAIXA = "confianca_baixa"
+MOTIVO_ESCALONAMENTO_ERRO = "erro_no_modelo_rapido"
+
+# Anexada à tarefa (última parte do prompt) só na chamada ao modelo rápido,
+# para não alterar o prefixo compartilhado com os demais agentes
+INSTRUCAO_AUTOAVALIACAO = (
+    "AUTOAVALIAÇÃO (obrigatória): na última linha da resposta, escreva apenas "
+    f"'AUTOAVALIAÇÃO: {AUTOAVALIACAO_SUFICIENTE}' se o parecer responde à pergunta "
+    "de forma completa com base nos documentos (inclusive quando a questão não "
+    "envolve a sua área), ou "
+    f"'AUTOAVALIAÇÃO: {AUTOAVALIACAO_ESCALAR}' se a questão exige uma análise mais "
+    "aprofundada, envolve pontos controvertidos ou você não tem segurança na conclusão."
+)
+
+_PADRAO_AUTOAVALIACAO = re.compile(
+    r"[*_]*AUTOAVALIA[ÇC][ÃA]O[*_]*\s*:\s*[*_]*\s*"
+    rf"({AUTOAVALIACAO_SUFICIENTE}|{AUTOAVALIACAO_ESCALAR})\b[*_.]*\s*$",
+    re.IGNORECASE,
+)
+
+
+def separar_autoavaliacao(resposta: str) -> Tuple[str, Optional[str]]:
+    """
+    Separa a linha de autoavaliação do fim da resposta do modelo rápido.
+    
+    Args:
+        resposta: Texto devolvido pelo modelo rápido
+    
+    Returns:
+        (parecer sem a autoavaliação; AUTOAVALIACAO_SUFICIENTE,
+        AUTOAVALIACAO_ESCALAR ou None se o modelo não a escreveu)
+    """
+    correspondencia = _PADRAO_AUTOAVALIACAO.search(resposta)
+    if correspondencia is None:
+        return resposta, None
+    return resposta[:correspondencia.start()].rstrip(), correspondencia.group(1).upper()
+
+
+# ==============================================================================
+# MODELOS DE DADOS
+# ==============================================================================
+
+@dataclass
+class PromptDoAgente:
+    """
+    Prompt de um agente separado nas partes enviadas à API.
+    
+    ORDEM DAS MENSAGENS (ver GerenciadorLLM._montar_mensagens):
+    contexto_compartilhado (se houver) → mensagem_de_sistema → prompt
+    """
+    mensagem_de_sistema: str
+    prompt: str
+    # Documentos do caso, idênticos para todos os agentes da mesma análise
+    contexto_compartilhado: Optional[str] = None
+    
+    def texto_completo(self) -> str:
+        """
+        Todas as partes em um único texto (contagem de tokens e montar_prompt()).
+        """
+        return "\n\n".join(
+            parte for parte in (self.contexto_compartilhado, self.mensagem_de_sistema, self.prompt) if parte
+        )
+
+
 # ==============================================================================
 # CLASSE ABSTRATA BASE
 # ==============================================================================
@@ -53,6 +156,7 @@ class AgenteBase(ABC):
     
     FUNCIONALIDADES FORNECIDAS:
     1. Método processar() - Orquestra o fluxo de análise
+       (processar_async() faz o mesmo sem bloquear o event loop)
     2. Integração automática com GerenciadorLLM
     3. Logging padronizado
     4. Formatação de respostas
@@ -89,12 +193,39 @@ class AgenteBase(ABC):
         # 0.7 é um bom equilíbrio entre criatividade e consistência
         self.temperatura_padrao: float = 0.7
         
+        # Cache de respostas do LLM (ver LLM_CACHE_* em configuracoes.py)
+        # None = automático (só em temperatura baixa); True/False = opt-in/opt-out
+        self.usar_cache_llm: Optional[bool] = None
+        
+        # Orçamento de tokens do prompt (ver orcamento_prompt.py)
+        # None = LLM_ORCAMENTO_TOKENS_PROMPT; 0 = sem ajuste
+        self.orcamento_tokens_prompt: Optional[int] = None
+        
+        # Layout do prompt (ver montar_prompt_do_agente): True = documentos do
+        # caso como prefixo comum + instruções fixas na mensagem de sistema.
+        # Subclasses que ativam devem implementar montar_instrucoes_de_sistema()
+        # e montar_prompt_da_tarefa()
+        self.usa_contexto_compartilhado: bool = False
+        
+        # Cascata de modelos (ver LLM_CASCATA_* em configuracoes.py)
+        # None = configuração global; True/False = opt-in/opt-out do agente
+        self.usar_cascata_de_modelos: Optional[bool] = None
+        
+        # Modelo da primeira tentativa da cascata (None = LLM_CASCATA_MODELO_RAPIDO)
+        self.modelo_llm_rapido: Optional[str] = None
+        
         # Inicializar ou receber gerenciador de LLM
         self.gerenciador_llm = gerenciador_llm or GerenciadorLLM()
         
         # Contador de análises realizadas por este agente (estatística)
         self.numero_de_analises_realizadas: int = 0
         
+        # Análises respondidas por cada nível da cascata (estatística)
+        self.respostas_por_nivel_da_cascata: Dict[str, int] = {
+            NIVEL_CASCATA_RAPIDO: 0,
+            NIVEL_CASCATA_PRINCIPAL: 0,
+        }
+        
         logger.info(f"Agente '{self.nome_do_agente}' inicializado")
     
     @abstractmethod
@@ -133,6 +264,68 @@ class AgenteBase(ABC):
             f"A subclasse {self.__class__.__name__} deve implementar montar_prompt()"
         )
     
+    def montar_prompt_do_agente(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> PromptDoAgente:
+        """
+        Monta o prompt nas partes enviadas à API (ver PromptDoAgente).
+        
+        LAYOUTS:
+        - usa_contexto_compartilhado=False: mensagem de sistema padrão +
+          montar_prompt() (documentos, instruções e pergunta em uma mensagem)
+        - usa_contexto_compartilhado=True: documentos do caso como contexto
+          compartilhado (formatar_contexto_do_caso, igual para todos os
+          agentes), montar_instrucoes_de_sistema() como mensagem de sistema e
+          montar_prompt_da_tarefa() como prompt. Só o contexto compartilhado
+          varia entre análises e só a tarefa varia entre chamadas do agente.
+        
+        Returns:
+            PromptDoAgente
+        """
+        if not self.usa_contexto_compartilhado:
+            return PromptDoAgente(
+                mensagem_de_sistema=self._montar_mensagem_de_sistema(),
+                prompt=self.montar_prompt(contexto_de_documentos, pergunta_do_usuario, metadados_adicionais),
+            )
+        return PromptDoAgente(
+            mensagem_de_sistema=self.montar_instrucoes_de_sistema(),
+            prompt=self.montar_prompt_da_tarefa(pergunta_do_usuario, metadados_adicionais),
+            contexto_compartilhado=formatar_contexto_do_caso(contexto_de_documentos),
+        )
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Instruções FIXAS do agente (papel, método de análise, formato do parecer).
+        
+        Não podem depender dos documentos nem da pergunta: são enviadas como
+        mensagem de sistema e se repetem em todas as chamadas do agente.
+        
+        Returns:
+            str: Mensagem de sistema (padrão: _montar_mensagem_de_sistema())
+        """
+        return self._montar_mensagem_de_sistema()
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt (metadados da consulta + pergunta), enviada
+        depois dos documentos do caso e das instruções de sistema.
+        
+        Obrigatório para subclasses com usa_contexto_compartilhado=True.
+        
+        Raises:
+            NotImplementedError: Se a subclasse ativar o layout sem implementar
+        """
+        raise NotImplementedError(
+            f"A subclasse {self.__class__.__name__} deve implementar montar_prompt_da_tarefa()"
+        )
+    
     def processar(
         self,
         contexto_de_documentos: List[str],
@@ -140,6 +333,8 @@ class AgenteBase(ABC):
         metadados_adicionais: Optional[Dict[str, Any]] = None,
         modelo_customizado: Optional[str] = None,
         temperatura_customizada: Optional[float] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        secoes_dos_documentos: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Processa uma solicitação usando este agente.
@@ -147,7 +342,8 @@ class AgenteBase(ABC):
         FLUXO DE EXECUÇÃO:
         1. Validar entradas
         2. Montar prompt específico do agente (chama montar_prompt)
-        3. Chamar LLM via GerenciadorLLM
+        3. Chamar LLM via GerenciadorLLM (com a cascata ativada: modelo
+           rápido primeiro, modelo principal só se preciso)
         4. Formatar resposta em estrutura padronizada
         5. Registrar logs e estatísticas
         
@@ -159,8 +355,14 @@ class AgenteBase(ABC):
             contexto_de_documentos: Trechos relevantes dos documentos (do RAG)
             pergunta_do_usuario: Pergunta/solicitação original
             metadados_adicionais: Informações extras opcionais
-            modelo_customizado: Sobrescrever modelo padrão (opcional)
+            modelo_customizado: Sobrescrever modelo padrão (opcional; desliga a cascata)
             temperatura_customizada: Sobrescrever temperatura padrão (opcional)
+            ao_receber_fragmento: Callback de streaming; recebe cada fragmento do
+                parecer à medida que o LLM o gera (o retorno não muda). Resposta
+                aceita do modelo rápido da cascata chega em um único fragmento
+            secoes_dos_documentos: Seção de cada documento do contexto, paralela a
+                contexto_de_documentos (ex: ["peticao", "anexos", "anexos"]). Define
+                como o orçamento de tokens é dividido; None = uma única seção
         
         Returns:
             dict contendo:
@@ -170,13 +372,140 @@ class AgenteBase(ABC):
                 "confianca": float,               # Grau de confiança (0.0 a 1.0)
                 "timestamp": str,                 # Quando foi gerado
                 "modelo_utilizado": str,          # Modelo LLM usado
-                "metadados": dict,                # Informações adicionais
+                "metadados": dict,                # Informações adicionais (inclui
+                                                  # "orcamento_de_tokens" e "cascata")
             }
         
         Raises:
             ValueError: Se os parâmetros de entrada forem inválidos
             ErroGeralAPI: Se houver falha na comunicação com o LLM
         """
+        chamada = self._preparar_chamada_llm(
+            contexto_de_documentos=contexto_de_documentos,
+            pergunta_do_usuario=pergunta_do_usuario,
+            metadados_adicionais=metadados_adicionais,
+            modelo_customizado=modelo_customizado,
+            temperatura_customizada=temperatura_customizada,
+            secoes_dos_documentos=secoes_dos_documentos,
+        )
+        
+        # ===== ETAPA 3: CHAMADA AO LLM =====
+        
+        # Cascata: modelo rápido primeiro; o principal só responde se preciso
+        cascata = None
+        modelo_rapido = self._modelo_rapido_da_cascata(modelo_customizado)
+        if modelo_rapido is not None:
+            try:
+                resposta_rapida = self.gerenciador_llm.chamar_llm(
+                    **self._argumentos_da_chamada_llm(chamada, modelo_rapido=modelo_rapido)
+                )
+            except Exception as erro:
+                logger.warning(f"Modelo rápido '{modelo_rapido}' falhou; escalando para '{chamada['modelo']}': {erro}")
+                resposta_rapida = None
+            parecer_rapido, cascata = self._avaliar_resposta_rapida(chamada, modelo_rapido, resposta_rapida)
+            if parecer_rapido is not None:
+                return self._aceitar_resposta_rapida(
+                    chamada, parecer_rapido, cascata, metadados_adicionais, ao_receber_fragmento
+                )
+        
+        try:
+            parecer_gerado = self.gerenciador_llm.chamar_llm(
+                **self._argumentos_da_chamada_llm(chamada, ao_receber_fragmento=ao_receber_fragmento)
+            )
+        except Exception as erro:
+            mensagem_erro = f"Erro ao chamar LLM: {str(erro)}"
+            logger.error(mensagem_erro, exc_info=True)
+            raise
+        
+        return self._montar_resposta_estruturada(chamada, parecer_gerado, metadados_adicionais, cascata)
+    
+    async def processar_async(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None,
+        modelo_customizado: Optional[str] = None,
+        temperatura_customizada: Optional[float] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        secoes_dos_documentos: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de processar() (mesmos parâmetros, mesmo retorno).
+        
+        CONTEXTO:
+        Usada quando vários agentes rodam em paralelo dentro do event loop
+        (AgenteAdvogadoCoordenador, OrquestradorAnalisePeticoes). A chamada
+        ao LLM é feita com GerenciadorLLM.chamar_llm_async(), então cada
+        agente em espera custa uma corrotina em vez de uma thread.
+        
+        NOTA:
+        Validação, montagem do prompt, cascata de modelos e formatação da
+        resposta são as mesmas de processar() (métodos _preparar_chamada_llm,
+        _avaliar_resposta_rapida e _montar_resposta_estruturada); subclasses que sobrescrevem
+        montar_prompt() funcionam igual nos dois caminhos.
+        
+        Raises:
+            ValueError: Se os parâmetros de entrada forem inválidos
+            ErroGeralAPI: Se houver falha na comunicação com o LLM
+        """
+        chamada = self._preparar_chamada_llm(
+            contexto_de_documentos=contexto_de_documentos,
+            pergunta_do_usuario=pergunta_do_usuario,
+            metadados_adicionais=metadados_adicionais,
+            modelo_customizado=modelo_customizado,
+            temperatura_customizada=temperatura_customizada,
+            secoes_dos_documentos=secoes_dos_documentos,
+        )
+        
+        cascata = None
+        modelo_rapido = self._modelo_rapido_da_cascata(modelo_customizado)
+        if modelo_rapido is not None:
+            try:
+                resposta_rapida = await self.gerenciador_llm.chamar_llm_async(
+                    **self._argumentos_da_chamada_llm(chamada, modelo_rapido=modelo_rapido)
+                )
+            except Exception as erro:
+                logger.warning(f"Modelo rápido '{modelo_rapido}' falhou; escalando para '{chamada['modelo']}': {erro}")
+                resposta_rapida = None
+            parecer_rapido, cascata = self._avaliar_resposta_rapida(chamada, modelo_rapido, resposta_rapida)
+            if parecer_rapido is not None:
+                return self._aceitar_resposta_rapida(
+                    chamada, parecer_rapido, cascata, metadados_adicionais, ao_receber_fragmento
+                )
+        
+        try:
+            parecer_gerado = await self.gerenciador_llm.chamar_llm_async(
+                **self._argumentos_da_chamada_llm(chamada, ao_receber_fragmento=ao_receber_fragmento)
+            )
+        except Exception as erro:
+            mensagem_erro = f"Erro ao chamar LLM: {str(erro)}"
+            logger.error(mensagem_erro, exc_info=True)
+            raise
+        
+        return self._montar_resposta_estruturada(chamada, parecer_gerado, metadados_adicionais, cascata)
+    
+    def _preparar_chamada_llm(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]],
+        modelo_customizado: Optional[str],
+        temperatura_customizada: Optional[float],
+        secoes_dos_documentos: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Valida as entradas e monta tudo o que a chamada ao LLM precisa (etapas 1 e 2).
+        
+        Compartilhado por processar() e processar_async().
+        
+        Returns:
+            dict com "contexto_de_documentos" (já ajustado ao orçamento de
+            tokens), "prompt", "mensagem_de_sistema", "contexto_compartilhado"
+            (ver PromptDoAgente), "modelo", "temperatura" e "orcamento_de_tokens"
+        
+        Raises:
+            ValueError: Se os parâmetros de entrada forem inválidos ou o prompt falhar
+        """
         logger.info(
             f"Iniciando processamento com agente '{self.nome_do_agente}' | "
             f"Documentos no contexto: {len(contexto_de_documentos)}"
@@ -194,6 +523,11 @@ class AgenteBase(ABC):
             logger.error(mensagem_erro)
             raise ValueError(mensagem_erro)
         
+        if secoes_dos_documentos is not None and len(secoes_dos_documentos) != len(contexto_de_documentos):
+            mensagem_erro = "secoes_dos_documentos deve ter um item por documento de contexto_de_documentos"
+            logger.error(mensagem_erro)
+            raise ValueError(mensagem_erro)
+        
         # Se não houver contexto de documentos, criar aviso
         if not contexto_de_documentos:
             logger.warning(
@@ -203,23 +537,25 @@ class AgenteBase(ABC):
             contexto_de_documentos = [
                 "[Nenhum documento específico foi fornecido para análise]"
             ]
+            secoes_dos_documentos = None
         
         # ===== ETAPA 2: PREPARAÇÃO DO PROMPT =====
         
+        # Mensagem de sistema, documentos e tarefa (ver montar_prompt_do_agente),
+        # já ajustados ao orçamento de tokens
         try:
-            prompt_completo = self.montar_prompt(
+            contexto_de_documentos, prompt_do_agente, orcamento_de_tokens = self._montar_prompt_no_orcamento(
                 contexto_de_documentos=contexto_de_documentos,
+                secoes_dos_documentos=secoes_dos_documentos,
                 pergunta_do_usuario=pergunta_do_usuario,
-                metadados_adicionais=metadados_adicionais or {}
+                metadados_adicionais=metadados_adicionais or {},
             )
         except Exception as erro:
             mensagem_erro = f"Erro ao montar prompt: {str(erro)}"
             logger.error(mensagem_erro, exc_info=True)
             raise ValueError(mensagem_erro) from erro
         
-        logger.debug(f"Prompt montado (tamanho: {len(prompt_completo)} caracteres)")
-        
-        # ===== ETAPA 3: CHAMADA AO LLM =====
+        logger.debug(f"Prompt montado (tamanho: {len(prompt_do_agente.texto_completo())} caracteres)")
         
         # Determinar modelo e temperatura a usar
         modelo_a_usar = modelo_customizado or self.modelo_llm_padrao
@@ -229,20 +565,223 @@ class AgenteBase(ABC):
             else self.temperatura_padrao
         )
         
-        # Criar mensagem de sistema para contextualizar o LLM
-        mensagem_de_sistema = self._montar_mensagem_de_sistema()
+        return {
+            "contexto_de_documentos": contexto_de_documentos,
+            "prompt": prompt_do_agente.prompt,
+            "mensagem_de_sistema": prompt_do_agente.mensagem_de_sistema,
+            "contexto_compartilhado": prompt_do_agente.contexto_compartilhado,
+            "tamanho_do_prompt_caracteres": len(prompt_do_agente.texto_completo()),
+            "modelo": modelo_a_usar,
+            "temperatura": temperatura_a_usar,
+            "orcamento_de_tokens": orcamento_de_tokens.para_dict(),
+        }
+    
+    def _argumentos_da_chamada_llm(
+        self,
+        chamada: Dict[str, Any],
+        modelo_rapido: Optional[str] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+    ) -> Dict[str, Any]:
+        """
+        Argumentos de chamar_llm()/chamar_llm_async() para a chamada preparada.
         
-        try:
-            parecer_gerado = self.gerenciador_llm.chamar_llm(
-                prompt=prompt_completo,
-                modelo=modelo_a_usar,
-                temperatura=temperatura_a_usar,
-                mensagens_de_sistema=mensagem_de_sistema,
+        Args:
+            modelo_rapido: Se informado, monta a chamada do primeiro nível da
+                cascata: outro modelo e a tarefa seguida de INSTRUCAO_AUTOAVALIACAO
+                (sem streaming, pois a resposta ainda pode ser descartada)
+            ao_receber_fragmento: Callback de streaming (só no modelo principal)
+        """
+        prompt = chamada["prompt"]
+        if modelo_rapido is not None:
+            prompt = f"{prompt}\n\n{INSTRUCAO_AUTOAVALIACAO}"
+        return {
+            "prompt": prompt,
+            "modelo": modelo_rapido or chamada["modelo"],
+            "temperatura": chamada["temperatura"],
+            "mensagens_de_sistema": chamada["mensagem_de_sistema"],
+            "usar_cache": self.usar_cache_llm,
+            "ao_receber_fragmento": ao_receber_fragmento,
+            "agente": self.nome_do_agente,
+            "contexto_compartilhado": chamada["contexto_compartilhado"],
+        }
+    
+    def _modelo_rapido_da_cascata(self, modelo_customizado: Optional[str]) -> Optional[str]:
+        """
+        Modelo do primeiro nível da cascata, ou None se a cascata não se aplica.
+        
+        A cascata não se aplica quando está desativada (no agente ou em
+        LLM_CASCATA_ATIVADA), quando o modelo rápido é o próprio modelo do
+        agente ou quando o chamador escolheu um modelo_customizado.
+        """
+        if modelo_customizado:
+            return None
+        
+        configuracoes = obter_configuracoes()
+        usar_cascata = self.usar_cascata_de_modelos
+        if usar_cascata is None:
+            usar_cascata = configuracoes.LLM_CASCATA_ATIVADA
+        modelo_rapido = self.modelo_llm_rapido or configuracoes.LLM_CASCATA_MODELO_RAPIDO
+        
+        if not usar_cascata or not modelo_rapido or modelo_rapido == self.modelo_llm_padrao:
+            return None
+        return modelo_rapido
+    
+    def _avaliar_resposta_rapida(
+        self,
+        chamada: Dict[str, Any],
+        modelo_rapido: str,
+        resposta_rapida: Optional[str],
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Decide se a resposta do modelo rápido é aceita ou se a análise escala.
+        
+        CRITÉRIOS DE ESCALONAMENTO (nesta ordem):
+        1. O modelo rápido falhou (resposta_rapida=None)
+        2. A autoavaliação pediu escalonamento (AUTOAVALIACAO_ESCALAR)
+        3. _calcular_confianca() ficou abaixo de LLM_CASCATA_CONFIANCA_MINIMA
+        
+        Args:
+            chamada: Chamada preparada por _preparar_chamada_llm()
+            modelo_rapido: Modelo que gerou a resposta
+            resposta_rapida: Texto devolvido pelo modelo rápido (None = falhou)
+        
+        Returns:
+            (parecer sem a autoavaliação, ou None se for preciso escalar;
+            registro da cascata para metadados["cascata"])
+        """
+        parecer, autoavaliacao, confianca = None, None, None
+        if resposta_rapida is None:
+            motivo = MOTIVO_ESCALONAMENTO_ERRO
+        else:
+            parecer, autoavaliacao = separar_autoavaliacao(resposta_rapida)
+            confianca = self._calcular_confianca(parecer, chamada["contexto_de_documentos"])
+            motivo = None
+            if autoavaliacao == AUTOAVALIACAO_ESCALAR:
+                motivo = MOTIVO_ESCALONAMENTO_AUTOAVALIACAO
+            elif confianca < obter_configuracoes().LLM_CASCATA_CONFIANCA_MINIMA:
+                motivo = MOTIVO_ESCALONAMENTO_CONFIANCA_BAIXA
+        
+        registro = {
+            "nivel": NIVEL_CASCATA_PRINCIPAL if motivo else NIVEL_CASCATA_RAPIDO,
+            "modelo_rapido": modelo_rapido,
+            "confianca_do_modelo_rapido": confianca,
+            "autoavaliacao": autoavaliacao,
+            "motivo_do_escalonamento": motivo,
+        }
+        if motivo:
+            logger.info(
+                f"Cascata escalada para '{chamada['modelo']}' | Agente: {self.nome_do_agente} | Motivo: {motivo}"
             )
-        except Exception as erro:
-            mensagem_erro = f"Erro ao chamar LLM: {str(erro)}"
-            logger.error(mensagem_erro, exc_info=True)
-            raise
+            return None, registro
+        return parecer, registro
+    
+    def _aceitar_resposta_rapida(
+        self,
+        chamada: Dict[str, Any],
+        parecer: str,
+        cascata: Dict[str, Any],
+        metadados_adicionais: Optional[Dict[str, Any]],
+        ao_receber_fragmento: Optional[CallbackDeFragmento],
+    ) -> Dict[str, Any]:
+        """
+        Monta a resposta com o parecer do modelo rápido.
+        
+        Com streaming, o parecer é emitido em um único fragmento (como uma
+        resposta do cache); um callback com defeito não derruba a análise.
+        """
+        if ao_receber_fragmento is not None:
+            try:
+                ao_receber_fragmento(parecer)
+            except Exception as erro:
+                logger.warning(f"Callback de streaming falhou (resposta do modelo rápido): {erro}")
+        return self._montar_resposta_estruturada(
+            {**chamada, "modelo": cascata["modelo_rapido"]}, parecer, metadados_adicionais, cascata
+        )
+    
+    def _montar_prompt_no_orcamento(
+        self,
+        contexto_de_documentos: List[str],
+        secoes_dos_documentos: Optional[List[str]],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Dict[str, Any],
+        pareceres: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[str], PromptDoAgente, ResultadoOrcamentoPrompt]:
+        """
+        Chama montar_prompt_do_agente() com os documentos ajustados ao orçamento de tokens.
+        
+        IMPLEMENTAÇÃO:
+        Os documentos são agrupados por seção (secoes_dos_documentos) e
+        entregues ao MontadorPromptComOrcamento, que mede as instruções fixas
+        do agente (prompt completo, com a mensagem de sistema, montado com
+        documentos vazios), divide o restante
+        entre as seções e, se preciso, reduz cada documento aos trechos mais
+        relevantes para a pergunta e para a especialidade do agente.
+        
+        Args:
+            pareceres: (Opcional) Pareceres de outros agentes (nome → texto),
+                ajustados como a seção "pareceres" e repassados a
+                montar_prompt() em metadados_adicionais["pareceres"]
+                (Estrategista Processual e Prognóstico)
+        
+        Returns:
+            (documentos ajustados, na ordem original; PromptDoAgente; uso do orçamento)
+        """
+        rotulos = secoes_dos_documentos or [SECAO_DOCUMENTOS] * len(contexto_de_documentos)
+        secoes = [
+            SecaoDoPrompt(nome, [documento for documento, rotulo in zip(contexto_de_documentos, rotulos) if rotulo == nome])
+            for nome in dict.fromkeys(rotulos)
+        ]
+        if pareceres:
+            secoes.append(SecaoDoPrompt(SECAO_PARECERES, list(pareceres.values())))
+        
+        def remontar_documentos(textos_por_secao: Dict[str, List[str]]) -> List[str]:
+            restantes = {nome: iter(textos) for nome, textos in textos_por_secao.items()}
+            return [next(restantes[rotulo]) for rotulo in rotulos]
+        
+        def montar_partes(textos_por_secao: Dict[str, List[str]]) -> PromptDoAgente:
+            metadados = metadados_adicionais
+            if pareceres:
+                metadados = {**metadados_adicionais, "pareceres": dict(zip(pareceres, textos_por_secao[SECAO_PARECERES]))}
+            return self.montar_prompt_do_agente(
+                contexto_de_documentos=remontar_documentos(textos_por_secao),
+                pergunta_do_usuario=pergunta_do_usuario,
+                metadados_adicionais=metadados
+            )
+        
+        orcamento_total = self.orcamento_tokens_prompt
+        if orcamento_total is None:
+            orcamento_total = obter_configuracoes().LLM_ORCAMENTO_TOKENS_PROMPT
+        
+        _, resultado = MontadorPromptComOrcamento(orcamento_total).montar(
+            secoes=secoes,
+            montar=lambda textos_por_secao: montar_partes(textos_por_secao).texto_completo(),
+            consulta=f"{pergunta_do_usuario} {self.descricao_do_agente}",
+        )
+        return (
+            remontar_documentos(resultado.textos_por_secao),
+            montar_partes(resultado.textos_por_secao),
+            resultado,
+        )
+    
+    def _montar_resposta_estruturada(
+        self,
+        chamada: Dict[str, Any],
+        parecer_gerado: str,
+        metadados_adicionais: Optional[Dict[str, Any]],
+        cascata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Formata o parecer no dicionário padronizado e atualiza as estatísticas (etapas 4 e 5).
+        
+        Compartilhado por processar() e processar_async().
+        
+        Args:
+            cascata: Registro da cascata (ver _avaliar_resposta_rapida); None
+                quando a cascata não se aplicou
+        """
+        contexto_de_documentos = chamada["contexto_de_documentos"]
+        modelo_a_usar = chamada["modelo"]
+        temperatura_a_usar = chamada["temperatura"]
         
         # ===== ETAPA 4: FORMATAÇÃO DA RESPOSTA =====
         
@@ -265,8 +804,11 @@ class AgenteBase(ABC):
             "temperatura_utilizada": temperatura_a_usar,
             "metadados": {
                 "numero_de_documentos_analisados": len(contexto_de_documentos),
-                "tamanho_do_prompt_caracteres": len(prompt_completo),
+                "tamanho_do_prompt_caracteres": chamada["tamanho_do_prompt_caracteres"],
+                "contexto_compartilhado": chamada["contexto_compartilhado"] is not None,
                 "tamanho_da_resposta_caracteres": len(parecer_gerado),
+                "orcamento_de_tokens": chamada["orcamento_de_tokens"],
+                "cascata": cascata,
                 "metadados_adicionais_fornecidos": metadados_adicionais or {},
             }
         }
@@ -274,10 +816,12 @@ class AgenteBase(ABC):
         # ===== ETAPA 5: LOGGING E ESTATÍSTICAS =====
         
         self.numero_de_analises_realizadas += 1
+        if cascata is not None:
+            self.respostas_por_nivel_da_cascata[cascata["nivel"]] += 1
         
         logger.info(
             f"Processamento concluído | Agente: {self.nome_do_agente} | "
-            f"Confiança: {confianca:.2f} | "
+            f"Confiança: {confianca:.2f} | Modelo: {modelo_a_usar} | "
             f"Total de análises: {self.numero_de_analises_realizadas}"
         )
         
@@ -385,6 +929,7 @@ class AgenteBase(ABC):
             "numero_de_analises_realizadas": self.numero_de_analises_realizadas,
             "modelo_padrao": self.modelo_llm_padrao,
             "temperatura_padrao": self.temperatura_padrao,
+            "respostas_por_nivel_da_cascata": dict(self.respostas_por_nivel_da_cascata),
         }
 
 
@@ -425,6 +970,32 @@ def formatar_contexto_de_documentos(chunks_de_documentos: List[str]) -> str:
     return "\n".join(documentos_formatados)
 
 
+def formatar_contexto_do_caso(contexto_de_documentos: List[str]) -> str:
+    """
+    Formata os documentos do caso como contexto compartilhado entre agentes.
+    
+    CONTEXTO:
+    O texto não depende do agente: recebendo os mesmos documentos, todos os
+    agentes de uma análise enviam exatamente a mesma primeira mensagem, e o
+    cache de prompt do provedor reaproveita esse prefixo. Por isso nada
+    específico de agente (nome, instruções, pergunta) pode entrar aqui.
+    
+    Args:
+        contexto_de_documentos: Documentos do caso (petição, anexos, trechos do RAG)
+    
+    Returns:
+        str: Documentos numerados ("DOCUMENTO N:") sob um cabeçalho comum
+    """
+    return (
+        "# DOCUMENTOS DO CASO\n"
+        "\n"
+        "Os documentos abaixo são o material de análise. As instruções e a "
+        "tarefa vêm nas mensagens seguintes.\n"
+        "\n"
+        f"{formatar_contexto_de_documentos(contexto_de_documentos)}"
+    )
+
+
 def truncar_texto_se_necessario(texto: str, tamanho_maximo: int = 5000) -> str:
     """
     Trunca um texto se ele exceder o tamanho máximo.
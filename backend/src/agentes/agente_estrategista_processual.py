@@ -53,15 +53,16 @@ VERSÃO: 1.0.0
 DATA: 2025-10-25
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import json
 
 # Importar classe base de agentes
-from src.agentes.agente_base import AgenteBase
+from src.agentes.agente_base import AgenteBase, PromptDoAgente
 
 # Importar gerenciador de LLM
 from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.orcamento_prompt import SECAO_ANEXOS, SECAO_PETICAO
 
 # Importar modelos de dados
 from src.modelos.processo import (
@@ -157,6 +158,13 @@ class AgenteEstrategistaProcessual(AgenteBase):
         # Temperatura: baixa para objetividade (análise estratégica requer precisão)
         self.temperatura_padrao = 0.3
         
+        # Análise determinística: mesma entrada → reaproveita a resposta (LLM_CACHE_ATIVADO)
+        self.usar_cache_llm = True
+        
+        # Documentos do caso como prefixo comum aos agentes da análise e
+        # instruções fixas na mensagem de sistema (cache de prompt do provedor)
+        self.usa_contexto_compartilhado = True
+        
         logger.info(
             f"⚙️  Agente '{self.nome_do_agente}' inicializado. "
             f"Modelo: {self.modelo_llm_padrao}, Temperatura: {self.temperatura_padrao}"
@@ -171,17 +179,16 @@ class AgenteEstrategistaProcessual(AgenteBase):
         """
         Monta o prompt especializado para análise estratégica processual.
         
-        ESTRUTURA DO PROMPT:
-        1. Definição de papel (estrategista processual experiente)
-        2. Contexto fornecido (petição + documentos + pareceres)
-        3. Tarefa específica (elaborar estratégia e próximos passos)
-        4. Formato de saída estruturado (JSON com campos específicos)
-        5. Instruções de qualidade (objetividade, fundamentação, praticidade)
+        ESTRUTURA DO PROMPT (mesma ordem das mensagens enviadas à API):
+        1. Documentos do caso (formatar_contexto_do_caso, comum a todos os agentes)
+        2. Papel, tarefa, formato de saída JSON e diretrizes de qualidade
+           (montar_instrucoes_de_sistema)
+        3. Tipo de ação, pareceres e consulta (montar_prompt_da_tarefa)
         
-        NOTA IMPORTANTE:
-        Este método é herdado de AgenteBase, mas aqui é usado principalmente
-        pelo método analisar() customizado. O método processar() da base
-        também pode ser usado se necessário.
+        NOTA:
+        analisar() envia as três partes em mensagens separadas (ver
+        AgenteBase.montar_prompt_do_agente); este método devolve o mesmo
+        conteúdo em um único texto.
         
         Args:
             contexto_de_documentos: Trechos relevantes dos documentos do caso
@@ -191,43 +198,28 @@ class AgenteEstrategistaProcessual(AgenteBase):
         Returns:
             str: Prompt completo formatado para o LLM
         """
+        return self.montar_prompt_do_agente(
+            contexto_de_documentos,
+            pergunta_do_usuario,
+            metadados_adicionais
+        ).texto_completo()
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Papel do agente, tarefa, formato de saída e diretrizes de qualidade.
         
-        # Extrair metadados se fornecidos
-        tipo_acao = ""
-        pareceres_compilados = ""
-        
-        if metadados_adicionais:
-            tipo_acao = metadados_adicionais.get("tipo_acao", "")
-            pareceres = metadados_adicionais.get("pareceres", {})
-            
-            # Formatar pareceres para inclusão no prompt
-            if pareceres:
-                pareceres_compilados = "\n### PARECERES DE ESPECIALISTAS:\n\n"
-                for nome_agente, parecer in pareceres.items():
-                    pareceres_compilados += f"**{nome_agente}:**\n{parecer}\n\n"
-        
-        # Formatar contexto de documentos
-        contexto_formatado = "\n### DOCUMENTOS DO CASO:\n\n"
-        for idx, doc in enumerate(contexto_de_documentos, 1):
-            contexto_formatado += f"**Documento {idx}:**\n{doc}\n\n"
+        Parte fixa do prompt, enviada como mensagem de sistema.
         
-        # Montar prompt completo
-        prompt = f"""
-Você é um ESTRATEGISTA PROCESSUAL EXPERIENTE, especialista em planejamento tático
+        Returns:
+            str: Mensagem de sistema deste agente
+        """
+        return """Você é um ESTRATEGISTA PROCESSUAL EXPERIENTE, especialista em planejamento tático
 de litígios judiciais. Seu papel é analisar processos de forma ESTRATÉGICA e
 elaborar um PLANO DE AÇÃO claro, objetivo e fundamentado.
 
-## CONTEXTO DO CASO
-
-**Tipo de Ação:** {tipo_acao if tipo_acao else "Não especificado"}
-
-{contexto_formatado}
-
-{pareceres_compilados}
-
 ## SUA TAREFA
 
-Com base em TODOS os elementos acima (petição inicial, documentos anexados e
+Com base em TODOS os elementos do caso (petição inicial, documentos anexados e
 pareceres dos especialistas), você deve elaborar:
 
 1. **ESTRATÉGIA RECOMENDADA** (narrativa, 100-500 palavras):
@@ -261,24 +253,24 @@ pareceres dos especialistas), você deve elaborar:
 
 Estrutura EXATA obrigatória:
 
-{{
+{
   "estrategia_recomendada": "string (100-2000 caracteres)",
   "passos": [
-    {{
+    {
       "numero": 1,
       "descricao": "string (20-1000 caracteres)",
       "prazo_estimado": "string (ex: '15 dias')",
       "documentos_necessarios": ["string", "string"]
-    }}
+    }
   ],
   "caminhos_alternativos": [
-    {{
+    {
       "titulo": "string (5-200 caracteres)",
       "descricao": "string (20-1000 caracteres)",
       "quando_considerar": "string (20-500 caracteres)"
-    }}
+    }
   ]
-}}
+}
 
 ## DIRETRIZES DE QUALIDADE
 
@@ -291,6 +283,45 @@ Estrutura EXATA obrigatória:
 ❌ NÃO SEJA GENÉRICO: Evite "analisar", "avaliar", "considerar" sem detalhes
 ❌ NÃO IGNORE PARECERES: Use as análises dos especialistas como base
 ❌ NÃO SEJA IRREALISTA: Prazos e passos devem ser factíveis
+"""
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt: tipo de ação, pareceres e consulta.
+        
+        Args:
+            pergunta_do_usuario: Solicitação de análise estratégica
+            metadados_adicionais: Informações extras (tipo_acao, pareceres, etc.)
+        
+        Returns:
+            str: Tarefa a ser respondida com base nos DOCUMENTOS DO CASO
+        """
+        # Extrair metadados se fornecidos
+        tipo_acao = ""
+        pareceres_compilados = ""
+        
+        if metadados_adicionais:
+            tipo_acao = metadados_adicionais.get("tipo_acao", "")
+            pareceres = metadados_adicionais.get("pareceres", {})
+            
+            # Formatar pareceres para inclusão no prompt
+            if pareceres:
+                pareceres_compilados = "\n### PARECERES DE ESPECIALISTAS:\n\n"
+                for nome_agente, parecer in pareceres.items():
+                    pareceres_compilados += f"**{nome_agente}:**\n{parecer}\n\n"
+        
+        return f"""## CONTEXTO DO CASO
+
+**Tipo de Ação:** {tipo_acao if tipo_acao else "Não especificado"}
+
+O DOCUMENTO 1 dos DOCUMENTOS DO CASO é a petição inicial; os demais são
+documentos complementares.
+
+{pareceres_compilados}
 
 ## CONSULTA ESPECÍFICA
 
@@ -298,8 +329,6 @@ Estrutura EXATA obrigatória:
 
 Agora, analise estrategicamente este caso e forneça sua resposta em JSON.
 """
-        
-        return prompt
     
     def analisar(self, contexto: Dict[str, Any]) -> ProximosPassos:
         """
@@ -332,6 +361,67 @@ Agora, analise estrategicamente este caso e forneça sua resposta em JSON.
             ValueError: Se contexto inválido ou resposta do LLM não puder ser parseada
             Exception: Erros de comunicação com LLM ou validação Pydantic
         """
+        prompt_do_agente, _ = self._preparar_analise(contexto)
+        
+        # CHAMAR LLM
+        logger.info("🤖 Chamando LLM para análise estratégica...")
+        
+        try:
+            resposta_llm = self.gerenciador_llm.chamar_llm(
+                **self._argumentos_da_chamada_llm_da_analise(prompt_do_agente)
+            )
+            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
+        except Exception as e:
+            logger.error(f"❌ Erro ao chamar LLM: {str(e)}")
+            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        
+        return self._converter_resposta_da_analise(resposta_llm)
+    
+    async def analisar_async(self, contexto: Dict[str, Any]) -> Tuple[ProximosPassos, Dict[str, Any]]:
+        """
+        Versão assíncrona de analisar() (mesmo contexto).
+        
+        CONTEXTO:
+        Usada pelo OrquestradorAnalisePeticoes, que roda dentro do event loop:
+        a chamada ao LLM usa GerenciadorLLM.chamar_llm_async() e não bloqueia
+        o loop durante a análise (até o timeout da chamada).
+        
+        O uso do orçamento de tokens do prompt volta junto com o resultado (e
+        não num atributo do agente): a mesma instância atende análises
+        simultâneas de petições diferentes.
+        
+        Returns:
+            (ProximosPassos, uso do orçamento de tokens do prompt)
+        
+        Raises:
+            ValueError: Se contexto inválido ou resposta do LLM não puder ser parseada
+            Exception: Erros de comunicação com LLM ou validação Pydantic
+        """
+        prompt_do_agente, uso_do_orcamento = self._preparar_analise(contexto)
+        
+        logger.info("🤖 Chamando LLM para análise estratégica...")
+        
+        try:
+            resposta_llm = await self.gerenciador_llm.chamar_llm_async(
+                **self._argumentos_da_chamada_llm_da_analise(prompt_do_agente)
+            )
+            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
+        except Exception as e:
+            logger.error(f"❌ Erro ao chamar LLM: {str(e)}")
+            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        
+        return self._converter_resposta_da_analise(resposta_llm), uso_do_orcamento
+    
+    def _preparar_analise(self, contexto: Dict[str, Any]) -> Tuple[PromptDoAgente, Dict[str, Any]]:
+        """
+        Valida o contexto e monta o prompt da análise (comum a analisar e analisar_async).
+        
+        Returns:
+            (PromptDoAgente, uso do orçamento de tokens do prompt)
+        
+        Raises:
+            ValueError: Se o contexto for inválido
+        """
         
         logger.info("Iniciando análise estratégica processual")
         
@@ -353,13 +443,11 @@ Agora, analise estrategicamente este caso e forneça sua resposta em JSON.
         )
         
         # PREPARAR CONTEXTO PARA O PROMPT
-        # Combinar petição + documentos como "contexto_de_documentos"
-        contexto_de_documentos = [
-            f"[PETIÇÃO INICIAL]\n{peticao_inicial}"
-        ]
-        
-        for idx, doc in enumerate(documentos, 1):
-            contexto_de_documentos.append(f"[DOCUMENTO COMPLEMENTAR {idx}]\n{doc}")
+        # Petição + documentos sem rótulos: o mesmo contexto_de_documentos que
+        # o orquestrador envia aos advogados e peritos, para que a primeira
+        # mensagem (documentos do caso) seja idêntica e aproveite o cache de
+        # prompt do provedor. O rótulo da petição vai em montar_prompt_da_tarefa()
+        contexto_de_documentos = [peticao_inicial] + list(documentos)
         
         # Preparar metadados adicionais
         metadados_adicionais = {
@@ -374,33 +462,45 @@ Agora, analise estrategicamente este caso e forneça sua resposta em JSON.
         )
         
         # MONTAR PROMPT
-        prompt = self.montar_prompt(
+        # Petição, anexos e pareceres reduzidos aos trechos mais relevantes se
+        # passarem do orçamento de tokens
+        _, prompt_do_agente, uso_do_orcamento = self._montar_prompt_no_orcamento(
             contexto_de_documentos=contexto_de_documentos,
+            secoes_dos_documentos=[SECAO_PETICAO] + [SECAO_ANEXOS] * len(documentos),
             pergunta_do_usuario=pergunta,
-            metadados_adicionais=metadados_adicionais
+            metadados_adicionais=metadados_adicionais,
+            pareceres=pareceres,
         )
         
-        logger.info(f"📝 Prompt montado: {len(prompt)} caracteres")
+        logger.info(f"📝 Prompt montado: {len(prompt_do_agente.texto_completo())} caracteres")
         logger.info(f"🔧 Modelo: {self.modelo_llm_padrao}, Temperatura: {self.temperatura_padrao}, Max tokens: 4000")
         
-                # CHAMAR LLM
-        logger.info("🤖 Chamando LLM para análise estratégica...")
-        
-        try:
-            resposta_llm = self.gerenciador_llm.chamar_llm(
-                prompt=prompt,
-                modelo=self.modelo_llm_padrao,
-                temperatura=self.temperatura_padrao,
-                max_tokens=20000,  # ✅ Aumentado para 20000 para acomodar reasoning tokens do gpt-5-nano
-                response_schema=ProximosPassos  # ✅ STRUCTURED OUTPUTS: garante formato exato
-            )
-            
-            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao chamar LLM: {str(e)}")
-            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        return prompt_do_agente, uso_do_orcamento.para_dict()
+    
+    def _argumentos_da_chamada_llm_da_analise(self, prompt_do_agente: PromptDoAgente) -> Dict[str, Any]:
+        """
+        Argumentos de chamar_llm()/chamar_llm_async() para a análise.
+        """
+        return dict(
+            prompt=prompt_do_agente.prompt,
+            mensagens_de_sistema=prompt_do_agente.mensagem_de_sistema,
+            modelo=self.modelo_llm_padrao,
+            temperatura=self.temperatura_padrao,
+            max_tokens=20000,  # ✅ Aumentado para 20000 para acomodar reasoning tokens do gpt-5-nano
+            usar_cache=self.usar_cache_llm,
+            agente=self.nome_do_agente,
+            response_schema=ProximosPassos,  # ✅ STRUCTURED OUTPUTS: garante formato exato
+            contexto_compartilhado=prompt_do_agente.contexto_compartilhado
+        )
+    
+    def _converter_resposta_da_analise(self, resposta_llm: str) -> ProximosPassos:
+        """
+        Converte a resposta JSON do LLM em ProximosPassos (comum a analisar e analisar_async).
         
+        Raises:
+            ValueError: Se a resposta do LLM não puder ser parseada
+            Exception: Se a validação Pydantic falhar
+        """
         # PARSEAR RESPOSTA JSON
         logger.info("Parseando resposta JSON do LLM...")
         
@@ -129,6 +129,21 @@ class AgentePeritoMedico(AgenteBase):
             "Medicina Legal"
         ]
         
+        # Perfil de domínio usado na triagem de relevância dos orquestradores
+        # (triagem_relevancia.py): termos que indicam matéria médico-pericial
+        self.palavras_chave_especializacao = [
+            "laudo médico", "atestado", "atestado médico", "perícia médica", "CID",
+            "diagnóstico", "prontuário", "exame", "lesão", "fratura", "amputação",
+            "sequela", "incapacidade", "invalidez", "doença ocupacional",
+            "doença do trabalho", "LER", "DORT", "nexo causal", "nexo técnico",
+            "dano estético", "dano corporal", "afastamento", "auxílio-doença",
+            "cirurgia", "tratamento", "depressão", "burnout", "perda auditiva",
+        ]
+        
+        # Documentos do caso como prefixo comum aos agentes da análise e
+        # instruções fixas na mensagem de sistema (cache de prompt do provedor)
+        self.usa_contexto_compartilhado = True
+        
         logger.info(
             f"Agente '{self.nome_do_agente}' inicializado | "
             f"Modelo: {self.modelo_llm_padrao} | "
@@ -144,17 +159,15 @@ class AgentePeritoMedico(AgenteBase):
         """
         Monta o prompt específico para análise médica pericial.
         
-        ESTRUTURA DO PROMPT:
-        1. Definição do papel (perito médico especializado)
-        2. Contexto documental (laudos, exames, prontuários)
-        3. Pergunta específica do usuário
-        4. Instruções detalhadas para análise médica
-        5. Formato esperado do parecer
+        ESTRUTURA DO PROMPT (mesma ordem das mensagens enviadas à API):
+        1. Contexto documental (formatar_contexto_do_caso, comum a todos os agentes)
+        2. Papel, instruções de análise e formato do parecer (montar_instrucoes_de_sistema)
+        3. Metadados do processo e pergunta do usuário (montar_prompt_da_tarefa)
         
-        OBJETIVO:
-        Guiar o GPT-4 a responder como um perito médico experiente,
-        usando terminologia técnica apropriada, citando evidências
-        documentais e fundamentando conclusões.
+        NOTA:
+        processar() envia as três partes em mensagens separadas (ver
+        AgenteBase.montar_prompt_do_agente); este método devolve o mesmo
+        conteúdo em um único texto.
         
         Args:
             contexto_de_documentos: Trechos relevantes de documentos médicos
@@ -164,7 +177,7 @@ class AgentePeritoMedico(AgenteBase):
                                  especialidade médica requerida, etc.)
         
         Returns:
-            str: Prompt completo formatado para envio ao GPT-4
+            str: Prompt completo formatado para envio ao LLM
         """
         logger.debug(
             f"Montando prompt para análise médica | "
@@ -172,39 +185,27 @@ class AgentePeritoMedico(AgenteBase):
             f"Metadados: {bool(metadados_adicionais)}"
         )
         
-        # ===== SEÇÃO 1: DOCUMENTOS DISPONÍVEIS =====
-        
-        # Formatar lista de documentos de forma estruturada
-        documentos_formatados = self._formatar_documentos_para_prompt(
-            contexto_de_documentos
-        )
-        
-        # ===== SEÇÃO 2: METADADOS ADICIONAIS =====
-        
-        # Extrair informações úteis dos metadados (se fornecidos)
-        tipo_de_processo = ""
-        especialidade_requerida = ""
+        prompt_completo = self.montar_prompt_do_agente(
+            contexto_de_documentos,
+            pergunta_do_usuario,
+            metadados_adicionais
+        ).texto_completo()
         
-        if metadados_adicionais:
-            tipo_de_processo = metadados_adicionais.get("tipo_processo", "")
-            especialidade_requerida = metadados_adicionais.get(
-                "especialidade_medica", ""
-            )
+        logger.debug(f"Prompt montado com {len(prompt_completo)} caracteres")
         
-        # Seção de metadados (se disponíveis)
-        secao_metadados = ""
-        if tipo_de_processo or especialidade_requerida:
-            secao_metadados = "\n**INFORMAÇÕES DO PROCESSO:**\n"
-            if tipo_de_processo:
-                secao_metadados += f"- Tipo de processo: {tipo_de_processo}\n"
-            if especialidade_requerida:
-                secao_metadados += (
-                    f"- Especialidade médica requerida: {especialidade_requerida}\n"
-                )
+        return prompt_completo
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Papel do perito, instruções de análise e formato do parecer.
         
-        # ===== SEÇÃO 3: MONTAGEM DO PROMPT COMPLETO =====
+        Parte fixa do prompt, enviada como mensagem de sistema: não depende
+        dos documentos nem da pergunta.
         
-        prompt_completo = f"""Você é um PERITO MÉDICO altamente qualificado e experiente, com especialização em Medicina do Trabalho e Medicina Legal.
+        Returns:
+            str: Mensagem de sistema deste perito
+        """
+        return """Você é um PERITO MÉDICO altamente qualificado e experiente, com especialização em Medicina do Trabalho e Medicina Legal.
 
 Você está realizando uma PERÍCIA MÉDICA para um processo jurídico (trabalhista, previdenciário ou cível).
 
@@ -217,18 +218,6 @@ Sua análise deve ser:
 
 ---
 
-**DOCUMENTOS MÉDICOS DISPONÍVEIS PARA ANÁLISE:**
-
-{documentos_formatados}
-{secao_metadados}
----
-
-**QUESTÃO A SER RESPONDIDA:**
-
-{pergunta_do_usuario}
-
----
-
 **INSTRUÇÕES PARA SUA ANÁLISE:**
 
 1. **IDENTIFICAÇÃO DE DIAGNÓSTICOS:**
@@ -294,13 +283,54 @@ Sua análise deve ser:
 - Use o padrão "Conforme documento X: [citação]" para fundamentar afirmações
 - Mantenha postura científica e imparcial
 - Se a questão requerer conhecimento de especialidade médica específica, indique isso
-
-Agora, realize a perícia médica respondendo à questão acima.
 """
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt: informações do processo e questão pericial.
         
-        logger.debug(f"Prompt montado com {len(prompt_completo)} caracteres")
+        Args:
+            pergunta_do_usuario: Pergunta específica sobre análise médica
+            metadados_adicionais: Informações extras (ex: tipo de processo,
+                                 especialidade médica requerida, etc.)
         
-        return prompt_completo
+        Returns:
+            str: Tarefa a ser respondida com base nos DOCUMENTOS DO CASO
+        """
+        # Extrair informações úteis dos metadados (se fornecidos)
+        tipo_de_processo = ""
+        especialidade_requerida = ""
+        
+        if metadados_adicionais:
+            tipo_de_processo = metadados_adicionais.get("tipo_processo", "")
+            especialidade_requerida = metadados_adicionais.get(
+                "especialidade_medica", ""
+            )
+        
+        # Seção de metadados (se disponíveis)
+        secao_metadados = ""
+        if tipo_de_processo or especialidade_requerida:
+            secao_metadados = "**INFORMAÇÕES DO PROCESSO:**\n"
+            if tipo_de_processo:
+                secao_metadados += f"- Tipo de processo: {tipo_de_processo}\n"
+            if especialidade_requerida:
+                secao_metadados += (
+                    f"- Especialidade médica requerida: {especialidade_requerida}\n"
+                )
+        
+        return f"""{secao_metadados}
+**QUESTÃO A SER RESPONDIDA:**
+
+{pergunta_do_usuario}
+
+---
+
+Agora, realize a perícia médica respondendo à questão acima.
+"""
     
     def gerar_parecer(
         self,
@@ -518,62 +548,6 @@ Agora, realize a perícia médica respondendo à questão acima.
             pergunta_do_usuario=pergunta_incapacidade,
             metadados_adicionais=metadados_enriquecidos,
         )
-    
-    # ==========================================================================
-    # MÉTODOS AUXILIARES PRIVADOS
-    # ==========================================================================
-    
-    def _formatar_documentos_para_prompt(
-        self,
-        documentos: List[str]
-    ) -> str:
-        """
-        Formata a lista de documentos de forma estruturada para o prompt.
-        
-        OBJETIVO:
-        Transformar lista de strings em uma seção formatada e numerada,
-        facilitando a referência a documentos específicos no parecer.
-        
-        Args:
-            documentos: Lista de trechos de documentos médicos
-        
-        Returns:
-            str: Documentos formatados com numeração
-        
-        EXEMPLO:
-            Input: ["Laudo médico: ...", "Exame de sangue: ..."]
-            
-            Output:
-            '''
-            [DOCUMENTO 1]
-            Laudo médico: ...
-            
-            [DOCUMENTO 2]
-            Exame de sangue: ...
-            '''
-        """
-        if not documentos:
-            return "[Nenhum documento médico disponível para análise]"
-        
-        # Formatar cada documento com numeração
-        documentos_formatados_lista = []
-        
-        for indice, documento in enumerate(documentos, start=1):
-            # Limpar espaços em branco extras
-            documento_limpo = documento.strip()
-            
-            # Formatar com numeração
-            documento_formatado = (
-                f"[DOCUMENTO {indice}]\n"
-                f"{documento_limpo}\n"
-            )
-            
-            documentos_formatados_lista.append(documento_formatado)
-        
-        # Juntar todos os documentos com separador
-        resultado = "\n".join(documentos_formatados_lista)
-        
-        return resultado
 
 
 # ==============================================================================
@@ -155,6 +155,18 @@ class AgentePeritoSegurancaTrabalho(AgenteBase):
             "Proteção contra Incêndio"
         ]
         
+        # Perfil de domínio usado na triagem de relevância dos orquestradores
+        # (triagem_relevancia.py): termos que indicam matéria de segurança do trabalho
+        self.palavras_chave_especializacao = [
+            "acidente de trabalho", "acidente", "CAT", "EPI", "EPC",
+            "equipamento de proteção", "norma regulamentadora", "NR",
+            "insalubridade", "periculosidade", "insalubre", "perigoso",
+            "PPRA", "PGR", "PCMSO", "LTCAT", "PPP", "CIPA", "SESMT",
+            "ergonomia", "máquina", "prensa", "trabalho em altura",
+            "espaço confinado", "agente nocivo", "ruído", "treinamento",
+            "fiscalização", "condições de trabalho",
+        ]
+        
         # Normas Regulamentadoras de referência
         # (lista para facilitar citações no prompt)
         self.normas_regulamentadoras_principais = {
@@ -173,6 +185,10 @@ class AgentePeritoSegurancaTrabalho(AgenteBase):
             "NR-35": "Trabalho em Altura"
         }
         
+        # Documentos do caso como prefixo comum aos agentes da análise e
+        # instruções fixas na mensagem de sistema (cache de prompt do provedor)
+        self.usa_contexto_compartilhado = True
+        
         logger.info(
             f"Agente '{self.nome_do_agente}' inicializado | "
             f"Modelo: {self.modelo_llm_padrao} | "
@@ -188,17 +204,15 @@ class AgentePeritoSegurancaTrabalho(AgenteBase):
         """
         Monta o prompt específico para análise de segurança do trabalho.
         
-        ESTRUTURA DO PROMPT:
-        1. Definição do papel (perito de segurança do trabalho)
-        2. Contexto documental (PPRA, laudos, relatórios de acidente, etc.)
-        3. Pergunta específica do usuário
-        4. Instruções detalhadas para análise de segurança
-        5. Formato esperado do parecer
+        ESTRUTURA DO PROMPT (mesma ordem das mensagens enviadas à API):
+        1. Contexto documental (formatar_contexto_do_caso, comum a todos os agentes)
+        2. Papel, instruções de análise e formato do parecer (montar_instrucoes_de_sistema)
+        3. Metadados do processo e pergunta do usuário (montar_prompt_da_tarefa)
         
-        OBJETIVO:
-        Guiar o GPT-4 a responder como um engenheiro ou técnico de segurança
-        do trabalho experiente, citando NRs aplicáveis, identificando riscos
-        e não conformidades, e propondo medidas corretivas.
+        NOTA:
+        processar() envia as três partes em mensagens separadas (ver
+        AgenteBase.montar_prompt_do_agente); este método devolve o mesmo
+        conteúdo em um único texto.
         
         Args:
             contexto_de_documentos: Trechos relevantes de documentos de segurança
@@ -208,7 +222,7 @@ class AgentePeritoSegurancaTrabalho(AgenteBase):
                                  econômica, setor, etc.)
         
         Returns:
-            str: Prompt completo formatado para envio ao GPT-4
+            str: Prompt completo formatado para envio ao LLM
         """
         logger.debug(
             f"Montando prompt para análise de segurança do trabalho | "
@@ -216,39 +230,27 @@ class AgentePeritoSegurancaTrabalho(AgenteBase):
             f"Metadados: {bool(metadados_adicionais)}"
         )
         
-        # ===== SEÇÃO 1: DOCUMENTOS DISPONÍVEIS =====
-        
-        # Formatar lista de documentos de forma estruturada
-        documentos_formatados = self._formatar_documentos_para_prompt(
-            contexto_de_documentos
-        )
-        
-        # ===== SEÇÃO 2: METADADOS ADICIONAIS =====
-        
-        # Extrair informações úteis dos metadados (se fornecidos)
-        tipo_de_processo = ""
-        atividade_economica = ""
-        setor_empresa = ""
+        prompt_completo = self.montar_prompt_do_agente(
+            contexto_de_documentos,
+            pergunta_do_usuario,
+            metadados_adicionais
+        ).texto_completo()
         
-        if metadados_adicionais:
-            tipo_de_processo = metadados_adicionais.get("tipo_processo", "")
-            atividade_economica = metadados_adicionais.get("atividade_economica", "")
-            setor_empresa = metadados_adicionais.get("setor", "")
+        logger.debug(f"Prompt montado com {len(prompt_completo)} caracteres")
         
-        # Seção de metadados (se disponíveis)
-        secao_metadados = ""
-        if tipo_de_processo or atividade_economica or setor_empresa:
-            secao_metadados = "\n**INFORMAÇÕES DO PROCESSO/EMPRESA:**\n"
-            if tipo_de_processo:
-                secao_metadados += f"- Tipo de processo: {tipo_de_processo}\n"
-            if atividade_economica:
-                secao_metadados += f"- Atividade econômica: {atividade_economica}\n"
-            if setor_empresa:
-                secao_metadados += f"- Setor: {setor_empresa}\n"
+        return prompt_completo
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Papel do perito, instruções de análise e formato do parecer.
         
-        # ===== SEÇÃO 3: MONTAGEM DO PROMPT COMPLETO =====
+        Parte fixa do prompt, enviada como mensagem de sistema: não depende
+        dos documentos nem da pergunta.
         
-        prompt_completo = f"""Você é um ENGENHEIRO/TÉCNICO DE SEGURANÇA DO TRABALHO altamente qualificado e experiente, com profundo conhecimento das Normas Regulamentadoras (NRs) do Ministério do Trabalho e Emprego.
+        Returns:
+            str: Mensagem de sistema deste perito
+        """
+        return """Você é um ENGENHEIRO/TÉCNICO DE SEGURANÇA DO TRABALHO altamente qualificado e experiente, com profundo conhecimento das Normas Regulamentadoras (NRs) do Ministério do Trabalho e Emprego.
 
 Você está realizando uma PERÍCIA TÉCNICA em Segurança e Saúde Ocupacional para um processo jurídico (trabalhista, cível ou previdenciário).
 
@@ -262,18 +264,6 @@ Sua análise deve ser:
 
 ---
 
-**DOCUMENTOS DE SEGURANÇA DO TRABALHO DISPONÍVEIS PARA ANÁLISE:**
-
-{documentos_formatados}
-{secao_metadados}
----
-
-**QUESTÃO A SER RESPONDIDA:**
-
-{pergunta_do_usuario}
-
----
-
 **INSTRUÇÕES PARA SUA ANÁLISE:**
 
 1. **IDENTIFICAÇÃO DE RISCOS OCUPACIONAIS:**
@@ -383,13 +373,54 @@ Sua análise deve ser:
 4. CONTROLES ADMINISTRATIVOS (procedimentos, treinamentos)
 5. EPCs (Equipamentos de Proteção Coletiva)
 6. EPIs (Equipamentos de Proteção Individual) - último recurso
-
-Agora, realize a perícia técnica em segurança do trabalho respondendo à questão acima.
 """
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt: informações do processo e questão pericial.
         
-        logger.debug(f"Prompt montado com {len(prompt_completo)} caracteres")
+        Args:
+            pergunta_do_usuario: Pergunta específica sobre segurança do trabalho
+            metadados_adicionais: Informações extras (tipo de processo, atividade
+                                 econômica, setor, etc.)
         
-        return prompt_completo
+        Returns:
+            str: Tarefa a ser respondida com base nos DOCUMENTOS DO CASO
+        """
+        # Extrair informações úteis dos metadados (se fornecidos)
+        tipo_de_processo = ""
+        atividade_economica = ""
+        setor_empresa = ""
+        
+        if metadados_adicionais:
+            tipo_de_processo = metadados_adicionais.get("tipo_processo", "")
+            atividade_economica = metadados_adicionais.get("atividade_economica", "")
+            setor_empresa = metadados_adicionais.get("setor", "")
+        
+        # Seção de metadados (se disponíveis)
+        secao_metadados = ""
+        if tipo_de_processo or atividade_economica or setor_empresa:
+            secao_metadados = "**INFORMAÇÕES DO PROCESSO/EMPRESA:**\n"
+            if tipo_de_processo:
+                secao_metadados += f"- Tipo de processo: {tipo_de_processo}\n"
+            if atividade_economica:
+                secao_metadados += f"- Atividade econômica: {atividade_economica}\n"
+            if setor_empresa:
+                secao_metadados += f"- Setor: {setor_empresa}\n"
+        
+        return f"""{secao_metadados}
+**QUESTÃO A SER RESPONDIDA:**
+
+{pergunta_do_usuario}
+
+---
+
+Agora, realize a perícia técnica em segurança do trabalho respondendo à questão acima.
+"""
     
     def gerar_parecer(
         self,
@@ -750,62 +781,6 @@ Agora, realize a perícia técnica em segurança do trabalho respondendo à ques
             pergunta_do_usuario=pergunta_caracterizacao,
             metadados_adicionais=metadados_enriquecidos,
         )
-    
-    # ==========================================================================
-    # MÉTODOS AUXILIARES PRIVADOS
-    # ==========================================================================
-    
-    def _formatar_documentos_para_prompt(
-        self,
-        documentos: List[str]
-    ) -> str:
-        """
-        Formata a lista de documentos de forma estruturada para o prompt.
-        
-        OBJETIVO:
-        Transformar lista de strings em uma seção formatada e numerada,
-        facilitando a referência a documentos específicos no parecer.
-        
-        Args:
-            documentos: Lista de trechos de documentos de segurança do trabalho
-        
-        Returns:
-            str: Documentos formatados com numeração
-        
-        EXEMPLO:
-            Input: ["PPRA: Identificado ruído...", "CAT: Acidente em..."]
-            
-            Output:
-            '''
-            [DOCUMENTO 1]
-            PPRA: Identificado ruído...
-            
-            [DOCUMENTO 2]
-            CAT: Acidente em...
-            '''
-        """
-        if not documentos:
-            return "[Nenhum documento de segurança do trabalho disponível para análise]"
-        
-        # Formatar cada documento com numeração
-        documentos_formatados_lista = []
-        
-        for indice, documento in enumerate(documentos, start=1):
-            # Limpar espaços em branco extras
-            documento_limpo = documento.strip()
-            
-            # Formatar com numeração
-            documento_formatado = (
-                f"[DOCUMENTO {indice}]\n"
-                f"{documento_limpo}\n"
-            )
-            
-            documentos_formatados_lista.append(documento_formatado)
-        
-        # Juntar todos os documentos com separador
-        resultado = "\n".join(documentos_formatados_lista)
-        
-        return resultado
 
 
 # ==============================================================================
@@ -57,15 +57,16 @@ VERSÃO: 1.0.0
 DATA: 2025-10-25
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import json
 
 # Importar classe base de agentes
-from src.agentes.agente_base import AgenteBase
+from src.agentes.agente_base import AgenteBase, PromptDoAgente
 
 # Importar gerenciador de LLM
 from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.orcamento_prompt import SECAO_ANEXOS, SECAO_PETICAO
 
 # Importar modelos de dados
 from src.modelos.processo import (
@@ -150,6 +151,13 @@ class AgentePrognostico(AgenteBase):
         # Prognóstico não deve ser criativo, deve ser realista e consistente
         self.temperatura_padrao = 0.2
         
+        # Análise determinística: mesma entrada → reaproveita a resposta (LLM_CACHE_ATIVADO)
+        self.usar_cache_llm = True
+        
+        # Documentos do caso como prefixo comum aos agentes da análise e
+        # instruções fixas na mensagem de sistema (cache de prompt do provedor)
+        self.usa_contexto_compartilhado = True
+        
         logger.info(
             f"⚙️  Agente '{self.nome_do_agente}' inicializado "
             f"(modelo: {self.modelo_llm_padrao}, temperatura: {self.temperatura_padrao})"
@@ -164,21 +172,16 @@ class AgentePrognostico(AgenteBase):
         """
         Monta o prompt especializado para análise de prognóstico.
         
-        ESTRATÉGIA DE PROMPT ENGINEERING:
-        1. Definir papel claro (analista de prognóstico experiente)
-        2. Fornecer contexto completo (petição + docs + pareceres + estratégia)
-        3. Instruir sobre cenários possíveis e formato de saída
-        4. Exigir estrutura JSON estrita para facilitar parsing
-        5. Fornecer diretrizes de qualidade (realismo, fundamentação)
-        
-        ESTRUTURA DO PROMPT:
-        - Papel e expertise do agente
-        - Contexto completo do caso
-        - Pareceres de especialistas
-        - Estratégia recomendada (se disponível)
-        - Tarefa específica (gerar prognóstico com probabilidades)
-        - Formato de saída JSON estruturado
-        - Diretrizes de qualidade
+        ESTRUTURA DO PROMPT (mesma ordem das mensagens enviadas à API):
+        1. Documentos do caso (formatar_contexto_do_caso, comum a todos os agentes)
+        2. Papel, tarefa, formato de saída JSON e diretrizes de qualidade
+           (montar_instrucoes_de_sistema)
+        3. Tipo de ação, pareceres e consulta (montar_prompt_da_tarefa)
+        
+        NOTA:
+        analisar() envia as três partes em mensagens separadas (ver
+        AgenteBase.montar_prompt_do_agente); este método devolve o mesmo
+        conteúdo em um único texto.
         
         Args:
             contexto_de_documentos: Lista de textos (petição + documentos complementares)
@@ -188,54 +191,29 @@ class AgentePrognostico(AgenteBase):
         Returns:
             str: Prompt completo formatado para o LLM
         """
+        return self.montar_prompt_do_agente(
+            contexto_de_documentos,
+            pergunta_do_usuario,
+            metadados_adicionais
+        ).texto_completo()
+    
+    def montar_instrucoes_de_sistema(self) -> str:
+        """
+        Papel do agente, tarefa, formato de saída e diretrizes de qualidade.
         
-        # Extrair metadados se disponíveis
-        tipo_acao = ""
-        pareceres_compilados = ""
-        estrategia_recomendada = ""
-        
-        if metadados_adicionais:
-            tipo_acao = metadados_adicionais.get("tipo_acao", "")
-            pareceres = metadados_adicionais.get("pareceres", {})
-            estrategia = metadados_adicionais.get("estrategia", {})
-            
-            # Formatar pareceres para inclusão no prompt
-            if pareceres:
-                pareceres_compilados = "\n### PARECERES DE ESPECIALISTAS:\n\n"
-                for nome_agente, parecer in pareceres.items():
-                    pareceres_compilados += f"**{nome_agente}:**\n{parecer}\n\n"
-            
-            # Formatar estratégia se disponível
-            if estrategia:
-                estrategia_texto = estrategia.get("estrategia_recomendada", "")
-                if estrategia_texto:
-                    estrategia_recomendada = f"\n### ESTRATÉGIA RECOMENDADA:\n\n{estrategia_texto}\n\n"
-        
-        # Formatar contexto de documentos
-        contexto_formatado = "\n### DOCUMENTOS DO CASO:\n\n"
-        for idx, doc in enumerate(contexto_de_documentos, 1):
-            contexto_formatado += f"**Documento {idx}:**\n{doc}\n\n"
+        Parte fixa do prompt, enviada como mensagem de sistema.
         
-        # Montar prompt completo
-        prompt = f"""
-Você é um ANALISTA DE PROGNÓSTICO PROCESSUAL altamente experiente, especializado
+        Returns:
+            str: Mensagem de sistema deste agente
+        """
+        return """Você é um ANALISTA DE PROGNÓSTICO PROCESSUAL altamente experiente, especializado
 em análise probabilística de desfechos de processos judiciais. Seu papel é
 fornecer estimativas REALISTAS e FUNDAMENTADAS sobre as chances de sucesso
 em diferentes cenários.
 
-## CONTEXTO DO CASO
-
-**Tipo de Ação:** {tipo_acao if tipo_acao else "Não especificado"}
-
-{contexto_formatado}
-
-{pareceres_compilados}
-
-{estrategia_recomendada}
-
 ## SUA TAREFA
 
-Com base em TODOS os elementos acima (petição, documentos, pareceres de
+Com base em TODOS os elementos do caso (petição, documentos, pareceres de
 especialistas e estratégia recomendada), você deve elaborar um PROGNÓSTICO
 PROBABILÍSTICO completo, incluindo:
 
@@ -256,10 +234,10 @@ PROBABILÍSTICO completo, incluindo:
      (100-1000 caracteres)
    
    - **valores_estimados**: objeto JSON com valores em Reais
-     {{
+     {
        "receber": 50000.00,  // Valor que o cliente receberia
        "pagar": 0.00         // Valor que o cliente pagaria (custas, honorários)
-     }}
+     }
    
    - **tempo_estimado_meses**: tempo até conclusão neste cenário (número inteiro)
 
@@ -278,33 +256,33 @@ PROBABILÍSTICO completo, incluindo:
 Responda EXCLUSIVAMENTE em JSON, seguindo esta estrutura EXATA:
 
 ```json
-{{
+{
   "cenarios": [
-    {{
+    {
       "tipo": "vitoria_parcial",
       "probabilidade_percentual": 45.0,
       "descricao": "string (20-1000 caracteres)",
-      "valores_estimados": {{
+      "valores_estimados": {
         "receber": 50000.00,
         "pagar": 0.00
-      }},
+      },
       "tempo_estimado_meses": 18
-    }},
-    {{
+    },
+    {
       "tipo": "acordo",
       "probabilidade_percentual": 30.0,
       "descricao": "string (20-1000 caracteres)",
-      "valores_estimados": {{
+      "valores_estimados": {
         "receber": 30000.00,
         "pagar": 0.00
-      }},
+      },
       "tempo_estimado_meses": 6
-    }},
+    },
     ...
   ],
   "cenario_mais_provavel": "Vitória parcial com redução de 50% no valor da indenização",
   "recomendacao_geral": "Recomenda-se prosseguir com o processo, mas manter abertura para acordo se a oferta superar R$ 40.000 (ponto de equilíbrio considerando custos e tempo). O risco de derrota total é baixo (5%), mas o cenário de vitória parcial é mais provável que vitória total."
-}}
+}
 ```
 
 ## DIRETRIZES DE QUALIDADE
@@ -330,6 +308,55 @@ ANTES de gerar sua resposta, VERIFIQUE:
 3. ✓ Valores estimados são números (não strings)?
 4. ✓ Tempo estimado é número inteiro positivo?
 5. ✓ Descrições são detalhadas e fundamentadas?
+"""
+    
+    def montar_prompt_da_tarefa(
+        self,
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Parte variável do prompt: tipo de ação, pareceres e consulta.
+        
+        Args:
+            pergunta_do_usuario: Pergunta/solicitação específica (geralmente padrão)
+            metadados_adicionais: Dict com tipo_acao, pareceres, estrategia (opcional)
+        
+        Returns:
+            str: Tarefa a ser respondida com base nos DOCUMENTOS DO CASO
+        """
+        # Extrair metadados se disponíveis
+        tipo_acao = ""
+        pareceres_compilados = ""
+        estrategia_recomendada = ""
+        
+        if metadados_adicionais:
+            tipo_acao = metadados_adicionais.get("tipo_acao", "")
+            pareceres = metadados_adicionais.get("pareceres", {})
+            estrategia = metadados_adicionais.get("estrategia", {})
+            
+            # Formatar pareceres para inclusão no prompt
+            if pareceres:
+                pareceres_compilados = "\n### PARECERES DE ESPECIALISTAS:\n\n"
+                for nome_agente, parecer in pareceres.items():
+                    pareceres_compilados += f"**{nome_agente}:**\n{parecer}\n\n"
+            
+            # Formatar estratégia se disponível
+            if estrategia:
+                estrategia_texto = estrategia.get("estrategia_recomendada", "")
+                if estrategia_texto:
+                    estrategia_recomendada = f"\n### ESTRATÉGIA RECOMENDADA:\n\n{estrategia_texto}\n\n"
+        
+        return f"""## CONTEXTO DO CASO
+
+**Tipo de Ação:** {tipo_acao if tipo_acao else "Não especificado"}
+
+O DOCUMENTO 1 dos DOCUMENTOS DO CASO é a petição inicial; os demais são
+documentos complementares.
+
+{pareceres_compilados}
+
+{estrategia_recomendada}
 
 ## CONSULTA ESPECÍFICA
 
@@ -337,8 +364,6 @@ ANTES de gerar sua resposta, VERIFIQUE:
 
 Agora, analise probabilisticamente este caso e forneça seu prognóstico em JSON.
 """
-        
-        return prompt
     
     def analisar(self, contexto: Dict[str, Any]) -> Prognostico:
         """
@@ -406,6 +431,67 @@ Agora, analise probabilisticamente este caso e forneça seu prognóstico em JSON
             print(f"{cenario.tipo}: {cenario.probabilidade_percentual}%")
         ```
         """
+        prompt_do_agente, _ = self._preparar_analise(contexto)
+        
+        # ETAPA 4: CHAMAR LLM
+        logger.info("Chamando LLM para análise de prognóstico...")
+        
+        try:
+            resposta_llm = self.gerenciador_llm.chamar_llm(
+                **self._argumentos_da_chamada_llm_da_analise(prompt_do_agente)
+            )
+            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
+        except Exception as e:
+            logger.error(f"Erro ao chamar LLM: {str(e)}")
+            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        
+        return self._converter_resposta_da_analise(resposta_llm)
+    
+    async def analisar_async(self, contexto: Dict[str, Any]) -> Tuple[Prognostico, Dict[str, Any]]:
+        """
+        Versão assíncrona de analisar() (mesmo contexto).
+        
+        CONTEXTO:
+        Usada pelo OrquestradorAnalisePeticoes, que roda dentro do event loop:
+        a chamada ao LLM usa GerenciadorLLM.chamar_llm_async() e não bloqueia
+        o loop durante a análise (até o timeout da chamada).
+        
+        O uso do orçamento de tokens do prompt volta junto com o resultado (e
+        não num atributo do agente): a mesma instância atende análises
+        simultâneas de petições diferentes.
+        
+        Returns:
+            (Prognostico, uso do orçamento de tokens do prompt)
+        
+        Raises:
+            ValueError: Se contexto inválido ou resposta do LLM não puder ser parseada
+            Exception: Erros de comunicação com LLM ou validação Pydantic
+        """
+        prompt_do_agente, uso_do_orcamento = self._preparar_analise(contexto)
+        
+        logger.info("Chamando LLM para análise de prognóstico...")
+        
+        try:
+            resposta_llm = await self.gerenciador_llm.chamar_llm_async(
+                **self._argumentos_da_chamada_llm_da_analise(prompt_do_agente)
+            )
+            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
+        except Exception as e:
+            logger.error(f"Erro ao chamar LLM: {str(e)}")
+            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        
+        return self._converter_resposta_da_analise(resposta_llm), uso_do_orcamento
+    
+    def _preparar_analise(self, contexto: Dict[str, Any]) -> Tuple[PromptDoAgente, Dict[str, Any]]:
+        """
+        Valida o contexto e monta o prompt da análise (comum a analisar e analisar_async).
+        
+        Returns:
+            (PromptDoAgente, uso do orçamento de tokens do prompt)
+        
+        Raises:
+            ValueError: Se o contexto for inválido
+        """
         
         logger.info("Iniciando análise de prognóstico processual")
         
@@ -429,13 +515,11 @@ Agora, analise probabilisticamente este caso e forneça seu prognóstico em JSON
         )
         
         # ETAPA 2: PREPARAR CONTEXTO PARA O PROMPT
-        # Combinar petição + documentos como "contexto_de_documentos"
-        contexto_de_documentos = [
-            f"[PETIÇÃO INICIAL]\n{peticao_inicial}"
-        ]
-        
-        for idx, doc in enumerate(documentos, 1):
-            contexto_de_documentos.append(f"[DOCUMENTO COMPLEMENTAR {idx}]\n{doc}")
+        # Petição + documentos sem rótulos: o mesmo contexto_de_documentos que
+        # o orquestrador envia aos advogados e peritos, para que a primeira
+        # mensagem (documentos do caso) seja idêntica e aproveite o cache de
+        # prompt do provedor. O rótulo da petição vai em montar_prompt_da_tarefa()
+        contexto_de_documentos = [peticao_inicial] + list(documentos)
         
         # Preparar metadados adicionais
         metadados_adicionais = {
@@ -451,32 +535,44 @@ Agora, analise probabilisticamente este caso e forneça seu prognóstico em JSON
         )
         
         # ETAPA 3: MONTAR PROMPT
-        prompt = self.montar_prompt(
+        # Petição, anexos e pareceres reduzidos aos trechos mais relevantes se
+        # passarem do orçamento de tokens
+        _, prompt_do_agente, uso_do_orcamento = self._montar_prompt_no_orcamento(
             contexto_de_documentos=contexto_de_documentos,
+            secoes_dos_documentos=[SECAO_PETICAO] + [SECAO_ANEXOS] * len(documentos),
             pergunta_do_usuario=pergunta,
-            metadados_adicionais=metadados_adicionais
+            metadados_adicionais=metadados_adicionais,
+            pareceres=pareceres,
         )
         
-        logger.debug(f"Prompt montado: {len(prompt)} caracteres")
-        
-        # ETAPA 4: CHAMAR LLM
-        logger.info("Chamando LLM para análise de prognóstico...")
+        logger.debug(f"Prompt montado: {len(prompt_do_agente.texto_completo())} caracteres")
         
-        try:
-            resposta_llm = self.gerenciador_llm.chamar_llm(
-                prompt=prompt,
-                modelo=self.modelo_llm_padrao,
-                temperatura=self.temperatura_padrao,
-                max_tokens=20000,  # ✅ Aumentado para 20000 para acomodar reasoning tokens do gpt-5-nano
-                response_schema=Prognostico  # ✅ STRUCTURED OUTPUTS: garante formato exato
-            )
-            
-            logger.info(f"✅ Resposta recebida: {len(resposta_llm) if resposta_llm else 0} caracteres")
-            
-        except Exception as e:
-            logger.error(f"Erro ao chamar LLM: {str(e)}")
-            raise Exception(f"Falha na comunicação com LLM: {str(e)}")
+        return prompt_do_agente, uso_do_orcamento.para_dict()
+    
+    def _argumentos_da_chamada_llm_da_analise(self, prompt_do_agente: PromptDoAgente) -> Dict[str, Any]:
+        """
+        Argumentos de chamar_llm()/chamar_llm_async() para a análise.
+        """
+        return dict(
+            prompt=prompt_do_agente.prompt,
+            mensagens_de_sistema=prompt_do_agente.mensagem_de_sistema,
+            modelo=self.modelo_llm_padrao,
+            temperatura=self.temperatura_padrao,
+            max_tokens=20000,  # ✅ Aumentado para 20000 para acomodar reasoning tokens do gpt-5-nano
+            usar_cache=self.usar_cache_llm,
+            agente=self.nome_do_agente,
+            response_schema=Prognostico,  # ✅ STRUCTURED OUTPUTS: garante formato exato
+            contexto_compartilhado=prompt_do_agente.contexto_compartilhado
+        )
+    
+    def _converter_resposta_da_analise(self, resposta_llm: str) -> Prognostico:
+        """
+        Converte a resposta JSON do LLM em Prognostico (comum a analisar e analisar_async).
         
+        Raises:
+            ValueError: Se a resposta do LLM não puder ser parseada
+            Exception: Se a validação Pydantic falhar
+        """
         # ETAPA 5: PARSEAR RESPOSTA JSON
         logger.info("Parseando resposta JSON do LLM...")
         
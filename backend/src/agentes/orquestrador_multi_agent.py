@@ -62,10 +62,10 @@ TAREFAS RELACIONADAS:
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from datetime import datetime
 from enum import Enum
-from functools import lru_cache
+from functools import lru_cache, partial
 
 # Importar agente advogado coordenador
 from src.agentes.agente_advogado_coordenador import (
@@ -79,6 +79,8 @@ from src.utilitarios.gerenciador_llm import (
     ErroTimeoutAPI,
     ErroGeralAPI
 )
+from src.utilitarios.agendador_llm import PrioridadeLLM, contexto_agendamento_llm
+from src.utilitarios.triagem_relevancia import agentes_ignorados
 
 # Importar gerenciador de estado de tarefas (NOVO TAREFA-030)
 from src.servicos.gerenciador_estado_tarefas import (
@@ -87,10 +89,20 @@ from src.servicos.gerenciador_estado_tarefas import (
     StatusTarefa
 )
 
+# Streaming dos pareceres por SSE
+from src.servicos.gerenciador_eventos_streaming import (
+    TIPO_EVENTO_CONCLUIDA,
+    TIPO_EVENTO_ERRO,
+    obter_gerenciador_eventos_streaming
+)
+
 
 # Configuração do logger para este módulo
 logger = logging.getLogger(__name__)
 
+# Identificador do advogado coordenador nos eventos de streaming
+IDENTIFICADOR_COORDENADOR_STREAMING = "advogado_coordenador"
+
 
 # ==============================================================================
 # ENUMERAÇÕES
@@ -208,7 +220,8 @@ class OrquestradorMultiAgent:
         id_consulta: Optional[str] = None,
         metadados_adicionais: Optional[Dict[str, Any]] = None,
         documento_ids: Optional[List[str]] = None,
-        advogados_selecionados: Optional[List[str]] = None
+        advogados_selecionados: Optional[List[str]] = None,
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None
     ) -> Dict[str, Any]:
         """
         Processa uma consulta jurídica usando o sistema multi-agent.
@@ -273,6 +286,10 @@ class OrquestradorMultiAgent:
             advogados_selecionados: (NOVO TAREFA-024) Lista de advogados especialistas a consultar
                                     (ex: ["trabalhista", "previdenciario"])
                                     Se None ou vazio, nenhum advogado especialista é consultado
+            ao_receber_fragmento: Callback de streaming (agente, fragmento). Recebe o texto
+                                  de cada perito, advogado especialista e do advogado
+                                  coordenador ("advogado_coordenador") enquanto é gerado.
+                                  O resultado retornado é o mesmo com ou sem streaming.
         
         Returns:
             Dict[str, Any]: Resultado estruturado da consulta
@@ -286,6 +303,7 @@ class OrquestradorMultiAgent:
                 "numero_documentos_rag": int,
                 "agentes_utilizados": List[str],            # Peritos
                 "advogados_utilizados": List[str],          # NOVO: Advogados especialistas
+                "triagem_de_relevancia": Dict[str, Dict],   # Inclui os especialistas ignorados
                 "timestamp_inicio": str,
                 "timestamp_fim": str,
                 "tempo_total_segundos": float,
@@ -445,6 +463,9 @@ class OrquestradorMultiAgent:
             
             pareceres_peritos = {}
             
+            # Decisão da triagem de relevância de cada especialista (peritos e advogados)
+            triagem_de_relevancia: Dict[str, Dict[str, Any]] = {}
+            
             if agentes_selecionados:
                 self._atualizar_status_consulta(id_consulta, StatusConsulta.DELEGANDO_PERITOS)
                 
@@ -482,7 +503,9 @@ class OrquestradorMultiAgent:
                             pergunta=prompt,
                             contexto_de_documentos=contexto_rag,
                             peritos_selecionados=agentes_selecionados,
-                            metadados_adicionais=metadados_adicionais
+                            metadados_adicionais=metadados_adicionais,
+                            ao_receber_fragmento=ao_receber_fragmento,
+                            triagem_de_relevancia=triagem_de_relevancia
                         ),
                         timeout=self.timeout_padrao_agente
                     )
@@ -569,7 +592,9 @@ class OrquestradorMultiAgent:
                             pergunta=prompt,
                             contexto_de_documentos=contexto_rag,
                             advogados_selecionados=advogados_selecionados,
-                            metadados_adicionais=metadados_adicionais
+                            metadados_adicionais=metadados_adicionais,
+                            ao_receber_fragmento=ao_receber_fragmento,
+                            triagem_de_relevancia=triagem_de_relevancia
                         ),
                         timeout=self.timeout_padrao_agente
                     )
@@ -627,22 +652,29 @@ class OrquestradorMultiAgent:
             
             logger.info(f"📝 COMPILANDO RESPOSTA | ID: {id_consulta}")
             
+            ao_receber_fragmento_coordenador = (
+                partial(ao_receber_fragmento, IDENTIFICADOR_COORDENADOR_STREAMING)
+                if ao_receber_fragmento else None
+            )
+            
             try:
                 if pareceres_peritos or pareceres_advogados_especialistas:
                     # Se há pareceres de peritos OU advogados especialistas, compilar resposta integradora
-                    resposta_final = self.agente_advogado.compilar_resposta(
+                    resposta_final = await self.agente_advogado.compilar_resposta_async(
                         pareceres_peritos=pareceres_peritos,
                         pareceres_advogados_especialistas=pareceres_advogados_especialistas,  # NOVO TAREFA-024
                         contexto_rag=contexto_rag,
                         pergunta_original=prompt,
-                        metadados_adicionais=metadados_adicionais
+                        metadados_adicionais=metadados_adicionais,
+                        ao_receber_fragmento=ao_receber_fragmento_coordenador
                     )
                 else:
                     # Se não há peritos nem advogados especialistas, advogado coordenador responde diretamente
-                    resposta_final = self.agente_advogado.processar(
+                    resposta_final = await self.agente_advogado.processar_async(
                         contexto_de_documentos=contexto_rag,
                         pergunta_do_usuario=prompt,
-                        metadados_adicionais=metadados_adicionais
+                        metadados_adicionais=metadados_adicionais,
+                        ao_receber_fragmento=ao_receber_fragmento_coordenador
                     )
                 
                 # NOVO (TAREFA-034): Reportar compilação finalizada
@@ -699,6 +731,10 @@ class OrquestradorMultiAgent:
                 for i in range(len(contexto_rag))
             ]))
             
+            # Especialistas pulados pela triagem não participaram da análise
+            peritos_ignorados = agentes_ignorados(triagem_de_relevancia, "perito")
+            advogados_ignorados = agentes_ignorados(triagem_de_relevancia, "advogado")
+            
             # Montar resultado estruturado
             resultado = {
                 "id_consulta": id_consulta,
@@ -708,8 +744,13 @@ class OrquestradorMultiAgent:
                 "pareceres_advogados": pareceres_advogados,  # NOVO TAREFA-024: Advogados especialistas
                 "documentos_consultados": documentos_consultados,
                 "numero_documentos_rag": len(contexto_rag),
-                "agentes_utilizados": ["advogado"] + agentes_selecionados,  # Peritos
-                "advogados_utilizados": advogados_selecionados,  # NOVO TAREFA-024: Advogados especialistas
+                "agentes_utilizados": ["advogado"] + [  # Peritos
+                    perito for perito in agentes_selecionados if perito not in peritos_ignorados
+                ],
+                "advogados_utilizados": [  # NOVO TAREFA-024: Advogados especialistas
+                    advogado for advogado in advogados_selecionados if advogado not in advogados_ignorados
+                ],
+                "triagem_de_relevancia": triagem_de_relevancia,  # Especialistas executados, rebaixados ou ignorados
                 "timestamp_inicio": timestamp_inicio.isoformat(),
                 "timestamp_fim": timestamp_fim.isoformat(),
                 "tempo_total_segundos": round(tempo_total, 2),
@@ -770,6 +811,11 @@ class OrquestradorMultiAgent:
         4. Se SUCESSO: registrar resultado (status: CONCLUIDA)
         5. Se ERRO: registrar erro (status: ERRO)
         
+        STREAMING:
+        Os fragmentos de texto de cada agente são publicados no canal de
+        streaming da consulta (GET /api/analise/stream/{consulta_id}), que é
+        encerrado com "concluida" ou "erro" junto com a tarefa.
+        
         DIFERENÇA vs processar_consulta:
         - processar_consulta(): Executa análise e RETORNA resultado (síncrono)
         - _processar_consulta_em_background(): Executa análise e ARMAZENA resultado (assíncrono)
@@ -822,6 +868,10 @@ class OrquestradorMultiAgent:
         # Obter gerenciador de estado
         gerenciador = obter_gerenciador_estado_tarefas()
         
+        # Canal de streaming desta consulta (fragmentos dos agentes via SSE).
+        # obter_canal (e não abrir_canal): o cliente pode ter assinado antes do início
+        gerenciador_streaming = obter_gerenciador_eventos_streaming()
+        
         logger.info(
             f"🚀 INICIANDO PROCESSAMENTO EM BACKGROUND | "
             f"ID: {consulta_id} | "
@@ -839,17 +889,21 @@ class OrquestradorMultiAgent:
             
             # Executar processamento principal (método existente)
             # IMPORTANTE: Passa consulta_id para manter rastreabilidade
-            resultado = await self.processar_consulta(
-                prompt=prompt,
-                agentes_selecionados=agentes_selecionados,
-                id_consulta=consulta_id,
-                metadados_adicionais=metadados_adicionais,
-                documento_ids=documento_ids,
-                advogados_selecionados=advogados_selecionados
-            )
+            # (e para o agendador do LLM revezar as vagas entre consultas)
+            with contexto_agendamento_llm(PrioridadeLLM.INTERATIVA, consulta_id):
+                resultado = await self.processar_consulta(
+                    prompt=prompt,
+                    agentes_selecionados=agentes_selecionados,
+                    id_consulta=consulta_id,
+                    metadados_adicionais=metadados_adicionais,
+                    documento_ids=documento_ids,
+                    advogados_selecionados=advogados_selecionados,
+                    ao_receber_fragmento=gerenciador_streaming.criar_emissor_de_fragmentos(consulta_id)
+                )
             
             # Registrar resultado no gerenciador de estado
             gerenciador.registrar_resultado(consulta_id, resultado)
+            gerenciador_streaming.publicar(consulta_id, TIPO_EVENTO_CONCLUIDA, {"consulta_id": consulta_id})
             
             logger.info(
                 f"✅ PROCESSAMENTO EM BACKGROUND CONCLUÍDO | "
@@ -877,6 +931,7 @@ class OrquestradorMultiAgent:
                     "exception_message": str(erro)
                 }
             )
+            gerenciador_streaming.publicar(consulta_id, TIPO_EVENTO_ERRO, {"mensagem": mensagem_erro})
     
     def obter_status_consulta(self, id_consulta: str) -> Optional[Dict[str, Any]]:
         """
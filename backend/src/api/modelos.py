@@ -349,6 +349,12 @@ class ResultadoProcessamentoDocumento(BaseModel):
         description="Total de caracteres extraídos"
     )
     
+    tokens_boilerplate_economizados: int = Field(
+        default=0,
+        ge=0,
+        description="Tokens de cabeçalhos/rodapés repetidos removidos antes do chunking"
+    )
+    
     confianca_media: float = Field(
         ...,
         ge=0.0,
@@ -393,6 +399,7 @@ class ResultadoProcessamentoDocumento(BaseModel):
                 "numero_paginas": 15,
                 "numero_chunks": 42,
                 "numero_caracteres": 25000,
+                "tokens_boilerplate_economizados": 1200,
                 "confianca_media": 1.0,
                 "tempo_processamento_segundos": 12.5,
                 "ids_chunks_armazenados": ["chunk_1", "chunk_2"],
@@ -476,12 +483,18 @@ class RespostaListarDocumentos(BaseModel):
         description="Lista de documentos com metadados"
     )
     
+    proximo_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor para buscar a próxima página (None = última página)"
+    )
+    
     class Config:
         """Exemplo para documentação Swagger"""
         json_schema_extra = {
             "example": {
                 "sucesso": True,
                 "total_documentos": 3,
+                "proximo_cursor": None,
                 "documentos": [
                     {
                         "documento_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -1197,6 +1210,13 @@ class RespostaAnaliseMultiAgent(BaseModel):
         description="(NOVO TAREFA-024) Lista de IDs dos advogados especialistas que participaram da análise (jurídica)"
     )
     
+    triagem_de_relevancia: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Decisão da triagem de relevância de cada especialista selecionado "
+                    "(executar, rebaixar para o modelo rápido ou pular, com o motivo; "
+                    "chave = 'perito_<id>' ou 'advogado_<id>')"
+    )
+    
     tempo_total_segundos: float = Field(
         ...,
         ge=0.0,
@@ -1781,6 +1801,13 @@ class RespostaResultadoAnalise(BaseModel):
         description="IDs dos advogados especialistas que participaram"
     )
     
+    triagem_de_relevancia: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Decisão da triagem de relevância de cada especialista selecionado "
+                    "(executar, rebaixar para o modelo rápido ou pular, com o motivo; "
+                    "chave = 'perito_<id>' ou 'advogado_<id>')"
+    )
+    
     tempo_total_segundos: float = Field(
         ...,
         ge=0.0,
@@ -2379,6 +2406,7 @@ class RespostaResultadoAnalisePeticao(BaseModel):
     - pareceres_advogados: Dict[str, ParecerAdvogado] (1 por advogado)
     - pareceres_peritos: Dict[str, ParecerPerito] (1 por perito)
     - documento_continuacao: Objeto DocumentoContinuacao (Markdown + HTML)
+    - triagem_de_relevancia: Especialistas executados, rebaixados ou ignorados (e por quê)
     - tempo_processamento_segundos: Tempo total de processamento
     - timestamp_conclusao: Quando análise foi finalizada
     """
@@ -2436,6 +2464,14 @@ class RespostaResultadoAnalisePeticao(BaseModel):
         )
     )
     
+    triagem_de_relevancia: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Decisão da triagem de relevância de cada especialista selecionado "
+                    "(executar, rebaixar para o modelo rápido ou pular, com o motivo; "
+                    "chave = 'advogado_<tipo>' ou 'perito_<tipo>'). Especialistas "
+                    "pulados não têm parecer"
+    )
+    
     tempo_processamento_segundos: float = Field(
         ...,
         description="Tempo total de processamento da análise em segundos"
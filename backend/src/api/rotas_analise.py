@@ -68,10 +68,10 @@ TAREFAS RELACIONADAS:
 - TAREFA-024: Refatoração para Advogados Especialistas (ESTE UPDATE)
 """
 
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 import asyncio
 import uuid
@@ -113,6 +113,17 @@ from src.servicos.gerenciador_estado_tarefas import (
     StatusTarefa
 )
 
+# Importar gerenciador de eventos de streaming (SSE)
+from src.servicos.gerenciador_eventos_streaming import (
+    TIPO_EVENTO_CONCLUIDA,
+    TIPO_EVENTO_ERRO,
+    gerar_fluxo_sse,
+    obter_gerenciador_eventos_streaming
+)
+
+# Prioridade das chamadas ao LLM (agendador global)
+from src.utilitarios.agendador_llm import PrioridadeLLM, contexto_agendamento_llm
+
 
 # ===== CONFIGURAÇÃO DO LOGGER =====
 
@@ -404,11 +415,15 @@ async def endpoint_analise_multi_agent(
         logger.info("🚀 Iniciando processamento via OrquestradorMultiAgent...")
         
         # NOVIDADE (TAREFA-022): Passa documento_ids para o orquestrador
-        resultado_orquestrador = await orquestrador.processar_consulta(
-            prompt=request_body.prompt,
-            agentes_selecionados=request_body.agentes_selecionados,
-            documento_ids=request_body.documento_ids
-        )
+        # O ID é gerado aqui para o agendador do LLM revezar as vagas entre consultas
+        id_consulta = str(uuid.uuid4())
+        with contexto_agendamento_llm(PrioridadeLLM.INTERATIVA, id_consulta):
+            resultado_orquestrador = await orquestrador.processar_consulta(
+                prompt=request_body.prompt,
+                agentes_selecionados=request_body.agentes_selecionados,
+                id_consulta=id_consulta,
+                documento_ids=request_body.documento_ids
+            )
         
         logger.info("✅ Processamento concluído com sucesso!")
         
@@ -436,6 +451,8 @@ async def endpoint_analise_multi_agent(
             pareceres_individuais=pareceres_formatados,
             documentos_consultados=resultado_orquestrador.get("documentos_consultados", []),
             agentes_utilizados=resultado_orquestrador.get("agentes_utilizados", []),
+            advogados_utilizados=resultado_orquestrador.get("advogados_utilizados", []),
+            triagem_de_relevancia=resultado_orquestrador.get("triagem_de_relevancia", {}),
             tempo_total_segundos=resultado_orquestrador.get("tempo_total_segundos", 0.0),
             timestamp_inicio=resultado_orquestrador.get("timestamp_inicio", ""),
             timestamp_fim=resultado_orquestrador.get("timestamp_fim", ""),
@@ -946,7 +963,10 @@ async def endpoint_iniciar_analise_assincrona(
             sucesso=True,
             consulta_id=consulta_id,
             status="INICIADA",
-            mensagem=f"Análise iniciada com sucesso! Use GET /api/analise/status/{consulta_id} para acompanhar o progresso.",
+            mensagem=(
+                f"Análise iniciada com sucesso! Use GET /api/analise/status/{consulta_id} para acompanhar o progresso "
+                f"ou GET /api/analise/stream/{consulta_id} para receber os pareceres em tempo real."
+            ),
             timestamp_criacao=timestamp_criacao
         )
         
@@ -973,6 +993,94 @@ async def endpoint_iniciar_analise_assincrona(
         )
 
 
+@router.get(
+    "/stream/{consulta_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Acompanhar análise assíncrona em tempo real (SSE)",
+    description="""
+    Transmite, via **Server-Sent Events**, o texto de cada agente (peritos,
+    advogados especialistas e advogado coordenador) à medida que é gerado.
+    
+    **EVENTOS:**
+    - **fragmento**: `{"agente": "medico", "texto": "..."}` (um trecho de parecer)
+    - **concluida**: análise terminou → resultado estruturado em GET /api/analise/resultado/{id}
+    - **erro**: `{"mensagem": "..."}`
+    
+    **USO NO FRONTEND:**
+    ```javascript
+    const fonte = new EventSource(`/api/analise/stream/${consulta_id}`);
+    fonte.addEventListener('fragmento', (e) => {
+      const { agente, texto } = JSON.parse(e.data);
+      anexarTexto(agente, texto);
+    });
+    fonte.addEventListener('concluida', () => { fonte.close(); obterResultado(consulta_id); });
+    fonte.addEventListener('erro', (e) => { fonte.close(); exibirErro(JSON.parse(e.data).mensagem); });
+    ```
+    
+    **RECONEXÃO:** o EventSource reenvia `Last-Event-ID` e o fluxo continua do evento seguinte.
+    
+    O resultado final (GET /resultado) é o mesmo com ou sem streaming.
+    """,
+    responses={
+        200: {"description": "Fluxo text/event-stream"},
+        404: {
+            "description": "Consulta não encontrada (consulta_id inválido)",
+            "model": RespostaErro
+        }
+    }
+)
+async def endpoint_stream_analise(
+    consulta_id: str,
+    last_event_id: Optional[str] = Header(default=None)
+) -> StreamingResponse:
+    """
+    Endpoint GET /api/analise/stream/{consulta_id}
+    
+    Transmite os fragmentos dos pareceres de uma análise assíncrona (SSE).
+    
+    FLUXO INTERNO:
+    1. Consulta GerenciadorEstadoTarefas com consulta_id (404 se não existir)
+    2. Obtém o canal de streaming da consulta (criado se ainda não existir:
+       a tarefa pode estar na fila)
+    3. Se a tarefa já terminou, garante o evento final no canal
+    4. Entrega histórico + eventos novos até "concluida" / "erro"
+    
+    Args:
+        consulta_id: UUID da consulta (retornado por POST /iniciar)
+        last_event_id: Header Last-Event-ID enviado pelo EventSource ao reconectar
+    
+    Returns:
+        StreamingResponse (text/event-stream)
+    
+    Raises:
+        HTTPException: 404 se consulta não encontrada
+    """
+    logger.info(f"📡 Cliente conectado ao stream da consulta: {consulta_id}")
+    
+    tarefa = obter_gerenciador_estado_tarefas().obter_tarefa(consulta_id)
+    
+    if tarefa is None:
+        logger.warning(f"⚠️ Consulta não encontrada: {consulta_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Consulta não encontrada: {consulta_id}"
+        )
+    
+    canal = obter_gerenciador_eventos_streaming().obter_canal(consulta_id)
+    
+    # Tarefa já finalizada (ex: canal expirado): encerrar com o estado atual
+    if tarefa.status == StatusTarefa.CONCLUIDA:
+        canal.publicar(TIPO_EVENTO_CONCLUIDA, {"consulta_id": consulta_id})
+    elif tarefa.status == StatusTarefa.ERRO:
+        canal.publicar(TIPO_EVENTO_ERRO, {"mensagem": tarefa.mensagem_erro or "Erro desconhecido"})
+    
+    return StreamingResponse(
+        gerar_fluxo_sse(canal, a_partir_de=int(last_event_id) if last_event_id and last_event_id.isdigit() else 0),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/status/{consulta_id}",
     response_model=RespostaStatusAnalise,
@@ -1147,6 +1255,7 @@ async def endpoint_verificar_status_analise(
     - `documentos_consultados`: Documentos do RAG usados
     - `agentes_utilizados`: IDs dos peritos que participaram
     - `advogados_utilizados`: IDs dos advogados que participaram
+    - `triagem_de_relevancia`: Especialistas rebaixados ou ignorados pela triagem (e por quê)
     - `tempo_total_segundos`: Tempo REAL de processamento (pode ser >2 minutos!)
     
     **RESPONSE (SUCESSO):**
@@ -1313,6 +1422,7 @@ async def endpoint_obter_resultado_analise(
             documentos_consultados=resultado_dict.get("documentos_consultados", []),
             agentes_utilizados=resultado_dict.get("agentes_utilizados", []),
             advogados_utilizados=resultado_dict.get("advogados_utilizados", []),
+            triagem_de_relevancia=resultado_dict.get("triagem_de_relevancia", {}),
             tempo_total_segundos=resultado_dict.get("tempo_total_segundos", 0.0),
             timestamp_inicio=resultado_dict.get("timestamp_inicio", ""),
             timestamp_fim=resultado_dict.get("timestamp_fim", "")
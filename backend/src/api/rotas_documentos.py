@@ -29,8 +29,8 @@ JUSTIFICATIVA PARA LLMs:
 - Funções auxiliares pequenas e focadas
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks
-from typing import List, Dict, Any
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks, Query
+from typing import List, Dict, Any, Literal, Optional
 import uuid
 import os
 from pathlib import Path
@@ -814,33 +814,60 @@ async def endpoint_consultar_status_documento(documento_id: str) -> StatusDocume
     Lista todos os documentos que foram processados e estão disponíveis
     no sistema RAG (ChromaDB).
     
+    **Paginação (opcional):**
+    - `limite`: documentos por página (sem limite = todos)
+    - `cursor`: valor de `proximo_cursor` da página anterior
+    - `ordenar_por`: data_upload (padrão), nome_arquivo, numero_chunks, numero_caracteres
+    - `ordem`: desc (padrão) ou asc
+    
     **Retorna:**
     - Total de documentos
     - Lista com metadados de cada documento
+    - Cursor da próxima página (null na última)
     """
 )
-async def endpoint_listar_documentos() -> RespostaListarDocumentos:
+async def endpoint_listar_documentos(
+    limite: Optional[int] = Query(default=None, gt=0, le=1000, description="Documentos por página"),
+    cursor: Optional[str] = Query(default=None, description="proximo_cursor da página anterior"),
+    ordenar_por: Literal["data_upload", "nome_arquivo", "numero_chunks", "numero_caracteres"] = Query(
+        default="data_upload", description="Campo de ordenação"
+    ),
+    ordem: Literal["asc", "desc"] = Query(default="desc", description="Direção da ordenação")
+) -> RespostaListarDocumentos:
     """
-    Lista todos os documentos disponíveis no sistema.
+    Lista os documentos disponíveis no sistema (com paginação por cursor).
     
     CONTEXTO:
     Útil para visualizar todos os documentos que foram processados
     e estão disponíveis para consulta pelos agentes de IA.
     
     IMPLEMENTAÇÃO:
-    Consulta diretamente o ChromaDB para obter lista de documentos únicos.
+    Consulta o catálogo de documentos (SQLite), que já guarda os dados
+    agregados por documento; os chunks do ChromaDB não são varridos.
     
     Returns:
         RespostaListarDocumentos com lista de documentos
     """
-    logger.info("Listando todos os documentos do sistema")
+    logger.info("Listando documentos do sistema")
     
     try:
-        # Inicializar ChromaDB
-        _, collection = servico_banco_vetorial.inicializar_chromadb()
+        # ChromaDB compartilhado (singleton criado no startup)
+        _, collection = servico_banco_vetorial.obter_servico_banco_vetorial()
         
-        # Obter lista de documentos do ChromaDB
-        documentos_chromadb = servico_banco_vetorial.listar_documentos(collection)
+        # Obter página de documentos do catálogo
+        try:
+            pagina = servico_banco_vetorial.listar_documentos_paginados(
+                collection,
+                limite=limite,
+                cursor=cursor,
+                ordenar_por=ordenar_por,
+                ordem=ordem
+            )
+        except servico_banco_vetorial.ErroDeBusca as erro:
+            if cursor:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+            raise
+        documentos_chromadb = pagina["documentos"]
         
         # Transformar para formato esperado pelo frontend (camelCase)
         documentos_formatados = []
@@ -852,20 +879,27 @@ async def endpoint_listar_documentos() -> RespostaListarDocumentos:
                 "tamanhoEmBytes": 0,  # ChromaDB não armazena tamanho
                 "dataHoraUpload": doc.get("data_upload", ""),
                 "statusProcessamento": "concluido",  # Se está no ChromaDB, foi processado
-                "numeroChunks": doc.get("numero_chunks", 0)
+                "numeroChunks": doc.get("numero_chunks", 0),
+                "numeroCaracteres": doc.get("tamanho_total_texto_caracteres", 0),
+                "numeroTokens": doc.get("numero_tokens", 0)
             }
             documentos_formatados.append(doc_formatado)
         
-        logger.info(f"Encontrados {len(documentos_formatados)} documentos no sistema")
+        logger.info(
+            f"Retornando {len(documentos_formatados)} de {pagina['total_documentos']} documentos"
+        )
         
         resposta = RespostaListarDocumentos(
             sucesso=True,
-            total_documentos=len(documentos_formatados),
-            documentos=documentos_formatados
+            total_documentos=pagina["total_documentos"],
+            documentos=documentos_formatados,
+            proximo_cursor=pagina["proximo_cursor"]
         )
         
         return resposta
     
+    except HTTPException:
+        raise
     except Exception as erro:
         logger.error(f"Erro ao listar documentos: {erro}", exc_info=True)
         raise HTTPException(
@@ -938,7 +972,7 @@ async def endpoint_deletar_documento(documento_id: str) -> RespostaDeletarDocume
     
     try:
         # Obter collection do ChromaDB
-        cliente_chroma, collection = servico_banco_vetorial.inicializar_chromadb()
+        cliente_chroma, collection = servico_banco_vetorial.obter_servico_banco_vetorial()
         
         # Antes de deletar, buscar informações do documento
         documento_info = None
@@ -39,7 +39,8 @@ JUSTIFICATIVA PARA LLMs:
 - Funções auxiliares pequenas e focadas
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks, Form, Header
+from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any, List
 import uuid
 import os
@@ -78,6 +79,12 @@ from src.modelos.processo import (
 # Importar serviços
 from src.servicos.gerenciador_estado_peticoes import obter_gerenciador_estado_peticoes
 from src.servicos.gerenciador_estado_uploads import obter_gerenciador_estado_uploads
+from src.servicos.gerenciador_eventos_streaming import (
+    TIPO_EVENTO_CONCLUIDA,
+    TIPO_EVENTO_ERRO,
+    gerar_fluxo_sse,
+    obter_gerenciador_eventos_streaming,
+)
 from src.servicos.servico_analise_documentos_relevantes import (
     obter_servico_analise_documentos,
     ErroAnaliseDocumentosRelevantes,
@@ -85,6 +92,7 @@ from src.servicos.servico_analise_documentos_relevantes import (
     ErroDocumentoPeticaoNaoEncontrado,
     ErroParsingRespostaLLM
 )
+from src.utilitarios.agendador_llm import PrioridadeLLM, contexto_agendamento_llm
 
 
 # ===== CONFIGURAÇÃO DO ROUTER =====
@@ -818,9 +826,11 @@ async def endpoint_analisar_documentos_peticao(
             servico_analise = obter_servico_analise_documentos()
             
             # Executar análise (pode demorar 10-60s dependendo da LLM)
-            documentos_sugeridos = servico_analise.analisar_peticao_e_sugerir_documentos(
-                peticao_id=peticao_id
-            )
+            # Background: cede as vagas do LLM às consultas interativas
+            with contexto_agendamento_llm(PrioridadeLLM.ANALISE_PETICAO, peticao_id):
+                documentos_sugeridos = servico_analise.analisar_peticao_e_sugerir_documentos(
+                    peticao_id=peticao_id
+                )
             
             logger.info(
                 f"[PETICAO] Análise concluída com sucesso - peticao_id: {peticao_id}, "
@@ -1728,6 +1738,11 @@ async def endpoint_iniciar_analise_peticao(
     from src.servicos.orquestrador_analise_peticoes import criar_orquestrador_analise_peticoes
     import asyncio
     
+    # Canal de streaming aberto antes de agendar: quem assinar GET /{peticao_id}/stream
+    # logo após o 202 já recebe os eventos desta execução (e não os de uma anterior)
+    gerenciador_streaming = obter_gerenciador_eventos_streaming()
+    gerenciador_streaming.abrir_canal(peticao_id)
+    
     def processar_analise_em_background():
         """
         Função executada em background para processar análise completa.
@@ -1756,7 +1771,8 @@ async def endpoint_iniciar_analise_peticao(
                 resultado = await orquestrador.analisar_peticao_completa(
                     peticao_id=peticao_id,
                     advogados_selecionados=advogados_selecionados,
-                    peritos_selecionados=peritos_selecionados
+                    peritos_selecionados=peritos_selecionados,
+                    ao_receber_fragmento=gerenciador_streaming.criar_emissor_de_fragmentos(peticao_id)
                 )
                 
                 # Registrar resultado no gerenciador
@@ -1764,6 +1780,7 @@ async def endpoint_iniciar_analise_peticao(
                     peticao_id=peticao_id,
                     resultado=resultado
                 )
+                gerenciador_streaming.publicar(peticao_id, TIPO_EVENTO_CONCLUIDA, {"peticao_id": peticao_id})
                 
                 logger.info(f"[PETICAO-ANALISE-BG] Análise concluída com sucesso - peticao_id: {peticao_id}")
                 
@@ -1775,9 +1792,13 @@ async def endpoint_iniciar_analise_peticao(
                     peticao_id=peticao_id,
                     mensagem_erro=str(e)
                 )
+                gerenciador_streaming.publicar(peticao_id, TIPO_EVENTO_ERRO, {"mensagem": str(e)})
         
-        # Executar função async em novo event loop
-        asyncio.run(_executar_analise_async())
+        # Executar função async em novo event loop (as tasks herdam o contexto
+        # de agendamento: as chamadas ao LLM desta petição entram na pista de
+        # análise em background, revezando com as outras petições)
+        with contexto_agendamento_llm(PrioridadeLLM.ANALISE_PETICAO, peticao_id):
+            asyncio.run(_executar_analise_async())
     
     # Agendar processamento em background
     background_tasks.add_task(processar_analise_em_background)
@@ -1794,7 +1815,8 @@ async def endpoint_iniciar_analise_peticao(
         status="processando",
         mensagem=(
             "Análise da petição iniciada com sucesso. "
-            f"Use GET /api/peticoes/{peticao_id}/status-analise para acompanhar o progresso."
+            f"Use GET /api/peticoes/{peticao_id}/status-analise para acompanhar o progresso "
+            f"ou GET /api/peticoes/{peticao_id}/stream para receber os pareceres em tempo real."
         ),
         timestamp_inicio=timestamp_inicio
     )
@@ -1967,6 +1989,81 @@ async def endpoint_consultar_status_analise(peticao_id: str):
     return resposta
 
 
+@router.get(
+    "/{peticao_id}/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Acompanhar análise de petição em tempo real (SSE)",
+    description="""
+    Transmite, via Server-Sent Events, o texto dos pareceres de cada agente
+    enquanto a análise da petição está sendo gerada.
+    
+    **EVENTOS:**
+    - **fragmento**: `{"agente": "trabalhista", "texto": "..."}` (um trecho de parecer;
+      `"agente": "documento_continuacao"` para o documento de continuação)
+    - **concluida**: análise terminou; o resultado estruturado continua em GET /resultado
+    - **erro**: `{"mensagem": "..."}`
+    
+    **RECONEXÃO:**
+    Cada evento tem `id`; o navegador (EventSource) reenvia o último recebido em
+    `Last-Event-ID` e o fluxo continua do evento seguinte.
+    
+    **Raises:**
+        HTTPException 404: Se petição não existir
+    """
+)
+async def endpoint_stream_analise_peticao(
+    peticao_id: str,
+    last_event_id: Optional[str] = Header(default=None)
+):
+    """
+    Endpoint SSE com os fragmentos dos pareceres da análise da petição.
+    
+    CONTEXTO:
+    Complementa o polling de /status-analise: o status mostra a etapa, o
+    stream mostra o texto de cada advogado/perito e do documento de
+    continuação à medida que o LLM o gera.
+    
+    Se a análise já terminou (ou nunca foi transmitida, ex: servidor
+    reiniciado), o fluxo entrega o que houver no histórico e o evento final.
+    
+    Args:
+        peticao_id: UUID da petição
+        last_event_id: Header Last-Event-ID enviado pelo EventSource ao reconectar
+    
+    Returns:
+        StreamingResponse (text/event-stream)
+    
+    Raises:
+        HTTPException 404: Petição não encontrada
+    """
+    gerenciador_peticoes = obter_gerenciador_estado_peticoes()
+    peticao = gerenciador_peticoes.obter_peticao(peticao_id)
+    
+    if not peticao:
+        logger.warning(f"[PETICAO-STREAM] Petição não encontrada: {peticao_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Petição {peticao_id} não encontrada."
+        )
+    
+    canal = obter_gerenciador_eventos_streaming().obter_canal(peticao_id)
+    
+    # Análise já finalizada sem canal aberto: encerrar com o estado atual
+    if peticao.status == StatusPeticao.CONCLUIDA:
+        canal.publicar(TIPO_EVENTO_CONCLUIDA, {"peticao_id": peticao_id})
+    elif peticao.status == StatusPeticao.ERRO:
+        erro_info = gerenciador_peticoes.obter_erro(peticao_id)
+        canal.publicar(TIPO_EVENTO_ERRO, {"mensagem": erro_info.get("mensagem_erro", "Erro desconhecido durante análise")})
+    
+    logger.info(f"[PETICAO-STREAM] Cliente conectado ao stream - peticao_id: {peticao_id}")
+    
+    return StreamingResponse(
+        gerar_fluxo_sse(canal, a_partir_de=int(last_event_id) if last_event_id and last_event_id.isdigit() else 0),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/{peticao_id}/resultado",
     response_model=RespostaResultadoAnalisePeticao,
@@ -2126,6 +2223,7 @@ async def endpoint_obter_resultado_analise(peticao_id: str):
             if resultado.documento_continuacao is not None
             else None
         ),
+        triagem_de_relevancia=resultado.triagem_de_relevancia,
         tempo_processamento_segundos=(
             (resultado.timestamp_conclusao - peticao.timestamp_criacao).total_seconds()
         ),
@@ -28,7 +28,7 @@ JUSTIFICATIVA PARA LLMs:
 - Singleton garante que configurações são carregadas uma única vez
 """
 
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
@@ -93,8 +93,153 @@ class Configuracoes(BaseSettings):
         description="Máximo de tokens na resposta do modelo"
     )
     
+    # ===== CACHE DE RESPOSTAS DO LLM =====
+    
+    LLM_CACHE_ATIVADO: bool = Field(
+        default=False,
+        description="Reaproveita respostas do LLM para requisições idênticas (reanálise de petição inalterada)"
+    )
+    
+    CAMINHO_CACHE_RESPOSTAS_LLM: str = Field(
+        default="./dados/cache_respostas_llm.sqlite3",
+        description="Arquivo SQLite do cache de respostas do LLM"
+    )
+    
+    LLM_CACHE_TTL_SEGUNDOS: int = Field(
+        default=604800,
+        gt=0,
+        description="Validade de cada resposta em cache (padrão: 7 dias)"
+    )
+    
+    LLM_CACHE_MAX_ENTRADAS: int = Field(
+        default=5000,
+        gt=0,
+        description="Máximo de respostas em cache (remove as acessadas há mais tempo)"
+    )
+    
+    LLM_CACHE_TEMPERATURA_MAXIMA: float = Field(
+        default=0.3,
+        ge=0.0,
+        le=2.0,
+        description="Chamadas sem opção explícita de cache só o usam até esta temperatura"
+    )
+    
+    # ===== AGENDADOR DE CHAMADAS AO LLM =====
+    
+    LLM_AGENDADOR_ATIVADO: bool = Field(
+        default=True,
+        description="Limita chamadas simultâneas ao LLM por modelo, com prioridade para consultas interativas"
+    )
+    
+    LLM_MAX_CHAMADAS_SIMULTANEAS_POR_MODELO: int = Field(
+        default=8,
+        gt=0,
+        description="Chamadas simultâneas por modelo (somando todas as análises do processo)"
+    )
+    
+    LLM_LIMITES_CHAMADAS_POR_MODELO: str = Field(
+        default="",
+        description="Limites específicos por modelo, no formato 'modelo=limite,modelo=limite'"
+    )
+    
+    LLM_AGENDADOR_ESTRITO: Optional[bool] = Field(
+        default=None,
+        description=(
+            "Chamada síncrona ao LLM dentro de um event loop levanta erro em vez de seguir sem vaga "
+            "(None: ativo apenas com AMBIENTE=development)"
+        )
+    )
+    
+    # ===== RESILIÊNCIA DAS CHAMADAS AO LLM =====
+    
+    LLM_RETRY_ESPERA_MAXIMA_SEGUNDOS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Espera máxima entre tentativas; Retry-After acima disso faz a chamada falhar sem repetir"
+    )
+    
+    LLM_RETRY_ORCAMENTO_PROPORCAO: float = Field(
+        default=0.2,
+        ge=0.0,
+        description="Crédito de retry por chamada (0.2 = no máximo 1 repetição a cada 5 chamadas em incidentes)"
+    )
+    
+    LLM_RETRY_ORCAMENTO_SALDO_MAXIMO: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="Crédito de retry acumulado máximo (repetições em rajada permitidas)"
+    )
+    
+    LLM_DISJUNTOR_FALHAS_CONSECUTIVAS: int = Field(
+        default=5,
+        gt=0,
+        description="Falhas consecutivas do provedor (429, 5xx, timeout) que abrem o circuito do modelo"
+    )
+    
+    LLM_DISJUNTOR_SEGUNDOS_ABERTO: float = Field(
+        default=30.0,
+        gt=0,
+        description="Tempo em que o circuito aberto faz as chamadas ao modelo falharem imediatamente"
+    )
+    
+    # ===== ORÇAMENTO DE TOKENS DOS PROMPTS =====
+    
+    LLM_ORCAMENTO_TOKENS_PROMPT: int = Field(
+        default=30000,
+        ge=0,
+        description="Tokens máximos do prompt de cada agente (documentos são reduzidos por relevância; 0 desativa)"
+    )
+    
+    # ===== CASCATA DE MODELOS DOS AGENTES =====
+    
+    LLM_CASCATA_ATIVADA: bool = Field(
+        default=False,
+        description="Agentes respondem primeiro com o modelo rápido e só escalam para o modelo principal se preciso"
+    )
+    
+    LLM_CASCATA_MODELO_RAPIDO: str = Field(
+        default="gpt-4o-mini",
+        description="Modelo menor/mais rápido usado na primeira tentativa da cascata"
+    )
+    
+    LLM_CASCATA_CONFIANCA_MINIMA: float = Field(
+        default=0.6,
+        ge=0.0,
+        le=1.0,
+        description="Confiança heurística mínima para aceitar a resposta do modelo rápido sem escalar"
+    )
+    
+    # ===== TRIAGEM DE RELEVÂNCIA DOS AGENTES =====
+    
+    TRIAGEM_RELEVANCIA_ATIVADA: bool = Field(
+        default=False,
+        description="Pular/rebaixar especialistas pouco aderentes ao caso antes de chamar o LLM"
+    )
+    
+    TRIAGEM_RELEVANCIA_PROPORCAO_PULAR: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Agentes com aderência abaixo desta fração da do agente mais aderente não são executados"
+    )
+    
+    TRIAGEM_RELEVANCIA_PROPORCAO_REBAIXAR: float = Field(
+        default=0.3,
+        ge=0.0,
+        le=1.0,
+        description=(
+            "Agentes abaixo desta fração da aderência do mais aderente rodam com "
+            "LLM_CASCATA_MODELO_RAPIDO (só com LLM_CASCATA_ATIVADA)"
+        )
+    )
+    
     # ===== BANCO DE DADOS VETORIAL (ChromaDB) =====
     
+    BACKEND_BANCO_VETORIAL: Literal["chromadb", "numpy"] = Field(
+        default="chromadb",
+        description="Armazenamento dos chunks: chromadb (persistente, HNSW) ou numpy (memória, busca exata)"
+    )
+    
     CHROMA_DB_PATH: str = Field(
         default="./dados/chroma_db",
         description="Caminho para persistência do ChromaDB no sistema de arquivos"
@@ -105,6 +250,99 @@ class Configuracoes(BaseSettings):
         description="Nome da collection principal no ChromaDB"
     )
     
+    CHROMA_PRECARREGAR_INDICE: bool = Field(
+        default=True,
+        description="Carregar o índice vetorial em memória no startup (evita latência na 1ª busca)"
+    )
+    
+    # Parâmetros do índice HNSW da collection (aplicados na CRIAÇÃO da collection).
+    # Os padrões são os do próprio ChromaDB; ajuste com benchmarks.benchmark_hnsw
+    CHROMA_HNSW_M: int = Field(
+        default=16,
+        ge=2,
+        description="hnsw:M - vizinhos por nó do grafo (maior = mais recall, mais memória)"
+    )
+    
+    CHROMA_HNSW_CONSTRUCTION_EF: int = Field(
+        default=100,
+        ge=1,
+        description="hnsw:construction_ef - candidatos avaliados ao inserir (maior = grafo melhor, inserção mais lenta)"
+    )
+    
+    CHROMA_HNSW_SEARCH_EF: int = Field(
+        default=10,
+        ge=1,
+        description="hnsw:search_ef - candidatos avaliados na busca (maior = mais recall, busca mais lenta)"
+    )
+    
+    CHROMA_HNSW_BATCH_SIZE: int = Field(
+        default=100,
+        ge=2,
+        description="hnsw:batch_size - vetores acumulados em memória antes de entrar no índice"
+    )
+    
+    CHROMA_HNSW_SYNC_THRESHOLD: int = Field(
+        default=1000,
+        ge=2,
+        description="hnsw:sync_threshold - vetores inseridos entre gravações do índice em disco"
+    )
+    
+    CAMINHO_TEXTOS_CANONICOS: str = Field(
+        default="./dados/textos_canonicos",
+        description="Diretório com o texto completo (comprimido) de cada documento ingerido"
+    )
+    
+    CAMINHO_CATALOGO_DOCUMENTOS: str = Field(
+        default="./dados/catalogo_documentos.sqlite3",
+        description="Arquivo SQLite do catálogo de documentos (uma linha por documento)"
+    )
+    
+    CAMINHO_INDICE_LEXICAL: str = Field(
+        default="./dados/indice_lexical.sqlite3",
+        description="Arquivo SQLite (FTS5) do índice lexical BM25 dos chunks"
+    )
+    
+    MODO_BUSCA_RAG: Literal["vetorial", "hibrida"] = Field(
+        default="vetorial",
+        description="Modo padrão de busca RAG (hibrida = vetorial + BM25 com Reciprocal Rank Fusion)"
+    )
+    
+    BUSCA_HIBRIDA_CONSTANTE_RRF: int = Field(
+        default=60,
+        gt=0,
+        description="Constante k do Reciprocal Rank Fusion (score = soma de 1 / (k + posição))"
+    )
+    
+    BUSCA_HIBRIDA_FATOR_CANDIDATOS: int = Field(
+        default=4,
+        ge=1,
+        description="Candidatos buscados em cada ranking (vetorial e BM25) = k × fator"
+    )
+    
+    RAG_LAMBDA_MMR: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Peso da relevância na diversificação MMR do RAG dos agentes (1.0 = sem diversificação)"
+    )
+    
+    MMR_FATOR_CANDIDATOS: int = Field(
+        default=4,
+        ge=1,
+        description="Candidatos avaliados pelo MMR = k × fator"
+    )
+    
+    CAMINHO_INDICE_DOCUMENTOS: str = Field(
+        default="./dados/indice_documentos.sqlite3",
+        description="Arquivo SQLite com o vetor (centroide) de cada documento, usado pela busca hierárquica"
+    )
+    
+    RAG_NUMERO_DOCUMENTOS_PRE_SELECAO: int = Field(
+        default=10,
+        gt=0,
+        description="Documentos pré-selecionados no primeiro estágio da busca hierárquica"
+    )
+    
     # ===== CONFIGURAÇÕES DE PROCESSAMENTO =====
     
     TAMANHO_MAXIMO_CHUNK: int = Field(
@@ -119,6 +357,31 @@ class Configuracoes(BaseSettings):
         description="Overlap (sobreposição) entre chunks consecutivos em tokens"
     )
     
+    ESTRATEGIA_CHUNKING: Literal["secoes_juridicas", "recursiva"] = Field(
+        default="recursiva",
+        description=(
+            "Estratégia de chunking (secoes_juridicas = respeita DOS FATOS/DO DIREITO/...). "
+            "Trocar a estratégia exige reindexar os documentos já ingeridos"
+        )
+    )
+    
+    REMOCAO_BOILERPLATE_ATIVADA: bool = Field(
+        default=True,
+        description="Remover cabeçalhos/rodapés repetidos entre páginas antes do chunking"
+    )
+    
+    FRACAO_MINIMA_PAGINAS_BOILERPLATE: float = Field(
+        default=0.6,
+        gt=0.0,
+        le=1.0,
+        description="Fração mínima de páginas em que uma linha deve se repetir para ser boilerplate"
+    )
+    
+    BOILERPLATE_MANTER_UMA_OCORRENCIA: bool = Field(
+        default=True,
+        description="Manter a primeira ocorrência de cada linha de boilerplate removida"
+    )
+    
     TAMANHO_MAXIMO_ARQUIVO_MB: int = Field(
         default=50,
         gt=0,
@@ -134,7 +397,12 @@ class Configuracoes(BaseSettings):
         default=".pdf,.docx,.png,.jpg,.jpeg",
         description="Tipos de arquivo aceitos no upload (separados por vírgula)"
     )
-    
+
+    BACKEND_EXTRACAO_PDF: Literal["pypdf2", "pypdfium2", "pdfminer"] = Field(
+        default="pypdf2",
+        description="Motor de extração de texto de PDFs (pypdf2, pypdfium2 ou pdfminer)"
+    )
+
     # ===== TESSERACT OCR =====
     
     TESSERACT_PATH: str = Field(
@@ -232,6 +500,39 @@ class Configuracoes(BaseSettings):
             if origem.strip()  # Ignora strings vazias
         ]
     
+    def obter_limites_chamadas_por_modelo(self) -> dict[str, int]:
+        """
+        Converte a string LLM_LIMITES_CHAMADAS_POR_MODELO em um dicionário.
+        
+        CONTEXTO:
+        Modelos diferentes têm rate limits diferentes na OpenAI (o gpt-4o
+        aguenta menos chamadas simultâneas que o gpt-4o-mini). Modelos fora
+        da lista usam LLM_MAX_CHAMADAS_SIMULTANEAS_POR_MODELO.
+        
+        Returns:
+            dict[str, int]: Limite de chamadas simultâneas por modelo
+            
+        Raises:
+            ValueError: Se algum item não estiver no formato "modelo=limite"
+            
+        Exemplo:
+            >>> config.LLM_LIMITES_CHAMADAS_POR_MODELO = "gpt-4o=4, gpt-4o-mini=12"
+            >>> config.obter_limites_chamadas_por_modelo()
+            {"gpt-4o": 4, "gpt-4o-mini": 12}
+        """
+        limites: dict[str, int] = {}
+        for item in self.LLM_LIMITES_CHAMADAS_POR_MODELO.split(","):
+            if not item.strip():
+                continue  # Ignora strings vazias
+            modelo, separador, limite = item.partition("=")
+            if not separador or not modelo.strip() or not limite.strip().isdigit():
+                raise ValueError(
+                    f"Item inválido em LLM_LIMITES_CHAMADAS_POR_MODELO: '{item.strip()}' "
+                    f"(formato esperado: modelo=limite)"
+                )
+            limites[modelo.strip()] = int(limite.strip())
+        return limites
+    
     def obter_lista_tipos_arquivo_aceitos(self) -> list[str]:
         """
         Converte a string TIPOS_ARQUIVO_ACEITOS em uma lista de extensões.
@@ -272,6 +573,21 @@ class Configuracoes(BaseSettings):
             bool: True se AMBIENTE == "production"
         """
         return self.AMBIENTE == "production"
+    
+    def usa_armazenamento_em_memoria(self) -> bool:
+        """
+        Verifica se os dados indexados vivem apenas na memória do processo.
+        
+        CONTEXTO:
+        Com BACKEND_BANCO_VETORIAL=numpy os vetores não são persistidos. O
+        catálogo, os índices lexical e de documentos e os textos canônicos
+        também ficam em memória: persistidos, sobreviveriam a um restart sem
+        os vetores e apontariam para chunks que não existem mais.
+        
+        Returns:
+            bool: True se BACKEND_BANCO_VETORIAL == "numpy"
+        """
+        return self.BACKEND_BANCO_VETORIAL == "numpy"
 
 
 @lru_cache()
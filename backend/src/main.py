@@ -39,6 +39,16 @@ from datetime import datetime
 # Importação das configurações
 from src.configuracao.configuracoes import obter_configuracoes
 
+# Banco vetorial compartilhado (uma conexão por processo)
+from src.servicos.servico_banco_vetorial import (
+    obter_servico_banco_vetorial,
+    aquecer_banco_vetorial,
+    encerrar_servico_banco_vetorial,
+)
+
+# Telemetria das chamadas ao LLM (endpoint de métricas)
+from src.utilitarios.gerenciador_llm import obter_metricas_llm
+
 # ===== CARREGAR CONFIGURAÇÕES =====
 
 # Obtém instância singleton de configurações
@@ -64,8 +74,16 @@ async def lifespan(app: FastAPI):
       (ex: fechar conexões, liberar recursos)
     
     IMPLEMENTAÇÃO:
-    Por enquanto, apenas logamos eventos. Em tarefas futuras, aqui será feito:
-    - Inicialização do ChromaDB
+    - Startup: abre antecipadamente a conexão ÚNICA com o ChromaDB (singleton
+      de servico_banco_vetorial, que rotas, orquestradores e agentes obtêm
+      via obter_servico_banco_vetorial()) e, se CHROMA_PRECARREGAR_INDICE,
+      carrega o índice vetorial antes da primeira requisição
+    - Shutdown: descarta o singleton do ChromaDB
+    
+    Se o ChromaDB falhar no startup, a aplicação sobe mesmo assim (health
+    check continua respondendo); a conexão é tentada de novo no primeiro uso.
+    
+    TAREFAS FUTURAS:
     - Verificação de conectividade com OpenAI API
     - Criação de pastas necessárias (logs, chroma_db)
     """
@@ -82,7 +100,21 @@ async def lifespan(app: FastAPI):
     print(f"📝 Log Level: {configuracoes.LOG_LEVEL}")
     print("=" * 60)
     
-    # TODO (TAREFA FUTURA): Inicializar ChromaDB aqui
+    # Inicializar ChromaDB (singleton compartilhado) e aquecer o índice
+    try:
+        cliente_chromadb, collection_chromadb = obter_servico_banco_vetorial()
+        print(f"🗄️  ChromaDB inicializado: collection '{collection_chromadb.name}'")
+        
+        if configuracoes.CHROMA_PRECARREGAR_INDICE:
+            estatisticas_aquecimento = aquecer_banco_vetorial(collection_chromadb)
+            print(
+                f"🔥 Índice vetorial pré-carregado: "
+                f"{estatisticas_aquecimento['numero_chunks']} chunks em "
+                f"{estatisticas_aquecimento['tempo_segundos']:.2f}s"
+            )
+    except Exception as erro:
+        print(f"⚠️  ChromaDB não inicializado no startup (será tentado no primeiro uso): {erro}")
+    
     # TODO (TAREFA FUTURA): Verificar conectividade com OpenAI
     # TODO (TAREFA FUTURA): Criar pastas necessárias
     
@@ -97,7 +129,8 @@ async def lifespan(app: FastAPI):
     print("🛑 ENCERRANDO PLATAFORMA JURÍDICA MULTI-AGENT")
     print("=" * 60)
     
-    # TODO (TAREFA FUTURA): Fechar conexões com ChromaDB
+    # Descartar conexão compartilhada com o ChromaDB
+    encerrar_servico_banco_vetorial()
     # TODO (TAREFA FUTURA): Salvar estado se necessário
     
     print("✅ Aplicação encerrada com sucesso!")
@@ -270,6 +303,30 @@ async def health_check():
     }
 
 
+@app.get("/metricas/llm")
+async def metricas_llm(chamadas_recentes: int = 20):
+    """
+    Métricas das chamadas ao LLM desde o início do processo.
+    
+    CONTEXTO DE NEGÓCIO:
+    Custo e latência do LLM dominam o tempo e o gasto de cada análise.
+    Este endpoint expõe a telemetria em memória do GerenciadorLLM para
+    dashboards e alertas: latência p50/p95/p99, tokens de entrada, saída e
+    raciocínio, custo, retries e erros por classe, no geral, por modelo e
+    por agente, além das últimas chamadas e do cache de respostas.
+    
+    Args:
+        chamadas_recentes: Quantas chamadas individuais incluir (máx. 500)
+    
+    Returns:
+        dict: Métricas agregadas do LLM
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **obter_metricas_llm(numero_chamadas_recentes=max(chamadas_recentes, 0)),
+    }
+
+
 # ===== REGISTRO DE ROTAS =====
 
 # TAREFA-003: Rotas de documentos (upload e gestão)
@@ -892,6 +892,8 @@ class ResultadoAnaliseProcesso(BaseModel):
     - pareceres_advogados: Dict com pareceres de cada advogado (chave = tipo)
     - pareceres_peritos: Dict com pareceres de cada perito (chave = tipo)
     - documento_continuacao: Documento gerado automaticamente
+    - uso_orcamento_tokens: Uso do orçamento de tokens do prompt de cada agente
+    - triagem_de_relevancia: Especialistas executados, rebaixados ou ignorados (e por quê)
     - timestamp_conclusao: Quando a análise foi concluída
     """
     peticao_id: str = Field(
@@ -926,6 +928,22 @@ class ResultadoAnaliseProcesso(BaseModel):
         description="Documento de continuação gerado automaticamente (pode ser None se ainda não disponível)"
     )
     
+    uso_orcamento_tokens: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description=(
+            "Uso do orçamento de tokens do prompt de cada agente "
+            "(chave = 'advogado_<tipo>', 'perito_<tipo>', 'estrategista' ou 'prognostico')"
+        )
+    )
+    
+    triagem_de_relevancia: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description=(
+            "Decisão da triagem de relevância de cada especialista selecionado: executar, "
+            "rebaixar (modelo rápido) ou pular, com o motivo (chave = 'advogado_<tipo>' ou 'perito_<tipo>')"
+        )
+    )
+    
     timestamp_conclusao: datetime = Field(
         default_factory=datetime.now,
         description="Timestamp de quando a análise foi concluída"
@@ -0,0 +1,380 @@
+"""
+Gerenciador de Eventos de Streaming - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Uma análise multi-agent leva dezenas de segundos (ou minutos, no caso de
+petições). O polling de status só mostra a etapa atual; com streaming o
+usuário acompanha o texto de cada agente (perito, advogado especialista,
+advogado coordenador) à medida que o LLM o gera.
+
+RESPONSABILIDADES:
+1. Manter um CANAL de eventos por análise (consulta_id ou peticao_id)
+2. Receber eventos publicados de QUALQUER thread ou event loop (a análise
+   roda em background, em outro loop / thread)
+3. Entregar os eventos aos assinantes (endpoints SSE) no event loop de cada um
+4. Guardar um histórico limitado, para que quem assina depois do início
+   receba o que já foi gerado (e para reconexões com Last-Event-ID)
+5. Descartar canais encerrados após um tempo de retenção e canais ociosos
+   (sem evento final) após um tempo máximo de inatividade
+
+TIPOS DE EVENTO:
+- "fragmento": trecho de texto gerado por um agente ({"agente", "texto"})
+- "concluida": análise terminou; o resultado estruturado é obtido pelo
+  endpoint de resultado de sempre (não muda com o streaming)
+- "erro": análise falhou ({"mensagem"})
+
+FORMATO SSE (Server-Sent Events):
+```
+id: 12
+event: fragmento
+data: {"agente": "medico", "texto": "O laudo indica..."}
+
+```
+
+THREAD-SAFETY:
+Cada canal tem um threading.Lock. A entrega para o assinante usa
+loop.call_soon_threadsafe(fila.put_nowait, evento): a fila asyncio do
+assinante só é tocada pelo loop dele.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+# Configuração do logger para este módulo
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONSTANTES
+# ==============================================================================
+
+TIPO_EVENTO_FRAGMENTO = "fragmento"
+TIPO_EVENTO_CONCLUIDA = "concluida"
+TIPO_EVENTO_ERRO = "erro"
+
+# Eventos que encerram o canal (o fluxo SSE termina depois deles)
+TIPOS_EVENTO_FINAIS = (TIPO_EVENTO_CONCLUIDA, TIPO_EVENTO_ERRO)
+
+# Histórico máximo por canal (cada evento é um fragmento de poucos caracteres;
+# uma análise com 6 agentes gera alguns milhares)
+NUMERO_MAXIMO_EVENTOS_POR_CANAL = 50_000
+
+# Tempo que um canal encerrado continua disponível para novos assinantes
+TEMPO_RETENCAO_CANAL_ENCERRADO_SEGUNDOS = 600
+
+# Tempo sem nenhum evento após o qual um canal NÃO encerrado é descartado
+# (análise que morreu sem publicar concluida / erro, ou assinatura de um ID
+# que nunca foi analisado). Os assinantes recebem um evento "erro" antes.
+TEMPO_MAXIMO_INATIVIDADE_CANAL_SEGUNDOS = 1800
+
+# Mensagens dos eventos "erro" publicados pelo próprio gerenciador
+MENSAGEM_CANAL_SUBSTITUIDO = "Análise reiniciada: acompanhe o novo fluxo de eventos"
+MENSAGEM_CANAL_EXPIRADO = "Fluxo de eventos expirado por inatividade"
+
+# Intervalo dos comentários de keep-alive do SSE (evita timeout de proxies)
+INTERVALO_KEEPALIVE_SSE_SEGUNDOS = 15.0
+
+
+# ==============================================================================
+# EVENTO
+# ==============================================================================
+
+@dataclass
+class EventoStreaming:
+    """
+    Um evento de uma análise, numerado em ordem crescente dentro do canal.
+    """
+    sequencia: int
+    tipo: str
+    dados: Dict[str, Any] = field(default_factory=dict)
+
+    def formatar_sse(self) -> str:
+        """
+        Formata o evento no protocolo Server-Sent Events.
+        """
+        dados_json = json.dumps(self.dados, ensure_ascii=False)
+        return f"id: {self.sequencia}\nevent: {self.tipo}\ndata: {dados_json}\n\n"
+
+
+# ==============================================================================
+# CANAL DE EVENTOS (UMA ANÁLISE)
+# ==============================================================================
+
+class CanalEventosStreaming:
+    """
+    Canal de eventos de uma única análise.
+
+    Publicação é síncrona e pode vir de qualquer thread; assinatura é um
+    iterador assíncrono no event loop do assinante.
+    """
+
+    def __init__(self, maximo_eventos: int = NUMERO_MAXIMO_EVENTOS_POR_CANAL):
+        self._lock = threading.Lock()
+        self._eventos: Deque[EventoStreaming] = deque(maxlen=maximo_eventos)
+        self._assinantes: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._proxima_sequencia = 1
+        self.encerrado_em: Optional[float] = None
+        # Criação ou último evento publicado (base da expiração por inatividade)
+        self.ultima_atividade_em: float = time.time()
+
+    @property
+    def encerrado(self) -> bool:
+        return self.encerrado_em is not None
+
+    def publicar(self, tipo: str, dados: Optional[Dict[str, Any]] = None) -> Optional[EventoStreaming]:
+        """
+        Publica um evento para o histórico e para todos os assinantes.
+
+        Eventos publicados depois do encerramento são ignorados.
+
+        Returns:
+            O evento publicado, ou None se o canal já estava encerrado
+        """
+        with self._lock:
+            if self.encerrado:
+                return None
+
+            evento = EventoStreaming(sequencia=self._proxima_sequencia, tipo=tipo, dados=dados or {})
+            self._proxima_sequencia += 1
+            self._eventos.append(evento)
+            self.ultima_atividade_em = time.time()
+            if tipo in TIPOS_EVENTO_FINAIS:
+                self.encerrado_em = self.ultima_atividade_em
+
+            assinantes_ativos = []
+            for loop, fila in self._assinantes:
+                try:
+                    loop.call_soon_threadsafe(fila.put_nowait, evento)
+                    assinantes_ativos.append((loop, fila))
+                except RuntimeError:
+                    # Loop do assinante já foi fechado (cliente desconectou)
+                    logger.debug("Assinante de streaming removido: event loop fechado")
+            self._assinantes = assinantes_ativos
+
+        return evento
+
+    async def assinar(
+        self,
+        a_partir_de: int = 0,
+        intervalo_keepalive_segundos: Optional[float] = None
+    ) -> AsyncIterator[Optional[EventoStreaming]]:
+        """
+        Itera sobre os eventos do canal: primeiro o histórico, depois os novos.
+
+        Termina depois do evento final (concluida / erro).
+
+        Args:
+            a_partir_de: Só entrega eventos com sequência maior que esta
+                        (Last-Event-ID de uma reconexão)
+            intervalo_keepalive_segundos: Se informado, produz None quando
+                        nenhum evento chega nesse intervalo (keep-alive)
+
+        Yields:
+            EventoStreaming, ou None como sinal de keep-alive
+        """
+        loop = asyncio.get_running_loop()
+        fila: asyncio.Queue = asyncio.Queue()
+
+        # Histórico e registro sob o mesmo lock: nenhum evento se perde ou duplica
+        with self._lock:
+            historico = [evento for evento in self._eventos if evento.sequencia > a_partir_de]
+            ja_encerrado = self.encerrado
+            if not ja_encerrado:
+                self._assinantes.append((loop, fila))
+
+        try:
+            for evento in historico:
+                yield evento
+            if ja_encerrado:
+                return
+
+            while True:
+                try:
+                    evento = await asyncio.wait_for(fila.get(), timeout=intervalo_keepalive_segundos)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                yield evento
+                if evento.tipo in TIPOS_EVENTO_FINAIS:
+                    return
+        finally:
+            with self._lock:
+                self._assinantes = [
+                    (loop_assinante, fila_assinante)
+                    for loop_assinante, fila_assinante in self._assinantes
+                    if fila_assinante is not fila
+                ]
+
+
+# ==============================================================================
+# GERENCIADOR (TODOS OS CANAIS)
+# ==============================================================================
+
+class GerenciadorEventosStreaming:
+    """
+    Registro dos canais de streaming, indexados pelo ID da análise.
+
+    EXEMPLO DE USO:
+    ```python
+    gerenciador = obter_gerenciador_eventos_streaming()
+
+    # Na análise (background)
+    gerenciador.abrir_canal(consulta_id)
+    emissor = gerenciador.criar_emissor_de_fragmentos(consulta_id)
+    emissor("medico", "O laudo indica...")
+    gerenciador.publicar(consulta_id, TIPO_EVENTO_CONCLUIDA)
+
+    # No endpoint SSE
+    canal = gerenciador.obter_canal(consulta_id)
+    async for texto_sse in gerar_fluxo_sse(canal):
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        tempo_retencao_segundos: float = TEMPO_RETENCAO_CANAL_ENCERRADO_SEGUNDOS,
+        tempo_maximo_inatividade_segundos: float = TEMPO_MAXIMO_INATIVIDADE_CANAL_SEGUNDOS
+    ):
+        self._lock = threading.Lock()
+        self._canais: Dict[str, CanalEventosStreaming] = {}
+        self._tempo_retencao_segundos = tempo_retencao_segundos
+        self._tempo_maximo_inatividade_segundos = tempo_maximo_inatividade_segundos
+
+    def abrir_canal(self, id_analise: str) -> CanalEventosStreaming:
+        """
+        Cria um canal novo para a análise (substitui o de uma execução anterior).
+
+        Chamado no início da análise: uma reanálise da mesma petição não
+        reaproveita os eventos da execução anterior. Se o canal anterior ainda
+        não foi encerrado, ele recebe um evento "erro" final: seus assinantes
+        terminam o fluxo (e podem reassinar) em vez de receber só keep-alives.
+        """
+        with self._lock:
+            self._remover_canais_expirados()
+            canal_anterior = self._canais.get(id_analise)
+            canal = CanalEventosStreaming()
+            self._canais[id_analise] = canal
+
+        if canal_anterior is not None:
+            canal_anterior.publicar(TIPO_EVENTO_ERRO, {"mensagem": MENSAGEM_CANAL_SUBSTITUIDO})
+        return canal
+
+    def obter_canal(self, id_analise: str) -> CanalEventosStreaming:
+        """
+        Retorna o canal da análise, criando-o se ainda não existir.
+
+        Um cliente pode assinar antes de a análise (em fila) abrir o canal;
+        nesse caso ele espera pelo canal criado aqui.
+        """
+        with self._lock:
+            self._remover_canais_expirados()
+            canal = self._canais.get(id_analise)
+            if canal is None:
+                canal = CanalEventosStreaming()
+                self._canais[id_analise] = canal
+        return canal
+
+    def publicar(self, id_analise: str, tipo: str, dados: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Publica um evento no canal da análise (pode ser chamado de qualquer thread).
+        """
+        self.obter_canal(id_analise).publicar(tipo, dados)
+
+    def criar_emissor_de_fragmentos(self, id_analise: str) -> Callable[[str, str], None]:
+        """
+        Retorna um callback (agente, fragmento) que publica eventos "fragmento".
+
+        É o callback repassado a delegar_para_peritos() /
+        delegar_para_advogados_especialistas() e aos orquestradores.
+        """
+        canal = self.obter_canal(id_analise)
+
+        def emitir_fragmento(agente: str, texto: str) -> None:
+            canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": agente, "texto": texto})
+
+        return emitir_fragmento
+
+    def _remover_canais_expirados(self) -> None:
+        """
+        Descarta canais encerrados há mais que o tempo de retenção e canais
+        sem evento há mais que o tempo máximo de inatividade.
+
+        Um canal ocioso ainda aberto é encerrado com um evento "erro" antes de
+        ser descartado, para que os assinantes não fiquem presos em keep-alives.
+
+        IMPORTANTE: deve ser chamado com self._lock adquirido.
+        """
+        agora = time.time()
+        ids_expirados = []
+        for id_analise, canal in self._canais.items():
+            if canal.encerrado_em is not None:
+                if agora - canal.encerrado_em > self._tempo_retencao_segundos:
+                    ids_expirados.append(id_analise)
+            elif agora - canal.ultima_atividade_em > self._tempo_maximo_inatividade_segundos:
+                canal.publicar(TIPO_EVENTO_ERRO, {"mensagem": MENSAGEM_CANAL_EXPIRADO})
+                ids_expirados.append(id_analise)
+                logger.warning(f"Canal de streaming '{id_analise}' expirado por inatividade")
+
+        for id_analise in ids_expirados:
+            del self._canais[id_analise]
+
+
+async def gerar_fluxo_sse(
+    canal: CanalEventosStreaming,
+    a_partir_de: int = 0,
+    intervalo_keepalive_segundos: float = INTERVALO_KEEPALIVE_SSE_SEGUNDOS
+) -> AsyncIterator[str]:
+    """
+    Gera o corpo text/event-stream de um canal (usado pelos endpoints SSE).
+
+    Args:
+        canal: Canal da análise
+        a_partir_de: Último ID de evento já recebido pelo cliente (Last-Event-ID)
+        intervalo_keepalive_segundos: Intervalo dos comentários de keep-alive
+
+    Yields:
+        str: Eventos no formato SSE
+    """
+    async for evento in canal.assinar(a_partir_de, intervalo_keepalive_segundos):
+        if evento is None:
+            yield ": keep-alive\n\n"
+        else:
+            yield evento.formatar_sse()
+
+
+# ==============================================================================
+# SINGLETON
+# ==============================================================================
+
+_instancia_gerenciador_streaming: Optional[GerenciadorEventosStreaming] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_gerenciador_eventos_streaming() -> GerenciadorEventosStreaming:
+    """
+    Obtém a instância singleton do gerenciador de eventos de streaming.
+
+    THREAD-SAFETY:
+    Usa double-checked locking (a análise publica a partir de threads de
+    background, os endpoints SSE assinam a partir do event loop da API).
+
+    Returns:
+        Instância singleton do GerenciadorEventosStreaming
+    """
+    global _instancia_gerenciador_streaming
+
+    if _instancia_gerenciador_streaming is None:
+        with _lock_singleton:
+            if _instancia_gerenciador_streaming is None:
+                _instancia_gerenciador_streaming = GerenciadorEventosStreaming()
+                logger.info("✅ Gerenciador de eventos de streaming inicializado")
+
+    return _instancia_gerenciador_streaming
@@ -12,6 +12,8 @@ RESPONSABILIDADES:
 3. EXECUÇÃO PARALELA: Advogados e peritos em paralelo para otimizar tempo
 4. INTEGRAÇÃO CONTEXTUAL: Compilar contexto completo (petição + documentos + RAG)
 5. TRATAMENTO DE ERROS: Continuar execução mesmo se um agente falhar
+6. TRIAGEM DE RELEVÂNCIA: Pular (ou rodar com o modelo rápido) especialistas
+   pouco aderentes ao caso antes de pagar uma chamada ao LLM por eles
 
 FLUXO DE EXECUÇÃO:
 1. Recuperar petição e documentos do ChromaDB
@@ -73,10 +75,9 @@ TAREFAS RELACIONADAS:
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+from functools import lru_cache, partial
 
 # Importar modelos de dados
 from src.modelos.processo import (
@@ -97,7 +98,7 @@ from src.servicos.gerenciador_estado_peticoes import (
 )
 from src.servicos.servico_banco_vetorial import (
     obter_servico_banco_vetorial,
-    obter_documento_por_id,
+    obter_textos_completos_dos_documentos,
     buscar_chunks_similares
 )
 from src.servicos.servico_geracao_documento import (
@@ -120,7 +121,13 @@ from src.agentes.agente_perito_medico import AgentePeritoMedico
 from src.agentes.agente_perito_seguranca_trabalho import AgentePeritoSegurancaTrabalho
 
 # Importar exceções
-from src.utilitarios.gerenciador_llm import ErroGeralAPI
+from src.utilitarios.gerenciador_llm import CallbackDeFragmento, ErroGeralAPI
+
+# Seções do orçamento de tokens dos prompts
+from src.utilitarios.orcamento_prompt import SECAO_ANEXOS, SECAO_PETICAO
+
+# Triagem de relevância dos especialistas selecionados
+from src.utilitarios.triagem_relevancia import DECISAO_PULAR, aplicar_triagem
 
 
 # Configuração do logger
@@ -144,6 +151,9 @@ MAPA_PERITOS = {
     "seguranca_trabalho": AgentePeritoSegurancaTrabalho
 }
 
+# Identificador dos fragmentos do documento de continuação no streaming
+IDENTIFICADOR_DOCUMENTO_CONTINUACAO_STREAMING = "documento_continuacao"
+
 
 # ==============================================================================
 # CLASSE ORQUESTRADOR DE ANÁLISE DE PETIÇÕES
@@ -169,7 +179,7 @@ class OrquestradorAnalisePeticoes:
     - servico_rag: Serviço de banco vetorial (ChromaDB)
     - agente_estrategista: Instância do AgenteEstrategistaProcessual
     - agente_prognostico: Instância do AgentePrognostico
-    - max_workers_paralelo: Número máximo de threads para execução paralela
+    - max_workers_paralelo: Número máximo de agentes chamando o LLM ao mesmo tempo
     
     EXEMPLO:
     ```python
@@ -190,21 +200,27 @@ class OrquestradorAnalisePeticoes:
     
     def __init__(
         self,
-        max_workers_paralelo: int = 5
+        max_workers_paralelo: int = 5,
+        banco_vetorial: Optional[Tuple[Any, Any]] = None
     ):
         """
         Inicializa o Orquestrador de Análise de Petições.
         
         Args:
-            max_workers_paralelo: Número máximo de threads para execução paralela (padrão: 5)
+            max_workers_paralelo: Número máximo de agentes chamando o LLM ao mesmo
+                tempo em cada etapa paralela (padrão: 5)
+            banco_vetorial: (cliente, collection) do ChromaDB. Se None, usa o
+                singleton compartilhado (obter_servico_banco_vetorial).
         """
         logger.info("🚀 Inicializando Orquestrador de Análise de Petições...")
         
         # Gerenciadores
         self.gerenciador_peticoes = obter_gerenciador_estado_peticoes()
         
-        # Cliente e Collection do ChromaDB (tupla)
-        self.cliente_chromadb, self.collection_chromadb = obter_servico_banco_vetorial()
+        # Cliente e Collection do ChromaDB (tupla compartilhada)
+        self.cliente_chromadb, self.collection_chromadb = (
+            banco_vetorial if banco_vetorial is not None else obter_servico_banco_vetorial()
+        )
         
         # Agentes especializados (instâncias únicas)
         self.agente_estrategista = AgenteEstrategistaProcessual()
@@ -225,7 +241,8 @@ class OrquestradorAnalisePeticoes:
         self,
         peticao_id: str,
         advogados_selecionados: List[str],
-        peritos_selecionados: List[str]
+        peritos_selecionados: List[str],
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None
     ) -> ResultadoAnaliseProcesso:
         """
         Analisa petição inicial de forma completa com todos os agentes selecionados.
@@ -254,6 +271,11 @@ class OrquestradorAnalisePeticoes:
             peticao_id: ID único da petição
             advogados_selecionados: Lista de advogados especialistas (ex: ["trabalhista", "civel"])
             peritos_selecionados: Lista de peritos técnicos (ex: ["medico", "seguranca_trabalho"])
+            ao_receber_fragmento: Callback de streaming (agente, fragmento) que recebe o
+                                  texto dos pareceres de advogados e peritos e do
+                                  documento de continuação (agente =
+                                  IDENTIFICADOR_DOCUMENTO_CONTINUACAO_STREAMING)
+                                  enquanto é gerado. O resultado retornado não muda.
         
         Returns:
             ResultadoAnaliseProcesso: Resultado completo estruturado
@@ -313,9 +335,18 @@ class OrquestradorAnalisePeticoes:
                 progresso=25
             )
             
-            pareceres_advogados = self._executar_advogados_paralelo(
+            # Uso do orçamento de tokens do prompt de cada agente (metadados do resultado)
+            uso_orcamento_tokens: Dict[str, Dict[str, Any]] = {}
+            
+            # Decisão da triagem de relevância de cada especialista (metadados do resultado)
+            triagem_de_relevancia: Dict[str, Dict[str, Any]] = {}
+            
+            pareceres_advogados = await self._executar_advogados_paralelo(
                 advogados_selecionados=advogados_selecionados,
-                contexto=contexto_completo
+                contexto=contexto_completo,
+                ao_receber_fragmento=ao_receber_fragmento,
+                uso_orcamento_tokens=uso_orcamento_tokens,
+                triagem_de_relevancia=triagem_de_relevancia
             )
             
             logger.info(
@@ -331,9 +362,12 @@ class OrquestradorAnalisePeticoes:
                 progresso=55
             )
             
-            pareceres_peritos = self._executar_peritos_paralelo(
+            pareceres_peritos = await self._executar_peritos_paralelo(
                 peritos_selecionados=peritos_selecionados,
-                contexto=contexto_completo
+                contexto=contexto_completo,
+                ao_receber_fragmento=ao_receber_fragmento,
+                uso_orcamento_tokens=uso_orcamento_tokens,
+                triagem_de_relevancia=triagem_de_relevancia
             )
             
             logger.info(
@@ -349,11 +383,12 @@ class OrquestradorAnalisePeticoes:
                 progresso=75
             )
             
-            proximos_passos = self._executar_estrategista(
+            proximos_passos = await self._executar_estrategista(
                 peticao=peticao,
                 contexto=contexto_completo,
                 pareceres_advogados=pareceres_advogados,
-                pareceres_peritos=pareceres_peritos
+                pareceres_peritos=pareceres_peritos,
+                uso_orcamento_tokens=uso_orcamento_tokens
             )
             
             logger.info(
@@ -368,12 +403,13 @@ class OrquestradorAnalisePeticoes:
                 progresso=85
             )
             
-            prognostico = self._executar_prognostico(
+            prognostico = await self._executar_prognostico(
                 peticao=peticao,
                 contexto=contexto_completo,
                 pareceres_advogados=pareceres_advogados,
                 pareceres_peritos=pareceres_peritos,
-                proximos_passos=proximos_passos
+                proximos_passos=proximos_passos,
+                uso_orcamento_tokens=uso_orcamento_tokens
             )
             
             logger.info(
@@ -391,13 +427,17 @@ class OrquestradorAnalisePeticoes:
             )
 
             try:
-                documento_continuacao = self._gerar_documento_continuacao(
+                documento_continuacao = await self._gerar_documento_continuacao(
                     peticao=peticao,
                     contexto=contexto_completo,
                     proximos_passos=proximos_passos,
                     prognostico=prognostico,
                     pareceres_advogados=pareceres_advogados,
-                    pareceres_peritos=pareceres_peritos
+                    pareceres_peritos=pareceres_peritos,
+                    ao_receber_fragmento=(
+                        partial(ao_receber_fragmento, IDENTIFICADOR_DOCUMENTO_CONTINUACAO_STREAMING)
+                        if ao_receber_fragmento else None
+                    )
                 )
 
                 if documento_continuacao is not None:
@@ -429,6 +469,8 @@ class OrquestradorAnalisePeticoes:
                 pareceres_advogados=pareceres_advogados,
                 pareceres_peritos=pareceres_peritos,
                 documento_continuacao=documento_continuacao,
+                uso_orcamento_tokens=uso_orcamento_tokens,
+                triagem_de_relevancia=triagem_de_relevancia,
                 timestamp_conclusao=timestamp_conclusao
             )
             
@@ -489,35 +531,27 @@ class OrquestradorAnalisePeticoes:
         try:
             logger.info(f"🔍 Recuperando documentos da petição do RAG...")
             
-            # Recuperar petição inicial
-            # NOTA: obter_documento_por_id retorna dict com "documents" (lista de chunks),
-            # não "texto_completo". Precisamos concatenar os chunks.
-            doc_peticao = obter_documento_por_id(
+            # Recuperar petição inicial e documentos complementares em lote
+            # (texto canônico gravado na ingestão; documentos antigos são
+            # reconstruídos a partir dos chunks em UMA consulta ao ChromaDB)
+            textos_por_id = obter_textos_completos_dos_documentos(
                 collection=self.collection_chromadb,
-                documento_id=peticao.documento_peticao_id
+                documento_ids=[peticao.documento_peticao_id] + list(peticao.documentos_enviados)
             )
-            if not doc_peticao or doc_peticao.get("count", 0) == 0:
-                raise ValueError(f"Documento da petição {peticao.documento_peticao_id} não encontrado no RAG")
             
-            # Concatenar chunks da petição para formar texto completo
-            chunks_peticao = doc_peticao.get("documents", [])
-            peticao_texto = "\n\n".join(chunks_peticao)
+            peticao_texto = textos_por_id.get(peticao.documento_peticao_id, "")
+            if not peticao_texto:
+                raise ValueError(f"Documento da petição {peticao.documento_peticao_id} não encontrado no RAG")
             
-            logger.debug(f"Petição recuperada: {doc_peticao.get('count', 0)} chunks, {len(peticao_texto)} chars")
+            logger.debug(f"Petição recuperada: {len(peticao_texto)} chars")
             
-            # Recuperar documentos complementares
+            # Documentos complementares (na ordem em que foram enviados)
             documentos_texto = []
             for doc_id in peticao.documentos_enviados:
-                doc = obter_documento_por_id(
-                    collection=self.collection_chromadb,
-                    documento_id=doc_id
-                )
-                if doc and doc.get("count", 0) > 0:
-                    # Concatenar chunks do documento
-                    chunks_doc = doc.get("documents", [])
-                    texto_doc = "\n\n".join(chunks_doc)
+                texto_doc = textos_por_id.get(doc_id, "")
+                if texto_doc:
                     documentos_texto.append(texto_doc)
-                    logger.debug(f"Documento complementar {doc_id}: {doc.get('count', 0)} chunks")
+                    logger.debug(f"Documento complementar {doc_id}: {len(texto_doc)} chars")
                 else:
                     logger.warning(f"⚠️ Documento {doc_id} não encontrado no RAG")
             
@@ -545,82 +579,110 @@ class OrquestradorAnalisePeticoes:
             logger.error(f"❌ Erro ao montar contexto RAG: {erro}")
             raise
     
-    def _executar_advogados_paralelo(
+    async def _executar_advogados_paralelo(
         self,
         advogados_selecionados: List[str],
-        contexto: Dict[str, Any]
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None,
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None,
+        triagem_de_relevancia: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, ParecerAdvogado]:
         """
         Executa advogados especialistas em paralelo.
         
         CONTEXTO:
-        Usa ThreadPoolExecutor para executar múltiplos advogados simultaneamente,
-        reduzindo o tempo total de análise. Tratamento robusto de erros: se um
-        advogado falhar, continua com os outros.
+        Executa múltiplos advogados simultaneamente como corrotinas
+        (AgenteBase.processar_async), reduzindo o tempo total de análise sem
+        ocupar uma thread por chamada ao LLM. No máximo max_workers_paralelo
+        advogados chamam o LLM ao mesmo tempo (asyncio.Semaphore).
+        Tratamento robusto de erros: se um advogado falhar, continua com os outros.
+        
+        TRIAGEM DE RELEVÂNCIA:
+        Antes das chamadas, triar_agentes() compara o caso com as palavras-chave
+        de cada advogado selecionado: os pouco aderentes não são executados e os
+        de aderência parcial rodam com o modelo rápido (se LLM_CASCATA_ATIVADA).
         
         Args:
             advogados_selecionados: Lista de IDs de advogados (ex: ["trabalhista", "civel"])
             contexto: Contexto RAG completo
+            ao_receber_fragmento: Callback de streaming (advogado_id, fragmento)
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens
+                                  do prompt de cada advogado ("advogado_<id>")
+            triagem_de_relevancia: (Opcional) Recebe a decisão da triagem de cada
+                                   advogado ("advogado_<id>")
         
         Returns:
-            Dict mapeando ID do advogado para seu ParecerAdvogado
+            Dict mapeando ID do advogado para seu ParecerAdvogado (sem os ignorados
+            pela triagem)
         """
         if not advogados_selecionados:
             logger.info("ℹ️ Nenhum advogado especialista selecionado")
             return {}
         
-        logger.info(f"👔 Executando {len(advogados_selecionados)} advogados em paralelo...")
-        
         pareceres = {}
         
-        with ThreadPoolExecutor(max_workers=self.max_workers_paralelo) as executor:
-            # Criar futures para cada advogado
-            futures = {}
-            for advogado_id in advogados_selecionados:
-                if advogado_id not in MAPA_ADVOGADOS_ESPECIALISTAS:
-                    logger.warning(f"⚠️ Advogado '{advogado_id}' não reconhecido, ignorando")
-                    continue
-                
-                # Instanciar agente
-                classe_agente = MAPA_ADVOGADOS_ESPECIALISTAS[advogado_id]
-                agente = classe_agente()
-                
-                # Submeter execução
-                future = executor.submit(
-                    self._executar_agente_advogado,
+        limite_concorrencia = asyncio.Semaphore(self.max_workers_paralelo)
+        
+        # Instanciar agentes
+        agentes = {}
+        for advogado_id in advogados_selecionados:
+            if advogado_id not in MAPA_ADVOGADOS_ESPECIALISTAS:
+                logger.warning(f"⚠️ Advogado '{advogado_id}' não reconhecido, ignorando")
+                continue
+            agentes[advogado_id] = MAPA_ADVOGADOS_ESPECIALISTAS[advogado_id]()
+        
+        triagem = aplicar_triagem(agentes, self._texto_do_caso(contexto), "advogado", triagem_de_relevancia)
+        
+        # Criar uma corrotina para cada advogado aprovado na triagem
+        execucoes = []
+        for advogado_id, agente in agentes.items():
+            if triagem[advogado_id].decisao == DECISAO_PULAR:
+                continue
+            
+            execucoes.append(self._executar_com_limite(
+                limite_concorrencia,
+                advogado_id,
+                self._executar_agente_advogado(
                     agente=agente,
                     advogado_id=advogado_id,
-                    contexto=contexto
+                    contexto=contexto,
+                    ao_receber_fragmento=partial(ao_receber_fragmento, advogado_id) if ao_receber_fragmento else None,
+                    uso_orcamento_tokens=uso_orcamento_tokens,
+                    modelo_customizado=triagem[advogado_id].modelo
                 )
-                futures[future] = advogado_id
+            ))
+        
+        logger.info(f"👔 Executando {len(execucoes)} advogados em paralelo...")
+        
+        # Coletar resultados conforme concluem
+        advogados_concluidos = 0
+        total_advogados = len(execucoes)
+        
+        for proxima_execucao in asyncio.as_completed(execucoes):
+            advogado_id, parecer, erro = await proxima_execucao
+            if erro is not None:
+                logger.error(f"❌ Erro no advogado '{advogado_id}': {erro}")
+                # Continua com os outros advogados
+                continue
             
-            # Coletar resultados conforme concluem
-            advogados_concluidos = 0
-            total_advogados = len(advogados_selecionados)
+            pareceres[advogado_id] = parecer
+            advogados_concluidos += 1
             
-            for future in as_completed(futures):
-                advogado_id = futures[future]
-                try:
-                    parecer = future.result()
-                    pareceres[advogado_id] = parecer
-                    advogados_concluidos += 1
-                    
-                    # Atualizar progresso incremental (20% → 50%)
-                    progresso_parcial = 20 + int((advogados_concluidos / total_advogados) * 30)
-                    logger.info(f"✅ Advogado '{advogado_id}' concluído ({advogados_concluidos}/{total_advogados})")
-                    
-                except Exception as erro:
-                    logger.error(f"❌ Erro no advogado '{advogado_id}': {erro}")
-                    # Continua com os outros advogados
+            # Atualizar progresso incremental (20% → 50%)
+            progresso_parcial = 20 + int((advogados_concluidos / total_advogados) * 30)
+            logger.info(f"✅ Advogado '{advogado_id}' concluído ({advogados_concluidos}/{total_advogados})")
         
         logger.info(f"✅ Advogados concluídos: {len(pareceres)}/{len(advogados_selecionados)}")
         return pareceres
     
-    def _executar_agente_advogado(
+    async def _executar_agente_advogado(
         self,
         agente: Any,
         advogado_id: str,
-        contexto: Dict[str, Any]
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None,
+        modelo_customizado: Optional[str] = None
     ) -> ParecerAdvogado:
         """
         Executa um agente advogado específico.
@@ -629,6 +691,10 @@ class OrquestradorAnalisePeticoes:
             agente: Instância do agente advogado
             advogado_id: ID do advogado (para logging)
             contexto: Contexto RAG completo
+            ao_receber_fragmento: Callback de streaming do parecer (opcional)
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens do prompt
+            modelo_customizado: (Opcional) Modelo definido pela triagem de relevância
+                                (agente rebaixado para o modelo rápido)
         
         Returns:
             ParecerAdvogado gerado pelo agente
@@ -643,8 +709,8 @@ class OrquestradorAnalisePeticoes:
             f"Identifique riscos, oportunidades, fundamentos legais e recomendações específicas."
         )
         
-        # Chamar método processar() do agente (método correto da classe AgenteBase)
-        # NOTA: processar() retorna Dict[str, Any] com a estrutura:
+        # Chamar método processar_async() do agente (classe AgenteBase)
+        # NOTA: processar_async() retorna Dict[str, Any] com a estrutura:
         # {
         #     "agente": str,
         #     "parecer": str,  ← texto da análise aqui
@@ -653,11 +719,19 @@ class OrquestradorAnalisePeticoes:
         #     "modelo_utilizado": str,
         #     "metadados": dict
         # }
-        resultado_processamento = agente.processar(
+        # Petição e anexos em seções separadas do orçamento de tokens: se não
+        # couberem, cada um é reduzido aos trechos mais relevantes para este agente
+        resultado_processamento = await agente.processar_async(
             contexto_de_documentos=[contexto["peticao_texto"]] + contexto["documentos_texto"],
             pergunta_do_usuario=prompt,
-            metadados_adicionais={"tipo_acao": contexto["tipo_acao"]}
+            metadados_adicionais={"tipo_acao": contexto["tipo_acao"]},
+            modelo_customizado=modelo_customizado,
+            ao_receber_fragmento=ao_receber_fragmento,
+            secoes_dos_documentos=[SECAO_PETICAO] + [SECAO_ANEXOS] * len(contexto["documentos_texto"])
         )
+        uso_do_orcamento = resultado_processamento.get("metadados", {}).get("orcamento_de_tokens")
+        if uso_orcamento_tokens is not None and uso_do_orcamento is not None:
+            uso_orcamento_tokens[f"advogado_{advogado_id}"] = uso_do_orcamento
         
         # Extrair o texto do parecer do dicionário retornado
         parecer_texto = resultado_processamento.get("parecer", "")
@@ -678,21 +752,29 @@ class OrquestradorAnalisePeticoes:
         
         return parecer
     
-    def _executar_peritos_paralelo(
+    async def _executar_peritos_paralelo(
         self,
         peritos_selecionados: List[str],
-        contexto: Dict[str, Any]
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[Callable[[str, str], None]] = None,
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None,
+        triagem_de_relevancia: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, ParecerPerito]:
         """
         Executa peritos técnicos em paralelo.
         
         CONTEXTO:
         Similar a _executar_advogados_paralelo, mas para peritos técnicos.
-        Execução paralela com tratamento robusto de erros.
+        Execução concorrente (corrotinas, limitada por max_workers_paralelo)
+        com tratamento robusto de erros e triagem de relevância.
         
         Args:
             peritos_selecionados: Lista de IDs de peritos (ex: ["medico", "seguranca_trabalho"])
             contexto: Contexto RAG completo
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens
+                                  do prompt de cada perito ("perito_<id>")
+            triagem_de_relevancia: (Opcional) Recebe a decisão da triagem de cada
+                                   perito ("perito_<id>")
         
         Returns:
             Dict mapeando ID do perito para seu ParecerPerito
@@ -701,58 +783,70 @@ class OrquestradorAnalisePeticoes:
             logger.info("ℹ️ Nenhum perito técnico selecionado")
             return {}
         
-        logger.info(f"🔬 Executando {len(peritos_selecionados)} peritos em paralelo...")
-        
         pareceres = {}
         
-        with ThreadPoolExecutor(max_workers=self.max_workers_paralelo) as executor:
-            # Criar futures para cada perito
-            futures = {}
-            for perito_id in peritos_selecionados:
-                if perito_id not in MAPA_PERITOS:
-                    logger.warning(f"⚠️ Perito '{perito_id}' não reconhecido, ignorando")
-                    continue
-                
-                # Instanciar agente
-                classe_agente = MAPA_PERITOS[perito_id]
-                agente = classe_agente()
-                
-                # Submeter execução
-                future = executor.submit(
-                    self._executar_agente_perito,
+        limite_concorrencia = asyncio.Semaphore(self.max_workers_paralelo)
+        
+        # Instanciar agentes
+        agentes = {}
+        for perito_id in peritos_selecionados:
+            if perito_id not in MAPA_PERITOS:
+                logger.warning(f"⚠️ Perito '{perito_id}' não reconhecido, ignorando")
+                continue
+            agentes[perito_id] = MAPA_PERITOS[perito_id]()
+        
+        triagem = aplicar_triagem(agentes, self._texto_do_caso(contexto), "perito", triagem_de_relevancia)
+        
+        # Criar uma corrotina para cada perito aprovado na triagem
+        execucoes = []
+        for perito_id, agente in agentes.items():
+            if triagem[perito_id].decisao == DECISAO_PULAR:
+                continue
+            
+            execucoes.append(self._executar_com_limite(
+                limite_concorrencia,
+                perito_id,
+                self._executar_agente_perito(
                     agente=agente,
                     perito_id=perito_id,
-                    contexto=contexto
+                    contexto=contexto,
+                    ao_receber_fragmento=partial(ao_receber_fragmento, perito_id) if ao_receber_fragmento else None,
+                    uso_orcamento_tokens=uso_orcamento_tokens,
+                    modelo_customizado=triagem[perito_id].modelo
                 )
-                futures[future] = perito_id
+            ))
+        
+        logger.info(f"🔬 Executando {len(execucoes)} peritos em paralelo...")
+        
+        # Coletar resultados conforme concluem
+        peritos_concluidos = 0
+        total_peritos = len(execucoes)
+        
+        for proxima_execucao in asyncio.as_completed(execucoes):
+            perito_id, parecer, erro = await proxima_execucao
+            if erro is not None:
+                logger.error(f"❌ Erro no perito '{perito_id}': {erro}")
+                # Continua com os outros peritos
+                continue
             
-            # Coletar resultados conforme concluem
-            peritos_concluidos = 0
-            total_peritos = len(peritos_selecionados)
+            pareceres[perito_id] = parecer
+            peritos_concluidos += 1
             
-            for future in as_completed(futures):
-                perito_id = futures[future]
-                try:
-                    parecer = future.result()
-                    pareceres[perito_id] = parecer
-                    peritos_concluidos += 1
-                    
-                    # Atualizar progresso incremental (50% → 70%)
-                    progresso_parcial = 50 + int((peritos_concluidos / total_peritos) * 20)
-                    logger.info(f"✅ Perito '{perito_id}' concluído ({peritos_concluidos}/{total_peritos})")
-                    
-                except Exception as erro:
-                    logger.error(f"❌ Erro no perito '{perito_id}': {erro}")
-                    # Continua com os outros peritos
+            # Atualizar progresso incremental (50% → 70%)
+            progresso_parcial = 50 + int((peritos_concluidos / total_peritos) * 20)
+            logger.info(f"✅ Perito '{perito_id}' concluído ({peritos_concluidos}/{total_peritos})")
         
         logger.info(f"✅ Peritos concluídos: {len(pareceres)}/{len(peritos_selecionados)}")
         return pareceres
     
-    def _executar_agente_perito(
+    async def _executar_agente_perito(
         self,
         agente: Any,
         perito_id: str,
-        contexto: Dict[str, Any]
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None,
+        modelo_customizado: Optional[str] = None
     ) -> ParecerPerito:
         """
         Executa um agente perito específico.
@@ -761,6 +855,10 @@ class OrquestradorAnalisePeticoes:
             agente: Instância do agente perito
             perito_id: ID do perito (para logging)
             contexto: Contexto RAG completo
+            ao_receber_fragmento: Callback de streaming do parecer (opcional)
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens do prompt
+            modelo_customizado: (Opcional) Modelo definido pela triagem de relevância
+                                (agente rebaixado para o modelo rápido)
         
         Returns:
             ParecerPerito gerado pelo agente
@@ -775,8 +873,8 @@ class OrquestradorAnalisePeticoes:
             f"Identifique aspectos técnicos relevantes, riscos e recomendações."
         )
         
-        # Chamar método processar() do agente (método correto da classe AgenteBase)
-        # NOTA: processar() retorna Dict[str, Any] com a estrutura:
+        # Chamar método processar_async() do agente (classe AgenteBase)
+        # NOTA: processar_async() retorna Dict[str, Any] com a estrutura:
         # {
         #     "agente": str,
         #     "parecer": str,  ← texto da análise técnica aqui
@@ -785,11 +883,19 @@ class OrquestradorAnalisePeticoes:
         #     "modelo_utilizado": str,
         #     "metadados": dict
         # }
-        resultado_processamento = agente.processar(
+        # Petição e anexos em seções separadas do orçamento de tokens: se não
+        # couberem, cada um é reduzido aos trechos mais relevantes para este agente
+        resultado_processamento = await agente.processar_async(
             contexto_de_documentos=[contexto["peticao_texto"]] + contexto["documentos_texto"],
             pergunta_do_usuario=prompt,
-            metadados_adicionais={"tipo_acao": contexto["tipo_acao"]}
+            metadados_adicionais={"tipo_acao": contexto["tipo_acao"]},
+            modelo_customizado=modelo_customizado,
+            ao_receber_fragmento=ao_receber_fragmento,
+            secoes_dos_documentos=[SECAO_PETICAO] + [SECAO_ANEXOS] * len(contexto["documentos_texto"])
         )
+        uso_do_orcamento = resultado_processamento.get("metadados", {}).get("orcamento_de_tokens")
+        if uso_orcamento_tokens is not None and uso_do_orcamento is not None:
+            uso_orcamento_tokens[f"perito_{perito_id}"] = uso_do_orcamento
         
         # Extrair o texto do parecer do dicionário retornado
         parecer_texto = resultado_processamento.get("parecer", "")
@@ -809,12 +915,46 @@ class OrquestradorAnalisePeticoes:
         
         return parecer
     
-    def _executar_estrategista(
+    def _texto_do_caso(self, contexto: Dict[str, Any]) -> str:
+        """
+        Texto usado na triagem de relevância: a petição mais os documentos
+        complementares (o mesmo contexto que os agentes receberiam).
+        """
+        return "\n".join([contexto["peticao_texto"]] + contexto["documentos_texto"])
+    
+    async def _executar_com_limite(
+        self,
+        limite_concorrencia: asyncio.Semaphore,
+        identificador: str,
+        execucao: Any
+    ) -> Tuple[str, Any, Optional[Exception]]:
+        """
+        Aguarda a execução de um agente respeitando o limite de concorrência.
+        
+        Erros são devolvidos (não lançados) para que a falha de um agente
+        não interrompa a coleta dos demais em asyncio.as_completed().
+        
+        Args:
+            limite_concorrencia: Semáforo com max_workers_paralelo vagas
+            identificador: ID do agente (ex: "trabalhista", "medico")
+            execucao: Corrotina de _executar_agente_advogado/_executar_agente_perito
+        
+        Returns:
+            (identificador, parecer ou None, exceção ou None)
+        """
+        async with limite_concorrencia:
+            try:
+                return identificador, await execucao, None
+            except Exception as erro:
+                return identificador, None, erro
+    
+    async def _executar_estrategista(
         self,
         peticao: Peticao,
         contexto: Dict[str, Any],
         pareceres_advogados: Dict[str, ParecerAdvogado],
-        pareceres_peritos: Dict[str, ParecerPerito]
+        pareceres_peritos: Dict[str, ParecerPerito],
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> ProximosPassos:
         """
         Executa Agente Estrategista Processual.
@@ -828,6 +968,7 @@ class OrquestradorAnalisePeticoes:
             contexto: Contexto RAG completo
             pareceres_advogados: Pareceres dos advogados especialistas
             pareceres_peritos: Pareceres dos peritos técnicos
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens do prompt
         
         Returns:
             ProximosPassos elaborados pelo estrategista
@@ -849,7 +990,7 @@ class OrquestradorAnalisePeticoes:
             )
             
             # Montar contexto completo para o estrategista
-            # Nota: agente_estrategista.analisar() espera:
+            # Nota: agente_estrategista.analisar_async() espera:
             #   - "peticao_inicial" (str)
             #   - "documentos" (List[str])
             #   - "pareceres" (Dict[str, str])
@@ -861,8 +1002,10 @@ class OrquestradorAnalisePeticoes:
                 "pareceres": pareceres_compilados
             }
             
-            # Executar agente
-            proximos_passos = self.agente_estrategista.analisar(contexto_estrategista)
+            # Executar agente (chamada ao LLM sem bloquear o event loop)
+            proximos_passos, uso_do_orcamento = await self.agente_estrategista.analisar_async(contexto_estrategista)
+            if uso_orcamento_tokens is not None:
+                uso_orcamento_tokens["estrategista"] = uso_do_orcamento
             
             logger.info(
                 f"✅ Estratégia elaborada | "
@@ -876,13 +1019,14 @@ class OrquestradorAnalisePeticoes:
             logger.error(f"❌ Erro no Estrategista: {erro}")
             raise
     
-    def _executar_prognostico(
+    async def _executar_prognostico(
         self,
         peticao: Peticao,
         contexto: Dict[str, Any],
         pareceres_advogados: Dict[str, ParecerAdvogado],
         pareceres_peritos: Dict[str, ParecerPerito],
-        proximos_passos: ProximosPassos
+        proximos_passos: ProximosPassos,
+        uso_orcamento_tokens: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Prognostico:
         """
         Executa Agente de Prognóstico.
@@ -897,6 +1041,7 @@ class OrquestradorAnalisePeticoes:
             pareceres_advogados: Pareceres dos advogados especialistas
             pareceres_peritos: Pareceres dos peritos técnicos
             proximos_passos: Próximos passos elaborados pelo estrategista
+            uso_orcamento_tokens: (Opcional) Recebe o uso do orçamento de tokens do prompt
         
         Returns:
             Prognostico com cenários probabilísticos
@@ -913,7 +1058,7 @@ class OrquestradorAnalisePeticoes:
             )
             
             # Montar contexto completo para o prognóstico
-            # Nota: agente_prognostico.analisar() espera:
+            # Nota: agente_prognostico.analisar_async() espera:
             #   - "peticao_inicial" (str)
             #   - "documentos" (List[str])
             #   - "pareceres" (Dict[str, str])
@@ -933,8 +1078,10 @@ class OrquestradorAnalisePeticoes:
                 }
             }
             
-            # Executar agente
-            prognostico = self.agente_prognostico.analisar(contexto_prognostico)
+            # Executar agente (chamada ao LLM sem bloquear o event loop)
+            prognostico, uso_do_orcamento = await self.agente_prognostico.analisar_async(contexto_prognostico)
+            if uso_orcamento_tokens is not None:
+                uso_orcamento_tokens["prognostico"] = uso_do_orcamento
             
             logger.info(
                 f"✅ Prognóstico calculado | "
@@ -948,16 +1095,22 @@ class OrquestradorAnalisePeticoes:
             logger.error(f"❌ Erro no Prognóstico: {erro}")
             raise
     
-    def _gerar_documento_continuacao(
+    async def _gerar_documento_continuacao(
         self,
         peticao: Peticao,
         contexto: Dict[str, Any],
         proximos_passos: ProximosPassos,
         prognostico: Prognostico,
         pareceres_advogados: Dict[str, ParecerAdvogado],
-        pareceres_peritos: Dict[str, ParecerPerito]
+        pareceres_peritos: Dict[str, ParecerPerito],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None
     ) -> Optional[DocumentoContinuacao]:
-        """Gera o documento de continuação usando o serviço dedicado."""
+        """
+        Gera o documento de continuação usando o serviço dedicado (com streaming opcional).
+
+        Usa a versão assíncrona do serviço: a chamada ao LLM não bloqueia o
+        event loop da análise e aguarda vaga no agendador de chamadas ao LLM.
+        """
 
         if not self.servico_geracao_documento:
             logger.warning("Serviço de geração de documentos não disponível")
@@ -977,7 +1130,9 @@ class OrquestradorAnalisePeticoes:
             "tipo_acao": contexto.get("tipo_acao") or peticao.tipo_acao,
         }
 
-        return self.servico_geracao_documento.gerar_documento_continuacao(contexto_documento)
+        return await self.servico_geracao_documento.gerar_documento_continuacao_async(
+            contexto_documento, ao_receber_fragmento=ao_receber_fragmento
+        )
 
     def _compilar_pareceres_para_texto(
         self,
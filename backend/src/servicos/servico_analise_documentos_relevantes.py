@@ -35,7 +35,7 @@ sugerir proativamente o que precisa ser enviado.
 
 import logging
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Importar modelos de processo (TAREFA-040)
@@ -49,15 +49,18 @@ from src.modelos.processo import (
 # Importar serviços necessários
 from src.servicos.gerenciador_estado_peticoes import obter_gerenciador_estado_peticoes
 from src.servicos.servico_banco_vetorial import (
-    inicializar_chromadb,
+    obter_servico_banco_vetorial,
     buscar_chunks_similares,
-    obter_documento_por_id,
+    obter_texto_completo_do_documento,
     ErroDeBusca
 )
 
 # Importar gerenciador LLM (TAREFA-009)
 from src.utilitarios.gerenciador_llm import GerenciadorLLM, ErroGeralAPI
 
+# Configurações (RAG_LAMBDA_MMR)
+from src.configuracao.configuracoes import obter_configuracoes
+
 
 # ===== CONFIGURAÇÃO DE LOGGING =====
 
@@ -281,24 +284,40 @@ class ServicoAnaliseDocumentosRelevantes:
     ```
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        banco_vetorial: Optional[Tuple[Any, Any]] = None,
+        lambda_mmr: Optional[float] = None
+    ):
         """
         Inicializa o serviço de análise de documentos relevantes.
         
         IMPLEMENTAÇÃO:
         - Cria instância do GerenciadorLLM para chamadas à OpenAI
-        - Inicializa ChromaDB para busca RAG
+        - Usa o ChromaDB compartilhado para busca RAG
         - Obtém gerenciador de estado de petições
+        
+        Args:
+            banco_vetorial: (cliente, collection) do ChromaDB. Se None, usa o
+                singleton compartilhado (obter_servico_banco_vetorial).
+            lambda_mmr: Peso da relevância na diversificação MMR do contexto RAG
+                (0 a 1). None = RAG_LAMBDA_MMR do .env; 1.0 = sem diversificação.
         """
         logger.info("Inicializando ServicoAnaliseDocumentosRelevantes")
         
+        if lambda_mmr is None:
+            lambda_mmr = obter_configuracoes().RAG_LAMBDA_MMR
+        self.lambda_mmr = None if lambda_mmr >= 1.0 else lambda_mmr
+        
         # Criar gerenciador LLM para chamadas à OpenAI
         self.gerenciador_llm = GerenciadorLLM()
         logger.debug("✅ GerenciadorLLM inicializado")
         
         # Inicializar ChromaDB para busca RAG
         try:
-            self.cliente_chromadb, self.collection_chromadb = inicializar_chromadb()
+            self.cliente_chromadb, self.collection_chromadb = (
+                banco_vetorial if banco_vetorial is not None else obter_servico_banco_vetorial()
+            )
             logger.debug("✅ ChromaDB inicializado")
         except Exception as erro:
             logger.error(f"❌ Erro ao inicializar ChromaDB: {erro}")
@@ -436,7 +455,9 @@ class ServicoAnaliseDocumentosRelevantes:
         
         CONTEXTO:
         O texto da petição foi vetorizado e armazenado no ChromaDB durante
-        o upload (TAREFA-041). Aqui recuperamos os chunks e juntamos em texto único.
+        o upload (TAREFA-041). O texto canônico gravado na ingestão é lido
+        diretamente (sem o overlap dos chunks); documentos antigos são
+        reconstruídos a partir dos chunks.
         
         Args:
             peticao: Dados da petição (contém documento_peticao_id)
@@ -450,25 +471,17 @@ class ServicoAnaliseDocumentosRelevantes:
         documento_id = peticao.documento_peticao_id
         
         try:
-            # Buscar documento no ChromaDB usando função utilitária
-            resultado = obter_documento_por_id(
+            texto_completo = obter_texto_completo_do_documento(
                 collection=self.collection_chromadb,
                 documento_id=documento_id
             )
             
-            if not resultado or "documents" not in resultado or len(resultado["documents"]) == 0:
+            if not texto_completo:
                 raise ErroDocumentoPeticaoNaoEncontrado(
                     f"Documento da petição (ID: {documento_id}) não foi encontrado no ChromaDB"
                 )
             
-            # Juntar todos os chunks em texto único
-            chunks = resultado["documents"]
-            texto_completo = "\n\n".join(chunks)
-            
-            logger.debug(
-                f"✅ Texto da petição recuperado: {len(texto_completo)} caracteres, "
-                f"{len(chunks)} chunks"
-            )
+            logger.debug(f"✅ Texto da petição recuperado: {len(texto_completo)} caracteres")
             
             return texto_completo
             
@@ -510,15 +523,17 @@ class ServicoAnaliseDocumentosRelevantes:
             query_rag = texto_peticao[:TAMANHO_QUERY_CARACTERES]
             
             # Fazer busca por similaridade no ChromaDB
+            # MMR: a própria petição e seus anexos repetidos não ocupam todo o contexto
             resultados_rag = buscar_chunks_similares(
                 collection=self.collection_chromadb,
                 query=query_rag,
-                k=NUMERO_DE_CHUNKS_RAG_PARA_CONTEXTO
+                k=NUMERO_DE_CHUNKS_RAG_PARA_CONTEXTO,
+                lambda_mmr=self.lambda_mmr
             )
             
-            # Extrair textos dos chunks
-            if resultados_rag and "documents" in resultados_rag:
-                chunks_contexto = resultados_rag["documents"]
+            # Extrair textos dos chunks (lista de dicts de buscar_chunks_similares)
+            if resultados_rag:
+                chunks_contexto = [resultado["documento"] for resultado in resultados_rag]
                 logger.debug(f"✅ Busca RAG retornou {len(chunks_contexto)} chunks de contexto")
                 return chunks_contexto
             else:
@@ -565,7 +580,8 @@ class ServicoAnaliseDocumentosRelevantes:
                 mensagens_de_sistema=PROMPT_SISTEMA_ANALISE_DOCUMENTOS,
                 modelo=MODELO_LLM_ANALISE_DOCUMENTOS,
                 temperatura=TEMPERATURA_LLM_ANALISE_DOCUMENTOS,
-                timeout_segundos=TIMEOUT_LLM_SEGUNDOS
+                timeout_segundos=TIMEOUT_LLM_SEGUNDOS,
+                agente="analise_documentos_relevantes"
             )
             
             logger.debug(f"✅ LLM retornou resposta ({len(resposta_llm)} caracteres)")
@@ -0,0 +1,504 @@
+"""
+Serviço de Armazenamento Vetorial (Interface + Backend NumPy) - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Todo o servico_banco_vetorial conversa com uma Collection do ChromaDB.
+Para conjuntos pequenos (os documentos de UM caso, testes, benchmarks),
+a busca exata por força bruta sobre uma matriz float32 é mais rápida que
+o HNSW, sempre consistente (sem recall < 100%) e não depende do ChromaDB.
+
+Este módulo define:
+- ArmazenamentoVetorial: o protocolo (subconjunto da API de Collection do
+  ChromaDB usado pelo sistema). A Collection do ChromaDB já o satisfaz.
+- ColecaoVetorialNumPy: implementação em memória, com busca exata.
+- criar_colecao_em_memoria: fábrica.
+
+O backend da aplicação é escolhido por BACKEND_BANCO_VETORIAL no .env
+(ver servico_banco_vetorial.inicializar_chromadb).
+
+OPERAÇÕES DO PROTOCOLO:
+- add(ids, embeddings, documents, metadatas)
+- query(query_embeddings, n_results, where, include)
+- get(ids, where, include, limit, offset) — get(where={"documento_id": x})
+  é a leitura por documento
+- delete(ids, where)
+- count() / peek(limit)
+
+FILTROS (where):
+Mesma sintaxe do ChromaDB: {"campo": valor}, {"campo": {"$in": [...]}},
+$eq, $ne, $nin, $gt, $gte, $lt, $lte, e composição com $and / $or.
+
+PADRÃO DE USO:
+```python
+from src.servicos.servico_armazenamento_vetorial import criar_colecao_em_memoria
+
+# Busca exata em memória, sem ChromaDB (testes, benchmarks)
+colecao = criar_colecao_em_memoria("documentos_juridicos")
+armazenar_chunks(colecao, chunks, embeddings, metadados)
+resultados = buscar_chunks_similares(colecao, "nexo causal", k=5)
+```
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+import numpy as np
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== CONSTANTES =====
+
+# Campos retornados por padrão (os mesmos do ChromaDB)
+INCLUDE_PADRAO_QUERY = ["metadatas", "documents", "distances"]
+INCLUDE_PADRAO_GET = ["metadatas", "documents"]
+
+# Métricas de distância aceitas (chave "hnsw:space" dos metadados)
+METRICAS_DISTANCIA = ("cosine", "l2", "ip")
+
+# Capacidade inicial da matriz (cresce dobrando, inserção amortizada O(1))
+CAPACIDADE_INICIAL = 256
+
+
+# ===== PROTOCOLO =====
+
+@runtime_checkable
+class ArmazenamentoVetorial(Protocol):
+    """
+    Interface de armazenamento vetorial usada por servico_banco_vetorial.
+
+    É o subconjunto da API de chromadb Collection que o sistema usa; a
+    Collection do ChromaDB o satisfaz sem adaptador. Formatos de entrada
+    e de retorno são os do ChromaDB (listas paralelas; em query(), uma
+    lista por embedding de consulta).
+    """
+
+    name: str
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]: ...
+
+    def count(self) -> int: ...
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+    ) -> None: ...
+
+    def query(
+        self,
+        query_embeddings: Any = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]: ...
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]: ...
+
+    def peek(self, limit: int = 10) -> Dict[str, Any]: ...
+
+    def delete(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> None: ...
+
+
+# ===== FILTROS DE METADADOS =====
+
+def _comparar(valor: Any, operador: str, esperado: Any) -> bool:
+    """
+    Aplica um operador do ChromaDB a um valor de metadado.
+    """
+    if operador == "$eq":
+        return valor == esperado
+    if operador == "$ne":
+        return valor != esperado
+    if operador == "$in":
+        return valor in esperado
+    if operador == "$nin":
+        return valor not in esperado
+    if valor is None:
+        return False
+    if operador == "$gt":
+        return valor > esperado
+    if operador == "$gte":
+        return valor >= esperado
+    if operador == "$lt":
+        return valor < esperado
+    if operador == "$lte":
+        return valor <= esperado
+    raise ValueError(f"Operador de filtro não suportado: {operador}")
+
+
+def avaliar_filtro(metadados: Optional[Dict[str, Any]], filtro: Optional[Dict[str, Any]]) -> bool:
+    """
+    Indica se os metadados de um item satisfazem um filtro "where" do ChromaDB.
+
+    Args:
+        metadados: Metadados do item
+        filtro: Filtro (None ou {} = aceita tudo)
+
+    Returns:
+        bool: True se o item passa no filtro
+
+    Raises:
+        ValueError: Se o filtro usar um operador desconhecido
+    """
+    if not filtro:
+        return True
+    metadados = metadados or {}
+    for chave, condicao in filtro.items():
+        if chave == "$and":
+            if not all(avaliar_filtro(metadados, subfiltro) for subfiltro in condicao):
+                return False
+        elif chave == "$or":
+            if not any(avaliar_filtro(metadados, subfiltro) for subfiltro in condicao):
+                return False
+        elif isinstance(condicao, dict):
+            valor = metadados.get(chave)
+            if not all(_comparar(valor, operador, esperado) for operador, esperado in condicao.items()):
+                return False
+        elif metadados.get(chave) != condicao:
+            return False
+    return True
+
+
+# ===== BACKEND NUMPY =====
+
+class ColecaoVetorialNumPy:
+    """
+    Armazenamento vetorial em memória com busca exata (força bruta em NumPy).
+
+    IMPLEMENTAÇÃO:
+    - Embeddings em uma matriz float32 pré-alocada (cresce dobrando) e uma
+      cópia normalizada para a métrica de cosseno
+    - Consulta = uma multiplicação de matrizes (consultas × itens filtrados)
+      + argpartition para o top-n
+    - Itens mantêm a ordem de inserção (como o ChromaDB no get())
+    - Índice documento_id → posições: filtros por documento (leitura por
+      documento, busca hierárquica) não percorrem a coleção inteira
+
+    QUANDO USAR:
+    Conjuntos de até dezenas de milhares de chunks (um caso, testes,
+    benchmarks). Não persiste em disco.
+
+    THREAD-SAFETY:
+    Todas as operações são protegidas por um threading.RLock.
+    """
+
+    def __init__(self, name: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Cria uma coleção vazia.
+
+        Args:
+            name: Nome da coleção (logs e mensagens de erro)
+            metadata: Metadados da coleção; "hnsw:space" define a métrica
+                ("cosine" padrão, "l2" ou "ip"), como no ChromaDB
+
+        Raises:
+            ValueError: Se a métrica for desconhecida
+        """
+        self.name = name
+        self._metadata = dict(metadata) if metadata else None
+        self.metrica = (metadata or {}).get("hnsw:space", "cosine")
+        if self.metrica not in METRICAS_DISTANCIA:
+            raise ValueError(f"Métrica de distância inválida: '{self.metrica}'. Válidas: {METRICAS_DISTANCIA}")
+
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._posicao_por_id: Dict[str, int] = {}
+        self._posicoes_por_documento: Dict[Any, List[int]] = {}
+        self._documentos: List[Optional[str]] = []
+        self._metadados: List[Optional[Dict[str, Any]]] = []
+        self._embeddings: Optional[np.ndarray] = None
+        self._embeddings_normalizados: Optional[np.ndarray] = None
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self._metadata
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    # ----- escrita -----
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Any = None,
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Insere itens. IDs já existentes são ignorados (com warning), como no ChromaDB.
+
+        Raises:
+            ValueError: Se faltarem embeddings, se as listas tiverem tamanhos
+                diferentes ou se a dimensão não bater com a da coleção
+        """
+        if embeddings is None:
+            raise ValueError("ColecaoVetorialNumPy exige embeddings pré-calculados (sem embedding_function)")
+        matriz = np.asarray(embeddings, dtype=np.float32)
+        if matriz.ndim != 2 or len(matriz) != len(ids):
+            raise ValueError(f"Esperados {len(ids)} embeddings, recebido formato {matriz.shape}")
+        for nome_lista, lista in (("metadatas", metadatas), ("documents", documents)):
+            if lista is not None and len(lista) != len(ids):
+                raise ValueError(f"{nome_lista} tem {len(lista)} itens; esperados {len(ids)}")
+
+        with self._lock:
+            if self._embeddings is not None and matriz.shape[1] != self._embeddings.shape[1]:
+                raise ValueError(
+                    f"Dimensão {matriz.shape[1]} diferente da coleção '{self.name}' ({self._embeddings.shape[1]})"
+                )
+
+            novos = [
+                posicao for posicao, id_item in enumerate(ids)
+                if id_item not in self._posicao_por_id
+            ]
+            if len(novos) < len(ids):
+                logger.warning(f"⚠️ {len(ids) - len(novos)} ID(s) já existentes ignorados em '{self.name}'")
+            if len(set(ids[posicao] for posicao in novos)) < len(novos):
+                raise ValueError("IDs duplicados na mesma chamada de add()")
+            if not novos:
+                return
+
+            self._garantir_capacidade(len(self._ids) + len(novos), matriz.shape[1])
+            inicio = len(self._ids)
+            fim = inicio + len(novos)
+            self._embeddings[inicio:fim] = matriz[novos]
+            self._embeddings_normalizados[inicio:fim] = self._normalizar(matriz[novos])
+            for posicao in novos:
+                metadados_item = dict(metadatas[posicao]) if metadatas is not None else None
+                self._registrar_documento(metadados_item, len(self._ids))
+                self._posicao_por_id[ids[posicao]] = len(self._ids)
+                self._ids.append(ids[posicao])
+                self._documentos.append(documents[posicao] if documents is not None else None)
+                self._metadados.append(metadados_item)
+
+    def delete(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Remove itens por ID e/ou filtro (IDs inexistentes são ignorados).
+        """
+        with self._lock:
+            remover = set(self._selecionar_posicoes(ids, where))
+            if not remover:
+                return
+            manter = [posicao for posicao in range(len(self._ids)) if posicao not in remover]
+            self._ids = [self._ids[posicao] for posicao in manter]
+            self._documentos = [self._documentos[posicao] for posicao in manter]
+            self._metadados = [self._metadados[posicao] for posicao in manter]
+            self._embeddings[:len(manter)] = self._embeddings[manter]
+            self._embeddings_normalizados[:len(manter)] = self._embeddings_normalizados[manter]
+            self._posicao_por_id = {id_item: posicao for posicao, id_item in enumerate(self._ids)}
+            self._posicoes_por_documento = {}
+            for posicao, metadados_item in enumerate(self._metadados):
+                self._registrar_documento(metadados_item, posicao)
+
+    # ----- leitura -----
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Lê itens por ID e/ou filtro, na ordem de inserção.
+        """
+        include = INCLUDE_PADRAO_GET if include is None else include
+        with self._lock:
+            posicoes = self._selecionar_posicoes(ids, where)
+            posicoes = posicoes[offset or 0:]
+            if limit is not None:
+                posicoes = posicoes[:limit]
+            return self._montar_resultado(posicoes, include)
+
+    def peek(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Primeiros itens da coleção (com embeddings), como no ChromaDB.
+        """
+        return self.get(limit=limit, include=["embeddings", "documents", "metadatas"])
+
+    def query(
+        self,
+        query_embeddings: Any = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Busca exata dos n_results itens mais próximos de cada embedding de consulta.
+
+        Raises:
+            ValueError: Se faltarem embeddings de consulta ou a dimensão não bater
+        """
+        if query_embeddings is None:
+            raise ValueError("ColecaoVetorialNumPy exige query_embeddings (sem embedding_function)")
+        include = INCLUDE_PADRAO_QUERY if include is None else include
+        consultas = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+
+        with self._lock:
+            posicoes = np.asarray(self._selecionar_posicoes(None, where), dtype=np.intp)
+            resultado: Dict[str, Any] = {"ids": [], "included": list(include)}
+            for campo in ("embeddings", "documents", "metadatas", "distances"):
+                resultado[campo] = [] if campo in include else None
+
+            if len(posicoes) == 0 or n_results <= 0:
+                for _ in consultas:
+                    self._anexar_linha(resultado, [], None, include)
+                return resultado
+
+            if consultas.shape[1] != self._embeddings.shape[1]:
+                raise ValueError(
+                    f"Dimensão da consulta ({consultas.shape[1]}) diferente da coleção "
+                    f"'{self.name}' ({self._embeddings.shape[1]})"
+                )
+
+            distancias = self._calcular_distancias(consultas, posicoes)
+            n = min(n_results, len(posicoes))
+            for linha in distancias:
+                melhores = np.argpartition(linha, n - 1)[:n] if n < len(linha) else np.arange(len(linha))
+                melhores = melhores[np.argsort(linha[melhores], kind="stable")]
+                self._anexar_linha(resultado, posicoes[melhores].tolist(), linha[melhores], include)
+            return resultado
+
+    # ----- internos -----
+
+    def _garantir_capacidade(self, necessaria: int, dimensao: int) -> None:
+        capacidade_atual = 0 if self._embeddings is None else len(self._embeddings)
+        if necessaria <= capacidade_atual:
+            return
+        nova_capacidade = max(CAPACIDADE_INICIAL, capacidade_atual * 2, necessaria)
+        for atributo in ("_embeddings", "_embeddings_normalizados"):
+            nova_matriz = np.zeros((nova_capacidade, dimensao), dtype=np.float32)
+            matriz_atual = getattr(self, atributo)
+            if matriz_atual is not None:
+                nova_matriz[:len(self._ids)] = matriz_atual[:len(self._ids)]
+            setattr(self, atributo, nova_matriz)
+
+    @staticmethod
+    def _normalizar(matriz: np.ndarray) -> np.ndarray:
+        normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+        normas[normas == 0.0] = 1.0
+        return matriz / normas
+
+    def _calcular_distancias(self, consultas: np.ndarray, posicoes: np.ndarray) -> np.ndarray:
+        """
+        Distâncias (consultas × itens) na métrica da coleção, com a convenção do ChromaDB.
+        """
+        if self.metrica == "cosine":
+            return 1.0 - self._normalizar(consultas) @ self._embeddings_normalizados[posicoes].T
+        itens = self._embeddings[posicoes]
+        if self.metrica == "ip":
+            return 1.0 - consultas @ itens.T
+        # l2: distância euclidiana AO QUADRADO, como o hnswlib
+        return (
+            np.sum(consultas ** 2, axis=1, keepdims=True)
+            - 2.0 * consultas @ itens.T
+            + np.sum(itens ** 2, axis=1)
+        )
+
+    def _registrar_documento(self, metadados_item: Optional[Dict[str, Any]], posicao: int) -> None:
+        if metadados_item and "documento_id" in metadados_item:
+            self._posicoes_por_documento.setdefault(metadados_item["documento_id"], []).append(posicao)
+
+    def _posicoes_dos_documentos(self, where: Optional[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        Candidatos pela restrição de documento_id do filtro (None se não houver).
+
+        Só estreita os candidatos: o filtro completo é aplicado depois.
+        """
+        if not where:
+            return None
+        condicao = where.get("documento_id")
+        if condicao is None and isinstance(where.get("$and"), list):
+            for subfiltro in where["$and"]:
+                posicoes = self._posicoes_dos_documentos(subfiltro)
+                if posicoes is not None:
+                    return posicoes
+            return None
+        if isinstance(condicao, dict):
+            if set(condicao) == {"$in"}:
+                documento_ids = condicao["$in"]
+            elif set(condicao) == {"$eq"}:
+                documento_ids = [condicao["$eq"]]
+            else:
+                return None
+        elif condicao is not None:
+            documento_ids = [condicao]
+        else:
+            return None
+        return sorted(
+            posicao
+            for documento_id in set(documento_ids)
+            for posicao in self._posicoes_por_documento.get(documento_id, [])
+        )
+
+    def _selecionar_posicoes(self, ids: Optional[Sequence[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        if ids is not None:
+            posicoes = [self._posicao_por_id[id_item] for id_item in ids if id_item in self._posicao_por_id]
+        else:
+            posicoes = self._posicoes_dos_documentos(where)
+            if posicoes is None:
+                posicoes = list(range(len(self._ids)))
+        if where:
+            posicoes = [posicao for posicao in posicoes if avaliar_filtro(self._metadados[posicao], where)]
+        return posicoes
+
+    def _montar_resultado(self, posicoes: List[int], include: List[str]) -> Dict[str, Any]:
+        return {
+            "ids": [self._ids[posicao] for posicao in posicoes],
+            "embeddings": (
+                self._embeddings[posicoes].copy() if self._embeddings is not None
+                else np.zeros((0, 0), dtype=np.float32)
+            ) if "embeddings" in include else None,
+            "documents": [self._documentos[posicao] for posicao in posicoes] if "documents" in include else None,
+            "metadatas": [self._metadados[posicao] for posicao in posicoes] if "metadatas" in include else None,
+            "included": list(include),
+        }
+
+    def _anexar_linha(
+        self,
+        resultado: Dict[str, Any],
+        posicoes: List[int],
+        distancias: Optional[np.ndarray],
+        include: List[str],
+    ) -> None:
+        linha = self._montar_resultado(posicoes, include)
+        resultado["ids"].append(linha["ids"])
+        for campo in ("embeddings", "documents", "metadatas"):
+            if campo in include:
+                resultado[campo].append(linha[campo])
+        if "distances" in include:
+            resultado["distances"].append([] if distancias is None else distancias.astype(float).tolist())
+
+
+# ===== FÁBRICAS =====
+
+def criar_colecao_em_memoria(nome: str, metrica: str = "cosine") -> ColecaoVetorialNumPy:
+    """
+    Cria uma coleção NumPy vazia com a métrica informada.
+    """
+    return ColecaoVetorialNumPy(name=nome, metadata={"hnsw:space": metrica})
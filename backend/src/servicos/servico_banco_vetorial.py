@@ -12,7 +12,7 @@ IMPLEMENTAÇÃO:
 Fornece interface completa para:
 1. Inicialização do ChromaDB (cliente + collection)
 2. Armazenamento de chunks com embeddings e metadados
-3. Busca por similaridade semântica
+3. Busca por similaridade semântica (uma query ou várias em lote)
 4. Listagem de documentos armazenados
 5. Remoção de documentos
 
@@ -54,19 +54,40 @@ JUSTIFICATIVA PARA LLMs:
 - Comentários exaustivos explicam cada decisão de design
 """
 
+import json
 import logging
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Any, Optional
 from pathlib import Path
 
 # Imports serão validados em tempo de execução (validar_dependencias)
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from chromadb.api.models.Collection import Collection
 
 from src.configuracao.configuracoes import obter_configuracoes
 from src.servicos import servico_vetorizacao
+from src.servicos import servico_texto_canonico
+from src.servicos.servico_armazenamento_vetorial import (
+    ArmazenamentoVetorial,
+    criar_colecao_em_memoria,
+)
+from src.servicos.servico_indice_lexical import (
+    ErroDeIndiceLexical,
+    obter_indice_lexical,
+)
+from src.servicos.servico_indice_documentos import (
+    ErroDeIndiceDocumentos,
+    calcular_centroide,
+    obter_indice_documentos,
+)
+from src.servicos.servico_catalogo_documentos import (
+    ErroDeCatalogoDocumentos,
+    obter_catalogo_documentos,
+)
 
 
 # ===== CONFIGURAÇÃO DE LOGGING =====
@@ -200,6 +221,14 @@ DIMENSAO_EMBEDDINGS_OPENAI_ADA_002 = 1536
 # Alternativas: "l2" (distância euclidiana), "ip" (produto interno)
 METRICA_DISTANCIA_CHROMADB = "cosine"
 
+# Modos de busca RAG aceitos por buscar_chunks_similares (ver MODO_BUSCA_RAG)
+MODOS_BUSCA_RAG = ("vetorial", "hibrida")
+
+# Sobreposição mínima (em caracteres) para considerar que dois chunks
+# vizinhos SEM offsets armazenados (documentos antigos) se sobrepõem.
+# Evita "colar" chunks por coincidência de 1-2 caracteres.
+SOBREPOSICAO_MINIMA_SEM_OFFSETS = 20
+
 
 # ===== VALIDAÇÃO DE DEPENDÊNCIAS =====
 
@@ -257,6 +286,7 @@ def validar_configuracoes_chromadb() -> None:
     2. CHROMA_COLLECTION_NAME está definido e não é vazio
     3. Diretório de persistência pode ser criado (se não existir)
     4. Há permissão de escrita no diretório
+    5. Parâmetros HNSW coerentes (batch_size <= sync_threshold)
     
     EXCEÇÕES:
     - ErroDeInicializacaoChromaDB: Se alguma validação falhar
@@ -294,6 +324,15 @@ def validar_configuracoes_chromadb() -> None:
     
     logger.debug(f"✅ CHROMA_COLLECTION_NAME está configurado: {configuracoes.CHROMA_COLLECTION_NAME}")
     
+    # Validar parâmetros HNSW (o ChromaDB exige batch_size <= sync_threshold)
+    if configuracoes.CHROMA_HNSW_BATCH_SIZE > configuracoes.CHROMA_HNSW_SYNC_THRESHOLD:
+        mensagem_erro = (
+            f"CHROMA_HNSW_BATCH_SIZE ({configuracoes.CHROMA_HNSW_BATCH_SIZE}) não pode ser maior que "
+            f"CHROMA_HNSW_SYNC_THRESHOLD ({configuracoes.CHROMA_HNSW_SYNC_THRESHOLD})."
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeInicializacaoChromaDB(mensagem_erro)
+    
     # Tentar criar diretório se não existir
     caminho_persistencia = Path(configuracoes.CHROMA_DB_PATH)
     try:
@@ -328,7 +367,60 @@ def validar_configuracoes_chromadb() -> None:
 
 # ===== INICIALIZAÇÃO DO CHROMADB =====
 
-def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
+def montar_metadados_hnsw() -> dict[str, Any]:
+    """
+    Monta os parâmetros do índice HNSW (chaves "hnsw:*") a partir do .env.
+    
+    CONTEXTO:
+    O ChromaDB lê estes parâmetros dos metadados da collection APENAS na
+    criação. M e construction_ef definem a qualidade do grafo (recall) e o
+    custo de inserção; search_ef define o custo e o recall de cada busca;
+    batch_size e sync_threshold, a frequência de atualização e gravação do
+    índice durante a ingestão.
+    
+    Returns:
+        dict: Metadados "hnsw:*" para create/get_or_create_collection
+    """
+    return {
+        "hnsw:space": METRICA_DISTANCIA_CHROMADB,
+        "hnsw:M": configuracoes.CHROMA_HNSW_M,
+        "hnsw:construction_ef": configuracoes.CHROMA_HNSW_CONSTRUCTION_EF,
+        "hnsw:search_ef": configuracoes.CHROMA_HNSW_SEARCH_EF,
+        "hnsw:batch_size": configuracoes.CHROMA_HNSW_BATCH_SIZE,
+        "hnsw:sync_threshold": configuracoes.CHROMA_HNSW_SYNC_THRESHOLD,
+    }
+
+
+def verificar_parametros_hnsw(collection: ArmazenamentoVetorial, metadados_hnsw: dict[str, Any]) -> list[str]:
+    """
+    Compara os parâmetros HNSW de uma collection existente com os do .env.
+    
+    Uma collection criada antes (ou com outro .env) mantém os parâmetros da
+    criação; o .env novo é ignorado sem aviso pelo ChromaDB. Aqui a
+    divergência vira um warning no log.
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy) já aberto
+        metadados_hnsw: Parâmetros esperados (montar_metadados_hnsw)
+    
+    Returns:
+        list[str]: Parâmetros divergentes (vazia se tudo confere)
+    """
+    metadados_collection = collection.metadata or {}
+    divergentes = [
+        chave for chave, valor in metadados_hnsw.items()
+        if chave in metadados_collection and metadados_collection[chave] != valor
+    ]
+    if divergentes:
+        logger.warning(
+            f"⚠️ Parâmetros HNSW da collection '{collection.name}' diferem do .env: "
+            + ", ".join(f"{chave}={metadados_collection[chave]} (env: {metadados_hnsw[chave]})" for chave in divergentes)
+            + ". Eles só valem na criação: recrie a collection e reprocesse os documentos para aplicá-los."
+        )
+    return divergentes
+
+
+def inicializar_chromadb() -> tuple[Optional[chromadb.ClientAPI], ArmazenamentoVetorial]:
     """
     Inicializa o cliente ChromaDB e cria/carrega a collection principal.
     
@@ -345,16 +437,26 @@ def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
     3. Cria ou carrega a collection "documentos_juridicos"
     4. Configura a collection com:
        - Métrica de distância: cosine similarity
+       - Parâmetros do índice HNSW do .env (montar_metadados_hnsw)
        - Metadata: Permite armazenar metadados com os chunks
+    5. Em collection já existente, avisa se os parâmetros HNSW divergem do .env
     
     PERSISTÊNCIA:
     O ChromaDB salvará dados em: configuracoes.CHROMA_DB_PATH
     Isso garante que documentos não sejam perdidos ao reiniciar a aplicação.
     
+    BACKEND NUMPY (BACKEND_BANCO_VETORIAL=numpy):
+    Em vez do ChromaDB, retorna (None, ColecaoVetorialNumPy): busca exata
+    em memória, sem persistência (desenvolvimento, testes, benchmarks).
+    Catálogo, índices lexical e de documentos e textos canônicos também
+    ficam em memória (Configuracoes.usa_armazenamento_em_memoria), para não
+    listar nem retornar documentos cujos vetores se perderam num restart.
+    
     RETURNS:
         tuple: (cliente_chromadb, collection)
-            - cliente_chromadb: Instância do cliente ChromaDB
-            - collection: Collection "documentos_juridicos" pronta para uso
+            - cliente_chromadb: Instância do cliente ChromaDB (None com o backend NumPy)
+            - collection: armazenamento vetorial "documentos_juridicos" pronto para uso
+              (Collection do ChromaDB ou ColecaoVetorialNumPy, conforme BACKEND_BANCO_VETORIAL)
     
     RAISES:
         ErroDeInicializacaoChromaDB: Se algo der errado durante inicialização
@@ -375,6 +477,13 @@ def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
     - Testes (pode ser mockada facilmente)
     - Mudanças de configuração (um único lugar para modificar)
     """
+    if configuracoes.BACKEND_BANCO_VETORIAL == "numpy":
+        logger.warning(
+            "⚠️ BACKEND_BANCO_VETORIAL=numpy: chunks, catálogo, índices e textos canônicos "
+            "armazenados EM MEMÓRIA (busca exata). Os dados são perdidos ao reiniciar a aplicação."
+        )
+        return None, criar_colecao_em_memoria(configuracoes.CHROMA_COLLECTION_NAME, METRICA_DISTANCIA_CHROMADB)
+    
     logger.info("🚀 Iniciando inicialização do ChromaDB...")
     
     # Validar antes de tentar usar
@@ -415,6 +524,7 @@ def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
     # Criar ou carregar collection
     # Collection é como uma "tabela" no ChromaDB, agrupa documentos relacionados
     try:
+        metadados_hnsw = montar_metadados_hnsw()
         collection = cliente.get_or_create_collection(
             name=configuracoes.CHROMA_COLLECTION_NAME,
             
@@ -422,10 +532,12 @@ def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
             metadata={
                 "description": "Armazena chunks de documentos jurídicos vetorizados",
                 "created_at": datetime.now().isoformat(),
-                # Métrica de similaridade: cosine é ideal para embeddings de texto
-                "hnsw:space": METRICA_DISTANCIA_CHROMADB
+                # Métrica de similaridade (cosine é ideal para embeddings de texto)
+                # e parâmetros do índice HNSW
+                **metadados_hnsw
             }
         )
+        verificar_parametros_hnsw(collection, metadados_hnsw)
         
         # Contar quantos documentos já estão na collection
         numero_documentos_existentes = collection.count()
@@ -452,10 +564,12 @@ def inicializar_chromadb() -> tuple[chromadb.ClientAPI, Collection]:
 # ===== ARMAZENAMENTO DE CHUNKS =====
 
 def armazenar_chunks(
-    collection: Collection,
+    collection: ArmazenamentoVetorial,
     chunks: list[str],
     embeddings: list[list[float]],
-    metadados: dict[str, Any]
+    metadados: dict[str, Any],
+    metadados_por_chunk: Optional[list[dict[str, Any]]] = None,
+    estatisticas_documento: Optional[dict[str, int]] = None
 ) -> list[str]:
     """
     Armazena chunks de texto com seus embeddings e metadados no ChromaDB.
@@ -473,6 +587,13 @@ def armazenar_chunks(
     2. Gera IDs únicos para cada chunk
     3. Enriquece metadados com informações adicionais
     4. Insere no ChromaDB usando API .add()
+    5. Registra o documento no catálogo (servico_catalogo_documentos); se o
+       catálogo falhar, os chunks recém-inseridos são removidos (as duas
+       fontes nunca divergem)
+    6. Indexa os textos dos chunks no índice lexical BM25 (servico_indice_lexical),
+       com o mesmo desfazer em caso de falha
+    7. Registra o centroide dos embeddings no índice de documentos
+       (servico_indice_documentos), usado pela busca hierárquica
     
     FORMATO DOS METADADOS:
     Cada chunk terá metadados como:
@@ -481,13 +602,14 @@ def armazenar_chunks(
         "nome_arquivo": "peticao_inicial.pdf",
         "data_upload": "2025-10-23T10:30:00",
         "tipo_documento": "pdf",
+        "secao": "DOS FATOS",
         "numero_pagina": 1,
         "chunk_index": 0,
         "total_chunks": 10
     }
     
     ARGS:
-        collection: Collection do ChromaDB onde armazenar
+        collection: Armazenamento vetorial (Chroma ou NumPy) onde armazenar
         chunks: Lista de textos dos chunks
         embeddings: Lista de embeddings (vetores) correspondentes aos chunks
         metadados: Dicionário com metadados do DOCUMENTO (serão replicados para cada chunk)
@@ -495,7 +617,18 @@ def armazenar_chunks(
             - nome_arquivo (str): Nome original do arquivo
             - data_upload (str): Data/hora do upload (ISO format)
             - tipo_documento (str): Extensão do arquivo (.pdf, .docx, etc.)
-            - (opcional) numero_pagina (int): Página de origem do chunk
+        metadados_por_chunk: (opcional) Lista paralela a chunks com metadados
+            específicos de cada chunk, gerados na vetorização:
+            - secao (str): Seção jurídica de origem (ex: "DOS PEDIDOS")
+            - numero_pagina (int): Página onde o chunk começa
+            - pagina_inicial / pagina_final (int): Intervalo de páginas do chunk
+            - offset_inicio / offset_fim (int): Posição (caracteres) no texto
+              processado; usados para mesclar vizinhos sem duplicar overlap
+        estatisticas_documento: (opcional) Totais do documento para o catálogo:
+            - numero_caracteres (int): Tamanho do texto processado
+            - numero_tokens (int): Tokens somados dos chunks
+            Sem este argumento, os caracteres são calculados pelos offsets
+            (ou pela soma dos chunks) e os tokens ficam 0
     
     RETURNS:
         list[str]: Lista de IDs dos chunks armazenados no ChromaDB
@@ -567,6 +700,15 @@ def armazenar_chunks(
             logger.error(mensagem_erro)
             raise ErroDeArmazenamento(mensagem_erro)
     
+    # VALIDAÇÃO 5: Metadados por chunk (se fornecidos) devem ser paralelos aos chunks
+    if metadados_por_chunk is not None and len(metadados_por_chunk) != len(chunks):
+        mensagem_erro = (
+            f"Número de metadados por chunk ({len(metadados_por_chunk)}) não corresponde "
+            f"ao número de chunks ({len(chunks)})."
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeArmazenamento(mensagem_erro)
+    
     logger.debug(f"✅ Validações passaram. Dimensão dos embeddings: {dimensao_primeiro_embedding}")
     
     # Gerar IDs únicos para cada chunk
@@ -582,6 +724,10 @@ def armazenar_chunks(
         # Copiar metadados do documento
         metadados_chunk = metadados.copy()
         
+        # Metadados gerados na vetorização (seção, página)
+        if metadados_por_chunk is not None:
+            metadados_chunk.update(metadados_por_chunk[i])
+        
         # Adicionar metadados específicos do chunk
         metadados_chunk["chunk_index"] = i
         metadados_chunk["total_chunks"] = len(chunks)
@@ -609,8 +755,6 @@ def armazenar_chunks(
             f"Documento: {metadados['nome_arquivo']} (ID: {documento_id})"
         )
         
-        return ids_chunks
-        
     except Exception as erro:
         mensagem_erro = (
             f"Falha ao armazenar chunks no ChromaDB. "
@@ -620,15 +764,80 @@ def armazenar_chunks(
         )
         logger.error(mensagem_erro)
         raise ErroDeArmazenamento(mensagem_erro) from erro
+    
+    # Registrar no catálogo de documentos (uma linha por documento)
+    estatisticas_documento = estatisticas_documento or {}
+    try:
+        obter_catalogo_documentos().registrar_documento({
+            "documento_id": documento_id,
+            "nome_arquivo": metadados["nome_arquivo"],
+            "data_upload": str(metadados["data_upload"]),
+            "tipo_documento": str(metadados["tipo_documento"]),
+            "numero_chunks": len(chunks),
+            "numero_caracteres": estatisticas_documento.get(
+                "numero_caracteres", calcular_numero_caracteres_do_documento(chunks, metadados_por_chunk)
+            ),
+            "numero_tokens": estatisticas_documento.get("numero_tokens", 0),
+        })
+    except ErroDeCatalogoDocumentos as erro:
+        # Desfazer a inserção: chunks sem linha no catálogo ficariam invisíveis na listagem
+        collection.delete(ids=ids_chunks)
+        mensagem_erro = f"Chunks removidos: falha ao registrar documento no catálogo. Erro: {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeArmazenamento(mensagem_erro) from erro
+    
+    # Indexar no índice lexical (BM25) usado pela busca híbrida
+    try:
+        obter_indice_lexical().indexar_chunks(documento_id, ids_chunks, chunks)
+    except ErroDeIndiceLexical as erro:
+        collection.delete(ids=ids_chunks)
+        obter_catalogo_documentos().remover_documento(documento_id)
+        mensagem_erro = f"Chunks removidos: falha ao indexar documento no índice lexical. Erro: {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeArmazenamento(mensagem_erro) from erro
+    
+    # Registrar o vetor do documento (centroide) usado pela busca hierárquica
+    try:
+        obter_indice_documentos().registrar_documento(documento_id, calcular_centroide(embeddings))
+    except ErroDeIndiceDocumentos as erro:
+        collection.delete(ids=ids_chunks)
+        obter_catalogo_documentos().remover_documento(documento_id)
+        obter_indice_lexical().remover_documento(documento_id)
+        mensagem_erro = f"Chunks removidos: falha ao registrar documento no índice de documentos. Erro: {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeArmazenamento(mensagem_erro) from erro
+    
+    return ids_chunks
+
+
+def calcular_numero_caracteres_do_documento(
+    chunks: list[str],
+    metadados_por_chunk: Optional[list[dict[str, Any]]] = None
+) -> int:
+    """
+    Estima o tamanho do texto do documento a partir dos chunks.
+    
+    Com offsets (offset_fim), o tamanho é exato (o overlap não é contado
+    duas vezes); sem offsets, soma o tamanho dos chunks.
+    """
+    if metadados_por_chunk:
+        offsets_fim = [metadados_chunk.get("offset_fim") for metadados_chunk in metadados_por_chunk]
+        if all(isinstance(offset, int) for offset in offsets_fim):
+            return max(offsets_fim)
+    return sum(len(chunk) for chunk in chunks)
 
 
 # ===== BUSCA POR SIMILARIDADE =====
 
 def buscar_chunks_similares(
-    collection: Collection,
+    collection: ArmazenamentoVetorial,
     query: str,
     k: int = 5,
-    filtro_metadados: Optional[dict[str, Any]] = None
+    filtro_metadados: Optional[dict[str, Any]] = None,
+    janela_vizinhos: int = 0,
+    modo_busca: Optional[str] = None,
+    lambda_mmr: Optional[float] = None,
+    numero_documentos_pre_selecao: Optional[int] = None
 ) -> list[dict[str, Any]]:
     """
     Busca os k chunks mais similares semanticamente a uma query de texto.
@@ -652,6 +861,40 @@ def buscar_chunks_similares(
     3. Busca usando similaridade de cosseno no ChromaDB
     4. Aplica filtros de metadados (opcional)
     5. Retorna os k resultados mais relevantes
+    6. (Opcional) Expande cada resultado com os chunks vizinhos (janela_vizinhos)
+    
+    MODO JANELA DE VIZINHOS:
+    Com janela_vizinhos=N > 0, cada chunk encontrado é ampliado com até N
+    chunks anteriores e N posteriores do MESMO documento. Janelas que se
+    tocam ou se sobrepõem são mescladas em um único trecho contíguo, com o
+    overlap entre chunks removido. Assim o agente recebe passagens inteiras
+    (ex: o artigo completo) em vez de fragmentos isolados de 500 tokens.
+    Como janelas podem ser mescladas, o retorno pode ter MENOS de k itens.
+    
+    MODO HÍBRIDO (modo_busca="hibrida"):
+    O ranking vetorial é combinado com o ranking BM25 do índice lexical
+    (servico_indice_lexical) por Reciprocal Rank Fusion. Identificadores
+    exatos ("art. 482 da CLT", "Súmula 331", "M54.5") que a busca vetorial
+    perde entram no top-k pelo ranking lexical. Os resultados vêm ordenados
+    pelo score de fusão ("score_rrf") em vez da distância.
+    
+    DIVERSIFICAÇÃO MMR (lambda_mmr):
+    Chunks sobrepostos e anexos repetidos fazem o top-k trazer várias cópias
+    quase idênticas do mesmo trecho. Com lambda_mmr definido, são buscados
+    k × MMR_FATOR_CANDIDATOS candidatos e os k finais são escolhidos por
+    Maximal Marginal Relevance sobre os embeddings armazenados:
+    cada escolha maximiza λ·relevância − (1−λ)·(maior similaridade com os já
+    escolhidos). λ=1 equivale ao ranking original; valores menores
+    penalizam mais as repetições (0.5–0.7 é o uso típico).
+    
+    BUSCA HIERÁRQUICA (numero_documentos_pre_selecao):
+    Em bases com muitos processos, buscar em todos os chunks é lento e
+    deixa chunks de processos sem relação disputarem o top-k. Com
+    numero_documentos_pre_selecao=N, a busca tem dois estágios:
+    1. Escolhe os N documentos cujo vetor (centroide dos chunks, em
+       servico_indice_documentos) é mais próximo da query
+    2. Busca os chunks apenas dentro desses N documentos
+    O filtro de metadados continua valendo nos dois estágios.
     
     IMPORTANTE:
     - Usa OpenAI para gerar embedding da query (mesmo modelo dos chunks)
@@ -659,11 +902,18 @@ def buscar_chunks_similares(
     - Evita erro de incompatibilidade com modelo interno do ChromaDB (384 dimensões)
     
     ARGS:
-        collection: Collection do ChromaDB onde buscar
+        collection: Armazenamento vetorial (Chroma ou NumPy) onde buscar
         query: Texto da pergunta/busca (será vetorizado usando OpenAI)
         k: Número de resultados a retornar (padrão: 5)
         filtro_metadados: (Opcional) Filtrar por metadados específicos
             Exemplo: {"tipo_documento": "pdf", "nome_arquivo": "laudo.pdf"}
+        janela_vizinhos: (Opcional) Quantos chunks vizinhos incluir de cada lado
+            de cada resultado (padrão: 0 = chunks isolados, comportamento original)
+        modo_busca: (Opcional) "vetorial" ou "hibrida" (None = MODO_BUSCA_RAG do .env)
+        lambda_mmr: (Opcional) Peso da relevância no MMR, entre 0 e 1
+            (None = sem diversificação, comportamento original)
+        numero_documentos_pre_selecao: (Opcional) Número de documentos
+            pré-selecionados na busca hierárquica (None = busca direta nos chunks)
     
     RETURNS:
         list[dict]: Lista de resultados, cada um contendo:
@@ -671,6 +921,10 @@ def buscar_chunks_similares(
             - documento (str): Texto do chunk
             - distancia (float): Score de similaridade (menor = mais similar)
             - metadados (dict): Metadados do chunk (documento_id, nome_arquivo, etc.)
+        No modo híbrido, cada resultado tem também "score_rrf" (maior = mais relevante).
+        No modo janela, "id"/"distancia" são os do melhor chunk da janela e os
+        metadados ganham chunk_index_inicial/final, pagina_inicial/final,
+        offset_inicio/fim (quando disponíveis) e ids_chunks (lista).
     
     RAISES:
         ErroDeBusca: Se query for inválida ou erro durante busca
@@ -700,18 +954,138 @@ def buscar_chunks_similares(
     """
     logger.info(f"🔍 Buscando chunks similares para query: '{query[:100]}...'")
     
-    # VALIDAÇÃO 1: Verificar se query não está vazia
-    if not query or query.strip() == "":
-        mensagem_erro = "Query de busca não pode ser vazia. Forneça um texto para buscar."
+    # Busca simples = lote de uma query (mesmas validações e formatação)
+    return buscar_chunks_similares_lote(
+        collection=collection,
+        queries=[query],
+        k=k,
+        filtros=filtro_metadados,
+        janela_vizinhos=janela_vizinhos,
+        modo_busca=modo_busca,
+        lambda_mmr=lambda_mmr,
+        numero_documentos_pre_selecao=numero_documentos_pre_selecao
+    )[0]
+
+
+def buscar_chunks_similares_lote(
+    collection: ArmazenamentoVetorial,
+    queries: list[str],
+    k: int = 5,
+    filtros: Optional[dict[str, Any] | list[Optional[dict[str, Any]]]] = None,
+    janela_vizinhos: int = 0,
+    modo_busca: Optional[str] = None,
+    lambda_mmr: Optional[float] = None,
+    numero_documentos_pre_selecao: Optional[int] = None
+) -> list[list[dict[str, Any]]]:
+    """
+    Busca os k chunks mais similares para VÁRIAS queries de uma só vez.
+    
+    CONTEXTO DE NEGÓCIO:
+    Vários fluxos fazem buscas relacionadas em sequência (ex: uma consulta
+    por agente/perito sobre o mesmo caso). Chamar buscar_chunks_similares()
+    N vezes custa N collection.count(), N requisições de embedding à OpenAI
+    e N consultas ao ChromaDB. Em lote, o custo é de UMA ida e volta de
+    embedding, não importa quantas queries.
+    
+    IMPLEMENTAÇÃO:
+    1. Valida todas as queries e parâmetros (um único collection.count())
+    2. Gera os embeddings de todas as queries em UMA chamada à OpenAI
+    2b. Com numero_documentos_pre_selecao, restringe o filtro de cada query
+        aos documentos pré-selecionados (pre_selecionar_documentos)
+    3. Consulta o ChromaDB com query_embeddings=[...] (uma chamada por filtro
+       distinto; com filtro único ou sem filtro, uma chamada no total)
+    4. No modo "hibrida", funde cada ranking vetorial com o ranking BM25
+       (combinar_com_ranking_lexical)
+    5. Com lambda_mmr, diversifica os candidatos por MMR
+       (diversificar_resultados_por_mmr)
+    6. Formata e devolve os resultados de cada query, na ordem de entrada
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy) onde buscar
+        queries: Lista de textos de busca (nenhum pode ser vazio)
+        k: Número de resultados por query (padrão: 5)
+        filtros: (Opcional) Um filtro de metadados aplicado a todas as queries,
+            ou uma lista paralela a queries com o filtro de cada uma (None = sem filtro)
+        janela_vizinhos: (Opcional) Chunks vizinhos de cada lado (ver buscar_chunks_similares)
+        modo_busca: (Opcional) "vetorial" ou "hibrida" (None = MODO_BUSCA_RAG do .env)
+        lambda_mmr: (Opcional) Peso da relevância no MMR (ver buscar_chunks_similares)
+        numero_documentos_pre_selecao: (Opcional) Documentos pré-selecionados na
+            busca hierárquica (ver buscar_chunks_similares)
+    
+    Returns:
+        list[list[dict]]: Uma lista de resultados por query, no mesmo formato
+        de buscar_chunks_similares() e na mesma ordem de queries
+    
+    Raises:
+        ErroDeBusca: Se alguma query for inválida ou erro durante a busca
+    
+    EXEMPLO:
+    ```python
+    resultados_por_query = buscar_chunks_similares_lote(
+        collection,
+        queries=["nexo causal", "perícia médica", "NR-12 máquinas"],
+        k=5,
+        filtros={"documento_id": {"$in": documento_ids}}
+    )
+    for query, resultados in zip(queries, resultados_por_query):
+        ...
+    ```
+    """
+    # VALIDAÇÃO 1: Lista de queries e cada query não vazias
+    if not queries:
+        mensagem_erro = "Lista de queries de busca não pode ser vazia."
         logger.error(mensagem_erro)
         raise ErroDeBusca(mensagem_erro)
     
+    for query in queries:
+        if not query or query.strip() == "":
+            mensagem_erro = "Query de busca não pode ser vazia. Forneça um texto para buscar."
+            logger.error(mensagem_erro)
+            raise ErroDeBusca(mensagem_erro)
+    
     # VALIDAÇÃO 2: Verificar se k é válido
     if k <= 0:
         mensagem_erro = f"Número de resultados k deve ser maior que 0. Recebido: {k}"
         logger.error(mensagem_erro)
         raise ErroDeBusca(mensagem_erro)
     
+    if janela_vizinhos < 0:
+        mensagem_erro = f"janela_vizinhos não pode ser negativa. Recebido: {janela_vizinhos}"
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro)
+    
+    modo_busca = modo_busca or configuracoes.MODO_BUSCA_RAG
+    if modo_busca not in MODOS_BUSCA_RAG:
+        mensagem_erro = f"modo_busca inválido: '{modo_busca}'. Válidos: {', '.join(MODOS_BUSCA_RAG)}"
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro)
+    
+    if lambda_mmr is not None and not 0.0 <= lambda_mmr <= 1.0:
+        mensagem_erro = f"lambda_mmr deve estar entre 0 e 1. Recebido: {lambda_mmr}"
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro)
+    
+    if numero_documentos_pre_selecao is not None and numero_documentos_pre_selecao <= 0:
+        mensagem_erro = (
+            f"numero_documentos_pre_selecao deve ser maior que 0. "
+            f"Recebido: {numero_documentos_pre_selecao}"
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro)
+    
+    # Normalizar filtros: um filtro por query
+    if isinstance(filtros, list):
+        if len(filtros) != len(queries):
+            mensagem_erro = (
+                f"Lista de filtros ({len(filtros)}) deve ter o mesmo tamanho "
+                f"da lista de queries ({len(queries)})."
+            )
+            logger.error(mensagem_erro)
+            raise ErroDeBusca(mensagem_erro)
+        filtros_por_query = filtros
+    else:
+        filtros_por_query = [filtros] * len(queries)
+    
     # VALIDAÇÃO 3: Verificar se collection tem documentos
     numero_documentos = collection.count()
     if numero_documentos == 0:
@@ -732,66 +1106,738 @@ def buscar_chunks_similares(
             f"disponíveis ({numero_documentos}). Ajustando para k={k_ajustado}"
         )
     
-    # Realizar busca no ChromaDB
+    # Busca híbrida e MMR trabalham sobre mais candidatos do que k
+    fator_candidatos = 1
+    if modo_busca == "hibrida":
+        fator_candidatos = max(fator_candidatos, configuracoes.BUSCA_HIBRIDA_FATOR_CANDIDATOS)
+    if lambda_mmr is not None:
+        fator_candidatos = max(fator_candidatos, configuracoes.MMR_FATOR_CANDIDATOS)
+    numero_candidatos = min(k_ajustado * fator_candidatos, numero_documentos)
+    
+    resultados_por_query: list[list[dict[str, Any]]] = [[] for _ in queries]
+    indices_por_filtro: dict[str, list[int]] = {}
+    
     try:
-        # Gerar embedding da query usando OpenAI (mesma dimensão dos chunks armazenados)
-        logger.debug("Gerando embedding da query usando OpenAI...")
-        embeddings_query = servico_vetorizacao.gerar_embeddings([query], usar_cache=False)
-        embedding_query = embeddings_query[0]  # Pegar o primeiro (e único) embedding
-        logger.debug(f"Embedding gerado. Dimensão: {len(embedding_query)}")
+        # Gerar embeddings de TODAS as queries em uma única requisição à OpenAI
+        # (mesmo modelo dos chunks armazenados)
+        logger.debug(f"Gerando embeddings de {len(queries)} query(s) usando OpenAI...")
+        embeddings_queries = servico_vetorizacao.gerar_embeddings(list(queries), usar_cache=False)
         
-        # ChromaDB query() com embedding pré-gerado:
-        # Usamos query_embeddings ao invés de query_texts para garantir
-        # que estamos usando o mesmo modelo (OpenAI) dos chunks armazenados
-        resultados_chromadb = collection.query(
-            query_embeddings=[embedding_query],  # Passar embedding já gerado
-            n_results=k_ajustado,
-            where=filtro_metadados,  # Filtro opcional por metadados
-            include=["documents", "metadatas", "distances"]  # O que incluir nos resultados
-        )
+        # Busca hierárquica: cada query passa a buscar só nos documentos pré-selecionados
+        if numero_documentos_pre_selecao is not None:
+            filtros_por_query = pre_selecionar_documentos(
+                collection, embeddings_queries, filtros_por_query, numero_documentos_pre_selecao
+            )
         
-        logger.debug(f"✅ Busca no ChromaDB concluída. Resultados encontrados: {k_ajustado}")
+        # Agrupar queries por filtro: o ChromaDB aceita um único where por chamada
+        # (query sem documento pré-selecionado fica sem resultados)
+        for indice, filtro in enumerate(filtros_por_query):
+            if filtro is FILTRO_SEM_DOCUMENTOS:
+                continue
+            chave_filtro = json.dumps(filtro, sort_keys=True, default=str)
+            indices_por_filtro.setdefault(chave_filtro, []).append(indice)
+        
+        for indices in indices_por_filtro.values():
+            filtro = filtros_por_query[indices[0]]
+            
+            # ChromaDB query() com embeddings pré-gerados (uma linha por query)
+            resultados_chromadb = collection.query(
+                query_embeddings=[embeddings_queries[indice] for indice in indices],
+                n_results=numero_candidatos,
+                where=filtro,  # Filtro opcional por metadados
+                include=["documents", "metadatas", "distances"]
+            )
+            
+            for posicao, indice in enumerate(indices):
+                resultados_por_query[indice] = formatar_resultados_chromadb(
+                    resultados_chromadb, posicao
+                )
+            
+            if modo_busca == "hibrida":
+                resultados_hibridos = combinar_com_ranking_lexical(
+                    collection=collection,
+                    queries=[queries[indice] for indice in indices],
+                    embeddings_queries=[embeddings_queries[indice] for indice in indices],
+                    resultados_vetoriais=[resultados_por_query[indice] for indice in indices],
+                    filtro=filtro,
+                    k=numero_candidatos if lambda_mmr is not None else k_ajustado,
+                    numero_candidatos=numero_candidatos
+                )
+                for indice, resultados in zip(indices, resultados_hibridos):
+                    resultados_por_query[indice] = resultados
+            
+            if lambda_mmr is not None:
+                resultados_diversificados = diversificar_resultados_por_mmr(
+                    collection=collection,
+                    embeddings_queries=[embeddings_queries[indice] for indice in indices],
+                    resultados_por_query=[resultados_por_query[indice] for indice in indices],
+                    k=k_ajustado,
+                    lambda_mmr=lambda_mmr
+                )
+                for indice, resultados in zip(indices, resultados_diversificados):
+                    resultados_por_query[indice] = resultados
+        
+        logger.debug(
+            f"✅ Busca em lote ({modo_busca}) concluída: {len(queries)} query(s), "
+            f"{len(indices_por_filtro)} consulta(s) ao ChromaDB"
+        )
         
     except Exception as erro:
         mensagem_erro = (
             f"Erro ao buscar no ChromaDB. "
-            f"Query: '{query[:100]}...', k={k}, filtro={filtro_metadados}. "
+            f"Queries: {[query[:50] for query in queries[:3]]}"
+            f"{'...' if len(queries) > 3 else ''}, k={k}, filtros={filtros}. "
             f"Erro: {str(erro)}"
         )
         logger.error(mensagem_erro)
         raise ErroDeBusca(mensagem_erro) from erro
     
-    # Formatar resultados em estrutura mais amigável
-    # ChromaDB retorna estrutura aninhada, vamos achatar para lista de dicts
-    resultados_formatados = []
+    if janela_vizinhos > 0:
+        resultados_por_query = [
+            expandir_resultados_com_vizinhos(collection, resultados, janela_vizinhos)
+            for resultados in resultados_por_query
+        ]
     
-    # ChromaDB retorna resultados em listas aninhadas (suporta múltiplas queries)
-    # Como fizemos apenas uma query, acessamos o primeiro índice [0]
-    ids = resultados_chromadb["ids"][0] if resultados_chromadb["ids"] else []
-    documentos = resultados_chromadb["documents"][0] if resultados_chromadb["documents"] else []
-    distancias = resultados_chromadb["distances"][0] if resultados_chromadb["distances"] else []
-    metadados = resultados_chromadb["metadatas"][0] if resultados_chromadb["metadatas"] else []
+    logger.info(
+        f"✅ Busca concluída. {len(queries)} query(s), "
+        f"{sum(len(resultados) for resultados in resultados_por_query)} chunks retornados."
+    )
     
-    for i in range(len(ids)):
-        resultado = {
+    return resultados_por_query
+
+
+def formatar_resultados_chromadb(
+    resultados_chromadb: dict[str, Any],
+    indice_query: int
+) -> list[dict[str, Any]]:
+    """
+    Achata o resultado de collection.query() de UMA query em lista de dicts.
+    
+    O ChromaDB devolve listas aninhadas (uma linha por query embedding);
+    esta função extrai a linha indice_query.
+    
+    Args:
+        resultados_chromadb: Retorno de collection.query()
+        indice_query: Posição da query em query_embeddings
+    
+    Returns:
+        list[dict]: [{"id", "documento", "distancia", "metadados"}, ...]
+    """
+    def obter_linha(campo: str) -> list[Any]:
+        valores = resultados_chromadb.get(campo)
+        if not valores or len(valores) <= indice_query:
+            return []
+        return valores[indice_query] or []
+    
+    ids = obter_linha("ids")
+    documentos = obter_linha("documents")
+    distancias = obter_linha("distances")
+    metadados = obter_linha("metadatas")
+    
+    return [
+        {
             "id": ids[i],
             "documento": documentos[i],
             "distancia": distancias[i],
             "metadados": metadados[i]
         }
-        resultados_formatados.append(resultado)
+        for i in range(len(ids))
+    ]
+
+
+# ===== BUSCA HÍBRIDA (VETORIAL + BM25) =====
+
+def fundir_rankings_rrf(
+    rankings: list[list[str]],
+    constante_rrf: int = 60
+) -> list[tuple[str, float]]:
+    """
+    Funde rankings de IDs por Reciprocal Rank Fusion (RRF).
     
-    logger.info(
-        f"✅ Busca concluída. Retornando {len(resultados_formatados)} chunks mais similares."
+    IMPLEMENTAÇÃO:
+    score(id) = soma, em cada ranking onde o id aparece, de 1 / (constante_rrf + posição),
+    com posição começando em 1. Só usa as POSIÇÕES, então não é preciso
+    normalizar distâncias de cosseno e scores BM25 (escalas incomparáveis).
+    
+    Args:
+        rankings: Listas de IDs, cada uma do mais para o menos relevante
+        constante_rrf: Constante k do RRF (60 na literatura)
+    
+    Returns:
+        list[tuple[str, float]]: (id, score) do maior para o menor score;
+        empates mantêm a ordem de primeira aparição
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for posicao, id_item in enumerate(ranking, start=1):
+            scores[id_item] = scores.get(id_item, 0.0) + 1.0 / (constante_rrf + posicao)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def extrair_documento_ids_do_filtro(filtro: Optional[dict[str, Any]]) -> Optional[list[str]]:
+    """
+    Extrai a restrição por documento_id de um filtro do ChromaDB, se houver.
+    
+    Aceita {"documento_id": "x"} e {"documento_id": {"$in": [...]}} (o formato
+    usado por consultar_rag), inclusive dentro de um "$and" (o formato da
+    busca hierárquica; várias restrições são intersectadas). Usado para
+    restringir o BM25 aos mesmos documentos ANTES de cortar os candidatos.
+    """
+    if not filtro:
+        return None
+    if isinstance(filtro.get("$and"), list):
+        documento_ids: Optional[list[str]] = None
+        for subfiltro in filtro["$and"]:
+            documento_ids_subfiltro = extrair_documento_ids_do_filtro(subfiltro)
+            if documento_ids_subfiltro is None:
+                continue
+            if documento_ids is None:
+                documento_ids = documento_ids_subfiltro
+            else:
+                permitidos = set(documento_ids_subfiltro)
+                documento_ids = [documento_id for documento_id in documento_ids if documento_id in permitidos]
+        return documento_ids
+    valor = filtro.get("documento_id")
+    if isinstance(valor, str):
+        return [valor]
+    if isinstance(valor, dict) and isinstance(valor.get("$in"), list):
+        return [str(documento_id) for documento_id in valor["$in"]]
+    return None
+
+
+def calcular_distancia_cosseno(embedding_a: Any, embedding_b: Any) -> float:
+    """
+    Distância de cosseno (1 - similaridade), a mesma métrica da collection.
+    """
+    vetor_a = np.asarray(embedding_a, dtype=np.float64)
+    vetor_b = np.asarray(embedding_b, dtype=np.float64)
+    normas = float(np.linalg.norm(vetor_a) * np.linalg.norm(vetor_b))
+    if normas == 0.0:
+        return 1.0
+    return 1.0 - float(np.dot(vetor_a, vetor_b)) / normas
+
+
+def combinar_com_ranking_lexical(
+    collection: ArmazenamentoVetorial,
+    queries: list[str],
+    embeddings_queries: list[Any],
+    resultados_vetoriais: list[list[dict[str, Any]]],
+    filtro: Optional[dict[str, Any]],
+    k: int,
+    numero_candidatos: int
+) -> list[list[dict[str, Any]]]:
+    """
+    Funde os resultados vetoriais de cada query com o ranking BM25 (RRF).
+    
+    IMPLEMENTAÇÃO:
+    1. Reconstrói o índice lexical se estiver vazio (base anterior ao índice)
+    2. Busca numero_candidatos chunks no BM25 para cada query
+    3. Chunks que só o BM25 encontrou são lidos do ChromaDB em UM get(),
+       com o mesmo filtro de metadados da busca vetorial (o filtro vale para
+       os dois rankings)
+    4. Funde os dois rankings por RRF e mantém os k melhores
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+        queries: Textos das queries (mesmo filtro)
+        embeddings_queries: Embeddings das queries (paralelo a queries)
+        resultados_vetoriais: Resultados formatados da busca vetorial de cada query
+        filtro: Filtro de metadados aplicado às queries
+        k: Número de resultados finais por query
+        numero_candidatos: Candidatos buscados no BM25 por query
+    
+    Returns:
+        list[list[dict]]: Resultados de cada query ordenados por "score_rrf";
+        "distancia" é sempre a distância de cosseno até a query
+    
+    Raises:
+        ErroDeBusca: Se o índice lexical ou o ChromaDB falharem
+    """
+    indice_lexical = obter_indice_lexical()
+    documento_ids_filtro = extrair_documento_ids_do_filtro(filtro)
+    
+    try:
+        if indice_lexical.esta_vazio():
+            reconstruir_indice_lexical(collection)
+        rankings_lexicais = [
+            indice_lexical.buscar(query, limite=numero_candidatos, documento_ids=documento_ids_filtro)
+            for query in queries
+        ]
+    except ErroDeIndiceLexical as erro:
+        raise ErroDeBusca(f"Erro na busca lexical (BM25): {erro}") from erro
+    
+    # Chunks encontrados só pelo BM25: buscar texto, metadados e embedding de uma vez
+    ids_vetoriais = [{resultado["id"] for resultado in resultados} for resultados in resultados_vetoriais]
+    ids_somente_lexicais = sorted({
+        id_chunk
+        for ranking, ids_vetor in zip(rankings_lexicais, ids_vetoriais)
+        for id_chunk, _ in ranking
+        if id_chunk not in ids_vetor
+    })
+    
+    chunks_lexicais: dict[str, tuple[str, dict[str, Any], Any]] = {}
+    if ids_somente_lexicais:
+        dados = collection.get(
+            ids=ids_somente_lexicais,
+            where=filtro,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        for id_chunk, texto_chunk, metadados_chunk, embedding_chunk in zip(
+            dados["ids"], dados["documents"], dados["metadatas"], dados["embeddings"]
+        ):
+            chunks_lexicais[id_chunk] = (texto_chunk, metadados_chunk or {}, embedding_chunk)
+    
+    resultados_hibridos: list[list[dict[str, Any]]] = []
+    for embedding_query, resultados, ranking_lexical, ids_vetor in zip(
+        embeddings_queries, resultados_vetoriais, rankings_lexicais, ids_vetoriais
+    ):
+        resultado_por_id = {resultado["id"]: resultado for resultado in resultados}
+        ranking_lexical_filtrado = [
+            id_chunk for id_chunk, _ in ranking_lexical
+            if id_chunk in ids_vetor or id_chunk in chunks_lexicais
+        ]
+        ranking_fundido = fundir_rankings_rrf(
+            [[resultado["id"] for resultado in resultados], ranking_lexical_filtrado],
+            constante_rrf=configuracoes.BUSCA_HIBRIDA_CONSTANTE_RRF
+        )[:k]
+        
+        resultados_query = []
+        for id_chunk, score_rrf in ranking_fundido:
+            if id_chunk in resultado_por_id:
+                resultado = dict(resultado_por_id[id_chunk])
+            else:
+                texto_chunk, metadados_chunk, embedding_chunk = chunks_lexicais[id_chunk]
+                resultado = {
+                    "id": id_chunk,
+                    "documento": texto_chunk,
+                    "distancia": calcular_distancia_cosseno(embedding_query, embedding_chunk),
+                    "metadados": metadados_chunk,
+                }
+            resultado["score_rrf"] = score_rrf
+            resultados_query.append(resultado)
+        resultados_hibridos.append(resultados_query)
+    
+    logger.debug(
+        f"Busca híbrida: {len(queries)} query(s), "
+        f"{len(ids_somente_lexicais)} chunk(s) encontrados apenas pelo BM25"
     )
+    return resultados_hibridos
+
+
+# ===== BUSCA HIERÁRQUICA (DOCUMENTOS → CHUNKS) =====
+
+# Marcador de query sem nenhum documento pré-selecionado (não consulta o ChromaDB)
+FILTRO_SEM_DOCUMENTOS: dict[str, Any] = {}
+
+
+def restringir_filtro_a_documentos(
+    filtro: Optional[dict[str, Any]],
+    documento_ids: list[str]
+) -> dict[str, Any]:
+    """
+    Combina um filtro de metadados com uma restrição por documento_id.
+    """
+    restricao = {"documento_id": {"$in": documento_ids}}
+    if not filtro:
+        return restricao
+    return {"$and": [filtro, restricao]}
+
+
+def pre_selecionar_documentos(
+    collection: ArmazenamentoVetorial,
+    embeddings_queries: list[list[float]],
+    filtros_por_query: list[Optional[dict[str, Any]]],
+    numero_documentos: int
+) -> list[Optional[dict[str, Any]]]:
+    """
+    Primeiro estágio da busca hierárquica: escolhe os documentos de cada query.
+    
+    IMPLEMENTAÇÃO:
+    1. Se o índice de documentos estiver vazio (base anterior a ele),
+       reconstrói a partir do ChromaDB
+    2. Para cada grupo de queries com o mesmo filtro, uma multiplicação de
+       matrizes sobre os centroides (IndiceDocumentos.buscar_lote), já
+       restrita aos documento_ids do filtro, se houver
+    3. Devolve o filtro de cada query restrito aos documentos escolhidos
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy), usado só para reconstruir o índice
+        embeddings_queries: Embeddings das queries
+        filtros_por_query: Filtro de metadados de cada query
+        numero_documentos: Documentos escolhidos por query
     
-    return resultados_formatados
+    Returns:
+        list: Novo filtro de cada query (FILTRO_SEM_DOCUMENTOS se nenhum
+        documento foi escolhido)
+    
+    Raises:
+        ErroDeBusca: Se o índice de documentos não puder ser lido ou reconstruído
+    """
+    indice_documentos = obter_indice_documentos()
+    try:
+        if indice_documentos.esta_vazio():
+            reconstruir_indice_documentos(collection)
+        
+        indices_por_filtro: dict[str, list[int]] = {}
+        for indice, filtro in enumerate(filtros_por_query):
+            chave_filtro = json.dumps(filtro, sort_keys=True, default=str)
+            indices_por_filtro.setdefault(chave_filtro, []).append(indice)
+        
+        filtros_restritos: list[Optional[dict[str, Any]]] = list(filtros_por_query)
+        for indices in indices_por_filtro.values():
+            filtro = filtros_por_query[indices[0]]
+            documentos_por_query = indice_documentos.buscar_lote(
+                [embeddings_queries[indice] for indice in indices],
+                limite=numero_documentos,
+                documento_ids=extrair_documento_ids_do_filtro(filtro)
+            )
+            for indice, documentos in zip(indices, documentos_por_query):
+                documento_ids = [documento_id for documento_id, _ in documentos]
+                filtros_restritos[indice] = (
+                    restringir_filtro_a_documentos(filtro, documento_ids)
+                    if documento_ids else FILTRO_SEM_DOCUMENTOS
+                )
+    except ErroDeIndiceDocumentos as erro:
+        raise ErroDeBusca(f"Erro no índice de documentos da busca hierárquica: {erro}") from erro
+    
+    return filtros_restritos
+
+
+# ===== DIVERSIFICAÇÃO (MAXIMAL MARGINAL RELEVANCE) =====
+
+def selecionar_indices_mmr(
+    relevancias: np.ndarray,
+    embeddings: np.ndarray,
+    k: int,
+    lambda_mmr: float
+) -> list[int]:
+    """
+    Seleciona k candidatos por Maximal Marginal Relevance (vetorizado em NumPy).
+    
+    IMPLEMENTAÇÃO:
+    A cada passo escolhe argmax(λ·relevância − (1−λ)·max_sim), onde max_sim
+    é a maior similaridade de cosseno do candidato com os já escolhidos.
+    max_sim é atualizado com UM produto matriz-vetor por escolha
+    (O(k·n·d) no total, sem matriz n×n).
+    
+    Args:
+        relevancias: Relevância de cada candidato (n,), maior = mais relevante
+        embeddings: Embeddings dos candidatos (n, d)
+        k: Número de candidatos a selecionar
+        lambda_mmr: Peso da relevância (1 = só relevância, 0 = só diversidade)
+    
+    Returns:
+        list[int]: Índices dos candidatos escolhidos, na ordem de escolha
+    """
+    numero_candidatos = len(relevancias)
+    k = min(k, numero_candidatos)
+    if k <= 0:
+        return []
+    
+    normas = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normas[normas == 0.0] = 1.0
+    embeddings_normalizados = embeddings / normas
+    
+    similaridade_maxima = np.zeros(numero_candidatos)
+    selecionados = np.zeros(numero_candidatos, dtype=bool)
+    indices_escolhidos: list[int] = []
+    
+    for _ in range(k):
+        pontuacoes = lambda_mmr * relevancias
+        if indices_escolhidos:
+            pontuacoes = pontuacoes - (1.0 - lambda_mmr) * similaridade_maxima
+        pontuacoes = np.where(selecionados, -np.inf, pontuacoes)
+        
+        indice_escolhido = int(np.argmax(pontuacoes))
+        indices_escolhidos.append(indice_escolhido)
+        selecionados[indice_escolhido] = True
+        
+        similaridades = embeddings_normalizados @ embeddings_normalizados[indice_escolhido]
+        similaridade_maxima = (
+            similaridades if len(indices_escolhidos) == 1
+            else np.maximum(similaridade_maxima, similaridades)
+        )
+    
+    return indices_escolhidos
+
+
+def diversificar_resultados_por_mmr(
+    collection: ArmazenamentoVetorial,
+    embeddings_queries: list[Any],
+    resultados_por_query: list[list[dict[str, Any]]],
+    k: int,
+    lambda_mmr: float
+) -> list[list[dict[str, Any]]]:
+    """
+    Reordena e corta os candidatos de cada query por MMR.
+    
+    IMPLEMENTAÇÃO:
+    1. Lê os embeddings armazenados de TODOS os candidatos em um get()
+    2. Relevância: similaridade de cosseno com a query (modo vetorial) ou
+       score_rrf normalizado para [0, 1] (modo híbrido, preserva o sinal BM25)
+    3. selecionar_indices_mmr() escolhe os k finais
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+        embeddings_queries: Embedding de cada query
+        resultados_por_query: Candidatos formatados de cada query (super-conjunto do top-k)
+        k: Número de resultados finais por query
+        lambda_mmr: Peso da relevância (0 a 1)
+    
+    Returns:
+        list[list[dict]]: Até k resultados por query, na ordem do MMR
+    
+    Raises:
+        ErroDeBusca: Se a leitura dos embeddings falhar
+    """
+    ids_candidatos = sorted({
+        resultado["id"] for resultados in resultados_por_query for resultado in resultados
+    })
+    if not ids_candidatos:
+        return resultados_por_query
+    
+    try:
+        dados = collection.get(ids=ids_candidatos, include=["embeddings"])
+    except Exception as erro:
+        mensagem_erro = f"Erro ao ler embeddings dos candidatos para MMR. Erro: {str(erro)}"
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro) from erro
+    embedding_por_id = dict(zip(dados["ids"], dados["embeddings"]))
+    
+    resultados_diversificados: list[list[dict[str, Any]]] = []
+    for embedding_query, resultados in zip(embeddings_queries, resultados_por_query):
+        candidatos = [resultado for resultado in resultados if resultado["id"] in embedding_por_id]
+        if len(candidatos) <= 1:
+            resultados_diversificados.append(candidatos[:k])
+            continue
+        
+        embeddings_candidatos = np.asarray(
+            [embedding_por_id[candidato["id"]] for candidato in candidatos], dtype=np.float64
+        )
+        
+        if all("score_rrf" in candidato for candidato in candidatos):
+            scores = np.asarray([candidato["score_rrf"] for candidato in candidatos], dtype=np.float64)
+            amplitude = scores.max() - scores.min()
+            relevancias = (scores - scores.min()) / amplitude if amplitude > 0 else np.ones_like(scores)
+        else:
+            vetor_query = np.asarray(embedding_query, dtype=np.float64)
+            normas = np.linalg.norm(embeddings_candidatos, axis=1) * (np.linalg.norm(vetor_query) or 1.0)
+            normas[normas == 0.0] = 1.0
+            relevancias = (embeddings_candidatos @ vetor_query) / normas
+        
+        indices = selecionar_indices_mmr(relevancias, embeddings_candidatos, k, lambda_mmr)
+        resultados_diversificados.append([candidatos[indice] for indice in indices])
+    
+    logger.debug(f"MMR (λ={lambda_mmr}): {len(ids_candidatos)} candidatos → top-{k} diversificado")
+    return resultados_diversificados
+
+
+# ===== EXPANSÃO DE RESULTADOS COM CHUNKS VIZINHOS =====
+
+def mesclar_textos_de_chunks_contiguos(chunks_ordenados: list[tuple[str, dict[str, Any]]]) -> str:
+    """
+    Concatena chunks consecutivos de um documento removendo o overlap.
+    
+    IMPLEMENTAÇÃO:
+    - Com offset_inicio/offset_fim nos metadados (documentos ingeridos com
+      offsets), o trecho já coberto pelo chunk anterior é cortado pelo
+      próprio offset: texto[fim_anterior - offset_inicio:]
+    - Sem offsets (documentos antigos), procura o maior sufixo do texto
+      acumulado que é prefixo do próximo chunk (mínimo de
+      SOBREPOSICAO_MINIMA_SEM_OFFSETS caracteres)
+    - Sem sobreposição, os chunks são separados por quebra de linha
+    
+    Args:
+        chunks_ordenados: [(texto_chunk, metadados_chunk)] em ordem de chunk_index
+    
+    Returns:
+        str: Trecho contíguo sem repetição do overlap
+    """
+    partes: list[str] = []
+    texto_anterior = ""
+    offset_fim_anterior: Optional[int] = None
+    
+    for texto_chunk, metadados_chunk in chunks_ordenados:
+        offset_inicio = metadados_chunk.get("offset_inicio")
+        offset_fim = metadados_chunk.get("offset_fim")
+        possui_offsets = isinstance(offset_inicio, int) and isinstance(offset_fim, int)
+        
+        if not partes:
+            partes.append(texto_chunk)
+        elif possui_offsets and offset_fim_anterior is not None:
+            if offset_inicio < offset_fim_anterior:
+                partes.append(texto_chunk[offset_fim_anterior - offset_inicio:])
+            else:
+                partes.append("\n" + texto_chunk)
+        else:
+            tamanho_sobreposicao = 0
+            for tamanho in range(min(len(texto_anterior), len(texto_chunk)), SOBREPOSICAO_MINIMA_SEM_OFFSETS - 1, -1):
+                if texto_anterior.endswith(texto_chunk[:tamanho]):
+                    tamanho_sobreposicao = tamanho
+                    break
+            if tamanho_sobreposicao:
+                partes.append(texto_chunk[tamanho_sobreposicao:])
+            else:
+                partes.append("\n" + texto_chunk)
+        
+        texto_anterior = texto_chunk
+        if possui_offsets:
+            offset_fim_anterior = max(offset_fim, offset_fim_anterior or offset_fim)
+        else:
+            offset_fim_anterior = None
+    
+    return "".join(partes)
+
+
+def expandir_resultados_com_vizinhos(
+    collection: ArmazenamentoVetorial,
+    resultados: list[dict[str, Any]],
+    janela_vizinhos: int
+) -> list[dict[str, Any]]:
+    """
+    Amplia resultados de busca com os chunks vizinhos, mesclando janelas.
+    
+    CONTEXTO DE NEGÓCIO:
+    Um chunk isolado costuma cortar o raciocínio no meio (o pedido sem o
+    fundamento, o artigo sem o parágrafo). Este passo devolve ao agente o
+    trecho contíguo ao redor de cada resultado.
+    
+    IMPLEMENTAÇÃO:
+    1. Para cada resultado, calcula o intervalo [chunk_index - N, chunk_index + N]
+       (limitado a [0, total_chunks - 1]) dentro do seu documento_id
+    2. Intervalos do mesmo documento que se sobrepõem ou se tocam são
+       mesclados (o trecho aparece UMA vez, representado pelo resultado mais bem ranqueado)
+    3. Busca todos os chunks necessários em UMA chamada collection.get(ids=...)
+       (IDs são determinísticos: {documento_id}_chunk_{index})
+    4. Monta o texto de cada janela sem repetir o overlap
+    
+    Resultados sem documento_id/chunk_index (metadados incompletos) são
+    devolvidos inalterados.
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+        resultados: Resultados formatados de buscar_chunks_similares
+        janela_vizinhos: Quantos chunks incluir de cada lado
+    
+    Returns:
+        list[dict]: Janelas no formato de buscar_chunks_similares, na ordem do
+        ranking de entrada (distância no modo vetorial, score_rrf no híbrido)
+    
+    Raises:
+        ErroDeBusca: Se a leitura dos chunks vizinhos falhar
+    """
+    janelas_por_documento: dict[str, list[dict[str, Any]]] = {}
+    resultados_sem_janela: list[dict[str, Any]] = []
+    
+    # Posição no ranking de entrada (por distância na busca vetorial, por
+    # score_rrf na híbrida): define o melhor chunk de cada janela e a ordem final
+    posicao_por_id = {resultado["id"]: posicao for posicao, resultado in enumerate(resultados)}
+    
+    for resultado in resultados:
+        metadados_resultado = resultado.get("metadados") or {}
+        documento_id = metadados_resultado.get("documento_id")
+        chunk_index = metadados_resultado.get("chunk_index")
+        
+        if documento_id is None or not isinstance(chunk_index, int):
+            resultados_sem_janela.append(resultado)
+            continue
+        
+        total_chunks = metadados_resultado.get("total_chunks")
+        indice_final = chunk_index + janela_vizinhos
+        if isinstance(total_chunks, int):
+            indice_final = min(indice_final, total_chunks - 1)
+        
+        janelas_por_documento.setdefault(documento_id, []).append({
+            "indice_inicial": max(0, chunk_index - janela_vizinhos),
+            "indice_final": indice_final,
+            "melhor_resultado": resultado,
+        })
+    
+    # Mesclar janelas sobrepostas/adjacentes de cada documento
+    janelas_mescladas: list[tuple[str, dict[str, Any]]] = []
+    for documento_id, janelas in janelas_por_documento.items():
+        janelas.sort(key=lambda janela: janela["indice_inicial"])
+        janela_atual = janelas[0]
+        for janela in janelas[1:]:
+            if janela["indice_inicial"] <= janela_atual["indice_final"] + 1:
+                janela_atual["indice_final"] = max(janela_atual["indice_final"], janela["indice_final"])
+                if posicao_por_id[janela["melhor_resultado"]["id"]] < posicao_por_id[janela_atual["melhor_resultado"]["id"]]:
+                    janela_atual["melhor_resultado"] = janela["melhor_resultado"]
+            else:
+                janelas_mescladas.append((documento_id, janela_atual))
+                janela_atual = janela
+        janelas_mescladas.append((documento_id, janela_atual))
+    
+    ids_necessarios = [
+        f"{documento_id}_chunk_{indice}"
+        for documento_id, janela in janelas_mescladas
+        for indice in range(janela["indice_inicial"], janela["indice_final"] + 1)
+    ]
+    
+    try:
+        chunks_vizinhos = collection.get(ids=ids_necessarios, include=["documents", "metadatas"])
+    except Exception as erro:
+        mensagem_erro = f"Erro ao buscar chunks vizinhos no ChromaDB. Erro: {str(erro)}"
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro) from erro
+    
+    chunks_por_id = {
+        id_chunk: (texto_chunk, metadados_chunk or {})
+        for id_chunk, texto_chunk, metadados_chunk in zip(
+            chunks_vizinhos["ids"], chunks_vizinhos["documents"], chunks_vizinhos["metadatas"]
+        )
+    }
+    
+    resultados_expandidos: list[dict[str, Any]] = []
+    for documento_id, janela in janelas_mescladas:
+        melhor_resultado = janela["melhor_resultado"]
+        ids_janela = [
+            f"{documento_id}_chunk_{indice}"
+            for indice in range(janela["indice_inicial"], janela["indice_final"] + 1)
+            if f"{documento_id}_chunk_{indice}" in chunks_por_id
+        ]
+        if not ids_janela:
+            resultados_expandidos.append(melhor_resultado)
+            continue
+        
+        chunks_janela = [chunks_por_id[id_chunk] for id_chunk in ids_janela]
+        metadados_primeiro = chunks_janela[0][1]
+        metadados_ultimo = chunks_janela[-1][1]
+        
+        metadados_janela = dict(melhor_resultado["metadados"] or {})
+        metadados_janela["chunk_index_inicial"] = metadados_primeiro.get("chunk_index")
+        metadados_janela["chunk_index_final"] = metadados_ultimo.get("chunk_index")
+        metadados_janela["ids_chunks"] = ids_janela
+        for chave, metadados_origem in (
+            ("pagina_inicial", metadados_primeiro),
+            ("offset_inicio", metadados_primeiro),
+            ("pagina_final", metadados_ultimo),
+            ("offset_fim", metadados_ultimo),
+        ):
+            if chave in metadados_origem:
+                metadados_janela[chave] = metadados_origem[chave]
+        
+        resultados_expandidos.append({
+            **melhor_resultado,
+            "documento": mesclar_textos_de_chunks_contiguos(chunks_janela),
+            "metadados": metadados_janela,
+        })
+    
+    resultados_expandidos.extend(resultados_sem_janela)
+    resultados_expandidos.sort(key=lambda resultado: posicao_por_id[resultado["id"]])
+    
+    logger.debug(
+        f"Janela de vizinhos ±{janela_vizinhos}: {len(resultados)} chunks → "
+        f"{len(resultados_expandidos)} trechos contíguos"
+    )
+    
+    return resultados_expandidos
 
 
 # ===== OBTER DOCUMENTO POR ID =====
 
 def obter_documento_por_id(
-    collection: Collection,
+    collection: ArmazenamentoVetorial,
     documento_id: str
 ) -> dict[str, Any]:
     """
@@ -806,9 +1852,10 @@ def obter_documento_por_id(
     1. Busca todos os chunks onde metadados["documento_id"] == documento_id
     2. Ordena chunks por chunk_index para manter ordem original
     3. Retorna estrutura contendo documentos (chunks), metadados e IDs
+    (Caso particular de obter_documentos_por_ids com um único ID.)
     
     Args:
-        collection: Collection do ChromaDB
+        collection: Armazenamento vetorial (Chroma ou NumPy)
         documento_id: ID único do documento a buscar
     
     Returns:
@@ -841,73 +1888,223 @@ def obter_documento_por_id(
     """
     logger.info(f"🔍 Buscando documento por ID: {documento_id}")
     
+    documento = obter_documentos_por_ids(collection, [documento_id])[documento_id]
+    
+    if documento["count"] == 0:
+        logger.warning(f"⚠️ Documento {documento_id} não encontrado no ChromaDB")
+    else:
+        logger.info(f"✅ Documento {documento_id} encontrado: {documento['count']} chunks")
+    
+    return documento
+
+
+def obter_documentos_por_ids(
+    collection: ArmazenamentoVetorial,
+    documento_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Recupera os chunks de VÁRIOS documentos em uma única consulta ao ChromaDB.
+    
+    CONTEXTO DE NEGÓCIO:
+    Petições chegam com 20+ anexos. Buscar cada documento separadamente
+    significa N consultas filtradas por metadado em sequência; aqui é uma só.
+    
+    IMPLEMENTAÇÃO:
+    1. Uma única chamada collection.get(where={"documento_id": {"$in": ids}})
+    2. Uma passada agrupa os chunks por documento_id, posicionando cada um
+       pelo chunk_index (sem ordenação quando total_chunks está presente)
+    3. Documentos sem chunks aparecem no mapa com count == 0
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+        documento_ids: IDs dos documentos (duplicatas são ignoradas)
+    
+    Returns:
+        dict[str, dict]: {documento_id: {"documents", "metadatas", "ids", "count"}},
+        no mesmo formato de obter_documento_por_id
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB
+    """
+    ids_unicos = list(dict.fromkeys(documento_ids))
+    documentos_por_id: dict[str, dict[str, Any]] = {
+        documento_id: {"documents": [], "metadatas": [], "ids": [], "count": 0}
+        for documento_id in ids_unicos
+    }
+    if not ids_unicos:
+        return documentos_por_id
+    
+    filtro = (
+        {"documento_id": ids_unicos[0]} if len(ids_unicos) == 1
+        else {"documento_id": {"$in": ids_unicos}}
+    )
+    
     try:
-        # Buscar todos os chunks deste documento
-        # Usar where filter para filtrar por documento_id
-        resultados = collection.get(
-            where={"documento_id": documento_id},
-            include=["documents", "metadatas"]
+        resultados = collection.get(where=filtro, include=["documents", "metadatas"])
+    except Exception as erro:
+        mensagem_erro = (
+            f"Erro ao buscar documentos por ID no ChromaDB. "
+            f"documento_ids: {ids_unicos[:5]}{'...' if len(ids_unicos) > 5 else ''}. "
+            f"Erro: {str(erro)}"
         )
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro) from erro
+    
+    # Agrupar em uma passada: slots[documento_id][chunk_index] = (texto, metadados, id)
+    slots_por_documento: dict[str, list] = {}
+    sobras_por_documento: dict[str, list] = {}
+    for id_chunk, texto_chunk, metadados_chunk in zip(
+        resultados.get("ids") or [], resultados.get("documents") or [], resultados.get("metadatas") or []
+    ):
+        metadados_chunk = metadados_chunk or {}
+        documento_id = metadados_chunk.get("documento_id")
+        if documento_id not in documentos_por_id:
+            continue
         
-        # Verificar se encontrou algum chunk
-        if not resultados or len(resultados.get("ids", [])) == 0:
-            logger.warning(f"⚠️ Documento {documento_id} não encontrado no ChromaDB")
-            return {
-                "documents": [],
-                "metadatas": [],
-                "ids": [],
-                "count": 0
-            }
-        
-        # Extrair dados
-        ids = resultados["ids"]
-        documentos = resultados["documents"]
-        metadados = resultados["metadatas"]
-        
-        # Ordenar chunks por chunk_index para manter ordem original
-        # Criar lista de tuplas (chunk_index, documento, metadado, id)
-        chunks_com_indices = []
-        for i in range(len(ids)):
-            chunk_index = int(metadados[i].get("chunk_index", i))
-            chunks_com_indices.append((
-                chunk_index,
-                documentos[i],
-                metadados[i],
-                ids[i]
-            ))
-        
-        # Ordenar por chunk_index
-        chunks_com_indices.sort(key=lambda x: x[0])
-        
-        # Reconstruir listas ordenadas
-        documentos_ordenados = [chunk[1] for chunk in chunks_com_indices]
-        metadados_ordenados = [chunk[2] for chunk in chunks_com_indices]
-        ids_ordenados = [chunk[3] for chunk in chunks_com_indices]
+        chunk_index = int(metadados_chunk.get("chunk_index", -1))
+        total_chunks = int(metadados_chunk.get("total_chunks", 0))
+        slots = slots_por_documento.setdefault(documento_id, [None] * total_chunks)
         
-        logger.info(
-            f"✅ Documento {documento_id} encontrado: {len(documentos_ordenados)} chunks"
-        )
+        if 0 <= chunk_index < len(slots) and slots[chunk_index] is None:
+            slots[chunk_index] = (chunk_index, texto_chunk, metadados_chunk, id_chunk)
+        else:
+            sobras_por_documento.setdefault(documento_id, []).append(
+                (chunk_index, texto_chunk, metadados_chunk, id_chunk)
+            )
+    
+    for documento_id, slots in slots_por_documento.items():
+        chunks_ordenados = [slot for slot in slots if slot is not None]
+        sobras = sobras_por_documento.get(documento_id)
+        if sobras:
+            # Metadados inconsistentes (documentos antigos): ordenação completa
+            chunks_ordenados = sorted(chunks_ordenados + sobras, key=lambda chunk: chunk[0])
         
-        return {
-            "documents": documentos_ordenados,
-            "metadatas": metadados_ordenados,
-            "ids": ids_ordenados,
-            "count": len(documentos_ordenados)
+        documentos_por_id[documento_id] = {
+            "documents": [chunk[1] for chunk in chunks_ordenados],
+            "metadatas": [chunk[2] for chunk in chunks_ordenados],
+            "ids": [chunk[3] for chunk in chunks_ordenados],
+            "count": len(chunks_ordenados)
         }
+    
+    logger.debug(
+        f"✅ {len(ids_unicos)} documento(s) consultados em uma chamada: "
+        f"{len(resultados.get('ids') or [])} chunks"
+    )
+    
+    return documentos_por_id
+
+
+# ===== TEXTO COMPLETO DO DOCUMENTO =====
+
+def _ler_texto_canonico_ou_none(documento_id: str) -> Optional[str]:
+    """
+    Lê o texto canônico; None se ausente OU ilegível (arquivo corrompido,
+    erro de leitura). Um arquivo ruim não deve derrubar a análise inteira:
+    quem chama reconstrói o texto a partir dos chunks.
+    """
+    try:
+        return servico_texto_canonico.obter_texto_canonico(documento_id)
+    except servico_texto_canonico.ErroDeTextoCanonico as erro:
+        logger.warning(
+            f"⚠️ Texto canônico do documento '{documento_id}' ilegível; "
+            f"reconstruindo a partir dos chunks. Erro: {erro}"
+        )
+        return None
+
+
+def obter_texto_completo_do_documento(
+    collection: ArmazenamentoVetorial,
+    documento_id: str
+) -> str:
+    """
+    Retorna o texto completo de um documento, sem duplicação de overlap.
+    
+    CONTEXTO DE NEGÓCIO:
+    Os orquestradores enviam petições e documentos inteiros para os agentes.
+    Juntar os chunks com "\\n\\n" repetia o overlap de cada fronteira
+    (~10% de tokens desperdiçados em todo prompt).
+    
+    IMPLEMENTAÇÃO:
+    1. Lê o texto canônico gravado na ingestão (servico_texto_canonico):
+       leitura direta por ID, sem consultar o ChromaDB
+    2. Documentos antigos (sem texto canônico) ou com texto canônico
+       ilegível: reconstrói a partir dos chunks ordenados, removendo o
+       overlap entre chunks consecutivos
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy), usado apenas no fallback
+        documento_id: ID único do documento
+    
+    Returns:
+        str: Texto completo ("" se o documento não existir)
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB
+    """
+    texto_canonico = _ler_texto_canonico_ou_none(documento_id)
+    
+    if texto_canonico is not None:
+        logger.debug(f"Texto canônico lido: {documento_id} ({len(texto_canonico)} caracteres)")
+        return texto_canonico
+    
+    logger.debug(f"Documento {documento_id} sem texto canônico; reconstruindo a partir dos chunks")
+    documento = obter_documento_por_id(collection=collection, documento_id=documento_id)
+    return mesclar_textos_de_chunks_contiguos(
+        list(zip(documento["documents"], documento["metadatas"]))
+    )
+
+
+def obter_textos_completos_dos_documentos(
+    collection: ArmazenamentoVetorial,
+    documento_ids: list[str]
+) -> dict[str, str]:
+    """
+    Versão em lote de obter_texto_completo_do_documento().
+    
+    IMPLEMENTAÇÃO:
+    1. Lê o texto canônico de cada documento (arquivos locais, sem ChromaDB)
+    2. Os documentos sem texto canônico (ou com texto canônico ilegível) são
+       reconstruídos a partir dos chunks obtidos em UMA única consulta
+       (obter_documentos_por_ids)
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy), usado apenas no fallback
+        documento_ids: IDs dos documentos
+    
+    Returns:
+        dict[str, str]: {documento_id: texto} ("" para documentos inexistentes)
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB
+    """
+    textos_por_id: dict[str, str] = {}
+    ids_sem_texto_canonico: list[str] = []
+    
+    for documento_id in dict.fromkeys(documento_ids):
+        texto_canonico = _ler_texto_canonico_ou_none(documento_id)
         
-    except Exception as erro:
-        mensagem_erro = (
-            f"Erro ao buscar documento por ID no ChromaDB. "
-            f"documento_id: '{documento_id}'. "
-            f"Erro: {str(erro)}"
+        if texto_canonico is None:
+            ids_sem_texto_canonico.append(documento_id)
+        else:
+            textos_por_id[documento_id] = texto_canonico
+    
+    if ids_sem_texto_canonico:
+        logger.debug(
+            f"{len(ids_sem_texto_canonico)} documento(s) sem texto canônico; "
+            "reconstruindo a partir dos chunks"
         )
-        logger.error(mensagem_erro)
-        raise ErroDeBusca(mensagem_erro) from erro
+        documentos = obter_documentos_por_ids(collection, ids_sem_texto_canonico)
+        for documento_id, documento in documentos.items():
+            textos_por_id[documento_id] = mesclar_textos_de_chunks_contiguos(
+                list(zip(documento["documents"], documento["metadatas"]))
+            )
+    
+    return textos_por_id
 
 
 # ===== LISTAGEM DE DOCUMENTOS =====
 
-def listar_documentos(collection: Collection) -> list[dict[str, Any]]:
+def listar_documentos(collection: ArmazenamentoVetorial) -> list[dict[str, Any]]:
     """
     Lista todos os documentos armazenados no ChromaDB com metadados agregados.
     
@@ -921,22 +2118,22 @@ def listar_documentos(collection: Collection) -> list[dict[str, Any]]:
     - Tipo de documento
     
     IMPLEMENTAÇÃO:
-    1. Busca TODOS os chunks da collection
-    2. Agrupa chunks pelo documento_id
-    3. Para cada documento, compila metadados agregados
-    4. Retorna lista de documentos únicos
+    Lê o catálogo de documentos (uma linha por documento, mantido por
+    armazenar_chunks/deletar_documento), sem varrer os chunks. Para
+    paginação e ordenação, use listar_documentos_paginados().
     
     RETURNS:
-        list[dict]: Lista de documentos, cada um contendo:
+        list[dict]: Lista de documentos (mais recentes primeiro), cada um contendo:
             - documento_id (str): ID único do documento
             - nome_arquivo (str): Nome original do arquivo
             - data_upload (str): Data/hora do upload
             - tipo_documento (str): Extensão do arquivo
             - numero_chunks (int): Quantos chunks o documento tem
-            - tamanho_total_texto (int): Número total de caracteres (aproximado)
+            - tamanho_total_texto_caracteres (int): Número total de caracteres
+            - numero_tokens (int): Tokens do documento (0 se desconhecido)
     
     RAISES:
-        ErroDeBusca: Se erro ao consultar ChromaDB
+        ErroDeBusca: Se erro ao consultar o catálogo ou o ChromaDB
     
     EXEMPLO:
     ```python
@@ -951,33 +2148,100 @@ def listar_documentos(collection: Collection) -> list[dict[str, Any]]:
     
     JUSTIFICATIVA PARA LLMs:
     - Permite implementar interface de listagem de documentos
-    - Agregação no backend (não no frontend)
+    - Agregação feita na escrita (catálogo), não a cada leitura
     - Visão de alto nível do que está armazenado
     """
-    logger.info("📋 Listando todos os documentos armazenados no ChromaDB...")
+    return listar_documentos_paginados(collection)["documentos"]
+
+
+def listar_documentos_paginados(
+    collection: ArmazenamentoVetorial,
+    limite: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ordenar_por: str = "data_upload",
+    ordem: str = "desc"
+) -> dict[str, Any]:
+    """
+    Lista documentos do catálogo com ordenação e paginação por cursor.
+    
+    IMPLEMENTAÇÃO:
+    1. Consulta o catálogo SQLite (custo proporcional à página, não aos chunks)
+    2. Se o catálogo estiver vazio mas a collection tiver chunks (dados
+       anteriores ao catálogo), reconstrói o catálogo UMA vez a partir da
+       collection (reconstruir_catalogo_documentos)
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy), usado apenas na reconstrução
+        limite: Itens por página (None = todos)
+        cursor: proximo_cursor retornado pela página anterior
+        ordenar_por: data_upload, nome_arquivo, numero_chunks ou numero_caracteres
+        ordem: "asc" ou "desc"
+    
+    Returns:
+        dict: {"documentos": list[dict], "proximo_cursor": Optional[str],
+               "total_documentos": int}
+    
+    Raises:
+        ErroDeBusca: Se parâmetros forem inválidos ou a consulta falhar
+    """
+    logger.info("📋 Listando documentos do catálogo...")
     
     try:
-        # Buscar TODOS os chunks da collection
-        # peek() retorna uma amostra, get() retorna tudo
-        numero_total_chunks = collection.count()
-        
-        if numero_total_chunks == 0:
-            logger.info("ℹ️ Collection está vazia. Nenhum documento armazenado.")
-            return []
+        catalogo = obter_catalogo_documentos()
+        if catalogo.contar_documentos() == 0 and collection.count() > 0:
+            reconstruir_catalogo_documentos(collection)
         
-        # Buscar todos os metadados
-        # Não precisamos dos documentos (textos) e embeddings aqui, só metadados
-        todos_os_dados = collection.get(
-            include=["metadatas"]
+        pagina = catalogo.listar_documentos(
+            limite=limite, cursor=cursor, ordenar_por=ordenar_por, ordem=ordem
         )
-        
-        metadados_de_todos_chunks = todos_os_dados["metadatas"]
-        
-        logger.debug(f"✅ Recuperados metadados de {len(metadados_de_todos_chunks)} chunks")
-        
+    except ErroDeCatalogoDocumentos as erro:
+        raise ErroDeBusca(str(erro)) from erro
+    
+    pagina["documentos"] = [
+        {
+            "documento_id": linha["documento_id"],
+            "nome_arquivo": linha["nome_arquivo"],
+            "data_upload": linha["data_upload"],
+            "tipo_documento": linha["tipo_documento"],
+            "numero_chunks": linha["numero_chunks"],
+            "tamanho_total_texto_caracteres": linha["numero_caracteres"],
+            "numero_tokens": linha["numero_tokens"],
+        }
+        for linha in pagina["documentos"]
+    ]
+    
+    logger.info(
+        f"✅ Listagem concluída. {len(pagina['documentos'])} de "
+        f"{pagina['total_documentos']} documentos"
+    )
+    
+    return pagina
+
+
+def reconstruir_catalogo_documentos(collection: ArmazenamentoVetorial) -> int:
+    """
+    Reconstrói o catálogo de documentos a partir dos chunks da collection.
+    
+    CONTEXTO:
+    Migração de bases criadas antes do catálogo (ou recuperação após perda
+    do arquivo SQLite). É a ÚNICA operação que ainda varre todos os chunks.
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+    
+    Returns:
+        int: Número de documentos registrados
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB ou gravar o catálogo
+    """
+    logger.info("🔧 Reconstruindo catálogo de documentos a partir do ChromaDB...")
+    
+    try:
+        todos_os_dados = collection.get(include=["documents", "metadatas"])
     except Exception as erro:
         mensagem_erro = (
-            f"Erro ao listar documentos do ChromaDB. "
+            f"Erro ao ler chunks do ChromaDB para reconstruir o catálogo. "
             f"Collection: {collection.name}. "
             f"Erro: {str(erro)}"
         )
@@ -985,47 +2249,159 @@ def listar_documentos(collection: Collection) -> list[dict[str, Any]]:
         raise ErroDeBusca(mensagem_erro) from erro
     
     # Agrupar chunks por documento_id
-    documentos_agregados = {}
-    
-    for metadados_chunk in metadados_de_todos_chunks:
+    documentos_agregados: dict[str, dict[str, Any]] = {}
+    for texto_chunk, metadados_chunk in zip(todos_os_dados["documents"], todos_os_dados["metadatas"]):
+        metadados_chunk = metadados_chunk or {}
         documento_id = metadados_chunk.get("documento_id")
         
         if not documento_id:
             logger.warning(f"Chunk sem documento_id encontrado: {metadados_chunk}")
             continue
         
-        # Se este documento ainda não foi visto, inicializar
         if documento_id not in documentos_agregados:
             documentos_agregados[documento_id] = {
                 "documento_id": documento_id,
-                "nome_arquivo": metadados_chunk.get("nome_arquivo", "DESCONHECIDO"),
-                "data_upload": metadados_chunk.get("data_upload", "DESCONHECIDA"),
-                "tipo_documento": metadados_chunk.get("tipo_documento", "DESCONHECIDO"),
+                "nome_arquivo": str(metadados_chunk.get("nome_arquivo", "DESCONHECIDO")),
+                "data_upload": str(metadados_chunk.get("data_upload", "DESCONHECIDA")),
+                "tipo_documento": str(metadados_chunk.get("tipo_documento", "DESCONHECIDO")),
                 "numero_chunks": 0,
-                "tamanho_total_texto_caracteres": 0
+                "numero_caracteres": 0,
+                "numero_tokens": 0,
             }
         
-        # Incrementar contador de chunks deste documento
-        documentos_agregados[documento_id]["numero_chunks"] += 1
+        documento = documentos_agregados[documento_id]
+        documento["numero_chunks"] += 1
+        offset_fim = metadados_chunk.get("offset_fim")
+        if isinstance(offset_fim, int):
+            documento["numero_caracteres"] = max(documento["numero_caracteres"], offset_fim)
+        else:
+            documento["numero_caracteres"] += len(texto_chunk or "")
     
-    # Converter dicionário em lista
-    lista_documentos = list(documentos_agregados.values())
+    try:
+        numero_registrados = obter_catalogo_documentos().registrar_documentos(documentos_agregados.values())
+    except ErroDeCatalogoDocumentos as erro:
+        raise ErroDeBusca(str(erro)) from erro
+    
+    logger.info(f"✅ Catálogo reconstruído: {numero_registrados} documentos")
+    return numero_registrados
+
+
+def reconstruir_indice_lexical(collection: ArmazenamentoVetorial) -> int:
+    """
+    Reconstrói o índice lexical (BM25) a partir dos chunks da collection.
+    
+    CONTEXTO:
+    Migração de bases criadas antes do índice lexical (ou recuperação após
+    perda do arquivo SQLite). Chamada automaticamente pela busca híbrida
+    quando o índice está vazio e a collection não.
     
-    # Ordenar por data de upload (mais recente primeiro)
-    lista_documentos.sort(key=lambda doc: doc["data_upload"], reverse=True)
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+    
+    Returns:
+        int: Número de chunks indexados
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB ou gravar o índice
+    """
+    logger.info("🔧 Reconstruindo índice lexical (BM25) a partir do ChromaDB...")
+    
+    try:
+        todos_os_dados = collection.get(include=["documents", "metadatas"])
+    except Exception as erro:
+        mensagem_erro = (
+            f"Erro ao ler chunks do ChromaDB para reconstruir o índice lexical. "
+            f"Collection: {collection.name}. "
+            f"Erro: {str(erro)}"
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro) from erro
+    
+    # Agrupar chunks por documento_id (indexar_chunks substitui por documento)
+    chunks_por_documento: dict[str, tuple[list[str], list[str]]] = {}
+    for id_chunk, texto_chunk, metadados_chunk in zip(
+        todos_os_dados["ids"], todos_os_dados["documents"], todos_os_dados["metadatas"]
+    ):
+        documento_id = (metadados_chunk or {}).get("documento_id")
+        if not documento_id:
+            logger.warning(f"Chunk sem documento_id encontrado: {id_chunk}")
+            continue
+        ids_documento, textos_documento = chunks_por_documento.setdefault(documento_id, ([], []))
+        ids_documento.append(id_chunk)
+        textos_documento.append(texto_chunk or "")
+    
+    indice_lexical = obter_indice_lexical()
+    numero_indexados = 0
+    try:
+        for documento_id, (ids_documento, textos_documento) in chunks_por_documento.items():
+            numero_indexados += indice_lexical.indexar_chunks(documento_id, ids_documento, textos_documento)
+    except ErroDeIndiceLexical as erro:
+        raise ErroDeBusca(f"Erro ao reconstruir índice lexical: {erro}") from erro
     
     logger.info(
-        f"✅ Listagem concluída. Total de documentos únicos: {len(lista_documentos)}, "
-        f"Total de chunks: {numero_total_chunks}"
+        f"✅ Índice lexical reconstruído: {numero_indexados} chunks de "
+        f"{len(chunks_por_documento)} documentos"
     )
+    return numero_indexados
+
+
+def reconstruir_indice_documentos(collection: ArmazenamentoVetorial) -> int:
+    """
+    Reconstrói o índice de documentos (centroides) a partir dos embeddings da collection.
+    
+    CONTEXTO:
+    Migração de bases criadas antes da busca hierárquica (ou recuperação
+    após perda do arquivo SQLite). Chamada automaticamente pela busca
+    hierárquica quando o índice está vazio.
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+    
+    Returns:
+        int: Número de documentos registrados
+    
+    Raises:
+        ErroDeBusca: Se erro ao consultar ChromaDB ou gravar o índice
+    """
+    logger.info("🔧 Reconstruindo índice de documentos (centroides) a partir do ChromaDB...")
+    
+    try:
+        todos_os_dados = collection.get(include=["embeddings", "metadatas"])
+    except Exception as erro:
+        mensagem_erro = (
+            f"Erro ao ler embeddings do ChromaDB para reconstruir o índice de documentos. "
+            f"Collection: {collection.name}. "
+            f"Erro: {str(erro)}"
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeBusca(mensagem_erro) from erro
+    
+    embeddings_por_documento: dict[str, list[Any]] = {}
+    for id_chunk, embedding, metadados_chunk in zip(
+        todos_os_dados["ids"], todos_os_dados["embeddings"], todos_os_dados["metadatas"]
+    ):
+        documento_id = (metadados_chunk or {}).get("documento_id")
+        if not documento_id:
+            logger.warning(f"Chunk sem documento_id encontrado: {id_chunk}")
+            continue
+        embeddings_por_documento.setdefault(documento_id, []).append(embedding)
     
-    return lista_documentos
+    try:
+        numero_registrados = obter_indice_documentos().registrar_documentos({
+            documento_id: calcular_centroide(embeddings)
+            for documento_id, embeddings in embeddings_por_documento.items()
+        })
+    except ErroDeIndiceDocumentos as erro:
+        raise ErroDeBusca(f"Erro ao reconstruir índice de documentos: {erro}") from erro
+    
+    logger.info(f"✅ Índice de documentos reconstruído: {numero_registrados} documentos")
+    return numero_registrados
 
 
 # ===== DELEÇÃO DE DOCUMENTOS =====
 
 def deletar_documento(
-    collection: Collection,
+    collection: ArmazenamentoVetorial,
     documento_id: str
 ) -> bool:
     """
@@ -1039,14 +2415,15 @@ def deletar_documento(
     IMPLEMENTAÇÃO:
     1. Busca todos os chunks que pertencem ao documento_id
     2. Deleta todos os chunks de uma vez
-    3. Valida que a deleção foi bem-sucedida
+    3. Remove o documento do catálogo, dos índices lexical e de documentos e o seu texto canônico
+    4. Valida que a deleção foi bem-sucedida
     
     ATENÇÃO:
     Esta operação é IRREVERSÍVEL. Uma vez deletado, o documento precisa ser
     re-processado e re-vetorizado para ser adicionado novamente.
     
     ARGS:
-        collection: Collection do ChromaDB
+        collection: Armazenamento vetorial (Chroma ou NumPy)
         documento_id: ID único do documento a ser deletado
     
     RETURNS:
@@ -1094,6 +2471,12 @@ def deletar_documento(
         
         if len(ids_chunks) == 0:
             logger.warning(f"⚠️ Documento '{documento_id}' não encontrado no ChromaDB.")
+            # Linha órfã no catálogo, nos índices ou texto canônico órfão
+            # (ex: falha entre as escritas da ingestão) é limpa aqui
+            obter_catalogo_documentos().remover_documento(documento_id)
+            obter_indice_lexical().remover_documento(documento_id)
+            obter_indice_documentos().remover_documento(documento_id)
+            servico_texto_canonico.deletar_texto_canonico(documento_id)
             return False
         
         logger.debug(f"✅ Encontrados {len(ids_chunks)} chunks do documento '{documento_id}'")
@@ -1103,6 +2486,12 @@ def deletar_documento(
             ids=ids_chunks
         )
         
+        # Catálogo, índices lexical e de documentos e texto canônico deixam de fazer sentido sem os chunks
+        obter_catalogo_documentos().remover_documento(documento_id)
+        obter_indice_lexical().remover_documento(documento_id)
+        obter_indice_documentos().remover_documento(documento_id)
+        servico_texto_canonico.deletar_texto_canonico(documento_id)
+        
         logger.info(
             f"✅ Documento '{documento_id}' deletado com sucesso. "
             f"Total de chunks removidos: {len(ids_chunks)}"
@@ -1249,26 +2638,33 @@ def verificar_saude_banco_vetorial() -> dict[str, Any]:
 # ===== FUNÇÃO FACTORY (SINGLETON) =====
 
 # Cache global para singleton
-_instancia_chromadb: Optional[tuple[chromadb.ClientAPI, Collection]] = None
+_instancia_chromadb: Optional[tuple[Optional[chromadb.ClientAPI], ArmazenamentoVetorial]] = None
+_lock_singleton_chromadb = threading.Lock()
 
 
-def obter_servico_banco_vetorial() -> tuple[chromadb.ClientAPI, Collection]:
+def obter_servico_banco_vetorial() -> tuple[Optional[chromadb.ClientAPI], ArmazenamentoVetorial]:
     """
     Factory function (singleton) para obter instância do ChromaDB.
     
     CONTEXTO:
     Esta função garante que apenas UMA conexão com ChromaDB seja criada
-    durante toda a execução da aplicação (padrão Singleton).
+    durante toda a execução da aplicação (padrão Singleton). A instância é
+    criada no startup (main.lifespan) e compartilhada por rotas, ingestão,
+    orquestradores e agentes; nenhum deles deve chamar inicializar_chromadb().
     
     QUANDO USAR:
     Use esta função em vez de chamar inicializar_chromadb() diretamente
     sempre que precisar acessar o ChromaDB em outros módulos.
     
     BENEFÍCIOS:
-    - ✅ Performance: Evita reconexões desnecessárias
+    - ✅ Performance: Evita reconexões (novo PersistentClient, validações,
+      get_or_create_collection) a cada documento ingerido ou agente criado
     - ✅ Memória: Uma única instância em toda aplicação
     - ✅ Simplicidade: Interface unificada
     
+    THREAD-SAFETY:
+    Double-checked locking (ingestão em background roda em outras threads).
+    
     EXEMPLO:
     ```python
     # Em qualquer módulo:
@@ -1281,30 +2677,93 @@ def obter_servico_banco_vetorial() -> tuple[chromadb.ClientAPI, Collection]:
     ```
     
     Returns:
-        tuple[chromadb.ClientAPI, Collection]: Tupla com (cliente, collection)
+        tuple[Optional[chromadb.ClientAPI], ArmazenamentoVetorial]: Tupla com (cliente, collection)
     
     Raises:
-        ErroDeInicializacao: Se falhar ao conectar ao ChromaDB
+        ErroDeInicializacaoChromaDB: Se falhar ao conectar ao ChromaDB
     """
     global _instancia_chromadb
     
     # Se já existe instância, retornar cache
     if _instancia_chromadb is not None:
-        logger.debug("♻️ Reutilizando instância existente do ChromaDB (singleton)")
         return _instancia_chromadb
     
-    # Primeira vez: criar instância
-    logger.info("🔄 Criando nova instância do ChromaDB (singleton)...")
-    try:
-        cliente, collection = inicializar_chromadb()
-        _instancia_chromadb = (cliente, collection)
-        logger.info("✅ Instância do ChromaDB criada e armazenada em cache")
-        return _instancia_chromadb
-    except Exception as erro:
-        logger.error(f"❌ Erro ao criar instância do ChromaDB: {erro}")
-        raise ErroDeInicializacao(
-            f"Falha ao inicializar ChromaDB: {erro}"
-        ) from erro
+    with _lock_singleton_chromadb:
+        if _instancia_chromadb is None:
+            # Primeira vez: criar instância
+            logger.info("🔄 Criando nova instância do ChromaDB (singleton)...")
+            try:
+                _instancia_chromadb = inicializar_chromadb()
+            except Exception as erro:
+                logger.error(f"❌ Erro ao criar instância do ChromaDB: {erro}")
+                if isinstance(erro, ErroDeInicializacaoChromaDB):
+                    raise
+                raise ErroDeInicializacaoChromaDB(
+                    f"Falha ao inicializar ChromaDB: {erro}"
+                ) from erro
+            logger.info("✅ Instância do ChromaDB criada e armazenada em cache")
+    
+    return _instancia_chromadb
+
+
+def aquecer_banco_vetorial(collection: ArmazenamentoVetorial) -> dict[str, Any]:
+    """
+    Pré-carrega o índice vetorial em memória (warmup do startup).
+    
+    CONTEXTO:
+    O ChromaDB carrega o índice HNSW do disco na PRIMEIRA consulta; sem
+    warmup, essa latência cai na primeira requisição do usuário. Uma busca
+    de 1 resultado com o embedding de um chunk existente força o carregamento
+    sem chamar a API OpenAI.
+    
+    Args:
+        collection: Armazenamento vetorial (Chroma ou NumPy)
+    
+    Returns:
+        dict: {"numero_chunks": int, "tempo_segundos": float, "indice_carregado": bool}
+    """
+    inicio = time.perf_counter()
+    numero_chunks = collection.count()
+    indice_carregado = False
+    
+    if numero_chunks > 0:
+        try:
+            amostra = collection.peek(limit=1)
+            embeddings_amostra = amostra.get("embeddings")
+            if embeddings_amostra is not None and len(embeddings_amostra) > 0:
+                collection.query(
+                    query_embeddings=[list(embeddings_amostra[0])],
+                    n_results=1,
+                    include=[]
+                )
+                indice_carregado = True
+        except Exception as erro:
+            # Warmup é otimização: falha não impede a aplicação de subir
+            logger.warning(f"⚠️ Warmup do índice vetorial falhou: {erro}")
+    
+    tempo_segundos = time.perf_counter() - inicio
+    logger.info(
+        f"🔥 Warmup do ChromaDB: {numero_chunks} chunks, índice "
+        f"{'carregado' if indice_carregado else 'não carregado'} em {tempo_segundos:.2f}s"
+    )
+    return {
+        "numero_chunks": numero_chunks,
+        "tempo_segundos": tempo_segundos,
+        "indice_carregado": indice_carregado,
+    }
+
+
+def encerrar_servico_banco_vetorial() -> None:
+    """
+    Descarta a instância singleton do ChromaDB (shutdown da aplicação).
+    
+    O PersistentClient grava os dados a cada escrita; aqui apenas liberamos
+    a referência (uma nova chamada a obter_servico_banco_vetorial reconecta).
+    """
+    global _instancia_chromadb
+    with _lock_singleton_chromadb:
+        _instancia_chromadb = None
+    logger.info("🛑 Instância do ChromaDB liberada")
 
 
 # ===== BLOCO DE TESTES (Desenvolvimento) =====
@@ -0,0 +1,339 @@
+"""
+Serviço de Catálogo de Documentos (SQLite) - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+A tela "Meus Documentos" lista os documentos disponíveis para os agentes.
+Antes, cada listagem lia os metadados de TODOS os chunks do ChromaDB e
+agregava por documento_id em Python: O(total de chunks) por requisição,
+lento e pesado em memória a partir de algumas centenas de milhares de chunks.
+
+Este módulo mantém um catálogo com UMA linha por documento, com os campos
+já agregados (nome, data de upload, tipo, número de chunks, caracteres e
+tokens). Ele é atualizado por servico_banco_vetorial.armazenar_chunks() e
+deletar_documento(), junto com a escrita no ChromaDB.
+
+IMPLEMENTAÇÃO:
+- SQLite (biblioteca padrão), arquivo em CAMINHO_CATALOGO_DOCUMENTOS
+- Modo WAL: leituras não bloqueiam a escrita da ingestão em background
+- Paginação por cursor (keyset): cada página é uma consulta por índice,
+  sem OFFSET (o custo não cresce com o número da página)
+- O cursor é opaco para o cliente (base64 de [valor_ordenacao, documento_id])
+
+PADRÃO DE USO:
+```python
+from src.servicos.servico_catalogo_documentos import obter_catalogo_documentos
+
+catalogo = obter_catalogo_documentos()
+pagina = catalogo.listar_documentos(limite=20, ordenar_por="nome_arquivo", ordem="asc")
+proxima = catalogo.listar_documentos(limite=20, cursor=pagina["proximo_cursor"],
+                                     ordenar_por="nome_arquivo", ordem="asc")
+```
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== EXCEÇÕES CUSTOMIZADAS =====
+
+class ErroDeCatalogoDocumentos(Exception):
+    """
+    Erro ao ler ou atualizar o catálogo de documentos.
+
+    CENÁRIOS COMUNS:
+    - Arquivo SQLite sem permissão de escrita ou corrompido
+    - Cursor de paginação inválido (adulterado ou de outra ordenação)
+    - Campo de ordenação não suportado
+    """
+    pass
+
+
+# ===== CONSTANTES =====
+
+# Campos pelos quais a listagem pode ser ordenada (todos indexados)
+CAMPOS_ORDENACAO_CATALOGO = ("data_upload", "nome_arquivo", "numero_chunks", "numero_caracteres")
+
+ESQUEMA_CATALOGO_DOCUMENTOS = """
+CREATE TABLE IF NOT EXISTS documentos (
+    documento_id      TEXT PRIMARY KEY,
+    nome_arquivo      TEXT NOT NULL,
+    data_upload       TEXT NOT NULL,
+    tipo_documento    TEXT NOT NULL,
+    numero_chunks     INTEGER NOT NULL,
+    numero_caracteres INTEGER NOT NULL,
+    numero_tokens     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documentos_data_upload ON documentos (data_upload, documento_id);
+CREATE INDEX IF NOT EXISTS idx_documentos_nome_arquivo ON documentos (nome_arquivo, documento_id);
+CREATE INDEX IF NOT EXISTS idx_documentos_numero_chunks ON documentos (numero_chunks, documento_id);
+CREATE INDEX IF NOT EXISTS idx_documentos_numero_caracteres ON documentos (numero_caracteres, documento_id);
+"""
+
+COLUNAS_CATALOGO = (
+    "documento_id", "nome_arquivo", "data_upload", "tipo_documento",
+    "numero_chunks", "numero_caracteres", "numero_tokens",
+)
+
+
+# ===== FUNÇÕES AUXILIARES =====
+
+def codificar_cursor(valor_ordenacao: Any, documento_id: str) -> str:
+    """
+    Gera o cursor opaco que aponta para o último item de uma página.
+    """
+    bruto = json.dumps([valor_ordenacao, documento_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(bruto).decode("ascii")
+
+
+def decodificar_cursor(cursor: str) -> tuple:
+    """
+    Decodifica um cursor gerado por codificar_cursor().
+
+    Raises:
+        ErroDeCatalogoDocumentos: Se o cursor for inválido
+    """
+    try:
+        valor_ordenacao, documento_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as erro:
+        raise ErroDeCatalogoDocumentos(f"Cursor de paginação inválido: '{cursor}'") from erro
+    return valor_ordenacao, documento_id
+
+
+# ===== CLASSE DO CATÁLOGO =====
+
+class CatalogoDocumentos:
+    """
+    Catálogo de documentos (uma linha por documento) em SQLite.
+
+    THREAD-SAFETY:
+    Uma conexão por instância (check_same_thread=False) protegida por
+    threading.Lock; cada escrita é uma transação (with self._conexao).
+    """
+
+    def __init__(self, caminho_banco: str):
+        """
+        Abre (ou cria) o catálogo.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite (":memory:" para testes)
+
+        Raises:
+            ErroDeCatalogoDocumentos: Se o banco não puder ser aberto
+        """
+        self.caminho_banco = caminho_banco
+        self._lock = threading.Lock()
+
+        try:
+            if caminho_banco != ":memory:":
+                Path(caminho_banco).parent.mkdir(parents=True, exist_ok=True)
+            self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+            self._conexao.row_factory = sqlite3.Row
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(ESQUEMA_CATALOGO_DOCUMENTOS)
+        except (sqlite3.Error, OSError) as erro:
+            mensagem_erro = f"Falha ao abrir catálogo de documentos em '{caminho_banco}': {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCatalogoDocumentos(mensagem_erro) from erro
+
+    def registrar_documento(self, documento: Dict[str, Any]) -> None:
+        """
+        Insere ou substitui a linha de um documento (reprocessamento).
+
+        Args:
+            documento: Dicionário com todas as COLUNAS_CATALOGO
+
+        Raises:
+            ErroDeCatalogoDocumentos: Se a escrita falhar
+        """
+        valores = [documento[coluna] for coluna in COLUNAS_CATALOGO]
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute(
+                    f"INSERT OR REPLACE INTO documentos ({', '.join(COLUNAS_CATALOGO)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUNAS_CATALOGO)})",
+                    valores
+                )
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao registrar documento '{documento['documento_id']}' no catálogo: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCatalogoDocumentos(mensagem_erro) from erro
+
+    def registrar_documentos(self, documentos: Iterable[Dict[str, Any]]) -> int:
+        """
+        Registra vários documentos em uma única transação (reconstrução).
+
+        Returns:
+            int: Número de documentos registrados
+        """
+        linhas = [[documento[coluna] for coluna in COLUNAS_CATALOGO] for documento in documentos]
+        try:
+            with self._lock, self._conexao:
+                self._conexao.executemany(
+                    f"INSERT OR REPLACE INTO documentos ({', '.join(COLUNAS_CATALOGO)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUNAS_CATALOGO)})",
+                    linhas
+                )
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao registrar documentos no catálogo: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCatalogoDocumentos(mensagem_erro) from erro
+        return len(linhas)
+
+    def remover_documento(self, documento_id: str) -> bool:
+        """
+        Remove a linha de um documento.
+
+        Returns:
+            bool: True se o documento estava no catálogo
+
+        Raises:
+            ErroDeCatalogoDocumentos: Se a escrita falhar
+        """
+        try:
+            with self._lock, self._conexao:
+                cursor = self._conexao.execute(
+                    "DELETE FROM documentos WHERE documento_id = ?", (documento_id,)
+                )
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao remover documento '{documento_id}' do catálogo: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCatalogoDocumentos(mensagem_erro) from erro
+        return cursor.rowcount > 0
+
+    def obter_documento(self, documento_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a linha de um documento (ou None).
+        """
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT * FROM documentos WHERE documento_id = ?", (documento_id,)
+            ).fetchone()
+        return dict(linha) if linha else None
+
+    def contar_documentos(self) -> int:
+        """
+        Retorna o número de documentos no catálogo.
+        """
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM documentos").fetchone()[0]
+
+    def listar_documentos(
+        self,
+        limite: Optional[int] = None,
+        cursor: Optional[str] = None,
+        ordenar_por: str = "data_upload",
+        ordem: str = "desc"
+    ) -> Dict[str, Any]:
+        """
+        Lista documentos com ordenação e paginação por cursor.
+
+        IMPLEMENTAÇÃO:
+        Paginação keyset: a próxima página começa depois de
+        (valor_ordenacao, documento_id) do último item, usando o índice
+        composto do campo de ordenação. documento_id desempata valores iguais.
+
+        Args:
+            limite: Itens por página (None = todos os restantes)
+            cursor: proximo_cursor da página anterior (None = primeira página)
+            ordenar_por: Um de CAMPOS_ORDENACAO_CATALOGO
+            ordem: "asc" ou "desc"
+
+        Returns:
+            dict: {"documentos": list[dict], "proximo_cursor": Optional[str],
+                   "total_documentos": int}
+
+        Raises:
+            ErroDeCatalogoDocumentos: Se ordenação, ordem ou cursor forem inválidos
+        """
+        if ordenar_por not in CAMPOS_ORDENACAO_CATALOGO:
+            raise ErroDeCatalogoDocumentos(
+                f"Campo de ordenação inválido: '{ordenar_por}'. "
+                f"Válidos: {', '.join(CAMPOS_ORDENACAO_CATALOGO)}"
+            )
+        if ordem not in ("asc", "desc"):
+            raise ErroDeCatalogoDocumentos(f"Ordem inválida: '{ordem}'. Use 'asc' ou 'desc'")
+        if limite is not None and limite <= 0:
+            raise ErroDeCatalogoDocumentos(f"limite deve ser maior que 0. Recebido: {limite}")
+
+        comparador = "<" if ordem == "desc" else ">"
+        direcao = ordem.upper()
+        clausula_where = ""
+        parametros: List[Any] = []
+
+        if cursor:
+            valor_ordenacao, documento_id = decodificar_cursor(cursor)
+            clausula_where = (
+                f"WHERE {ordenar_por} {comparador} ? "
+                f"OR ({ordenar_por} = ? AND documento_id {comparador} ?)"
+            )
+            parametros.extend([valor_ordenacao, valor_ordenacao, documento_id])
+
+        # Busca um item a mais para saber se existe próxima página
+        clausula_limite = ""
+        if limite is not None:
+            clausula_limite = "LIMIT ?"
+            parametros.append(limite + 1)
+
+        consulta = (
+            f"SELECT * FROM documentos {clausula_where} "
+            f"ORDER BY {ordenar_por} {direcao}, documento_id {direcao} {clausula_limite}"
+        )
+
+        with self._lock:
+            linhas = [dict(linha) for linha in self._conexao.execute(consulta, parametros)]
+            total_documentos = self._conexao.execute("SELECT COUNT(*) FROM documentos").fetchone()[0]
+
+        proximo_cursor = None
+        if limite is not None and len(linhas) > limite:
+            linhas = linhas[:limite]
+            ultimo = linhas[-1]
+            proximo_cursor = codificar_cursor(ultimo[ordenar_por], ultimo["documento_id"])
+
+        return {
+            "documentos": linhas,
+            "proximo_cursor": proximo_cursor,
+            "total_documentos": total_documentos,
+        }
+
+
+# ===== INSTÂNCIA SINGLETON =====
+
+# DESIGN: Singleton pattern (uma conexão SQLite compartilhada pelo processo)
+_instancia_catalogo: Optional[CatalogoDocumentos] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_catalogo_documentos() -> CatalogoDocumentos:
+    """
+    Obtém a instância singleton do catálogo (caminho em CAMINHO_CATALOGO_DOCUMENTOS).
+
+    THREAD-SAFETY:
+    Double-checked locking, como nos gerenciadores de estado.
+    """
+    global _instancia_catalogo
+
+    if _instancia_catalogo is None:
+        with _lock_singleton:
+            if _instancia_catalogo is None:
+                configuracoes = obter_configuracoes()
+                # Backend NumPy: os vetores não persistem, então o catálogo também não
+                caminho_banco = (
+                    ":memory:" if configuracoes.usa_armazenamento_em_memoria()
+                    else configuracoes.CAMINHO_CATALOGO_DOCUMENTOS
+                )
+                logger.info(f"🔧 Abrindo catálogo de documentos: {caminho_banco}")
+                _instancia_catalogo = CatalogoDocumentos(caminho_banco)
+
+    return _instancia_catalogo
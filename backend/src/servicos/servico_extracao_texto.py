@@ -12,20 +12,35 @@ IMPORTANTE: Este módulo NÃO faz OCR (processamento de PDFs escaneados).
 O OCR será implementado em um serviço separado (TAREFA-005).
 
 RESPONSABILIDADES:
-1. Extrair texto de PDFs que contêm texto selecionável (usando PyPDF2)
-2. Extrair texto de arquivos DOCX (usando python-docx)
+1. Extrair texto de PDFs que contêm texto selecionável (backend configurável)
+2. Extrair texto de arquivos DOCX (leitura em streaming do XML OOXML)
 3. Detectar se um PDF é escaneado (imagem) ou contém texto
 4. Fornecer metadados sobre a extração (número de páginas, confiança, etc.)
 
+BACKENDS DE EXTRAÇÃO DE PDF:
+O motor usado para ler o texto do PDF é escolhido pela configuração
+BACKEND_EXTRACAO_PDF (ver configuracoes.py):
+- "pypdf2": PyPDF2 (padrão, Python puro, mais lento)
+- "pypdfium2": PDFium via pypdfium2 (nativo, muito mais rápido)
+- "pdfminer": pdfminer.six (Python puro, melhor preservação de layout)
+O script benchmarks/benchmark_backends_extracao_pdf.py compara os backends
+sobre um corpus de petições (páginas/segundo e equivalência de texto).
+
 DEPENDÊNCIAS:
 - PyPDF2: Para leitura de PDFs com texto
-- python-docx: Para leitura de arquivos DOCX
+- pypdfium2 / pdfminer.six: Backends alternativos (opcionais)
+- zipfile + xml.etree (biblioteca padrão): Para leitura de arquivos DOCX
 """
 
 import os
 import logging
+import zipfile
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import IO, Dict, Any, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from src.configuracao.configuracoes import obter_configuracoes
 
 # Bibliotecas de terceiros para processamento de documentos
 try:
@@ -34,9 +49,17 @@ except ImportError:
     PdfReader = None  # Será validado nas funções que usam
 
 try:
-    from docx import Document as DocxDocument
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None  # Backend opcional, validado apenas se selecionado
+
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer as PdfminerLTTextContainer
 except ImportError:
-    DocxDocument = None  # Será validado nas funções que usam
+    pdfminer_extract_pages = None  # Backend opcional, validado apenas se selecionado
+    PdfminerLTTextContainer = None
+
 
 
 # ==========================================
@@ -158,18 +181,267 @@ def validar_dependencia_instalada(biblioteca: Any, nome_biblioteca: str) -> None
         raise DependenciaNaoInstaladaError(mensagem_erro)
 
 
+# ==========================================
+# BACKENDS DE EXTRAÇÃO DE TEXTO DE PDF
+# ==========================================
+# CONTEXTO:
+# O extract_text() do PyPDF2 é implementado em Python puro e é um dos
+# extratores mais lentos disponíveis. Para permitir trocar de motor com base
+# em evidência (ver benchmark), a leitura das páginas passa por uma interface
+# comum. O restante do serviço (detecção de escaneado, montagem do resultado,
+# páginas vazias) é idêntico para todos os backends.
+
+class BackendExtracaoPDF(ABC):
+    """
+    Interface comum para motores de extração de texto de PDFs.
+    
+    CONTEXTO:
+    Cada backend sabe apenas abrir o PDF e devolver o texto de cada página.
+    Toda a lógica de negócio (detecção de PDF escaneado, páginas vazias,
+    montagem do resultado) permanece nas funções do serviço.
+    
+    ATRIBUTOS:
+        nome: Chave usada na configuração BACKEND_EXTRACAO_PDF
+        nome_exibicao: Valor registrado em "metodo_extracao" no resultado
+        nome_pacote_pip: Pacote a instalar caso a biblioteca esteja faltando
+    """
+    
+    nome: str = ""
+    nome_exibicao: str = ""
+    nome_pacote_pip: str = ""
+    
+    @abstractmethod
+    def obter_biblioteca(self) -> Any:
+        """
+        Retorna o objeto da biblioteca usada (ou None se não instalada).
+        
+        Usado por validar_dependencia_instalada() para falhar com mensagem clara.
+        """
+        pass
+    
+    @abstractmethod
+    def extrair_textos_das_paginas(
+        self,
+        caminho_arquivo_pdf: str,
+        limite_paginas: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        """
+        Extrai o texto de cada página do PDF.
+        
+        Args:
+            caminho_arquivo_pdf: Caminho absoluto para o arquivo PDF
+            limite_paginas: Se informado, extrai apenas as N primeiras páginas
+        
+        Returns:
+            Tupla (textos_das_paginas, numero_total_de_paginas).
+            textos_das_paginas tem uma string por página extraída
+            (string vazia quando a página não tem texto).
+        """
+        pass
+
+
+class BackendExtracaoPDFPyPDF2(BackendExtracaoPDF):
+    """
+    Backend padrão baseado em PyPDF2 (Python puro).
+    
+    Mantido como padrão por compatibilidade: é o comportamento histórico
+    do serviço e não exige dependências nativas.
+    """
+    
+    nome = "pypdf2"
+    nome_exibicao = "PyPDF2"
+    nome_pacote_pip = "PyPDF2"
+    
+    def obter_biblioteca(self) -> Any:
+        return PdfReader
+    
+    def extrair_textos_das_paginas(
+        self,
+        caminho_arquivo_pdf: str,
+        limite_paginas: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        leitor_pdf = PdfReader(caminho_arquivo_pdf)
+        numero_total_de_paginas = len(leitor_pdf.pages)
+        
+        numero_paginas_para_extrair = numero_total_de_paginas
+        if limite_paginas is not None:
+            numero_paginas_para_extrair = min(limite_paginas, numero_total_de_paginas)
+        
+        textos_das_paginas: List[str] = []
+        for indice_pagina in range(numero_paginas_para_extrair):
+            texto_da_pagina = leitor_pdf.pages[indice_pagina].extract_text()
+            textos_das_paginas.append(texto_da_pagina or "")
+        
+        return textos_das_paginas, numero_total_de_paginas
+
+
+class BackendExtracaoPDFPyPDFium2(BackendExtracaoPDF):
+    """
+    Backend baseado em PDFium (biblioteca nativa do Chromium) via pypdfium2.
+    
+    CONTEXTO:
+    A extração é feita em código nativo, tipicamente uma ordem de grandeza
+    mais rápida que o PyPDF2 em petições longas. Instalável localmente via
+    pip (wheels incluem o binário do PDFium).
+    """
+    
+    nome = "pypdfium2"
+    nome_exibicao = "pypdfium2"
+    nome_pacote_pip = "pypdfium2"
+    
+    def obter_biblioteca(self) -> Any:
+        return pypdfium2
+    
+    def extrair_textos_das_paginas(
+        self,
+        caminho_arquivo_pdf: str,
+        limite_paginas: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        documento_pdf = pypdfium2.PdfDocument(caminho_arquivo_pdf)
+        try:
+            numero_total_de_paginas = len(documento_pdf)
+            
+            numero_paginas_para_extrair = numero_total_de_paginas
+            if limite_paginas is not None:
+                numero_paginas_para_extrair = min(limite_paginas, numero_total_de_paginas)
+            
+            textos_das_paginas: List[str] = []
+            for indice_pagina in range(numero_paginas_para_extrair):
+                pagina = documento_pdf[indice_pagina]
+                pagina_texto = pagina.get_textpage()
+                try:
+                    texto_da_pagina = pagina_texto.get_text_range()
+                finally:
+                    pagina_texto.close()
+                    pagina.close()
+                
+                # PDFium usa quebras de linha no estilo Windows (CRLF)
+                texto_da_pagina = texto_da_pagina.replace("\r\n", "\n").replace("\r", "\n")
+                textos_das_paginas.append(texto_da_pagina)
+            
+            return textos_das_paginas, numero_total_de_paginas
+        finally:
+            documento_pdf.close()
+
+
+class BackendExtracaoPDFPdfminer(BackendExtracaoPDF):
+    """
+    Backend baseado em pdfminer.six.
+    
+    CONTEXTO:
+    Também é Python puro, mas faz análise de layout (agrupa caracteres em
+    linhas e blocos), o que costuma produzir ordem de leitura melhor em
+    documentos com colunas. Útil como referência de qualidade no benchmark.
+    """
+    
+    nome = "pdfminer"
+    nome_exibicao = "pdfminer.six"
+    nome_pacote_pip = "pdfminer.six"
+    
+    def obter_biblioteca(self) -> Any:
+        return pdfminer_extract_pages
+    
+    def extrair_textos_das_paginas(
+        self,
+        caminho_arquivo_pdf: str,
+        limite_paginas: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        textos_das_paginas: List[str] = []
+        
+        # extract_pages é um gerador: percorrer uma única vez, página a página
+        for layout_pagina in pdfminer_extract_pages(caminho_arquivo_pdf, maxpages=limite_paginas or 0):
+            partes_texto = [
+                elemento.get_text()
+                for elemento in layout_pagina
+                if isinstance(elemento, PdfminerLTTextContainer)
+            ]
+            textos_das_paginas.append("".join(partes_texto))
+        
+        # pdfminer não expõe o total de páginas sem percorrer o documento.
+        # Quando há limite, contamos as páginas com PDFParser (leitura leve).
+        if limite_paginas is None:
+            numero_total_de_paginas = len(textos_das_paginas)
+        else:
+            numero_total_de_paginas = _contar_paginas_pdfminer(caminho_arquivo_pdf)
+        
+        return textos_das_paginas, numero_total_de_paginas
+
+
+def _contar_paginas_pdfminer(caminho_arquivo_pdf: str) -> int:
+    """
+    Conta as páginas de um PDF usando apenas o parser do pdfminer (sem layout).
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    
+    with open(caminho_arquivo_pdf, "rb") as arquivo_pdf:
+        documento_pdf = PDFDocument(PDFParser(arquivo_pdf))
+        return sum(1 for _ in PDFPage.create_pages(documento_pdf))
+
+
+# Registro de backends disponíveis (chave = valor aceito em BACKEND_EXTRACAO_PDF)
+BACKENDS_EXTRACAO_PDF: Dict[str, BackendExtracaoPDF] = {
+    backend.nome: backend
+    for backend in (
+        BackendExtracaoPDFPyPDF2(),
+        BackendExtracaoPDFPyPDFium2(),
+        BackendExtracaoPDFPdfminer(),
+    )
+}
+
+
+def obter_backend_extracao_pdf(nome_backend: Optional[str] = None) -> BackendExtracaoPDF:
+    """
+    Retorna o backend de extração de PDF solicitado (ou o configurado no .env).
+    
+    CONTEXTO:
+    Chamadores normais não passam nome_backend: o motor vem da configuração
+    BACKEND_EXTRACAO_PDF. O benchmark passa o nome explicitamente para comparar
+    todos os backends no mesmo corpus.
+    
+    Args:
+        nome_backend: "pypdf2", "pypdfium2" ou "pdfminer" (None = configuração)
+    
+    Returns:
+        BackendExtracaoPDF pronto para uso (dependência validada)
+    
+    Raises:
+        ErroDeExtracaoDeTexto: Se o nome do backend for desconhecido
+        DependenciaNaoInstaladaError: Se a biblioteca do backend não estiver instalada
+    """
+    if nome_backend is None:
+        nome_backend = obter_configuracoes().BACKEND_EXTRACAO_PDF
+    
+    backend = BACKENDS_EXTRACAO_PDF.get(nome_backend.strip().lower())
+    if backend is None:
+        mensagem_erro = (
+            f"Backend de extração de PDF desconhecido: '{nome_backend}'. "
+            f"Backends disponíveis: {', '.join(BACKENDS_EXTRACAO_PDF.keys())}"
+        )
+        logger.error(mensagem_erro)
+        raise ErroDeExtracaoDeTexto(mensagem_erro)
+    
+    validar_dependencia_instalada(backend.obter_biblioteca(), backend.nome_pacote_pip)
+    
+    return backend
+
+
 # ==========================================
 # FUNÇÃO: DETECTAR SE PDF É ESCANEADO
 # ==========================================
 
-def detectar_se_pdf_e_escaneado(caminho_arquivo_pdf: str) -> bool:
+def detectar_se_pdf_e_escaneado(
+    caminho_arquivo_pdf: str,
+    nome_backend_pdf: Optional[str] = None
+) -> bool:
     """
     Detecta se um PDF contém texto extraível ou se é escaneado (apenas imagens).
     
     CONTEXTO DE NEGÓCIO:
     Documentos jurídicos frequentemente são processos físicos digitalizados (escaneados),
     resultando em PDFs que são basicamente imagens. Estes não podem ser processados
-    com PyPDF2 e precisam passar por OCR.
+    por extração de texto e precisam passar por OCR.
     
     IMPLEMENTAÇÃO:
     A detecção é feita tentando extrair texto das primeiras páginas:
@@ -183,48 +455,38 @@ def detectar_se_pdf_e_escaneado(caminho_arquivo_pdf: str) -> bool:
     
     Args:
         caminho_arquivo_pdf: Caminho absoluto para o arquivo PDF
+        nome_backend_pdf: Backend de extração (None = BACKEND_EXTRACAO_PDF do .env)
         
     Returns:
         True se o PDF é escaneado (imagem), False se contém texto extraível
         
     Raises:
         ArquivoNaoEncontradoError: Se o arquivo não existir
-        DependenciaNaoInstaladaError: Se PyPDF2 não estiver instalado
+        DependenciaNaoInstaladaError: Se a biblioteca do backend não estiver instalada
     """
     # Validações preliminares
     validar_existencia_arquivo(caminho_arquivo_pdf)
-    validar_dependencia_instalada(PdfReader, "PyPDF2")
+    backend_pdf = obter_backend_extracao_pdf(nome_backend_pdf)
     
-    logger.info(f"Detectando tipo de PDF: {caminho_arquivo_pdf}")
+    logger.info(f"Detectando tipo de PDF: {caminho_arquivo_pdf} (backend: {backend_pdf.nome})")
     
     try:
-        # Abrir o PDF para leitura
-        leitor_pdf = PdfReader(caminho_arquivo_pdf)
-        numero_total_de_paginas = len(leitor_pdf.pages)
-        
-        logger.debug(f"PDF possui {numero_total_de_paginas} página(s)")
-        
         # Limite de páginas a analisar (evitar processar PDFs gigantes inteiros)
         # Analisamos até as primeiras 3 páginas ou total de páginas (o que for menor)
-        numero_paginas_para_analisar = min(3, numero_total_de_paginas)
+        textos_das_paginas, numero_total_de_paginas = backend_pdf.extrair_textos_das_paginas(
+            caminho_arquivo_pdf,
+            limite_paginas=3
+        )
         
-        # Acumulador de texto extraído
-        texto_total_extraido = ""
+        logger.debug(f"PDF possui {numero_total_de_paginas} página(s)")
         
-        # Iterar pelas primeiras páginas
-        for indice_pagina in range(numero_paginas_para_analisar):
-            pagina_atual = leitor_pdf.pages[indice_pagina]
-            texto_da_pagina = pagina_atual.extract_text()
-            
-            if texto_da_pagina:
-                texto_total_extraido += texto_da_pagina
-            
+        for indice_pagina, texto_da_pagina in enumerate(textos_das_paginas):
             logger.debug(
                 f"Página {indice_pagina + 1}: {len(texto_da_pagina)} caracteres extraídos"
             )
         
         # Limpar texto extraído (remover espaços em branco excessivos)
-        texto_limpo = texto_total_extraido.strip()
+        texto_limpo = "".join(textos_das_paginas).strip()
         
         # HEURÍSTICA DE DETECÇÃO:
         # Se conseguimos extrair pelo menos 50 caracteres de texto válido,
@@ -243,7 +505,7 @@ def detectar_se_pdf_e_escaneado(caminho_arquivo_pdf: str) -> bool:
             return True  # É escaneado
             
     except Exception as erro:
-        # Captura qualquer erro do PyPDF2 e loga
+        # Captura qualquer erro do backend de PDF e loga
         mensagem_erro = f"Erro ao tentar detectar tipo de PDF: {str(erro)}"
         logger.error(mensagem_erro)
         raise ErroDeExtracaoDeTexto(mensagem_erro)
@@ -253,7 +515,10 @@ def detectar_se_pdf_e_escaneado(caminho_arquivo_pdf: str) -> bool:
 # FUNÇÃO: EXTRAIR TEXTO DE PDF
 # ==========================================
 
-def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
+def extrair_texto_de_pdf_texto(
+    caminho_arquivo_pdf: str,
+    nome_backend_pdf: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Extrai texto de um PDF que contém texto selecionável (não escaneado).
     
@@ -263,9 +528,9 @@ def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
     Este é o caso mais simples e eficiente de processamento.
     
     IMPLEMENTAÇÃO:
-    1. Valida que o arquivo existe e PyPDF2 está disponível
+    1. Valida que o arquivo existe e a biblioteca do backend está disponível
     2. Detecta se o PDF é escaneado (e falha se for)
-    3. Itera por todas as páginas extraindo texto
+    3. Itera por todas as páginas extraindo texto (via backend configurado)
     4. Retorna texto completo + metadados
     
     IMPORTANTE:
@@ -274,33 +539,38 @@ def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
     
     Args:
         caminho_arquivo_pdf: Caminho absoluto para o arquivo PDF
+        nome_backend_pdf: Backend de extração (None = BACKEND_EXTRACAO_PDF do .env)
         
     Returns:
         dict contendo:
         {
             "texto_extraido": str,              # Texto completo de todas as páginas
             "numero_de_paginas": int,           # Total de páginas processadas
-            "metodo_extracao": str,             # "PyPDF2"
+            "metodo_extracao": str,             # "PyPDF2", "pypdfium2" ou "pdfminer.six"
             "caminho_arquivo_original": str,    # Caminho do arquivo processado
             "tipo_documento": str,              # "pdf_texto"
-            "paginas_vazias": list[int]         # Índices de páginas sem texto (0-indexed)
+            "paginas_vazias": list[int],        # Índices de páginas sem texto (0-indexed)
+            "textos_por_pagina": list[str]      # Texto de cada página ("" se vazia)
         }
         
     Raises:
         ArquivoNaoEncontradoError: Se o arquivo não existir
-        DependenciaNaoInstaladaError: Se PyPDF2 não estiver instalado
+        DependenciaNaoInstaladaError: Se a biblioteca do backend não estiver instalada
         PDFEscaneadoError: Se o PDF for detectado como escaneado
         ErroDeExtracaoDeTexto: Para outros erros durante processamento
     """
     # Validações preliminares
     validar_existencia_arquivo(caminho_arquivo_pdf)
-    validar_dependencia_instalada(PdfReader, "PyPDF2")
+    backend_pdf = obter_backend_extracao_pdf(nome_backend_pdf)
     
-    logger.info(f"Iniciando extração de texto do PDF: {caminho_arquivo_pdf}")
+    logger.info(
+        f"Iniciando extração de texto do PDF: {caminho_arquivo_pdf} "
+        f"(backend: {backend_pdf.nome})"
+    )
     
     # Verificar se o PDF é escaneado
-    # Se for, não podemos processar com PyPDF2 - precisa OCR
-    if detectar_se_pdf_e_escaneado(caminho_arquivo_pdf):
+    # Se for, não podemos processar com extração de texto - precisa OCR
+    if detectar_se_pdf_e_escaneado(caminho_arquivo_pdf, backend_pdf.nome):
         mensagem_erro = (
             f"O PDF '{caminho_arquivo_pdf}' foi detectado como escaneado (imagem). "
             f"Use o serviço de OCR para processar este documento."
@@ -309,24 +579,23 @@ def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
         raise PDFEscaneadoError(mensagem_erro)
     
     try:
-        # Abrir o PDF
-        leitor_pdf = PdfReader(caminho_arquivo_pdf)
-        numero_total_de_paginas = len(leitor_pdf.pages)
+        # Extrair texto de todas as páginas com o backend selecionado
+        textos_das_paginas, numero_total_de_paginas = backend_pdf.extrair_textos_das_paginas(
+            caminho_arquivo_pdf
+        )
         
         logger.info(f"Processando PDF com {numero_total_de_paginas} página(s)")
         
         # Acumuladores
-        texto_completo = ""
+        # Partes são acumuladas em lista e unidas no final (evita concatenação quadrática)
+        partes_texto: List[str] = []
         lista_paginas_vazias: List[int] = []
         
         # Iterar por todas as páginas
-        for indice_pagina in range(numero_total_de_paginas):
-            pagina_atual = leitor_pdf.pages[indice_pagina]
-            texto_da_pagina = pagina_atual.extract_text()
-            
+        for indice_pagina, texto_da_pagina in enumerate(textos_das_paginas):
             # Verificar se a página tem texto
             if texto_da_pagina and texto_da_pagina.strip():
-                texto_completo += texto_da_pagina + "\n\n"
+                partes_texto.append(texto_da_pagina)
                 logger.debug(
                     f"Página {indice_pagina + 1}: {len(texto_da_pagina)} caracteres extraídos"
                 )
@@ -336,16 +605,17 @@ def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
                 logger.warning(f"Página {indice_pagina + 1}: SEM TEXTO (vazia ou escaneada)")
         
         # Limpar texto final (remover espaços excessivos)
-        texto_completo = texto_completo.strip()
+        texto_completo = "\n\n".join(partes_texto).strip()
         
         # Montar resultado
         resultado = {
             "texto_extraido": texto_completo,
             "numero_de_paginas": numero_total_de_paginas,
-            "metodo_extracao": "PyPDF2",
+            "metodo_extracao": backend_pdf.nome_exibicao,
             "caminho_arquivo_original": caminho_arquivo_pdf,
             "tipo_documento": "pdf_texto",
-            "paginas_vazias": lista_paginas_vazias
+            "paginas_vazias": lista_paginas_vazias,
+            "textos_por_pagina": [texto or "" for texto in textos_das_paginas]
         }
         
         logger.info(
@@ -369,6 +639,21 @@ def extrair_texto_de_pdf_texto(caminho_arquivo_pdf: str) -> Dict[str, Any]:
 # FUNÇÃO: EXTRAIR TEXTO DE DOCX
 # ==========================================
 
+# Namespaces do formato OOXML (WordprocessingML) usados no document.xml
+NAMESPACE_WORDPROCESSINGML = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+TAG_DOCX_CORPO = NAMESPACE_WORDPROCESSINGML + "body"
+TAG_DOCX_PARAGRAFO = NAMESPACE_WORDPROCESSINGML + "p"
+TAG_DOCX_TEXTO = NAMESPACE_WORDPROCESSINGML + "t"
+TAG_DOCX_TABULACAO = NAMESPACE_WORDPROCESSINGML + "tab"
+TAGS_DOCX_QUEBRA_LINHA = (NAMESPACE_WORDPROCESSINGML + "br", NAMESPACE_WORDPROCESSINGML + "cr")
+TAG_DOCX_TABELA = NAMESPACE_WORDPROCESSINGML + "tbl"
+TAG_DOCX_LINHA_TABELA = NAMESPACE_WORDPROCESSINGML + "tr"
+TAG_DOCX_CELULA_TABELA = NAMESPACE_WORDPROCESSINGML + "tc"
+
+# Caminho da parte principal do documento dentro do pacote ZIP do .docx
+CAMINHO_PARTE_DOCUMENTO_DOCX = "word/document.xml"
+
+
 def extrair_texto_de_docx(caminho_arquivo_docx: str) -> Dict[str, Any]:
     """
     Extrai texto de um arquivo Microsoft Word (.docx).
@@ -379,15 +664,27 @@ def extrair_texto_de_docx(caminho_arquivo_docx: str) -> Dict[str, Any]:
     A extração de DOCX é geralmente mais confiável que PDF pois preserva
     a estrutura do documento.
     
-    IMPLEMENTAÇÃO:
-    1. Valida que o arquivo existe e python-docx está disponível
-    2. Abre o documento usando a biblioteca python-docx
-    3. Extrai texto de todos os parágrafos
-    4. Extrai texto de tabelas (comum em documentos jurídicos)
-    5. Retorna texto completo + metadados
+    IMPLEMENTAÇÃO (STREAMING):
+    Um .docx é um pacote ZIP; o conteúdo do corpo fica em word/document.xml.
+    Em vez de montar o modelo de objetos completo (python-docx), esta função
+    percorre o XML com ElementTree.iterparse diretamente do ZIP:
+    1. Valida que o arquivo existe e tem extensão .docx
+    2. Lê word/document.xml em streaming (eventos start/end)
+    3. Emite parágrafos e tabelas NA ORDEM DO DOCUMENTO (intercalados)
+    4. Descarta cada bloco já processado (memória limitada, mesmo em
+       contratos/contestações com centenas de páginas)
+    5. Acumula as linhas em lista e une uma única vez (custo linear)
+    
+    FORMATO DO TEXTO:
+    - Cada parágrafo não vazio do corpo vira uma linha
+    - Cada tabela vira um bloco "[TABELA N]" ... "[FIM TABELA N]", com uma
+      linha por linha da tabela e células separadas por tabulação
+    - Tabelas aninhadas são achatadas dentro da célula que as contém
+    - Caixas de texto (parágrafos dentro de parágrafos) são ignoradas,
+      assim como no python-docx
     
     IMPORTANTE:
-    python-docx só funciona com formato .docx (Office 2007+).
+    Só funciona com formato .docx (Office 2007+).
     Arquivos .doc antigos (Office 2003) não são suportados.
     
     Args:
@@ -397,22 +694,20 @@ def extrair_texto_de_docx(caminho_arquivo_docx: str) -> Dict[str, Any]:
         dict contendo:
         {
             "texto_extraido": str,              # Texto completo do documento
-            "numero_de_paragrafos": int,        # Total de parágrafos
-            "numero_de_tabelas": int,           # Total de tabelas
-            "metodo_extracao": str,             # "python-docx"
+            "numero_de_paragrafos": int,        # Total de parágrafos (fora de tabelas)
+            "numero_de_tabelas": int,           # Total de tabelas (nível superior)
+            "metodo_extracao": str,             # "ooxml-streaming"
             "caminho_arquivo_original": str,    # Caminho do arquivo processado
             "tipo_documento": str               # "docx"
         }
         
     Raises:
         ArquivoNaoEncontradoError: Se o arquivo não existir
-        DependenciaNaoInstaladaError: Se python-docx não estiver instalado
         TipoDeArquivoNaoSuportadoError: Se o arquivo não for .docx válido
         ErroDeExtracaoDeTexto: Para outros erros durante processamento
     """
     # Validações preliminares
     validar_existencia_arquivo(caminho_arquivo_docx)
-    validar_dependencia_instalada(DocxDocument, "python-docx")
     
     # Validar extensão do arquivo
     extensao_arquivo = Path(caminho_arquivo_docx).suffix.lower()
@@ -428,67 +723,159 @@ def extrair_texto_de_docx(caminho_arquivo_docx: str) -> Dict[str, Any]:
     logger.info(f"Iniciando extração de texto do DOCX: {caminho_arquivo_docx}")
     
     try:
-        # Abrir o documento
-        documento = DocxDocument(caminho_arquivo_docx)
-        
-        # Acumuladores
-        texto_completo = ""
-        numero_de_paragrafos = 0
-        
-        # ETAPA 1: Extrair texto dos parágrafos
-        # Parágrafos são a estrutura principal de texto em Word
-        logger.debug("Extraindo texto dos parágrafos...")
-        for paragrafo in documento.paragraphs:
-            texto_paragrafo = paragrafo.text
-            if texto_paragrafo.strip():  # Ignorar parágrafos vazios
-                texto_completo += texto_paragrafo + "\n"
-                numero_de_paragrafos += 1
-        
-        logger.debug(f"Extraídos {numero_de_paragrafos} parágrafos")
-        
-        # ETAPA 2: Extrair texto das tabelas
-        # Documentos jurídicos frequentemente têm tabelas com dados estruturados
-        numero_de_tabelas = len(documento.tables)
-        logger.debug(f"Processando {numero_de_tabelas} tabela(s)...")
-        
-        for indice_tabela, tabela in enumerate(documento.tables):
-            texto_completo += f"\n[TABELA {indice_tabela + 1}]\n"
-            
-            # Iterar por linhas da tabela
-            for linha in tabela.rows:
-                # Iterar por células da linha
-                textos_celulas = [celula.text.strip() for celula in linha.cells]
-                # Juntar células com separador de tabulação
-                linha_texto = "\t".join(textos_celulas)
-                texto_completo += linha_texto + "\n"
-            
-            texto_completo += f"[FIM TABELA {indice_tabela + 1}]\n\n"
-        
-        # Limpar texto final
-        texto_completo = texto_completo.strip()
-        
-        # Montar resultado
-        resultado = {
-            "texto_extraido": texto_completo,
-            "numero_de_paragrafos": numero_de_paragrafos,
-            "numero_de_tabelas": numero_de_tabelas,
-            "metodo_extracao": "python-docx",
-            "caminho_arquivo_original": caminho_arquivo_docx,
-            "tipo_documento": "docx"
-        }
-        
-        logger.info(
-            f"Extração concluída: {len(texto_completo)} caracteres, "
-            f"{numero_de_paragrafos} parágrafos, {numero_de_tabelas} tabelas"
+        with zipfile.ZipFile(caminho_arquivo_docx) as pacote_docx:
+            with pacote_docx.open(CAMINHO_PARTE_DOCUMENTO_DOCX) as xml_documento:
+                linhas_texto, numero_de_paragrafos, numero_de_tabelas = (
+                    _percorrer_xml_documento_docx(xml_documento)
+                )
+    except (zipfile.BadZipFile, KeyError) as erro:
+        # Não é um ZIP, ou é um ZIP sem word/document.xml
+        mensagem_erro = (
+            f"Arquivo '{caminho_arquivo_docx}' não é um .docx válido "
+            f"(pacote OOXML ilegível): {str(erro)}"
         )
-        
-        return resultado
-        
+        logger.error(mensagem_erro)
+        raise TipoDeArquivoNaoSuportadoError(mensagem_erro)
     except Exception as erro:
-        # Captura qualquer erro
+        # Captura qualquer outro erro (ex: XML corrompido)
         mensagem_erro = f"Erro ao extrair texto do DOCX: {str(erro)}"
         logger.error(mensagem_erro)
         raise ErroDeExtracaoDeTexto(mensagem_erro)
+    
+    # Unir uma única vez e limpar texto final
+    texto_completo = "".join(linhas_texto).strip()
+    
+    # Montar resultado
+    resultado = {
+        "texto_extraido": texto_completo,
+        "numero_de_paragrafos": numero_de_paragrafos,
+        "numero_de_tabelas": numero_de_tabelas,
+        "metodo_extracao": "ooxml-streaming",
+        "caminho_arquivo_original": caminho_arquivo_docx,
+        "tipo_documento": "docx"
+    }
+    
+    logger.info(
+        f"Extração concluída: {len(texto_completo)} caracteres, "
+        f"{numero_de_paragrafos} parágrafos, {numero_de_tabelas} tabelas"
+    )
+    
+    return resultado
+
+
+def _percorrer_xml_documento_docx(xml_documento: IO[bytes]) -> Tuple[List[str], int, int]:
+    """
+    Percorre o word/document.xml em streaming e monta as linhas de texto.
+    
+    IMPLEMENTAÇÃO:
+    Máquina de estados sobre os eventos do iterparse:
+    - pilha_paragrafos: partes de texto do(s) parágrafo(s) abertos
+      (mais de um nível = caixa de texto dentro de parágrafo)
+    - pilha_tabelas: para cada tabela aberta, a linha atual (lista de
+      células) e a célula atual (lista de parágrafos)
+    Ao fechar um bloco de nível superior (parágrafo ou tabela fora de
+    tabela), o elemento do corpo é limpo para liberar memória.
+    
+    Args:
+        xml_documento: Stream binário do word/document.xml
+    
+    Returns:
+        Tupla (linhas_texto, numero_de_paragrafos, numero_de_tabelas).
+        linhas_texto já contém as quebras de linha e deve ser unida com "".
+    """
+    linhas_texto: List[str] = []
+    numero_de_paragrafos = 0
+    numero_de_tabelas = 0
+    
+    corpo = None
+    pilha_paragrafos: List[List[str]] = []
+    pilha_tabelas: List[Dict[str, List[str]]] = []
+    
+    for evento, elemento in ElementTree.iterparse(xml_documento, events=("start", "end")):
+        tag = elemento.tag
+        
+        if evento == "start":
+            if tag == TAG_DOCX_PARAGRAFO:
+                pilha_paragrafos.append([])
+            elif tag == TAG_DOCX_TABELA:
+                pilha_tabelas.append({"celulas_linha": [], "paragrafos_celula": []})
+                if len(pilha_tabelas) == 1:
+                    numero_de_tabelas += 1
+                    linhas_texto.append(f"\n[TABELA {numero_de_tabelas}]\n")
+            elif tag == TAG_DOCX_LINHA_TABELA and pilha_tabelas:
+                pilha_tabelas[-1]["celulas_linha"] = []
+            elif tag == TAG_DOCX_CELULA_TABELA and pilha_tabelas:
+                pilha_tabelas[-1]["paragrafos_celula"] = []
+            elif tag == TAG_DOCX_CORPO:
+                corpo = elemento
+            continue
+        
+        # ===== EVENTOS "end" =====
+        
+        if tag == TAG_DOCX_TEXTO:
+            if pilha_paragrafos and elemento.text:
+                pilha_paragrafos[-1].append(elemento.text)
+        
+        elif tag == TAG_DOCX_TABULACAO:
+            if pilha_paragrafos:
+                pilha_paragrafos[-1].append("\t")
+        
+        elif tag in TAGS_DOCX_QUEBRA_LINHA:
+            if pilha_paragrafos:
+                pilha_paragrafos[-1].append("\n")
+        
+        elif tag == TAG_DOCX_PARAGRAFO:
+            texto_paragrafo = "".join(pilha_paragrafos.pop())
+            
+            if pilha_paragrafos:
+                # Caixa de texto dentro de outro parágrafo: ignorada
+                continue
+            
+            if pilha_tabelas:
+                pilha_tabelas[-1]["paragrafos_celula"].append(texto_paragrafo)
+            else:
+                if texto_paragrafo.strip():  # Ignorar parágrafos vazios
+                    linhas_texto.append(texto_paragrafo + "\n")
+                    numero_de_paragrafos += 1
+                _liberar_blocos_processados_docx(corpo, elemento)
+        
+        elif tag == TAG_DOCX_CELULA_TABELA and pilha_tabelas:
+            tabela_atual = pilha_tabelas[-1]
+            tabela_atual["celulas_linha"].append(
+                "\n".join(tabela_atual["paragrafos_celula"]).strip()
+            )
+        
+        elif tag == TAG_DOCX_LINHA_TABELA and pilha_tabelas:
+            # Juntar células com separador de tabulação
+            linha_texto = "\t".join(pilha_tabelas[-1]["celulas_linha"])
+            
+            if len(pilha_tabelas) > 1:
+                # Tabela aninhada: a linha vira um parágrafo da célula externa
+                pilha_tabelas[-2]["paragrafos_celula"].append(linha_texto)
+            else:
+                linhas_texto.append(linha_texto + "\n")
+        
+        elif tag == TAG_DOCX_TABELA and pilha_tabelas:
+            pilha_tabelas.pop()
+            if not pilha_tabelas:
+                linhas_texto.append(f"[FIM TABELA {numero_de_tabelas}]\n\n")
+                _liberar_blocos_processados_docx(corpo, elemento)
+    
+    return linhas_texto, numero_de_paragrafos, numero_de_tabelas
+
+
+def _liberar_blocos_processados_docx(corpo: Any, elemento: Any) -> None:
+    """
+    Libera a memória de um bloco de nível superior já convertido em texto.
+    
+    CONTEXTO:
+    O iterparse continua construindo a árvore em memória; sem esta limpeza,
+    um documento grande ficaria inteiro em memória ao final da leitura.
+    Limpar o corpo remove os blocos anteriores já processados.
+    """
+    elemento.clear()
+    if corpo is not None:
+        corpo.clear()
 
 
 # ==========================================
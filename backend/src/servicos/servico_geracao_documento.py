@@ -40,7 +40,7 @@ O documento gerado é o produto final entregue ao advogado.
 
 import logging
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from functools import lru_cache
 
 # markdown é opcional; se não disponível, usamos fallback simples
@@ -52,7 +52,7 @@ except ModuleNotFoundError:  # pragma: no cover - ambiente sem dependência opci
         "Biblioteca 'markdown' não instalada. Fallback basico será usado para gerar HTML."
     )
 
-from src.utilitarios.gerenciador_llm import obter_gerenciador_llm, GerenciadorLLM
+from src.utilitarios.gerenciador_llm import obter_gerenciador_llm, CallbackDeFragmento, GerenciadorLLM
 from src.modelos.processo import (
     DocumentoContinuacao,
     TipoPecaContinuacao,
@@ -109,7 +109,8 @@ class ServicoGeracaoDocumento:
     
     def gerar_documento_continuacao(
         self,
-        contexto: Dict[str, Any]
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None
     ) -> DocumentoContinuacao:
         """
         Gera documento de continuação processual com base no contexto completo.
@@ -137,6 +138,9 @@ class ServicoGeracaoDocumento:
                 - prognostico (Prognostico): Prognóstico com cenários e probabilidades
                 - tipo_peca (str): Tipo de peça a gerar (opcional, inferido se ausente)
                 - tipo_acao (str): Tipo de ação jurídica (opcional)
+            ao_receber_fragmento: Callback de streaming que recebe o Markdown do
+                                  documento enquanto é gerado (opcional; o
+                                  documento retornado não muda)
         
         Returns:
             DocumentoContinuacao: Documento gerado com conteúdo em Markdown e HTML
@@ -161,6 +165,67 @@ class ServicoGeracaoDocumento:
             >>> print(len(documento.sugestoes_personalizacao))
             5
         """
+        tipo_peca, prompt = self._preparar_geracao(contexto)
+        
+        # ETAPA 4: Chamar gpt-5-nano-2025-08-07
+        logger.info("Etapa 4/7: Chamando gpt-5-nano-2025-08-07 para gerar documento...")
+        try:
+            conteudo_markdown = self.gerenciador_llm.chamar_llm(
+                **self._argumentos_da_chamada_llm_do_documento(prompt, ao_receber_fragmento)
+            )
+            logger.info(f"Documento gerado com {len(conteudo_markdown)} caracteres")
+        except Exception as e:
+            logger.error(f"Erro ao chamar gpt-5-nano-2025-08-07 para gerar documento: {e}")
+            raise Exception(f"Falha ao gerar documento com LLM: {e}")
+        
+        return self._montar_documento(tipo_peca, conteudo_markdown)
+    
+    async def gerar_documento_continuacao_async(
+        self,
+        contexto: Dict[str, Any],
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None
+    ) -> DocumentoContinuacao:
+        """
+        Versão assíncrona de gerar_documento_continuacao().
+        
+        CONTEXTO:
+        O OrquestradorAnalisePeticoes roda dentro de um event loop. A chamada
+        síncrona bloquearia o loop durante toda a geração e não aguardaria
+        vaga no agendador de chamadas ao LLM; aqui a chamada usa
+        chamar_llm_async() e entra na fila como as dos demais agentes.
+        
+        Args:
+            contexto: Mesmo contexto de gerar_documento_continuacao()
+            ao_receber_fragmento: Callback de streaming (opcional)
+        
+        Returns:
+            DocumentoContinuacao: Documento gerado com conteúdo em Markdown e HTML
+        """
+        tipo_peca, prompt = self._preparar_geracao(contexto)
+        
+        logger.info("Etapa 4/7: Chamando gpt-5-nano-2025-08-07 para gerar documento (assíncrono)...")
+        try:
+            conteudo_markdown = await self.gerenciador_llm.chamar_llm_async(
+                **self._argumentos_da_chamada_llm_do_documento(prompt, ao_receber_fragmento)
+            )
+            logger.info(f"Documento gerado com {len(conteudo_markdown)} caracteres")
+        except Exception as e:
+            logger.error(f"Erro ao chamar gpt-5-nano-2025-08-07 para gerar documento: {e}")
+            raise Exception(f"Falha ao gerar documento com LLM: {e}")
+        
+        return self._montar_documento(tipo_peca, conteudo_markdown)
+    
+    def _preparar_geracao(self, contexto: Dict[str, Any]) -> Tuple[TipoPecaContinuacao, str]:
+        """
+        Etapas 1 a 3 da geração: valida o contexto, determina o tipo de peça
+        e monta o prompt.
+        
+        Returns:
+            (tipo de peça, prompt)
+        
+        Raises:
+            ValueError: Se contexto for inválido
+        """
         logger.info("=== INICIANDO GERAÇÃO DE DOCUMENTO DE CONTINUAÇÃO ===")
         
         # ETAPA 1: Validar entrada
@@ -177,23 +242,36 @@ class ServicoGeracaoDocumento:
         prompt = self._montar_prompt_documento(contexto, tipo_peca)
         logger.info(f"Prompt montado com {len(prompt)} caracteres")
         
-        # ETAPA 4: Chamar gpt-5-nano-2025-08-07
-        logger.info("Etapa 4/7: Chamando gpt-5-nano-2025-08-07 para gerar documento...")
-        try:
-            conteudo_markdown = self.gerenciador_llm.chamar_llm(
-                prompt=prompt,
-                modelo=self.modelo_padrao,
-                temperatura=self.temperatura_padrao,
-                max_tokens=self.max_tokens_padrao,
-                mensagens_de_sistema=(
-                    "Você é um redator jurídico experiente especializado em documentos processuais formais."
-                )
-            )
-            logger.info(f"Documento gerado com {len(conteudo_markdown)} caracteres")
-        except Exception as e:
-            logger.error(f"Erro ao chamar gpt-5-nano-2025-08-07 para gerar documento: {e}")
-            raise Exception(f"Falha ao gerar documento com LLM: {e}")
+        return tipo_peca, prompt
+    
+    def _argumentos_da_chamada_llm_do_documento(
+        self,
+        prompt: str,
+        ao_receber_fragmento: Optional[CallbackDeFragmento]
+    ) -> Dict[str, Any]:
+        """
+        Parâmetros da chamada ao LLM (iguais nas versões síncrona e assíncrona).
+        """
+        return {
+            "prompt": prompt,
+            "modelo": self.modelo_padrao,
+            "temperatura": self.temperatura_padrao,
+            "max_tokens": self.max_tokens_padrao,
+            "mensagens_de_sistema": (
+                "Você é um redator jurídico experiente especializado em documentos processuais formais."
+            ),
+            "ao_receber_fragmento": ao_receber_fragmento,
+            "agente": "geracao_documento",
+        }
+    
+    def _montar_documento(self, tipo_peca: TipoPecaContinuacao, conteudo_markdown: str) -> DocumentoContinuacao:
+        """
+        Etapas 5 a 7 da geração: sugestões de personalização, HTML e o
+        DocumentoContinuacao final.
         
+        Raises:
+            Exception: Se falhar ao converter para HTML
+        """
         # ETAPA 5: Extrair sugestões de personalização
         logger.info("Etapa 5/7: Extraindo sugestões de personalização...")
         sugestoes = self._extrair_sugestoes_personalizacao(conteudo_markdown)
@@ -0,0 +1,322 @@
+"""
+Serviço de Índice Vetorial de Documentos - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Com milhares de processos na base, buscar em TODOS os chunks (ou passar
+um "$in" enorme de documento_ids ao ChromaDB) fica lento e ruidoso: chunks
+de processos sem relação com a consulta disputam o top-k. A busca em dois
+estágios primeiro escolhe os documentos mais próximos da consulta e só
+então busca chunks DENTRO deles.
+
+Este módulo guarda UM vetor por documento (o centroide dos embeddings dos
+seus chunks), gravado na ingestão por servico_banco_vetorial.armazenar_chunks().
+
+IMPLEMENTAÇÃO:
+- SQLite (biblioteca padrão): documento_id → vetor float32 (BLOB), arquivo
+  em CAMINHO_INDICE_DOCUMENTOS
+- Busca por força bruta em NumPy: a matriz (documentos × dimensão) fica em
+  memória e só é recarregada após uma escrita. Com 10 mil documentos e
+  1536 dimensões são ~60 MB e poucos milissegundos por consulta
+- Vetores normalizados: similaridade de cosseno = produto interno
+
+PADRÃO DE USO:
+```python
+from src.servicos.servico_indice_documentos import calcular_centroide, obter_indice_documentos
+
+indice = obter_indice_documentos()
+indice.registrar_documento("doc-1", calcular_centroide(embeddings_dos_chunks))
+documentos = indice.buscar_lote([embedding_query], limite=10)[0]  # [(documento_id, similaridade)]
+```
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== EXCEÇÕES CUSTOMIZADAS =====
+
+class ErroDeIndiceDocumentos(Exception):
+    """
+    Erro ao ler ou atualizar o índice vetorial de documentos.
+
+    CENÁRIOS COMUNS:
+    - Arquivo SQLite sem permissão de escrita ou corrompido
+    - Vetores de dimensões diferentes (troca de modelo de embedding sem reindexar)
+    """
+    pass
+
+
+# ===== CONSTANTES =====
+
+ESQUEMA_INDICE_DOCUMENTOS = """
+CREATE TABLE IF NOT EXISTS vetores_documentos (
+    documento_id TEXT PRIMARY KEY,
+    dimensao     INTEGER NOT NULL,
+    vetor        BLOB NOT NULL
+);
+"""
+
+
+# ===== FUNÇÕES AUXILIARES =====
+
+def normalizar_vetores(vetores: np.ndarray) -> np.ndarray:
+    """
+    Normaliza as linhas para norma 1 (linhas nulas ficam nulas).
+    """
+    normas = np.linalg.norm(vetores, axis=-1, keepdims=True)
+    normas[normas == 0.0] = 1.0
+    return vetores / normas
+
+
+def calcular_centroide(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Calcula o vetor do documento: média dos embeddings normalizados dos chunks.
+
+    Normalizar antes da média impede que chunks de norma maior dominem o
+    centroide; o resultado é normalizado de novo.
+
+    Args:
+        embeddings: Embeddings dos chunks do documento
+
+    Returns:
+        np.ndarray: Vetor float32 de norma 1
+
+    Raises:
+        ErroDeIndiceDocumentos: Se a lista de embeddings estiver vazia
+    """
+    if len(embeddings) == 0:
+        raise ErroDeIndiceDocumentos("Não é possível calcular o centroide de um documento sem embeddings")
+    matriz = normalizar_vetores(np.asarray(embeddings, dtype=np.float32))
+    return normalizar_vetores(matriz.mean(axis=0))
+
+
+# ===== CLASSE DO ÍNDICE =====
+
+class IndiceDocumentos:
+    """
+    Índice vetorial com um vetor (centroide) por documento.
+
+    THREAD-SAFETY:
+    Uma conexão por instância (check_same_thread=False) protegida por
+    threading.Lock, como em CatalogoDocumentos. A matriz em memória é
+    descartada a cada escrita e recarregada na próxima busca.
+    """
+
+    def __init__(self, caminho_banco: str):
+        """
+        Abre (ou cria) o índice de documentos.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite (":memory:" para testes)
+
+        Raises:
+            ErroDeIndiceDocumentos: Se o banco não puder ser aberto
+        """
+        self.caminho_banco = caminho_banco
+        self._lock = threading.Lock()
+        self._ids_em_memoria: Optional[List[str]] = None
+        self._matriz_em_memoria: Optional[np.ndarray] = None
+
+        try:
+            if caminho_banco != ":memory:":
+                Path(caminho_banco).parent.mkdir(parents=True, exist_ok=True)
+            self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(ESQUEMA_INDICE_DOCUMENTOS)
+        except (sqlite3.Error, OSError) as erro:
+            mensagem_erro = f"Falha ao abrir índice de documentos em '{caminho_banco}': {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceDocumentos(mensagem_erro) from erro
+
+    def registrar_documento(self, documento_id: str, vetor: np.ndarray) -> None:
+        """
+        Insere ou substitui o vetor de um documento (reprocessamento).
+
+        Raises:
+            ErroDeIndiceDocumentos: Se a escrita falhar
+        """
+        self.registrar_documentos({documento_id: vetor})
+
+    def registrar_documentos(self, vetores_por_documento: Dict[str, np.ndarray]) -> int:
+        """
+        Registra vários documentos em uma única transação (reconstrução).
+
+        Returns:
+            int: Número de documentos registrados
+
+        Raises:
+            ErroDeIndiceDocumentos: Se a escrita falhar
+        """
+        linhas = []
+        for documento_id, vetor in vetores_por_documento.items():
+            vetor_float32 = np.asarray(vetor, dtype=np.float32).ravel()
+            linhas.append((documento_id, int(vetor_float32.size), vetor_float32.tobytes()))
+        try:
+            with self._lock, self._conexao:
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO vetores_documentos (documento_id, dimensao, vetor) VALUES (?, ?, ?)",
+                    linhas
+                )
+                self._descartar_matriz_em_memoria()
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao registrar vetores de documentos: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceDocumentos(mensagem_erro) from erro
+        return len(linhas)
+
+    def remover_documento(self, documento_id: str) -> bool:
+        """
+        Remove o vetor de um documento.
+
+        Returns:
+            bool: True se o documento estava no índice
+
+        Raises:
+            ErroDeIndiceDocumentos: Se a escrita falhar
+        """
+        try:
+            with self._lock, self._conexao:
+                cursor = self._conexao.execute(
+                    "DELETE FROM vetores_documentos WHERE documento_id = ?", (documento_id,)
+                )
+                self._descartar_matriz_em_memoria()
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao remover documento '{documento_id}' do índice de documentos: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceDocumentos(mensagem_erro) from erro
+        return cursor.rowcount > 0
+
+    def contar_documentos(self) -> int:
+        """
+        Retorna o número de documentos indexados.
+        """
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM vetores_documentos").fetchone()[0]
+
+    def esta_vazio(self) -> bool:
+        """
+        Indica se o índice ainda não tem documentos (ex: base anterior a este índice).
+        """
+        return self.contar_documentos() == 0
+
+    def buscar_lote(
+        self,
+        embeddings_queries: Sequence[Sequence[float]],
+        limite: int = 10,
+        documento_ids: Optional[Sequence[str]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Seleciona os documentos mais próximos de cada query (força bruta em NumPy).
+
+        Args:
+            embeddings_queries: Embeddings das queries (mesmo modelo dos chunks)
+            limite: Número máximo de documentos por query
+            documento_ids: (Opcional) Restringe a seleção a estes documentos
+
+        Returns:
+            List[List[Tuple[str, float]]]: Para cada query, (documento_id,
+            similaridade de cosseno) da maior para a menor
+
+        Raises:
+            ErroDeIndiceDocumentos: Se a dimensão das queries não bater com a do índice
+        """
+        ids_documentos, matriz = self._obter_matriz()
+        if not ids_documentos or limite <= 0 or len(embeddings_queries) == 0:
+            return [[] for _ in embeddings_queries]
+
+        if documento_ids is not None:
+            permitidos = set(documento_ids)
+            mascara = np.fromiter((documento_id in permitidos for documento_id in ids_documentos), dtype=bool)
+            if not mascara.any():
+                return [[] for _ in embeddings_queries]
+            posicoes = np.flatnonzero(mascara)
+            ids_documentos = [ids_documentos[posicao] for posicao in posicoes]
+            matriz = matriz[posicoes]
+
+        queries = normalizar_vetores(np.asarray(embeddings_queries, dtype=np.float32))
+        if queries.shape[1] != matriz.shape[1]:
+            raise ErroDeIndiceDocumentos(
+                f"Dimensão da query ({queries.shape[1]}) diferente da do índice de documentos "
+                f"({matriz.shape[1]}). Reindexe após trocar o modelo de embedding."
+            )
+
+        # (queries × documentos): uma multiplicação de matrizes para o lote inteiro
+        similaridades = queries @ matriz.T
+        limite = min(limite, len(ids_documentos))
+        selecionados = np.argpartition(-similaridades, limite - 1, axis=1)[:, :limite]
+
+        resultados = []
+        for linha, colunas in zip(similaridades, selecionados):
+            colunas_ordenadas = colunas[np.argsort(-linha[colunas])]
+            resultados.append([(ids_documentos[coluna], float(linha[coluna])) for coluna in colunas_ordenadas])
+        return resultados
+
+    def _obter_matriz(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Retorna (ids, matriz normalizada), carregando do SQLite se necessário.
+        """
+        with self._lock:
+            if self._matriz_em_memoria is None:
+                linhas = self._conexao.execute(
+                    "SELECT documento_id, dimensao, vetor FROM vetores_documentos ORDER BY documento_id"
+                ).fetchall()
+                dimensoes = {dimensao for _, dimensao, _ in linhas}
+                if len(dimensoes) > 1:
+                    raise ErroDeIndiceDocumentos(
+                        f"Índice de documentos com dimensões misturadas: {sorted(dimensoes)}"
+                    )
+                self._ids_em_memoria = [documento_id for documento_id, _, _ in linhas]
+                self._matriz_em_memoria = normalizar_vetores(np.vstack([
+                    np.frombuffer(vetor, dtype=np.float32) for _, _, vetor in linhas
+                ])) if linhas else np.zeros((0, 0), dtype=np.float32)
+            return self._ids_em_memoria, self._matriz_em_memoria
+
+    def _descartar_matriz_em_memoria(self) -> None:
+        """
+        Invalida a matriz em memória (chamar com o lock aberto).
+        """
+        self._ids_em_memoria = None
+        self._matriz_em_memoria = None
+
+
+# ===== INSTÂNCIA SINGLETON =====
+
+# DESIGN: Singleton pattern (uma conexão SQLite e uma matriz em memória por processo)
+_instancia_indice_documentos: Optional[IndiceDocumentos] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_indice_documentos() -> IndiceDocumentos:
+    """
+    Obtém a instância singleton do índice de documentos (caminho em CAMINHO_INDICE_DOCUMENTOS).
+
+    THREAD-SAFETY:
+    Double-checked locking, como no catálogo de documentos.
+    """
+    global _instancia_indice_documentos
+
+    if _instancia_indice_documentos is None:
+        with _lock_singleton:
+            if _instancia_indice_documentos is None:
+                configuracoes = obter_configuracoes()
+                # Backend NumPy: os vetores não persistem, então o índice de documentos também não
+                caminho_banco = (
+                    ":memory:" if configuracoes.usa_armazenamento_em_memoria()
+                    else configuracoes.CAMINHO_INDICE_DOCUMENTOS
+                )
+                logger.info(f"🔧 Abrindo índice vetorial de documentos: {caminho_banco}")
+                _instancia_indice_documentos = IndiceDocumentos(caminho_banco)
+
+    return _instancia_indice_documentos
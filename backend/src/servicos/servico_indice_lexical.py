@@ -0,0 +1,332 @@
+"""
+Serviço de Índice Lexical (BM25) - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Consultas jurídicas são cheias de identificadores EXATOS: "art. 482 da CLT",
+"Súmula 331 do TST", números de processo, CIDs como "M54.5". A busca por
+similaridade de cosseno sobre embeddings (ada-002) trata esses termos como
+"parecidos" com outros números e frequentemente não os traz no top-k.
+
+Este módulo mantém um índice invertido local (BM25) com o texto de todos os
+chunks do ChromaDB, para que servico_banco_vetorial.buscar_chunks_similares()
+possa combinar o ranking lexical com o ranking vetorial (modo "hibrida",
+fusão por Reciprocal Rank Fusion).
+
+IMPLEMENTAÇÃO:
+- SQLite FTS5 (biblioteca padrão): índice invertido persistente com ranking
+  bm25() nativo, arquivo em CAMINHO_INDICE_LEXICAL
+- Tokenizador unicode61 com remoção de acentos ("súmula" casa "sumula")
+- Identificadores com pontuação ("M54.5", "1001234-56.2024.8.26.0100") viram
+  consultas de FRASE: os pedaços precisam aparecer em sequência
+- Atualizado por servico_banco_vetorial.armazenar_chunks() e
+  deletar_documento(), junto com a escrita no ChromaDB
+
+PADRÃO DE USO:
+```python
+from src.servicos.servico_indice_lexical import obter_indice_lexical
+
+indice = obter_indice_lexical()
+indice.indexar_chunks("doc-1", ["doc-1_chunk_0"], ["Súmula 331 do TST ..."])
+resultados = indice.buscar("súmula 331 TST", limite=20)  # [(chunk_id, score), ...]
+```
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== EXCEÇÕES CUSTOMIZADAS =====
+
+class ErroDeIndiceLexical(Exception):
+    """
+    Erro ao ler ou atualizar o índice lexical (BM25).
+
+    CENÁRIOS COMUNS:
+    - Arquivo SQLite sem permissão de escrita ou corrompido
+    - SQLite compilado sem a extensão FTS5
+    """
+    pass
+
+
+# ===== CONSTANTES =====
+
+# chunks: rowid → (chunk_id, documento_id), com índice por documento_id
+# (remoção/reindexação de um documento não varre o índice inteiro)
+# chunks_lexicos: texto de cada chunk no FTS5, com o MESMO rowid
+ESQUEMA_INDICE_LEXICAL = """
+CREATE TABLE IF NOT EXISTS chunks (
+    rowid        INTEGER PRIMARY KEY,
+    chunk_id     TEXT NOT NULL UNIQUE,
+    documento_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_documento_id ON chunks (documento_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_lexicos USING fts5(
+    texto,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Termos da consulta: palavras e identificadores com pontuação interna
+# (art. 482 → "art", "482"; M54.5 → "m54.5"; 1001234-56.2024 → um identificador)
+PADRAO_TERMO_CONSULTA = re.compile(r"\w+(?:[.\-/]\w+)*")
+
+# Palavras muito frequentes em português jurídico que não discriminam chunks
+# (casariam quase todo o índice em uma consulta OR)
+STOPWORDS_CONSULTA_LEXICAL = frozenset({
+    "a", "o", "as", "os", "e", "é", "de", "da", "do", "das", "dos", "em", "na", "no",
+    "nas", "nos", "um", "uma", "por", "para", "com", "que", "se", "ao", "aos", "à", "às",
+    "ou", "sua", "seu", "suas", "seus", "pela", "pelo", "pelas", "pelos", "como",
+})
+
+
+# ===== FUNÇÕES AUXILIARES =====
+
+def extrair_termos_consulta(consulta: str) -> List[str]:
+    """
+    Extrai os termos de busca de uma consulta em linguagem natural.
+
+    Args:
+        consulta: Texto livre (ex: "demissão por justa causa art. 482 CLT")
+
+    Returns:
+        List[str]: Termos em minúsculas, sem stopwords e sem repetição,
+        na ordem em que aparecem
+    """
+    termos: List[str] = []
+    for termo in PADRAO_TERMO_CONSULTA.findall(consulta.lower()):
+        if termo in STOPWORDS_CONSULTA_LEXICAL or termo in termos:
+            continue
+        termos.append(termo)
+    return termos
+
+
+def montar_expressao_fts(termos: Sequence[str]) -> str:
+    """
+    Monta a expressão MATCH do FTS5 (termos unidos por OR).
+
+    Cada termo vai entre aspas: o FTS5 o trata como frase, então "m54.5"
+    exige "m54" seguido de "5", e operadores do FTS5 (AND, NEAR, *) no
+    texto do usuário não são interpretados.
+
+    Args:
+        termos: Saída de extrair_termos_consulta()
+
+    Returns:
+        str: Expressão para "WHERE chunks_lexicos MATCH ?"
+    """
+    return " OR ".join('"' + termo.replace('"', '""') + '"' for termo in termos)
+
+
+# ===== CLASSE DO ÍNDICE =====
+
+class IndiceLexical:
+    """
+    Índice invertido BM25 dos chunks (uma linha por chunk) em SQLite FTS5.
+
+    THREAD-SAFETY:
+    Uma conexão por instância (check_same_thread=False) protegida por
+    threading.Lock; cada escrita é uma transação (with self._conexao),
+    como em CatalogoDocumentos.
+    """
+
+    def __init__(self, caminho_banco: str):
+        """
+        Abre (ou cria) o índice lexical.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite (":memory:" para testes)
+
+        Raises:
+            ErroDeIndiceLexical: Se o banco não puder ser aberto ou não houver FTS5
+        """
+        self.caminho_banco = caminho_banco
+        self._lock = threading.Lock()
+
+        try:
+            if caminho_banco != ":memory:":
+                Path(caminho_banco).parent.mkdir(parents=True, exist_ok=True)
+            self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(ESQUEMA_INDICE_LEXICAL)
+        except (sqlite3.Error, OSError) as erro:
+            mensagem_erro = f"Falha ao abrir índice lexical em '{caminho_banco}': {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceLexical(mensagem_erro) from erro
+
+    def indexar_chunks(
+        self,
+        documento_id: str,
+        ids_chunks: Sequence[str],
+        textos_chunks: Sequence[str]
+    ) -> int:
+        """
+        Indexa (ou reindexa) os chunks de um documento.
+
+        Chunks anteriores do mesmo documento são removidos na mesma transação
+        (reprocessamento não deixa chunks duplicados no índice).
+
+        Args:
+            documento_id: ID do documento
+            ids_chunks: IDs dos chunks no ChromaDB
+            textos_chunks: Textos dos chunks (paralelo a ids_chunks)
+
+        Returns:
+            int: Número de chunks indexados
+
+        Raises:
+            ErroDeIndiceLexical: Se a escrita falhar
+        """
+        linhas = list(zip(ids_chunks, textos_chunks))
+        try:
+            with self._lock, self._conexao:
+                self._remover_chunks_do_documento(documento_id)
+                for id_chunk, texto_chunk in linhas:
+                    cursor = self._conexao.execute(
+                        "INSERT INTO chunks (chunk_id, documento_id) VALUES (?, ?)",
+                        (id_chunk, documento_id)
+                    )
+                    self._conexao.execute(
+                        "INSERT INTO chunks_lexicos (rowid, texto) VALUES (?, ?)",
+                        (cursor.lastrowid, texto_chunk)
+                    )
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao indexar chunks do documento '{documento_id}' no índice lexical: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceLexical(mensagem_erro) from erro
+        return len(linhas)
+
+    def remover_documento(self, documento_id: str) -> int:
+        """
+        Remove todos os chunks de um documento do índice.
+
+        Returns:
+            int: Número de chunks removidos
+
+        Raises:
+            ErroDeIndiceLexical: Se a escrita falhar
+        """
+        try:
+            with self._lock, self._conexao:
+                return self._remover_chunks_do_documento(documento_id)
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao remover documento '{documento_id}' do índice lexical: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceLexical(mensagem_erro) from erro
+
+    def _remover_chunks_do_documento(self, documento_id: str) -> int:
+        """
+        Remove os chunks de um documento (chamar com o lock e a transação abertos).
+        """
+        self._conexao.execute(
+            "DELETE FROM chunks_lexicos WHERE rowid IN "
+            "(SELECT rowid FROM chunks WHERE documento_id = ?)",
+            (documento_id,)
+        )
+        cursor = self._conexao.execute("DELETE FROM chunks WHERE documento_id = ?", (documento_id,))
+        return cursor.rowcount
+
+    def contar_chunks(self) -> int:
+        """
+        Retorna o número de chunks indexados.
+        """
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def esta_vazio(self) -> bool:
+        """
+        Indica se o índice não tem nenhum chunk (mais barato que contar_chunks).
+        """
+        with self._lock:
+            return self._conexao.execute("SELECT 1 FROM chunks LIMIT 1").fetchone() is None
+
+    def buscar(
+        self,
+        consulta: str,
+        limite: int = 20,
+        documento_ids: Optional[Sequence[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Busca os chunks mais relevantes para a consulta pelo ranking BM25.
+
+        Args:
+            consulta: Texto livre da consulta
+            limite: Número máximo de chunks retornados
+            documento_ids: (Opcional) Restringe a busca a estes documentos
+
+        Returns:
+            List[Tuple[str, float]]: (chunk_id, score) do mais para o menos
+            relevante; score = -bm25() (maior = mais relevante). Lista vazia
+            se a consulta não tiver termos úteis.
+
+        Raises:
+            ErroDeIndiceLexical: Se a consulta ao SQLite falhar
+        """
+        termos = extrair_termos_consulta(consulta)
+        if not termos or limite <= 0:
+            return []
+
+        clausula_documentos = ""
+        parametros: List[object] = [montar_expressao_fts(termos)]
+        if documento_ids:
+            clausula_documentos = f"AND chunks.documento_id IN ({', '.join('?' for _ in documento_ids)})"
+            parametros.extend(documento_ids)
+        parametros.append(limite)
+
+        try:
+            with self._lock:
+                linhas = self._conexao.execute(
+                    "SELECT chunks.chunk_id, bm25(chunks_lexicos) AS pontuacao FROM chunks_lexicos "
+                    "JOIN chunks ON chunks.rowid = chunks_lexicos.rowid "
+                    f"WHERE chunks_lexicos MATCH ? {clausula_documentos} "
+                    "ORDER BY pontuacao LIMIT ?",
+                    parametros
+                ).fetchall()
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao consultar índice lexical: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeIndiceLexical(mensagem_erro) from erro
+
+        # bm25() do FTS5 é negativo (mais negativo = mais relevante)
+        return [(chunk_id, -pontuacao) for chunk_id, pontuacao in linhas]
+
+
+# ===== INSTÂNCIA SINGLETON =====
+
+# DESIGN: Singleton pattern (uma conexão SQLite compartilhada pelo processo)
+_instancia_indice_lexical: Optional[IndiceLexical] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_indice_lexical() -> IndiceLexical:
+    """
+    Obtém a instância singleton do índice lexical (caminho em CAMINHO_INDICE_LEXICAL).
+
+    THREAD-SAFETY:
+    Double-checked locking, como no catálogo de documentos.
+    """
+    global _instancia_indice_lexical
+
+    if _instancia_indice_lexical is None:
+        with _lock_singleton:
+            if _instancia_indice_lexical is None:
+                configuracoes = obter_configuracoes()
+                # Backend NumPy: os vetores não persistem, então o índice lexical também não
+                caminho_banco = (
+                    ":memory:" if configuracoes.usa_armazenamento_em_memoria()
+                    else configuracoes.CAMINHO_INDICE_LEXICAL
+                )
+                logger.info(f"🔧 Abrindo índice lexical (BM25): {caminho_banco}")
+                _instancia_indice_lexical = IndiceLexical(caminho_banco)
+
+    return _instancia_indice_lexical
@@ -98,6 +98,7 @@ from src.servicos import servico_extracao_texto
 from src.servicos import servico_ocr
 from src.servicos import servico_vetorizacao
 from src.servicos import servico_banco_vetorial
+from src.servicos import servico_texto_canonico
 
 # Gerenciador de estado de uploads (TAREFA-035)
 from src.servicos.gerenciador_estado_uploads import obter_gerenciador_estado_uploads
@@ -347,7 +348,9 @@ def extrair_texto_do_documento(
             "numero_paginas": int,              # Total de páginas
             "metodo_usado": str,                # "extracao" ou "ocr"
             "confianca_media": float,           # Só para OCR, 1.0 para extração
-            "paginas_baixa_confianca": list     # Só para OCR, [] para extração
+            "paginas_baixa_confianca": list,    # Só para OCR, [] para extração
+            "textos_por_pagina": list[str]      # Texto de cada página (PDFs);
+                                                # DOCX/imagem = [texto_completo]
         }
     
     Raises:
@@ -382,7 +385,8 @@ def extrair_texto_do_documento(
                         "numero_paginas": resultado_extracao["numero_de_paginas"],
                         "metodo_usado": "extracao",
                         "confianca_media": 1.0,  # Extração sempre tem confiança total
-                        "paginas_baixa_confianca": []
+                        "paginas_baixa_confianca": [],
+                        "textos_por_pagina": resultado_extracao.get("textos_por_pagina", [])
                     }
                 
                 except servico_extracao_texto.PDFEscaneadoError:
@@ -414,7 +418,8 @@ def extrair_texto_do_documento(
                         "numero_paginas": resultado_ocr["numero_de_paginas"],
                         "metodo_usado": "ocr",
                         "confianca_media": resultado_ocr["confianca_media"],
-                        "paginas_baixa_confianca": resultado_ocr.get("paginas_baixa_confianca", [])
+                        "paginas_baixa_confianca": resultado_ocr.get("paginas_baixa_confianca", []),
+                        "textos_por_pagina": resultado_ocr.get("textos_por_pagina", [])
                     }
             
             elif extensao == ".docx":
@@ -433,7 +438,8 @@ def extrair_texto_do_documento(
                     "numero_paginas": resultado_extracao.get("numero_de_paragrafos", 1),
                     "metodo_usado": "extracao",
                     "confianca_media": 1.0,
-                    "paginas_baixa_confianca": []
+                    "paginas_baixa_confianca": [],
+                    "textos_por_pagina": [resultado_extracao["texto_extraido"]]
                 }
         
         elif tipo_processamento == TIPO_PROCESSAMENTO_OCR:
@@ -462,7 +468,8 @@ def extrair_texto_do_documento(
                 "numero_paginas": 1,  # Imagem única = 1 página
                 "metodo_usado": "ocr",
                 "confianca_media": resultado_ocr["confianca"],
-                "paginas_baixa_confianca": []
+                "paginas_baixa_confianca": [],
+                "textos_por_pagina": [resultado_ocr["texto_extraido"]]
             }
         
         else:
@@ -542,6 +549,53 @@ def validar_texto_extraido(texto: str, nome_arquivo: str) -> None:
     logger.info(f"Texto válido: {numero_caracteres} caracteres")
 
 
+def calcular_estatisticas_documento(resultado_vetorizacao: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Totais do documento registrados no catálogo (caracteres e tokens).
+    
+    Args:
+        resultado_vetorizacao: Retorno de processar_texto_completo
+    
+    Returns:
+        dict: {"numero_caracteres", "numero_tokens"}
+    """
+    return {
+        "numero_caracteres": len(resultado_vetorizacao.get("texto_processado") or ""),
+        "numero_tokens": int(resultado_vetorizacao.get("numero_tokens", 0)),
+    }
+
+
+def salvar_texto_canonico_do_documento(
+    documento_id: str,
+    resultado_vetorizacao: Dict[str, Any]
+) -> None:
+    """
+    Grava o texto canônico (texto processado, sem overlap) do documento.
+    
+    CONTEXTO:
+    Os orquestradores leem este texto para montar o contexto dos agentes
+    em vez de juntar chunks sobrepostos do ChromaDB. Uma falha aqui NÃO
+    interrompe a ingestão: os chunks já foram armazenados e a leitura cai
+    para a reconstrução a partir deles.
+    
+    Args:
+        documento_id: ID único do documento
+        resultado_vetorizacao: Retorno de processar_texto_completo
+    """
+    texto_processado = resultado_vetorizacao.get("texto_processado")
+    if texto_processado is None:
+        return
+    
+    try:
+        resultado = servico_texto_canonico.salvar_texto_canonico(documento_id, texto_processado)
+        logger.info(
+            f"Texto canônico salvo: {resultado['bytes_originais']} → "
+            f"{resultado['bytes_comprimidos']} bytes"
+        )
+    except servico_texto_canonico.ErroDeTextoCanonico as erro:
+        logger.warning(f"⚠️ Texto canônico não salvo (leitura usará os chunks): {erro}")
+
+
 # ==========================================
 # FUNÇÃO PRINCIPAL DE ORQUESTRAÇÃO
 # ==========================================
@@ -612,6 +666,7 @@ def processar_documento_completo(
             "numero_paginas": int,              # Total de páginas processadas
             "numero_chunks": int,               # Chunks gerados
             "numero_caracteres": int,           # Caracteres extraídos
+            "tokens_boilerplate_economizados": int,  # Cabeçalhos/rodapés removidos
             "confianca_media": float,           # Confiança (OCR) ou 1.0
             "tempo_processamento_segundos": float,  # Duração total
             "ids_chunks_armazenados": list[str],    # IDs no ChromaDB
@@ -679,17 +734,23 @@ def processar_documento_completo(
         
         try:
             # Processar texto completo: chunking + embeddings
+            # textos_por_pagina permite remover cabeçalhos/rodapés repetidos
             resultado_vetorizacao = servico_vetorizacao.processar_texto_completo(
                 texto=texto_extraido,
-                usar_cache=True
+                usar_cache=True,
+                textos_por_pagina=resultado_extracao.get("textos_por_pagina")
             )
             
             chunks = resultado_vetorizacao["chunks"]
             embeddings = resultado_vetorizacao["embeddings"]
             numero_chunks = len(chunks)
+            tokens_boilerplate_economizados = resultado_vetorizacao.get(
+                "tokens_boilerplate_economizados", 0
+            )
             
             logger.info(f"[ETAPA 3/5] ✓ Vetorização concluída")
             logger.info(f"            Chunks gerados: {numero_chunks}")
+            logger.info(f"            Tokens de boilerplate economizados: {tokens_boilerplate_economizados}")
             logger.info(f"            Dimensão embeddings: {len(embeddings[0]) if embeddings else 0}")
             
         except servico_vetorizacao.ErroDeVetorizacao as erro:
@@ -703,8 +764,8 @@ def processar_documento_completo(
         logger.info("[ETAPA 4/5] Armazenando no ChromaDB...")
         
         try:
-            # Inicializar ChromaDB
-            cliente_chroma, collection_chroma = servico_banco_vetorial.inicializar_chromadb()
+            # ChromaDB compartilhado (singleton criado no startup)
+            cliente_chroma, collection_chroma = servico_banco_vetorial.obter_servico_banco_vetorial()
             
             # Preparar metadados completos para cada chunk
             # Cada chunk terá metadados individuais + metadados do documento
@@ -729,7 +790,9 @@ def processar_documento_completo(
                 collection=collection_chroma,
                 chunks=chunks,
                 embeddings=embeddings,
-                metadados=metadados_documento
+                metadados=metadados_documento,
+                metadados_por_chunk=resultado_vetorizacao.get("metadados_chunks"),
+                estatisticas_documento=calcular_estatisticas_documento(resultado_vetorizacao)
             )
             
             logger.info(f"[ETAPA 4/5] ✓ Armazenamento concluído")
@@ -740,6 +803,8 @@ def processar_documento_completo(
             logger.error(mensagem_erro)
             raise ErroDeArmazenamentoNaIngestao(mensagem_erro) from erro
         
+        salvar_texto_canonico_do_documento(documento_id, resultado_vetorizacao)
+        
         # ==========================================
         # ETAPA 5: COMPILAR RESULTADO FINAL
         # ==========================================
@@ -758,6 +823,7 @@ def processar_documento_completo(
             "numero_paginas": numero_paginas,
             "numero_chunks": numero_chunks,
             "numero_caracteres": len(texto_extraido),
+            "tokens_boilerplate_economizados": tokens_boilerplate_economizados,
             "confianca_media": confianca_media,
             "tempo_processamento_segundos": round(tempo_processamento, 2),
             "ids_chunks_armazenados": ids_chunks_armazenados,
@@ -1004,16 +1070,24 @@ def processar_documento_em_background(
         
         # Processar texto completo: chunking + embeddings
         # NOTA: servico_vetorizacao faz AMBOS chunking E geração de embeddings
+        # textos_por_pagina permite remover cabeçalhos/rodapés repetidos
         resultado_vetorizacao = servico_vetorizacao.processar_texto_completo(
             texto=texto_extraido,
-            usar_cache=True
+            usar_cache=True,
+            textos_por_pagina=resultado_extracao.get("textos_por_pagina")
         )
         
         chunks = resultado_vetorizacao["chunks"]
         embeddings = resultado_vetorizacao["embeddings"]
         numero_chunks = len(chunks)
+        tokens_boilerplate_economizados = resultado_vetorizacao.get(
+            "tokens_boilerplate_economizados", 0
+        )
         
-        logger.info(f"[BACKGROUND] Texto dividido em {numero_chunks} chunks")
+        logger.info(
+            f"[BACKGROUND] Texto dividido em {numero_chunks} chunks "
+            f"({tokens_boilerplate_economizados} tokens de boilerplate economizados)"
+        )
         
         # Atualizar progresso após chunking (progresso intermediário)
         progresso_atual = 70 if metodo_usado == "ocr" else 50
@@ -1064,8 +1138,8 @@ def processar_documento_em_background(
             progresso=progresso_atual
         )
         
-        # Inicializar ChromaDB
-        cliente_chroma, collection_chroma = servico_banco_vetorial.inicializar_chromadb()
+        # ChromaDB compartilhado (singleton criado no startup)
+        cliente_chroma, collection_chroma = servico_banco_vetorial.obter_servico_banco_vetorial()
         
         # Preparar metadados
         data_processamento_iso = datetime.now().isoformat()
@@ -1095,7 +1169,9 @@ def processar_documento_em_background(
             collection=collection_chroma,
             chunks=chunks,
             embeddings=embeddings,
-            metadados=metadados_documento
+            metadados=metadados_documento,
+            metadados_por_chunk=resultado_vetorizacao.get("metadados_chunks"),
+            estatisticas_documento=calcular_estatisticas_documento(resultado_vetorizacao)
         )
         
         # Reportar progresso após armazenamento
@@ -1107,6 +1183,8 @@ def processar_documento_em_background(
         )
         logger.info(f"[BACKGROUND] {len(ids_chunks_armazenados)} chunks armazenados no ChromaDB")
         
+        salvar_texto_canonico_do_documento(documento_id, resultado_vetorizacao)
+        
         # Finalização (100%)
         logger.info("[BACKGROUND] Finalizando processamento...")
         gerenciador.atualizar_progresso(
@@ -1125,6 +1203,7 @@ def processar_documento_em_background(
             "numero_paginas": numero_paginas,
             "numero_chunks": numero_chunks,
             "numero_caracteres": len(texto_extraido),
+            "tokens_boilerplate_economizados": tokens_boilerplate_economizados,
             "confianca_media": confianca_media,
             "ids_chunks_armazenados": ids_chunks_armazenados,
             "data_processamento": data_processamento_iso,
@@ -457,6 +457,7 @@ def extrair_texto_de_pdf_escaneado(
             "numero_de_paginas": int,                       # Total de páginas processadas
             "confianca_media": float,                       # Média de confiança do OCR (0-100)
             "confiancas_por_pagina": list[float],          # Lista de confiança de cada página
+            "textos_por_pagina": list[str],                # Texto reconhecido em cada página
             "paginas_com_baixa_confianca": list[int],      # Índices (1-based) de páginas problemáticas
             "numero_total_palavras": int,                   # Total de palavras extraídas
             "idioma_ocr": str,                              # Idioma usado no OCR
@@ -591,6 +592,7 @@ def extrair_texto_de_pdf_escaneado(
             "numero_de_paginas": numero_de_paginas,
             "confianca_media": round(confianca_media, 2),
             "confiancas_por_pagina": [round(c, 2) for c in confiancas_por_pagina],
+            "textos_por_pagina": textos_por_pagina,
             "paginas_com_baixa_confianca": paginas_com_baixa_confianca,
             "numero_total_palavras": numero_total_palavras,
             "idioma_ocr": idioma,
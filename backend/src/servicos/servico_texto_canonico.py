@@ -0,0 +1,235 @@
+"""
+Serviço de Texto Canônico - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Os orquestradores (análise de petição, documentos relevantes) precisam do
+TEXTO COMPLETO de petições e documentos para montar o contexto dos agentes.
+Reconstruir esse texto juntando os chunks do ChromaDB tem dois problemas:
+1. Chunks consecutivos se sobrepõem (CHUNK_OVERLAP tokens), então o texto
+   reconstruído carrega ~10% de texto duplicado que vai para o LLM
+2. Exige uma busca por metadado (full scan filtrado) na collection
+
+Este módulo guarda, no momento da ingestão, o texto processado de cada
+documento (após remoção de boilerplate, exatamente o texto que foi
+dividido em chunks) em um arquivo comprimido por documento_id.
+
+IMPLEMENTAÇÃO:
+- Um arquivo gzip por documento: {CAMINHO_TEXTOS_CANONICOS}/{documento_id}.txt.gz
+- Escrita atômica (arquivo temporário + os.replace): leitores nunca veem
+  um arquivo pela metade
+- Leitura por ID é um open + descompressão (sem consulta ao ChromaDB)
+- Os offsets dos chunks (offset_inicio/offset_fim) referem-se a este texto
+- Backend NumPy (BACKEND_BANCO_VETORIAL=numpy): os textos ficam num dict em
+  memória, já que os vetores também não sobrevivem a um restart
+
+PADRÃO DE USO:
+```python
+from src.servicos import servico_texto_canonico
+
+servico_texto_canonico.salvar_texto_canonico("abc-123", texto_processado)
+texto = servico_texto_canonico.obter_texto_canonico("abc-123")  # None se ausente
+```
+
+IMPORTANTE:
+Documentos ingeridos antes deste serviço não têm texto canônico. Para eles,
+use servico_banco_vetorial.obter_texto_completo_do_documento(), que cai para
+a reconstrução a partir dos chunks (removendo o overlap).
+"""
+
+import gzip
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== EXCEÇÕES CUSTOMIZADAS =====
+
+class ErroDeTextoCanonico(Exception):
+    """
+    Erro ao salvar, ler ou remover o texto canônico de um documento.
+
+    CENÁRIOS COMUNS:
+    - documento_id com caracteres inválidos (ex: "../")
+    - Diretório sem permissão de escrita
+    - Arquivo corrompido (gzip inválido)
+    """
+    pass
+
+
+# ===== CONSTANTES E CONFIGURAÇÕES =====
+
+configuracoes = obter_configuracoes()
+
+# Extensão dos arquivos de texto canônico
+EXTENSAO_TEXTO_CANONICO = ".txt.gz"
+
+# Nível de compressão gzip (6 = equilíbrio entre tamanho e velocidade)
+NIVEL_COMPRESSAO_TEXTO_CANONICO = 6
+
+# Backend NumPy: conteúdo comprimido por documento_id (nada vai para o disco)
+_textos_em_memoria: Dict[str, bytes] = {}
+_lock_textos_em_memoria = threading.Lock()
+
+# IDs aceitos: UUIDs e identificadores simples (impede path traversal)
+PADRAO_DOCUMENTO_ID_VALIDO = re.compile(r"^[A-Za-z0-9_.\-]+$")
+
+
+# ===== FUNÇÕES AUXILIARES =====
+
+def obter_caminho_texto_canonico(documento_id: str) -> Path:
+    """
+    Retorna o caminho do arquivo de texto canônico de um documento.
+
+    Args:
+        documento_id: ID único do documento
+
+    Returns:
+        Path: Caminho do arquivo .txt.gz
+
+    Raises:
+        ErroDeTextoCanonico: Se o documento_id for vazio ou tiver caracteres inválidos
+    """
+    if not documento_id or not PADRAO_DOCUMENTO_ID_VALIDO.match(documento_id) or documento_id in (".", ".."):
+        raise ErroDeTextoCanonico(f"documento_id inválido para texto canônico: '{documento_id}'")
+
+    return Path(configuracoes.CAMINHO_TEXTOS_CANONICOS) / f"{documento_id}{EXTENSAO_TEXTO_CANONICO}"
+
+
+# ===== FUNÇÕES PRINCIPAIS =====
+
+def salvar_texto_canonico(documento_id: str, texto: str) -> Dict[str, Any]:
+    """
+    Salva (ou substitui) o texto canônico comprimido de um documento.
+
+    IMPLEMENTAÇÃO:
+    Comprime em memória e grava em arquivo temporário no mesmo diretório;
+    os.replace() torna a troca atômica. O nome do temporário inclui processo
+    e thread: duas gravações simultâneas do mesmo documento não dividem o
+    mesmo arquivo temporário (a última a terminar vence).
+
+    Args:
+        documento_id: ID único do documento
+        texto: Texto processado do documento (o mesmo que foi dividido em chunks)
+
+    Returns:
+        dict: {"caminho" (None no backend NumPy), "bytes_originais", "bytes_comprimidos"}
+
+    Raises:
+        ErroDeTextoCanonico: Se o ID for inválido ou a gravação falhar
+    """
+    caminho = obter_caminho_texto_canonico(documento_id)
+    conteudo_original = texto.encode("utf-8")
+    conteudo_comprimido = gzip.compress(conteudo_original, compresslevel=NIVEL_COMPRESSAO_TEXTO_CANONICO)
+
+    if configuracoes.usa_armazenamento_em_memoria():
+        with _lock_textos_em_memoria:
+            _textos_em_memoria[documento_id] = conteudo_comprimido
+        return {
+            "caminho": None,
+            "bytes_originais": len(conteudo_original),
+            "bytes_comprimidos": len(conteudo_comprimido),
+        }
+
+    caminho_temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho_temporario.write_bytes(conteudo_comprimido)
+        os.replace(caminho_temporario, caminho)
+    except OSError as erro:
+        caminho_temporario.unlink(missing_ok=True)
+        mensagem_erro = f"Falha ao salvar texto canônico do documento '{documento_id}': {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeTextoCanonico(mensagem_erro) from erro
+
+    logger.debug(
+        f"Texto canônico salvo: {documento_id} "
+        f"({len(conteudo_original)} → {len(conteudo_comprimido)} bytes)"
+    )
+
+    return {
+        "caminho": str(caminho),
+        "bytes_originais": len(conteudo_original),
+        "bytes_comprimidos": len(conteudo_comprimido),
+    }
+
+
+def obter_texto_canonico(documento_id: str) -> Optional[str]:
+    """
+    Lê o texto canônico de um documento.
+
+    Args:
+        documento_id: ID único do documento
+
+    Returns:
+        Optional[str]: Texto completo, ou None se o documento não tiver texto
+        canônico (ex: ingerido antes deste serviço existir)
+
+    Raises:
+        ErroDeTextoCanonico: Se o ID for inválido ou o arquivo estiver corrompido
+    """
+    caminho = obter_caminho_texto_canonico(documento_id)
+
+    try:
+        if configuracoes.usa_armazenamento_em_memoria():
+            with _lock_textos_em_memoria:
+                conteudo_comprimido = _textos_em_memoria.get(documento_id)
+            if conteudo_comprimido is None:
+                return None
+        else:
+            conteudo_comprimido = caminho.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as erro:
+        mensagem_erro = f"Falha ao ler texto canônico do documento '{documento_id}': {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeTextoCanonico(mensagem_erro) from erro
+
+    try:
+        return gzip.decompress(conteudo_comprimido).decode("utf-8")
+    except (OSError, EOFError, UnicodeDecodeError) as erro:
+        mensagem_erro = f"Texto canônico corrompido para o documento '{documento_id}': {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeTextoCanonico(mensagem_erro) from erro
+
+
+def deletar_texto_canonico(documento_id: str) -> bool:
+    """
+    Remove o texto canônico de um documento.
+
+    Args:
+        documento_id: ID único do documento
+
+    Returns:
+        bool: True se o arquivo existia e foi removido, False se não existia
+
+    Raises:
+        ErroDeTextoCanonico: Se o ID for inválido ou a remoção falhar
+    """
+    caminho = obter_caminho_texto_canonico(documento_id)
+
+    if configuracoes.usa_armazenamento_em_memoria():
+        with _lock_textos_em_memoria:
+            return _textos_em_memoria.pop(documento_id, None) is not None
+
+    try:
+        caminho.unlink()
+    except FileNotFoundError:
+        return False
+    except OSError as erro:
+        mensagem_erro = f"Falha ao remover texto canônico do documento '{documento_id}': {erro}"
+        logger.error(mensagem_erro)
+        raise ErroDeTextoCanonico(mensagem_erro) from erro
+
+    logger.debug(f"Texto canônico removido: {documento_id}")
+    return True
@@ -9,14 +9,15 @@ ser divididos em "chunks" (pedaços menores) e transformados em vetores numéric
 (embeddings) para permitir busca semântica.
 
 RESPONSABILIDADES:
-1. Dividir textos longos em chunks de tamanho otimizado (500 tokens)
+1. Dividir textos longos em chunks de tamanho otimizado (500 tokens),
+   respeitando as seções da peça jurídica (DOS FATOS, DO DIREITO, ...)
 2. Gerar embeddings (vetores) usando OpenAI API
 3. Gerenciar cache de embeddings para reduzir custos
 4. Processar textos em batches para eficiência
 5. Tratar rate limits da OpenAI API
 
 PIPELINE DE VETORIZAÇÃO:
-Texto → Divisão em Chunks → Geração de Embeddings → Cache → Retorno
+Texto → Remoção de Boilerplate → Divisão em Chunks → Geração de Embeddings → Cache → Retorno
 
 DEPENDÊNCIAS:
 - langchain: Para chunking inteligente com TextSplitter
@@ -27,8 +28,11 @@ DEPENDÊNCIAS:
 
 import os
 import logging
+import bisect
 import hashlib
 import json
+import math
+import re
 import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
@@ -169,14 +173,15 @@ def validar_dependencias_vetorizacao() -> None:
     em vez de deixar o erro ocorrer durante processamento.
     
     VALIDAÇÕES:
-    1. LangChain instalado (para chunking)
+    1. LangChain instalado (para chunking com ESTRATEGIA_CHUNKING="recursiva")
     2. tiktoken instalado (para contagem de tokens)
     3. OpenAI SDK instalado (para gerar embeddings)
     
     Raises:
         DependenciaNaoInstaladaError: Se alguma dependência estiver faltando
     """
-    if RecursiveCharacterTextSplitter is None:
+    # LangChain só é necessário para a estratégia de chunking recursiva
+    if configuracoes.ESTRATEGIA_CHUNKING == "recursiva" and RecursiveCharacterTextSplitter is None:
         raise DependenciaNaoInstaladaError(
             "LangChain não está instalado. "
             "Instale com: pip install langchain"
@@ -339,6 +344,196 @@ def gerar_hash_texto(texto: str) -> str:
     return hash_hexadecimal
 
 
+# ==========================================
+# REMOÇÃO DE CABEÇALHOS, RODAPÉS E BOILERPLATE
+# ==========================================
+# PDFs de tribunais repetem em TODAS as páginas o mesmo cabeçalho (nome do
+# tribunal, número do processo) e o mesmo carimbo de assinatura digital
+# ("Assinado eletronicamente por..."). Sem limpeza, esse texto é dividido em
+# chunks, vetorizado e recuperado como se fosse conteúdo, gastando tokens de
+# embedding, espaço no índice e tokens de prompt.
+
+# Normalização usada para comparar linhas entre páginas:
+# dígitos viram "#" para que "Pág. 3" e "Pág. 4" sejam a mesma linha
+PADRAO_DIGITOS = re.compile(r"\d+")
+PADRAO_ESPACOS = re.compile(r"\s+")
+
+# Carimbos e rodapés típicos de sistemas processuais (PJe, e-SAJ, Projudi).
+# Linhas que casam com estes padrões são boilerplate mesmo que o conteúdo
+# varie entre páginas (ex: código de verificação diferente em cada folha).
+# Os padrões são aplicados à linha JÁ NORMALIZADA (minúsculas, dígitos = "#").
+PADROES_BOILERPLATE_JURIDICO: List[re.Pattern] = [
+    re.compile(r"^assinado eletronicamente por", re.IGNORECASE),
+    re.compile(r"^documento assinado digitalmente", re.IGNORECASE),
+    re.compile(r"^este documento (foi|é) (gerado|assinado)", re.IGNORECASE),
+    re.compile(r"^para conferir o original, acesse", re.IGNORECASE),
+    re.compile(r"^num\. # - p[áa]g\. #", re.IGNORECASE),
+    re.compile(r"^(p[áa]g(ina)?|fls?)\.? ?# ?(de|/) ?#$", re.IGNORECASE),
+    re.compile(r"^https?://\S+/(documento|consultadocumento|pje|esaj)\S*$", re.IGNORECASE),
+]
+
+# Documentos com menos páginas que isso não têm repetição suficiente
+# para distinguir cabeçalho de conteúdo
+NUMERO_MINIMO_PAGINAS_BOILERPLATE: int = 4
+
+# Tamanho mínimo (linha normalizada) para uma linha ser boilerplate apenas por
+# se repetir entre as páginas. Marcadores jurídicos curtos ("§ 1º", "Art. 5º",
+# "DOS PEDIDOS", enumeradores) também se repetem depois que os dígitos viram
+# "#", mas são conteúdo. Linhas curtas só saem se casarem com um padrão de
+# PADROES_BOILERPLATE_JURIDICO (ex: "Pág. 3 de 10").
+NUMERO_MINIMO_CARACTERES_LINHA_BOILERPLATE: int = 16
+
+
+def normalizar_linha_para_boilerplate(linha: str) -> str:
+    """
+    Normaliza uma linha para detecção de repetição entre páginas.
+    
+    Args:
+        linha: Linha original do texto extraído
+    
+    Returns:
+        str: Linha em minúsculas, espaços colapsados e dígitos trocados por "#"
+    """
+    linha_normalizada = PADRAO_ESPACOS.sub(" ", linha).strip().lower()
+    return PADRAO_DIGITOS.sub("#", linha_normalizada)
+
+
+def remover_boilerplate_repetido(
+    textos_por_pagina: List[str],
+    fracao_minima_paginas: Optional[float] = None,
+    manter_uma_ocorrencia: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Remove cabeçalhos, rodapés e carimbos que se repetem entre as páginas.
+    
+    CONTEXTO DE NEGÓCIO:
+    Roda APÓS a extração de texto e ANTES de dividir_texto_em_chunks().
+    Reduz custo de embeddings, tamanho do índice e tokens enviados aos
+    agentes, sem perder conteúdo jurídico.
+    
+    IMPLEMENTAÇÃO:
+    1. Cada linha é normalizada (normalizar_linha_para_boilerplate)
+    2. Conta em quantas PÁGINAS distintas cada linha normalizada aparece
+    3. É boilerplate a linha com pelo menos NUMERO_MINIMO_CARACTERES_LINHA_BOILERPLATE
+       caracteres presente em >= fracao_minima_paginas das páginas, ou que
+       casa com um padrão conhecido de carimbo processual
+       (PADROES_BOILERPLATE_JURIDICO) e aparece em mais de uma página
+    4. Boilerplate é removido de todas as páginas; se manter_uma_ocorrencia,
+       a primeira ocorrência é preservada (o nome do tribunal ainda é útil)
+    5. Tokens economizados = tokens(texto original) - tokens(texto limpo)
+    
+    Args:
+        textos_por_pagina: Texto de cada página, na ordem do documento
+        fracao_minima_paginas: Fração de páginas a partir da qual uma linha é
+                               considerada repetida (padrão: .env)
+        manter_uma_ocorrencia: Se True, mantém a primeira ocorrência (padrão: .env)
+    
+    Returns:
+        dict contendo:
+        {
+            "textos_por_pagina": list[str],     # Páginas sem boilerplate
+            "texto_limpo": str,                 # Páginas não vazias unidas por "\n\n"
+            "linhas_boilerplate": list[str],    # Linhas detectadas (forma original)
+            "numero_linhas_removidas": int,     # Ocorrências removidas
+            "tokens_originais": int,            # Tokens antes da limpeza
+            "tokens_economizados": int          # Tokens removidos
+        }
+    
+    Example:
+        >>> paginas = ["TRIBUNAL X\nFatos...", "TRIBUNAL X\nDireito...", "TRIBUNAL X\nPedidos..."]
+        >>> remover_boilerplate_repetido(paginas, manter_uma_ocorrencia=False)["textos_por_pagina"]
+        ["Fatos...", "Direito...", "Pedidos..."]
+    """
+    if fracao_minima_paginas is None:
+        fracao_minima_paginas = configuracoes.FRACAO_MINIMA_PAGINAS_BOILERPLATE
+    if manter_uma_ocorrencia is None:
+        manter_uma_ocorrencia = configuracoes.BOILERPLATE_MANTER_UMA_OCORRENCIA
+    
+    texto_original = "\n\n".join(texto for texto in textos_por_pagina if texto and texto.strip())
+    tokens_originais = contar_tokens(texto_original)
+    
+    resultado_sem_alteracao = {
+        "textos_por_pagina": list(textos_por_pagina),
+        "texto_limpo": texto_original,
+        "linhas_boilerplate": [],
+        "numero_linhas_removidas": 0,
+        "tokens_originais": tokens_originais,
+        "tokens_economizados": 0
+    }
+    
+    paginas_com_texto = [texto for texto in textos_por_pagina if texto and texto.strip()]
+    if len(paginas_com_texto) < NUMERO_MINIMO_PAGINAS_BOILERPLATE:
+        return resultado_sem_alteracao
+    
+    # Passo 1-2: em quantas páginas cada linha normalizada aparece
+    linhas_por_pagina: List[List[str]] = [texto.splitlines() for texto in textos_por_pagina]
+    paginas_por_linha: Dict[str, int] = {}
+    forma_original_por_linha: Dict[str, str] = {}
+    
+    for linhas in linhas_por_pagina:
+        for linha_normalizada in {normalizar_linha_para_boilerplate(linha) for linha in linhas}:
+            if linha_normalizada:
+                paginas_por_linha[linha_normalizada] = paginas_por_linha.get(linha_normalizada, 0) + 1
+        for linha in linhas:
+            forma_original_por_linha.setdefault(normalizar_linha_para_boilerplate(linha), linha.strip())
+    
+    # Passo 3: classificar boilerplate
+    minimo_paginas = max(2, math.ceil(fracao_minima_paginas * len(paginas_com_texto)))
+    linhas_boilerplate = {
+        linha_normalizada
+        for linha_normalizada, numero_paginas in paginas_por_linha.items()
+        if (
+            numero_paginas >= minimo_paginas
+            and len(linha_normalizada) >= NUMERO_MINIMO_CARACTERES_LINHA_BOILERPLATE
+        )
+        or (
+            numero_paginas >= 2
+            and any(padrao.search(linha_normalizada) for padrao in PADROES_BOILERPLATE_JURIDICO)
+        )
+    }
+    
+    if not linhas_boilerplate:
+        return resultado_sem_alteracao
+    
+    # Passo 4: remover ocorrências (preservando a primeira, se configurado)
+    linhas_ja_mantidas = set()
+    numero_linhas_removidas = 0
+    textos_limpos: List[str] = []
+    
+    for linhas in linhas_por_pagina:
+        linhas_mantidas: List[str] = []
+        for linha in linhas:
+            linha_normalizada = normalizar_linha_para_boilerplate(linha)
+            if linha_normalizada in linhas_boilerplate:
+                if manter_uma_ocorrencia and linha_normalizada not in linhas_ja_mantidas:
+                    linhas_ja_mantidas.add(linha_normalizada)
+                    linhas_mantidas.append(linha)
+                else:
+                    numero_linhas_removidas += 1
+                continue
+            linhas_mantidas.append(linha)
+        textos_limpos.append("\n".join(linhas_mantidas).strip())
+    
+    # Passo 5: medir economia
+    texto_limpo = "\n\n".join(texto for texto in textos_limpos if texto)
+    tokens_economizados = tokens_originais - contar_tokens(texto_limpo)
+    
+    logger.info(
+        f"Boilerplate removido: {len(linhas_boilerplate)} linha(s) repetida(s), "
+        f"{numero_linhas_removidas} ocorrência(s), {tokens_economizados} tokens economizados "
+        f"({tokens_economizados / max(tokens_originais, 1):.1%})"
+    )
+    
+    return {
+        "textos_por_pagina": textos_limpos,
+        "texto_limpo": texto_limpo,
+        "linhas_boilerplate": sorted(forma_original_por_linha[linha] for linha in linhas_boilerplate),
+        "numero_linhas_removidas": numero_linhas_removidas,
+        "tokens_originais": tokens_originais,
+        "tokens_economizados": tokens_economizados
+    }
+
+
 # ==========================================
 # FUNÇÕES PRINCIPAIS - CHUNKING
 # ==========================================
@@ -458,6 +653,356 @@ def dividir_texto_em_chunks(
         ) from erro
 
 
+# ==========================================
+# CHUNKING POR SEÇÕES JURÍDICAS
+# ==========================================
+# Petições brasileiras seguem uma estrutura previsível ("DOS FATOS",
+# "DO DIREITO", "DOS PEDIDOS", "DO VALOR DA CAUSA"). O splitter recursivo
+# genérico corta através dessas fronteiras; esta estratégia divide o texto
+# DENTRO de cada seção, preferindo cortar em dispositivos ("Art.", "§",
+# incisos) e inícios de parágrafo. Cada chunk registra sua seção e página,
+# permitindo que agentes recuperem, por exemplo, apenas os pedidos.
+
+# Título de seção: numeração opcional (romana, arábica ou "1.2") seguida
+# de "DO/DA/DOS/DAS ..." ou de um título avulso conhecido, tudo em maiúsculas
+PADRAO_TITULO_SECAO = re.compile(
+    r"^(?:(?:[IVXLC]+|\d+(?:\.\d+)*)\s*[-–—.)]\s*)?"
+    r"((?:D[OA]S?\s+\S.*)|PRELIMINARMENTE|PRELIMINARES|NO M[ÉE]RITO|M[ÉE]RITO|"
+    r"REQUERIMENTOS|PEDIDOS|FATOS|FUNDAMENTA[ÇC][ÃA]O|RELAT[ÓO]RIO|DISPOSITIVO|"
+    r"EMENTA|CONCLUS[ÃA]O)\s*[:.]?$"
+)
+
+# Tamanho máximo (caracteres) de uma linha para ser considerada título
+TAMANHO_MAXIMO_TITULO_SECAO: int = 80
+
+# Marcadores de dispositivos legais: pontos de corte preferenciais
+PADRAO_MARCADOR_DISPOSITIVO = re.compile(
+    r"^(?:Art\.?\s*\d|§|Par[áa]grafo\s+[úu]nico|[IVXLC]+\s*[-–—]\s|inciso\b|[a-z]\)\s)",
+    re.IGNORECASE
+)
+
+# Seção atribuída ao texto anterior ao primeiro título (qualificação das partes)
+SECAO_PREAMBULO: str = "PREÂMBULO"
+
+# Separa frases para dividir linhas longas demais para um único chunk
+PADRAO_FIM_DE_FRASE = re.compile(r"(?<=[.;:!?])\s+")
+
+
+def detectar_titulo_secao(linha: str) -> Optional[str]:
+    """
+    Verifica se uma linha é um título de seção jurídica.
+    
+    Args:
+        linha: Linha do documento
+    
+    Returns:
+        str | None: Nome normalizado da seção (ex: "DOS PEDIDOS") ou None
+    
+    Example:
+        >>> detectar_titulo_secao("III - DOS PEDIDOS:")
+        "DOS PEDIDOS"
+        >>> detectar_titulo_secao("Dos fatos narrados pelo autor")
+        None
+    """
+    linha_limpa = PADRAO_ESPACOS.sub(" ", linha).strip()
+    if not linha_limpa or len(linha_limpa) > TAMANHO_MAXIMO_TITULO_SECAO:
+        return None
+    
+    # Títulos são escritos inteiramente em maiúsculas
+    if linha_limpa != linha_limpa.upper():
+        return None
+    
+    correspondencia = PADRAO_TITULO_SECAO.match(linha_limpa)
+    if not correspondencia:
+        return None
+    
+    titulo = correspondencia.group(1).strip().rstrip(":.").strip()
+    
+    # Frases em caixa alta terminadas em vírgula/ponto e vírgula não são títulos
+    if titulo.endswith((",", ";")):
+        return None
+    
+    return titulo
+
+
+def detectar_secoes_juridicas(texto: str) -> List[Tuple[int, str]]:
+    """
+    Localiza os títulos de seção de um documento.
+    
+    Args:
+        texto: Texto completo do documento
+    
+    Returns:
+        list[tuple[int, str]]: (offset do início da seção, nome da seção),
+        em ordem. O primeiro item é sempre (0, SECAO_PREAMBULO) quando o
+        documento não começa com um título.
+    """
+    secoes: List[Tuple[int, str]] = []
+    offset = 0
+    
+    for linha in texto.splitlines(keepends=True):
+        titulo = detectar_titulo_secao(linha)
+        if titulo:
+            secoes.append((offset, titulo))
+        offset += len(linha)
+    
+    if not secoes or secoes[0][0] > 0:
+        secoes.insert(0, (0, SECAO_PREAMBULO))
+    
+    return secoes
+
+
+def montar_texto_paginado(textos_por_pagina: List[str]) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Une as páginas em um único texto, registrando onde cada página começa.
+    
+    IMPLEMENTAÇÃO:
+    Páginas vazias são omitidas (mas a numeração original é preservada).
+    As páginas são unidas por "\n\n", o mesmo formato da extração de PDFs.
+    
+    Args:
+        textos_por_pagina: Texto de cada página, na ordem do documento
+    
+    Returns:
+        tuple: (texto_completo, [(offset_inicio, numero_pagina_1_indexado), ...])
+    """
+    partes: List[str] = []
+    inicios_paginas: List[Tuple[int, int]] = []
+    offset = 0
+    
+    for indice, texto_pagina in enumerate(textos_por_pagina):
+        texto_pagina = (texto_pagina or "").strip()
+        if not texto_pagina:
+            continue
+        if partes:
+            partes.append("\n\n")
+            offset += 2
+        inicios_paginas.append((offset, indice + 1))
+        partes.append(texto_pagina)
+        offset += len(texto_pagina)
+    
+    if not inicios_paginas:
+        inicios_paginas.append((0, 1))
+    
+    return "".join(partes), inicios_paginas
+
+
+def obter_numero_pagina_por_offset(offset: int, inicios_paginas: List[Tuple[int, int]]) -> int:
+    """
+    Retorna o número da página (1-indexado) que contém o offset informado.
+    
+    Args:
+        offset: Posição (caractere) no texto completo
+        inicios_paginas: Saída de montar_texto_paginado()
+    
+    Returns:
+        int: Número da página
+    """
+    posicao = bisect.bisect_right([inicio for inicio, _ in inicios_paginas], offset) - 1
+    return inicios_paginas[max(posicao, 0)][1]
+
+
+def _dividir_unidade_longa(
+    texto: str,
+    inicio: int,
+    fim: int,
+    tamanho_chunk: int
+) -> List[Tuple[int, int, int]]:
+    """
+    Divide uma linha que sozinha excede tamanho_chunk em pedaços menores.
+    
+    Tenta cortar em fins de frase; frases ainda grandes demais são cortadas
+    em palavras.
+    
+    Returns:
+        list[tuple[int, int, int]]: (inicio, fim, tokens) de cada pedaço
+    """
+    pedacos: List[Tuple[int, int, int]] = []
+    inicio_frase = inicio
+    fronteiras = [inicio + m.end() for m in PADRAO_FIM_DE_FRASE.finditer(texto[inicio:fim])] + [fim]
+    
+    for fim_frase in fronteiras:
+        tokens_frase = contar_tokens(texto[inicio_frase:fim_frase])
+        if tokens_frase <= tamanho_chunk:
+            pedacos.append((inicio_frase, fim_frase, tokens_frase))
+        else:
+            # Frase gigante (ex: lista sem pontuação): cortar em palavras
+            inicio_pedaco = inicio_frase
+            tokens_pedaco = 0
+            fim_pedaco = inicio_frase
+            for palavra in re.finditer(r"\S+\s*", texto[inicio_frase:fim_frase]):
+                tokens_palavra = contar_tokens(palavra.group())
+                if tokens_pedaco + tokens_palavra > tamanho_chunk and fim_pedaco > inicio_pedaco:
+                    pedacos.append((inicio_pedaco, fim_pedaco, tokens_pedaco))
+                    inicio_pedaco = fim_pedaco
+                    tokens_pedaco = 0
+                tokens_pedaco += tokens_palavra
+                fim_pedaco = inicio_frase + palavra.end()
+            if fim_pedaco > inicio_pedaco:
+                pedacos.append((inicio_pedaco, fim_pedaco, tokens_pedaco))
+        inicio_frase = fim_frase
+    
+    return pedacos
+
+
+def dividir_texto_em_chunks_por_secao(
+    texto: str,
+    tamanho_chunk: Optional[int] = None,
+    chunk_overlap: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Divide um documento jurídico em chunks que respeitam as seções.
+    
+    CONTEXTO DE NEGÓCIO:
+    Um chunk que mistura o fim de "DOS FATOS" com o início de "DO DIREITO"
+    é recuperado com menos precisão e não pode ser filtrado por seção.
+    Aqui nenhum chunk atravessa uma fronteira de seção.
+    
+    IMPLEMENTAÇÃO:
+    1. Detecta títulos de seção (detectar_secoes_juridicas)
+    2. Dentro de cada seção, cada linha não vazia é uma unidade; linhas
+       maiores que tamanho_chunk são divididas em frases/palavras
+    3. Unidades são agrupadas gulosamente até tamanho_chunk tokens
+    4. Ao fechar um chunk, recua até o último ponto de corte preferencial
+       (dispositivo "Art."/"§"/inciso ou início de parágrafo) da metade
+       final do chunk, se houver
+    5. Overlap: o próximo chunk repete as últimas unidades do anterior
+       (até chunk_overlap tokens), sem nunca cruzar a seção
+    Cada chunk é uma fatia CONTÍGUA do texto (texto[inicio:fim]).
+    
+    Args:
+        texto: Texto completo do documento
+        tamanho_chunk: Tamanho máximo de cada chunk em tokens (padrão: .env)
+        chunk_overlap: Overlap entre chunks da mesma seção em tokens (padrão: .env)
+    
+    Returns:
+        list[dict]: Um dict por chunk:
+        {
+            "texto": str,     # Conteúdo do chunk
+            "secao": str,     # Seção de origem (ex: "DOS PEDIDOS")
+            "inicio": int,    # Offset do primeiro caractere no texto
+            "fim": int        # Offset após o último caractere
+        }
+    """
+    tamanho_chunk = tamanho_chunk or TAMANHO_MAXIMO_CHUNK
+    chunk_overlap = chunk_overlap if chunk_overlap is not None else CHUNK_OVERLAP
+    
+    if not texto or not texto.strip():
+        logger.warning("Texto vazio fornecido para chunking por seções")
+        return []
+    
+    secoes = detectar_secoes_juridicas(texto)
+    chunks: List[Dict[str, Any]] = []
+    
+    for indice_secao, (inicio_secao, nome_secao) in enumerate(secoes):
+        fim_secao = secoes[indice_secao + 1][0] if indice_secao + 1 < len(secoes) else len(texto)
+        
+        # Passo 2: unidades (inicio, fim, tokens, corte_preferencial)
+        unidades: List[Tuple[int, int, int, bool]] = []
+        linha_anterior_vazia = True
+        offset = inicio_secao
+        for linha in texto[inicio_secao:fim_secao].splitlines(keepends=True):
+            inicio_linha, fim_linha = offset, offset + len(linha.rstrip("\r\n"))
+            offset += len(linha)
+            
+            if not linha.strip():
+                linha_anterior_vazia = True
+                continue
+            
+            corte_preferencial = linha_anterior_vazia or bool(
+                PADRAO_MARCADOR_DISPOSITIVO.match(linha.strip())
+            )
+            linha_anterior_vazia = False
+            
+            tokens_linha = contar_tokens(texto[inicio_linha:fim_linha])
+            if tokens_linha <= tamanho_chunk:
+                unidades.append((inicio_linha, fim_linha, tokens_linha, corte_preferencial))
+            else:
+                for posicao, (inicio_p, fim_p, tokens_p) in enumerate(
+                    _dividir_unidade_longa(texto, inicio_linha, fim_linha, tamanho_chunk)
+                ):
+                    unidades.append((inicio_p, fim_p, tokens_p, corte_preferencial and posicao == 0))
+        
+        # Passos 3-5: agrupamento guloso com recuo e overlap
+        i = 0
+        while i < len(unidades):
+            j = i
+            tokens_chunk = 0
+            while j < len(unidades) and (j == i or tokens_chunk + unidades[j][2] <= tamanho_chunk):
+                tokens_chunk += unidades[j][2]
+                j += 1
+            
+            if j < len(unidades):
+                metade = i + (j - i) // 2
+                cortes = [k for k in range(metade + 1, j) if unidades[k][3]]
+                if cortes:
+                    j = cortes[-1]
+            
+            inicio_chunk, fim_chunk = unidades[i][0], unidades[j - 1][1]
+            chunks.append({
+                "texto": texto[inicio_chunk:fim_chunk],
+                "secao": nome_secao,
+                "inicio": inicio_chunk,
+                "fim": fim_chunk
+            })
+            
+            if j >= len(unidades):
+                break
+            
+            # Overlap: recuar o início do próximo chunk (garantindo progresso)
+            proximo_inicio = j
+            tokens_overlap = 0
+            while (
+                proximo_inicio - 1 > i
+                and tokens_overlap + unidades[proximo_inicio - 1][2] <= chunk_overlap
+            ):
+                proximo_inicio -= 1
+                tokens_overlap += unidades[proximo_inicio][2]
+            i = proximo_inicio
+    
+    logger.info(
+        f"✅ Chunking por seções concluído: {len(chunks)} chunks em "
+        f"{len(secoes)} seção(ões) ({', '.join(nome for _, nome in secoes)})"
+    )
+    
+    return chunks
+
+
+def localizar_chunks_no_texto(texto: str, chunks: List[str]) -> List[Dict[str, Any]]:
+    """
+    Calcula offsets de chunks gerados pelo splitter recursivo.
+    
+    CONTEXTO:
+    O RecursiveCharacterTextSplitter devolve apenas strings. Para atribuir
+    seção e página, cada chunk é localizado no texto a partir da posição
+    do chunk anterior (os chunks estão em ordem e podem se sobrepor).
+    
+    Returns:
+        list[dict]: {"texto", "secao", "inicio", "fim"} para cada chunk
+    """
+    secoes = detectar_secoes_juridicas(texto)
+    inicios_secoes = [inicio for inicio, _ in secoes]
+    chunks_localizados: List[Dict[str, Any]] = []
+    cursor = 0
+    
+    for chunk in chunks:
+        inicio = texto.find(chunk, cursor)
+        if inicio < 0:
+            inicio = max(texto.find(chunk), 0)
+        fim = inicio + len(chunk)
+        cursor = inicio + 1
+        
+        indice_secao = bisect.bisect_right(inicios_secoes, inicio) - 1
+        chunks_localizados.append({
+            "texto": chunk,
+            "secao": secoes[max(indice_secao, 0)][1],
+            "inicio": inicio,
+            "fim": fim
+        })
+    
+    return chunks_localizados
+
+
 # ==========================================
 # FUNÇÕES PRINCIPAIS - CACHE
 # ==========================================
@@ -721,7 +1266,8 @@ def gerar_embeddings(
 
 def processar_texto_completo(
     texto: str,
-    usar_cache: bool = True
+    usar_cache: bool = True,
+    textos_por_pagina: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Processa um texto completo: chunking + geração de embeddings.
@@ -731,11 +1277,25 @@ def processar_texto_completo(
     Ela é chamada pelo serviço de ingestão após extração de texto de documentos.
     
     PIPELINE:
-    Texto → Chunking → Geração de Embeddings → Retorno (chunks + embeddings)
+    Texto → Remoção de Boilerplate → Chunking → Geração de Embeddings → Retorno
+    
+    A remoção de boilerplate só acontece quando textos_por_pagina é informado
+    (é preciso saber onde cada página começa) e REMOCAO_BOILERPLATE_ATIVADA.
+    Com textos_por_pagina, o texto é reconstruído a partir das páginas e cada
+    chunk recebe o intervalo de páginas que cobre. Os offsets (caracteres)
+    referem-se a texto_processado e permitem reconstruir trechos contíguos
+    a partir de chunks vizinhos sem duplicar o overlap.
+    
+    O chunking segue ESTRATEGIA_CHUNKING:
+    - "recursiva": dividir_texto_em_chunks (LangChain, padrão)
+    - "secoes_juridicas": dividir_texto_em_chunks_por_secao
+    Em ambas, cada chunk recebe a seção jurídica de origem.
     
     Args:
         texto: Texto completo a ser processado
         usar_cache: Se True, usa cache de embeddings (padrão: True)
+        textos_por_pagina: Texto de cada página (opcional, habilita remoção
+                           de cabeçalhos/rodapés repetidos)
         
     Returns:
         dict contendo:
@@ -744,7 +1304,12 @@ def processar_texto_completo(
             "embeddings": list[list[float]],  # Embeddings dos chunks
             "numero_chunks": int,             # Total de chunks
             "numero_tokens": int,             # Total de tokens processados
-            "usou_cache": bool                # Se cache foi utilizado
+            "usou_cache": bool,               # Se cache foi utilizado
+            "texto_processado": str,          # Texto efetivamente dividido em chunks
+            "tokens_boilerplate_economizados": int,  # Tokens removidos como boilerplate
+            "metadados_chunks": list[dict]    # Por chunk: {"secao", "numero_pagina",
+                                              #   "pagina_inicial", "pagina_final",
+                                              #   "offset_inicio", "offset_fim"}
         }
         
     Raises:
@@ -764,9 +1329,39 @@ def processar_texto_completo(
     validar_dependencias_vetorizacao()
     validar_configuracoes_vetorizacao()
     
-    # Passo 1: Chunking
-    logger.info("Passo 1/2: Divisão em chunks")
-    chunks = dividir_texto_em_chunks(texto)
+    # Passo 0: Remoção de cabeçalhos/rodapés repetidos (quando há páginas)
+    tokens_boilerplate_economizados = 0
+    inicios_paginas: List[Tuple[int, int]] = [(0, 1)]
+    if textos_por_pagina:
+        if configuracoes.REMOCAO_BOILERPLATE_ATIVADA:
+            resultado_boilerplate = remover_boilerplate_repetido(textos_por_pagina)
+            if resultado_boilerplate["numero_linhas_removidas"] > 0:
+                textos_por_pagina = resultado_boilerplate["textos_por_pagina"]
+                tokens_boilerplate_economizados = resultado_boilerplate["tokens_economizados"]
+        
+        # Texto reconstruído a partir das páginas para saber onde cada uma começa
+        texto, inicios_paginas = montar_texto_paginado(textos_por_pagina)
+    
+    # Passo 1: Chunking (estratégia configurável)
+    logger.info(f"Passo 1/2: Divisão em chunks (estratégia: {configuracoes.ESTRATEGIA_CHUNKING})")
+    if configuracoes.ESTRATEGIA_CHUNKING == "secoes_juridicas":
+        chunks_localizados = dividir_texto_em_chunks_por_secao(texto)
+    else:
+        chunks_localizados = localizar_chunks_no_texto(texto, dividir_texto_em_chunks(texto))
+    
+    chunks = [chunk["texto"] for chunk in chunks_localizados]
+    metadados_chunks = []
+    for chunk in chunks_localizados:
+        pagina_inicial = obter_numero_pagina_por_offset(chunk["inicio"], inicios_paginas)
+        pagina_final = obter_numero_pagina_por_offset(max(chunk["fim"] - 1, chunk["inicio"]), inicios_paginas)
+        metadados_chunks.append({
+            "secao": chunk["secao"],
+            "numero_pagina": pagina_inicial,
+            "pagina_inicial": pagina_inicial,
+            "pagina_final": pagina_final,
+            "offset_inicio": chunk["inicio"],
+            "offset_fim": chunk["fim"]
+        })
     
     if not chunks:
         logger.warning("Nenhum chunk gerado. Texto vazio?")
@@ -775,7 +1370,10 @@ def processar_texto_completo(
             "embeddings": [],
             "numero_chunks": 0,
             "numero_tokens": 0,
-            "usou_cache": False
+            "usou_cache": False,
+            "texto_processado": texto,
+            "tokens_boilerplate_economizados": tokens_boilerplate_economizados,
+            "metadados_chunks": []
         }
     
     # Passo 2: Geração de embeddings
@@ -789,13 +1387,17 @@ def processar_texto_completo(
     logger.info(f"   Chunks gerados: {len(chunks)}")
     logger.info(f"   Embeddings gerados: {len(embeddings)}")
     logger.info(f"   Tokens processados: {numero_tokens}")
+    logger.info(f"   Tokens de boilerplate economizados: {tokens_boilerplate_economizados}")
     
     return {
         "chunks": chunks,
         "embeddings": embeddings,
         "numero_chunks": len(chunks),
         "numero_tokens": numero_tokens,
-        "usou_cache": usar_cache
+        "usou_cache": usar_cache,
+        "texto_processado": texto,
+        "tokens_boilerplate_economizados": tokens_boilerplate_economizados,
+        "metadados_chunks": metadados_chunks
     }
 
 
@@ -0,0 +1,507 @@
+"""
+Agendador Global de Chamadas ao LLM - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Cada análise de petição dispara 4 advogados + 2 peritos + estrategista +
+prognóstico + geração de documento. Cinco análises simultâneas somam 40+
+chamadas ao mesmo tempo: a OpenAI responde com rate limit, os retries
+pioram o congestionamento e TODOS ficam lentos, inclusive o usuário que
+só fez uma consulta rápida.
+
+RESPONSABILIDADES:
+1. Limitar quantas chamadas rodam ao mesmo tempo POR MODELO
+   (LLM_MAX_CHAMADAS_SIMULTANEAS_POR_MODELO / LLM_LIMITES_CHAMADAS_POR_MODELO)
+2. Pistas de prioridade: consulta interativa > análise de petição em
+   background. Uma vaga livre vai sempre para a pista de maior prioridade
+   que tem alguém esperando
+3. Fila justa por análise: dentro da mesma pista, as análises se revezam
+   (round-robin por id_fluxo), então uma petição com 9 agentes não passa
+   na frente de todas as outras
+4. Observabilidade: profundidade da fila, vagas em uso e tempo de espera
+   (p50/p95/p99) por pista
+
+COMO A PRIORIDADE CHEGA AQUI:
+Quem inicia uma análise declara a prioridade e o ID da análise com
+contexto_agendamento_llm(...). O valor fica numa ContextVar, herdada pelas
+corrotinas/tasks criadas dentro do bloco, então os agentes não precisam
+repassar nada: GerenciadorLLM lê o contexto ao chamar reservar().
+
+THREAD-SAFETY:
+Chamadas síncronas (threads) e assíncronas (vários event loops: a análise
+de petições roda em asyncio.run() próprio) disputam as mesmas vagas. O
+estado fica sob um threading.Lock; a espera usa threading.Event (síncrona)
+ou um Future acordado com loop.call_soon_threadsafe (assíncrona).
+
+CHAMADA SÍNCRONA DENTRO DE UM EVENT LOOP:
+reservar() chamado da thread de um event loop em execução (código async que
+chama chamar_llm() síncrono) NUNCA espera: a vaga só seria devolvida por
+tasks desse mesmo loop, que ficaria bloqueado (deadlock). O caminho correto
+no código async é chamar_llm_async() / reservar_async(). Se a chamada chegar
+mesmo assim:
+- modo estrito (LLM_AGENDADOR_ESTRITO; padrão em AMBIENTE=development):
+  levanta ErroChamadaSincronaNoEventLoop, para o chamador ser corrigido
+- senão: usa uma vaga livre se houver; se não houver, segue sem vaga, com um
+  aviso no log e na estatística "sem_vaga_no_event_loop"
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from src.configuracao.configuracoes import obter_configuracoes
+from src.utilitarios.telemetria_llm import HistogramaLatencia
+
+# Configuração do logger para este módulo
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# PRIORIDADES E CONTEXTO
+# ==============================================================================
+
+class PrioridadeLLM(IntEnum):
+    """
+    Pistas de prioridade do agendador (menor valor = atendida primeiro).
+    """
+    INTERATIVA = 0        # Consulta do usuário aguardando resposta (/api/analise)
+    ANALISE_PETICAO = 1   # Análise de petição em background (/api/peticoes)
+
+
+class ErroChamadaSincronaNoEventLoop(RuntimeError):
+    """
+    reservar() síncrono chamado de dentro de um event loop em modo estrito.
+
+    O chamador deve usar chamar_llm_async() / reservar_async().
+    """
+    pass
+
+
+# Fluxo atribuído às chamadas feitas fora de qualquer análise
+ID_FLUXO_PADRAO = "geral"
+
+_contexto_agendamento: ContextVar[Tuple[PrioridadeLLM, str]] = ContextVar(
+    "contexto_agendamento_llm",
+    default=(PrioridadeLLM.INTERATIVA, ID_FLUXO_PADRAO)
+)
+
+
+@contextmanager
+def contexto_agendamento_llm(prioridade: PrioridadeLLM, id_fluxo: str) -> Iterator[None]:
+    """
+    Define a prioridade e a análise (fluxo) das chamadas ao LLM feitas no bloco.
+
+    EXEMPLO:
+    ```python
+    with contexto_agendamento_llm(PrioridadeLLM.ANALISE_PETICAO, peticao_id):
+        resultado = await orquestrador.analisar_peticao_completa(...)
+    ```
+    """
+    token = _contexto_agendamento.set((prioridade, id_fluxo))
+    try:
+        yield
+    finally:
+        _contexto_agendamento.reset(token)
+
+
+def obter_contexto_agendamento_llm() -> Tuple[PrioridadeLLM, str]:
+    """
+    Retorna (prioridade, id_fluxo) vigentes no contexto atual.
+    """
+    return _contexto_agendamento.get()
+
+
+def _event_loop_em_execucao() -> bool:
+    """
+    True se a thread atual está executando um event loop (esperar nela o bloquearia).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# ==============================================================================
+# ESTRUTURAS INTERNAS
+# ==============================================================================
+
+@dataclass
+class _EsperaPorVaga:
+    """
+    Uma chamada aguardando vaga. acordar() é chamado (com o lock do
+    agendador adquirido) quando a vaga é concedida.
+    """
+    modelo: str
+    prioridade: PrioridadeLLM
+    id_fluxo: str
+    acordar: Callable[[], None]
+    inicio: float = field(default_factory=time.perf_counter)
+    concedida: bool = False
+
+
+@dataclass
+class _EstadoDoModelo:
+    """
+    Vagas e filas de um modelo: pista → (id_fluxo → chamadas em espera).
+
+    O OrderedDict de cada pista dá o round-robin: o fluxo atendido vai para o fim.
+    """
+    limite: int
+    em_uso: int = 0
+    pistas: Dict[PrioridadeLLM, "OrderedDict[str, Deque[_EsperaPorVaga]]"] = field(
+        default_factory=lambda: {prioridade: OrderedDict() for prioridade in PrioridadeLLM}
+    )
+
+    def profundidade(self, prioridade: Optional[PrioridadeLLM] = None) -> int:
+        pistas = [self.pistas[prioridade]] if prioridade is not None else list(self.pistas.values())
+        return sum(len(fila) for pista in pistas for fila in pista.values())
+
+
+# ==============================================================================
+# AGENDADOR
+# ==============================================================================
+
+class AgendadorChamadasLLM:
+    """
+    Limita chamadas simultâneas por modelo com pistas de prioridade e fila justa.
+
+    EXEMPLO DE USO:
+    ```python
+    agendador = obter_agendador_llm()
+
+    with agendador.reservar("gpt-4o-mini"):
+        resposta = cliente.chat.completions.create(...)
+
+    async with agendador.reservar_async("gpt-4o-mini"):
+        resposta = await cliente_async.chat.completions.create(...)
+    ```
+    """
+
+    def __init__(
+        self,
+        limite_padrao: int = 8,
+        limites_por_modelo: Optional[Dict[str, int]] = None,
+        estrito: bool = False
+    ):
+        """
+        Args:
+            limite_padrao: Chamadas simultâneas permitidas para modelos sem limite próprio
+            limites_por_modelo: Limites específicos (ex: {"gpt-4o": 4})
+            estrito: Se True, reservar() dentro de um event loop levanta
+                     ErroChamadaSincronaNoEventLoop em vez de seguir sem esperar
+
+        Raises:
+            ValueError: Se algum limite for menor que 1
+        """
+        limites = {**(limites_por_modelo or {}), "__padrao__": limite_padrao}
+        if any(limite < 1 for limite in limites.values()):
+            raise ValueError(f"Limites de chamadas simultâneas devem ser >= 1: {limites}")
+
+        self.limite_padrao = limite_padrao
+        self.limites_por_modelo = dict(limites_por_modelo or {})
+        self.estrito = estrito
+        self._lock = threading.Lock()
+        self._modelos: Dict[str, _EstadoDoModelo] = {}
+
+        # Observabilidade por pista
+        self._tempo_de_espera = {prioridade: HistogramaLatencia() for prioridade in PrioridadeLLM}
+        self._concedidas = {prioridade: 0 for prioridade in PrioridadeLLM}
+        self._sem_vaga_no_event_loop = {prioridade: 0 for prioridade in PrioridadeLLM}
+        self._profundidade_maxima = {prioridade: 0 for prioridade in PrioridadeLLM}
+
+    # ===== API PÚBLICA =====
+
+    @contextmanager
+    def reservar(
+        self,
+        modelo: str,
+        prioridade: Optional[PrioridadeLLM] = None,
+        id_fluxo: Optional[str] = None
+    ) -> Iterator[None]:
+        """
+        Aguarda (bloqueando a thread) uma vaga do modelo e a libera ao sair do bloco.
+
+        Na thread de um event loop em execução não espera (ver "CHAMADA
+        SÍNCRONA DENTRO DE UM EVENT LOOP" no topo do módulo).
+
+        Args:
+            modelo: Modelo da chamada (cada modelo tem suas vagas)
+            prioridade: Pista; None usa a do contexto_agendamento_llm
+            id_fluxo: Análise a que a chamada pertence; None usa a do contexto
+
+        Raises:
+            ErroChamadaSincronaNoEventLoop: Em modo estrito, se chamado de
+                dentro de um event loop em execução
+        """
+        evento = threading.Event()
+        espera = self._criar_espera(modelo, prioridade, id_fluxo, evento.set)
+        if _event_loop_em_execucao():
+            if self.estrito:
+                raise ErroChamadaSincronaNoEventLoop(
+                    f"Chamada síncrona ao LLM ({modelo}) dentro de um event loop: "
+                    f"use chamar_llm_async() / reservar_async()"
+                )
+            if not self._enfileirar(espera, entrar_na_fila=False):
+                self._registrar_sem_vaga_no_event_loop(espera)
+                yield
+                return
+        elif not self._enfileirar(espera):
+            evento.wait()
+        try:
+            yield
+        finally:
+            self._liberar_vaga(modelo)
+
+    @asynccontextmanager
+    async def reservar_async(
+        self,
+        modelo: str,
+        prioridade: Optional[PrioridadeLLM] = None,
+        id_fluxo: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        Versão assíncrona de reservar(): espera sem bloquear o event loop.
+
+        Se a task for cancelada durante a espera, a chamada sai da fila (ou
+        devolve a vaga, se ela já tinha sido concedida).
+        """
+        loop = asyncio.get_running_loop()
+        futuro: asyncio.Future = loop.create_future()
+
+        def resolver() -> None:
+            if not futuro.done():
+                futuro.set_result(None)
+
+        espera = self._criar_espera(modelo, prioridade, id_fluxo, lambda: loop.call_soon_threadsafe(resolver))
+        if not self._enfileirar(espera):
+            try:
+                await futuro
+            except asyncio.CancelledError:
+                self._desistir(espera)
+                raise
+        try:
+            yield
+        finally:
+            self._liberar_vaga(modelo)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """
+        Vagas, filas e tempos de espera (para o endpoint de métricas).
+
+        Returns:
+            dict com "por_modelo" (limite, em_uso, na_fila por pista) e
+            "por_prioridade" (concedidas, na_fila, profundidade máxima e
+            tempo de espera em segundos)
+        """
+        with self._lock:
+            return {
+                "limite_padrao": self.limite_padrao,
+                "estrito": self.estrito,
+                "por_modelo": {
+                    modelo: {
+                        "limite": estado.limite,
+                        "em_uso": estado.em_uso,
+                        "na_fila": {prioridade.name.lower(): estado.profundidade(prioridade) for prioridade in PrioridadeLLM},
+                    }
+                    for modelo, estado in self._modelos.items()
+                },
+                "por_prioridade": {
+                    prioridade.name.lower(): {
+                        "concedidas": self._concedidas[prioridade],
+                        "sem_vaga_no_event_loop": self._sem_vaga_no_event_loop[prioridade],
+                        "na_fila": sum(estado.profundidade(prioridade) for estado in self._modelos.values()),
+                        "profundidade_maxima": self._profundidade_maxima[prioridade],
+                        "tempo_de_espera_segundos": self._tempo_de_espera[prioridade].para_dict(),
+                    }
+                    for prioridade in PrioridadeLLM
+                },
+            }
+
+    # ===== IMPLEMENTAÇÃO =====
+
+    def _criar_espera(
+        self,
+        modelo: str,
+        prioridade: Optional[PrioridadeLLM],
+        id_fluxo: Optional[str],
+        acordar: Callable[[], None]
+    ) -> _EsperaPorVaga:
+        prioridade_do_contexto, fluxo_do_contexto = obter_contexto_agendamento_llm()
+        return _EsperaPorVaga(
+            modelo=modelo,
+            prioridade=prioridade if prioridade is not None else prioridade_do_contexto,
+            id_fluxo=id_fluxo or fluxo_do_contexto,
+            acordar=acordar,
+        )
+
+    def _obter_estado(self, modelo: str) -> _EstadoDoModelo:
+        """
+        Estado do modelo (criado no primeiro uso). Chamar com self._lock adquirido.
+        """
+        estado = self._modelos.get(modelo)
+        if estado is None:
+            estado = _EstadoDoModelo(limite=self.limites_por_modelo.get(modelo, self.limite_padrao))
+            self._modelos[modelo] = estado
+        return estado
+
+    def _registrar_sem_vaga_no_event_loop(self, espera: _EsperaPorVaga) -> None:
+        with self._lock:
+            self._sem_vaga_no_event_loop[espera.prioridade] += 1
+        logger.warning(
+            f"⚠️ Chamada síncrona ao LLM dentro de um event loop sem vaga livre: segue sem "
+            f"aguardar o agendador para não bloquear o loop | Modelo: {espera.modelo} | "
+            f"Prioridade: {espera.prioridade.name} | Fluxo: {espera.id_fluxo} "
+            f"(use chamar_llm_async no código assíncrono)"
+        )
+
+    def _enfileirar(self, espera: _EsperaPorVaga, entrar_na_fila: bool = True) -> bool:
+        """
+        Concede a vaga na hora ou coloca a chamada na fila.
+
+        Só concede na hora se ninguém do mesmo modelo está esperando:
+        quem chega não fura a fila.
+
+        Args:
+            espera: Chamada que pede a vaga
+            entrar_na_fila: False para só tentar a concessão imediata
+                           (chamada síncrona dentro de um event loop)
+
+        Returns:
+            bool: True se a vaga foi concedida imediatamente
+        """
+        with self._lock:
+            estado = self._obter_estado(espera.modelo)
+            if estado.em_uso < estado.limite and estado.profundidade() == 0:
+                estado.em_uso += 1
+                self._registrar_concessao(espera)
+                return True
+            if not entrar_na_fila:
+                return False
+
+            estado.pistas[espera.prioridade].setdefault(espera.id_fluxo, deque()).append(espera)
+            profundidade = sum(estado_modelo.profundidade(espera.prioridade) for estado_modelo in self._modelos.values())
+            self._profundidade_maxima[espera.prioridade] = max(self._profundidade_maxima[espera.prioridade], profundidade)
+
+        logger.debug(
+            f"⏳ Chamada ao LLM na fila | Modelo: {espera.modelo} | "
+            f"Prioridade: {espera.prioridade.name} | Fluxo: {espera.id_fluxo}"
+        )
+        return False
+
+    def _liberar_vaga(self, modelo: str) -> None:
+        """
+        Devolve a vaga e a concede às próximas chamadas da fila.
+        """
+        with self._lock:
+            estado = self._obter_estado(modelo)
+            estado.em_uso -= 1
+            self._conceder_proximas(estado)
+
+    def _desistir(self, espera: _EsperaPorVaga) -> None:
+        """
+        Retira da fila uma chamada cancelada (ou devolve a vaga já concedida).
+        """
+        with self._lock:
+            if not espera.concedida:
+                estado = self._obter_estado(espera.modelo)
+                pista = estado.pistas[espera.prioridade]
+                fila = pista.get(espera.id_fluxo)
+                if fila is not None and espera in fila:
+                    fila.remove(espera)
+                    if not fila:
+                        del pista[espera.id_fluxo]
+                return
+        self._liberar_vaga(espera.modelo)
+
+    def _conceder_proximas(self, estado: _EstadoDoModelo) -> None:
+        """
+        Concede vagas livres: pista de maior prioridade primeiro e, dentro
+        dela, o próximo fluxo no rodízio. Chamar com self._lock adquirido.
+        """
+        while estado.em_uso < estado.limite:
+            espera = self._retirar_proxima(estado)
+            if espera is None:
+                return
+            estado.em_uso += 1
+            self._registrar_concessao(espera)
+            try:
+                espera.acordar()
+            except RuntimeError:
+                # Event loop da chamada já foi fechado: a vaga volta para a fila
+                logger.debug("Chamada ao LLM abandonada na fila (event loop fechado)")
+                estado.em_uso -= 1
+
+    def _retirar_proxima(self, estado: _EstadoDoModelo) -> Optional[_EsperaPorVaga]:
+        for prioridade in PrioridadeLLM:
+            pista = estado.pistas[prioridade]
+            if not pista:
+                continue
+            id_fluxo, fila = next(iter(pista.items()))
+            espera = fila.popleft()
+            # Rodízio: o fluxo atendido vai para o fim da pista (ou sai, se esvaziou)
+            del pista[id_fluxo]
+            if fila:
+                pista[id_fluxo] = fila
+            return espera
+        return None
+
+    def _registrar_concessao(self, espera: _EsperaPorVaga) -> None:
+        espera.concedida = True
+        self._concedidas[espera.prioridade] += 1
+        self._tempo_de_espera[espera.prioridade].registrar(time.perf_counter() - espera.inicio)
+
+
+# ==============================================================================
+# SINGLETON
+# ==============================================================================
+
+_instancia_agendador_llm: Optional[AgendadorChamadasLLM] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_agendador_llm() -> AgendadorChamadasLLM:
+    """
+    Obtém a instância singleton do agendador (configurada por LLM_*_CHAMADAS_*).
+
+    THREAD-SAFETY:
+    Double-checked locking: o agendador só limita algo se for o MESMO para
+    todas as threads e event loops do processo.
+    """
+    global _instancia_agendador_llm
+
+    if _instancia_agendador_llm is None:
+        with _lock_singleton:
+            if _instancia_agendador_llm is None:
+                configuracoes = obter_configuracoes()
+                estrito = configuracoes.LLM_AGENDADOR_ESTRITO
+                if estrito is None:
+                    estrito = configuracoes.esta_em_desenvolvimento()
+                _instancia_agendador_llm = AgendadorChamadasLLM(
+                    limite_padrao=configuracoes.LLM_MAX_CHAMADAS_SIMULTANEAS_POR_MODELO,
+                    limites_por_modelo=configuracoes.obter_limites_chamadas_por_modelo(),
+                    estrito=estrito
+                )
+                logger.info(
+                    f"🚦 Agendador de chamadas ao LLM inicializado | "
+                    f"Limite padrão: {configuracoes.LLM_MAX_CHAMADAS_SIMULTANEAS_POR_MODELO} | "
+                    f"Limites por modelo: {configuracoes.obter_limites_chamadas_por_modelo() or 'nenhum'} | "
+                    f"Estrito: {estrito}"
+                )
+
+    return _instancia_agendador_llm
+
+
+def obter_estatisticas_agendador_llm() -> Dict[str, Any]:
+    """
+    Estatísticas do agendador compartilhado, sem criá-lo se ainda não foi usado.
+    """
+    if _instancia_agendador_llm is None:
+        return {"ativado": obter_configuracoes().LLM_AGENDADOR_ATIVADO, "por_modelo": {}, "por_prioridade": {}}
+    return {"ativado": True, **_instancia_agendador_llm.obter_estatisticas()}
@@ -0,0 +1,397 @@
+"""
+Cache de Respostas do LLM (endereçado por conteúdo)
+
+CONTEXTO DE NEGÓCIO:
+Reanalisar uma petição que não mudou (usuário clicou em "analisar" de novo,
+retry depois da falha de um único agente, reprodução em QA) reenvia os
+MESMOS prompts a todos os agentes e paga de novo pelos mesmos tokens.
+Para agentes determinísticos, de temperatura baixa (Prognóstico,
+Estrategista Processual), a resposta anterior é tão boa quanto uma nova.
+
+Este módulo guarda a resposta de cada chamada ao LLM sob uma chave que é o
+hash do CONTEÚDO da requisição: modelo, mensagem de sistema, prompt,
+temperatura, max_tokens e formato/schema da resposta. Qualquer mudança em
+um desses itens gera outra chave (não há invalidação manual a fazer).
+
+IMPLEMENTAÇÃO:
+- SQLite (biblioteca padrão), arquivo em CAMINHO_CACHE_RESPOSTAS_LLM
+- TTL (LLM_CACHE_TTL_SEGUNDOS): entradas vencidas contam como falha e são apagadas
+- Limite de tamanho (LLM_CACHE_MAX_ENTRADAS): ao passar do limite, as
+  entradas acessadas há mais tempo são removidas (LRU)
+- Contadores de acertos/falhas e de tokens/custo evitados, expostos em
+  gerenciador_llm.obter_estatisticas_uso_llm()
+
+QUEM DECIDE SE UMA CHAMADA USA O CACHE:
+GerenciadorLLM.chamar_llm(usar_cache=...) — ver _resolver_cache_respostas.
+O cache só existe com LLM_CACHE_ATIVADO=true.
+
+PADRÃO DE USO:
+```python
+from src.utilitarios.cache_respostas_llm import calcular_chave_cache, obter_cache_respostas_llm
+
+cache = obter_cache_respostas_llm()
+chave = calcular_chave_cache(modelo="gpt-4o-mini", mensagens_de_sistema=None, prompt="...", temperatura=0.2)
+resposta = cache.obter(chave)  # RespostaEmCache ou None
+```
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+
+# ===== CONFIGURAÇÃO DE LOGGING =====
+
+logger = logging.getLogger(__name__)
+
+
+# ===== EXCEÇÕES CUSTOMIZADAS =====
+
+class ErroDeCacheRespostasLLM(Exception):
+    """
+    Erro ao ler ou gravar o cache de respostas do LLM.
+
+    CENÁRIOS COMUNS:
+    - Arquivo SQLite sem permissão de escrita ou corrompido
+    - Disco cheio
+
+    O GerenciadorLLM trata este erro como falha do cache (loga e segue
+    chamando a API): o cache nunca deve derrubar uma análise.
+    """
+    pass
+
+
+# ===== CONSTANTES =====
+
+ESQUEMA_CACHE_RESPOSTAS_LLM = """
+CREATE TABLE IF NOT EXISTS respostas_llm (
+    chave              TEXT PRIMARY KEY,
+    modelo             TEXT NOT NULL,
+    resposta           TEXT NOT NULL,
+    tokens_totais      INTEGER NOT NULL DEFAULT 0,
+    custo_estimado_usd REAL NOT NULL DEFAULT 0,
+    criado_em          REAL NOT NULL,
+    ultimo_acesso      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_respostas_llm_ultimo_acesso ON respostas_llm (ultimo_acesso);
+"""
+
+
+# ===== MODELOS DE DADOS =====
+
+@dataclass
+class RespostaEmCache:
+    """
+    Resposta recuperada do cache e o que ela custou quando foi gerada.
+    """
+    resposta: str
+    modelo: str
+    tokens_totais: int
+    custo_estimado_usd: float
+
+
+# ===== FUNÇÕES AUXILIARES =====
+
+def calcular_chave_cache(
+    modelo: str,
+    mensagens_de_sistema: Optional[str],
+    prompt: str,
+    temperatura: float,
+    max_tokens: Optional[int] = None,
+    response_format: Optional[str] = None,
+    response_schema: Optional[type[BaseModel]] = None,
+    contexto_compartilhado: Optional[str] = None
+) -> str:
+    """
+    Calcula a chave (SHA-256) de uma requisição ao LLM.
+
+    O schema Pydantic entra pelo seu JSON schema (e não só pelo nome), para
+    que mudar um campo do modelo de saída não devolva respostas no formato
+    antigo. O contexto compartilhado (documentos do caso enviados antes da
+    mensagem de sistema) só entra na chave quando existe, então as chaves
+    das requisições sem ele não mudam.
+
+    Returns:
+        str: Hash hexadecimal de 64 caracteres
+    """
+    conteudo = {
+        "modelo": modelo,
+        "sistema": mensagens_de_sistema or "",
+        "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "temperatura": temperatura,
+        "max_tokens": max_tokens,
+        "response_format": response_format,
+        "response_schema": response_schema.model_json_schema() if response_schema is not None else None,
+    }
+    if contexto_compartilhado:
+        conteudo["contexto_sha256"] = hashlib.sha256(contexto_compartilhado.encode("utf-8")).hexdigest()
+    serializado = json.dumps(conteudo, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+
+# ===== CLASSE DO CACHE =====
+
+class CacheRespostasLLM:
+    """
+    Cache persistente de respostas do LLM com TTL e limite de entradas.
+
+    THREAD-SAFETY:
+    Uma conexão por instância (check_same_thread=False) protegida por
+    threading.Lock, como em CatalogoDocumentos. As operações são consultas
+    por chave primária (sub-milissegundo), então também são chamadas de
+    dentro do event loop por chamar_llm_async().
+    """
+
+    def __init__(
+        self,
+        caminho_banco: str,
+        ttl_segundos: int = 604800,
+        max_entradas: int = 5000,
+        temperatura_maxima_automatica: float = 0.3
+    ):
+        """
+        Abre (ou cria) o cache.
+
+        Args:
+            caminho_banco: Caminho do arquivo SQLite (":memory:" para testes)
+            ttl_segundos: Validade de cada resposta
+            max_entradas: Máximo de respostas guardadas (remove as menos acessadas)
+            temperatura_maxima_automatica: Chamadas sem opção explícita
+                (usar_cache=None) só usam o cache até esta temperatura
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se o banco não puder ser aberto
+        """
+        self.caminho_banco = caminho_banco
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self.temperatura_maxima_automatica = temperatura_maxima_automatica
+        self._lock = threading.Lock()
+
+        # Contadores desde o início do processo (não persistidos)
+        self.numero_de_acertos = 0
+        self.numero_de_falhas = 0
+        self.tokens_evitados = 0
+        self.custo_evitado_usd = 0.0
+
+        try:
+            if caminho_banco != ":memory:":
+                Path(caminho_banco).parent.mkdir(parents=True, exist_ok=True)
+            self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.executescript(ESQUEMA_CACHE_RESPOSTAS_LLM)
+        except (sqlite3.Error, OSError) as erro:
+            mensagem_erro = f"Falha ao abrir cache de respostas do LLM em '{caminho_banco}': {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+
+    def obter(self, chave: str) -> Optional[RespostaEmCache]:
+        """
+        Busca a resposta de uma chave (atualiza o último acesso e os contadores).
+
+        Returns:
+            RespostaEmCache ou None (ausente ou vencida)
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se a leitura falhar
+        """
+        agora = time.time()
+        try:
+            with self._lock, self._conexao:
+                linha = self._conexao.execute(
+                    "SELECT resposta, modelo, tokens_totais, custo_estimado_usd, criado_em "
+                    "FROM respostas_llm WHERE chave = ?",
+                    (chave,)
+                ).fetchone()
+
+                if linha is not None and agora - linha[4] > self.ttl_segundos:
+                    self._conexao.execute("DELETE FROM respostas_llm WHERE chave = ?", (chave,))
+                    linha = None
+
+                if linha is None:
+                    self.numero_de_falhas += 1
+                    return None
+
+                self._conexao.execute(
+                    "UPDATE respostas_llm SET ultimo_acesso = ? WHERE chave = ?", (agora, chave)
+                )
+                self.numero_de_acertos += 1
+                self.tokens_evitados += linha[2]
+                self.custo_evitado_usd += linha[3]
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao ler o cache de respostas do LLM: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+
+        return RespostaEmCache(
+            resposta=linha[0],
+            modelo=linha[1],
+            tokens_totais=linha[2],
+            custo_estimado_usd=linha[3]
+        )
+
+    def salvar(
+        self,
+        chave: str,
+        modelo: str,
+        resposta: str,
+        tokens_totais: int = 0,
+        custo_estimado_usd: float = 0.0
+    ) -> None:
+        """
+        Grava (ou substitui) a resposta de uma chave e aplica o limite de entradas.
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se a escrita falhar
+        """
+        agora = time.time()
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO respostas_llm "
+                    "(chave, modelo, resposta, tokens_totais, custo_estimado_usd, criado_em, ultimo_acesso) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (chave, modelo, resposta, tokens_totais, custo_estimado_usd, agora, agora)
+                )
+                excedente = self._conexao.execute("SELECT COUNT(*) FROM respostas_llm").fetchone()[0] - self.max_entradas
+                if excedente > 0:
+                    self._conexao.execute(
+                        "DELETE FROM respostas_llm WHERE chave IN ("
+                        "SELECT chave FROM respostas_llm ORDER BY ultimo_acesso ASC LIMIT ?)",
+                        (excedente,)
+                    )
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao gravar no cache de respostas do LLM: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+
+    def remover_expiradas(self) -> int:
+        """
+        Apaga as entradas com TTL vencido.
+
+        Returns:
+            int: Número de entradas removidas
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se a remoção falhar
+        """
+        limite = time.time() - self.ttl_segundos
+        try:
+            with self._lock, self._conexao:
+                cursor = self._conexao.execute("DELETE FROM respostas_llm WHERE criado_em < ?", (limite,))
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao remover respostas vencidas do cache do LLM: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+        return cursor.rowcount
+
+    def limpar(self) -> int:
+        """
+        Apaga todas as respostas (ex: após trocar os prompts de um agente).
+
+        Returns:
+            int: Número de entradas removidas
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se a remoção falhar
+        """
+        try:
+            with self._lock, self._conexao:
+                cursor = self._conexao.execute("DELETE FROM respostas_llm")
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao limpar o cache de respostas do LLM: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+        return cursor.rowcount
+
+    def contar_entradas(self) -> int:
+        """
+        Retorna o número de respostas guardadas (inclusive as ainda não removidas por TTL).
+
+        Raises:
+            ErroDeCacheRespostasLLM: Se a contagem falhar
+        """
+        try:
+            with self._lock:
+                return self._conexao.execute("SELECT COUNT(*) FROM respostas_llm").fetchone()[0]
+        except sqlite3.Error as erro:
+            mensagem_erro = f"Falha ao contar as entradas do cache de respostas do LLM: {erro}"
+            logger.error(mensagem_erro)
+            raise ErroDeCacheRespostasLLM(mensagem_erro) from erro
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """
+        Resumo de acertos, falhas e economia desde o início do processo.
+        """
+        total_consultas = self.numero_de_acertos + self.numero_de_falhas
+        taxa_de_acerto = (self.numero_de_acertos / total_consultas * 100) if total_consultas > 0 else 0.0
+        return {
+            "ativado": True,
+            "entradas": self.contar_entradas(),
+            "max_entradas": self.max_entradas,
+            "ttl_segundos": self.ttl_segundos,
+            "acertos": self.numero_de_acertos,
+            "falhas": self.numero_de_falhas,
+            "taxa_de_acerto_percentual": round(taxa_de_acerto, 2),
+            "tokens_evitados": self.tokens_evitados,
+            "custo_evitado_usd": round(self.custo_evitado_usd, 4),
+        }
+
+    def resetar_contadores(self) -> None:
+        """
+        Zera os contadores de acertos/falhas (não apaga as respostas).
+        """
+        self.numero_de_acertos = 0
+        self.numero_de_falhas = 0
+        self.tokens_evitados = 0
+        self.custo_evitado_usd = 0.0
+
+
+# ===== INSTÂNCIA SINGLETON =====
+
+# DESIGN: Singleton pattern (todas as instâncias de GerenciadorLLM compartilham o cache)
+_instancia_cache_respostas_llm: Optional[CacheRespostasLLM] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_cache_respostas_llm() -> CacheRespostasLLM:
+    """
+    Obtém a instância singleton do cache (configurada por LLM_CACHE_*).
+
+    THREAD-SAFETY:
+    Double-checked locking, como no catálogo de documentos.
+    """
+    global _instancia_cache_respostas_llm
+
+    if _instancia_cache_respostas_llm is None:
+        with _lock_singleton:
+            if _instancia_cache_respostas_llm is None:
+                configuracoes = obter_configuracoes()
+                logger.info(f"🔧 Abrindo cache de respostas do LLM: {configuracoes.CAMINHO_CACHE_RESPOSTAS_LLM}")
+                _instancia_cache_respostas_llm = CacheRespostasLLM(
+                    caminho_banco=configuracoes.CAMINHO_CACHE_RESPOSTAS_LLM,
+                    ttl_segundos=configuracoes.LLM_CACHE_TTL_SEGUNDOS,
+                    max_entradas=configuracoes.LLM_CACHE_MAX_ENTRADAS,
+                    temperatura_maxima_automatica=configuracoes.LLM_CACHE_TEMPERATURA_MAXIMA
+                )
+
+    return _instancia_cache_respostas_llm
+
+
+def obter_estatisticas_cache_respostas_llm() -> Dict[str, Any]:
+    """
+    Estatísticas do cache compartilhado, sem abri-lo se ainda não foi usado.
+    """
+    if _instancia_cache_respostas_llm is None:
+        return {"ativado": obter_configuracoes().LLM_CACHE_ATIVADO, "entradas": 0, "acertos": 0, "falhas": 0}
+    return _instancia_cache_respostas_llm.obter_estatisticas()
@@ -8,10 +8,20 @@ para gerar análises, pareceres e respostas.
 
 RESPONSABILIDADES:
 1. Fazer chamadas à OpenAI API de forma robusta e segura
-2. Implementar retry logic com backoff exponencial para lidar com rate limits
+2. Implementar retry com backoff exponencial com jitter, respeitando o
+   Retry-After do provedor, com disjuntor por modelo e orçamento de
+   retries compartilhado (resiliencia_llm)
 3. Registrar logs detalhados de chamadas (custos, tokens, tempo de resposta)
 4. Tratamento de erros específicos (timeout, rate limit, API errors)
-5. Fornecer estatísticas de uso para monitoramento de custos
+5. Fornecer estatísticas de uso para monitoramento de custos e latência
+   (p50/p95/p99 por modelo e por agente, memória limitada)
+6. Reaproveitar respostas de requisições idênticas (cache de respostas, opcional)
+7. Entregar a resposta em fragmentos à medida que é gerada (streaming, opcional)
+8. Limitar as chamadas simultâneas por modelo, com prioridade para consultas
+   interativas (agendador_llm)
+9. Enviar o contexto comum de uma análise (documentos do caso) como primeira
+   mensagem, idêntica entre agentes, para aproveitar o cache de prompt do
+   provedor, e registrar os tokens de entrada servidos por esse cache
 
 DESIGN PATTERN:
 Este módulo usa o padrão Singleton implícito, pois mantém estado global de
@@ -20,15 +30,41 @@ estatísticas. Em produção, considere usar um sistema de métricas dedicado.
 
 import os
 import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+import weakref
+from collections import deque
+from contextlib import nullcontext
+from typing import Optional, Dict, Any, Callable, Deque, List, NoReturn, Tuple
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 # Biblioteca OpenAI para comunicação com a API
-from openai import OpenAI, APIError, RateLimitError, APITimeoutError, BadRequestError
+from openai import AsyncOpenAI, OpenAI, APIError, RateLimitError, APITimeoutError, BadRequestError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from pydantic import BaseModel
 
+from src.configuracao.configuracoes import obter_configuracoes
+from src.utilitarios.cache_respostas_llm import (
+    CacheRespostasLLM,
+    ErroDeCacheRespostasLLM,
+    calcular_chave_cache,
+    obter_cache_respostas_llm,
+    obter_estatisticas_cache_respostas_llm,
+)
+from src.utilitarios.agendador_llm import (
+    AgendadorChamadasLLM,
+    obter_agendador_llm,
+    obter_estatisticas_agendador_llm,
+)
+from src.utilitarios.resiliencia_llm import (
+    ResilienciaLLM,
+    obter_estatisticas_resiliencia_llm,
+    obter_resiliencia_llm,
+)
+from src.utilitarios.telemetria_llm import AgregadoTelemetriaLLM
+
 # Configuração do logger para este módulo
 logger = logging.getLogger(__name__)
 
@@ -55,6 +91,19 @@ class EstatisticaChamadaLLM:
     tempo_de_resposta_segundos: float
     sucesso: bool
     mensagem_de_erro: Optional[str] = None
+    agente: Optional[str] = None
+    tokens_de_raciocinio: int = 0
+    # Tokens de prompt servidos pelo cache de prompt do provedor (prefixo repetido)
+    tokens_de_prompt_em_cache: int = 0
+    # Classe do erro de cada tentativa que falhou (inclusive as repetidas com sucesso)
+    erros_das_tentativas: List[str] = field(default_factory=list)
+
+
+# Quantas chamadas individuais ficam no histórico (buffer circular)
+TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM = 500
+
+# Chave de agregação das chamadas feitas sem identificar o agente
+AGENTE_NAO_IDENTIFICADO = "nao_identificado"
 
 
 @dataclass
@@ -66,6 +115,16 @@ class EstatisticasGlobaisLLM:
     IMPORTANTE: Estas estatísticas são mantidas em memória e são perdidas
     quando o servidor reinicia. Para produção, considere usar um sistema
     de métricas persistente (Prometheus, CloudWatch, etc.)
+    
+    MEMÓRIA LIMITADA:
+    O histórico de chamadas individuais é um buffer circular (as últimas
+    TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM); o restante são agregados de
+    tamanho fixo (geral, por modelo e por agente, com histograma de
+    latência), então o consumo não cresce com o tempo de execução.
+    
+    THREAD-SAFETY:
+    Agentes chamam o LLM de várias threads e corrotinas ao mesmo tempo;
+    leituras e escritas passam pelo mesmo lock.
     """
     total_de_chamadas: int = 0
     total_de_chamadas_bem_sucedidas: int = 0
@@ -73,7 +132,13 @@ class EstatisticasGlobaisLLM:
     total_de_tokens_utilizados: int = 0
     custo_total_estimado_usd: float = 0.0
     tempo_total_de_execucao_segundos: float = 0.0
-    historico_de_chamadas: List[EstatisticaChamadaLLM] = field(default_factory=list)
+    historico_de_chamadas: Deque[EstatisticaChamadaLLM] = field(
+        default_factory=lambda: deque(maxlen=TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM)
+    )
+    agregado_geral: AgregadoTelemetriaLLM = field(default_factory=AgregadoTelemetriaLLM)
+    agregados_por_modelo: Dict[str, AgregadoTelemetriaLLM] = field(default_factory=dict)
+    agregados_por_agente: Dict[str, AgregadoTelemetriaLLM] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
     
     def adicionar_chamada(self, estatistica: EstatisticaChamadaLLM) -> None:
         """
@@ -82,17 +147,37 @@ class EstatisticasGlobaisLLM:
         Args:
             estatistica: Dados da chamada individual que acabou de ser executada
         """
-        self.total_de_chamadas += 1
+        agente = estatistica.agente or AGENTE_NAO_IDENTIFICADO
         
-        if estatistica.sucesso:
-            self.total_de_chamadas_bem_sucedidas += 1
-            self.total_de_tokens_utilizados += estatistica.tokens_totais
-            self.custo_total_estimado_usd += estatistica.custo_estimado_usd
-        else:
-            self.total_de_chamadas_com_erro += 1
-        
-        self.tempo_total_de_execucao_segundos += estatistica.tempo_de_resposta_segundos
-        self.historico_de_chamadas.append(estatistica)
+        with self._lock:
+            self.total_de_chamadas += 1
+            
+            if estatistica.sucesso:
+                self.total_de_chamadas_bem_sucedidas += 1
+                self.total_de_tokens_utilizados += estatistica.tokens_totais
+                self.custo_total_estimado_usd += estatistica.custo_estimado_usd
+            else:
+                self.total_de_chamadas_com_erro += 1
+            
+            self.tempo_total_de_execucao_segundos += estatistica.tempo_de_resposta_segundos
+            self.historico_de_chamadas.append(estatistica)
+            
+            agregados = (
+                self.agregado_geral,
+                self.agregados_por_modelo.setdefault(estatistica.modelo_utilizado, AgregadoTelemetriaLLM()),
+                self.agregados_por_agente.setdefault(agente, AgregadoTelemetriaLLM()),
+            )
+            for agregado in agregados:
+                agregado.registrar(
+                    sucesso=estatistica.sucesso,
+                    tempo_de_resposta_segundos=estatistica.tempo_de_resposta_segundos,
+                    tokens_de_prompt=estatistica.tokens_de_prompt,
+                    tokens_de_resposta=estatistica.tokens_de_resposta,
+                    tokens_de_raciocinio=estatistica.tokens_de_raciocinio,
+                    custo_estimado_usd=estatistica.custo_estimado_usd,
+                    erros_das_tentativas=estatistica.erros_das_tentativas,
+                    tokens_de_prompt_em_cache=estatistica.tokens_de_prompt_em_cache,
+                )
     
     def obter_resumo(self) -> Dict[str, Any]:
         """
@@ -103,6 +188,13 @@ class EstatisticasGlobaisLLM:
         Returns:
             dict: Resumo legível das estatísticas agregadas
         """
+        with self._lock:
+            return self._montar_resumo()
+    
+    def _montar_resumo(self) -> Dict[str, Any]:
+        """
+        Monta o resumo de obter_resumo(). Deve ser chamado com self._lock adquirido.
+        """
         taxa_sucesso = (
             (self.total_de_chamadas_bem_sucedidas / self.total_de_chamadas * 100)
             if self.total_de_chamadas > 0 else 0.0
@@ -121,7 +213,33 @@ class EstatisticasGlobaisLLM:
             "total_de_tokens_utilizados": self.total_de_tokens_utilizados,
             "custo_total_estimado_usd": round(self.custo_total_estimado_usd, 4),
             "tempo_medio_por_chamada_segundos": round(tempo_medio_por_chamada, 2),
+            "latencia_segundos": self.agregado_geral.latencia.para_dict(),
         }
+    
+    def obter_metricas(self, numero_chamadas_recentes: int = 20) -> Dict[str, Any]:
+        """
+        Retorna a telemetria completa (endpoint de métricas).
+        
+        Args:
+            numero_chamadas_recentes: Quantas chamadas individuais do histórico incluir
+        
+        Returns:
+            dict com "resumo", "geral", "por_modelo", "por_agente" e
+            "chamadas_recentes" (mais recente por último)
+        """
+        with self._lock:
+            chamadas_recentes = list(self.historico_de_chamadas)[-numero_chamadas_recentes:] if numero_chamadas_recentes > 0 else []
+            return {
+                "resumo": self._montar_resumo(),
+                "geral": self.agregado_geral.para_dict(),
+                "por_modelo": {
+                    modelo: agregado.para_dict() for modelo, agregado in self.agregados_por_modelo.items()
+                },
+                "por_agente": {
+                    agente: agregado.para_dict() for agente, agregado in self.agregados_por_agente.items()
+                },
+                "chamadas_recentes": [asdict(chamada) for chamada in chamadas_recentes],
+            }
 
 
 # Instância global de estatísticas
@@ -157,16 +275,124 @@ TABELA_DE_CUSTOS_POR_MODELO = {
 
 # Configurações de retry para chamadas à API
 # CONTEXTO: A OpenAI impõe rate limits. Quando atingimos um limite,
-# precisamos esperar antes de tentar novamente.
+# precisamos esperar antes de tentar novamente. A espera (backoff com
+# jitter ou Retry-After), o disjuntor e o orçamento de retries ficam em
+# resiliencia_llm
 NUMERO_MAXIMO_DE_TENTATIVAS_RETRY = 3
-TEMPO_INICIAL_DE_ESPERA_SEGUNDOS = 1
-FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL = 2  # Cada retry espera 2x mais que o anterior
 
 # Timeout para chamadas à API (em segundos)
 # Aumentado de 60s → 180s para análises complexas com contexto grande
 TIMEOUT_PADRAO_CHAMADA_API_SEGUNDOS = 180
 
 
+# ==============================================================================
+# STREAMING DE RESPOSTAS
+# ==============================================================================
+
+# Callback chamado com cada fragmento de texto gerado pelo modelo
+CallbackDeFragmento = Callable[[str], None]
+
+
+class _AcumuladorDeFluxoLLM:
+    """
+    Junta os chunks de uma resposta em streaming e repassa cada fragmento.
+    
+    CONTEXTO:
+    Com stream=True a OpenAI devolve ChatCompletionChunk (um delta de
+    texto por chunk) e, com stream_options={"include_usage": True}, um
+    último chunk só com o uso de tokens. Ao final, montar_resposta()
+    reconstrói um ChatCompletion equivalente ao da chamada sem streaming,
+    para que _processar_resposta() valide, contabilize tokens/custo e
+    retorne exatamente o mesmo texto nos dois caminhos.
+    """
+    
+    def __init__(self, ao_receber_fragmento: CallbackDeFragmento):
+        self._ao_receber_fragmento: Optional[CallbackDeFragmento] = ao_receber_fragmento
+        self._fragmentos: List[str] = []
+        self._recusa: List[str] = []
+        self._id = ""
+        self._modelo = ""
+        self._criado_em = int(time.time())
+        self._finish_reason: Optional[str] = None
+        self._uso: Optional[Dict[str, Any]] = None
+        self.fragmentos_emitidos = 0
+    
+    def adicionar(self, chunk: ChatCompletionChunk) -> None:
+        """
+        Registra um chunk do fluxo e emite o fragmento de texto (se houver).
+        """
+        self._id = chunk.id or self._id
+        self._modelo = chunk.model or self._modelo
+        self._criado_em = chunk.created or self._criado_em
+        
+        if chunk.usage is not None:
+            self._uso = chunk.usage.model_dump()
+        
+        for escolha in chunk.choices:
+            if escolha.index != 0:
+                continue
+            if escolha.finish_reason:
+                self._finish_reason = escolha.finish_reason
+            if escolha.delta.refusal:
+                self._recusa.append(escolha.delta.refusal)
+            if escolha.delta.content:
+                self._fragmentos.append(escolha.delta.content)
+                self._emitir(escolha.delta.content)
+    
+    def adicionar_texto_completo(self, texto: str) -> None:
+        """
+        Emite um texto já pronto (ex: resposta do cache) como um único fragmento.
+        """
+        self._fragmentos.append(texto)
+        self._emitir(texto)
+    
+    def _emitir(self, fragmento: str) -> None:
+        """
+        Repassa o fragmento ao callback.
+        
+        Um callback com defeito (ex: cliente SSE que caiu) não pode derrubar
+        a análise: o erro é logado, o callback é desligado e a resposta
+        continua sendo acumulada normalmente.
+        """
+        if self._ao_receber_fragmento is None:
+            return
+        try:
+            self._ao_receber_fragmento(fragmento)
+            self.fragmentos_emitidos += 1
+        except Exception as erro:
+            logger.warning(f"Callback de streaming falhou e foi desativado: {erro}")
+            self._ao_receber_fragmento = None
+    
+    def montar_resposta(self) -> ChatCompletion:
+        """
+        Reconstrói o ChatCompletion completo a partir dos chunks recebidos.
+        """
+        return ChatCompletion.model_validate({
+            "id": self._id,
+            "object": "chat.completion",
+            "created": self._criado_em,
+            "model": self._modelo,
+            "choices": [{
+                "index": 0,
+                "finish_reason": self._finish_reason or "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": "".join(self._fragmentos) if self._fragmentos else None,
+                    "refusal": "".join(self._recusa) if self._recusa else None,
+                },
+            }],
+            # Sem o chunk de uso (ex: fluxo interrompido) os tokens ficam zerados
+            "usage": self._uso or {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+
+def _parametros_com_streaming(parametros_api: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Retorna uma cópia dos parâmetros da API pedindo streaming com uso de tokens.
+    """
+    return {**parametros_api, "stream": True, "stream_options": {"include_usage": True}}
+
+
 # ==============================================================================
 # CLASSE PRINCIPAL: GERENCIADOR LLM
 # ==============================================================================
@@ -193,13 +419,25 @@ class GerenciadorLLM:
     - Logging automático de todas as operações
     """
     
-    def __init__(self, chave_api: Optional[str] = None):
+    def __init__(
+        self,
+        chave_api: Optional[str] = None,
+        cache_respostas: Optional[CacheRespostasLLM] = None,
+        agendador: Optional[AgendadorChamadasLLM] = None,
+        resiliencia: Optional[ResilienciaLLM] = None
+    ):
         """
         Inicializa o gerenciador de LLM.
         
         Args:
             chave_api: Chave da API OpenAI. Se None, busca da variável de
                       ambiente OPENAI_API_KEY.
+            cache_respostas: Cache de respostas a usar. Se None, usa o cache
+                      compartilhado quando LLM_CACHE_ATIVADO=true.
+            agendador: Agendador que limita as chamadas simultâneas. Se None,
+                      usa o agendador compartilhado quando LLM_AGENDADOR_ATIVADO=true.
+            resiliencia: Disjuntor, orçamento de retries e cálculo das esperas.
+                      Se None, usa a instância compartilhada (obter_resiliencia_llm).
         
         Raises:
             ValueError: Se a chave da API não for encontrada
@@ -216,7 +454,20 @@ class GerenciadorLLM:
             raise ValueError(mensagem_erro)
         
         # Inicializar cliente da OpenAI
-        self.cliente_openai = OpenAI(api_key=self.chave_api)
+        # max_retries=0: as repetições são feitas só aqui (chamar_llm), onde
+        # passam pelo disjuntor e pelo orçamento de retries. Com o retry
+        # interno do SDK cada tentativa nossa viraria até 3 requisições
+        self.cliente_openai = OpenAI(api_key=self.chave_api, max_retries=0)
+        
+        # Cliente assíncrono (chamar_llm_async): criado sob demanda, um por event loop
+        self._clientes_openai_async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock_clientes_async = threading.Lock()
+        
+        self._cache_respostas = cache_respostas
+        self._agendador = agendador
+        self._resiliencia = resiliencia
         
         logger.info("GerenciadorLLM inicializado com sucesso")
     
@@ -230,6 +481,10 @@ class GerenciadorLLM:
         timeout_segundos: int = TIMEOUT_PADRAO_CHAMADA_API_SEGUNDOS,
         response_format: Optional[str] = None,  # "json_object" para forçar JSON
         response_schema: Optional[type[BaseModel]] = None,  # Schema Pydantic para Structured Outputs
+        usar_cache: Optional[bool] = None,  # None = automático pela temperatura
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,  # Streaming (opcional)
+        agente: Optional[str] = None,  # Nome do agente (telemetria por agente)
+        contexto_compartilhado: Optional[str] = None,  # Prefixo comum entre agentes (cache de prompt)
     ) -> str:
         """
         Realiza uma chamada à API da OpenAI com retry logic e logging automático.
@@ -239,12 +494,31 @@ class GerenciadorLLM:
         toda a lógica de comunicação com a OpenAI, incluindo tratamento de erros,
         retries, e logging de custos.
         
+        VERSÃO ASSÍNCRONA:
+        chamar_llm_async() aceita os mesmos parâmetros e compartilha a montagem
+        da requisição, o processamento da resposta e a política de retry com
+        este método. Use-a dentro do event loop (agentes em paralelo).
+        
         PARÂMETROS IMPORTANTES:
         - temperatura: Controla aleatoriedade (0.0 = determinístico, 1.0 = criativo)
         - max_tokens: Limita o tamanho da resposta (None = sem limite)
         - mensagens_de_sistema: Instruções de sistema (ex: "Você é um advogado especialista...")
         - response_format: "json_object" para forçar resposta em JSON válido (método antigo)
         - response_schema: Schema Pydantic para Structured Outputs (RECOMENDADO - garante formato exato)
+        - usar_cache: True/False força usar/ignorar o cache de respostas; None usa
+          o cache só até LLM_CACHE_TEMPERATURA_MAXIMA (exige LLM_CACHE_ATIVADO=true)
+        - ao_receber_fragmento: se informado, a chamada usa streaming e o callback
+          recebe cada fragmento de texto assim que o modelo o gera. O retorno
+          continua sendo o texto completo (idêntico ao da chamada sem streaming).
+          Resposta vinda do cache é entregue em um único fragmento. Depois que
+          algum fragmento foi emitido, uma falha NÃO é repetida (o cliente já
+          recebeu parte do texto).
+        - contexto_compartilhado: texto comum a todos os agentes de uma análise
+          (documentos do caso). Vai como PRIMEIRA mensagem, antes da mensagem
+          de sistema: o provedor reaproveita prefixos idênticos (cache de
+          prompt), então só o primeiro agente paga o processamento integral
+          desse trecho. Os tokens servidos do cache aparecem na telemetria
+          (tokens_de_prompt_em_cache).
         
         Args:
             prompt: O prompt/pergunta a ser enviada ao modelo
@@ -255,6 +529,10 @@ class GerenciadorLLM:
             timeout_segundos: Tempo máximo de espera pela resposta
             response_format: "json_object" para JSON mode (garante JSON válido mas estrutura livre)
             response_schema: Classe Pydantic para Structured Outputs (garante estrutura EXATA)
+            usar_cache: Opção do agente para o cache de respostas (None = automático)
+            ao_receber_fragmento: Callback de streaming (recebe cada fragmento de texto)
+            agente: Nome do agente que faz a chamada (agrega a telemetria por agente)
+            contexto_compartilhado: Contexto comum enviado antes da mensagem de sistema
         
         Returns:
             str: Resposta gerada pelo modelo (JSON string se usando schema)
@@ -266,386 +544,917 @@ class GerenciadorLLM:
         """
         logger.info(f"Iniciando chamada ao LLM (modelo: {modelo})")
         
-        # Construir lista de mensagens para a API
-        mensagens_para_api = []
+        cache, chave_cache, resposta_em_cache = self._consultar_cache_respostas(
+            usar_cache, modelo, mensagens_de_sistema, prompt, temperatura,
+            max_tokens, response_format, response_schema, contexto_compartilhado
+        )
+        if resposta_em_cache is not None:
+            if ao_receber_fragmento is not None:
+                _AcumuladorDeFluxoLLM(ao_receber_fragmento).adicionar_texto_completo(resposta_em_cache)
+            return resposta_em_cache
         
-        # Adicionar mensagem de sistema se fornecida
-        if mensagens_de_sistema:
-            mensagens_para_api.append({
-                "role": "system",
-                "content": mensagens_de_sistema
-            })
+        mensagens_para_api = self._montar_mensagens(prompt, mensagens_de_sistema, contexto_compartilhado)
         
-        # Adicionar prompt do usuário
-        mensagens_para_api.append({
-            "role": "user",
-            "content": prompt
-        })
+        # Cada chamada (não cada repetição) deposita crédito no orçamento de retries
+        resiliencia = self._resolver_resiliencia()
+        resiliencia.registrar_chamada()
         
         # Variáveis para controle de retry
         numero_da_tentativa_atual = 0
-        tempo_de_espera_atual_segundos = TEMPO_INICIAL_DE_ESPERA_SEGUNDOS
         ultima_excecao = None
+        parametros_api = None
+        acumulador_do_fluxo: Optional[_AcumuladorDeFluxoLLM] = None
+        erros_das_tentativas: List[str] = []
         
         # Registrar timestamp de início para calcular tempo de resposta
         timestamp_inicio = time.time()
         
-        # Loop de retry com backoff exponencial
+        # Loop de retry com backoff exponencial (com jitter / Retry-After)
         while numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
             numero_da_tentativa_atual += 1
             
+            # Circuito do modelo aberto: falha na hora, sem ir ao provedor
+            tentativa = resiliencia.permitir_tentativa(modelo)
+            if tentativa is None:
+                ultima_excecao = self._circuito_aberto(ultima_excecao, modelo, resiliencia, erros_das_tentativas)
+                break
+            
             try:
                 logger.debug(
                     f"Tentativa {numero_da_tentativa_atual}/"
                     f"{NUMERO_MAXIMO_DE_TENTATIVAS_RETRY}"
                 )
                 
-                # Preparar parâmetros para a chamada à API
-                parametros_api = {
-                    "model": modelo,
-                    "messages": mensagens_para_api,
-                    "timeout": timeout_segundos,
-                }
-                
-                # GPT-5-nano só aceita temperature=1 (padrão)
-                # Para outros modelos, usar temperature customizada
-                if modelo == "gpt-5-nano-2025-08-07":
-                    # Não incluir temperature para usar o padrão (1)
-                    logger.debug(f"Modelo {modelo} usa temperature padrão (1)")
-                else:
-                    parametros_api["temperature"] = temperatura
-                
-                # ===== STRUCTURED OUTPUTS (PRIORITÁRIO) =====
-                # Se schema Pydantic fornecido, usar Structured Outputs (garantia de formato exato)
-                if response_schema is not None:
-                    logger.info(f"🎯 Usando Structured Outputs com schema: {response_schema.__name__}")
-                    
-                    # Structured Outputs: define formato exato da resposta
-                    # https://platform.openai.com/docs/guides/structured-outputs
-                    
-                    # Gerar JSON schema do modelo Pydantic
-                    schema_dict = response_schema.model_json_schema()
-                    
-                    # CRÍTICO: OpenAI Structured Outputs exige:
-                    # 1. 'additionalProperties': false em TODOS os objetos
-                    # 2. 'required' deve incluir TODAS as propriedades (exceto opcionais)
-                    
-                    def fix_schema_for_openai(schema_obj):
-                        """Corrige schema recursivamente para Structured Outputs"""
-                        if isinstance(schema_obj, dict):
-                            # $ref não pode ter keywords extras (description, title, etc.)
-                            if "$ref" in schema_obj:
-                                chaves_para_remover = [
-                                    chave for chave in schema_obj.keys()
-                                    if chave not in {"$ref"}
-                                ]
-                                for chave in chaves_para_remover:
-                                    schema_obj.pop(chave, None)
-                                # Nada mais a fazer neste nível além de seguir recursão
-                            
-                            # Se é um objeto, adicionar additionalProperties: false
-                            if schema_obj.get('type') == 'object':
-                                schema_obj['additionalProperties'] = False
-                                
-                                # Se tem properties, garantir que TODAS estejam em required
-                                # (exceto as que Pydantic já marcou como opcionais)
-                                if 'properties' in schema_obj:
-                                    all_props = list(schema_obj['properties'].keys())
-                                    
-                                    # Manter required existente se presente, senão criar
-                                    if 'required' not in schema_obj:
-                                        schema_obj['required'] = all_props
-                                    else:
-                                        # Se required já existe, adicionar props faltantes
-                                        existing_required = set(schema_obj['required'])
-                                        missing_props = set(all_props) - existing_required
-                                        if missing_props:
-                                            schema_obj['required'].extend(missing_props)
-                            
-                            # Processar recursivamente
-                            for value in schema_obj.values():
-                                fix_schema_for_openai(value)
-                                
-                        elif isinstance(schema_obj, list):
-                            for item in schema_obj:
-                                fix_schema_for_openai(item)
-                    
-                    fix_schema_for_openai(schema_dict)
-                    
-                    parametros_api["response_format"] = {
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": response_schema.__name__,
-                            "schema": schema_dict,
-                            "strict": True  # Modo strict: garante 100% de conformidade
-                        }
-                    }
-                    
-                    logger.debug(f"Schema JSON corrigido para OpenAI: {schema_dict}")
-                    
-                # ===== JSON MODE (FALLBACK) =====
-                # Adicionar response_format se fornecido (JSON mode - estrutura livre)
-                # NOTA: Alguns modelos beta podem não suportar JSON mode
-                elif response_format == "json_object":
-                    # Lista de modelos que SABEMOS que suportam JSON mode
-                    modelos_json_suportados = [
-                        "gpt-4o",
-                        "gpt-4o-mini",
-                        "gpt-4-turbo",
-                        "gpt-4-0125-preview",
-                        "gpt-3.5-turbo-0125"
-                    ]
-                    
-                    # Verificar se modelo suporta JSON mode
-                    suporta_json = any(m in modelo for m in modelos_json_suportados)
-                    
-                    if suporta_json:
-                        parametros_api["response_format"] = {"type": "json_object"}
-                        logger.debug(f"✅ Usando JSON mode para {modelo}")
-                    else:
-                        logger.warning(
-                            f"⚠️  Modelo {modelo} pode não suportar JSON mode oficialmente. "
-                            "Tentando mesmo assim..."
-                        )
-                        # Tentar mesmo assim (pode funcionar em modelos beta)
-                        parametros_api["response_format"] = {"type": "json_object"}
-                
-                # IMPORTANTE: OpenAI mudou API em 2024
-                # Modelos novos (GPT-4o, GPT-5) usam 'max_completion_tokens'
-                # Modelos antigos (GPT-3.5, GPT-4 original) usam 'max_tokens'
-                if max_tokens is not None:
-                    # Lista de modelos que usam max_completion_tokens (API nova)
-                    modelos_nova_api = [
-                        "gpt-4o",
-                        "gpt-4o-mini", 
-                        "gpt-5-nano-2025-08-07",
-                        "gpt-4-turbo"
-                    ]
-                    
-                    # Verificar se modelo usa API nova
-                    usa_api_nova = any(modelo_novo in modelo for modelo_novo in modelos_nova_api)
-                    
-                    if usa_api_nova:
-                        parametros_api["max_completion_tokens"] = max_tokens
-                        logger.debug(f"Usando max_completion_tokens={max_tokens} para {modelo}")
-                    else:
-                        parametros_api["max_tokens"] = max_tokens
-                        logger.debug(f"Usando max_tokens={max_tokens} para {modelo}")
-                
-                # Logar parâmetros da chamada (INFO para debug)
-                logger.info("=" * 80)
-                logger.info("📤 PARÂMETROS DA CHAMADA OPENAI:")
-                logger.info(f"Modelo: {parametros_api.get('model')}")
-                logger.info(f"Temperature: {parametros_api.get('temperature', 'padrão')}")
-                logger.info(f"Max tokens/completion: {parametros_api.get('max_tokens') or parametros_api.get('max_completion_tokens', 'não definido')}")
-                logger.info(f"Response format: {parametros_api.get('response_format', 'texto livre')}")
-                logger.info(f"Número de mensagens: {len(parametros_api.get('messages', []))}")
-                
-                # Logar preview do prompt (primeiros 300 chars da última mensagem)
-                if parametros_api.get('messages'):
-                    ultima_msg = parametros_api['messages'][-1]
-                    prompt_preview = ultima_msg.get('content', '')[:300]
-                    logger.info(f"Prompt (preview): {prompt_preview}...")
-                
-                logger.info("=" * 80)
-                
-                # Fazer a chamada à API OpenAI
-                logger.debug(f"Parâmetros completos (DEBUG): {parametros_api}")
-                resposta_da_api = self.cliente_openai.chat.completions.create(**parametros_api)
-                
-                # Calcular tempo de resposta
-                tempo_de_resposta_segundos = time.time() - timestamp_inicio
-                
-                # DEBUG: Logar TODA a resposta da OpenAI
-                logger.info("=" * 80)
-                logger.info("📥 RESPOSTA COMPLETA DA OPENAI:")
-                logger.info(f"Modelo usado: {resposta_da_api.model}")
-                logger.info(f"ID da resposta: {resposta_da_api.id}")
-                logger.info(f"Finish reason: {resposta_da_api.choices[0].finish_reason}")
-                logger.info(f"Message role: {resposta_da_api.choices[0].message.role}")
-                logger.info(f"Message content type: {type(resposta_da_api.choices[0].message.content)}")
-                logger.info(f"Message content length: {len(resposta_da_api.choices[0].message.content) if resposta_da_api.choices[0].message.content else 'None'}")
-                
-                # Logar primeiros 500 caracteres do content
-                content_preview = resposta_da_api.choices[0].message.content
-                if content_preview:
-                    logger.info(f"Content (primeiros 500 chars):\n{content_preview[:500]}")
-                else:
-                    logger.error(f"⚠️  CONTENT É VAZIO OU NONE: {repr(content_preview)}")
-                
-                # Logar usage (tokens)
-                logger.info(f"Tokens - Prompt: {resposta_da_api.usage.prompt_tokens}, "
-                           f"Completion: {resposta_da_api.usage.completion_tokens}, "
-                           f"Total: {resposta_da_api.usage.total_tokens}")
-                
-                # Se houver refusal, logar
-                if hasattr(resposta_da_api.choices[0].message, 'refusal') and resposta_da_api.choices[0].message.refusal:
-                    logger.error(f"🚫 REFUSAL detectado: {resposta_da_api.choices[0].message.refusal}")
-                
-                # Logar objeto completo em formato JSON (para debug avançado)
-                try:
-                    import json
-                    resposta_dict = resposta_da_api.model_dump() if hasattr(resposta_da_api, 'model_dump') else resposta_da_api.dict()
-                    logger.debug(f"Resposta OpenAI (JSON completo):\n{json.dumps(resposta_dict, indent=2, ensure_ascii=False)}")
-                except Exception as e:
-                    logger.debug(f"Não foi possível serializar resposta para JSON: {e}")
-                
-                logger.info("=" * 80)
-                
-                # Extrair texto da resposta
-                texto_da_resposta = resposta_da_api.choices[0].message.content
-                
-                # VALIDAÇÃO: content pode ser None ou vazio (refusal ou erro)
-                if texto_da_resposta is None or texto_da_resposta.strip() == "":
-                    finish_reason = resposta_da_api.choices[0].finish_reason
-                    
-                    logger.error(f"❌ Resposta da API retornou content vazio!")
-                    logger.error(f"Content value: {repr(texto_da_resposta)}")
-                    logger.error(f"Finish reason: {finish_reason}")
-                    
-                    # Verificar se foi por limite de tokens
-                    if finish_reason == "length":
-                        completion_tokens = resposta_da_api.usage.completion_tokens
-                        reasoning_tokens = resposta_da_api.usage.completion_tokens_details.reasoning_tokens if hasattr(resposta_da_api.usage, 'completion_tokens_details') else 0
-                        
-                        logger.error("=" * 80)
-                        logger.error("🚨 ERRO: LIMITE DE TOKENS ATINGIDO")
-                        logger.error(f"Completion tokens usados: {completion_tokens}")
-                        logger.error(f"Reasoning tokens: {reasoning_tokens}")
-                        logger.error(f"Max tokens configurado: {parametros_api.get('max_completion_tokens') or parametros_api.get('max_tokens')}")
-                        logger.error("💡 SOLUÇÃO: Aumente o max_tokens na chamada do agente")
-                        logger.error("=" * 80)
-                        
-                        raise ValueError(
-                            f"Limite de tokens atingido ({completion_tokens} tokens usados, "
-                            f"{reasoning_tokens} reasoning). Aumente max_tokens."
-                        )
-                    
-                    if hasattr(resposta_da_api.choices[0].message, 'refusal'):
-                        logger.error(f"Refusal: {resposta_da_api.choices[0].message.refusal}")
-                    
-                    # Logar informações completas da resposta para debug
-                    logger.error(f"Resposta completa da API: {resposta_da_api}")
-                    logger.error(f"Parâmetros enviados: {parametros_api}")
-                    
-                    raise ValueError(
-                        f"API retornou content vazio (finish_reason: {finish_reason})"
-                    )
-                
-                # Extrair informações de uso (tokens)
-                tokens_de_prompt = resposta_da_api.usage.prompt_tokens
-                tokens_de_resposta = resposta_da_api.usage.completion_tokens
-                tokens_totais = resposta_da_api.usage.total_tokens
-                
-                # Calcular custo estimado
-                custo_estimado = self._calcular_custo_estimado(
+                parametros_api = self._montar_parametros_api(
+                    mensagens_para_api=mensagens_para_api,
                     modelo=modelo,
-                    tokens_de_prompt=tokens_de_prompt,
-                    tokens_de_resposta=tokens_de_resposta
+                    temperatura=temperatura,
+                    max_tokens=max_tokens,
+                    timeout_segundos=timeout_segundos,
+                    response_format=response_format,
+                    response_schema=response_schema,
                 )
                 
-                # Criar estatística da chamada
-                estatistica = EstatisticaChamadaLLM(
-                    timestamp=datetime.now().isoformat(),
-                    modelo_utilizado=modelo,
-                    tokens_de_prompt=tokens_de_prompt,
-                    tokens_de_resposta=tokens_de_resposta,
-                    tokens_totais=tokens_totais,
-                    custo_estimado_usd=custo_estimado,
-                    tempo_de_resposta_segundos=tempo_de_resposta_segundos,
-                    sucesso=True,
-                )
-                
-                # Adicionar às estatísticas globais
-                estatisticas_globais_llm.adicionar_chamada(estatistica)
+                # Fazer a chamada à API OpenAI (a vaga do agendador NÃO fica
+                # presa durante o backoff entre tentativas)
+                with self._reservar_vaga(modelo):
+                    if ao_receber_fragmento is None:
+                        resposta_da_api = self.cliente_openai.chat.completions.create(**parametros_api)
+                    else:
+                        parametros_api = _parametros_com_streaming(parametros_api)
+                        acumulador_do_fluxo = _AcumuladorDeFluxoLLM(ao_receber_fragmento)
+                        for chunk in self.cliente_openai.chat.completions.create(**parametros_api):
+                            acumulador_do_fluxo.adicionar(chunk)
+                        resposta_da_api = acumulador_do_fluxo.montar_resposta()
                 
-                # Log de sucesso com informações detalhadas
-                logger.info(
-                    f"Chamada LLM bem-sucedida | "
-                    f"Modelo: {modelo} | "
-                    f"Tokens: {tokens_totais} | "
-                    f"Custo: ${custo_estimado:.4f} | "
-                    f"Tempo: {tempo_de_resposta_segundos:.2f}s"
+                texto_da_resposta, estatistica = self._processar_resposta(
+                    resposta_da_api=resposta_da_api,
+                    modelo=modelo,
+                    parametros_api=parametros_api,
+                    timestamp_inicio=timestamp_inicio,
+                    agente=agente,
+                    erros_das_tentativas=erros_das_tentativas,
                 )
-                
+                resiliencia.registrar_resultado(modelo, tentativa=tentativa)
+                self._salvar_no_cache_respostas(cache, chave_cache, modelo, texto_da_resposta, estatistica)
                 return texto_da_resposta
             
-            except BadRequestError as erro:
-                # Erro 400: Request inválido (schema errado, parâmetros inválidos, etc)
-                # NÃO FAZER RETRY - problema está no código/schema, não vai se resolver sozinho
+            except Exception as erro:
                 ultima_excecao = erro
-                erro_str = str(erro)
+                erros_das_tentativas.append(type(erro).__name__)
+                resiliencia.registrar_resultado(modelo, erro, tentativa=tentativa)
                 
-                logger.error("=" * 80)
-                logger.error(f"❌ BadRequestError (400) - REQUEST INVÁLIDO")
-                logger.error(f"Tentativa: {numero_da_tentativa_atual}")
-                logger.error(f"Erro: {erro_str}")
-                logger.error(f"Modelo: {modelo}")
-                logger.error(f"Parâmetros enviados: {parametros_api}")
-                logger.error("=" * 80)
-                logger.error("🚫 ABORTAR: Erro 400 não é recuperável via retry.")
-                logger.error("💡 AÇÃO: Verifique o schema Pydantic ou parâmetros da chamada.")
+                if not self._tentativa_pode_ser_repetida(
+                    erro=erro,
+                    numero_da_tentativa=numero_da_tentativa_atual,
+                    modelo=modelo,
+                    parametros_api=parametros_api,
+                    timeout_segundos=timeout_segundos,
+                ) or self._fluxo_ja_emitiu_fragmentos(acumulador_do_fluxo):
+                    break
                 
-                # Sair do loop imediatamente - não adianta retry
+                # Se não é a última tentativa, esperar e tentar novamente. None:
+                # circuito aberto, Retry-After longo demais ou orçamento esgotado
+                if numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
+                    tempo_de_espera_segundos = resiliencia.calcular_espera(modelo, numero_da_tentativa_atual, erro)
+                    if tempo_de_espera_segundos is None:
+                        break
+                    time.sleep(tempo_de_espera_segundos)
+            
+            except BaseException:
+                # Tentativa interrompida sem resultado (ex.: KeyboardInterrupt):
+                # libera a sondagem do disjuntor, se era ela
+                resiliencia.liberar_tentativa(modelo, tentativa)
+                raise
+        
+        # Se chegou aqui, todas as tentativas falharam
+        self._registrar_falha_e_lancar(ultima_excecao, modelo, timestamp_inicio, agente, erros_das_tentativas)
+    
+    async def chamar_llm_async(
+        self,
+        prompt: str,
+        modelo: str = "gpt-4o-mini",
+        temperatura: float = 0.7,
+        max_tokens: Optional[int] = None,
+        mensagens_de_sistema: Optional[str] = None,
+        timeout_segundos: int = TIMEOUT_PADRAO_CHAMADA_API_SEGUNDOS,
+        response_format: Optional[str] = None,
+        response_schema: Optional[type[BaseModel]] = None,
+        usar_cache: Optional[bool] = None,
+        ao_receber_fragmento: Optional[CallbackDeFragmento] = None,
+        agente: Optional[str] = None,
+        contexto_compartilhado: Optional[str] = None,
+    ) -> str:
+        """
+        Versão assíncrona (nativa) de chamar_llm().
+        
+        CONTEXTO:
+        O coordenador e o orquestrador de petições disparam vários agentes ao
+        mesmo tempo. Com chamar_llm() cada chamada ocupava uma thread do pool
+        (run_in_executor / ThreadPoolExecutor), inclusive durante o time.sleep
+        do backoff. Aqui a chamada usa o cliente AsyncOpenAI e o backoff usa
+        asyncio.sleep: centenas de chamadas simultâneas custam corrotinas,
+        não threads.
+        
+        IMPLEMENTAÇÃO:
+        Mesmos parâmetros, mesma política de retry, mesmo cache de
+        respostas, mesmas estatísticas e mesmas exceções de chamar_llm() (a
+        lógica é compartilhada pelos métodos auxiliares
+        _consultar_cache_respostas, _montar_parametros_api,
+        _processar_resposta, _tentativa_pode_ser_repetida e
+        _registrar_falha_e_lancar, mais o ResilienciaLLM compartilhado). O
+        streaming (ao_receber_fragmento) também funciona igual, lendo o fluxo
+        com async for.
+        
+        Returns:
+            str: Resposta gerada pelo modelo (JSON string se usando schema)
+        
+        Raises:
+            ErroLimiteTaxaExcedido: Se todos os retries falharem por rate limit
+            ErroTimeoutAPI: Se a chamada exceder o timeout
+            ErroGeralAPI: Para outros erros da API OpenAI
+        """
+        logger.info(f"Iniciando chamada assíncrona ao LLM (modelo: {modelo})")
+        
+        cache, chave_cache, resposta_em_cache = self._consultar_cache_respostas(
+            usar_cache, modelo, mensagens_de_sistema, prompt, temperatura,
+            max_tokens, response_format, response_schema, contexto_compartilhado
+        )
+        if resposta_em_cache is not None:
+            if ao_receber_fragmento is not None:
+                _AcumuladorDeFluxoLLM(ao_receber_fragmento).adicionar_texto_completo(resposta_em_cache)
+            return resposta_em_cache
+        
+        mensagens_para_api = self._montar_mensagens(prompt, mensagens_de_sistema, contexto_compartilhado)
+        cliente_openai_async = self._obter_cliente_openai_async()
+        
+        resiliencia = self._resolver_resiliencia()
+        resiliencia.registrar_chamada()
+        
+        numero_da_tentativa_atual = 0
+        ultima_excecao = None
+        parametros_api = None
+        acumulador_do_fluxo: Optional[_AcumuladorDeFluxoLLM] = None
+        erros_das_tentativas: List[str] = []
+        
+        timestamp_inicio = time.time()
+        
+        while numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
+            numero_da_tentativa_atual += 1
+            
+            tentativa = resiliencia.permitir_tentativa(modelo)
+            if tentativa is None:
+                ultima_excecao = self._circuito_aberto(ultima_excecao, modelo, resiliencia, erros_das_tentativas)
                 break
             
-            except RateLimitError as erro:
-                # Rate limit atingido: implementar backoff exponencial
-                ultima_excecao = erro
+            try:
+                logger.debug(
+                    f"Tentativa {numero_da_tentativa_atual}/"
+                    f"{NUMERO_MAXIMO_DE_TENTATIVAS_RETRY} (assíncrona)"
+                )
                 
-                logger.warning(
-                    f"Rate limit atingido na tentativa {numero_da_tentativa_atual}. "
-                    f"Aguardando {tempo_de_espera_atual_segundos}s antes de tentar novamente."
+                parametros_api = self._montar_parametros_api(
+                    mensagens_para_api=mensagens_para_api,
+                    modelo=modelo,
+                    temperatura=temperatura,
+                    max_tokens=max_tokens,
+                    timeout_segundos=timeout_segundos,
+                    response_format=response_format,
+                    response_schema=response_schema,
                 )
                 
-                # Se não é a última tentativa, esperar e tentar novamente
-                if numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
-                    time.sleep(tempo_de_espera_atual_segundos)
-                    # Aumentar tempo de espera para próxima tentativa (backoff exponencial)
-                    tempo_de_espera_atual_segundos *= FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL
-            
-            except APITimeoutError as erro:
-                # Timeout na chamada à API
-                ultima_excecao = erro
+                async with self._reservar_vaga_async(modelo):
+                    if ao_receber_fragmento is None:
+                        resposta_da_api = await cliente_openai_async.chat.completions.create(**parametros_api)
+                    else:
+                        parametros_api = _parametros_com_streaming(parametros_api)
+                        acumulador_do_fluxo = _AcumuladorDeFluxoLLM(ao_receber_fragmento)
+                        async for chunk in await cliente_openai_async.chat.completions.create(**parametros_api):
+                            acumulador_do_fluxo.adicionar(chunk)
+                        resposta_da_api = acumulador_do_fluxo.montar_resposta()
                 
-                logger.error(
-                    f"Timeout na chamada à API (tentativa {numero_da_tentativa_atual}). "
-                    f"Tempo limite: {timeout_segundos}s"
+                texto_da_resposta, estatistica = self._processar_resposta(
+                    resposta_da_api=resposta_da_api,
+                    modelo=modelo,
+                    parametros_api=parametros_api,
+                    timestamp_inicio=timestamp_inicio,
+                    agente=agente,
+                    erros_das_tentativas=erros_das_tentativas,
                 )
-                
-                # Timeout geralmente indica problemas na OpenAI ou na rede
-                # Retry pode ajudar
-                if numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
-                    time.sleep(tempo_de_espera_atual_segundos)
-                    tempo_de_espera_atual_segundos *= FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL
+                resiliencia.registrar_resultado(modelo, tentativa=tentativa)
+                self._salvar_no_cache_respostas(cache, chave_cache, modelo, texto_da_resposta, estatistica)
+                return texto_da_resposta
             
-            except APIError as erro:
-                # Erro genérico da API OpenAI
+            except Exception as erro:
                 ultima_excecao = erro
+                erros_das_tentativas.append(type(erro).__name__)
+                resiliencia.registrar_resultado(modelo, erro, tentativa=tentativa)
                 
-                logger.error(
-                    f"Erro na API OpenAI (tentativa {numero_da_tentativa_atual}): {str(erro)}"
-                )
+                if not self._tentativa_pode_ser_repetida(
+                    erro=erro,
+                    numero_da_tentativa=numero_da_tentativa_atual,
+                    modelo=modelo,
+                    parametros_api=parametros_api,
+                    timeout_segundos=timeout_segundos,
+                ) or self._fluxo_ja_emitiu_fragmentos(acumulador_do_fluxo):
+                    break
                 
-                # Alguns erros não são recuperáveis via retry (ex: prompt inválido)
-                # Mas tentamos mesmo assim
+                # Backoff sem bloquear o event loop
                 if numero_da_tentativa_atual < NUMERO_MAXIMO_DE_TENTATIVAS_RETRY:
-                    time.sleep(tempo_de_espera_atual_segundos)
-                    tempo_de_espera_atual_segundos *= FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL
+                    tempo_de_espera_segundos = resiliencia.calcular_espera(modelo, numero_da_tentativa_atual, erro)
+                    if tempo_de_espera_segundos is None:
+                        break
+                    await asyncio.sleep(tempo_de_espera_segundos)
             
-            except Exception as erro:
-                # Erro inesperado
-                ultima_excecao = erro
-                
-                logger.error(
-                    f"Erro inesperado na chamada ao LLM: {str(erro)}",
-                    exc_info=True
+            except BaseException:
+                # Task cancelada (asyncio.CancelledError não é Exception) no
+                # meio da tentativa: libera a sondagem do disjuntor, se era ela
+                resiliencia.liberar_tentativa(modelo, tentativa)
+                raise
+        
+        self._registrar_falha_e_lancar(ultima_excecao, modelo, timestamp_inicio, agente, erros_das_tentativas)
+    
+    def _fluxo_ja_emitiu_fragmentos(self, acumulador_do_fluxo: Optional[_AcumuladorDeFluxoLLM]) -> bool:
+        """
+        Indica se a tentativa em streaming que falhou já entregou texto ao cliente.
+        
+        Nesse caso a falha não é repetida: uma nova tentativa geraria outro
+        texto, que seria emitido em sequência ao trecho já entregue.
+        """
+        if acumulador_do_fluxo is None or acumulador_do_fluxo.fragmentos_emitidos == 0:
+            return False
+        logger.error(
+            f"Falha após {acumulador_do_fluxo.fragmentos_emitidos} fragmentos já emitidos "
+            f"em streaming; a chamada não será repetida."
+        )
+        return True
+    
+    def _obter_cliente_openai_async(self) -> AsyncOpenAI:
+        """
+        Retorna o cliente AsyncOpenAI do event loop em execução (criação preguiçosa).
+        
+        CONTEXTO:
+        As conexões HTTP do cliente assíncrono ficam presas ao event loop em
+        que foram abertas. A análise de petições roda cada requisição em um
+        asyncio.run() próprio (loop novo), e várias dessas threads podem estar
+        ativas ao mesmo tempo.
+        
+        IMPLEMENTAÇÃO:
+        Um cliente por loop, guardado em um WeakKeyDictionary: loops
+        simultâneos não substituem o cliente uns dos outros (o que descartaria
+        pools ainda em uso). Entradas de loops já fechados são removidas aqui,
+        porque o cliente costuma manter referência ao próprio loop e a entrada
+        fraca sozinha não seria liberada. As conexões desses clientes já foram
+        encerradas junto com o loop; não há como aguardar aclose() nele.
+        
+        Returns:
+            AsyncOpenAI: Cliente ligado ao loop atual
+        """
+        loop_atual = asyncio.get_running_loop()
+        with self._lock_clientes_async:
+            for loop_fechado in [loop for loop in self._clientes_openai_async if loop.is_closed()]:
+                del self._clientes_openai_async[loop_fechado]
+            
+            cliente = self._clientes_openai_async.get(loop_atual)
+            if cliente is None:
+                cliente = AsyncOpenAI(api_key=self.chave_api, max_retries=0)
+                self._clientes_openai_async[loop_atual] = cliente
+            return cliente
+    
+    def _resolver_agendador(self) -> Optional[AgendadorChamadasLLM]:
+        """
+        Agendador injetado ou, com LLM_AGENDADOR_ATIVADO=true, o compartilhado.
+        
+        Returns:
+            AgendadorChamadasLLM ou None (chamadas sem limite de concorrência)
+        """
+        if self._agendador is not None:
+            return self._agendador
+        if not obter_configuracoes().LLM_AGENDADOR_ATIVADO:
+            return None
+        return obter_agendador_llm()
+    
+    def _reservar_vaga(self, modelo: str):
+        """
+        Context manager que ocupa uma vaga do modelo durante uma tentativa.
+        
+        Prioridade e análise vêm de contexto_agendamento_llm() (ver agendador_llm).
+        """
+        agendador = self._resolver_agendador()
+        return agendador.reservar(modelo) if agendador is not None else nullcontext()
+    
+    def _reservar_vaga_async(self, modelo: str):
+        """
+        Versão assíncrona de _reservar_vaga (espera sem bloquear o event loop).
+        """
+        agendador = self._resolver_agendador()
+        return agendador.reservar_async(modelo) if agendador is not None else nullcontext()
+    
+    def _resolver_resiliencia(self) -> ResilienciaLLM:
+        """
+        ResilienciaLLM injetado ou o compartilhado (disjuntor e orçamento do processo).
+        """
+        return self._resiliencia if self._resiliencia is not None else obter_resiliencia_llm()
+    
+    def _circuito_aberto(
+        self,
+        ultima_excecao: Optional[Exception],
+        modelo: str,
+        resiliencia: ResilienciaLLM,
+        erros_das_tentativas: List[str]
+    ) -> Exception:
+        """
+        Exceção a lançar quando o disjuntor do modelo rejeita a tentativa.
+        
+        Na 1ª tentativa a chamada falha com ErroCircuitoAbertoLLM, sem ir ao
+        provedor; numa repetição prevalece o erro da tentativa anterior.
+        """
+        if ultima_excecao is not None:
+            return ultima_excecao
+        erro = ErroCircuitoAbertoLLM(
+            f"Circuito do modelo {modelo} aberto após falhas consecutivas do provedor. "
+            f"Nova tentativa liberada em {resiliencia.segundos_para_liberar(modelo):.0f}s."
+        )
+        erros_das_tentativas.append(type(erro).__name__)
+        return erro
+    
+    def _resolver_cache_respostas(
+        self,
+        usar_cache: Optional[bool],
+        temperatura: float
+    ) -> Optional[CacheRespostasLLM]:
+        """
+        Decide se a chamada usa o cache de respostas.
+        
+        REGRAS:
+        - usar_cache=False: nunca (opt-out do agente)
+        - Sem cache injetado e LLM_CACHE_ATIVADO=false: nunca
+        - usar_cache=True: sempre (opt-in do agente)
+        - usar_cache=None: só se temperatura <= LLM_CACHE_TEMPERATURA_MAXIMA
+          (respostas de temperatura alta devem variar a cada chamada)
+        
+        Returns:
+            CacheRespostasLLM ou None (chamada sem cache)
+        """
+        if usar_cache is False:
+            return None
+        
+        cache = self._cache_respostas
+        if cache is None:
+            if not obter_configuracoes().LLM_CACHE_ATIVADO:
+                return None
+            cache = obter_cache_respostas_llm()
+        
+        if usar_cache is None and temperatura > cache.temperatura_maxima_automatica:
+            return None
+        return cache
+    
+    def _consultar_cache_respostas(
+        self,
+        usar_cache: Optional[bool],
+        modelo: str,
+        mensagens_de_sistema: Optional[str],
+        prompt: str,
+        temperatura: float,
+        max_tokens: Optional[int],
+        response_format: Optional[str],
+        response_schema: Optional[type[BaseModel]],
+        contexto_compartilhado: Optional[str] = None,
+    ) -> Tuple[Optional[CacheRespostasLLM], Optional[str], Optional[str]]:
+        """
+        Procura a requisição no cache de respostas.
+        
+        Falhas do cache (ErroDeCacheRespostasLLM) são logadas e a chamada
+        segue para a API sem cache: o cache é opcional.
+        
+        Returns:
+            (cache a usar na gravação ou None, chave da requisição, resposta em cache ou None)
+        """
+        try:
+            cache = self._resolver_cache_respostas(usar_cache, temperatura)
+            if cache is None:
+                return None, None, None
+            
+            chave_cache = calcular_chave_cache(
+                modelo=modelo,
+                mensagens_de_sistema=mensagens_de_sistema,
+                prompt=prompt,
+                temperatura=temperatura,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                response_schema=response_schema,
+                contexto_compartilhado=contexto_compartilhado,
+            )
+            resposta_em_cache = cache.obter(chave_cache)
+        except ErroDeCacheRespostasLLM as erro:
+            logger.warning(f"Cache de respostas do LLM indisponível, chamando a API: {erro}")
+            return None, None, None
+        
+        if resposta_em_cache is None:
+            return cache, chave_cache, None
+        
+        logger.info(
+            f"♻️  Resposta do LLM obtida do cache | "
+            f"Modelo: {modelo} | "
+            f"Tokens evitados: {resposta_em_cache.tokens_totais} | "
+            f"Custo evitado: ${resposta_em_cache.custo_estimado_usd:.4f}"
+        )
+        return cache, chave_cache, resposta_em_cache.resposta
+    
+    def _salvar_no_cache_respostas(
+        self,
+        cache: Optional[CacheRespostasLLM],
+        chave_cache: Optional[str],
+        modelo: str,
+        texto_da_resposta: str,
+        estatistica: EstatisticaChamadaLLM
+    ) -> None:
+        """
+        Grava a resposta bem-sucedida no cache (se a chamada usa cache).
+        """
+        if cache is None or chave_cache is None:
+            return
+        try:
+            cache.salvar(
+                chave=chave_cache,
+                modelo=modelo,
+                resposta=texto_da_resposta,
+                tokens_totais=estatistica.tokens_totais,
+                custo_estimado_usd=estatistica.custo_estimado_usd,
+            )
+        except ErroDeCacheRespostasLLM as erro:
+            # Não propagamos: a resposta já foi obtida, só não será reaproveitada
+            logger.warning(f"Não foi possível gravar a resposta no cache do LLM: {erro}")
+    
+    def _montar_mensagens(
+        self,
+        prompt: str,
+        mensagens_de_sistema: Optional[str],
+        contexto_compartilhado: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Monta a lista de mensagens enviada à API.
+        
+        LAYOUT (cache de prompt do provedor):
+        O provedor só reaproveita o processamento de um PREFIXO idêntico da
+        requisição. Por isso o contexto compartilhado (igual para todos os
+        agentes de uma análise) vem primeiro, seguido da mensagem de sistema
+        (fixa por agente) e, por último, do prompt da tarefa (o que muda):
+        
+            [user: contexto compartilhado] → [system] → [user: prompt]
+        
+        Sem contexto compartilhado: [system] → [user: prompt].
+        """
+        mensagens_para_api = []
+        
+        # Contexto comum primeiro: prefixo idêntico entre agentes
+        if contexto_compartilhado:
+            mensagens_para_api.append({
+                "role": "user",
+                "content": contexto_compartilhado
+            })
+        
+        # Adicionar mensagem de sistema se fornecida
+        if mensagens_de_sistema:
+            mensagens_para_api.append({
+                "role": "system",
+                "content": mensagens_de_sistema
+            })
+        
+        # Adicionar prompt do usuário
+        mensagens_para_api.append({
+            "role": "user",
+            "content": prompt
+        })
+        
+        return mensagens_para_api
+    
+    def _montar_parametros_api(
+        self,
+        mensagens_para_api: List[Dict[str, str]],
+        modelo: str,
+        temperatura: float,
+        max_tokens: Optional[int],
+        timeout_segundos: int,
+        response_format: Optional[str],
+        response_schema: Optional[type[BaseModel]],
+    ) -> Dict[str, Any]:
+        """
+        Monta os parâmetros de chat.completions.create (comum às versões síncrona e assíncrona).
+        
+        Trata as diferenças entre modelos (temperature, max_tokens vs
+        max_completion_tokens) e o formato da resposta (Structured Outputs
+        ou JSON mode).
+        
+        Returns:
+            dict: Parâmetros prontos para chat.completions.create(**parametros)
+        """
+        # Preparar parâmetros para a chamada à API
+        parametros_api = {
+            "model": modelo,
+            "messages": mensagens_para_api,
+            "timeout": timeout_segundos,
+        }
+        
+        # GPT-5-nano só aceita temperature=1 (padrão)
+        # Para outros modelos, usar temperature customizada
+        if modelo == "gpt-5-nano-2025-08-07":
+            # Não incluir temperature para usar o padrão (1)
+            logger.debug(f"Modelo {modelo} usa temperature padrão (1)")
+        else:
+            parametros_api["temperature"] = temperatura
+        
+        # ===== STRUCTURED OUTPUTS (PRIORITÁRIO) =====
+        # Se schema Pydantic fornecido, usar Structured Outputs (garantia de formato exato)
+        if response_schema is not None:
+            logger.info(f"🎯 Usando Structured Outputs com schema: {response_schema.__name__}")
+            
+            # Structured Outputs: define formato exato da resposta
+            # https://platform.openai.com/docs/guides/structured-outputs
+            
+            # Gerar JSON schema do modelo Pydantic
+            schema_dict = response_schema.model_json_schema()
+            
+            # CRÍTICO: OpenAI Structured Outputs exige:
+            # 1. 'additionalProperties': false em TODOS os objetos
+            # 2. 'required' deve incluir TODAS as propriedades (exceto opcionais)
+            
+            def fix_schema_for_openai(schema_obj):
+                """Corrige schema recursivamente para Structured Outputs"""
+                if isinstance(schema_obj, dict):
+                    # $ref não pode ter keywords extras (description, title, etc.)
+                    if "$ref" in schema_obj:
+                        chaves_para_remover = [
+                            chave for chave in schema_obj.keys()
+                            if chave not in {"$ref"}
+                        ]
+                        for chave in chaves_para_remover:
+                            schema_obj.pop(chave, None)
+                        # Nada mais a fazer neste nível além de seguir recursão
+                    
+                    # Se é um objeto, adicionar additionalProperties: false
+                    if schema_obj.get('type') == 'object':
+                        schema_obj['additionalProperties'] = False
+                        
+                        # Se tem properties, garantir que TODAS estejam em required
+                        # (exceto as que Pydantic já marcou como opcionais)
+                        if 'properties' in schema_obj:
+                            all_props = list(schema_obj['properties'].keys())
+                            
+                            # Manter required existente se presente, senão criar
+                            if 'required' not in schema_obj:
+                                schema_obj['required'] = all_props
+                            else:
+                                # Se required já existe, adicionar props faltantes
+                                existing_required = set(schema_obj['required'])
+                                missing_props = set(all_props) - existing_required
+                                if missing_props:
+                                    schema_obj['required'].extend(missing_props)
+                    
+                    # Processar recursivamente
+                    for value in schema_obj.values():
+                        fix_schema_for_openai(value)
+                        
+                elif isinstance(schema_obj, list):
+                    for item in schema_obj:
+                        fix_schema_for_openai(item)
+            
+            fix_schema_for_openai(schema_dict)
+            
+            parametros_api["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": response_schema.__name__,
+                    "schema": schema_dict,
+                    "strict": True  # Modo strict: garante 100% de conformidade
+                }
+            }
+            
+            logger.debug(f"Schema JSON corrigido para OpenAI: {schema_dict}")
+            
+        # ===== JSON MODE (FALLBACK) =====
+        # Adicionar response_format se fornecido (JSON mode - estrutura livre)
+        # NOTA: Alguns modelos beta podem não suportar JSON mode
+        elif response_format == "json_object":
+            # Lista de modelos que SABEMOS que suportam JSON mode
+            modelos_json_suportados = [
+                "gpt-4o",
+                "gpt-4o-mini",
+                "gpt-4-turbo",
+                "gpt-4-0125-preview",
+                "gpt-3.5-turbo-0125"
+            ]
+            
+            # Verificar se modelo suporta JSON mode
+            suporta_json = any(m in modelo for m in modelos_json_suportados)
+            
+            if suporta_json:
+                parametros_api["response_format"] = {"type": "json_object"}
+                logger.debug(f"✅ Usando JSON mode para {modelo}")
+            else:
+                logger.warning(
+                    f"⚠️  Modelo {modelo} pode não suportar JSON mode oficialmente. "
+                    "Tentando mesmo assim..."
                 )
+                # Tentar mesmo assim (pode funcionar em modelos beta)
+                parametros_api["response_format"] = {"type": "json_object"}
+        
+        # IMPORTANTE: OpenAI mudou API em 2024
+        # Modelos novos (GPT-4o, GPT-5) usam 'max_completion_tokens'
+        # Modelos antigos (GPT-3.5, GPT-4 original) usam 'max_tokens'
+        if max_tokens is not None:
+            # Lista de modelos que usam max_completion_tokens (API nova)
+            modelos_nova_api = [
+                "gpt-4o",
+                "gpt-4o-mini", 
+                "gpt-5-nano-2025-08-07",
+                "gpt-4-turbo"
+            ]
+            
+            # Verificar se modelo usa API nova
+            usa_api_nova = any(modelo_novo in modelo for modelo_novo in modelos_nova_api)
+            
+            if usa_api_nova:
+                parametros_api["max_completion_tokens"] = max_tokens
+                logger.debug(f"Usando max_completion_tokens={max_tokens} para {modelo}")
+            else:
+                parametros_api["max_tokens"] = max_tokens
+                logger.debug(f"Usando max_tokens={max_tokens} para {modelo}")
+        
+        # Logar parâmetros da chamada (INFO para debug)
+        logger.info("=" * 80)
+        logger.info("📤 PARÂMETROS DA CHAMADA OPENAI:")
+        logger.info(f"Modelo: {parametros_api.get('model')}")
+        logger.info(f"Temperature: {parametros_api.get('temperature', 'padrão')}")
+        logger.info(f"Max tokens/completion: {parametros_api.get('max_tokens') or parametros_api.get('max_completion_tokens', 'não definido')}")
+        logger.info(f"Response format: {parametros_api.get('response_format', 'texto livre')}")
+        logger.info(f"Número de mensagens: {len(parametros_api.get('messages', []))}")
+        
+        # Logar preview do prompt (primeiros 300 chars da última mensagem)
+        if parametros_api.get('messages'):
+            ultima_msg = parametros_api['messages'][-1]
+            prompt_preview = ultima_msg.get('content', '')[:300]
+            logger.info(f"Prompt (preview): {prompt_preview}...")
+        
+        logger.info("=" * 80)
+        logger.debug(f"Parâmetros completos (DEBUG): {parametros_api}")
+        
+        return parametros_api
+    
+    def _processar_resposta(
+        self,
+        resposta_da_api: Any,
+        modelo: str,
+        parametros_api: Dict[str, Any],
+        timestamp_inicio: float,
+        agente: Optional[str] = None,
+        erros_das_tentativas: Optional[List[str]] = None
+    ) -> Tuple[str, EstatisticaChamadaLLM]:
+        """
+        Valida a resposta da API, registra tokens/custo e retorna o texto gerado.
+        
+        Args:
+            resposta_da_api: Objeto ChatCompletion retornado pela OpenAI
+            modelo: Modelo solicitado (usado na tabela de custos)
+            parametros_api: Parâmetros enviados (para logs de erro)
+            timestamp_inicio: time.time() do início da chamada (inclui retries)
+            agente: Agente que fez a chamada (telemetria)
+            erros_das_tentativas: Classes dos erros das tentativas anteriores (retries)
+        
+        Returns:
+            (texto da resposta, estatística registrada da chamada)
+        
+        Raises:
+            ValueError: Se a resposta vier vazia (refusal ou limite de tokens)
+        """
+        # Calcular tempo de resposta
+        tempo_de_resposta_segundos = time.time() - timestamp_inicio
+        
+        # DEBUG: Logar TODA a resposta da OpenAI
+        logger.info("=" * 80)
+        logger.info("📥 RESPOSTA COMPLETA DA OPENAI:")
+        logger.info(f"Modelo usado: {resposta_da_api.model}")
+        logger.info(f"ID da resposta: {resposta_da_api.id}")
+        logger.info(f"Finish reason: {resposta_da_api.choices[0].finish_reason}")
+        logger.info(f"Message role: {resposta_da_api.choices[0].message.role}")
+        logger.info(f"Message content type: {type(resposta_da_api.choices[0].message.content)}")
+        logger.info(f"Message content length: {len(resposta_da_api.choices[0].message.content) if resposta_da_api.choices[0].message.content else 'None'}")
+        
+        # Logar primeiros 500 caracteres do content
+        content_preview = resposta_da_api.choices[0].message.content
+        if content_preview:
+            logger.info(f"Content (primeiros 500 chars):\n{content_preview[:500]}")
+        else:
+            logger.error(f"⚠️  CONTENT É VAZIO OU NONE: {repr(content_preview)}")
+        
+        # Logar usage (tokens)
+        logger.info(f"Tokens - Prompt: {resposta_da_api.usage.prompt_tokens}, "
+                   f"Completion: {resposta_da_api.usage.completion_tokens}, "
+                   f"Total: {resposta_da_api.usage.total_tokens}")
+        
+        # Se houver refusal, logar
+        if hasattr(resposta_da_api.choices[0].message, 'refusal') and resposta_da_api.choices[0].message.refusal:
+            logger.error(f"🚫 REFUSAL detectado: {resposta_da_api.choices[0].message.refusal}")
+        
+        # Logar objeto completo em formato JSON (para debug avançado)
+        try:
+            import json
+            resposta_dict = resposta_da_api.model_dump() if hasattr(resposta_da_api, 'model_dump') else resposta_da_api.dict()
+            logger.debug(f"Resposta OpenAI (JSON completo):\n{json.dumps(resposta_dict, indent=2, ensure_ascii=False)}")
+        except Exception as e:
+            logger.debug(f"Não foi possível serializar resposta para JSON: {e}")
+        
+        logger.info("=" * 80)
+        
+        # Extrair texto da resposta
+        texto_da_resposta = resposta_da_api.choices[0].message.content
+        
+        # VALIDAÇÃO: content pode ser None ou vazio (refusal ou erro)
+        if texto_da_resposta is None or texto_da_resposta.strip() == "":
+            finish_reason = resposta_da_api.choices[0].finish_reason
+            
+            logger.error(f"❌ Resposta da API retornou content vazio!")
+            logger.error(f"Content value: {repr(texto_da_resposta)}")
+            logger.error(f"Finish reason: {finish_reason}")
+            
+            # Verificar se foi por limite de tokens
+            if finish_reason == "length":
+                completion_tokens = resposta_da_api.usage.completion_tokens
+                reasoning_tokens = resposta_da_api.usage.completion_tokens_details.reasoning_tokens if hasattr(resposta_da_api.usage, 'completion_tokens_details') else 0
                 
-                # Para erros inesperados, não fazer retry
-                break
+                logger.error("=" * 80)
+                logger.error("🚨 ERRO: LIMITE DE TOKENS ATINGIDO")
+                logger.error(f"Completion tokens usados: {completion_tokens}")
+                logger.error(f"Reasoning tokens: {reasoning_tokens}")
+                logger.error(f"Max tokens configurado: {parametros_api.get('max_completion_tokens') or parametros_api.get('max_tokens')}")
+                logger.error("💡 SOLUÇÃO: Aumente o max_tokens na chamada do agente")
+                logger.error("=" * 80)
+                
+                raise ValueError(
+                    f"Limite de tokens atingido ({completion_tokens} tokens usados, "
+                    f"{reasoning_tokens} reasoning). Aumente max_tokens."
+                )
+            
+            if hasattr(resposta_da_api.choices[0].message, 'refusal'):
+                logger.error(f"Refusal: {resposta_da_api.choices[0].message.refusal}")
+            
+            # Logar informações completas da resposta para debug
+            logger.error(f"Resposta completa da API: {resposta_da_api}")
+            logger.error(f"Parâmetros enviados: {parametros_api}")
+            
+            raise ValueError(
+                f"API retornou content vazio (finish_reason: {finish_reason})"
+            )
         
-        # Se chegou aqui, todas as tentativas falharam
+        # Extrair informações de uso (tokens)
+        tokens_de_prompt = resposta_da_api.usage.prompt_tokens
+        tokens_de_resposta = resposta_da_api.usage.completion_tokens
+        tokens_totais = resposta_da_api.usage.total_tokens
+        detalhes_de_resposta = getattr(resposta_da_api.usage, "completion_tokens_details", None)
+        tokens_de_raciocinio = (getattr(detalhes_de_resposta, "reasoning_tokens", None) or 0) if detalhes_de_resposta else 0
+        detalhes_do_prompt = getattr(resposta_da_api.usage, "prompt_tokens_details", None)
+        tokens_de_prompt_em_cache = (getattr(detalhes_do_prompt, "cached_tokens", None) or 0) if detalhes_do_prompt else 0
+        
+        # Calcular custo estimado
+        custo_estimado = self._calcular_custo_estimado(
+            modelo=modelo,
+            tokens_de_prompt=tokens_de_prompt,
+            tokens_de_resposta=tokens_de_resposta
+        )
+        
+        # Criar estatística da chamada
+        estatistica = EstatisticaChamadaLLM(
+            timestamp=datetime.now().isoformat(),
+            modelo_utilizado=modelo,
+            tokens_de_prompt=tokens_de_prompt,
+            tokens_de_resposta=tokens_de_resposta,
+            tokens_totais=tokens_totais,
+            custo_estimado_usd=custo_estimado,
+            tempo_de_resposta_segundos=tempo_de_resposta_segundos,
+            sucesso=True,
+            agente=agente,
+            tokens_de_raciocinio=tokens_de_raciocinio,
+            tokens_de_prompt_em_cache=tokens_de_prompt_em_cache,
+            erros_das_tentativas=list(erros_das_tentativas or []),
+        )
+        
+        # Adicionar às estatísticas globais
+        estatisticas_globais_llm.adicionar_chamada(estatistica)
+        
+        # Log de sucesso com informações detalhadas
+        logger.info(
+            f"Chamada LLM bem-sucedida | "
+            f"Modelo: {modelo} | "
+            f"Tokens: {tokens_totais} | "
+            f"Prompt em cache: {tokens_de_prompt_em_cache}/{tokens_de_prompt} | "
+            f"Custo: ${custo_estimado:.4f} | "
+            f"Tempo: {tempo_de_resposta_segundos:.2f}s"
+        )
+        
+        return texto_da_resposta, estatistica
+    
+    def _tentativa_pode_ser_repetida(
+        self,
+        erro: Exception,
+        numero_da_tentativa: int,
+        modelo: str,
+        parametros_api: Optional[Dict[str, Any]],
+        timeout_segundos: int
+    ) -> bool:
+        """
+        Registra o erro de uma tentativa e decide se vale tentar de novo.
+        
+        POLÍTICA DE RETRY:
+        - BadRequestError (400): NÃO repete (problema no schema/parâmetros)
+        - RateLimitError, APITimeoutError, APIError: repete com backoff
+        - Qualquer outro erro (inclusive resposta vazia): NÃO repete
+        
+        Mesmo repetível, a nova tentativa ainda depende de
+        ResilienciaLLM.calcular_espera() (disjuntor, Retry-After e orçamento
+        de retries). A espera em si fica com o chamador (time.sleep em
+        chamar_llm, asyncio.sleep em chamar_llm_async).
+        
+        Returns:
+            bool: True se uma nova tentativa pode ser feita
+        """
+        if isinstance(erro, BadRequestError):
+            # Erro 400: Request inválido (schema errado, parâmetros inválidos, etc)
+            # NÃO FAZER RETRY - problema está no código/schema, não vai se resolver sozinho
+            logger.error("=" * 80)
+            logger.error(f"❌ BadRequestError (400) - REQUEST INVÁLIDO")
+            logger.error(f"Tentativa: {numero_da_tentativa}")
+            logger.error(f"Erro: {str(erro)}")
+            logger.error(f"Modelo: {modelo}")
+            logger.error(f"Parâmetros enviados: {parametros_api}")
+            logger.error("=" * 80)
+            logger.error("🚫 ABORTAR: Erro 400 não é recuperável via retry.")
+            logger.error("💡 AÇÃO: Verifique o schema Pydantic ou parâmetros da chamada.")
+            return False
+        
+        if isinstance(erro, RateLimitError):
+            # Rate limit atingido: backoff (ou o Retry-After informado pelo provedor)
+            logger.warning(f"Rate limit atingido na tentativa {numero_da_tentativa}.")
+            return True
+        
+        if isinstance(erro, APITimeoutError):
+            # Timeout geralmente indica problemas na OpenAI ou na rede; retry pode ajudar
+            logger.error(
+                f"Timeout na chamada à API (tentativa {numero_da_tentativa}). "
+                f"Tempo limite: {timeout_segundos}s"
+            )
+            return True
+        
+        if isinstance(erro, APIError):
+            # Erro genérico da API OpenAI: alguns não são recuperáveis, mas tentamos mesmo assim
+            logger.error(
+                f"Erro na API OpenAI (tentativa {numero_da_tentativa}): {str(erro)}"
+            )
+            return True
+        
+        # Erro inesperado: não fazer retry
+        logger.error(
+            f"Erro inesperado na chamada ao LLM: {str(erro)}",
+            exc_info=erro
+        )
+        return False
+    
+    def _registrar_falha_e_lancar(
+        self,
+        ultima_excecao: Optional[Exception],
+        modelo: str,
+        timestamp_inicio: float,
+        agente: Optional[str] = None,
+        erros_das_tentativas: Optional[List[str]] = None
+    ) -> NoReturn:
+        """
+        Registra a estatística de falha e lança a exceção customizada correspondente.
+        
+        Raises:
+            ErroCircuitoAbertoLLM: Disjuntor do modelo aberto (nenhuma tentativa feita)
+            ErroGeralAPI: BadRequest (400) ou erro genérico/inesperado
+            ErroLimiteTaxaExcedido: Último erro foi rate limit
+            ErroTimeoutAPI: Último erro foi timeout
+        """
         tempo_de_resposta_segundos = time.time() - timestamp_inicio
         
         # Registrar estatística de falha
@@ -659,9 +1468,15 @@ class GerenciadorLLM:
             tempo_de_resposta_segundos=tempo_de_resposta_segundos,
             sucesso=False,
             mensagem_de_erro=str(ultima_excecao),
+            agente=agente,
+            erros_das_tentativas=list(erros_das_tentativas or []),
         )
         estatisticas_globais_llm.adicionar_chamada(estatistica_falha)
         
+        if isinstance(ultima_excecao, ErroCircuitoAbertoLLM):
+            logger.error(str(ultima_excecao))
+            raise ultima_excecao
+        
         # Lançar exceção apropriada baseada no tipo do último erro
         if isinstance(ultima_excecao, BadRequestError):
             # BadRequest (400) - erro no schema/parâmetros
@@ -673,7 +1488,7 @@ class GerenciadorLLM:
         else:
             # Outros erros
             mensagem_erro_final = (
-                f"Falha ao chamar LLM após {NUMERO_MAXIMO_DE_TENTATIVAS_RETRY} tentativas. "
+                f"Falha ao chamar LLM após {len(erros_das_tentativas or []) or 1} tentativa(s). "
                 f"Último erro: {str(ultima_excecao)}"
             )
         
@@ -788,6 +1603,20 @@ class ErroGeralAPI(Exception):
     pass
 
 
+class ErroCircuitoAbertoLLM(ErroGeralAPI):
+    """
+    Lançada sem chamar a API quando o disjuntor do modelo está aberto
+    (falhas consecutivas do provedor; ver resiliencia_llm).
+    
+    Subclasse de ErroGeralAPI: quem já trata ErroGeralAPI continua tratando.
+    
+    COMO LIDAR:
+    - Aguarde LLM_DISJUNTOR_SEGUNDOS_ABERTO e tente de novo
+    - Verifique o status da OpenAI em https://status.openai.com/
+    """
+    pass
+
+
 # ==============================================================================
 # FUNÇÕES UTILITÁRIAS / HEALTH CHECK
 # ==============================================================================
@@ -839,6 +1668,31 @@ def verificar_conexao_openai(chave_api: Optional[str] = None) -> Dict[str, Any]:
         }
 
 
+def obter_metricas_llm(numero_chamadas_recentes: int = 20) -> Dict[str, Any]:
+    """
+    Retorna a telemetria completa do LLM (usada pelo endpoint GET /metricas/llm).
+    
+    Inclui latência p50/p95/p99, tokens (entrada, saída, raciocínio e
+    entrada servida pelo cache de prompt do provedor), custo, retries e
+    erros por classe: no geral, por modelo e por agente, além das últimas
+    chamadas individuais, das estatísticas do cache de respostas, das filas
+    do agendador (profundidade e tempo de espera por prioridade) e da
+    resiliência (disjuntores por modelo, orçamento de retries e esperas).
+    
+    Args:
+        numero_chamadas_recentes: Quantas chamadas individuais incluir
+    
+    Returns:
+        dict: Métricas agregadas (ver EstatisticasGlobaisLLM.obter_metricas)
+    """
+    return {
+        **estatisticas_globais_llm.obter_metricas(numero_chamadas_recentes),
+        "cache_de_respostas": obter_estatisticas_cache_respostas_llm(),
+        "agendador": obter_estatisticas_agendador_llm(),
+        "resiliencia": obter_estatisticas_resiliencia_llm(),
+    }
+
+
 def obter_estatisticas_uso_llm() -> Dict[str, Any]:
     """
     Retorna as estatísticas de uso do LLM desde o início da aplicação.
@@ -846,6 +1700,12 @@ def obter_estatisticas_uso_llm() -> Dict[str, Any]:
     Função auxiliar que pode ser usada em endpoints de monitoramento.
     
     Returns:
-        dict: Estatísticas agregadas de uso
+        dict: Estatísticas agregadas de uso, com os acertos/falhas do cache
+        de respostas em "cache_de_respostas" e disjuntores/orçamento de
+        retries em "resiliencia"
     """
-    return estatisticas_globais_llm.obter_resumo()
+    return {
+        **estatisticas_globais_llm.obter_resumo(),
+        "cache_de_respostas": obter_estatisticas_cache_respostas_llm(),
+        "resiliencia": obter_estatisticas_resiliencia_llm(),
+    }
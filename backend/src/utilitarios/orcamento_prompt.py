@@ -0,0 +1,432 @@
+"""
+Orçamento de Tokens dos Prompts - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Os agentes montam o prompt concatenando documentos inteiros: a análise de
+petição passa a petição completa e TODOS os anexos a cada advogado e perito,
+e o estrategista/prognóstico recebem ainda os pareceres. Com petições longas
+o prompt estoura, o custo dispara e modelos de raciocínio esgotam os tokens
+antes de responder. Cortar pelo número de caracteres (truncar_texto_se_necessario)
+descarta justamente o fim do documento, onde costumam estar os pedidos.
+
+RESPONSABILIDADES:
+1. Contar tokens com o tokenizer da OpenAI (o mesmo encoder em cache de
+   servico_vetorizacao.obter_tokenizer_openai)
+2. Dividir o orçamento do prompt entre SEÇÕES (petição, anexos, pareceres):
+   as instruções do agente são fixas; o restante é repartido por peso, e o
+   que uma seção não usa vai para as outras
+3. Preencher cada seção por RELEVÂNCIA: os documentos são divididos em
+   trechos (parágrafos), ranqueados por BM25 contra a pergunta do agente
+   (IndiceLexical em memória) e incluídos do mais relevante para o menos
+   relevante até a cota acabar. Os trechos escolhidos voltam à ordem
+   original do documento, com "[...]" marcando o que foi omitido
+4. Registrar o uso do orçamento (para os metadados do resultado)
+
+QUANDO NADA É CORTADO:
+Se o prompt inteiro cabe no orçamento, os documentos passam intactos (nem
+são divididos em trechos). O orçamento vem de LLM_ORCAMENTO_TOKENS_PROMPT
+(0 desativa o ajuste).
+"""
+
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.servicos.servico_indice_lexical import IndiceLexical
+from src.servicos.servico_vetorizacao import obter_tokenizer_openai
+
+# Configuração do logger para este módulo
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONSTANTES
+# ==============================================================================
+
+# Nomes de seção usados pelos agentes
+SECAO_INSTRUCOES = "instrucoes"
+SECAO_PETICAO = "peticao"
+SECAO_ANEXOS = "anexos"
+SECAO_PARECERES = "pareceres"
+SECAO_DOCUMENTOS = "documentos"  # Contexto sem distinção (ex: trechos do RAG)
+
+# Peso de cada seção na divisão do orçamento (seções sem peso usam o padrão)
+PESOS_SECOES_PROMPT: Dict[str, float] = {
+    SECAO_PETICAO: 4.0,
+    SECAO_ANEXOS: 3.0,
+    SECAO_PARECERES: 3.0,
+}
+PESO_PADRAO_SECAO_PROMPT = 3.0
+
+# Trechos maiores que isto são divididos por frases (mais granularidade no ranking)
+TAMANHO_MAXIMO_TRECHO_TOKENS = 300
+
+# Estimativa usada quando o tokenizer não está disponível
+CARACTERES_POR_TOKEN_ESTIMADO = 4
+
+MARCADOR_TRECHOS_OMITIDOS = "[...]"
+TEXTO_DOCUMENTO_OMITIDO = "[Documento omitido: nenhum trecho relevante coube no limite de tokens do prompt]"
+
+PADRAO_SEPARADOR_PARAGRAFOS = re.compile(r"\n\s*\n")
+PADRAO_FIM_DE_FRASE = re.compile(r"(?<=[.;:!?])\s+")
+
+
+# ==============================================================================
+# CONTAGEM DE TOKENS
+# ==============================================================================
+
+@lru_cache(maxsize=1)
+def _obter_codificador():
+    """
+    Encoder da OpenAI, ou None se o tiktoken não puder ser carregado.
+
+    O arquivo do encoding é baixado na primeira vez; sem ele (ambiente sem
+    rede e sem cache do tiktoken) a contagem passa a ser estimada.
+    """
+    try:
+        return obter_tokenizer_openai()
+    except Exception as erro:
+        logger.warning(
+            f"⚠️ Tokenizer da OpenAI indisponível ({erro}); tokens dos prompts "
+            f"serão estimados em {CARACTERES_POR_TOKEN_ESTIMADO} caracteres por token"
+        )
+        return None
+
+
+def contar_tokens_prompt(texto: str) -> int:
+    """
+    Conta os tokens de um trecho de prompt.
+
+    Diferente de servico_vetorizacao.contar_tokens(), aceita textos com
+    marcadores especiais (ex: "<|endoftext|>" dentro de um documento) e
+    não falha sem o tiktoken.
+    """
+    if not texto:
+        return 0
+    codificador = _obter_codificador()
+    if codificador is None:
+        return math.ceil(len(texto) / CARACTERES_POR_TOKEN_ESTIMADO)
+    return len(codificador.encode(texto, disallowed_special=()))
+
+
+# ==============================================================================
+# ESTRUTURAS
+# ==============================================================================
+
+@dataclass
+class SecaoDoPrompt:
+    """
+    Uma seção do prompt: uma lista de textos (documentos ou pareceres).
+    """
+    nome: str
+    textos: List[str]
+    peso: Optional[float] = None
+
+    @property
+    def peso_efetivo(self) -> float:
+        if self.peso is not None:
+            return self.peso
+        return PESOS_SECOES_PROMPT.get(self.nome, PESO_PADRAO_SECAO_PROMPT)
+
+
+@dataclass
+class UsoOrcamentoSecao:
+    """
+    Quanto do orçamento uma seção recebeu e usou.
+    """
+    orcamento_tokens: int
+    tokens_originais: int
+    tokens_utilizados: int
+    trechos_totais: Optional[int] = None
+    trechos_incluidos: Optional[int] = None
+
+    def para_dict(self) -> Dict[str, Any]:
+        dados = {
+            "orcamento_tokens": self.orcamento_tokens,
+            "tokens_originais": self.tokens_originais,
+            "tokens_utilizados": self.tokens_utilizados,
+        }
+        if self.trechos_totais is not None:
+            dados["trechos_totais"] = self.trechos_totais
+            dados["trechos_incluidos"] = self.trechos_incluidos
+        return dados
+
+
+@dataclass
+class ResultadoOrcamentoPrompt:
+    """
+    Textos de cada seção ajustados ao orçamento, mais o relatório de uso.
+
+    textos_por_secao tem, para cada seção, o MESMO número de textos da
+    entrada (documentos sem nenhum trecho incluído viram TEXTO_DOCUMENTO_OMITIDO),
+    então a numeração "DOCUMENTO N" dos prompts não muda.
+    """
+    orcamento_total_tokens: int
+    textos_por_secao: Dict[str, List[str]]
+    uso_por_secao: Dict[str, UsoOrcamentoSecao] = field(default_factory=dict)
+    ajustado: bool = False
+
+    @property
+    def tokens_utilizados(self) -> int:
+        return sum(uso.tokens_utilizados for uso in self.uso_por_secao.values())
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Resumo serializável (vai para os metadados do resultado do agente).
+        """
+        return {
+            "orcamento_total_tokens": self.orcamento_total_tokens,
+            "tokens_utilizados": self.tokens_utilizados,
+            "ajustado": self.ajustado,
+            "secoes": {nome: uso.para_dict() for nome, uso in self.uso_por_secao.items()},
+        }
+
+
+# ==============================================================================
+# DIVISÃO EM TRECHOS E RANKING
+# ==============================================================================
+
+def dividir_em_trechos(
+    texto: str,
+    contador_de_tokens: Callable[[str], int] = contar_tokens_prompt,
+    tamanho_maximo_tokens: int = TAMANHO_MAXIMO_TRECHO_TOKENS
+) -> List[Tuple[str, int]]:
+    """
+    Divide um documento em trechos (parágrafos; parágrafos longos por frases).
+
+    Returns:
+        List[Tuple[str, int]]: (trecho, tokens) na ordem do documento
+    """
+    trechos: List[Tuple[str, int]] = []
+    for paragrafo in PADRAO_SEPARADOR_PARAGRAFOS.split(texto):
+        paragrafo = paragrafo.strip()
+        if not paragrafo:
+            continue
+        tokens_paragrafo = contador_de_tokens(paragrafo)
+        if tokens_paragrafo <= tamanho_maximo_tokens:
+            trechos.append((paragrafo, tokens_paragrafo))
+            continue
+
+        # Parágrafo longo: agrupa frases até o tamanho máximo
+        frases_do_grupo: List[str] = []
+        tokens_do_grupo = 0
+        for frase in PADRAO_FIM_DE_FRASE.split(paragrafo):
+            tokens_frase = contador_de_tokens(frase)
+            if frases_do_grupo and tokens_do_grupo + tokens_frase > tamanho_maximo_tokens:
+                trechos.append((" ".join(frases_do_grupo), tokens_do_grupo))
+                frases_do_grupo, tokens_do_grupo = [], 0
+            frases_do_grupo.append(frase)
+            tokens_do_grupo += tokens_frase
+        if frases_do_grupo:
+            trechos.append((" ".join(frases_do_grupo), tokens_do_grupo))
+    return trechos
+
+
+def ranquear_trechos_por_relevancia(trechos: Sequence[str], consulta: str) -> List[int]:
+    """
+    Ordena os trechos do mais para o menos relevante para a consulta (BM25).
+
+    Trechos sem nenhum termo da consulta vêm depois, na ordem original
+    (o início dos documentos - qualificação, fatos - tem prioridade entre eles).
+
+    Returns:
+        List[int]: Índices de `trechos` em ordem de relevância
+    """
+    if not trechos:
+        return []
+
+    indice = IndiceLexical(":memory:")
+    ids_trechos = [str(posicao) for posicao in range(len(trechos))]
+    indice.indexar_chunks("prompt", ids_trechos, list(trechos))
+    ranking = [int(id_trecho) for id_trecho, _ in indice.buscar(consulta, limite=len(trechos))]
+
+    ja_ranqueados = set(ranking)
+    return ranking + [posicao for posicao in range(len(trechos)) if posicao not in ja_ranqueados]
+
+
+# ==============================================================================
+# MONTADOR
+# ==============================================================================
+
+class MontadorPromptComOrcamento:
+    """
+    Ajusta as seções de um prompt a um orçamento de tokens.
+
+    EXEMPLO DE USO:
+    ```python
+    montador = MontadorPromptComOrcamento(orcamento_total_tokens=30000)
+
+    def montar(textos_por_secao):
+        return template.format(peticao=textos_por_secao["peticao"][0], ...)
+
+    prompt, resultado = montador.montar(
+        secoes=[SecaoDoPrompt("peticao", [peticao]), SecaoDoPrompt("anexos", anexos)],
+        montar=montar,
+        consulta="nexo causal acidente de trabalho",
+        tokens_extras=contar_tokens_prompt(mensagem_de_sistema),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        orcamento_total_tokens: int,
+        contador_de_tokens: Callable[[str], int] = contar_tokens_prompt
+    ):
+        """
+        Args:
+            orcamento_total_tokens: Tokens máximos do prompt (mensagem de sistema
+                inclusa via tokens_extras); 0 desativa o ajuste
+            contador_de_tokens: Função de contagem (injetável em testes)
+        """
+        self.orcamento_total_tokens = orcamento_total_tokens
+        self.contar_tokens = contador_de_tokens
+
+    def montar(
+        self,
+        secoes: Sequence[SecaoDoPrompt],
+        montar: Callable[[Dict[str, List[str]]], str],
+        consulta: str,
+        tokens_extras: int = 0
+    ) -> Tuple[str, ResultadoOrcamentoPrompt]:
+        """
+        Monta o prompt com as seções ajustadas ao orçamento.
+
+        Args:
+            secoes: Seções ajustáveis (nomes únicos)
+            montar: Recebe {nome_da_secao: textos} e devolve o prompt. É chamada
+                com textos vazios para medir as instruções fixas do agente
+            consulta: Texto usado para ranquear os trechos (pergunta + foco do agente)
+            tokens_extras: Tokens fora do prompt que contam no orçamento
+                (mensagem de sistema)
+
+        Returns:
+            (prompt, ResultadoOrcamentoPrompt)
+        """
+        # Instruções fixas: o prompt com todas as seções vazias (mantém os cabeçalhos)
+        tokens_fixos = self.contar_tokens(montar({secao.nome: [""] * len(secao.textos) for secao in secoes})) + tokens_extras
+        tokens_por_texto = {secao.nome: [self.contar_tokens(texto) for texto in secao.textos] for secao in secoes}
+        necessidade = {nome: sum(tokens) for nome, tokens in tokens_por_texto.items()}
+
+        resultado = ResultadoOrcamentoPrompt(
+            orcamento_total_tokens=self.orcamento_total_tokens,
+            textos_por_secao={secao.nome: list(secao.textos) for secao in secoes},
+        )
+        resultado.uso_por_secao[SECAO_INSTRUCOES] = UsoOrcamentoSecao(tokens_fixos, tokens_fixos, tokens_fixos)
+
+        if self.orcamento_total_tokens <= 0 or tokens_fixos + sum(necessidade.values()) <= self.orcamento_total_tokens:
+            for nome, tokens in necessidade.items():
+                resultado.uso_por_secao[nome] = UsoOrcamentoSecao(tokens, tokens, tokens)
+            return montar(resultado.textos_por_secao), resultado
+
+        cotas = self._distribuir_orcamento(secoes, necessidade, max(self.orcamento_total_tokens - tokens_fixos, 0))
+        for secao in secoes:
+            if necessidade[secao.nome] <= cotas[secao.nome]:
+                tokens = necessidade[secao.nome]
+                resultado.uso_por_secao[secao.nome] = UsoOrcamentoSecao(cotas[secao.nome], tokens, tokens)
+                continue
+            textos, uso = self._preencher_secao_por_relevancia(secao, cotas[secao.nome], consulta)
+            resultado.textos_por_secao[secao.nome] = textos
+            resultado.uso_por_secao[secao.nome] = uso
+
+        resultado.ajustado = True
+        logger.info(
+            f"✂️ Prompt ajustado ao orçamento de {self.orcamento_total_tokens} tokens | "
+            + " | ".join(
+                f"{nome}: {uso.tokens_utilizados}/{uso.tokens_originais}"
+                for nome, uso in resultado.uso_por_secao.items() if nome != SECAO_INSTRUCOES
+            )
+        )
+        return montar(resultado.textos_por_secao), resultado
+
+    def _distribuir_orcamento(
+        self,
+        secoes: Sequence[SecaoDoPrompt],
+        necessidade: Dict[str, int],
+        disponivel: int
+    ) -> Dict[str, int]:
+        """
+        Reparte os tokens disponíveis por peso; sobra de uma seção vai para as outras.
+
+        IMPLEMENTAÇÃO ("water-filling"):
+        A cada rodada, as seções ainda não atendidas recebem uma cota
+        proporcional ao peso. Seções cuja necessidade cabe na cota recebem só
+        o que precisam e saem; a sobra é redistribuída na rodada seguinte.
+        """
+        cotas = {secao.nome: 0 for secao in secoes}
+        pendentes = [secao for secao in secoes if necessidade[secao.nome] > 0]
+        while pendentes and disponivel > 0:
+            peso_total = sum(secao.peso_efetivo for secao in pendentes)
+            atendidas = [
+                secao for secao in pendentes
+                if necessidade[secao.nome] <= disponivel * secao.peso_efetivo / peso_total
+            ]
+            if not atendidas:
+                for secao in pendentes:
+                    cotas[secao.nome] = int(disponivel * secao.peso_efetivo / peso_total)
+                break
+            for secao in atendidas:
+                cotas[secao.nome] = necessidade[secao.nome]
+                disponivel -= necessidade[secao.nome]
+            pendentes = [secao for secao in pendentes if secao not in atendidas]
+        return cotas
+
+    def _preencher_secao_por_relevancia(
+        self,
+        secao: SecaoDoPrompt,
+        cota_tokens: int,
+        consulta: str
+    ) -> Tuple[List[str], UsoOrcamentoSecao]:
+        """
+        Escolhe os trechos mais relevantes da seção que cabem na cota.
+
+        Returns:
+            (textos ajustados, um por documento da seção; uso da seção)
+        """
+        # (posição do documento, trecho, tokens) de todos os documentos da seção
+        trechos: List[Tuple[int, str, int]] = [
+            (posicao_documento, trecho, tokens)
+            for posicao_documento, texto in enumerate(secao.textos)
+            for trecho, tokens in dividir_em_trechos(texto, self.contar_tokens)
+        ]
+
+        selecionados = set()
+        tokens_utilizados = 0
+        for posicao in ranquear_trechos_por_relevancia([trecho for _, trecho, _ in trechos], consulta):
+            tokens = trechos[posicao][2]
+            if tokens_utilizados + tokens <= cota_tokens:
+                selecionados.add(posicao)
+                tokens_utilizados += tokens
+
+        # Remonta cada documento com os trechos escolhidos, na ordem original
+        partes_por_documento: List[List[str]] = [[] for _ in secao.textos]
+        omitindo = [False] * len(secao.textos)
+        for posicao, (posicao_documento, trecho, _) in enumerate(trechos):
+            if posicao in selecionados:
+                if omitindo[posicao_documento]:
+                    partes_por_documento[posicao_documento].append(MARCADOR_TRECHOS_OMITIDOS)
+                partes_por_documento[posicao_documento].append(trecho)
+                omitindo[posicao_documento] = False
+            else:
+                omitindo[posicao_documento] = True
+
+        textos_ajustados = []
+        for partes, houve_omissao_no_fim in zip(partes_por_documento, omitindo):
+            if not partes:
+                textos_ajustados.append(TEXTO_DOCUMENTO_OMITIDO)
+                continue
+            if houve_omissao_no_fim:
+                partes.append(MARCADOR_TRECHOS_OMITIDOS)
+            textos_ajustados.append("\n\n".join(partes))
+
+        uso = UsoOrcamentoSecao(
+            orcamento_tokens=cota_tokens,
+            tokens_originais=sum(tokens for _, _, tokens in trechos),
+            tokens_utilizados=tokens_utilizados,
+            trechos_totais=len(trechos),
+            trechos_incluidos=len(selecionados),
+        )
+        return textos_ajustados, uso
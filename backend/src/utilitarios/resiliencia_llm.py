@@ -0,0 +1,525 @@
+"""
+Resiliência das Chamadas ao LLM - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Durante uma instabilidade do provedor (rate limit global, erros 5xx,
+timeouts), cada agente repetia a chamada 3 vezes com esperas fixas de 1s e
+2s, ignorando o Retry-After enviado pela OpenAI. Com 9 agentes por análise
+e várias análises simultâneas, as repetições chegavam sincronizadas,
+prolongavam o incidente e cada análise só falhava depois de minutos.
+
+RESPONSABILIDADES:
+1. Backoff com jitter: a espera de cada repetição é sorteada entre 0 e o
+   teto exponencial (full jitter), então as repetições não chegam juntas
+2. Retry-After: quando o provedor informa quanto esperar (retry-after-ms ou
+   retry-after), a espera respeita esse valor; se ele passar de
+   LLM_RETRY_ESPERA_MAXIMA_SEGUNDOS, a chamada falha em vez de esperar
+3. Disjuntor (circuit breaker) por modelo: depois de
+   LLM_DISJUNTOR_FALHAS_CONSECUTIVAS falhas seguidas do provedor, as
+   chamadas ao modelo falham imediatamente por LLM_DISJUNTOR_SEGUNDOS_ABERTO
+   segundos; depois disso UMA chamada de sondagem decide se o circuito fecha.
+   A sondagem é identificada pela TentativaLLM que permitir_tentativa()
+   devolve: resultados tardios de chamadas iniciadas antes da abertura não
+   fecham nem reabrem o circuito
+4. Orçamento de retries compartilhado: cada chamada deposita
+   LLM_RETRY_ORCAMENTO_PROPORCAO de crédito e cada repetição consome 1.
+   Em operação normal sobra crédito; num incidente as repetições ficam
+   limitadas a uma fração das chamadas, em vez de multiplicar a carga
+5. Observabilidade: estado dos disjuntores, saldo do orçamento e esperas
+   (GET /metricas/llm, chave "resiliencia")
+
+QUAIS ERROS CONTAM COMO FALHA DO PROVEDOR:
+Rate limit (429), timeout/conexão e respostas 5xx. Um 400 ou uma resposta
+vazia mostram que o provedor está respondendo: não abrem o circuito.
+
+THREAD-SAFETY:
+Chamadas síncronas (threads) e assíncronas (vários event loops) usam a
+mesma instância; o estado fica sob um threading.Lock. A espera em si fica
+com o GerenciadorLLM (time.sleep ou asyncio.sleep).
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from openai import APIConnectionError, APIStatusError, RateLimitError
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+# Configuração do logger para este módulo
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONSTANTES
+# ==============================================================================
+
+# Teto da espera da 1ª repetição; cada repetição seguinte dobra o teto.
+# A espera sorteada fica entre 0 e o teto (full jitter)
+TEMPO_INICIAL_DE_ESPERA_SEGUNDOS = 1
+FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL = 2
+
+# Folga sorteada sobre o Retry-After (até 10%), para que as chamadas que
+# receberam o mesmo valor não voltem todas no mesmo instante
+FOLGA_MAXIMA_RETRY_AFTER = 0.1
+
+ESTADO_FECHADO = "fechado"
+ESTADO_ABERTO = "aberto"
+ESTADO_MEIO_ABERTO = "meio_aberto"
+
+
+def erro_indica_falha_do_provedor(erro: Exception) -> bool:
+    """
+    Indica se o erro é de indisponibilidade do provedor (conta para o disjuntor).
+
+    Returns:
+        bool: True para rate limit, timeout/conexão e respostas 5xx
+    """
+    if isinstance(erro, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(erro, APIStatusError) and erro.status_code >= 500
+
+
+def extrair_retry_after_segundos(erro: Exception) -> Optional[float]:
+    """
+    Lê quanto o provedor pediu para esperar antes de repetir a chamada.
+
+    Usa o cabeçalho retry-after-ms (OpenAI) e, na falta dele, retry-after
+    (segundos ou data HTTP).
+
+    Returns:
+        float ou None se o erro não trouxer a informação
+    """
+    resposta = getattr(erro, "response", None)
+    cabecalhos = getattr(resposta, "headers", None)
+    if not cabecalhos:
+        return None
+
+    try:
+        if cabecalhos.get("retry-after-ms"):
+            return max(0.0, float(cabecalhos["retry-after-ms"]) / 1000)
+    except ValueError:
+        pass
+
+    valor = cabecalhos.get("retry-after")
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+
+# ==============================================================================
+# DISJUNTOR POR MODELO
+# ==============================================================================
+
+@dataclass
+class _DisjuntorDoModelo:
+    """
+    Estado do circuito de um modelo.
+    """
+    estado: str = ESTADO_FECHADO
+    falhas_consecutivas: int = 0
+    aberto_ate: float = 0.0
+    sondagem_em_andamento: bool = False
+    # Número da sondagem liberada mais recente (identifica o resultado dela)
+    numero_da_sondagem: int = 0
+    aberturas: int = 0
+    chamadas_rejeitadas: int = 0
+
+
+@dataclass(frozen=True)
+class TentativaLLM:
+    """
+    Autorização de uma tentativa, devolvida por permitir_tentativa().
+
+    Deve voltar em registrar_resultado()/liberar_tentativa(): só a tentativa
+    que é a sondagem atual decide o circuito meio aberto.
+    """
+    modelo: str
+    # Número da sondagem; None = chamada comum (circuito fechado)
+    sondagem: Optional[int] = None
+
+
+# ==============================================================================
+# RESILIÊNCIA
+# ==============================================================================
+
+class ResilienciaLLM:
+    """
+    Backoff com jitter, disjuntor por modelo e orçamento de retries.
+
+    EXEMPLO DE USO (o que o GerenciadorLLM faz a cada chamada):
+    ```python
+    resiliencia = obter_resiliencia_llm()
+    resiliencia.registrar_chamada()
+
+    tentativa = resiliencia.permitir_tentativa(modelo)
+    if tentativa is None:
+        raise ErroCircuitoAbertoLLM(...)
+    try:
+        resposta = cliente.chat.completions.create(...)
+        resiliencia.registrar_resultado(modelo, tentativa=tentativa)
+    except Exception as erro:
+        resiliencia.registrar_resultado(modelo, erro, tentativa=tentativa)
+        espera = resiliencia.calcular_espera(modelo, numero_da_tentativa, erro)
+        if espera is None:
+            raise
+        time.sleep(espera)
+    except BaseException:
+        # Cancelamento (asyncio.CancelledError) ou interrupção: sem resultado
+        resiliencia.liberar_tentativa(modelo, tentativa)
+        raise
+    ```
+    """
+
+    def __init__(
+        self,
+        espera_maxima_segundos: float = 30.0,
+        falhas_para_abrir: int = 5,
+        segundos_aberto: float = 30.0,
+        proporcao_orcamento: float = 0.2,
+        saldo_maximo_orcamento: float = 10.0,
+        relogio: Callable[[], float] = time.monotonic,
+        gerador_aleatorio: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            espera_maxima_segundos: Teto da espera entre tentativas (e do Retry-After aceito)
+            falhas_para_abrir: Falhas consecutivas do provedor que abrem o circuito
+            segundos_aberto: Tempo em que o circuito aberto rejeita chamadas
+            proporcao_orcamento: Crédito de retry depositado por chamada
+            saldo_maximo_orcamento: Crédito máximo acumulado (rajada de retries permitida)
+            relogio: Fonte de tempo (injetável nos testes)
+            gerador_aleatorio: Sorteio do jitter (injetável nos testes)
+
+        Raises:
+            ValueError: Se algum parâmetro estiver fora da faixa válida
+        """
+        if falhas_para_abrir < 1 or segundos_aberto <= 0 or espera_maxima_segundos <= 0:
+            raise ValueError(
+                "falhas_para_abrir deve ser >= 1 e segundos_aberto/espera_maxima_segundos > 0"
+            )
+        if proporcao_orcamento < 0 or saldo_maximo_orcamento < 0:
+            raise ValueError("O orçamento de retries não pode ser negativo")
+
+        self.espera_maxima_segundos = espera_maxima_segundos
+        self.falhas_para_abrir = falhas_para_abrir
+        self.segundos_aberto = segundos_aberto
+        self.proporcao_orcamento = proporcao_orcamento
+        self.saldo_maximo_orcamento = saldo_maximo_orcamento
+        self._relogio = relogio
+        self._aleatorio = gerador_aleatorio or random.Random()
+        self._lock = threading.Lock()
+        self._disjuntores: Dict[str, _DisjuntorDoModelo] = {}
+
+        # Orçamento começa cheio: os primeiros erros após a subida podem ser repetidos
+        self._saldo_orcamento = saldo_maximo_orcamento
+        self._retries_concedidos = 0
+        self._retries_negados_pelo_orcamento = 0
+
+        # Esperas
+        self._esperas_com_retry_after = 0
+        self._desistencias_por_retry_after_longo = 0
+        self._tempo_total_de_espera_segundos = 0.0
+
+    # ===== DISJUNTOR =====
+
+    def permitir_tentativa(self, modelo: str) -> Optional[TentativaLLM]:
+        """
+        Indica se uma tentativa ao modelo pode ser feita agora.
+
+        Circuito aberto: rejeita até o fim do período. Passado o período, o
+        circuito fica meio aberto e libera UMA tentativa de sondagem (com o
+        número dela na TentativaLLM); as demais continuam rejeitadas até o
+        resultado dela.
+
+        Returns:
+            Optional[TentativaLLM]: None se a chamada deve falhar sem ir ao provedor
+        """
+        with self._lock:
+            disjuntor = self._disjuntores.setdefault(modelo, _DisjuntorDoModelo())
+            if disjuntor.estado == ESTADO_FECHADO:
+                return TentativaLLM(modelo)
+
+            if disjuntor.estado == ESTADO_ABERTO and self._relogio() >= disjuntor.aberto_ate:
+                disjuntor.estado = ESTADO_MEIO_ABERTO
+                disjuntor.sondagem_em_andamento = False
+
+            if disjuntor.estado == ESTADO_MEIO_ABERTO and not disjuntor.sondagem_em_andamento:
+                disjuntor.sondagem_em_andamento = True
+                disjuntor.numero_da_sondagem += 1
+                logger.info(f"🔌 Disjuntor do modelo {modelo}: sondagem liberada")
+                return TentativaLLM(modelo, sondagem=disjuntor.numero_da_sondagem)
+
+            disjuntor.chamadas_rejeitadas += 1
+            return None
+
+    @staticmethod
+    def _e_a_sondagem_atual(disjuntor: _DisjuntorDoModelo, tentativa: Optional[TentativaLLM]) -> bool:
+        """
+        Indica se a tentativa é a sondagem em andamento do circuito meio aberto.
+        """
+        return (
+            disjuntor.estado == ESTADO_MEIO_ABERTO
+            and disjuntor.sondagem_em_andamento
+            and tentativa is not None
+            and tentativa.sondagem == disjuntor.numero_da_sondagem
+        )
+
+    def liberar_tentativa(self, modelo: str, tentativa: Optional[TentativaLLM] = None) -> None:
+        """
+        Encerra uma tentativa que terminou sem resultado (task cancelada,
+        interrupção): não conta como sucesso nem como falha.
+
+        Se era a sondagem do circuito meio aberto, a vaga de sondagem volta a
+        ficar livre; sem isso, nenhuma outra chamada seria liberada e o
+        circuito ficaria meio aberto para sempre.
+
+        Args:
+            modelo: Modelo chamado
+            tentativa: Autorização devolvida por permitir_tentativa()
+        """
+        with self._lock:
+            disjuntor = self._disjuntores.get(modelo)
+            if disjuntor is not None and self._e_a_sondagem_atual(disjuntor, tentativa):
+                disjuntor.sondagem_em_andamento = False
+                logger.info(f"🔌 Disjuntor do modelo {modelo}: sondagem interrompida, vaga de sondagem liberada")
+
+    def segundos_para_liberar(self, modelo: str) -> float:
+        """
+        Tempo até o circuito do modelo liberar uma sondagem (0 se fechado).
+        """
+        with self._lock:
+            disjuntor = self._disjuntores.get(modelo)
+            if disjuntor is None or disjuntor.estado != ESTADO_ABERTO:
+                return 0.0
+            return max(0.0, disjuntor.aberto_ate - self._relogio())
+
+    def registrar_resultado(
+        self,
+        modelo: str,
+        erro: Optional[Exception] = None,
+        tentativa: Optional[TentativaLLM] = None
+    ) -> None:
+        """
+        Atualiza o disjuntor com o resultado de uma tentativa.
+
+        Com o circuito aberto ou meio aberto, só o resultado da sondagem atual
+        conta. Chamadas iniciadas antes da abertura ainda podem terminar
+        depois dela; um sucesso ou uma falha tardia dessas não diz nada sobre
+        o provedor agora e é ignorado.
+
+        Args:
+            modelo: Modelo chamado
+            erro: Exceção da tentativa; None em caso de sucesso. Erros que não
+                  são falha do provedor (400, resposta vazia) contam como
+                  resposta recebida
+            tentativa: Autorização devolvida por permitir_tentativa()
+        """
+        falhou = erro is not None and erro_indica_falha_do_provedor(erro)
+
+        with self._lock:
+            disjuntor = self._disjuntores.setdefault(modelo, _DisjuntorDoModelo())
+            sondagem = self._e_a_sondagem_atual(disjuntor, tentativa)
+            if disjuntor.estado != ESTADO_FECHADO and not sondagem:
+                return
+            disjuntor.sondagem_em_andamento = False
+
+            if not falhou:
+                if disjuntor.estado != ESTADO_FECHADO:
+                    logger.info(f"🔌 Disjuntor do modelo {modelo}: circuito fechado")
+                disjuntor.estado = ESTADO_FECHADO
+                disjuntor.falhas_consecutivas = 0
+                return
+
+            disjuntor.falhas_consecutivas += 1
+            if sondagem or (
+                disjuntor.estado == ESTADO_FECHADO
+                and disjuntor.falhas_consecutivas >= self.falhas_para_abrir
+            ):
+                disjuntor.estado = ESTADO_ABERTO
+                disjuntor.aberto_ate = self._relogio() + self.segundos_aberto
+                disjuntor.aberturas += 1
+                logger.warning(
+                    f"🔌 Disjuntor do modelo {modelo} ABERTO por {self.segundos_aberto}s "
+                    f"({disjuntor.falhas_consecutivas} falhas consecutivas, "
+                    f"última: {type(erro).__name__})"
+                )
+
+    # ===== ORÇAMENTO E ESPERA =====
+
+    def registrar_chamada(self) -> None:
+        """
+        Deposita o crédito de retry de uma nova chamada (não de uma repetição).
+        """
+        with self._lock:
+            self._saldo_orcamento = min(
+                self.saldo_maximo_orcamento,
+                self._saldo_orcamento + self.proporcao_orcamento
+            )
+
+    def calcular_espera(
+        self,
+        modelo: str,
+        numero_da_tentativa: int,
+        erro: Exception
+    ) -> Optional[float]:
+        """
+        Decide se a tentativa que falhou pode ser repetida e quanto esperar.
+
+        Deve ser chamado depois de registrar_resultado() e só para erros que
+        a política do chamador considera repetíveis.
+
+        Args:
+            modelo: Modelo chamado
+            numero_da_tentativa: Tentativa que acabou de falhar (1, 2, ...)
+            erro: Exceção da tentativa
+
+        Returns:
+            float: Segundos a esperar antes da próxima tentativa, ou None se a
+            chamada deve desistir (circuito aberto, Retry-After acima do teto
+            ou orçamento de retries esgotado)
+        """
+        retry_after = extrair_retry_after_segundos(erro)
+
+        with self._lock:
+            disjuntor = self._disjuntores.get(modelo)
+            if disjuntor is not None and disjuntor.estado != ESTADO_FECHADO:
+                logger.warning(f"Circuito do modelo {modelo} aberto: a chamada não será repetida")
+                return None
+
+            if retry_after is not None and retry_after > self.espera_maxima_segundos:
+                self._desistencias_por_retry_after_longo += 1
+                logger.warning(
+                    f"Provedor pediu {retry_after:.1f}s de espera (Retry-After), acima do "
+                    f"limite de {self.espera_maxima_segundos}s: a chamada não será repetida"
+                )
+                return None
+
+            if self._saldo_orcamento < 1:
+                self._retries_negados_pelo_orcamento += 1
+                logger.warning(
+                    f"Orçamento de retries esgotado (saldo {self._saldo_orcamento:.2f}): "
+                    f"a chamada não será repetida"
+                )
+                return None
+
+            self._saldo_orcamento -= 1
+            self._retries_concedidos += 1
+
+            if retry_after is not None:
+                self._esperas_com_retry_after += 1
+                espera = retry_after * (1 + self._aleatorio.uniform(0, FOLGA_MAXIMA_RETRY_AFTER))
+            else:
+                teto = TEMPO_INICIAL_DE_ESPERA_SEGUNDOS * (
+                    FATOR_MULTIPLICADOR_BACKOFF_EXPONENCIAL ** (numero_da_tentativa - 1)
+                )
+                espera = self._aleatorio.uniform(0, teto)
+
+            espera = min(espera, self.espera_maxima_segundos)
+            self._tempo_total_de_espera_segundos += espera
+
+        logger.info(
+            f"Nova tentativa em {espera:.2f}s"
+            + (f" (Retry-After: {retry_after:.2f}s)" if retry_after is not None else " (backoff com jitter)")
+        )
+        return espera
+
+    # ===== OBSERVABILIDADE =====
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """
+        Disjuntores, orçamento de retries e esperas (para o endpoint de métricas).
+
+        Returns:
+            dict com "disjuntores" (por modelo), "orcamento_de_retries" e "esperas"
+        """
+        with self._lock:
+            agora = self._relogio()
+            return {
+                "disjuntores": {
+                    modelo: {
+                        "estado": disjuntor.estado,
+                        "falhas_consecutivas": disjuntor.falhas_consecutivas,
+                        "aberturas": disjuntor.aberturas,
+                        "chamadas_rejeitadas": disjuntor.chamadas_rejeitadas,
+                        "segundos_para_liberar": round(
+                            max(0.0, disjuntor.aberto_ate - agora) if disjuntor.estado == ESTADO_ABERTO else 0.0, 2
+                        ),
+                    }
+                    for modelo, disjuntor in self._disjuntores.items()
+                },
+                "orcamento_de_retries": {
+                    "saldo": round(self._saldo_orcamento, 2),
+                    "saldo_maximo": self.saldo_maximo_orcamento,
+                    "proporcao_por_chamada": self.proporcao_orcamento,
+                    "retries_concedidos": self._retries_concedidos,
+                    "retries_negados": self._retries_negados_pelo_orcamento,
+                },
+                "esperas": {
+                    "com_retry_after": self._esperas_com_retry_after,
+                    "desistencias_por_retry_after_longo": self._desistencias_por_retry_after_longo,
+                    "tempo_total_segundos": round(self._tempo_total_de_espera_segundos, 2),
+                    "espera_maxima_segundos": self.espera_maxima_segundos,
+                },
+            }
+
+
+# ==============================================================================
+# SINGLETON
+# ==============================================================================
+
+_instancia_resiliencia_llm: Optional[ResilienciaLLM] = None
+_lock_singleton = threading.Lock()
+
+
+def obter_resiliencia_llm() -> ResilienciaLLM:
+    """
+    Obtém a instância singleton (configurada por LLM_RETRY_* e LLM_DISJUNTOR_*).
+
+    THREAD-SAFETY:
+    Double-checked locking: disjuntor e orçamento só funcionam se forem os
+    MESMOS para todas as threads e event loops do processo.
+    """
+    global _instancia_resiliencia_llm
+
+    if _instancia_resiliencia_llm is None:
+        with _lock_singleton:
+            if _instancia_resiliencia_llm is None:
+                configuracoes = obter_configuracoes()
+                _instancia_resiliencia_llm = ResilienciaLLM(
+                    espera_maxima_segundos=configuracoes.LLM_RETRY_ESPERA_MAXIMA_SEGUNDOS,
+                    falhas_para_abrir=configuracoes.LLM_DISJUNTOR_FALHAS_CONSECUTIVAS,
+                    segundos_aberto=configuracoes.LLM_DISJUNTOR_SEGUNDOS_ABERTO,
+                    proporcao_orcamento=configuracoes.LLM_RETRY_ORCAMENTO_PROPORCAO,
+                    saldo_maximo_orcamento=configuracoes.LLM_RETRY_ORCAMENTO_SALDO_MAXIMO,
+                )
+                logger.info(
+                    f"🔌 Resiliência do LLM inicializada | "
+                    f"Disjuntor: {configuracoes.LLM_DISJUNTOR_FALHAS_CONSECUTIVAS} falhas → "
+                    f"{configuracoes.LLM_DISJUNTOR_SEGUNDOS_ABERTO}s aberto | "
+                    f"Orçamento de retries: {configuracoes.LLM_RETRY_ORCAMENTO_PROPORCAO} por chamada"
+                )
+
+    return _instancia_resiliencia_llm
+
+
+def obter_estatisticas_resiliencia_llm() -> Dict[str, Any]:
+    """
+    Estatísticas da instância compartilhada, sem criá-la se ainda não foi usada.
+    """
+    if _instancia_resiliencia_llm is None:
+        return {"disjuntores": {}, "orcamento_de_retries": {}, "esperas": {}}
+    return _instancia_resiliencia_llm.obter_estatisticas()
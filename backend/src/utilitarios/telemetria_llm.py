@@ -0,0 +1,196 @@
+"""
+Telemetria de Chamadas ao LLM - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+O servidor roda por semanas. Guardar cada chamada ao LLM numa lista que só
+cresce (como fazia EstatisticasGlobaisLLM) vaza memória, e médias escondem
+o que importa para operar o sistema: a cauda de latência (p95/p99), quais
+modelos e agentes consomem mais tokens e quantas chamadas só passam depois
+de retries.
+
+RESPONSABILIDADES:
+1. Histograma de latência com buckets fixos (memória constante, percentis
+   aproximados p50/p95/p99 sem guardar as amostras)
+2. Agregado por chave (modelo ou agente): chamadas, erros, tokens de
+   entrada/saída/raciocínio, tokens de entrada servidos pelo cache de
+   prompt do provedor, custo, retries e contagem por classe de erro
+
+THREAD-SAFETY:
+As classes deste módulo NÃO têm lock próprio: quem as agrega
+(EstatisticasGlobaisLLM no gerenciador_llm) serializa o acesso.
+"""
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+# ==============================================================================
+# HISTOGRAMA DE LATÊNCIA
+# ==============================================================================
+
+# Limites superiores dos buckets (segundos): progressão geométrica de 50 ms
+# a ~15 minutos com razão 1.25, ou seja, erro relativo de no máximo ~25%
+# no percentil estimado (menos, com a interpolação dentro do bucket)
+LIMITES_BUCKETS_LATENCIA_SEGUNDOS: List[float] = [
+    round(0.05 * 1.25 ** indice, 4) for indice in range(45)
+]
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latências com buckets fixos e percentis aproximados.
+
+    IMPLEMENTAÇÃO:
+    Cada amostra incrementa o bucket cujo limite superior é o primeiro >= a
+    amostra; o último bucket (acima do maior limite) é de transbordo. O
+    percentil é interpolado linearmente dentro do bucket onde cai, limitado
+    ao mínimo/máximo observados.
+    """
+
+    def __init__(self, limites_segundos: List[float] = LIMITES_BUCKETS_LATENCIA_SEGUNDOS):
+        self.limites_segundos = limites_segundos
+        self.contagens: List[int] = [0] * (len(limites_segundos) + 1)
+        self.total_de_amostras = 0
+        self.soma_segundos = 0.0
+        self.minimo_segundos = math.inf
+        self.maximo_segundos = 0.0
+
+    def registrar(self, segundos: float) -> None:
+        """
+        Adiciona uma amostra de latência.
+        """
+        segundos = max(segundos, 0.0)
+        self.contagens[bisect.bisect_left(self.limites_segundos, segundos)] += 1
+        self.total_de_amostras += 1
+        self.soma_segundos += segundos
+        self.minimo_segundos = min(self.minimo_segundos, segundos)
+        self.maximo_segundos = max(self.maximo_segundos, segundos)
+
+    def percentil(self, fracao: float) -> float:
+        """
+        Estima o percentil (fracao entre 0 e 1) das amostras registradas.
+
+        Returns:
+            float: Latência estimada em segundos (0.0 se não há amostras)
+        """
+        if self.total_de_amostras == 0:
+            return 0.0
+
+        posicao_alvo = fracao * self.total_de_amostras
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            if contagem == 0:
+                continue
+            if acumulado + contagem >= posicao_alvo:
+                limite_inferior = self.limites_segundos[indice - 1] if indice > 0 else 0.0
+                limite_superior = (
+                    self.limites_segundos[indice] if indice < len(self.limites_segundos) else self.maximo_segundos
+                )
+                estimativa = limite_inferior + (limite_superior - limite_inferior) * (
+                    (posicao_alvo - acumulado) / contagem
+                )
+                return min(max(estimativa, self.minimo_segundos), self.maximo_segundos)
+            acumulado += contagem
+        return self.maximo_segundos
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Resumo do histograma (segundos, arredondado em ms).
+        """
+        media = self.soma_segundos / self.total_de_amostras if self.total_de_amostras else 0.0
+        return {
+            "amostras": self.total_de_amostras,
+            "media": round(media, 3),
+            "p50": round(self.percentil(0.50), 3),
+            "p95": round(self.percentil(0.95), 3),
+            "p99": round(self.percentil(0.99), 3),
+            "maximo": round(self.maximo_segundos, 3),
+        }
+
+
+# ==============================================================================
+# AGREGADO POR MODELO / AGENTE
+# ==============================================================================
+
+@dataclass
+class AgregadoTelemetriaLLM:
+    """
+    Totais de um conjunto de chamadas (um modelo, um agente ou o geral).
+
+    O número de campos é fixo: a memória não cresce com o número de chamadas.
+    """
+    chamadas: int = 0
+    chamadas_com_erro: int = 0
+    tokens_de_prompt: int = 0
+    tokens_de_resposta: int = 0
+    tokens_de_raciocinio: int = 0
+    tokens_de_prompt_em_cache: int = 0
+    custo_estimado_usd: float = 0.0
+    retries: int = 0
+    chamadas_com_retry: int = 0
+    erros_por_classe: Dict[str, int] = field(default_factory=dict)
+    latencia: HistogramaLatencia = field(default_factory=HistogramaLatencia)
+
+    def registrar(
+        self,
+        sucesso: bool,
+        tempo_de_resposta_segundos: float,
+        tokens_de_prompt: int,
+        tokens_de_resposta: int,
+        tokens_de_raciocinio: int,
+        custo_estimado_usd: float,
+        erros_das_tentativas: List[str],
+        tokens_de_prompt_em_cache: int = 0
+    ) -> None:
+        """
+        Soma uma chamada (já concluída, com ou sem sucesso) ao agregado.
+
+        Args:
+            erros_das_tentativas: Classe do erro de cada tentativa que falhou,
+                inclusive as que foram repetidas com sucesso depois
+            tokens_de_prompt_em_cache: Parte de tokens_de_prompt que o provedor
+                serviu do cache de prompt (usage.prompt_tokens_details.cached_tokens)
+        """
+        self.chamadas += 1
+        if not sucesso:
+            self.chamadas_com_erro += 1
+        self.tokens_de_prompt += tokens_de_prompt
+        self.tokens_de_resposta += tokens_de_resposta
+        self.tokens_de_raciocinio += tokens_de_raciocinio
+        self.tokens_de_prompt_em_cache += tokens_de_prompt_em_cache
+        self.custo_estimado_usd += custo_estimado_usd
+
+        # Numa falha, a última tentativa não é retry; num sucesso, toda falha anterior é
+        retries = len(erros_das_tentativas) - (0 if sucesso else 1)
+        if retries > 0:
+            self.retries += retries
+            self.chamadas_com_retry += 1
+
+        for classe_do_erro in erros_das_tentativas:
+            self.erros_por_classe[classe_do_erro] = self.erros_por_classe.get(classe_do_erro, 0) + 1
+
+        self.latencia.registrar(tempo_de_resposta_segundos)
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Resumo serializável do agregado.
+        """
+        percentual_prompt_em_cache = (
+            self.tokens_de_prompt_em_cache / self.tokens_de_prompt * 100 if self.tokens_de_prompt else 0.0
+        )
+        return {
+            "chamadas": self.chamadas,
+            "chamadas_com_erro": self.chamadas_com_erro,
+            "tokens_de_prompt": self.tokens_de_prompt,
+            "tokens_de_resposta": self.tokens_de_resposta,
+            "tokens_de_raciocinio": self.tokens_de_raciocinio,
+            "tokens_de_prompt_em_cache": self.tokens_de_prompt_em_cache,
+            "percentual_prompt_em_cache": round(percentual_prompt_em_cache, 2),
+            "custo_estimado_usd": round(self.custo_estimado_usd, 4),
+            "retries": self.retries,
+            "chamadas_com_retry": self.chamadas_com_retry,
+            "erros_por_classe": dict(self.erros_por_classe),
+            "latencia_segundos": self.latencia.para_dict(),
+        }
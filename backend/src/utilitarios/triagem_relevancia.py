@@ -0,0 +1,281 @@
+"""
+Triagem de Relevância dos Agentes - Plataforma Jurídica Multi-Agent
+
+CONTEXTO DE NEGÓCIO:
+Os orquestradores (OrquestradorAnalisePeticoes e AgenteAdvogadoCoordenador)
+chamavam o LLM para todo especialista selecionado, mesmo quando o caso não
+tinha relação com a área dele (ex: Advogado Tributário num caso puramente
+trabalhista). Cada um desses agentes custava uma chamada completa ao LLM
+para produzir um parecer do tipo "não há matéria da minha área".
+
+RESPONSABILIDADES:
+1. Pontuar o caso contra o perfil de domínio de cada agente selecionado
+   (palavras_chave_especializacao): proporção das palavras-chave do perfil
+   que aparecem no texto do caso
+2. Comparar cada agente com o mais bem pontuado da mesma seleção e decidir:
+   - executar: análise normal
+   - rebaixar: análise com o modelo rápido (LLM_CASCATA_MODELO_RAPIDO),
+     só com a cascata de modelos ativada (LLM_CASCATA_ATIVADA)
+   - pular: nenhuma chamada ao LLM
+3. Registrar o que foi pulado/rebaixado e por quê (aplicar_triagem, exposto
+   no resultado das análises)
+
+POR QUE RELATIVO AO MELHOR AGENTE:
+Petições longas citam de passagem termos de várias áreas ("imposto de
+renda" sobre verbas trabalhistas, "taxa" de juros). Um limiar absoluto
+pularia agentes em perguntas curtas e manteria todos em petições longas;
+comparado ao agente mais aderente da seleção, o Tributário de um caso
+trabalhista fica muito abaixo do Trabalhista. Agentes sem perfil de
+palavras-chave, seleções sem nenhuma palavra-chave encontrada e o agente
+mais bem pontuado nunca são pulados.
+"""
+
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.configuracao.configuracoes import obter_configuracoes
+
+# Configuração do logger para este módulo
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONSTANTES
+# ==============================================================================
+
+DECISAO_EXECUTAR = "executar"
+DECISAO_REBAIXAR = "rebaixar"
+DECISAO_PULAR = "pular"
+
+# Quantas palavras-chave encontradas aparecem na razão da decisão
+MAXIMO_PALAVRAS_CHAVE_NA_RAZAO = 5
+
+
+# ==============================================================================
+# PONTUAÇÃO
+# ==============================================================================
+
+def encontrar_palavras_chave(texto: str, palavras_chave: List[str]) -> List[str]:
+    """
+    Palavras-chave que aparecem no texto como palavras inteiras.
+
+    A comparação ignora maiúsculas/minúsculas e exige fronteira de palavra,
+    para que siglas curtas ("PIS", "ISS") não casem dentro de outras
+    palavras ("piso", "emissão").
+
+    Args:
+        texto: Texto onde procurar (pergunta ou documentos do caso)
+        palavras_chave: Perfil de domínio do agente
+
+    Returns:
+        List[str]: Palavras-chave encontradas, na ordem do perfil
+    """
+    texto_minusculo = texto.lower()
+    return [
+        palavra_chave
+        for palavra_chave in palavras_chave
+        # Busca por substring primeiro: documentos do caso podem ser longos
+        if palavra_chave.lower() in texto_minusculo
+        and re.search(rf"(?<!\w){re.escape(palavra_chave.lower())}(?!\w)", texto_minusculo)
+    ]
+
+
+# ==============================================================================
+# TRIAGEM
+# ==============================================================================
+
+@dataclass
+class TriagemDoAgente:
+    """
+    Decisão da triagem para um agente selecionado.
+    """
+    decisao: str
+    razao: str
+    # Proporção das palavras-chave do perfil encontradas no caso (None = sem perfil)
+    pontuacao: Optional[float] = None
+    # Pontuação dividida pela do agente mais aderente da seleção
+    pontuacao_relativa: Optional[float] = None
+    palavras_chave_encontradas: List[str] = field(default_factory=list)
+    # Modelo usado quando a decisão é DECISAO_REBAIXAR
+    modelo: Optional[str] = None
+
+    def para_dict(self) -> Dict[str, Any]:
+        """
+        Representação serializável (metadados do resultado das análises).
+        """
+        return asdict(self)
+
+
+def triar_agentes(
+    agentes: Dict[str, Any],
+    texto_do_caso: str,
+    ativada: Optional[bool] = None,
+    proporcao_para_pular: Optional[float] = None,
+    proporcao_para_rebaixar: Optional[float] = None,
+    modelo_rebaixado: Optional[str] = None,
+    permitir_rebaixamento: Optional[bool] = None,
+) -> Dict[str, TriagemDoAgente]:
+    """
+    Decide quais agentes selecionados valem uma chamada ao LLM.
+
+    IMPLEMENTAÇÃO:
+    1. Pontuação de cada agente = palavras-chave do perfil encontradas no
+       caso / tamanho do perfil (mesma medida de validar_relevancia_pergunta)
+    2. Pontuação relativa = pontuação / maior pontuação da seleção
+    3. Relativa abaixo de proporcao_para_pular → pular; abaixo de
+       proporcao_para_rebaixar → rebaixar (ou executar, se o rebaixamento
+       não for permitido); senão → executar
+
+    Args:
+        agentes: Identificador → instância do agente (lê palavras_chave_especializacao)
+        texto_do_caso: Pergunta e/ou documentos do caso
+        ativada: None = TRIAGEM_RELEVANCIA_ATIVADA
+        proporcao_para_pular: None = TRIAGEM_RELEVANCIA_PROPORCAO_PULAR
+        proporcao_para_rebaixar: None = TRIAGEM_RELEVANCIA_PROPORCAO_REBAIXAR
+        modelo_rebaixado: None = LLM_CASCATA_MODELO_RAPIDO
+        permitir_rebaixamento: None = LLM_CASCATA_ATIVADA (o modelo rápido
+            só é usado quando a cascata de modelos está ligada)
+
+    Returns:
+        Dict[str, TriagemDoAgente]: Decisão para cada identificador de agentes
+    """
+    configuracoes = obter_configuracoes()
+    if ativada is None:
+        ativada = configuracoes.TRIAGEM_RELEVANCIA_ATIVADA
+    if proporcao_para_pular is None:
+        proporcao_para_pular = configuracoes.TRIAGEM_RELEVANCIA_PROPORCAO_PULAR
+    if proporcao_para_rebaixar is None:
+        proporcao_para_rebaixar = configuracoes.TRIAGEM_RELEVANCIA_PROPORCAO_REBAIXAR
+    if modelo_rebaixado is None:
+        modelo_rebaixado = configuracoes.LLM_CASCATA_MODELO_RAPIDO
+    if permitir_rebaixamento is None:
+        permitir_rebaixamento = configuracoes.LLM_CASCATA_ATIVADA
+
+    if not ativada:
+        return {
+            identificador: TriagemDoAgente(DECISAO_EXECUTAR, "Triagem de relevância desativada")
+            for identificador in agentes
+        }
+
+    # ===== PONTUAÇÃO ABSOLUTA =====
+
+    encontradas_por_agente: Dict[str, List[str]] = {}
+    pontuacoes: Dict[str, float] = {}
+    for identificador, agente in agentes.items():
+        palavras_chave = getattr(agente, "palavras_chave_especializacao", None) or []
+        if not palavras_chave:
+            continue
+        encontradas = encontrar_palavras_chave(texto_do_caso, palavras_chave)
+        encontradas_por_agente[identificador] = encontradas
+        pontuacoes[identificador] = len(encontradas) / len(palavras_chave)
+
+    maior_pontuacao = max(pontuacoes.values(), default=0.0)
+
+    # ===== DECISÃO RELATIVA AO AGENTE MAIS ADERENTE =====
+
+    triagem: Dict[str, TriagemDoAgente] = {}
+    for identificador in agentes:
+        if identificador not in pontuacoes:
+            triagem[identificador] = TriagemDoAgente(DECISAO_EXECUTAR, "Agente sem perfil de palavras-chave")
+            continue
+
+        encontradas = encontradas_por_agente[identificador]
+        pontuacao = pontuacoes[identificador]
+        if maior_pontuacao == 0.0:
+            triagem[identificador] = TriagemDoAgente(
+                DECISAO_EXECUTAR,
+                "Nenhuma palavra-chave dos agentes selecionados no caso (triagem inconclusiva)",
+                pontuacao=0.0,
+            )
+            continue
+
+        relativa = pontuacao / maior_pontuacao
+        if encontradas:
+            descricao = f"{len(encontradas)} palavra(s)-chave: {', '.join(encontradas[:MAXIMO_PALAVRAS_CHAVE_NA_RAZAO])}"
+        else:
+            descricao = "nenhuma palavra-chave da área no caso"
+
+        if relativa < proporcao_para_pular:
+            decisao, modelo = DECISAO_PULAR, None
+            razao = f"Pouco aderente ao caso ({relativa:.0%} do agente mais aderente; {descricao})"
+        elif relativa < proporcao_para_rebaixar and permitir_rebaixamento:
+            decisao, modelo = DECISAO_REBAIXAR, modelo_rebaixado
+            razao = f"Aderência parcial ao caso ({relativa:.0%} do agente mais aderente; {descricao})"
+        elif relativa < proporcao_para_rebaixar:
+            decisao, modelo = DECISAO_EXECUTAR, None
+            razao = (
+                f"Aderência parcial ao caso ({relativa:.0%} do agente mais aderente; {descricao}); "
+                f"cascata de modelos desativada, mantido o modelo principal"
+            )
+        else:
+            decisao, modelo = DECISAO_EXECUTAR, None
+            razao = f"Aderente ao caso ({descricao})"
+
+        triagem[identificador] = TriagemDoAgente(
+            decisao=decisao,
+            razao=razao,
+            pontuacao=round(pontuacao, 4),
+            pontuacao_relativa=round(relativa, 4),
+            palavras_chave_encontradas=encontradas,
+            modelo=modelo,
+        )
+
+    ignorados = [identificador for identificador, resultado in triagem.items() if resultado.decisao == DECISAO_PULAR]
+    rebaixados = [identificador for identificador, resultado in triagem.items() if resultado.decisao == DECISAO_REBAIXAR]
+    if ignorados or rebaixados:
+        logger.info(f"Triagem de relevância | Ignorados: {ignorados} | Rebaixados para '{modelo_rebaixado}': {rebaixados}")
+
+    return triagem
+
+
+def aplicar_triagem(
+    agentes: Dict[str, Any],
+    texto_do_caso: str,
+    prefixo: str,
+    triagem_de_relevancia: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, TriagemDoAgente]:
+    """
+    Tria os agentes de uma etapa e registra as decisões para o resultado.
+
+    Ponto único usado pelos orquestradores (AgenteAdvogadoCoordenador e
+    OrquestradorAnalisePeticoes) antes de criar as chamadas ao LLM.
+
+    Args:
+        agentes: Identificador → instância do agente
+        texto_do_caso: Pergunta e/ou documentos do caso
+        prefixo: "advogado" ou "perito" (chave "<prefixo>_<id>" em triagem_de_relevancia)
+        triagem_de_relevancia: (Opcional) Recebe a decisão de cada agente (para_dict())
+
+    Returns:
+        Dict[str, TriagemDoAgente]: Decisão para cada identificador
+    """
+    triagem = triar_agentes(agentes, texto_do_caso)
+
+    for identificador, resultado in triagem.items():
+        if resultado.decisao == DECISAO_PULAR:
+            logger.info(f"⏭️ {prefixo.capitalize()} '{identificador}' ignorado pela triagem: {resultado.razao}")
+        if triagem_de_relevancia is not None:
+            triagem_de_relevancia[f"{prefixo}_{identificador}"] = resultado.para_dict()
+
+    return triagem
+
+
+def agentes_ignorados(triagem_de_relevancia: Dict[str, Dict[str, Any]], prefixo: str) -> List[str]:
+    """
+    Identificadores que a triagem pulou em uma etapa (sem parecer no resultado).
+
+    Args:
+        triagem_de_relevancia: Decisões registradas por aplicar_triagem
+        prefixo: "advogado" ou "perito"
+
+    Returns:
+        List[str]: Identificadores (sem o prefixo) com decisão DECISAO_PULAR
+    """
+    inicio = f"{prefixo}_"
+    return [
+        chave[len(inicio):]
+        for chave, resultado in triagem_de_relevancia.items()
+        if chave.startswith(inicio) and resultado.get("decisao") == DECISAO_PULAR
+    ]
@@ -0,0 +1,367 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - AGENDADOR DE CHAMADAS AO LLM
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida o agendador global de chamadas ao LLM: limite de chamadas
+simultâneas por modelo, pistas de prioridade (interativa > análise de
+petição), rodízio entre análises da mesma pista, cancelamento de
+quem espera, estatísticas de fila e a integração com o GerenciadorLLM.
+
+ESTRATÉGIA:
+- Agendadores com limite 1 ou 2, para que a ordem de concessão seja observável
+- Chamadas à API substituídas por mock
+============================================================================
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+from openai.types.chat import ChatCompletion
+
+from src.configuracao.configuracoes import Configuracoes
+from src.utilitarios import gerenciador_llm as modulo_gerenciador_llm
+from src.utilitarios.agendador_llm import (
+    ID_FLUXO_PADRAO,
+    AgendadorChamadasLLM,
+    ErroChamadaSincronaNoEventLoop,
+    PrioridadeLLM,
+    contexto_agendamento_llm,
+    obter_contexto_agendamento_llm,
+)
+from src.utilitarios.gerenciador_llm import GerenciadorLLM
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.agendador_llm  # Agendador de chamadas ao LLM
+]
+
+
+MODELO = "gpt-4o-mini"
+
+
+async def executar_em_fila(agendador: AgendadorChamadasLLM, chamadas):
+    """
+    Ocupa a única vaga, enfileira as chamadas (prioridade, id_fluxo, rótulo)
+    na ordem dada e devolve a ordem em que as vagas foram concedidas.
+    """
+    ordem_de_concessao = []
+
+    async def chamar(prioridade, id_fluxo, rotulo):
+        async with agendador.reservar_async(MODELO, prioridade, id_fluxo):
+            ordem_de_concessao.append(rotulo)
+
+    with agendador.reservar(MODELO):
+        tarefas = []
+        for prioridade, id_fluxo, rotulo in chamadas:
+            tarefas.append(asyncio.create_task(chamar(prioridade, id_fluxo, rotulo)))
+            await asyncio.sleep(0)  # Garante a ordem de chegada na fila
+    await asyncio.gather(*tarefas)
+    return ordem_de_concessao
+
+
+# ============================================================================
+# GRUPO DE TESTES: LIMITE E ORDEM DE CONCESSÃO
+# ============================================================================
+
+class TestAgendadorChamadasLLM:
+    """
+    Testa limites, prioridades e rodízio entre análises.
+    """
+
+    def test_nao_deve_exceder_limite_de_chamadas_simultaneas(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=2)
+        lock = threading.Lock()
+        simultaneas = {"atual": 0, "maximo": 0}
+
+        def chamar():
+            with agendador.reservar(MODELO):
+                with lock:
+                    simultaneas["atual"] += 1
+                    simultaneas["maximo"] = max(simultaneas["maximo"], simultaneas["atual"])
+                time.sleep(0.01)
+                with lock:
+                    simultaneas["atual"] -= 1
+
+        # ACT
+        threads = [threading.Thread(target=chamar) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # ASSERT
+        assert simultaneas["maximo"] == 2
+        assert agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"] == 0
+
+    def test_limite_por_modelo_deve_ser_independente(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1, limites_por_modelo={"gpt-4o": 3})
+
+        # ACT
+        with agendador.reservar(MODELO), agendador.reservar("gpt-4o"), agendador.reservar("gpt-4o"):
+            estatisticas = agendador.obter_estatisticas()["por_modelo"]
+
+        # ASSERT
+        assert estatisticas[MODELO] == {"limite": 1, "em_uso": 1, "na_fila": {"interativa": 0, "analise_peticao": 0}}
+        assert estatisticas["gpt-4o"]["limite"] == 3
+        assert estatisticas["gpt-4o"]["em_uso"] == 2
+
+    def test_vaga_livre_deve_ir_para_a_pista_de_maior_prioridade(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+        chamadas = [
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-1", "peticao-1"),
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-2", "peticao-2"),
+            (PrioridadeLLM.INTERATIVA, "consulta-1", "consulta"),
+        ]
+
+        # ACT
+        ordem = asyncio.run(executar_em_fila(agendador, chamadas))
+
+        # ASSERT
+        assert ordem == ["consulta", "peticao-1", "peticao-2"]
+
+    def test_analises_da_mesma_pista_devem_se_revezar(self):
+        # ARRANGE: a petição A enfileira 3 agentes antes de a petição B chegar
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+        chamadas = [
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-A", "A1"),
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-A", "A2"),
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-A", "A3"),
+            (PrioridadeLLM.ANALISE_PETICAO, "peticao-B", "B1"),
+        ]
+
+        # ACT
+        ordem = asyncio.run(executar_em_fila(agendador, chamadas))
+
+        # ASSERT
+        assert ordem == ["A1", "B1", "A2", "A3"]
+
+    def test_deve_usar_prioridade_e_fluxo_do_contexto(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+
+        async def chamar_sem_prioridade_explicita():
+            async with agendador.reservar_async(MODELO):
+                return obter_contexto_agendamento_llm()
+
+        # ACT: o contexto é herdado pelas tasks do asyncio.run()
+        with contexto_agendamento_llm(PrioridadeLLM.ANALISE_PETICAO, "peticao-1"):
+            contexto_na_task = asyncio.run(chamar_sem_prioridade_explicita())
+        with agendador.reservar(MODELO):
+            pass
+
+        # ASSERT
+        estatisticas = agendador.obter_estatisticas()["por_prioridade"]
+        assert contexto_na_task == (PrioridadeLLM.ANALISE_PETICAO, "peticao-1")
+        assert obter_contexto_agendamento_llm() == (PrioridadeLLM.INTERATIVA, ID_FLUXO_PADRAO)
+        assert estatisticas["analise_peticao"]["concedidas"] == 1
+        assert estatisticas["interativa"]["concedidas"] == 1
+
+    def test_limite_invalido_deve_lancar_erro(self):
+        # ACT & ASSERT
+        with pytest.raises(ValueError):
+            AgendadorChamadasLLM(limite_padrao=0)
+        with pytest.raises(ValueError):
+            AgendadorChamadasLLM(limites_por_modelo={"gpt-4o": 0})
+
+
+# ============================================================================
+# GRUPO DE TESTES: CANCELAMENTO E ESTATÍSTICAS
+# ============================================================================
+
+class TestFilaDoAgendador:
+    """
+    Testa cancelamento de quem espera e a observabilidade da fila.
+    """
+
+    def test_cancelamento_deve_retirar_chamada_da_fila(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+
+        async def executar():
+            async def esperar_vaga():
+                async with agendador.reservar_async(MODELO, PrioridadeLLM.ANALISE_PETICAO, "peticao-1"):
+                    pass
+
+            with agendador.reservar(MODELO):
+                tarefa = asyncio.create_task(esperar_vaga())
+                await asyncio.sleep(0)
+                na_fila_antes = agendador.obter_estatisticas()["por_prioridade"]["analise_peticao"]["na_fila"]
+                tarefa.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await tarefa
+            return na_fila_antes
+
+        # ACT
+        na_fila_antes = asyncio.run(executar())
+
+        # ASSERT
+        estatisticas = agendador.obter_estatisticas()
+        assert na_fila_antes == 1
+        assert estatisticas["por_prioridade"]["analise_peticao"]["na_fila"] == 0
+        assert estatisticas["por_modelo"][MODELO]["em_uso"] == 0
+
+    def test_cancelamento_apos_concessao_deve_devolver_a_vaga(self):
+        # ARRANGE: a vaga é concedida, mas a task é cancelada antes de acordar
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+
+        async def executar():
+            async def esperar_vaga():
+                async with agendador.reservar_async(MODELO):
+                    pass
+
+            with agendador.reservar(MODELO):
+                tarefa = asyncio.create_task(esperar_vaga())
+                await asyncio.sleep(0)
+            tarefa.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tarefa
+
+        # ACT
+        asyncio.run(executar())
+
+        # ASSERT
+        assert agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"] == 0
+
+    def test_chamada_sincrona_no_event_loop_nao_deve_esperar_vaga(self):
+        # ARRANGE: a única vaga está com uma task do próprio loop, que só a
+        # devolve quando o loop voltar a rodar (esperar aqui seria deadlock)
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+        resultado = {}
+
+        async def executar():
+            vaga_ocupada = asyncio.Event()
+            liberar = asyncio.Event()
+
+            async def ocupar_vaga():
+                async with agendador.reservar_async(MODELO):
+                    vaga_ocupada.set()
+                    await liberar.wait()
+
+            tarefa = asyncio.create_task(ocupar_vaga())
+            await vaga_ocupada.wait()
+            with agendador.reservar(MODELO):
+                resultado["em_uso_durante"] = agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"]
+            liberar.set()
+            await tarefa
+
+        # ACT: em outra thread, para o teste falhar (e não travar) se houver deadlock
+        thread = threading.Thread(target=lambda: asyncio.run(executar()), daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+
+        # ASSERT: seguiu sem vaga, sem ocupar nem devolver a vaga da task
+        assert not thread.is_alive()
+        estatisticas = agendador.obter_estatisticas()
+        assert resultado["em_uso_durante"] == 1
+        assert estatisticas["por_modelo"][MODELO]["em_uso"] == 0
+        assert estatisticas["por_prioridade"]["interativa"]["sem_vaga_no_event_loop"] == 1
+
+    def test_modo_estrito_deve_rejeitar_chamada_sincrona_no_event_loop(self):
+        # ARRANGE: mesmo com vaga livre, o chamador deveria usar reservar_async
+        agendador = AgendadorChamadasLLM(limite_padrao=1, estrito=True)
+
+        async def executar():
+            with agendador.reservar(MODELO):
+                pass
+
+        # ACT / ASSERT
+        with pytest.raises(ErroChamadaSincronaNoEventLoop):
+            asyncio.run(executar())
+        with agendador.reservar(MODELO):
+            pass
+        assert agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"] == 0
+
+    def test_estatisticas_devem_registrar_espera_e_profundidade(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+        chamadas = [(PrioridadeLLM.ANALISE_PETICAO, f"peticao-{indice}", indice) for indice in range(3)]
+
+        # ACT
+        asyncio.run(executar_em_fila(agendador, chamadas))
+
+        # ASSERT
+        pista = agendador.obter_estatisticas()["por_prioridade"]["analise_peticao"]
+        assert pista["concedidas"] == 3
+        assert pista["na_fila"] == 0
+        assert pista["profundidade_maxima"] == 3
+        assert pista["tempo_de_espera_segundos"]["amostras"] == 3
+
+
+# ============================================================================
+# GRUPO DE TESTES: CONFIGURAÇÃO E INTEGRAÇÃO COM O GERENCIADOR
+# ============================================================================
+
+class TestAgendadorNoGerenciador:
+    """
+    Testa a configuração dos limites e o uso do agendador por chamar_llm().
+    """
+
+    def test_deve_converter_limites_por_modelo(self):
+        # ARRANGE
+        configuracoes = Configuracoes(LLM_LIMITES_CHAMADAS_POR_MODELO="gpt-4o=4, gpt-4o-mini=12,")
+
+        # ACT & ASSERT
+        assert configuracoes.obter_limites_chamadas_por_modelo() == {"gpt-4o": 4, "gpt-4o-mini": 12}
+
+    def test_limite_por_modelo_mal_formatado_deve_lancar_erro(self):
+        # ARRANGE
+        configuracoes = Configuracoes(LLM_LIMITES_CHAMADAS_POR_MODELO="gpt-4o:4")
+
+        # ACT & ASSERT
+        with pytest.raises(ValueError):
+            configuracoes.obter_limites_chamadas_por_modelo()
+
+    def test_vaga_deve_ficar_livre_durante_o_backoff(self):
+        # ARRANGE
+        agendador = AgendadorChamadasLLM(limite_padrao=1)
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", agendador=agendador)
+        resposta = ChatCompletion.model_validate({
+            "id": "chatcmpl-teste",
+            "object": "chat.completion",
+            "created": 0,
+            "model": MODELO,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Parecer"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        })
+        erro_429 = RateLimitError(
+            "erro 429",
+            response=httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")),
+            body=None
+        )
+        vagas_em_uso = []
+
+        def em_uso(*args, **kwargs):
+            vagas_em_uso.append(agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"])
+
+        def criar(**parametros):
+            em_uso()
+            if len(vagas_em_uso) == 1:
+                raise erro_429
+            return resposta
+
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = criar
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm.time, "sleep", side_effect=em_uso):
+            texto = gerenciador.chamar_llm(prompt="Analise", modelo=MODELO, usar_cache=False)
+
+        # ASSERT: ocupada na 1ª tentativa, livre no backoff, ocupada na 2ª
+        assert texto == "Parecer"
+        assert vagas_em_uso == [1, 0, 1]
+        assert agendador.obter_estatisticas()["por_modelo"][MODELO]["em_uso"] == 0
+        assert "agendador" in modulo_gerenciador_llm.obter_metricas_llm()
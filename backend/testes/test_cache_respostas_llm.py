@@ -0,0 +1,184 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - CACHE DE RESPOSTAS DO LLM
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida o cache endereçado por conteúdo usado pelo GerenciadorLLM para
+reaproveitar respostas de requisições idênticas: chave, TTL, limite de
+entradas (LRU) e contadores de acertos/falhas.
+
+ESTRATÉGIA:
+- Banco SQLite em memória (":memory:"), nada é gravado em ./dados
+- Tempo controlado com patch de time.time no módulo do cache
+============================================================================
+"""
+
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from src.utilitarios import cache_respostas_llm as modulo_cache
+from src.utilitarios.cache_respostas_llm import CacheRespostasLLM, ErroDeCacheRespostasLLM, calcular_chave_cache
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.gerenciador_llm  # Cache usado pelo gerenciador de LLM
+]
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def cache() -> CacheRespostasLLM:
+    """
+    Cache em memória com TTL de 1 hora e até 3 entradas.
+    """
+    return CacheRespostasLLM(":memory:", ttl_segundos=3600, max_entradas=3)
+
+
+class SchemaParecer(BaseModel):
+    conclusao: str
+
+
+class SchemaParecerComRiscos(BaseModel):
+    conclusao: str
+    riscos: list[str]
+
+
+# ============================================================================
+# GRUPO DE TESTES: CHAVE DO CACHE
+# ============================================================================
+
+class TestChaveCache:
+    """
+    Testa a chave endereçada por conteúdo.
+    """
+
+    def test_requisicoes_identicas_devem_ter_mesma_chave(self):
+        # ACT
+        chave_1 = calcular_chave_cache("gpt-4o-mini", "Sistema", "Prompt", 0.2, response_schema=SchemaParecer)
+        chave_2 = calcular_chave_cache("gpt-4o-mini", "Sistema", "Prompt", 0.2, response_schema=SchemaParecer)
+
+        # ASSERT
+        assert chave_1 == chave_2
+        assert len(chave_1) == 64
+
+    @pytest.mark.parametrize("alteracao", [
+        {"modelo": "gpt-4o"},
+        {"mensagens_de_sistema": "Outro sistema"},
+        {"prompt": "Outro prompt"},
+        {"temperatura": 0.3},
+        {"max_tokens": 100},
+        {"response_schema": SchemaParecerComRiscos},
+    ])
+    def test_qualquer_mudanca_na_requisicao_deve_mudar_a_chave(self, alteracao):
+        # ARRANGE
+        base = {
+            "modelo": "gpt-4o-mini",
+            "mensagens_de_sistema": "Sistema",
+            "prompt": "Prompt",
+            "temperatura": 0.2,
+            "response_schema": SchemaParecer,
+        }
+
+        # ACT / ASSERT
+        assert calcular_chave_cache(**base) != calcular_chave_cache(**{**base, **alteracao})
+
+
+# ============================================================================
+# GRUPO DE TESTES: LEITURA, TTL E LIMITE
+# ============================================================================
+
+class TestCacheRespostasLLM:
+    """
+    Testa leitura, gravação, TTL, limite de entradas e contadores.
+    """
+
+    def test_salvar_e_obter_deve_devolver_resposta_e_contar_acerto(self, cache):
+        # ARRANGE
+        cache.salvar("chave-1", "gpt-4o-mini", "Parecer", tokens_totais=120, custo_estimado_usd=0.002)
+
+        # ACT
+        resposta = cache.obter("chave-1")
+
+        # ASSERT
+        assert resposta.resposta == "Parecer"
+        assert resposta.tokens_totais == 120
+        estatisticas = cache.obter_estatisticas()
+        assert estatisticas["acertos"] == 1
+        assert estatisticas["falhas"] == 0
+        assert estatisticas["tokens_evitados"] == 120
+        assert estatisticas["custo_evitado_usd"] == pytest.approx(0.002)
+
+    def test_chave_ausente_deve_contar_falha(self, cache):
+        # ACT
+        resposta = cache.obter("inexistente")
+
+        # ASSERT
+        assert resposta is None
+        assert cache.obter_estatisticas()["falhas"] == 1
+        assert cache.obter_estatisticas()["taxa_de_acerto_percentual"] == 0.0
+
+    def test_entrada_vencida_deve_ser_falha_e_removida(self, cache):
+        # ARRANGE
+        with patch.object(modulo_cache.time, "time", return_value=1000.0):
+            cache.salvar("chave-1", "gpt-4o-mini", "Parecer antigo")
+
+        # ACT
+        with patch.object(modulo_cache.time, "time", return_value=1000.0 + 3601):
+            resposta = cache.obter("chave-1")
+
+        # ASSERT
+        assert resposta is None
+        assert cache.contar_entradas() == 0
+
+    def test_limite_de_entradas_deve_remover_a_menos_acessada(self, cache):
+        # ARRANGE: três entradas; "a" é relida e passa a ser a mais recente
+        for instante, chave in enumerate(["a", "b", "c"]):
+            with patch.object(modulo_cache.time, "time", return_value=float(instante)):
+                cache.salvar(chave, "gpt-4o-mini", f"Resposta {chave}")
+        with patch.object(modulo_cache.time, "time", return_value=10.0):
+            cache.obter("a")
+
+        # ACT
+        with patch.object(modulo_cache.time, "time", return_value=11.0):
+            cache.salvar("d", "gpt-4o-mini", "Resposta d")
+
+        # ASSERT
+        assert cache.contar_entradas() == 3
+        with patch.object(modulo_cache.time, "time", return_value=12.0):
+            assert cache.obter("b") is None
+            assert cache.obter("a") is not None
+
+    def test_remover_expiradas_e_limpar(self, cache):
+        # ARRANGE
+        with patch.object(modulo_cache.time, "time", return_value=0.0):
+            cache.salvar("velha", "gpt-4o-mini", "Resposta velha")
+        with patch.object(modulo_cache.time, "time", return_value=5000.0):
+            cache.salvar("nova", "gpt-4o-mini", "Resposta nova")
+
+            # ACT / ASSERT
+            assert cache.remover_expiradas() == 1
+        assert cache.limpar() == 1
+        assert cache.contar_entradas() == 0
+
+    @pytest.mark.parametrize("operacao", ["obter", "salvar", "remover_expiradas", "limpar", "contar_entradas"])
+    def test_falha_do_sqlite_deve_virar_erro_de_cache(self, cache, operacao):
+        # ARRANGE: conexão fechada → sqlite3.ProgrammingError em qualquer comando
+        cache._conexao.close()
+        argumentos = {
+            "obter": ("chave",),
+            "salvar": ("chave", "gpt-4o-mini", "Resposta"),
+        }.get(operacao, ())
+
+        # ACT / ASSERT
+        with pytest.raises(ErroDeCacheRespostasLLM):
+            getattr(cache, operacao)(*argumentos)
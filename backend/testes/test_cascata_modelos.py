@@ -0,0 +1,235 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - CASCATA DE MODELOS DOS AGENTES
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida a cascata de AgenteBase.processar()/processar_async(): o modelo
+rápido responde primeiro, a resposta só escala para o modelo principal
+quando a autoavaliação pede, a confiança é baixa ou o modelo rápido falha,
+e o nível que respondeu fica registrado em metadados["cascata"].
+
+ESTRATÉGIA:
+- Agente mínimo com GerenciadorLLM substituído por mock (sem chamadas à API)
+- Respostas do modelo rápido e do principal definidas por side_effect
+============================================================================
+"""
+
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.agentes.agente_base import (
+    AUTOAVALIACAO_ESCALAR,
+    AUTOAVALIACAO_SUFICIENTE,
+    INSTRUCAO_AUTOAVALIACAO,
+    MOTIVO_ESCALONAMENTO_AUTOAVALIACAO,
+    MOTIVO_ESCALONAMENTO_CONFIANCA_BAIXA,
+    MOTIVO_ESCALONAMENTO_ERRO,
+    NIVEL_CASCATA_PRINCIPAL,
+    NIVEL_CASCATA_RAPIDO,
+    AgenteBase,
+    separar_autoavaliacao,
+)
+from src.utilitarios.gerenciador_llm import ErroGeralAPI, GerenciadorLLM
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.agente_base  # Cascata de modelos da classe base
+]
+
+
+MODELO_RAPIDO = "modelo-rapido"
+PARECER_COMPLETO = (
+    "Não há matéria tributária no caso: a controvérsia é exclusivamente trabalhista, "
+    "envolvendo acidente de trabalho e responsabilidade do empregador."
+)
+
+
+class AgenteDeTeste(AgenteBase):
+    """
+    Agente mínimo com a cascata ligada e o orçamento de tokens desligado.
+    """
+
+    def __init__(self, gerenciador_llm):
+        super().__init__(gerenciador_llm)
+        self.nome_do_agente = "Agente de Teste"
+        self.descricao_do_agente = "Analisa questões tributárias"
+        self.orcamento_tokens_prompt = 0
+        self.usar_cascata_de_modelos = True
+        self.modelo_llm_rapido = MODELO_RAPIDO
+
+    def montar_prompt(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Dict[str, Any] = None
+    ) -> str:
+        return pergunta_do_usuario + "\n" + "\n".join(contexto_de_documentos)
+
+
+def criar_agente(*respostas) -> AgenteDeTeste:
+    gerenciador = Mock(spec=GerenciadorLLM)
+    gerenciador.chamar_llm.side_effect = list(respostas)
+    return AgenteDeTeste(gerenciador)
+
+
+def processar(agente: AgenteDeTeste, **kwargs) -> Dict[str, Any]:
+    return agente.processar(
+        contexto_de_documentos=["Petição inicial trabalhista"],
+        pergunta_do_usuario="Há questão tributária?",
+        **kwargs
+    )
+
+
+# ============================================================================
+# GRUPO DE TESTES: ESCALONAMENTO
+# ============================================================================
+
+class TestCascataDeModelos:
+    """
+    Testa a decisão entre o modelo rápido e o modelo principal.
+    """
+
+    def test_resposta_suficiente_do_modelo_rapido_deve_ser_aceita(self):
+        # ARRANGE
+        agente = criar_agente(f"{PARECER_COMPLETO}\n\nAUTOAVALIAÇÃO: {AUTOAVALIACAO_SUFICIENTE}")
+
+        # ACT
+        resultado = processar(agente)
+
+        # ASSERT: uma chamada só, ao modelo rápido, sem a linha de autoavaliação
+        chamadas = agente.gerenciador_llm.chamar_llm.call_args_list
+        assert len(chamadas) == 1
+        assert chamadas[0].kwargs["modelo"] == MODELO_RAPIDO
+        assert chamadas[0].kwargs["prompt"].endswith(INSTRUCAO_AUTOAVALIACAO)
+        assert resultado["parecer"] == PARECER_COMPLETO
+        assert resultado["modelo_utilizado"] == MODELO_RAPIDO
+        assert resultado["metadados"]["cascata"]["nivel"] == NIVEL_CASCATA_RAPIDO
+        assert agente.obter_estatisticas()["respostas_por_nivel_da_cascata"][NIVEL_CASCATA_RAPIDO] == 1
+
+    def test_autoavaliacao_escalar_deve_chamar_o_modelo_principal(self):
+        # ARRANGE
+        agente = criar_agente(f"{PARECER_COMPLETO}\nAUTOAVALIAÇÃO: {AUTOAVALIACAO_ESCALAR}", "Parecer do principal")
+
+        # ACT
+        resultado = processar(agente)
+
+        # ASSERT: o modelo principal recebe o prompt original
+        segunda_chamada = agente.gerenciador_llm.chamar_llm.call_args_list[1].kwargs
+        assert segunda_chamada["modelo"] == agente.modelo_llm_padrao
+        assert INSTRUCAO_AUTOAVALIACAO not in segunda_chamada["prompt"]
+        assert resultado["parecer"] == "Parecer do principal"
+        assert resultado["modelo_utilizado"] == agente.modelo_llm_padrao
+        cascata = resultado["metadados"]["cascata"]
+        assert cascata["nivel"] == NIVEL_CASCATA_PRINCIPAL
+        assert cascata["motivo_do_escalonamento"] == MOTIVO_ESCALONAMENTO_AUTOAVALIACAO
+
+    def test_confianca_baixa_deve_escalar(self):
+        # ARRANGE: resposta curta e incerta, apesar da autoavaliação
+        agente = criar_agente(f"Talvez.\nAUTOAVALIAÇÃO: {AUTOAVALIACAO_SUFICIENTE}", "Parecer do principal")
+
+        # ACT
+        resultado = processar(agente)
+
+        # ASSERT
+        cascata = resultado["metadados"]["cascata"]
+        assert cascata["motivo_do_escalonamento"] == MOTIVO_ESCALONAMENTO_CONFIANCA_BAIXA
+        assert cascata["confianca_do_modelo_rapido"] < 0.6
+
+    def test_falha_do_modelo_rapido_deve_escalar(self):
+        # ARRANGE
+        agente = criar_agente(ErroGeralAPI("modelo indisponível"), "Parecer do principal")
+
+        # ACT
+        resultado = processar(agente)
+
+        # ASSERT
+        assert resultado["parecer"] == "Parecer do principal"
+        assert resultado["metadados"]["cascata"]["motivo_do_escalonamento"] == MOTIVO_ESCALONAMENTO_ERRO
+
+    def test_modelo_customizado_deve_ignorar_a_cascata(self):
+        # ARRANGE
+        agente = criar_agente("Parecer")
+
+        # ACT
+        resultado = processar(agente, modelo_customizado="gpt-4o")
+
+        # ASSERT
+        assert agente.gerenciador_llm.chamar_llm.call_args.kwargs["modelo"] == "gpt-4o"
+        assert resultado["metadados"]["cascata"] is None
+
+    def test_cascata_desligada_no_agente_deve_usar_so_o_modelo_principal(self):
+        # ARRANGE
+        agente = criar_agente("Parecer")
+        agente.usar_cascata_de_modelos = False
+
+        # ACT
+        processar(agente)
+
+        # ASSERT
+        assert agente.gerenciador_llm.chamar_llm.call_count == 1
+        assert agente.gerenciador_llm.chamar_llm.call_args.kwargs["modelo"] == agente.modelo_llm_padrao
+
+    def test_streaming_deve_receber_a_resposta_rapida_em_um_fragmento(self):
+        # ARRANGE
+        agente = criar_agente(f"{PARECER_COMPLETO}\nAUTOAVALIAÇÃO: {AUTOAVALIACAO_SUFICIENTE}")
+        fragmentos = []
+
+        # ACT
+        processar(agente, ao_receber_fragmento=fragmentos.append)
+
+        # ASSERT: a chamada ao modelo rápido não é transmitida
+        assert agente.gerenciador_llm.chamar_llm.call_args.kwargs["ao_receber_fragmento"] is None
+        assert fragmentos == [PARECER_COMPLETO]
+
+    @pytest.mark.asyncio
+    async def test_processar_async_deve_seguir_a_mesma_cascata(self):
+        # ARRANGE
+        gerenciador = Mock(spec=GerenciadorLLM)
+        gerenciador.chamar_llm_async = AsyncMock(
+            side_effect=[f"{PARECER_COMPLETO}\nAUTOAVALIAÇÃO: {AUTOAVALIACAO_ESCALAR}", "Parecer do principal"]
+        )
+        agente = AgenteDeTeste(gerenciador)
+
+        # ACT
+        resultado = await agente.processar_async(
+            contexto_de_documentos=["Petição inicial trabalhista"],
+            pergunta_do_usuario="Há questão tributária?",
+        )
+
+        # ASSERT
+        modelos = [chamada.kwargs["modelo"] for chamada in gerenciador.chamar_llm_async.call_args_list]
+        assert modelos == [MODELO_RAPIDO, agente.modelo_llm_padrao]
+        assert resultado["metadados"]["cascata"]["nivel"] == NIVEL_CASCATA_PRINCIPAL
+
+
+# ============================================================================
+# GRUPO DE TESTES: AUTOAVALIAÇÃO
+# ============================================================================
+
+class TestSepararAutoavaliacao:
+    """
+    Testa a leitura da linha de autoavaliação do modelo rápido.
+    """
+
+    def test_deve_aceitar_marcacao_markdown_e_minusculas(self):
+        # ACT
+        parecer, autoavaliacao = separar_autoavaliacao("Parecer.\n\n**Autoavaliacao: escalar**")
+
+        # ASSERT
+        assert parecer == "Parecer."
+        assert autoavaliacao == AUTOAVALIACAO_ESCALAR
+
+    def test_resposta_sem_autoavaliacao_deve_ficar_intacta(self):
+        # ACT
+        parecer, autoavaliacao = separar_autoavaliacao("Parecer sem a linha final.")
+
+        # ASSERT
+        assert parecer == "Parecer sem a linha final."
+        assert autoavaliacao is None
@@ -0,0 +1,184 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - LAYOUT DOS PROMPTS PARA CACHE DO PROVEDOR
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida o layout [documentos do caso] → [instruções de sistema] → [tarefa]:
+o contexto compartilhado é idêntico entre os agentes de uma análise, as
+instruções fixas não dependem dos documentos, o GerenciadorLLM envia o
+contexto como prefixo e registra os tokens de prompt servidos do cache.
+
+ESTRATÉGIA:
+- Agentes reais com GerenciadorLLM substituído por mock
+- Cliente OpenAI substituído por mock (sem chamadas à API)
+============================================================================
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from src.agentes.agente_advogado_civel import AgenteAdvogadoCivel
+from src.agentes.agente_advogado_tributario import AgenteAdvogadoTributario
+from src.agentes.agente_estrategista_processual import AgenteEstrategistaProcessual
+from src.agentes.agente_perito_medico import AgentePeritoMedico
+from src.agentes.agente_prognostico import AgentePrognostico
+from src.utilitarios import gerenciador_llm as modulo_gerenciador_llm
+from src.utilitarios.cache_respostas_llm import calcular_chave_cache
+from src.utilitarios.gerenciador_llm import GerenciadorLLM
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.gerenciador_llm  # Layout das mensagens enviadas ao LLM
+]
+
+
+PETICAO = "Petição inicial: o autor sofreu acidente de trabalho na prensa."
+ANEXOS = ["Laudo médico: amputação parcial do dedo indicador.", "CAT emitida pela empresa."]
+PERGUNTA = "Há responsabilidade civil do empregador?"
+
+
+# ============================================================================
+# GRUPO DE TESTES: PROMPT DOS AGENTES
+# ============================================================================
+
+class TestPromptDoAgente:
+    """
+    Testa a divisão do prompt em contexto, instruções e tarefa.
+    """
+
+    def test_agentes_diferentes_devem_compartilhar_o_mesmo_contexto(self):
+        # ARRANGE
+        documentos = [PETICAO] + ANEXOS
+        agentes = [
+            AgenteAdvogadoCivel(Mock(spec=GerenciadorLLM)),
+            AgenteAdvogadoTributario(Mock(spec=GerenciadorLLM)),
+            AgentePeritoMedico(Mock(spec=GerenciadorLLM)),
+            AgenteEstrategistaProcessual(Mock(spec=GerenciadorLLM)),
+            AgentePrognostico(Mock(spec=GerenciadorLLM)),
+        ]
+
+        # ACT
+        prompts = [agente.montar_prompt_do_agente(documentos, PERGUNTA, {"tipo_acao": "Indenização"}) for agente in agentes]
+
+        # ASSERT: mesmo prefixo, instruções próprias de cada agente
+        assert len({prompt.contexto_compartilhado for prompt in prompts}) == 1
+        assert len({prompt.mensagem_de_sistema for prompt in prompts}) == len(agentes)
+        assert PETICAO in prompts[0].contexto_compartilhado
+
+    def test_instrucoes_de_sistema_nao_devem_depender_do_caso(self):
+        # ARRANGE
+        advogado = AgenteAdvogadoCivel(Mock(spec=GerenciadorLLM))
+
+        # ACT
+        prompt_a = advogado.montar_prompt_do_agente([PETICAO], PERGUNTA)
+        prompt_b = advogado.montar_prompt_do_agente(ANEXOS, "Cabe dano moral?")
+
+        # ASSERT
+        assert prompt_a.mensagem_de_sistema == prompt_b.mensagem_de_sistema
+        assert PETICAO not in prompt_a.mensagem_de_sistema
+        assert PERGUNTA in prompt_a.prompt
+        assert PETICAO not in prompt_a.prompt
+
+    def test_montar_prompt_deve_conter_as_tres_partes(self):
+        # ARRANGE
+        perito = AgentePeritoMedico(Mock(spec=GerenciadorLLM))
+
+        # ACT
+        prompt = perito.montar_prompt([PETICAO], PERGUNTA, {"tipo_processo": "Trabalhista"})
+
+        # ASSERT: documentos → instruções → tarefa
+        assert prompt.index(PETICAO) < prompt.index("PERITO MÉDICO") < prompt.index(PERGUNTA)
+        assert "Tipo de processo: Trabalhista" in prompt
+
+    def test_processar_deve_enviar_o_contexto_separado(self):
+        # ARRANGE
+        gerenciador = Mock(spec=GerenciadorLLM)
+        gerenciador.chamar_llm.return_value = "Parecer"
+        advogado = AgenteAdvogadoCivel(gerenciador)
+        advogado.orcamento_tokens_prompt = 0
+
+        # ACT
+        resultado = advogado.processar(contexto_de_documentos=[PETICAO], pergunta_do_usuario=PERGUNTA)
+
+        # ASSERT
+        argumentos = gerenciador.chamar_llm.call_args.kwargs
+        assert PETICAO in argumentos["contexto_compartilhado"]
+        assert PETICAO not in argumentos["prompt"]
+        assert resultado["metadados"]["contexto_compartilhado"] is True
+
+
+# ============================================================================
+# GRUPO DE TESTES: GERENCIADOR LLM
+# ============================================================================
+
+class TestContextoCompartilhadoNoGerenciador:
+    """
+    Testa a ordem das mensagens, a chave do cache e os tokens em cache.
+    """
+
+    def test_contexto_deve_ser_a_primeira_mensagem(self):
+        # ARRANGE
+        gerenciador = GerenciadorLLM(chave_api="sk-teste")
+
+        # ACT
+        mensagens = gerenciador._montar_mensagens("Tarefa", "Instruções", contexto_compartilhado="Documentos")
+
+        # ASSERT
+        assert [mensagem["role"] for mensagem in mensagens] == ["user", "system", "user"]
+        assert [mensagem["content"] for mensagem in mensagens] == ["Documentos", "Instruções", "Tarefa"]
+
+    def test_chave_do_cache_deve_considerar_o_contexto(self):
+        # ARRANGE
+        argumentos = {"modelo": "gpt-4o-mini", "mensagens_de_sistema": "S", "prompt": "P", "temperatura": 0.2}
+
+        # ACT
+        sem_contexto = calcular_chave_cache(**argumentos)
+        contexto_a = calcular_chave_cache(**argumentos, contexto_compartilhado="Caso A")
+        contexto_b = calcular_chave_cache(**argumentos, contexto_compartilhado="Caso B")
+
+        # ASSERT
+        assert len({sem_contexto, contexto_a, contexto_b}) == 3
+        assert calcular_chave_cache(**argumentos, contexto_compartilhado=None) == sem_contexto
+
+    def test_tokens_de_prompt_em_cache_devem_ir_para_as_metricas(self):
+        # ARRANGE
+        gerenciador = GerenciadorLLM(chave_api="sk-teste")
+        gerenciador.resetar_estatisticas()
+        resposta = ChatCompletion.model_validate({
+            "id": "chatcmpl-teste",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Parecer"}}],
+            "usage": {
+                "prompt_tokens": 2000, "completion_tokens": 20, "total_tokens": 2020,
+                "prompt_tokens_details": {"cached_tokens": 1536},
+            },
+        })
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = resposta
+
+        # ACT
+        gerenciador.chamar_llm(
+            prompt="Tarefa",
+            mensagens_de_sistema="Instruções",
+            usar_cache=False,
+            agente="Advogado Cível",
+            contexto_compartilhado="Documentos",
+        )
+
+        # ASSERT
+        mensagens = gerenciador.cliente_openai.chat.completions.create.call_args.kwargs["messages"]
+        assert mensagens[0] == {"role": "user", "content": "Documentos"}
+        metricas = modulo_gerenciador_llm.obter_metricas_llm()
+        agente = metricas["por_agente"]["Advogado Cível"]
+        assert agente["tokens_de_prompt_em_cache"] == 1536
+        assert agente["percentual_prompt_em_cache"] == pytest.approx(76.8)
+        assert metricas["chamadas_recentes"][-1]["tokens_de_prompt_em_cache"] == 1536
@@ -0,0 +1,256 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - GERENCIADOR DE EVENTOS DE STREAMING (SSE)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida os canais que levam os fragmentos de texto dos agentes até os
+endpoints SSE: entrega entre threads/event loops, histórico para quem
+assina depois, reconexão com Last-Event-ID, encerramento e retenção.
+
+ESTRATÉGIA:
+- Publicação feita de uma thread separada (como a análise em background)
+- Assinatura consumida no event loop do teste (como o endpoint SSE)
+============================================================================
+"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.servicos import gerenciador_eventos_streaming as modulo_streaming
+from src.servicos.gerenciador_eventos_streaming import (
+    TIPO_EVENTO_CONCLUIDA,
+    TIPO_EVENTO_ERRO,
+    TIPO_EVENTO_FRAGMENTO,
+    CanalEventosStreaming,
+    GerenciadorEventosStreaming,
+    gerar_fluxo_sse,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.streaming  # Teste do streaming de eventos
+]
+
+
+async def coletar_eventos(canal: CanalEventosStreaming, a_partir_de: int = 0) -> list:
+    """
+    Consome a assinatura do canal até o evento final.
+    """
+    return [evento async for evento in canal.assinar(a_partir_de)]
+
+
+# ============================================================================
+# GRUPO DE TESTES: CANAL DE EVENTOS
+# ============================================================================
+
+class TestCanalEventosStreaming:
+    """
+    Testa a entrega de eventos de um canal.
+    """
+
+    @pytest.mark.asyncio
+    async def test_eventos_publicados_de_outra_thread_devem_chegar_ao_assinante(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        assinatura = asyncio.create_task(coletar_eventos(canal))
+        await asyncio.sleep(0)  # assinante registrado antes da publicação
+
+        def publicar_em_background():
+            canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "Nexo "})
+            canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "causal"})
+            canal.publicar(TIPO_EVENTO_CONCLUIDA)
+
+        # ACT
+        thread = threading.Thread(target=publicar_em_background)
+        thread.start()
+        eventos = await asyncio.wait_for(assinatura, timeout=5)
+        thread.join()
+
+        # ASSERT
+        assert [evento.tipo for evento in eventos] == [TIPO_EVENTO_FRAGMENTO, TIPO_EVENTO_FRAGMENTO, TIPO_EVENTO_CONCLUIDA]
+        assert [evento.sequencia for evento in eventos] == [1, 2, 3]
+        assert "".join(evento.dados.get("texto", "") for evento in eventos) == "Nexo causal"
+
+    @pytest.mark.asyncio
+    async def test_assinante_tardio_deve_receber_historico_e_terminar(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "trabalhista", "texto": "Parecer"})
+        canal.publicar(TIPO_EVENTO_ERRO, {"mensagem": "falhou"})
+
+        # ACT
+        eventos = await asyncio.wait_for(coletar_eventos(canal), timeout=5)
+
+        # ASSERT
+        assert [evento.tipo for evento in eventos] == [TIPO_EVENTO_FRAGMENTO, TIPO_EVENTO_ERRO]
+        assert canal.encerrado
+
+    @pytest.mark.asyncio
+    async def test_reconexao_deve_continuar_a_partir_do_ultimo_evento(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        for texto in ("a", "b", "c"):
+            canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": texto})
+        canal.publicar(TIPO_EVENTO_CONCLUIDA)
+
+        # ACT
+        eventos = await asyncio.wait_for(coletar_eventos(canal, a_partir_de=2), timeout=5)
+
+        # ASSERT
+        assert [evento.sequencia for evento in eventos] == [3, 4]
+
+    def test_eventos_depois_do_encerramento_devem_ser_ignorados(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        canal.publicar(TIPO_EVENTO_CONCLUIDA)
+
+        # ACT
+        evento = canal.publicar(TIPO_EVENTO_CONCLUIDA)
+
+        # ASSERT
+        assert evento is None
+
+    @pytest.mark.asyncio
+    async def test_sem_eventos_deve_produzir_keepalive(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        assinatura = canal.assinar(intervalo_keepalive_segundos=0.01)
+
+        # ACT
+        primeiro = await asyncio.wait_for(assinatura.__anext__(), timeout=5)
+        await assinatura.aclose()
+
+        # ASSERT
+        assert primeiro is None
+
+    @pytest.mark.asyncio
+    async def test_fluxo_sse_deve_formatar_id_evento_e_dados(self):
+        # ARRANGE
+        canal = CanalEventosStreaming()
+        canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "Laudo é válido"})
+        canal.publicar(TIPO_EVENTO_CONCLUIDA)
+
+        # ACT
+        blocos = [bloco async for bloco in gerar_fluxo_sse(canal)]
+
+        # ASSERT
+        linhas = blocos[0].split("\n")
+        assert linhas[0] == "id: 1"
+        assert linhas[1] == "event: fragmento"
+        assert json.loads(linhas[2].removeprefix("data: ")) == {"agente": "medico", "texto": "Laudo é válido"}
+        assert blocos[0].endswith("\n\n")
+        assert blocos[1].startswith("id: 2\nevent: concluida\n")
+
+
+# ============================================================================
+# GRUPO DE TESTES: GERENCIADOR DE CANAIS
+# ============================================================================
+
+class TestGerenciadorEventosStreaming:
+    """
+    Testa o registro de canais por análise.
+    """
+
+    def test_emissor_deve_publicar_fragmento_com_agente(self):
+        # ARRANGE
+        gerenciador = GerenciadorEventosStreaming()
+        emissor = gerenciador.criar_emissor_de_fragmentos("consulta-1")
+
+        # ACT
+        emissor("previdenciario", "Benefício devido")
+
+        # ASSERT
+        evento = list(gerenciador.obter_canal("consulta-1")._eventos)[0]
+        assert evento.tipo == TIPO_EVENTO_FRAGMENTO
+        assert evento.dados == {"agente": "previdenciario", "texto": "Benefício devido"}
+
+    def test_abrir_canal_deve_descartar_eventos_de_execucao_anterior(self):
+        # ARRANGE
+        gerenciador = GerenciadorEventosStreaming()
+        gerenciador.publicar("peticao-1", TIPO_EVENTO_ERRO, {"mensagem": "falhou"})
+
+        # ACT
+        canal = gerenciador.abrir_canal("peticao-1")
+
+        # ASSERT
+        assert not canal.encerrado
+        assert gerenciador.obter_canal("peticao-1") is canal
+
+    def test_canal_encerrado_deve_expirar_apos_retencao(self):
+        # ARRANGE
+        gerenciador = GerenciadorEventosStreaming(tempo_retencao_segundos=60)
+        with patch.object(modulo_streaming.time, "time", return_value=1000.0):
+            gerenciador.publicar("consulta-1", TIPO_EVENTO_CONCLUIDA)
+            canal_antigo = gerenciador.obter_canal("consulta-1")
+
+        # ACT
+        with patch.object(modulo_streaming.time, "time", return_value=1061.0):
+            canal_novo = gerenciador.obter_canal("consulta-1")
+
+        # ASSERT
+        assert canal_novo is not canal_antigo
+        assert not canal_novo.encerrado
+
+    @pytest.mark.asyncio
+    async def test_abrir_canal_deve_encerrar_canal_ativo_substituido(self):
+        # ARRANGE: assinante de uma execução que nunca publicou o evento final
+        gerenciador = GerenciadorEventosStreaming()
+        canal_antigo = gerenciador.abrir_canal("peticao-1")
+        canal_antigo.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "Parcial"})
+
+        async def consumir():
+            return [evento async for evento in canal_antigo.assinar(intervalo_keepalive_segundos=0.01)]
+
+        tarefa = asyncio.create_task(consumir())
+        await asyncio.sleep(0.05)
+
+        # ACT
+        gerenciador.abrir_canal("peticao-1")
+        eventos = await asyncio.wait_for(tarefa, timeout=2)
+
+        # ASSERT: o fluxo antigo termina com um evento final
+        assert canal_antigo.encerrado
+        eventos_reais = [evento for evento in eventos if evento is not None]
+        assert eventos_reais[-1].tipo == TIPO_EVENTO_ERRO
+        assert eventos_reais[-1].dados == {"mensagem": modulo_streaming.MENSAGEM_CANAL_SUBSTITUIDO}
+
+    def test_canal_ocioso_sem_evento_final_deve_expirar(self):
+        # ARRANGE
+        gerenciador = GerenciadorEventosStreaming(tempo_maximo_inatividade_segundos=300)
+        with patch.object(modulo_streaming.time, "time", return_value=1000.0):
+            canal_antigo = gerenciador.abrir_canal("consulta-1")
+            canal_antigo.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "Parcial"})
+
+        # ACT
+        with patch.object(modulo_streaming.time, "time", return_value=1301.0):
+            canal_novo = gerenciador.obter_canal("consulta-1")
+
+        # ASSERT: o canal antigo foi encerrado (assinantes terminam) e descartado
+        assert canal_novo is not canal_antigo
+        assert canal_antigo.encerrado
+        assert list(canal_antigo._eventos)[-1].dados == {"mensagem": modulo_streaming.MENSAGEM_CANAL_EXPIRADO}
+
+    def test_canal_com_atividade_recente_nao_deve_expirar(self):
+        # ARRANGE
+        gerenciador = GerenciadorEventosStreaming(tempo_maximo_inatividade_segundos=300)
+        with patch.object(modulo_streaming.time, "time", return_value=1000.0):
+            canal = gerenciador.abrir_canal("consulta-1")
+        with patch.object(modulo_streaming.time, "time", return_value=1200.0):
+            canal.publicar(TIPO_EVENTO_FRAGMENTO, {"agente": "medico", "texto": "Parcial"})
+
+        # ACT
+        with patch.object(modulo_streaming.time, "time", return_value=1400.0):
+            canal_obtido = gerenciador.obter_canal("consulta-1")
+
+        # ASSERT
+        assert canal_obtido is canal
+        assert not canal.encerrado
@@ -0,0 +1,678 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - GERENCIADOR LLM (CHAMADAS SÍNCRONAS E ASSÍNCRONAS)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida chamar_llm_async() (AsyncOpenAI + backoff com asyncio.sleep) e
+AgenteBase.processar_async(), usados pelo coordenador e pelo orquestrador
+de petições para rodar agentes em paralelo sem ocupar threads. Também
+garante que chamar_llm() continua com o mesmo comportamento, já que as
+duas versões compartilham a montagem da requisição e a política de retry.
+
+ESTRATÉGIA:
+- Cliente OpenAI substituído por mocks (nenhuma chamada real à API)
+- Respostas montadas com o modelo ChatCompletion da própria biblioteca
+- Erros de API construídos com respostas httpx falsas (429, 400)
+============================================================================
+"""
+
+import asyncio
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import BadRequestError, RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.agentes.agente_advogado_coordenador import AgenteAdvogadoCoordenador
+from src.agentes.agente_base import AgenteBase
+from src.agentes.agente_estrategista_processual import AgenteEstrategistaProcessual
+from src.modelos.processo import ProximosPassos
+from src.utilitarios.cache_respostas_llm import CacheRespostasLLM
+from src.utilitarios.resiliencia_llm import TEMPO_INICIAL_DE_ESPERA_SEGUNDOS, ResilienciaLLM
+from src.utilitarios import gerenciador_llm as modulo_gerenciador_llm
+from src.utilitarios.gerenciador_llm import (
+    ErroGeralAPI,
+    ErroLimiteTaxaExcedido,
+    GerenciadorLLM,
+    NUMERO_MAXIMO_DE_TENTATIVAS_RETRY,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.gerenciador_llm  # Teste do gerenciador de LLM
+]
+
+
+# ============================================================================
+# FUNÇÕES AUXILIARES E FIXTURES
+# ============================================================================
+
+def criar_resposta_openai(conteudo: str = "Parecer gerado", modelo: str = "gpt-4o-mini") -> ChatCompletion:
+    """
+    Monta um ChatCompletion como o devolvido por chat.completions.create.
+    """
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-teste",
+        "object": "chat.completion",
+        "created": 0,
+        "model": modelo,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": conteudo},
+        }],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    })
+
+
+def criar_chunks_openai(fragmentos: List[str], modelo: str = "gpt-4o-mini") -> List[ChatCompletionChunk]:
+    """
+    Monta os chunks de uma resposta em streaming (um por fragmento + chunk de uso).
+    """
+    chunks = [
+        ChatCompletionChunk.model_validate({
+            "id": "chatcmpl-teste",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": modelo,
+            "choices": [{
+                "index": 0,
+                "delta": {"content": fragmento},
+                "finish_reason": "stop" if indice == len(fragmentos) - 1 else None,
+            }],
+        })
+        for indice, fragmento in enumerate(fragmentos)
+    ]
+    chunks.append(ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-teste",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": modelo,
+        "choices": [],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    }))
+    return chunks
+
+
+async def iterar_assincrono(itens: List[Any]):
+    """
+    Iterador assíncrono sobre uma lista (simula o AsyncStream da OpenAI).
+    """
+    for item in itens:
+        yield item
+
+
+def criar_erro_api(classe_erro: type, status: int) -> Exception:
+    """
+    Instancia um erro da biblioteca openai com uma resposta HTTP falsa.
+    """
+    resposta = httpx.Response(status, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return classe_erro(f"erro {status}", response=resposta, body=None)
+
+
+@pytest.fixture
+def gerenciador() -> GerenciadorLLM:
+    """
+    GerenciadorLLM com chave falsa, estatísticas globais zeradas e
+    disjuntor/orçamento de retries próprios (isolados dos outros testes).
+    """
+    gerenciador_llm = GerenciadorLLM(chave_api="sk-teste", resiliencia=ResilienciaLLM())
+    gerenciador_llm.resetar_estatisticas()
+    return gerenciador_llm
+
+
+@pytest.fixture
+def cliente_async_mockado(gerenciador: GerenciadorLLM) -> MagicMock:
+    """
+    Substitui o cliente AsyncOpenAI do gerenciador por um mock.
+    """
+    cliente = MagicMock()
+    cliente.chat.completions.create = AsyncMock(return_value=criar_resposta_openai())
+    with patch.object(gerenciador, "_obter_cliente_openai_async", return_value=cliente):
+        yield cliente
+
+
+class AgenteDeTeste(AgenteBase):
+    """
+    Agente mínimo para exercitar o fluxo da classe base.
+    """
+
+    def __init__(self, gerenciador_llm: GerenciadorLLM):
+        super().__init__(gerenciador_llm=gerenciador_llm)
+        self.nome_do_agente = "Agente de Teste"
+        self.descricao_do_agente = "Agente usado nos testes"
+
+    def montar_prompt(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Optional[Dict[str, Any]] = None
+    ) -> str:
+        return f"{' '.join(contexto_de_documentos)}\n\nPergunta: {pergunta_do_usuario}"
+
+
+# ============================================================================
+# GRUPO DE TESTES: chamar_llm_async
+# ============================================================================
+
+class TestChamarLLMAsync:
+    """
+    Testa a chamada nativamente assíncrona ao LLM.
+    """
+
+    @pytest.mark.asyncio
+    async def test_deve_retornar_conteudo_e_registrar_estatistica(self, gerenciador, cliente_async_mockado):
+        # ACT
+        resposta = await gerenciador.chamar_llm_async(
+            prompt="Analise o documento",
+            mensagens_de_sistema="Você é um advogado",
+            max_tokens=500,
+        )
+
+        # ASSERT
+        assert resposta == "Parecer gerado"
+        parametros = cliente_async_mockado.chat.completions.create.await_args.kwargs
+        assert parametros["messages"] == [
+            {"role": "system", "content": "Você é um advogado"},
+            {"role": "user", "content": "Analise o documento"},
+        ]
+        assert parametros["max_completion_tokens"] == 500
+        estatisticas = gerenciador.obter_estatisticas_globais()
+        assert estatisticas["chamadas_bem_sucedidas"] == 1
+        assert estatisticas["total_de_tokens_utilizados"] == 120
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_deve_fazer_backoff_com_asyncio_sleep(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        cliente_async_mockado.chat.completions.create.side_effect = [
+            criar_erro_api(RateLimitError, 429),
+            criar_resposta_openai("Depois do retry"),
+        ]
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm.asyncio, "sleep", new=AsyncMock()) as sleep_async, \
+                patch.object(modulo_gerenciador_llm.time, "sleep") as sleep_bloqueante:
+            resposta = await gerenciador.chamar_llm_async(prompt="Analise")
+
+        # ASSERT
+        assert resposta == "Depois do retry"
+        sleep_async.assert_awaited_once()
+        assert 0 <= sleep_async.await_args.args[0] <= TEMPO_INICIAL_DE_ESPERA_SEGUNDOS  # jitter
+        sleep_bloqueante.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_persistente_deve_lancar_erro_limite_taxa(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        cliente_async_mockado.chat.completions.create.side_effect = criar_erro_api(RateLimitError, 429)
+
+        # ACT / ASSERT
+        with patch.object(modulo_gerenciador_llm.asyncio, "sleep", new=AsyncMock()):
+            with pytest.raises(ErroLimiteTaxaExcedido):
+                await gerenciador.chamar_llm_async(prompt="Analise")
+
+        assert cliente_async_mockado.chat.completions.create.await_count == NUMERO_MAXIMO_DE_TENTATIVAS_RETRY
+        assert gerenciador.obter_estatisticas_globais()["chamadas_com_erro"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_request_nao_deve_fazer_retry(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        cliente_async_mockado.chat.completions.create.side_effect = criar_erro_api(BadRequestError, 400)
+
+        # ACT / ASSERT
+        with pytest.raises(ErroGeralAPI):
+            await gerenciador.chamar_llm_async(prompt="Analise")
+
+        assert cliente_async_mockado.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_chamadas_simultaneas_devem_se_sobrepor_no_event_loop(self, gerenciador, cliente_async_mockado):
+        # ARRANGE: cada chamada "demora" 50 ms na API
+        async def resposta_lenta(**_parametros):
+            await asyncio.sleep(0.05)
+            return criar_resposta_openai()
+
+        cliente_async_mockado.chat.completions.create.side_effect = resposta_lenta
+
+        # ACT
+        inicio = time.perf_counter()
+        respostas = await asyncio.gather(*[
+            gerenciador.chamar_llm_async(prompt=f"Pergunta {indice}") for indice in range(100)
+        ])
+        duracao = time.perf_counter() - inicio
+
+        # ASSERT: 100 × 50 ms em sequência seriam 5 s
+        assert len(respostas) == 100
+        assert duracao < 2.0
+
+    def test_cliente_async_deve_ser_recriado_em_novo_event_loop(self, gerenciador):
+        # ARRANGE
+        async def obter_cliente():
+            return gerenciador._obter_cliente_openai_async()
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm, "AsyncOpenAI") as classe_cliente:
+            classe_cliente.side_effect = lambda **_kwargs: MagicMock()
+            cliente_primeiro_loop = asyncio.run(obter_cliente())
+            cliente_segundo_loop = asyncio.run(obter_cliente())
+
+        # ASSERT
+        assert cliente_primeiro_loop is not cliente_segundo_loop
+        assert classe_cliente.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cliente_async_deve_ser_reaproveitado_no_mesmo_event_loop(self, gerenciador):
+        # ACT
+        with patch.object(modulo_gerenciador_llm, "AsyncOpenAI") as classe_cliente:
+            classe_cliente.side_effect = lambda **_kwargs: MagicMock()
+            primeiro = gerenciador._obter_cliente_openai_async()
+            segundo = gerenciador._obter_cliente_openai_async()
+
+        # ASSERT
+        assert primeiro is segundo
+        assert classe_cliente.call_count == 1
+
+    def test_loops_simultaneos_nao_devem_substituir_o_cliente_um_do_outro(self, gerenciador):
+        # ARRANGE: duas threads com asyncio.run() próprio, intercaladas
+        barreira = threading.Barrier(2)
+        clientes_por_thread: Dict[int, list] = {}
+
+        async def obter_cliente_duas_vezes(indice: int) -> None:
+            primeiro = gerenciador._obter_cliente_openai_async()
+            await asyncio.to_thread(barreira.wait)
+            segundo = gerenciador._obter_cliente_openai_async()
+            clientes_por_thread[indice] = [primeiro, segundo]
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm, "AsyncOpenAI") as classe_cliente:
+            classe_cliente.side_effect = lambda **_kwargs: MagicMock()
+            threads = [
+                threading.Thread(target=asyncio.run, args=(obter_cliente_duas_vezes(indice),))
+                for indice in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        # ASSERT: cada loop manteve o próprio cliente durante toda a execução
+        for primeiro, segundo in clientes_por_thread.values():
+            assert primeiro is segundo
+        assert clientes_por_thread[0][0] is not clientes_por_thread[1][0]
+        assert classe_cliente.call_count == 2
+
+
+# ============================================================================
+# GRUPO DE TESTES: chamar_llm (regressão da versão síncrona)
+# ============================================================================
+
+class TestChamarLLMSincrono:
+    """
+    Garante que a versão síncrona mantém o comportamento após a extração dos auxiliares.
+    """
+
+    def test_deve_retornar_conteudo_com_cliente_sincrono(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = criar_resposta_openai("Síncrono")
+
+        # ACT
+        resposta = gerenciador.chamar_llm(prompt="Analise", response_format="json_object")
+
+        # ASSERT
+        assert resposta == "Síncrono"
+        parametros = gerenciador.cliente_openai.chat.completions.create.call_args.kwargs
+        assert parametros["response_format"] == {"type": "json_object"}
+
+    def test_rate_limit_deve_fazer_backoff_com_time_sleep(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = [
+            criar_erro_api(RateLimitError, 429),
+            criar_resposta_openai(),
+        ]
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm.time, "sleep") as sleep_bloqueante:
+            resposta = gerenciador.chamar_llm(prompt="Analise")
+
+        # ASSERT
+        assert resposta == "Parecer gerado"
+        sleep_bloqueante.assert_called_once()
+        assert 0 <= sleep_bloqueante.call_args.args[0] <= TEMPO_INICIAL_DE_ESPERA_SEGUNDOS  # jitter
+
+    def test_resposta_vazia_deve_lancar_erro_geral_sem_retry(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = criar_resposta_openai("")
+
+        # ACT / ASSERT
+        with pytest.raises(ErroGeralAPI):
+            gerenciador.chamar_llm(prompt="Analise")
+
+        assert gerenciador.cliente_openai.chat.completions.create.call_count == 1
+
+
+# ============================================================================
+# GRUPO DE TESTES: AgenteBase.processar_async
+# ============================================================================
+
+class TestProcessarAsyncAgenteBase:
+    """
+    Testa o caminho assíncrono da classe base de agentes.
+    """
+
+    @pytest.mark.asyncio
+    async def test_processar_async_deve_usar_chamar_llm_async(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        agente = AgenteDeTeste(gerenciador)
+
+        # ACT
+        resultado = await agente.processar_async(
+            contexto_de_documentos=["Laudo médico"],
+            pergunta_do_usuario="Há nexo causal?"
+        )
+
+        # ASSERT
+        assert resultado["agente"] == "Agente de Teste"
+        assert resultado["parecer"] == "Parecer gerado"
+        assert resultado["metadados"]["numero_de_documentos_analisados"] == 1
+        assert agente.numero_de_analises_realizadas == 1
+        mensagens = cliente_async_mockado.chat.completions.create.await_args.kwargs["messages"]
+        assert mensagens[0]["role"] == "system"
+        assert "Há nexo causal?" in mensagens[1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_processar_async_deve_validar_pergunta_vazia(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        agente = AgenteDeTeste(gerenciador)
+
+        # ACT / ASSERT
+        with pytest.raises(ValueError):
+            await agente.processar_async(contexto_de_documentos=[], pergunta_do_usuario="   ")
+
+        cliente_async_mockado.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_processar_e_processar_async_devem_retornar_mesma_estrutura(
+        self, gerenciador, cliente_async_mockado
+    ):
+        # ARRANGE
+        agente = AgenteDeTeste(gerenciador)
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = criar_resposta_openai()
+
+        # ACT: a versão síncrona roda fora do event loop, como em produção
+        resultado_sincrono = await asyncio.to_thread(agente.processar, ["Contrato"], "O contrato é válido?")
+        resultado_assincrono = await agente.processar_async(["Contrato"], "O contrato é válido?")
+
+        # ASSERT
+        for resultado in (resultado_sincrono, resultado_assincrono):
+            resultado.pop("timestamp")
+        assert resultado_sincrono == resultado_assincrono
+
+
+# ============================================================================
+# GRUPO DE TESTES: COMPILAÇÃO E AGENTES DE ESTRATÉGIA NO EVENT LOOP
+# ============================================================================
+
+class TestAnalisesAsyncDosOrquestradores:
+    """
+    Testa as versões assíncronas usadas pelos orquestradores dentro do event loop.
+    """
+
+    @pytest.mark.asyncio
+    async def test_compilar_resposta_async_nao_deve_usar_chamar_llm_sincrono(self):
+        # ARRANGE
+        gerenciador_mock = MagicMock(spec=GerenciadorLLM)
+        gerenciador_mock.chamar_llm_async = AsyncMock(return_value="Resposta compilada")
+        coordenador = AgenteAdvogadoCoordenador(gerenciador_llm=gerenciador_mock, banco_vetorial=(MagicMock(), MagicMock()))
+
+        # ACT
+        resposta = await coordenador.compilar_resposta_async(
+            pareceres_peritos={"medico": {"agente": "Perito Médico", "parecer": "Nexo causal presente", "confianca": 0.9}},
+            contexto_rag=["Laudo médico"],
+            pergunta_original="Há nexo causal?",
+            pareceres_advogados_especialistas={"tributario": {"erro": True}},
+        )
+
+        # ASSERT
+        gerenciador_mock.chamar_llm.assert_not_called()
+        assert resposta["parecer"] == "Resposta compilada"
+        assert resposta["metadados"]["pareceres_peritos_utilizados"] == ["medico"]
+        assert resposta["metadados"]["pareceres_advogados_com_erro"] == ["tributario"]
+        assert "Nexo causal presente" in gerenciador_mock.chamar_llm_async.await_args.kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_estrategista_analisar_async_deve_usar_chamar_llm_async(self):
+        # ARRANGE
+        gerenciador_mock = MagicMock(spec=GerenciadorLLM)
+        gerenciador_mock.chamar_llm_async = AsyncMock(return_value=json.dumps({
+            "estrategia_recomendada": "Produzir prova pericial do nexo causal antes da audiência de instrução.",
+            "passos": [{"numero": 1, "descricao": "Requerer perícia médica judicial", "prazo_estimado": "15 dias"}],
+            "caminhos_alternativos": [],
+        }))
+        agente = AgenteEstrategistaProcessual(gerenciador_mock)
+
+        # ACT
+        proximos_passos, uso_do_orcamento = await agente.analisar_async(
+            {"peticao_inicial": "Reclamação trabalhista por acidente"}
+        )
+
+        # ASSERT: o uso do orçamento volta com o resultado (não fica no agente compartilhado)
+        gerenciador_mock.chamar_llm.assert_not_called()
+        assert proximos_passos.passos[0].numero == 1
+        assert "secoes" in uso_do_orcamento
+        assert gerenciador_mock.chamar_llm_async.await_args.kwargs["response_schema"] is ProximosPassos
+
+
+# ============================================================================
+# GRUPO DE TESTES: CACHE DE RESPOSTAS
+# ============================================================================
+
+class TestCacheRespostasNoGerenciador:
+    """
+    Testa quando o GerenciadorLLM consulta e grava o cache de respostas.
+    """
+
+    @pytest.fixture
+    def gerenciador_com_cache(self) -> GerenciadorLLM:
+        """
+        Gerenciador com cache em memória injetado e cliente síncrono mockado.
+        """
+        gerenciador_llm = GerenciadorLLM(
+            chave_api="sk-teste",
+            cache_respostas=CacheRespostasLLM(":memory:", temperatura_maxima_automatica=0.3)
+        )
+        gerenciador_llm.resetar_estatisticas()
+        gerenciador_llm.cliente_openai = MagicMock()
+        gerenciador_llm.cliente_openai.chat.completions.create.return_value = criar_resposta_openai("Prognóstico")
+        return gerenciador_llm
+
+    def test_requisicao_repetida_deve_vir_do_cache_sem_chamar_api(self, gerenciador_com_cache):
+        # ACT
+        primeira = gerenciador_com_cache.chamar_llm(prompt="Calcule o prognóstico", temperatura=0.2)
+        segunda = gerenciador_com_cache.chamar_llm(prompt="Calcule o prognóstico", temperatura=0.2)
+
+        # ASSERT
+        assert primeira == segunda == "Prognóstico"
+        assert gerenciador_com_cache.cliente_openai.chat.completions.create.call_count == 1
+        assert gerenciador_com_cache.obter_estatisticas_globais()["total_de_chamadas"] == 1
+        estatisticas_cache = gerenciador_com_cache._cache_respostas.obter_estatisticas()
+        assert estatisticas_cache["acertos"] == 1
+        assert estatisticas_cache["falhas"] == 1
+
+    def test_temperatura_alta_sem_opt_in_nao_deve_usar_cache(self, gerenciador_com_cache):
+        # ACT
+        gerenciador_com_cache.chamar_llm(prompt="Parecer criativo", temperatura=0.7)
+        gerenciador_com_cache.chamar_llm(prompt="Parecer criativo", temperatura=0.7)
+
+        # ASSERT
+        assert gerenciador_com_cache.cliente_openai.chat.completions.create.call_count == 2
+        assert gerenciador_com_cache._cache_respostas.contar_entradas() == 0
+
+    def test_opt_in_e_opt_out_devem_prevalecer_sobre_a_temperatura(self, gerenciador_com_cache):
+        # ACT
+        gerenciador_com_cache.chamar_llm(prompt="A", temperatura=0.7, usar_cache=True)
+        gerenciador_com_cache.chamar_llm(prompt="A", temperatura=0.7, usar_cache=True)
+        gerenciador_com_cache.chamar_llm(prompt="B", temperatura=0.0, usar_cache=False)
+        gerenciador_com_cache.chamar_llm(prompt="B", temperatura=0.0, usar_cache=False)
+
+        # ASSERT: 1 chamada para "A" (segunda veio do cache) + 2 para "B"
+        assert gerenciador_com_cache.cliente_openai.chat.completions.create.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_versao_assincrona_deve_compartilhar_o_cache(self, gerenciador_com_cache):
+        # ARRANGE: a versão síncrona roda fora do event loop, como em produção
+        await asyncio.to_thread(gerenciador_com_cache.chamar_llm, prompt="Calcule o prognóstico", temperatura=0.2)
+        cliente_async = MagicMock()
+        cliente_async.chat.completions.create = AsyncMock()
+
+        # ACT
+        with patch.object(gerenciador_com_cache, "_obter_cliente_openai_async", return_value=cliente_async):
+            resposta = await gerenciador_com_cache.chamar_llm_async(prompt="Calcule o prognóstico", temperatura=0.2)
+
+        # ASSERT
+        assert resposta == "Prognóstico"
+        cliente_async.chat.completions.create.assert_not_awaited()
+
+    def test_cache_desativado_por_configuracao_nao_deve_ser_usado(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = criar_resposta_openai()
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm, "obter_cache_respostas_llm") as obter_cache:
+            gerenciador.chamar_llm(prompt="Analise", temperatura=0.0, usar_cache=True)
+
+        # ASSERT
+        obter_cache.assert_not_called()
+
+    def test_estatisticas_de_uso_devem_incluir_o_cache(self):
+        # ACT
+        estatisticas = modulo_gerenciador_llm.obter_estatisticas_uso_llm()
+
+        # ASSERT
+        assert "cache_de_respostas" in estatisticas
+        assert "acertos" in estatisticas["cache_de_respostas"]
+
+
+# ============================================================================
+# GRUPO DE TESTES: streaming (ao_receber_fragmento)
+# ============================================================================
+
+class TestStreamingChamarLLM:
+    """
+    Testa a entrega da resposta em fragmentos sem mudar o texto retornado.
+    """
+
+    def test_deve_emitir_fragmentos_e_retornar_texto_completo(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = iter(
+            criar_chunks_openai(["Parecer ", "gerado"])
+        )
+        fragmentos: List[str] = []
+
+        # ACT
+        resposta = gerenciador.chamar_llm(prompt="Analise", ao_receber_fragmento=fragmentos.append)
+
+        # ASSERT
+        assert fragmentos == ["Parecer ", "gerado"]
+        assert resposta == "Parecer gerado"
+        parametros = gerenciador.cliente_openai.chat.completions.create.call_args.kwargs
+        assert parametros["stream"] is True
+        assert parametros["stream_options"] == {"include_usage": True}
+        assert gerenciador.obter_estatisticas_globais()["total_de_tokens_utilizados"] == 120
+
+    @pytest.mark.asyncio
+    async def test_versao_assincrona_deve_emitir_fragmentos(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        cliente_async_mockado.chat.completions.create = AsyncMock(
+            return_value=iterar_assincrono(criar_chunks_openai(["Nexo ", "causal ", "comprovado"]))
+        )
+        fragmentos: List[str] = []
+
+        # ACT
+        resposta = await gerenciador.chamar_llm_async(prompt="Analise", ao_receber_fragmento=fragmentos.append)
+
+        # ASSERT
+        assert fragmentos == ["Nexo ", "causal ", "comprovado"]
+        assert resposta == "Nexo causal comprovado"
+
+    def test_falha_depois_de_emitir_fragmentos_nao_deve_fazer_retry(self, gerenciador):
+        # ARRANGE
+        def fluxo_interrompido():
+            yield criar_chunks_openai(["Parecer "])[0]
+            raise criar_erro_api(RateLimitError, 429)
+
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = lambda **_: fluxo_interrompido()
+
+        # ACT / ASSERT
+        with patch.object(modulo_gerenciador_llm.time, "sleep"):
+            with pytest.raises(ErroLimiteTaxaExcedido):
+                gerenciador.chamar_llm(prompt="Analise", ao_receber_fragmento=lambda fragmento: None)
+        assert gerenciador.cliente_openai.chat.completions.create.call_count == 1
+
+    def test_callback_com_defeito_nao_deve_interromper_a_chamada(self, gerenciador):
+        # ARRANGE
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.return_value = iter(
+            criar_chunks_openai(["Parecer ", "gerado"])
+        )
+
+        def callback_com_defeito(fragmento: str) -> None:
+            raise ConnectionError("cliente desconectou")
+
+        # ACT
+        resposta = gerenciador.chamar_llm(prompt="Analise", ao_receber_fragmento=callback_com_defeito)
+
+        # ASSERT
+        assert resposta == "Parecer gerado"
+
+    def test_resposta_do_cache_deve_ser_emitida_em_um_fragmento(self):
+        # ARRANGE
+        gerenciador_llm = GerenciadorLLM(chave_api="sk-teste", cache_respostas=CacheRespostasLLM(":memory:"))
+        gerenciador_llm.cliente_openai = MagicMock()
+        gerenciador_llm.cliente_openai.chat.completions.create.return_value = criar_resposta_openai("Prognóstico")
+        gerenciador_llm.chamar_llm(prompt="Calcule o prognóstico", temperatura=0.0)
+        fragmentos: List[str] = []
+
+        # ACT
+        resposta = gerenciador_llm.chamar_llm(
+            prompt="Calcule o prognóstico", temperatura=0.0, ao_receber_fragmento=fragmentos.append
+        )
+
+        # ASSERT
+        assert resposta == "Prognóstico"
+        assert fragmentos == ["Prognóstico"]
+        assert gerenciador_llm.cliente_openai.chat.completions.create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_processar_async_deve_repassar_callback_e_manter_resultado(self, gerenciador, cliente_async_mockado):
+        # ARRANGE
+        cliente_async_mockado.chat.completions.create = AsyncMock(
+            return_value=iterar_assincrono(criar_chunks_openai(["Parecer ", "gerado"]))
+        )
+        agente = AgenteDeTeste(gerenciador)
+        fragmentos: List[str] = []
+
+        # ACT
+        resultado = await agente.processar_async(
+            contexto_de_documentos=["Laudo médico"],
+            pergunta_do_usuario="Há nexo causal?",
+            ao_receber_fragmento=fragmentos.append,
+        )
+
+        # ASSERT
+        assert "".join(fragmentos) == resultado["parecer"] == "Parecer gerado"
@@ -0,0 +1,254 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - ORÇAMENTO DE TOKENS DOS PROMPTS
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida o MontadorPromptComOrcamento: repasse intacto quando tudo cabe,
+distribuição do orçamento por peso entre as seções, preenchimento por
+relevância (e não cortando o fim) e o uso do orçamento registrado nos
+metadados do AgenteBase.
+
+ESTRATÉGIA:
+- Contador de tokens determinístico (1 token por palavra) injetado
+- GerenciadorLLM substituído por mock (sem chamadas à API)
+============================================================================
+"""
+
+from typing import Any, Dict, List
+from unittest.mock import Mock
+
+import pytest
+
+from src.agentes.agente_base import AgenteBase
+from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.orcamento_prompt import (
+    MARCADOR_TRECHOS_OMITIDOS,
+    SECAO_ANEXOS,
+    SECAO_INSTRUCOES,
+    SECAO_PETICAO,
+    TEXTO_DOCUMENTO_OMITIDO,
+    MontadorPromptComOrcamento,
+    SecaoDoPrompt,
+    contar_tokens_prompt,
+    dividir_em_trechos,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.orcamento_prompt  # Orçamento de tokens dos prompts
+]
+
+
+def contar_palavras(texto: str) -> int:
+    """
+    Contador determinístico: 1 token por palavra.
+    """
+    return len(texto.split())
+
+
+def montar_prompt_simples(textos_por_secao: Dict[str, List[str]]) -> str:
+    """
+    Template mínimo: um cabeçalho de 2 palavras por seção.
+    """
+    return "\n".join(
+        f"SEÇÃO {nome.upper()}\n" + "\n".join(textos)
+        for nome, textos in textos_por_secao.items()
+    )
+
+
+def paragrafos(*frases: str) -> str:
+    return "\n\n".join(frases)
+
+
+class AgenteDeTeste(AgenteBase):
+    """
+    Agente mínimo: o prompt é só a pergunta seguida dos documentos.
+    """
+
+    def __init__(self, gerenciador_llm):
+        super().__init__(gerenciador_llm)
+        self.nome_do_agente = "Agente de Teste"
+        self.descricao_do_agente = "Analisa acidentes de trabalho"
+
+    def montar_prompt(
+        self,
+        contexto_de_documentos: List[str],
+        pergunta_do_usuario: str,
+        metadados_adicionais: Dict[str, Any] = None
+    ) -> str:
+        return pergunta_do_usuario + "\n" + "\n".join(contexto_de_documentos)
+
+
+# ============================================================================
+# GRUPO DE TESTES: MONTADOR
+# ============================================================================
+
+class TestMontadorPromptComOrcamento:
+    """
+    Testa o ajuste das seções ao orçamento.
+    """
+
+    def test_prompt_que_cabe_no_orcamento_deve_ser_repassado_intacto(self):
+        # ARRANGE
+        montador = MontadorPromptComOrcamento(1000, contador_de_tokens=contar_palavras)
+        secoes = [SecaoDoPrompt(SECAO_PETICAO, ["petição curta"]), SecaoDoPrompt(SECAO_ANEXOS, ["laudo", "atestado"])]
+
+        # ACT
+        prompt, resultado = montador.montar(secoes, montar_prompt_simples, consulta="acidente")
+
+        # ASSERT
+        assert resultado.ajustado is False
+        assert resultado.textos_por_secao[SECAO_ANEXOS] == ["laudo", "atestado"]
+        assert prompt == montar_prompt_simples({SECAO_PETICAO: ["petição curta"], SECAO_ANEXOS: ["laudo", "atestado"]})
+
+    def test_orcamento_zero_deve_desativar_o_ajuste(self):
+        # ARRANGE
+        montador = MontadorPromptComOrcamento(0, contador_de_tokens=contar_palavras)
+        texto_longo = " ".join(["palavra"] * 500)
+
+        # ACT
+        _, resultado = montador.montar([SecaoDoPrompt(SECAO_ANEXOS, [texto_longo])], montar_prompt_simples, "x")
+
+        # ASSERT
+        assert resultado.textos_por_secao[SECAO_ANEXOS] == [texto_longo]
+
+    def test_deve_manter_o_trecho_relevante_e_nao_o_inicio_do_documento(self):
+        # ARRANGE: o trecho sobre o acidente está no FIM do anexo
+        irrelevantes = [f"Cláusula {indice} sobre pagamento de aluguel do imóvel residencial." for indice in range(10)]
+        relevante = "O trabalhador sofreu acidente de trabalho com amputação na prensa."
+        anexo = paragrafos(*irrelevantes, relevante)
+        montador = MontadorPromptComOrcamento(30, contador_de_tokens=contar_palavras)
+
+        # ACT
+        _, resultado = montador.montar(
+            [SecaoDoPrompt(SECAO_ANEXOS, [anexo])], montar_prompt_simples, consulta="acidente de trabalho amputação"
+        )
+
+        # ASSERT
+        texto_ajustado = resultado.textos_por_secao[SECAO_ANEXOS][0]
+        assert resultado.ajustado is True
+        assert relevante in texto_ajustado
+        assert MARCADOR_TRECHOS_OMITIDOS in texto_ajustado
+        assert irrelevantes[-1] not in texto_ajustado
+        assert resultado.uso_por_secao[SECAO_ANEXOS].tokens_utilizados <= 30
+
+    def test_sobra_de_uma_secao_deve_ir_para_as_outras(self):
+        # ARRANGE: petição pequena, anexo grande; orçamento livre de 100 tokens
+        peticao = "Pedido de indenização por acidente."
+        anexo = paragrafos(*[f"Parágrafo {indice} do laudo pericial com cinco palavras." for indice in range(40)])
+        tokens_fixos = contar_palavras(montar_prompt_simples({SECAO_PETICAO: [""], SECAO_ANEXOS: [""]}))
+        montador = MontadorPromptComOrcamento(100 + tokens_fixos, contador_de_tokens=contar_palavras)
+
+        # ACT
+        _, resultado = montador.montar(
+            [SecaoDoPrompt(SECAO_PETICAO, [peticao]), SecaoDoPrompt(SECAO_ANEXOS, [anexo])],
+            montar_prompt_simples,
+            consulta="laudo",
+        )
+
+        # ASSERT: a petição entra inteira e o anexo fica com o resto
+        assert resultado.textos_por_secao[SECAO_PETICAO] == [peticao]
+        assert resultado.uso_por_secao[SECAO_ANEXOS].orcamento_tokens == 100 - contar_palavras(peticao)
+        assert resultado.tokens_utilizados <= 100 + tokens_fixos
+
+    def test_documento_sem_trecho_incluido_deve_virar_marcador(self):
+        # ARRANGE: três anexos de 60 palavras, cota para só um deles
+        anexos = [" ".join([f"{nome}"] * 60) for nome in ("contrato", "laudo", "recibo")]
+        montador = MontadorPromptComOrcamento(70, contador_de_tokens=contar_palavras)
+
+        # ACT
+        _, resultado = montador.montar([SecaoDoPrompt(SECAO_ANEXOS, anexos)], montar_prompt_simples, consulta="laudo")
+
+        # ASSERT: a numeração dos documentos não muda
+        textos = resultado.textos_por_secao[SECAO_ANEXOS]
+        assert len(textos) == 3
+        assert textos[1] == anexos[1]
+        assert textos[0] == TEXTO_DOCUMENTO_OMITIDO
+        assert textos[2] == TEXTO_DOCUMENTO_OMITIDO
+
+    def test_uso_do_orcamento_deve_ser_serializavel(self):
+        # ARRANGE
+        montador = MontadorPromptComOrcamento(20, contador_de_tokens=contar_palavras)
+        anexo = paragrafos(*["uma frase com cinco palavras"] * 10)
+
+        # ACT
+        _, resultado = montador.montar([SecaoDoPrompt(SECAO_ANEXOS, [anexo])], montar_prompt_simples, "frase")
+
+        # ASSERT
+        uso = resultado.para_dict()
+        assert uso["orcamento_total_tokens"] == 20
+        assert uso["ajustado"] is True
+        assert set(uso["secoes"]) == {SECAO_INSTRUCOES, SECAO_ANEXOS}
+        assert uso["secoes"][SECAO_ANEXOS]["trechos_totais"] == 10
+        assert uso["secoes"][SECAO_ANEXOS]["trechos_incluidos"] == 3
+
+
+# ============================================================================
+# GRUPO DE TESTES: TRECHOS E CONTAGEM
+# ============================================================================
+
+class TestDivisaoEmTrechos:
+    """
+    Testa a divisão de documentos e a contagem de tokens.
+    """
+
+    def test_paragrafo_longo_deve_ser_dividido_por_frases(self):
+        # ARRANGE
+        texto = " ".join(["Frase com quatro palavras."] * 10)
+
+        # ACT
+        trechos = dividir_em_trechos(texto, contar_palavras, tamanho_maximo_tokens=10)
+
+        # ASSERT
+        assert len(trechos) == 5
+        assert all(tokens <= 10 for _, tokens in trechos)
+
+    def test_contagem_de_tokens_deve_ser_positiva(self):
+        # ACT / ASSERT (tiktoken ou estimativa por caracteres)
+        assert contar_tokens_prompt("") == 0
+        assert contar_tokens_prompt("Petição inicial trabalhista") > 0
+
+
+# ============================================================================
+# GRUPO DE TESTES: INTEGRAÇÃO COM O AGENTE BASE
+# ============================================================================
+
+class TestOrcamentoNoAgenteBase:
+    """
+    Testa o orçamento aplicado por AgenteBase.processar().
+    """
+
+    def test_metadados_devem_incluir_o_uso_do_orcamento(self):
+        # ARRANGE
+        gerenciador = Mock(spec=GerenciadorLLM)
+        gerenciador.chamar_llm.return_value = "Parecer"
+        agente = AgenteDeTeste(gerenciador)
+        agente.orcamento_tokens_prompt = 0
+
+        # ACT
+        resultado = agente.processar(
+            contexto_de_documentos=["Petição", "Laudo"],
+            pergunta_do_usuario="Houve acidente?",
+            secoes_dos_documentos=[SECAO_PETICAO, SECAO_ANEXOS],
+        )
+
+        # ASSERT
+        uso = resultado["metadados"]["orcamento_de_tokens"]
+        assert set(uso["secoes"]) == {SECAO_INSTRUCOES, SECAO_PETICAO, SECAO_ANEXOS}
+
+    def test_secoes_com_tamanho_diferente_dos_documentos_deve_falhar(self):
+        # ARRANGE
+        agente = AgenteDeTeste(Mock(spec=GerenciadorLLM))
+
+        # ACT / ASSERT
+        with pytest.raises(ValueError):
+            agente.processar(
+                contexto_de_documentos=["Petição", "Laudo"],
+                pergunta_do_usuario="Houve acidente?",
+                secoes_dos_documentos=[SECAO_PETICAO],
+            )
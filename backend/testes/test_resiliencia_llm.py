@@ -0,0 +1,398 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - RESILIÊNCIA DAS CHAMADAS AO LLM
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida o ResilienciaLLM (backoff com jitter, Retry-After, disjuntor por
+modelo e orçamento de retries) e o uso dele pelo GerenciadorLLM.
+
+ESTRATÉGIA:
+- Relógio e gerador aleatório injetados (sem esperas reais)
+- Cliente OpenAI substituído por mock (sem chamadas à API)
+- Erros de API construídos com respostas httpx falsas (429, 400, 503)
+============================================================================
+"""
+
+import asyncio
+import random
+from typing import Dict, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import BadRequestError, InternalServerError, RateLimitError
+from openai.types.chat import ChatCompletion
+
+from src.utilitarios import gerenciador_llm as modulo_gerenciador_llm
+from src.utilitarios.gerenciador_llm import (
+    ErroCircuitoAbertoLLM,
+    ErroGeralAPI,
+    ErroLimiteTaxaExcedido,
+    GerenciadorLLM,
+)
+from src.utilitarios.resiliencia_llm import (
+    ESTADO_ABERTO,
+    ESTADO_FECHADO,
+    ESTADO_MEIO_ABERTO,
+    TEMPO_INICIAL_DE_ESPERA_SEGUNDOS,
+    ResilienciaLLM,
+    extrair_retry_after_segundos,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.gerenciador_llm  # Resiliência do gerenciador de LLM
+]
+
+
+MODELO = "gpt-4o-mini"
+
+
+class RelogioFalso:
+    """
+    Relógio controlado pelo teste.
+    """
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def criar_erro_api(classe_erro: type, status: int, cabecalhos: Optional[Dict[str, str]] = None) -> Exception:
+    """
+    Instancia um erro da biblioteca openai com uma resposta HTTP falsa.
+    """
+    resposta = httpx.Response(
+        status,
+        headers=cabecalhos or {},
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    return classe_erro(f"erro {status}", response=resposta, body=None)
+
+
+def criar_resposta_openai(conteudo: str = "Parecer") -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-teste",
+        "object": "chat.completion",
+        "created": 0,
+        "model": MODELO,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": conteudo}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+    })
+
+
+def criar_resiliencia(**parametros) -> ResilienciaLLM:
+    return ResilienciaLLM(gerador_aleatorio=random.Random(7), **parametros)
+
+
+# ============================================================================
+# GRUPO DE TESTES: ESPERA ENTRE TENTATIVAS
+# ============================================================================
+
+class TestEsperaEntreTentativas:
+    """
+    Testa o backoff com jitter e o Retry-After.
+    """
+
+    def test_espera_deve_ser_sorteada_ate_o_teto_exponencial(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia()
+        erro = criar_erro_api(RateLimitError, 429)
+
+        # ACT
+        esperas_1 = [resiliencia.calcular_espera(MODELO, 1, erro) for _ in range(5)]
+        esperas_2 = [resiliencia.calcular_espera(MODELO, 2, erro) for _ in range(5)]
+
+        # ASSERT: valores diferentes entre si (jitter) e dentro do teto
+        assert all(0 <= espera <= TEMPO_INICIAL_DE_ESPERA_SEGUNDOS for espera in esperas_1)
+        assert all(0 <= espera <= 2 * TEMPO_INICIAL_DE_ESPERA_SEGUNDOS for espera in esperas_2)
+        assert len(set(esperas_1)) == 5
+
+    def test_retry_after_deve_ser_respeitado(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia()
+        erro = criar_erro_api(RateLimitError, 429, {"retry-after-ms": "4000"})
+
+        # ACT
+        espera = resiliencia.calcular_espera(MODELO, 1, erro)
+
+        # ASSERT: pelo menos o pedido, com até 10% de folga
+        assert 4.0 <= espera <= 4.4
+        assert resiliencia.obter_estatisticas()["esperas"]["com_retry_after"] == 1
+
+    def test_retry_after_acima_do_limite_deve_desistir(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia(espera_maxima_segundos=10)
+        erro = criar_erro_api(RateLimitError, 429, {"retry-after": "120"})
+
+        # ACT / ASSERT
+        assert resiliencia.calcular_espera(MODELO, 1, erro) is None
+        assert resiliencia.obter_estatisticas()["esperas"]["desistencias_por_retry_after_longo"] == 1
+
+    def test_retry_after_em_data_http_deve_ser_convertido(self):
+        # ARRANGE
+        erro = criar_erro_api(RateLimitError, 429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        # ACT / ASSERT: data no passado → sem espera
+        assert extrair_retry_after_segundos(erro) == 0.0
+        assert extrair_retry_after_segundos(criar_erro_api(RateLimitError, 429)) is None
+
+    def test_orcamento_esgotado_deve_impedir_novos_retries(self):
+        # ARRANGE: saldo para 1 retry; cada chamada nova deposita meio retry
+        resiliencia = criar_resiliencia(saldo_maximo_orcamento=1, proporcao_orcamento=0.5)
+        erro = criar_erro_api(RateLimitError, 429)
+
+        # ACT
+        primeira = resiliencia.calcular_espera(MODELO, 1, erro)
+        segunda = resiliencia.calcular_espera(MODELO, 1, erro)
+        resiliencia.registrar_chamada()
+        resiliencia.registrar_chamada()
+        terceira = resiliencia.calcular_espera(MODELO, 1, erro)
+
+        # ASSERT
+        assert primeira is not None
+        assert segunda is None
+        assert terceira is not None
+        orcamento = resiliencia.obter_estatisticas()["orcamento_de_retries"]
+        assert orcamento["retries_concedidos"] == 2
+        assert orcamento["retries_negados"] == 1
+
+
+# ============================================================================
+# GRUPO DE TESTES: DISJUNTOR
+# ============================================================================
+
+class TestDisjuntor:
+    """
+    Testa a abertura, a sondagem e o fechamento do circuito por modelo.
+    """
+
+    def test_falhas_consecutivas_devem_abrir_o_circuito_do_modelo(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia(falhas_para_abrir=3, relogio=RelogioFalso())
+
+        # ACT
+        for _ in range(3):
+            resiliencia.registrar_resultado(MODELO, criar_erro_api(InternalServerError, 503))
+
+        # ASSERT
+        assert resiliencia.permitir_tentativa(MODELO) is None
+        assert resiliencia.permitir_tentativa("gpt-4o") is not None
+        disjuntor = resiliencia.obter_estatisticas()["disjuntores"][MODELO]
+        assert disjuntor["estado"] == ESTADO_ABERTO
+        assert disjuntor["chamadas_rejeitadas"] == 1
+
+    def test_sucesso_ou_erro_do_cliente_devem_zerar_as_falhas(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia(falhas_para_abrir=2)
+
+        # ACT
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(BadRequestError, 400))
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+
+        # ASSERT
+        assert resiliencia.permitir_tentativa(MODELO) is not None
+
+    def test_apos_o_periodo_deve_liberar_uma_unica_sondagem(self):
+        # ARRANGE
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+
+        # ACT
+        relogio.agora += 31
+        sondagem = resiliencia.permitir_tentativa(MODELO)
+        concorrente = resiliencia.permitir_tentativa(MODELO)
+        resiliencia.registrar_resultado(MODELO, tentativa=sondagem)
+
+        # ASSERT
+        assert sondagem.sondagem is not None
+        assert concorrente is None
+        assert resiliencia.permitir_tentativa(MODELO) is not None
+        assert resiliencia.obter_estatisticas()["disjuntores"][MODELO]["estado"] == ESTADO_FECHADO
+
+    def test_sondagem_com_falha_deve_reabrir_o_circuito(self):
+        # ARRANGE
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+        relogio.agora += 31
+        sondagem = resiliencia.permitir_tentativa(MODELO)
+
+        # ACT
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429), tentativa=sondagem)
+
+        # ASSERT
+        assert resiliencia.permitir_tentativa(MODELO) is None
+        assert resiliencia.segundos_para_liberar(MODELO) == pytest.approx(30)
+        assert resiliencia.obter_estatisticas()["disjuntores"][MODELO]["aberturas"] == 2
+
+    def test_sondagem_interrompida_deve_liberar_nova_sondagem(self):
+        # ARRANGE
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+        relogio.agora += 31
+        sondagem = resiliencia.permitir_tentativa(MODELO)
+
+        # ACT: a sondagem termina sem resultado (task cancelada)
+        resiliencia.liberar_tentativa(MODELO, sondagem)
+
+        # ASSERT: continua meio aberto, mas outra chamada pode sondar
+        assert resiliencia.obter_estatisticas()["disjuntores"][MODELO]["estado"] == ESTADO_MEIO_ABERTO
+        assert resiliencia.permitir_tentativa(MODELO) is not None
+        assert resiliencia.permitir_tentativa(MODELO) is None
+
+    def test_resultado_tardio_de_chamada_anterior_nao_deve_decidir_a_sondagem(self):
+        # ARRANGE: chamada autorizada com o circuito fechado, que só termina
+        # depois de o circuito abrir e a sondagem ser liberada
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        chamada_antiga = resiliencia.permitir_tentativa(MODELO)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+        relogio.agora += 31
+        sondagem = resiliencia.permitir_tentativa(MODELO)
+
+        # ACT
+        resiliencia.registrar_resultado(MODELO, tentativa=chamada_antiga)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429), tentativa=chamada_antiga)
+        resiliencia.liberar_tentativa(MODELO, chamada_antiga)
+
+        # ASSERT: nem fechou, nem reabriu, nem liberou outra sondagem
+        disjuntor = resiliencia.obter_estatisticas()["disjuntores"][MODELO]
+        assert disjuntor["estado"] == ESTADO_MEIO_ABERTO
+        assert disjuntor["aberturas"] == 1
+        assert resiliencia.permitir_tentativa(MODELO) is None
+
+        # A sondagem continua decidindo
+        resiliencia.registrar_resultado(MODELO, tentativa=sondagem)
+        assert resiliencia.obter_estatisticas()["disjuntores"][MODELO]["estado"] == ESTADO_FECHADO
+
+    def test_sucesso_tardio_nao_deve_fechar_o_circuito_aberto(self):
+        # ARRANGE
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        chamada_antiga = resiliencia.permitir_tentativa(MODELO)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+
+        # ACT
+        resiliencia.registrar_resultado(MODELO, tentativa=chamada_antiga)
+
+        # ASSERT
+        assert resiliencia.obter_estatisticas()["disjuntores"][MODELO]["estado"] == ESTADO_ABERTO
+        assert resiliencia.permitir_tentativa(MODELO) is None
+
+
+# ============================================================================
+# GRUPO DE TESTES: INTEGRAÇÃO COM O GERENCIADOR
+# ============================================================================
+
+class TestResilienciaNoGerenciador:
+    """
+    Testa o que chamar_llm() e chamar_llm_async() fazem com a resiliência.
+    """
+
+    def test_circuito_aberto_deve_falhar_sem_chamar_a_api(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia(falhas_para_abrir=1)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(InternalServerError, 503))
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", resiliencia=resiliencia)
+        gerenciador.resetar_estatisticas()
+        gerenciador.cliente_openai = MagicMock()
+
+        # ACT / ASSERT
+        with pytest.raises(ErroCircuitoAbertoLLM) as erro:
+            gerenciador.chamar_llm(prompt="Analise", modelo=MODELO, usar_cache=False)
+
+        assert isinstance(erro.value, ErroGeralAPI)
+        gerenciador.cliente_openai.chat.completions.create.assert_not_called()
+        metricas = modulo_gerenciador_llm.obter_metricas_llm()
+        assert metricas["geral"]["erros_por_classe"] == {"ErroCircuitoAbertoLLM": 1}
+        assert "resiliencia" in metricas
+
+    def test_falhas_durante_a_chamada_devem_interromper_os_retries(self):
+        # ARRANGE: o circuito abre na 2ª falha, antes da 3ª tentativa
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", resiliencia=criar_resiliencia(falhas_para_abrir=2))
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = criar_erro_api(InternalServerError, 503)
+
+        # ACT / ASSERT
+        with patch.object(modulo_gerenciador_llm.time, "sleep") as sleep_bloqueante:
+            with pytest.raises(ErroGeralAPI):
+                gerenciador.chamar_llm(prompt="Analise", modelo=MODELO, usar_cache=False)
+
+        assert gerenciador.cliente_openai.chat.completions.create.call_count == 2
+        sleep_bloqueante.assert_called_once()
+
+    def test_rate_limit_com_retry_after_deve_esperar_o_tempo_pedido(self):
+        # ARRANGE
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", resiliencia=criar_resiliencia())
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = [
+            criar_erro_api(RateLimitError, 429, {"retry-after": "3"}),
+            criar_resposta_openai(),
+        ]
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm.time, "sleep") as sleep_bloqueante:
+            resposta = gerenciador.chamar_llm(prompt="Analise", modelo=MODELO, usar_cache=False)
+
+        # ASSERT
+        assert resposta == "Parecer"
+        assert 3.0 <= sleep_bloqueante.call_args.args[0] <= 3.3
+
+    @pytest.mark.asyncio
+    async def test_orcamento_esgotado_deve_falhar_sem_repetir(self):
+        # ARRANGE
+        resiliencia = criar_resiliencia(saldo_maximo_orcamento=0)
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", resiliencia=resiliencia)
+        cliente = MagicMock()
+        cliente.chat.completions.create = AsyncMock(side_effect=criar_erro_api(RateLimitError, 429))
+
+        # ACT / ASSERT
+        with patch.object(gerenciador, "_obter_cliente_openai_async", return_value=cliente), \
+                patch.object(modulo_gerenciador_llm.asyncio, "sleep", new=AsyncMock()) as sleep_async:
+            with pytest.raises(ErroLimiteTaxaExcedido):
+                await gerenciador.chamar_llm_async(prompt="Analise", modelo=MODELO, usar_cache=False)
+
+        assert cliente.chat.completions.create.await_count == 1
+        sleep_async.assert_not_awaited()
+        assert resiliencia.obter_estatisticas()["orcamento_de_retries"]["retries_negados"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sondagem_cancelada_nao_deve_prender_o_circuito(self):
+        # ARRANGE: circuito meio aberto e a sondagem fica pendurada no provedor
+        relogio = RelogioFalso()
+        resiliencia = criar_resiliencia(falhas_para_abrir=1, segundos_aberto=30, relogio=relogio)
+        resiliencia.registrar_resultado(MODELO, criar_erro_api(RateLimitError, 429))
+        relogio.agora += 31
+        gerenciador = GerenciadorLLM(chave_api="sk-teste", resiliencia=resiliencia)
+        chamada_iniciada = asyncio.Event()
+
+        async def pendurar(**parametros):
+            chamada_iniciada.set()
+            await asyncio.Event().wait()
+
+        cliente = MagicMock()
+        cliente.chat.completions.create = AsyncMock(side_effect=pendurar)
+
+        # ACT: a task da sondagem é cancelada (asyncio.CancelledError não é Exception)
+        with patch.object(gerenciador, "_obter_cliente_openai_async", return_value=cliente):
+            tarefa = asyncio.create_task(
+                gerenciador.chamar_llm_async(prompt="Analise", modelo=MODELO, usar_cache=False)
+            )
+            await chamada_iniciada.wait()
+            tarefa.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tarefa
+
+        # ASSERT: a próxima chamada pode sondar
+        assert resiliencia.permitir_tentativa(MODELO) is not None
@@ -0,0 +1,258 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE ARMAZENAMENTO VETORIAL (BACKEND NUMPY)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_armazenamento_vetorial.py:
+o protocolo ArmazenamentoVetorial e a coleção NumPy com busca exata.
+O comportamento do servico_banco_vetorial sobre os dois backends é testado
+em test_servico_banco_vetorial.py (fixture parametrizada).
+
+ESCOPO DOS TESTES:
+- ✅ Filtros "where" com a sintaxe do ChromaDB
+- ✅ Mesmas distâncias e ranking do ChromaDB (cosine, l2, ip)
+- ✅ Escrita: IDs repetidos, dimensão incompatível, remoção
+- ✅ Seleção do backend por BACKEND_BANCO_VETORIAL
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_armazenamento_vetorial.py
+============================================================================
+"""
+
+import uuid
+
+import chromadb
+import numpy as np
+import pytest
+
+from src.servicos import servico_banco_vetorial
+from src.servicos.servico_armazenamento_vetorial import (
+    ArmazenamentoVetorial,
+    ColecaoVetorialNumPy,
+    avaliar_filtro,
+    criar_colecao_em_memoria,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Backend alternativo do serviço ChromaDB
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+def gerar_dados(quantidade: int = 40, dimensao: int = 8):
+    """
+    IDs, embeddings e metadados determinísticos (4 documentos).
+    """
+    gerador = np.random.default_rng(7)
+    ids = [f"item_{indice}" for indice in range(quantidade)]
+    embeddings = gerador.normal(size=(quantidade, dimensao)).astype(np.float32)
+    metadados = [
+        {"documento_id": f"doc-{indice % 4}", "chunk_index": indice // 4}
+        for indice in range(quantidade)
+    ]
+    return ids, embeddings, metadados
+
+
+@pytest.fixture
+def colecao():
+    """
+    Coleção NumPy com 40 itens de 4 documentos.
+    """
+    ids, embeddings, metadados = gerar_dados()
+    colecao = criar_colecao_em_memoria("teste")
+    colecao.add(ids=ids, embeddings=embeddings, metadatas=metadados, documents=ids)
+    return colecao
+
+
+# ============================================================================
+# GRUPO DE TESTES: FILTROS
+# ============================================================================
+
+class TestFiltros:
+    """
+    Testa avaliar_filtro() com a sintaxe "where" do ChromaDB.
+    """
+
+    @pytest.mark.parametrize("filtro, esperado", [
+        (None, True),
+        ({"documento_id": "doc-1"}, True),
+        ({"documento_id": {"$in": ["doc-2", "doc-3"]}}, False),
+        ({"documento_id": {"$nin": ["doc-2"]}}, True),
+        ({"chunk_index": {"$gte": 3}}, True),
+        ({"chunk_index": {"$lt": 3}}, False),
+        ({"$and": [{"documento_id": "doc-1"}, {"chunk_index": {"$ne": 3}}]}, False),
+        ({"$or": [{"documento_id": "doc-9"}, {"chunk_index": {"$eq": 3}}]}, True),
+        ({"campo_inexistente": {"$gt": 0}}, False),
+    ])
+    def test_operadores_devem_seguir_semantica_do_chromadb(self, filtro, esperado):
+        """
+        CENÁRIO: Metadados {"documento_id": "doc-1", "chunk_index": 3}
+        EXPECTATIVA: Resultado de cada operador como no ChromaDB
+        """
+        # ACT & ASSERT
+        assert avaliar_filtro({"documento_id": "doc-1", "chunk_index": 3}, filtro) is esperado
+
+
+# ============================================================================
+# GRUPO DE TESTES: CONSULTA
+# ============================================================================
+
+class TestConsulta:
+    """
+    Compara a coleção NumPy com o ChromaDB nos mesmos dados.
+    """
+
+    @pytest.mark.parametrize("metrica", ["cosine", "l2", "ip"])
+    def test_ranking_e_distancias_devem_coincidir_com_chromadb(self, metrica):
+        """
+        CENÁRIO: Mesmos 40 itens no ChromaDB e no NumPy, consulta com filtro
+        EXPECTATIVA: Mesmos IDs, na mesma ordem, com as mesmas distâncias
+        """
+        # ARRANGE
+        ids, embeddings, metadados = gerar_dados()
+        consultas = np.random.default_rng(11).normal(size=(3, 8)).astype(np.float32)
+        cliente = chromadb.EphemeralClient()
+        colecao_chromadb = cliente.create_collection(
+            f"teste_{uuid.uuid4().hex}", embedding_function=None, metadata={"hnsw:space": metrica}
+        )
+        colecao_numpy = criar_colecao_em_memoria("teste", metrica)
+        for destino in (colecao_chromadb, colecao_numpy):
+            destino.add(ids=ids, embeddings=embeddings, metadatas=metadados)
+
+        # ACT
+        argumentos = {
+            "query_embeddings": consultas, "n_results": 5,
+            "where": {"documento_id": {"$in": ["doc-0", "doc-2"]}}, "include": ["distances"]
+        }
+        esperado = colecao_chromadb.query(**argumentos)
+        obtido = colecao_numpy.query(**argumentos)
+        cliente.delete_collection(colecao_chromadb.name)
+
+        # ASSERT
+        assert obtido["ids"] == esperado["ids"]
+        assert np.allclose(obtido["distances"], esperado["distances"], atol=1e-4)
+
+    def test_filtro_sem_itens_deve_retornar_listas_vazias_por_consulta(self, colecao):
+        """
+        CENÁRIO: Filtro que não casa com nenhum item, duas consultas
+        EXPECTATIVA: Uma lista vazia por consulta (sem erro)
+        """
+        # ACT
+        resultado = colecao.query(query_embeddings=np.ones((2, 8)), n_results=3, where={"documento_id": "x"})
+
+        # ASSERT
+        assert resultado["ids"] == [[], []]
+        assert resultado["distances"] == [[], []]
+
+    def test_colecao_numpy_deve_satisfazer_protocolo(self, colecao):
+        """
+        CENÁRIO: Coleção NumPy e Collection do ChromaDB
+        EXPECTATIVA: Ambas são ArmazenamentoVetorial
+        """
+        # ARRANGE
+        colecao_chromadb = chromadb.EphemeralClient().get_or_create_collection(
+            f"teste_{uuid.uuid4().hex}", embedding_function=None
+        )
+
+        # ACT & ASSERT
+        assert isinstance(colecao, ArmazenamentoVetorial)
+        assert isinstance(colecao_chromadb, ArmazenamentoVetorial)
+
+
+# ============================================================================
+# GRUPO DE TESTES: ESCRITA E LEITURA
+# ============================================================================
+
+class TestEscritaELeitura:
+    """
+    Testa add/get/delete e a cópia para memória.
+    """
+
+    def test_get_por_documento_deve_manter_ordem_de_insercao(self, colecao):
+        """
+        CENÁRIO: Leitura dos chunks do doc-1 com limit e offset
+        EXPECTATIVA: item_5, item_9 (após pular item_1), na ordem de inserção
+        """
+        # ACT
+        resultado = colecao.get(where={"documento_id": "doc-1"}, offset=1, limit=2)
+
+        # ASSERT
+        assert resultado["ids"] == ["item_5", "item_9"]
+        assert resultado["documents"] == ["item_5", "item_9"]
+        assert resultado["embeddings"] is None
+
+    def test_ids_repetidos_devem_ser_ignorados_e_dimensao_validada(self, colecao):
+        """
+        CENÁRIO: add() de um ID existente e de um embedding com outra dimensão
+        EXPECTATIVA: ID existente ignorado; dimensão errada lança ValueError
+        """
+        # ACT
+        colecao.add(ids=["item_0"], embeddings=np.zeros((1, 8)), documents=["novo"])
+
+        # ASSERT
+        assert colecao.count() == 40
+        assert colecao.get(ids=["item_0"])["documents"] == ["item_0"]
+        with pytest.raises(ValueError):
+            colecao.add(ids=["item_x"], embeddings=np.zeros((1, 3)))
+
+    def test_delete_por_filtro_deve_remover_do_get_e_da_busca(self, colecao):
+        """
+        CENÁRIO: Remoção de todos os chunks do doc-0
+        EXPECTATIVA: 30 itens; doc-0 não aparece em nenhuma consulta
+        """
+        # ACT
+        colecao.delete(where={"documento_id": "doc-0"})
+        resultado = colecao.query(query_embeddings=np.ones((1, 8)), n_results=40, include=["metadatas"])
+
+        # ASSERT
+        assert colecao.count() == 30
+        assert len(resultado["ids"][0]) == 30
+        assert all(metadados["documento_id"] != "doc-0" for metadados in resultado["metadatas"][0])
+        assert colecao.get(ids=["item_1"], include=["embeddings"])["embeddings"].shape == (1, 8)
+
+
+# ============================================================================
+# GRUPO DE TESTES: SELEÇÃO DO BACKEND
+# ============================================================================
+
+class TestSelecaoDoBackend:
+    """
+    Testa BACKEND_BANCO_VETORIAL em inicializar_chromadb().
+    """
+
+    def test_backend_numpy_nao_deve_abrir_chromadb(self, monkeypatch):
+        """
+        CENÁRIO: BACKEND_BANCO_VETORIAL=numpy
+        EXPECTATIVA: (None, ColecaoVetorialNumPy) sem criar cliente ChromaDB
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "BACKEND_BANCO_VETORIAL", "numpy")
+        monkeypatch.setattr(
+            servico_banco_vetorial.chromadb, "PersistentClient",
+            lambda *args, **kwargs: pytest.fail("ChromaDB não deveria ser aberto")
+        )
+
+        # ACT
+        cliente, colecao = servico_banco_vetorial.inicializar_chromadb()
+
+        # ASSERT
+        assert cliente is None
+        assert isinstance(colecao, ColecaoVetorialNumPy)
+        assert colecao.count() == 0
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_armazenamento_vetorial.py -v
+# ============================================================================
@@ -0,0 +1,973 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE BANCO VETORIAL (ChromaDB)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_banco_vetorial.py,
+cobrindo o armazenamento de chunks com metadados de posição e a busca com
+expansão por chunks vizinhos.
+
+ESCOPO DOS TESTES:
+- ✅ Metadados por chunk (páginas e offsets) persistidos no ChromaDB
+- ✅ Mesclagem de chunks consecutivos sem duplicar o overlap
+- ✅ Busca com janela de vizinhos (trechos contíguos, janelas mescladas)
+- ✅ Busca em lote (uma requisição de embedding, uma consulta ao ChromaDB)
+- ✅ Busca híbrida (BM25 + vetorial, Reciprocal Rank Fusion) e índice lexical sincronizado
+- ✅ Diversificação MMR (chunks quase duplicados não ocupam o top-k)
+- ✅ Texto completo do documento (texto canônico ou reconstrução sem overlap)
+- ✅ Busca de vários documentos em uma única consulta ($in)
+- ✅ Catálogo de documentos mantido junto com armazenamento/deleção
+- ✅ Singleton do ChromaDB (uma conexão por processo) e warmup do índice
+
+ESTRATÉGIA DE TESTES:
+- ChromaDB e catálogo de documentos em memória, sem tocar o disco
+- Embeddings de 3 dimensões escritos à mão; gerar_embeddings da query é
+  substituído para não chamar a API OpenAI
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_banco_vetorial.py
+- Fixtures globais: backend/conftest.py
+============================================================================
+"""
+
+import uuid
+
+import chromadb
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+
+from src.servicos import (
+    servico_banco_vetorial,
+    servico_catalogo_documentos,
+    servico_indice_documentos,
+    servico_indice_lexical,
+    servico_texto_canonico,
+)
+from src.servicos.servico_armazenamento_vetorial import criar_colecao_em_memoria
+from src.servicos.servico_banco_vetorial import (
+    aquecer_banco_vetorial,
+    ErroDeBusca,
+    armazenar_chunks,
+    buscar_chunks_similares,
+    buscar_chunks_similares_lote,
+    fundir_rankings_rrf,
+    selecionar_indices_mmr,
+    deletar_documento,
+    encerrar_servico_banco_vetorial,
+    ErroDeInicializacaoChromaDB,
+    inicializar_chromadb,
+    listar_documentos,
+    listar_documentos_paginados,
+    mesclar_textos_de_chunks_contiguos,
+    montar_metadados_hnsw,
+    obter_documentos_por_ids,
+    obter_servico_banco_vetorial,
+    obter_texto_completo_do_documento,
+    obter_textos_completos_dos_documentos,
+    verificar_parametros_hnsw,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Marca como teste do serviço ChromaDB
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+# Texto processado do documento e fatias (com 5 caracteres de overlap)
+TEXTO_DOCUMENTO = (
+    "DOS FATOS O reclamante trabalhou dez anos. "
+    "DO DIREITO Art. 477 da CLT. "
+    "DOS PEDIDOS a) verbas rescisórias; "
+    "b) multa do art. 477."
+)
+LIMITES_CHUNKS = [(0, 43), (38, 71), (66, 106), (101, len(TEXTO_DOCUMENTO))]
+EMBEDDINGS_CHUNKS = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.9, 0.1], [0.0, 0.0, 1.0]]
+
+
+@pytest.fixture(autouse=True)
+def catalogo_em_memoria(monkeypatch):
+    """
+    Substitui o catálogo de documentos (SQLite) por um catálogo em memória.
+    """
+    catalogo = servico_catalogo_documentos.CatalogoDocumentos(":memory:")
+    monkeypatch.setattr(servico_catalogo_documentos, "_instancia_catalogo", catalogo)
+    return catalogo
+
+
+@pytest.fixture(autouse=True)
+def indice_lexical_em_memoria(monkeypatch):
+    """
+    Substitui o índice lexical BM25 (SQLite FTS5) por um índice em memória.
+    """
+    indice = servico_indice_lexical.IndiceLexical(":memory:")
+    monkeypatch.setattr(servico_indice_lexical, "_instancia_indice_lexical", indice)
+    return indice
+
+
+@pytest.fixture(autouse=True)
+def indice_documentos_em_memoria(monkeypatch):
+    """
+    Substitui o índice de documentos (centroides, SQLite) por um índice em memória.
+    """
+    indice = servico_indice_documentos.IndiceDocumentos(":memory:")
+    monkeypatch.setattr(servico_indice_documentos, "_instancia_indice_documentos", indice)
+    return indice
+
+
+@pytest.fixture(params=["chromadb", "numpy"])
+def collection_com_documento(request):
+    """
+    Collection em memória com um documento de 4 chunks sobrepostos.
+
+    Parametrizada: cada teste roda no ChromaDB e no backend NumPy
+    (os dois devem se comportar igual para o serviço).
+    """
+    if request.param == "numpy":
+        collection = criar_colecao_em_memoria(f"teste_{uuid.uuid4().hex}")
+    else:
+        cliente = chromadb.EphemeralClient()
+        collection = cliente.create_collection(
+            name=f"teste_{uuid.uuid4().hex}",
+            embedding_function=None,
+            metadata={"hnsw:space": "cosine"}
+        )
+    armazenar_chunks(
+        collection=collection,
+        chunks=[TEXTO_DOCUMENTO[inicio:fim] for inicio, fim in LIMITES_CHUNKS],
+        embeddings=EMBEDDINGS_CHUNKS,
+        metadados={
+            "documento_id": "doc-1",
+            "nome_arquivo": "peticao.pdf",
+            "data_upload": "2025-10-23T10:00:00",
+            "tipo_documento": "pdf"
+        },
+        metadados_por_chunk=[
+            {
+                "pagina_inicial": indice + 1,
+                "pagina_final": indice + 1,
+                "offset_inicio": inicio,
+                "offset_fim": fim
+            }
+            for indice, (inicio, fim) in enumerate(LIMITES_CHUNKS)
+        ]
+    )
+    yield collection
+    if request.param == "chromadb":
+        cliente.delete_collection(collection.name)
+
+
+def buscar_com_embedding(collection, embedding_query, **kwargs):
+    """
+    Executa buscar_chunks_similares com o embedding da query fixado.
+    """
+    with patch(
+        "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+        return_value=[embedding_query]
+    ):
+        return buscar_chunks_similares(collection=collection, query="verbas", **kwargs)
+
+
+# ============================================================================
+# GRUPO DE TESTES: JANELA DE CHUNKS VIZINHOS
+# ============================================================================
+
+class TestJanelaDeVizinhos:
+    """
+    Testa a expansão de resultados com chunks adjacentes.
+
+    CONTEXTO:
+    O agente deve receber trechos contíguos (sem repetição do overlap) em
+    vez de fragmentos isolados.
+    """
+
+    def test_mesclagem_por_offsets_deve_reconstruir_texto_original(self):
+        """
+        CENÁRIO: Chunks consecutivos com overlap e offsets conhecidos
+        EXPECTATIVA: Texto mesclado idêntico ao texto processado
+        """
+        # ARRANGE
+        chunks = [
+            (TEXTO_DOCUMENTO[inicio:fim], {"offset_inicio": inicio, "offset_fim": fim})
+            for inicio, fim in LIMITES_CHUNKS
+        ]
+
+        # ACT & ASSERT
+        assert mesclar_textos_de_chunks_contiguos(chunks) == TEXTO_DOCUMENTO
+
+    def test_mesclagem_sem_offsets_deve_remover_sobreposicao_textual(self):
+        """
+        CENÁRIO: Chunks antigos (sem offsets) com 25 caracteres repetidos
+        EXPECTATIVA: Sobreposição aparece uma única vez
+        """
+        # ARRANGE
+        primeiro = "O reclamante foi dispensado sem justa causa em 2023."
+        segundo = primeiro[-25:] + " Não recebeu as verbas rescisórias."
+
+        # ACT
+        texto = mesclar_textos_de_chunks_contiguos([(primeiro, {}), (segundo, {})])
+
+        # ASSERT
+        assert texto == primeiro + " Não recebeu as verbas rescisórias."
+
+    def test_busca_sem_janela_deve_manter_comportamento_original(self, collection_com_documento):
+        """
+        CENÁRIO: Busca padrão (janela_vizinhos=0)
+        EXPECTATIVA: Chunks isolados, com páginas e offsets nos metadados
+        """
+        # ACT
+        resultados = buscar_com_embedding(collection_com_documento, [0.0, 1.0, 0.0], k=2)
+
+        # ASSERT
+        assert [r["id"] for r in resultados] == ["doc-1_chunk_1", "doc-1_chunk_2"]
+        assert resultados[0]["documento"] == TEXTO_DOCUMENTO[38:71]
+        assert resultados[0]["metadados"]["offset_inicio"] == 38
+        assert resultados[0]["metadados"]["pagina_inicial"] == 2
+
+    def test_busca_com_janela_deve_mesclar_resultados_adjacentes(self, collection_com_documento):
+        """
+        CENÁRIO: Dois resultados vizinhos (chunks 1 e 2) com janela ±1
+        EXPECTATIVA: Um único trecho contíguo cobrindo os chunks 0 a 3
+        """
+        # ACT
+        resultados = buscar_com_embedding(
+            collection_com_documento, [0.0, 1.0, 0.0], k=2, janela_vizinhos=1
+        )
+
+        # ASSERT
+        assert len(resultados) == 1
+        janela = resultados[0]
+        assert janela["id"] == "doc-1_chunk_1"
+        assert janela["documento"] == TEXTO_DOCUMENTO
+        assert janela["metadados"]["chunk_index_inicial"] == 0
+        assert janela["metadados"]["chunk_index_final"] == 3
+        assert janela["metadados"]["pagina_inicial"] == 1
+        assert janela["metadados"]["pagina_final"] == 4
+        assert janela["metadados"]["ids_chunks"] == [f"doc-1_chunk_{i}" for i in range(4)]
+
+
+# ============================================================================
+# GRUPO DE TESTES: BUSCA EM LOTE
+# ============================================================================
+
+class TestBuscaEmLote:
+    """
+    Testa buscar_chunks_similares_lote().
+
+    CONTEXTO:
+    N queries relacionadas devem custar UMA requisição de embedding e UMA
+    consulta ao ChromaDB, com resultados separados por query.
+    """
+
+    def test_lote_deve_gerar_embeddings_e_consultar_chromadb_uma_vez(self, collection_com_documento):
+        """
+        CENÁRIO: Três queries, cada uma próxima de um chunk diferente
+        EXPECTATIVA: 1 chamada de embedding, 1 collection.query, resultados na ordem das queries
+        """
+        # ARRANGE
+        queries = ["fatos", "direito", "pedidos"]
+        embeddings_queries = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+        classe_collection = type(collection_com_documento)
+
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=embeddings_queries
+        ) as gerar, patch.object(
+            classe_collection, "query", autospec=True, side_effect=classe_collection.query
+        ) as consultar:
+            # ACT
+            resultados = buscar_chunks_similares_lote(collection_com_documento, queries, k=1)
+
+        # ASSERT
+        gerar.assert_called_once_with(queries, usar_cache=False)
+        assert consultar.call_count == 1
+        assert [r[0]["id"] for r in resultados] == ["doc-1_chunk_0", "doc-1_chunk_1", "doc-1_chunk_3"]
+
+    def test_filtros_por_query_devem_ser_aplicados_separadamente(self, collection_com_documento):
+        """
+        CENÁRIO: Duas queries com filtros diferentes
+        EXPECTATIVA: Cada query respeita o próprio filtro
+        """
+        # ARRANGE
+        filtros = [{"pagina_inicial": 1}, {"pagina_inicial": 4}]
+
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=[[0.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+        ) as gerar:
+            # ACT
+            resultados = buscar_chunks_similares_lote(
+                collection_com_documento, ["a", "b"], k=1, filtros=filtros
+            )
+
+        # ASSERT
+        assert gerar.call_count == 1
+        assert resultados[0][0]["id"] == "doc-1_chunk_0"
+        assert resultados[1][0]["id"] == "doc-1_chunk_3"
+
+    def test_busca_simples_deve_retornar_mesmo_resultado_do_lote(self, collection_com_documento):
+        """
+        CENÁRIO: buscar_chunks_similares() com uma query
+        EXPECTATIVA: Igual ao primeiro item do lote com a mesma query
+        """
+        # ACT
+        resultado_simples = buscar_com_embedding(collection_com_documento, [0.0, 0.9, 0.1], k=2)
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=[[0.0, 0.9, 0.1]]
+        ):
+            resultado_lote = buscar_chunks_similares_lote(collection_com_documento, ["verbas"], k=2)
+
+        # ASSERT
+        assert resultado_lote == [resultado_simples]
+
+    @pytest.mark.parametrize("queries, kwargs", [
+        ([], {}),
+        (["válida", "  "], {}),
+        (["a", "b"], {"filtros": [None]}),
+    ])
+    def test_entradas_invalidas_devem_lancar_erro_de_busca(self, collection_com_documento, queries, kwargs):
+        """
+        CENÁRIO: Lista vazia, query em branco ou filtros desalinhados
+        EXPECTATIVA: ErroDeBusca antes de chamar a API de embeddings
+        """
+        # ACT & ASSERT
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings"
+        ) as gerar:
+            with pytest.raises(ErroDeBusca):
+                buscar_chunks_similares_lote(collection_com_documento, queries, **kwargs)
+        gerar.assert_not_called()
+
+
+# ============================================================================
+# GRUPO DE TESTES: BUSCA HÍBRIDA (BM25 + VETORIAL)
+# ============================================================================
+
+class TestBuscaHibrida:
+    """
+    Testa o modo_busca="hibrida" e a sincronização do índice lexical.
+
+    CONTEXTO:
+    Identificadores exatos ("art. 477", "Súmula 331") devem entrar no top-k
+    mesmo quando o embedding da query aponta para outro chunk.
+    """
+
+    def test_rrf_deve_favorecer_itens_presentes_nos_dois_rankings(self):
+        """
+        CENÁRIO: "b" é 2º nos dois rankings; "a" e "c" lideram um ranking cada
+        EXPECTATIVA: "b" vence a fusão
+        """
+        # ACT
+        ranking = fundir_rankings_rrf([["a", "b", "d"], ["c", "b"]], constante_rrf=60)
+
+        # ASSERT
+        assert ranking[0][0] == "b"
+        assert {id_item for id_item, _ in ranking} == {"a", "b", "c", "d"}
+
+    def test_hibrida_deve_trazer_chunk_com_identificador_exato(self, collection_com_documento):
+        """
+        CENÁRIO: Embedding da query aponta para DOS FATOS, texto pede "multa art. 477"
+        EXPECTATIVA: Modo vetorial com k=2 perde o chunk da multa; híbrido com k=2 o inclui
+        """
+        # ARRANGE (levemente inclinado para DO DIREITO: sem empate com o chunk 3)
+        embedding_fatos = [1.0, 0.1, 0.0]
+
+        # ACT
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=[embedding_fatos]
+        ):
+            vetorial = buscar_chunks_similares(
+                collection_com_documento, "multa rescisórias", k=2, modo_busca="vetorial"
+            )
+            hibrida = buscar_chunks_similares(
+                collection_com_documento, "multa rescisórias", k=2, modo_busca="hibrida"
+            )
+
+        # ASSERT
+        assert "doc-1_chunk_3" not in [resultado["id"] for resultado in vetorial]
+        ids_hibrida = [resultado["id"] for resultado in hibrida]
+        assert "doc-1_chunk_3" in ids_hibrida
+        assert all("score_rrf" in resultado for resultado in hibrida)
+        assert hibrida[0]["score_rrf"] >= hibrida[1]["score_rrf"]
+        assert all(0.0 <= resultado["distancia"] <= 2.0 for resultado in hibrida)
+
+    def test_hibrida_deve_respeitar_filtro_de_metadados(self, collection_com_documento):
+        """
+        CENÁRIO: Termo só existe no chunk 3, mas o filtro exclui a página 4
+        EXPECTATIVA: Chunk 3 não aparece (o filtro vale para o ranking BM25)
+        """
+        # ACT
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=[[1.0, 0.0, 0.0]]
+        ):
+            resultados = buscar_chunks_similares(
+                collection_com_documento, "multa", k=4, modo_busca="hibrida",
+                filtro_metadados={"pagina_inicial": {"$lt": 4}}
+            )
+
+        # ASSERT
+        assert "doc-1_chunk_3" not in [resultado["id"] for resultado in resultados]
+
+    def test_indice_lexical_deve_acompanhar_armazenamento_e_delecao(
+        self, collection_com_documento, indice_lexical_em_memoria
+    ):
+        """
+        CENÁRIO: Documento armazenado e depois deletado
+        EXPECTATIVA: Chunks indexados no BM25 e removidos na deleção
+        """
+        # ASSERT (após armazenar)
+        assert indice_lexical_em_memoria.contar_chunks() == len(LIMITES_CHUNKS)
+        assert indice_lexical_em_memoria.buscar("rescisórias")[0][0] == "doc-1_chunk_2"
+
+        # ACT
+        deletar_documento(collection_com_documento, "doc-1")
+
+        # ASSERT
+        assert indice_lexical_em_memoria.esta_vazio()
+
+    def test_hibrida_deve_reconstruir_indice_vazio(self, collection_com_documento, monkeypatch):
+        """
+        CENÁRIO: Índice lexical perdido (base anterior ao índice)
+        EXPECTATIVA: Primeira busca híbrida reconstrói o índice a partir do ChromaDB
+        """
+        # ARRANGE
+        indice_novo = servico_indice_lexical.IndiceLexical(":memory:")
+        monkeypatch.setattr(servico_indice_lexical, "_instancia_indice_lexical", indice_novo)
+
+        # ACT
+        with patch(
+            "src.servicos.servico_banco_vetorial.servico_vetorizacao.gerar_embeddings",
+            return_value=[[1.0, 0.0, 0.0]]
+        ):
+            buscar_chunks_similares(collection_com_documento, "multa", k=1, modo_busca="hibrida")
+
+        # ASSERT
+        assert indice_novo.contar_chunks() == len(LIMITES_CHUNKS)
+
+    def test_modo_busca_invalido_deve_lancar_erro(self, collection_com_documento):
+        """
+        CENÁRIO: modo_busca desconhecido
+        EXPECTATIVA: ErroDeBusca
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeBusca):
+            buscar_chunks_similares(collection_com_documento, "multa", modo_busca="semantica")
+
+
+# ============================================================================
+# GRUPO DE TESTES: DIVERSIFICAÇÃO MMR
+# ============================================================================
+
+class TestDiversificacaoMMR:
+    """
+    Testa selecionar_indices_mmr() e o parâmetro lambda_mmr da busca.
+
+    CONTEXTO:
+    Chunks 1 e 2 da fixture são quase idênticos ([0, 1, 0] e [0, 0.9, 0.1]);
+    com MMR o segundo deles deve dar lugar a um trecho diferente.
+    """
+
+    def test_mmr_deve_pular_candidato_quase_duplicado(self):
+        """
+        CENÁRIO: Candidatos 0 e 1 quase idênticos, candidato 2 diferente e pouco menos relevante
+        EXPECTATIVA: λ=1 mantém a ordem; λ=0.5 troca o duplicado pelo diferente
+        """
+        # ARRANGE
+        relevancias = np.array([0.95, 0.94, 0.80])
+        embeddings = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+
+        # ACT & ASSERT
+        assert selecionar_indices_mmr(relevancias, embeddings, 2, lambda_mmr=1.0) == [0, 1]
+        assert selecionar_indices_mmr(relevancias, embeddings, 2, lambda_mmr=0.5) == [0, 2]
+        assert selecionar_indices_mmr(relevancias, embeddings, 10, lambda_mmr=0.5) == [0, 2, 1]
+
+    def test_busca_com_lambda_mmr_deve_diversificar_top_k(self, collection_com_documento):
+        """
+        CENÁRIO: Query próxima dos chunks 1 e 2 (quase iguais), k=2
+        EXPECTATIVA: Sem MMR vêm 1 e 2; com MMR vem 1 e um chunk diferente
+        """
+        # ACT
+        sem_mmr = buscar_com_embedding(collection_com_documento, [0.0, 1.0, 0.05], k=2)
+        com_mmr = buscar_com_embedding(collection_com_documento, [0.0, 1.0, 0.05], k=2, lambda_mmr=0.5)
+
+        # ASSERT
+        assert [resultado["id"] for resultado in sem_mmr] == ["doc-1_chunk_1", "doc-1_chunk_2"]
+        assert com_mmr[0]["id"] == "doc-1_chunk_1"
+        assert com_mmr[1]["id"] != "doc-1_chunk_2"
+
+    def test_lambda_mmr_fora_do_intervalo_deve_lancar_erro(self, collection_com_documento):
+        """
+        CENÁRIO: lambda_mmr = 1.5
+        EXPECTATIVA: ErroDeBusca
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeBusca):
+            buscar_com_embedding(collection_com_documento, [0.0, 1.0, 0.0], lambda_mmr=1.5)
+
+
+# ============================================================================
+# GRUPO DE TESTES: BUSCA HIERÁRQUICA (DOCUMENTOS → CHUNKS)
+# ============================================================================
+
+@pytest.fixture
+def collection_com_dois_documentos(collection_com_documento):
+    """
+    Acrescenta à fixture um doc-2 cujos chunks apontam para o eixo [1, 0, 0].
+    """
+    armazenar_chunks(
+        collection=collection_com_documento,
+        chunks=["Laudo pericial do doc-2.", "Conclusão do laudo do doc-2."],
+        embeddings=[[1.0, 0.05, 0.0], [0.95, 0.0, 0.05]],
+        metadados={
+            "documento_id": "doc-2",
+            "nome_arquivo": "laudo.pdf",
+            "data_upload": "2025-10-24T10:00:00",
+            "tipo_documento": "pdf"
+        }
+    )
+    return collection_com_documento
+
+
+class TestBuscaHierarquica:
+    """
+    Testa o índice de centroides e o parâmetro numero_documentos_pre_selecao.
+
+    CONTEXTO:
+    O chunk 0 do doc-1 é [1, 0, 0], mas o centroide do doc-1 aponta para os
+    eixos 1 e 2; o doc-2 inteiro está perto de [1, 0, 0].
+    """
+
+    def test_centroide_deve_acompanhar_armazenamento_e_delecao(
+        self, collection_com_dois_documentos, indice_documentos_em_memoria
+    ):
+        """
+        CENÁRIO: Dois documentos armazenados e um deletado
+        EXPECTATIVA: Um vetor por documento; a deleção remove o vetor
+        """
+        # ACT & ASSERT
+        assert indice_documentos_em_memoria.contar_documentos() == 2
+        deletar_documento(collection_com_dois_documentos, "doc-2")
+        assert indice_documentos_em_memoria.contar_documentos() == 1
+
+    def test_busca_hierarquica_deve_buscar_so_nos_documentos_pre_selecionados(
+        self, collection_com_dois_documentos
+    ):
+        """
+        CENÁRIO: Query [1, 0, 0], k=3, com e sem pré-seleção de 1 documento
+        EXPECTATIVA: Busca direta mistura os documentos; a hierárquica traz só o doc-2
+        """
+        # ACT
+        direta = buscar_com_embedding(collection_com_dois_documentos, [1.0, 0.0, 0.0], k=3)
+        hierarquica = buscar_com_embedding(
+            collection_com_dois_documentos, [1.0, 0.0, 0.0], k=3, numero_documentos_pre_selecao=1
+        )
+
+        # ASSERT
+        assert {resultado["metadados"]["documento_id"] for resultado in direta} == {"doc-1", "doc-2"}
+        assert [resultado["metadados"]["documento_id"] for resultado in hierarquica] == ["doc-2", "doc-2"]
+
+    def test_pre_selecao_deve_respeitar_filtro_de_documentos(self, collection_com_dois_documentos):
+        """
+        CENÁRIO: Query próxima do doc-2, mas filtro restrito ao doc-1, no modo híbrido
+        EXPECTATIVA: Apenas chunks do doc-1 (o primeiro estágio não escapa do filtro)
+        """
+        # ACT
+        resultados = buscar_com_embedding(
+            collection_com_dois_documentos,
+            [1.0, 0.0, 0.0],
+            k=2,
+            filtro_metadados={"documento_id": {"$in": ["doc-1"]}},
+            modo_busca="hibrida",
+            numero_documentos_pre_selecao=1
+        )
+
+        # ASSERT
+        assert resultados
+        assert {resultado["metadados"]["documento_id"] for resultado in resultados} == {"doc-1"}
+
+    def test_indice_vazio_deve_ser_reconstruido_na_primeira_busca(
+        self, collection_com_dois_documentos, monkeypatch
+    ):
+        """
+        CENÁRIO: Base anterior ao índice de documentos (índice vazio)
+        EXPECTATIVA: A busca hierárquica reconstrói os centroides a partir do ChromaDB
+        """
+        # ARRANGE
+        indice_novo = servico_indice_documentos.IndiceDocumentos(":memory:")
+        monkeypatch.setattr(servico_indice_documentos, "_instancia_indice_documentos", indice_novo)
+
+        # ACT
+        resultados = buscar_com_embedding(
+            collection_com_dois_documentos, [1.0, 0.0, 0.0], k=1, numero_documentos_pre_selecao=1
+        )
+
+        # ASSERT
+        assert indice_novo.contar_documentos() == 2
+        assert resultados[0]["metadados"]["documento_id"] == "doc-2"
+
+
+# ============================================================================
+# GRUPO DE TESTES: TEXTO COMPLETO DO DOCUMENTO
+# ============================================================================
+
+class TestTextoCompletoDoDocumento:
+    """
+    Testa obter_texto_completo_do_documento() (usado pelos orquestradores).
+
+    CONTEXTO:
+    O texto enviado aos agentes não pode repetir o overlap entre chunks.
+    """
+
+    @pytest.fixture(autouse=True)
+    def diretorio_textos_canonicos(self, diretorio_temporario_para_testes, monkeypatch):
+        """
+        Redireciona o armazenamento de textos canônicos para um diretório temporário.
+        """
+        monkeypatch.setattr(
+            servico_texto_canonico.configuracoes,
+            "CAMINHO_TEXTOS_CANONICOS",
+            str(diretorio_temporario_para_testes)
+        )
+
+    def test_deve_preferir_texto_canonico(self, collection_com_documento):
+        """
+        CENÁRIO: Documento com texto canônico gravado na ingestão
+        EXPECTATIVA: Texto canônico retornado sem consultar os chunks
+        """
+        # ARRANGE
+        servico_texto_canonico.salvar_texto_canonico("doc-1", "TEXTO CANÔNICO")
+
+        # ACT & ASSERT
+        assert obter_texto_completo_do_documento(collection_com_documento, "doc-1") == "TEXTO CANÔNICO"
+
+    def test_sem_texto_canonico_deve_reconstruir_sem_overlap(self, collection_com_documento):
+        """
+        CENÁRIO: Documento antigo (sem texto canônico)
+        EXPECTATIVA: Chunks ordenados e mesclados sem repetir o overlap
+        """
+        # ACT & ASSERT
+        assert obter_texto_completo_do_documento(collection_com_documento, "doc-1") == TEXTO_DOCUMENTO
+        assert obter_texto_completo_do_documento(collection_com_documento, "doc-x") == ""
+
+    def test_lote_deve_combinar_texto_canonico_e_reconstrucao(self, collection_com_documento):
+        """
+        CENÁRIO: Um documento com texto canônico, um antigo e um inexistente
+        EXPECTATIVA: Mapa completo por ID, na forma de cada fonte
+        """
+        # ARRANGE
+        servico_texto_canonico.salvar_texto_canonico("doc-canonico", "TEXTO CANÔNICO")
+
+        # ACT
+        textos = obter_textos_completos_dos_documentos(
+            collection_com_documento, ["doc-canonico", "doc-1", "doc-x"]
+        )
+
+        # ASSERT
+        assert textos == {"doc-canonico": "TEXTO CANÔNICO", "doc-1": TEXTO_DOCUMENTO, "doc-x": ""}
+
+    def test_texto_canonico_corrompido_deve_cair_para_os_chunks(
+        self, collection_com_documento, diretorio_temporario_para_testes
+    ):
+        """
+        CENÁRIO: Arquivo de texto canônico corrompido (gzip inválido)
+        EXPECTATIVA: Texto reconstruído a partir dos chunks, sem ErroDeBusca
+        """
+        # ARRANGE
+        (diretorio_temporario_para_testes / "doc-1.txt.gz").write_bytes(b"nao e gzip")
+        servico_texto_canonico.salvar_texto_canonico("doc-canonico", "TEXTO CANÔNICO")
+
+        # ACT
+        textos = obter_textos_completos_dos_documentos(collection_com_documento, ["doc-1", "doc-canonico"])
+
+        # ASSERT
+        assert textos == {"doc-1": TEXTO_DOCUMENTO, "doc-canonico": "TEXTO CANÔNICO"}
+        assert obter_texto_completo_do_documento(collection_com_documento, "doc-1") == TEXTO_DOCUMENTO
+
+
+# ============================================================================
+# GRUPO DE TESTES: BUSCA DE VÁRIOS DOCUMENTOS EM LOTE
+# ============================================================================
+
+class TestObterDocumentosPorIds:
+    """
+    Testa obter_documentos_por_ids() (uma consulta para N documentos).
+    """
+
+    def test_deve_agrupar_e_ordenar_chunks_por_documento(self, collection_com_documento):
+        """
+        CENÁRIO: Dois documentos na collection, chunks inseridos fora de ordem
+        EXPECTATIVA: Chunks agrupados por documento e ordenados por chunk_index
+        """
+        # ARRANGE
+        collection_com_documento.add(
+            ids=["doc-2_chunk_1", "doc-2_chunk_0"],
+            documents=["segundo", "primeiro"],
+            embeddings=[[0.5, 0.5, 0.0], [0.5, 0.0, 0.5]],
+            metadatas=[
+                {"documento_id": "doc-2", "chunk_index": 1, "total_chunks": 2},
+                {"documento_id": "doc-2", "chunk_index": 0, "total_chunks": 2},
+            ]
+        )
+
+        # ACT
+        documentos = obter_documentos_por_ids(collection_com_documento, ["doc-2", "doc-1", "doc-x", "doc-2"])
+
+        # ASSERT
+        assert list(documentos) == ["doc-2", "doc-1", "doc-x"]
+        assert documentos["doc-2"]["documents"] == ["primeiro", "segundo"]
+        assert documentos["doc-2"]["ids"] == ["doc-2_chunk_0", "doc-2_chunk_1"]
+        assert documentos["doc-1"]["count"] == len(LIMITES_CHUNKS)
+        assert documentos["doc-x"] == {"documents": [], "metadatas": [], "ids": [], "count": 0}
+
+
+# ============================================================================
+# GRUPO DE TESTES: CATÁLOGO DE DOCUMENTOS
+# ============================================================================
+
+class TestCatalogoNoBancoVetorial:
+    """
+    Testa a manutenção do catálogo por armazenar_chunks/deletar_documento.
+    """
+
+    def test_armazenar_e_deletar_devem_manter_catalogo(
+        self, collection_com_documento, catalogo_em_memoria, diretorio_temporario_para_testes, monkeypatch
+    ):
+        """
+        CENÁRIO: Documento armazenado e depois deletado
+        EXPECTATIVA: Linha agregada no catálogo; removida junto com os chunks
+        """
+        # ARRANGE
+        monkeypatch.setattr(
+            servico_texto_canonico.configuracoes,
+            "CAMINHO_TEXTOS_CANONICOS",
+            str(diretorio_temporario_para_testes)
+        )
+
+        # ACT
+        documentos = listar_documentos(collection_com_documento)
+
+        # ASSERT
+        assert documentos == [{
+            "documento_id": "doc-1",
+            "nome_arquivo": "peticao.pdf",
+            "data_upload": "2025-10-23T10:00:00",
+            "tipo_documento": "pdf",
+            "numero_chunks": len(LIMITES_CHUNKS),
+            "tamanho_total_texto_caracteres": len(TEXTO_DOCUMENTO),
+            "numero_tokens": 0,
+        }]
+
+        # ACT
+        assert deletar_documento(collection_com_documento, "doc-1") is True
+
+        # ASSERT
+        assert catalogo_em_memoria.contar_documentos() == 0
+
+    def test_deletar_documento_sem_chunks_deve_remover_texto_canonico_orfao(
+        self, collection_com_documento, diretorio_temporario_para_testes, monkeypatch
+    ):
+        """
+        CENÁRIO: Texto canônico gravado, mas a ingestão falhou antes dos chunks
+        EXPECTATIVA: deletar_documento retorna False e remove o texto órfão
+        """
+        # ARRANGE
+        monkeypatch.setattr(
+            servico_texto_canonico.configuracoes,
+            "CAMINHO_TEXTOS_CANONICOS",
+            str(diretorio_temporario_para_testes)
+        )
+        servico_texto_canonico.salvar_texto_canonico("doc-orfao", "TEXTO ÓRFÃO")
+
+        # ACT
+        resultado = deletar_documento(collection_com_documento, "doc-orfao")
+
+        # ASSERT
+        assert resultado is False
+        assert servico_texto_canonico.obter_texto_canonico("doc-orfao") is None
+
+    def test_catalogo_vazio_deve_ser_reconstruido_da_collection(
+        self, collection_com_documento, catalogo_em_memoria
+    ):
+        """
+        CENÁRIO: Base anterior ao catálogo (chunks no ChromaDB, catálogo vazio)
+        EXPECTATIVA: Primeira listagem reconstrói o catálogo a partir dos chunks
+        """
+        # ARRANGE
+        catalogo_em_memoria.remover_documento("doc-1")
+
+        # ACT
+        pagina = listar_documentos_paginados(collection_com_documento, limite=10)
+
+        # ASSERT
+        assert pagina["total_documentos"] == 1
+        assert pagina["proximo_cursor"] is None
+        assert pagina["documentos"][0]["numero_chunks"] == len(LIMITES_CHUNKS)
+        assert pagina["documentos"][0]["tamanho_total_texto_caracteres"] == len(TEXTO_DOCUMENTO)
+
+
+# ============================================================================
+# GRUPO DE TESTES: SINGLETON E WARMUP
+# ============================================================================
+
+class TestSingletonEWarmup:
+    """
+    Testa obter_servico_banco_vetorial() e aquecer_banco_vetorial().
+
+    CONTEXTO:
+    A conexão com o ChromaDB é criada uma única vez (startup) e
+    compartilhada; o warmup carrega o índice antes da primeira requisição.
+    """
+
+    def test_singleton_deve_inicializar_chromadb_uma_unica_vez(self, monkeypatch):
+        """
+        CENÁRIO: Várias chamadas a obter_servico_banco_vetorial()
+        EXPECTATIVA: inicializar_chromadb chamado uma vez; encerrar reseta o cache
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_banco_vetorial, "_instancia_chromadb", None)
+        instancia = (object(), object())
+
+        with patch(
+            "src.servicos.servico_banco_vetorial.inicializar_chromadb",
+            return_value=instancia
+        ) as inicializar:
+            # ACT
+            primeira = obter_servico_banco_vetorial()
+            segunda = obter_servico_banco_vetorial()
+            encerrar_servico_banco_vetorial()
+            obter_servico_banco_vetorial()
+
+        # ASSERT
+        assert primeira is segunda is instancia
+        assert inicializar.call_count == 2
+
+    def test_warmup_deve_carregar_indice_de_collection_com_chunks(self, collection_com_documento):
+        """
+        CENÁRIO: Collection com 4 chunks
+        EXPECTATIVA: Índice carregado sem chamar a API de embeddings
+        """
+        # ACT
+        with patch("src.servicos.servico_vetorizacao.gerar_embeddings") as gerar:
+            estatisticas = aquecer_banco_vetorial(collection_com_documento)
+
+        # ASSERT
+        assert estatisticas["numero_chunks"] == len(LIMITES_CHUNKS)
+        assert estatisticas["indice_carregado"] is True
+        gerar.assert_not_called()
+
+    def test_warmup_de_collection_vazia_nao_deve_falhar(self):
+        """
+        CENÁRIO: Collection recém-criada
+        EXPECTATIVA: numero_chunks == 0 e índice não carregado
+        """
+        # ARRANGE
+        collection = chromadb.EphemeralClient().get_or_create_collection(
+            f"vazia_{uuid.uuid4().hex}", embedding_function=None
+        )
+
+        # ACT
+        estatisticas = aquecer_banco_vetorial(collection)
+
+        # ASSERT
+        assert estatisticas == {
+            "numero_chunks": 0,
+            "tempo_segundos": estatisticas["tempo_segundos"],
+            "indice_carregado": False,
+        }
+
+
+# ============================================================================
+# GRUPO DE TESTES: PARÂMETROS DO ÍNDICE HNSW
+# ============================================================================
+
+class TestParametrosHNSW:
+    """
+    Testa a aplicação dos parâmetros CHROMA_HNSW_* na criação da collection.
+    """
+
+    @pytest.fixture(autouse=True)
+    def chromadb_em_diretorio_temporario(self, diretorio_temporario_para_testes, monkeypatch):
+        """
+        Redireciona a persistência do ChromaDB para um diretório temporário.
+        """
+        monkeypatch.setattr(
+            servico_banco_vetorial.configuracoes,
+            "CHROMA_DB_PATH",
+            str(diretorio_temporario_para_testes / "chroma_db")
+        )
+        monkeypatch.setattr(
+            servico_banco_vetorial.configuracoes,
+            "CHROMA_COLLECTION_NAME",
+            f"teste_{uuid.uuid4().hex}"
+        )
+
+    def test_collection_nova_deve_ser_criada_com_parametros_do_env(self, monkeypatch):
+        """
+        CENÁRIO: CHROMA_HNSW_M=32 e CHROMA_HNSW_SEARCH_EF=64 no .env
+        EXPECTATIVA: Metadados "hnsw:*" da collection refletem o .env
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_M", 32)
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_SEARCH_EF", 64)
+
+        # ACT
+        _, collection = inicializar_chromadb()
+
+        # ASSERT
+        assert collection.metadata["hnsw:M"] == 32
+        assert collection.metadata["hnsw:search_ef"] == 64
+        assert collection.metadata["hnsw:space"] == "cosine"
+
+    def test_collection_existente_com_parametros_divergentes_deve_ser_detectada(self, monkeypatch):
+        """
+        CENÁRIO: Collection criada com M=32; .env alterado para M=48
+        EXPECTATIVA: verificar_parametros_hnsw aponta hnsw:M
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_M", 32)
+        _, collection = inicializar_chromadb()
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_M", 48)
+
+        # ACT
+        divergentes = verificar_parametros_hnsw(collection, montar_metadados_hnsw())
+
+        # ASSERT
+        assert divergentes == ["hnsw:M"]
+
+    def test_batch_size_maior_que_sync_threshold_deve_lancar_erro(self, monkeypatch):
+        """
+        CENÁRIO: CHROMA_HNSW_BATCH_SIZE > CHROMA_HNSW_SYNC_THRESHOLD
+        EXPECTATIVA: ErroDeInicializacaoChromaDB antes de abrir o ChromaDB
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_BATCH_SIZE", 500)
+        monkeypatch.setattr(servico_banco_vetorial.configuracoes, "CHROMA_HNSW_SYNC_THRESHOLD", 100)
+
+        # ACT & ASSERT
+        with pytest.raises(ErroDeInicializacaoChromaDB):
+            inicializar_chromadb()
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_banco_vetorial.py -v
+#
+# Para executar apenas testes deste serviço (usando marker):
+#   pytest -m servico_banco_vetorial
+# ============================================================================
@@ -0,0 +1,173 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE CATÁLOGO DE DOCUMENTOS (SQLite)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_catalogo_documentos.py,
+que mantém uma linha por documento para a listagem sem varrer chunks.
+
+ESCOPO DOS TESTES:
+- ✅ Registro, substituição e remoção de documentos
+- ✅ Paginação por cursor sem repetir nem pular documentos
+- ✅ Ordenação por campos diferentes (asc/desc)
+- ✅ Parâmetros inválidos (campo, cursor)
+
+ESTRATÉGIA DE TESTES:
+- Catálogo em memória (":memory:") por teste
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_catalogo_documentos.py
+============================================================================
+"""
+
+import pytest
+
+from src.configuracao.configuracoes import Configuracoes
+from src.servicos import servico_catalogo_documentos
+from src.servicos.servico_catalogo_documentos import (
+    CatalogoDocumentos,
+    ErroDeCatalogoDocumentos,
+    obter_catalogo_documentos,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Catálogo mantido pelo serviço ChromaDB
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+def montar_documento(indice: int, **campos) -> dict:
+    """
+    Monta a linha de catálogo de um documento de teste.
+    """
+    documento = {
+        "documento_id": f"doc-{indice:02d}",
+        "nome_arquivo": f"arquivo_{indice % 3}.pdf",
+        "data_upload": f"2025-10-{indice % 28 + 1:02d}T10:00:00",
+        "tipo_documento": "pdf",
+        "numero_chunks": indice % 5,
+        "numero_caracteres": indice * 100,
+        "numero_tokens": indice * 20,
+    }
+    documento.update(campos)
+    return documento
+
+
+@pytest.fixture
+def catalogo_com_documentos() -> CatalogoDocumentos:
+    """
+    Catálogo em memória com 23 documentos (valores de ordenação repetidos).
+    """
+    catalogo = CatalogoDocumentos(":memory:")
+    catalogo.registrar_documentos(montar_documento(indice) for indice in range(23))
+    return catalogo
+
+
+# ============================================================================
+# GRUPO DE TESTES: CATÁLOGO
+# ============================================================================
+
+class TestCatalogoDocumentos:
+    """
+    Testa o CatalogoDocumentos.
+    """
+
+    def test_registrar_deve_substituir_documento_reprocessado(self):
+        """
+        CENÁRIO: Mesmo documento_id registrado duas vezes
+        EXPECTATIVA: Uma única linha, com os dados mais recentes
+        """
+        # ARRANGE
+        catalogo = CatalogoDocumentos(":memory:")
+
+        # ACT
+        catalogo.registrar_documento(montar_documento(1))
+        catalogo.registrar_documento(montar_documento(1, numero_chunks=42))
+
+        # ASSERT
+        assert catalogo.contar_documentos() == 1
+        assert catalogo.obter_documento("doc-01")["numero_chunks"] == 42
+        assert catalogo.remover_documento("doc-01") is True
+        assert catalogo.remover_documento("doc-01") is False
+
+    @pytest.mark.parametrize("ordenar_por, ordem", [
+        ("data_upload", "desc"),
+        ("nome_arquivo", "asc"),
+        ("numero_chunks", "desc"),
+        ("numero_caracteres", "asc"),
+    ])
+    def test_paginacao_por_cursor_deve_percorrer_todos_sem_repetir(
+        self, catalogo_com_documentos, ordenar_por, ordem
+    ):
+        """
+        CENÁRIO: 23 documentos, páginas de 5, vários valores empatados
+        EXPECTATIVA: Páginas concatenadas == listagem completa na mesma ordem
+        """
+        # ARRANGE
+        completa = catalogo_com_documentos.listar_documentos(ordenar_por=ordenar_por, ordem=ordem)
+        ids_paginados = []
+        cursor = None
+
+        # ACT
+        while True:
+            pagina = catalogo_com_documentos.listar_documentos(
+                limite=5, cursor=cursor, ordenar_por=ordenar_por, ordem=ordem
+            )
+            ids_paginados.extend(documento["documento_id"] for documento in pagina["documentos"])
+            cursor = pagina["proximo_cursor"]
+            if cursor is None:
+                break
+
+        # ASSERT
+        assert ids_paginados == [documento["documento_id"] for documento in completa["documentos"]]
+        assert len(ids_paginados) == 23 == completa["total_documentos"]
+        valores = [documento[ordenar_por] for documento in completa["documentos"]]
+        assert valores == sorted(valores, reverse=(ordem == "desc"))
+
+    def test_parametros_invalidos_devem_levantar_erro(self, catalogo_com_documentos):
+        """
+        CENÁRIO: Campo de ordenação não suportado e cursor adulterado
+        EXPECTATIVA: ErroDeCatalogoDocumentos
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeCatalogoDocumentos):
+            catalogo_com_documentos.listar_documentos(ordenar_por="documento_id; DROP TABLE documentos")
+        with pytest.raises(ErroDeCatalogoDocumentos):
+            catalogo_com_documentos.listar_documentos(limite=5, cursor="nao-e-um-cursor")
+
+    def test_backend_numpy_deve_usar_catalogo_em_memoria(self, monkeypatch, tmp_path):
+        """
+        CENÁRIO: BACKEND_BANCO_VETORIAL=numpy (vetores perdidos a cada restart)
+        EXPECTATIVA: Catálogo em memória; nada gravado no caminho configurado
+        """
+        # ARRANGE
+        caminho_configurado = tmp_path / "catalogo.sqlite3"
+        configuracoes = Configuracoes(
+            BACKEND_BANCO_VETORIAL="numpy", CAMINHO_CATALOGO_DOCUMENTOS=str(caminho_configurado)
+        )
+        monkeypatch.setattr(servico_catalogo_documentos, "obter_configuracoes", lambda: configuracoes)
+        monkeypatch.setattr(servico_catalogo_documentos, "_instancia_catalogo", None)
+
+        # ACT
+        catalogo = obter_catalogo_documentos()
+
+        # ASSERT
+        assert catalogo.caminho_banco == ":memory:"
+        assert not caminho_configurado.exists()
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_catalogo_documentos.py -v
+# ============================================================================
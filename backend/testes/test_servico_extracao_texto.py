@@ -18,7 +18,8 @@ ESCOPO DOS TESTES:
 - ✅ Análise de metadados (número de páginas, páginas vazias, etc.)
 
 ESTRATÉGIA DE TESTES:
-- Usar mocks para PyPDF2 e python-docx (evitar dependência de bibliotecas reais)
+- Usar mocks para PyPDF2 (evitar dependência de bibliotecas reais)
+- Gerar arquivos .docx reais com python-docx (o extrator lê o XML do pacote)
 - Criar arquivos temporários reais quando necessário
 - Testar casos de sucesso e casos de erro
 - Validar estrutura de retorno (schemas)
@@ -34,6 +35,8 @@ from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch, mock_open
 from typing import Dict, Any
 
+from docx import Document as DocxDocument
+
 # Importações do módulo a ser testado
 from src.servicos.servico_extracao_texto import (
     # Funções principais
@@ -43,6 +46,12 @@ from src.servicos.servico_extracao_texto import (
     validar_existencia_arquivo,
     validar_dependencia_instalada,
     extrair_texto_de_documento,
+    obter_backend_extracao_pdf,
+    
+    # Backends de extração de PDF
+    BACKENDS_EXTRACAO_PDF,
+    BackendExtracaoPDFPyPDF2,
+    BackendExtracaoPDFPyPDFium2,
     
     # Exceções
     ErroDeExtracaoDeTexto,
@@ -353,6 +362,85 @@ class TestExtracaoTextoPDF:
                 assert resultado["numero_de_paginas"] == 3
 
 
+# ============================================================================
+# GRUPO DE TESTES: BACKENDS DE EXTRAÇÃO DE PDF
+# ============================================================================
+
+class TestBackendsExtracaoPDF:
+    """
+    Testa a seleção de backends de extração de PDF (BACKEND_EXTRACAO_PDF).
+    
+    CONTEXTO:
+    O motor de extração é plugável. O padrão (PyPDF2) deve continuar
+    funcionando exatamente como antes, e os demais devem ser selecionáveis
+    por configuração ou explicitamente (benchmark).
+    """
+    
+    def test_backend_padrao_deve_vir_da_configuracao(self):
+        """
+        CENÁRIO: Nenhum backend informado explicitamente
+        EXPECTATIVA: Deve usar o valor de BACKEND_EXTRACAO_PDF da configuração
+        """
+        # ARRANGE: Configuração apontando para pypdf2
+        mock_configuracoes = Mock()
+        mock_configuracoes.BACKEND_EXTRACAO_PDF = "pypdf2"
+        
+        with patch(
+            "src.servicos.servico_extracao_texto.obter_configuracoes",
+            return_value=mock_configuracoes
+        ):
+            # ACT
+            backend = obter_backend_extracao_pdf()
+        
+        # ASSERT
+        assert isinstance(backend, BackendExtracaoPDFPyPDF2)
+        assert backend.nome_exibicao == "PyPDF2"
+    
+    def test_backend_desconhecido_deve_levantar_erro(self):
+        """
+        CENÁRIO: Nome de backend inexistente
+        EXPECTATIVA: Deve levantar ErroDeExtracaoDeTexto listando os disponíveis
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeExtracaoDeTexto) as info_excecao:
+            obter_backend_extracao_pdf("motor_inexistente")
+        
+        mensagem_erro = str(info_excecao.value)
+        for nome_backend in BACKENDS_EXTRACAO_PDF:
+            assert nome_backend in mensagem_erro
+    
+    def test_metodo_extracao_deve_refletir_backend_escolhido(
+        self,
+        diretorio_temporario_para_testes: Path
+    ):
+        """
+        CENÁRIO: Extração com backend pypdfium2 informado explicitamente
+        EXPECTATIVA: Resultado deve registrar o backend em metodo_extracao
+        """
+        # ARRANGE: Backend pypdfium2 com páginas simuladas
+        arquivo_pdf = diretorio_temporario_para_testes / "documento_pdfium.pdf"
+        arquivo_pdf.touch()
+        
+        textos_paginas = [
+            "Conteúdo da página 1 do processo jurídico com texto suficiente.",
+            "Conteúdo da página 2 com mais informações relevantes ao caso.",
+        ]
+        
+        with patch.object(BackendExtracaoPDFPyPDFium2, "obter_biblioteca", return_value=object()), \
+             patch.object(
+                 BackendExtracaoPDFPyPDFium2,
+                 "extrair_textos_das_paginas",
+                 return_value=(textos_paginas, 2)
+             ):
+            # ACT
+            resultado = extrair_texto_de_pdf_texto(str(arquivo_pdf), nome_backend_pdf="pypdfium2")
+        
+        # ASSERT
+        assert resultado["metodo_extracao"] == "pypdfium2"
+        assert resultado["numero_de_paginas"] == 2
+        assert resultado["texto_extraido"] == "\n\n".join(textos_paginas)
+
+
 # ============================================================================
 # GRUPO DE TESTES: EXTRAÇÃO DE TEXTO DE DOCX
 # ============================================================================
@@ -363,7 +451,8 @@ class TestExtracaoTextoDOCX:
     
     CONTEXTO:
     Documentos Word (.docx) são comuns em petições jurídicas.
-    Esta função extrai texto de DOCX usando python-docx.
+    Esta função lê word/document.xml em streaming, então os testes usam
+    arquivos .docx reais gerados com python-docx.
     """
     
     def test_extrair_texto_de_docx_valido_deve_retornar_texto_e_metadados(
@@ -374,41 +463,33 @@ class TestExtracaoTextoDOCX:
         CENÁRIO: Arquivo DOCX válido com múltiplos parágrafos
         EXPECTATIVA: Deve retornar dict com texto completo e metadados
         """
-        # ARRANGE: Criar arquivo DOCX temporário
+        # ARRANGE: Criar arquivo DOCX real
         arquivo_docx = diretorio_temporario_para_testes / "peticao.docx"
-        arquivo_docx.touch()
-        
-        # Mock de documento DOCX
-        mock_paragrafo_1 = Mock()
-        mock_paragrafo_1.text = "PETIÇÃO INICIAL"
-        
-        mock_paragrafo_2 = Mock()
-        mock_paragrafo_2.text = "Processo nº 12345"
-        
-        mock_paragrafo_3 = Mock()
-        mock_paragrafo_3.text = "Autor: João da Silva"
-        
-        mock_documento = Mock()
-        mock_documento.paragraphs = [mock_paragrafo_1, mock_paragrafo_2, mock_paragrafo_3]
-        
-        with patch("src.servicos.servico_extracao_texto.DocxDocument", return_value=mock_documento):
-            # ACT: Extrair texto
-            resultado = extrair_texto_de_docx(str(arquivo_docx))
-            
-            # ASSERT: Validar estrutura
-            assert isinstance(resultado, dict)
-            assert "texto_extraido" in resultado
-            assert "numero_de_paragrafos" in resultado
-            assert "metodo_extracao" in resultado
-            assert "tipo_documento" in resultado
-            
-            # Validar conteúdo
-            assert "PETIÇÃO INICIAL" in resultado["texto_extraido"]
-            assert "Processo nº 12345" in resultado["texto_extraido"]
-            assert "João da Silva" in resultado["texto_extraido"]
-            assert resultado["numero_de_paragrafos"] == 3
-            assert resultado["metodo_extracao"] == "python-docx"
-            assert resultado["tipo_documento"] == "docx"
+        documento = DocxDocument()
+        documento.add_paragraph("PETIÇÃO INICIAL")
+        documento.add_paragraph("Processo nº 12345")
+        documento.add_paragraph("")  # Parágrafo vazio deve ser ignorado
+        documento.add_paragraph("Autor: João da Silva")
+        documento.save(str(arquivo_docx))
+        
+        # ACT: Extrair texto
+        resultado = extrair_texto_de_docx(str(arquivo_docx))
+        
+        # ASSERT: Validar estrutura
+        assert isinstance(resultado, dict)
+        assert "texto_extraido" in resultado
+        assert "numero_de_paragrafos" in resultado
+        assert "metodo_extracao" in resultado
+        assert "tipo_documento" in resultado
+        
+        # Validar conteúdo
+        assert resultado["texto_extraido"] == (
+            "PETIÇÃO INICIAL\nProcesso nº 12345\nAutor: João da Silva"
+        )
+        assert resultado["numero_de_paragrafos"] == 3
+        assert resultado["numero_de_tabelas"] == 0
+        assert resultado["metodo_extracao"] == "ooxml-streaming"
+        assert resultado["tipo_documento"] == "docx"
     
     def test_extrair_texto_de_docx_vazio_deve_retornar_texto_vazio(
         self,
@@ -420,18 +501,62 @@ class TestExtracaoTextoDOCX:
         """
         # ARRANGE: DOCX vazio
         arquivo_docx = diretorio_temporario_para_testes / "vazio.docx"
-        arquivo_docx.touch()
+        DocxDocument().save(str(arquivo_docx))
         
-        mock_documento = Mock()
-        mock_documento.paragraphs = []  # Sem parágrafos
+        # ACT: Extrair texto
+        resultado = extrair_texto_de_docx(str(arquivo_docx))
         
-        with patch("src.servicos.servico_extracao_texto.DocxDocument", return_value=mock_documento):
-            # ACT: Extrair texto
-            resultado = extrair_texto_de_docx(str(arquivo_docx))
-            
-            # ASSERT: Deve retornar estrutura válida com texto vazio
-            assert resultado["texto_extraido"] == ""
-            assert resultado["numero_de_paragrafos"] == 0
+        # ASSERT: Deve retornar estrutura válida com texto vazio
+        assert resultado["texto_extraido"] == ""
+        assert resultado["numero_de_paragrafos"] == 0
+    
+    def test_tabelas_devem_aparecer_na_ordem_do_documento(
+        self,
+        diretorio_temporario_para_testes: Path
+    ):
+        """
+        CENÁRIO: Tabela entre dois parágrafos (qualificação das partes)
+        EXPECTATIVA: Texto da tabela deve ficar ENTRE os parágrafos, e não no final
+        """
+        # ARRANGE: Parágrafo, tabela, parágrafo
+        arquivo_docx = diretorio_temporario_para_testes / "contrato.docx"
+        documento = DocxDocument()
+        documento.add_paragraph("CONTRATO DE LOCAÇÃO")
+        tabela = documento.add_table(rows=2, cols=2)
+        tabela.cell(0, 0).text = "Locador"
+        tabela.cell(0, 1).text = "João da Silva"
+        tabela.cell(1, 0).text = "Aluguel"
+        tabela.cell(1, 1).text = "R$ 1.500,00"
+        documento.add_paragraph("Cláusula 1ª - Do prazo")
+        documento.save(str(arquivo_docx))
+        
+        # ACT
+        resultado = extrair_texto_de_docx(str(arquivo_docx))
+        
+        # ASSERT
+        assert resultado["texto_extraido"] == (
+            "CONTRATO DE LOCAÇÃO\n"
+            "\n[TABELA 1]\n"
+            "Locador\tJoão da Silva\n"
+            "Aluguel\tR$ 1.500,00\n"
+            "[FIM TABELA 1]\n"
+            "\n"
+            "Cláusula 1ª - Do prazo"
+        )
+        assert resultado["numero_de_paragrafos"] == 2
+        assert resultado["numero_de_tabelas"] == 1
+    
+    def test_arquivo_que_nao_e_pacote_docx_deve_levantar_erro(
+        self,
+        arquivo_docx_de_teste: Path
+    ):
+        """
+        CENÁRIO: Arquivo com extensão .docx que não é um pacote ZIP/OOXML
+        EXPECTATIVA: Deve levantar TipoDeArquivoNaoSuportadoError
+        """
+        # ACT & ASSERT: fixture global é um arquivo de texto renomeado
+        with pytest.raises(TipoDeArquivoNaoSuportadoError):
+            extrair_texto_de_docx(str(arquivo_docx_de_teste))
 
 
 # ============================================================================
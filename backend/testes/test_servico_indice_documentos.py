@@ -0,0 +1,160 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE ÍNDICE VETORIAL DE DOCUMENTOS
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_indice_documentos.py,
+o índice de centroides usado pelo primeiro estágio da busca hierárquica.
+
+ESCOPO DOS TESTES:
+- ✅ Cálculo do centroide (normalização)
+- ✅ Ranking de documentos em lote e restrição por documento_ids
+- ✅ Substituição e remoção de documentos
+
+ESTRATÉGIA DE TESTES:
+- Índice em memória (":memory:") por teste
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_indice_documentos.py
+============================================================================
+"""
+
+import numpy as np
+import pytest
+
+from src.servicos.servico_indice_documentos import (
+    ErroDeIndiceDocumentos,
+    IndiceDocumentos,
+    calcular_centroide,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Índice mantido pelo serviço ChromaDB
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+@pytest.fixture
+def indice():
+    """
+    Índice em memória com três documentos em direções diferentes.
+    """
+    indice = IndiceDocumentos(":memory:")
+    indice.registrar_documentos({
+        "doc-1": calcular_centroide([[1.0, 0.0, 0.0], [0.9, 0.1, 0.0]]),
+        "doc-2": calcular_centroide([[0.0, 1.0, 0.0]]),
+        "doc-3": calcular_centroide([[0.0, 0.0, 1.0]]),
+    })
+    return indice
+
+
+# ============================================================================
+# GRUPO DE TESTES: CENTROIDE E BUSCA
+# ============================================================================
+
+class TestBuscaDeDocumentos:
+    """
+    Testa o centroide e o ranking por similaridade de cosseno.
+    """
+
+    def test_centroide_deve_ter_norma_um_e_pesar_chunks_igualmente(self):
+        """
+        CENÁRIO: Dois chunks ortogonais, um com norma 10
+        EXPECTATIVA: Centroide na diagonal (a norma do chunk não pesa)
+        """
+        # ACT
+        centroide = calcular_centroide([[10.0, 0.0], [0.0, 1.0]])
+
+        # ASSERT
+        assert np.allclose(centroide, [np.sqrt(0.5), np.sqrt(0.5)])
+
+    def test_centroide_sem_embeddings_deve_lancar_erro(self):
+        """
+        CENÁRIO: Documento sem chunks
+        EXPECTATIVA: ErroDeIndiceDocumentos
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeIndiceDocumentos):
+            calcular_centroide([])
+
+    def test_busca_em_lote_deve_ordenar_documentos_por_similaridade(self, indice):
+        """
+        CENÁRIO: Duas queries, uma perto do doc-1 e outra perto do doc-3
+        EXPECTATIVA: Cada query recebe o seu documento em primeiro lugar
+        """
+        # ACT
+        resultados = indice.buscar_lote([[1.0, 0.0, 0.0], [0.0, 0.2, 1.0]], limite=2)
+
+        # ASSERT
+        assert [documento_id for documento_id, _ in resultados[0]] == ["doc-1", "doc-2"]
+        assert [documento_id for documento_id, _ in resultados[1]] == ["doc-3", "doc-2"]
+        assert resultados[0][0][1] > resultados[0][1][1]
+
+    def test_busca_deve_respeitar_documento_ids(self, indice):
+        """
+        CENÁRIO: Query perto do doc-1, busca restrita a doc-2 e doc-3
+        EXPECTATIVA: doc-1 fora do resultado
+        """
+        # ACT
+        resultados = indice.buscar_lote([[1.0, 0.0, 0.0]], limite=5, documento_ids=["doc-2", "doc-3"])
+
+        # ASSERT
+        assert sorted(documento_id for documento_id, _ in resultados[0]) == ["doc-2", "doc-3"]
+
+    def test_dimensao_diferente_deve_lancar_erro(self, indice):
+        """
+        CENÁRIO: Query com dimensão diferente (modelo de embedding trocado)
+        EXPECTATIVA: ErroDeIndiceDocumentos
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeIndiceDocumentos):
+            indice.buscar_lote([[1.0, 0.0]])
+
+
+# ============================================================================
+# GRUPO DE TESTES: MANUTENÇÃO DO ÍNDICE
+# ============================================================================
+
+class TestManutencaoDoIndiceDeDocumentos:
+    """
+    Testa substituição e remoção de documentos.
+    """
+
+    def test_registrar_novamente_deve_substituir_vetor(self, indice):
+        """
+        CENÁRIO: doc-3 reprocessado com conteúdo parecido com o doc-1
+        EXPECTATIVA: doc-3 passa a ser o mais próximo de [1, 0, 0]
+        """
+        # ACT
+        indice.registrar_documento("doc-3", calcular_centroide([[1.0, 0.0, 0.0]]))
+
+        # ASSERT
+        assert indice.contar_documentos() == 3
+        assert indice.buscar_lote([[1.0, 0.0, 0.0]], limite=1)[0][0][0] == "doc-3"
+
+    def test_remover_documento_deve_tirar_do_ranking(self, indice):
+        """
+        CENÁRIO: Remoção do doc-1 e de um documento inexistente
+        EXPECTATIVA: True / False; doc-1 não aparece mais
+        """
+        # ACT & ASSERT
+        assert indice.remover_documento("doc-1") is True
+        assert indice.remover_documento("doc-inexistente") is False
+        assert "doc-1" not in [documento_id for documento_id, _ in indice.buscar_lote([[1.0, 0.0, 0.0]], limite=3)[0]]
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_indice_documentos.py -v
+# ============================================================================
@@ -0,0 +1,164 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE ÍNDICE LEXICAL (BM25 / SQLite FTS5)
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_indice_lexical.py,
+o índice invertido usado pelo modo de busca híbrida.
+
+ESCOPO DOS TESTES:
+- ✅ Extração de termos (identificadores jurídicos, stopwords)
+- ✅ Busca por identificadores exatos e sem acentos
+- ✅ Reindexação e remoção por documento
+- ✅ Restrição da busca a documentos específicos
+
+ESTRATÉGIA DE TESTES:
+- Índice em memória (":memory:") por teste
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_indice_lexical.py
+============================================================================
+"""
+
+import pytest
+
+from src.servicos.servico_indice_lexical import (
+    IndiceLexical,
+    extrair_termos_consulta,
+    montar_expressao_fts,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Índice mantido pelo serviço ChromaDB
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+@pytest.fixture
+def indice():
+    """
+    Índice em memória com dois documentos jurídicos.
+    """
+    indice = IndiceLexical(":memory:")
+    indice.indexar_chunks("doc-1", ["doc-1_chunk_0", "doc-1_chunk_1"], [
+        "Aplica-se a Súmula 331 do TST à terceirização de serviços.",
+        "Laudo: lombalgia (CID M54.5) incompatível com a função.",
+    ])
+    indice.indexar_chunks("doc-2", ["doc-2_chunk_0"], [
+        "Dispensa por justa causa com base no art. 482 da CLT.",
+    ])
+    return indice
+
+
+# ============================================================================
+# GRUPO DE TESTES: CONSULTA
+# ============================================================================
+
+class TestConsultaLexical:
+    """
+    Testa a montagem da consulta e o ranking BM25.
+    """
+
+    def test_termos_devem_preservar_identificadores_e_remover_stopwords(self):
+        """
+        CENÁRIO: Consulta com artigo de lei, CID e stopwords
+        EXPECTATIVA: "m54.5" inteiro, sem "da"/"de", sem repetição
+        """
+        # ACT
+        termos = extrair_termos_consulta("Art. 482 da CLT e CID M54.5 de CLT")
+
+        # ASSERT
+        assert termos == ["art", "482", "clt", "cid", "m54.5"]
+
+    def test_expressao_fts_deve_escapar_aspas(self):
+        """
+        CENÁRIO: Termo com aspas (entrada do usuário)
+        EXPECTATIVA: Aspas duplicadas, termos unidos por OR
+        """
+        # ACT & ASSERT
+        assert montar_expressao_fts(['a"b', "c"]) == '"a""b" OR "c"'
+
+    @pytest.mark.parametrize("consulta, chunk_esperado", [
+        ("sumula 331", "doc-1_chunk_0"),
+        ("M54.5", "doc-1_chunk_1"),
+        ("art. 482 CLT", "doc-2_chunk_0"),
+    ])
+    def test_busca_deve_encontrar_identificadores_exatos(self, indice, consulta, chunk_esperado):
+        """
+        CENÁRIO: Consultas por súmula (sem acento), CID e artigo de lei
+        EXPECTATIVA: Chunk com o identificador em primeiro lugar
+        """
+        # ACT
+        resultados = indice.buscar(consulta, limite=3)
+
+        # ASSERT
+        assert resultados[0][0] == chunk_esperado
+
+    def test_busca_deve_respeitar_documento_ids(self, indice):
+        """
+        CENÁRIO: Termo presente nos dois documentos, busca restrita ao doc-2
+        EXPECTATIVA: Apenas chunks do doc-2
+        """
+        # ACT
+        resultados = indice.buscar("CLT terceirização", documento_ids=["doc-2"])
+
+        # ASSERT
+        assert [chunk_id for chunk_id, _ in resultados] == ["doc-2_chunk_0"]
+
+    def test_consulta_sem_termos_uteis_deve_retornar_lista_vazia(self, indice):
+        """
+        CENÁRIO: Consulta só com stopwords/pontuação
+        EXPECTATIVA: Lista vazia (sem erro de sintaxe do FTS5)
+        """
+        # ACT & ASSERT
+        assert indice.buscar("de da do ?!") == []
+
+
+# ============================================================================
+# GRUPO DE TESTES: MANUTENÇÃO DO ÍNDICE
+# ============================================================================
+
+class TestManutencaoDoIndice:
+    """
+    Testa reindexação e remoção por documento.
+    """
+
+    def test_reindexar_documento_deve_substituir_chunks_anteriores(self, indice):
+        """
+        CENÁRIO: doc-1 reprocessado com um único chunk
+        EXPECTATIVA: Chunks antigos do doc-1 somem do índice
+        """
+        # ACT
+        indice.indexar_chunks("doc-1", ["doc-1_chunk_0"], ["Texto novo sem identificadores."])
+
+        # ASSERT
+        assert indice.contar_chunks() == 2
+        assert indice.buscar("M54.5") == []
+
+    def test_remover_documento_deve_retornar_chunks_removidos(self, indice):
+        """
+        CENÁRIO: Remoção do doc-1 e de um documento inexistente
+        EXPECTATIVA: 2 chunks removidos; 0 para o inexistente
+        """
+        # ACT & ASSERT
+        assert indice.remover_documento("doc-1") == 2
+        assert indice.remover_documento("doc-inexistente") == 0
+        assert not indice.esta_vazio()
+        assert indice.buscar("sumula") == []
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_indice_lexical.py -v
+# ============================================================================
@@ -0,0 +1,176 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE TEXTO CANÔNICO
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_texto_canonico.py,
+que guarda o texto completo (comprimido) de cada documento ingerido.
+
+ESCOPO DOS TESTES:
+- ✅ Ida e volta (salvar → obter) preserva o texto exatamente
+- ✅ Arquivo gravado comprimido
+- ✅ Documento ausente retorna None; deleção idempotente
+- ✅ IDs inválidos (path traversal) são rejeitados
+
+ESTRATÉGIA DE TESTES:
+- CAMINHO_TEXTOS_CANONICOS aponta para um diretório temporário por teste
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_texto_canonico.py
+- Fixtures globais: backend/conftest.py
+============================================================================
+"""
+
+import threading
+
+import pytest
+
+from src.servicos import servico_texto_canonico
+from src.servicos.servico_texto_canonico import (
+    ErroDeTextoCanonico,
+    deletar_texto_canonico,
+    obter_texto_canonico,
+    salvar_texto_canonico,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_banco_vetorial  # Armazenamento auxiliar ao banco vetorial
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def diretorio_textos_canonicos(diretorio_temporario_para_testes, monkeypatch):
+    """
+    Redireciona o armazenamento de textos canônicos para um diretório temporário.
+    """
+    monkeypatch.setattr(
+        servico_texto_canonico.configuracoes,
+        "CAMINHO_TEXTOS_CANONICOS",
+        str(diretorio_temporario_para_testes / "textos_canonicos")
+    )
+    return diretorio_temporario_para_testes / "textos_canonicos"
+
+
+# ============================================================================
+# GRUPO DE TESTES: ARMAZENAMENTO DO TEXTO CANÔNICO
+# ============================================================================
+
+class TestTextoCanonico:
+    """
+    Testa salvar/obter/deletar texto canônico por documento_id.
+    """
+
+    def test_salvar_e_obter_deve_preservar_texto(self, diretorio_textos_canonicos):
+        """
+        CENÁRIO: Texto longo e repetitivo (típico de petições)
+        EXPECTATIVA: Leitura devolve o mesmo texto; arquivo menor que o original
+        """
+        # ARRANGE
+        texto = "DOS FATOS\nO reclamante trabalhou por dez anos – sem férias.\n" * 200
+
+        # ACT
+        resultado = salvar_texto_canonico("doc-123", texto)
+
+        # ASSERT
+        assert obter_texto_canonico("doc-123") == texto
+        assert resultado["bytes_comprimidos"] < resultado["bytes_originais"]
+        assert (diretorio_textos_canonicos / "doc-123.txt.gz").exists()
+
+    def test_documento_ausente_deve_retornar_none(self):
+        """
+        CENÁRIO: Documento ingerido antes do texto canônico existir
+        EXPECTATIVA: None (quem chama cai para a reconstrução por chunks)
+        """
+        # ACT & ASSERT
+        assert obter_texto_canonico("doc-inexistente") is None
+
+    def test_deletar_deve_remover_apenas_uma_vez(self):
+        """
+        CENÁRIO: Deleção repetida do mesmo documento
+        EXPECTATIVA: True na primeira, False na segunda
+        """
+        # ARRANGE
+        salvar_texto_canonico("doc-123", "texto")
+
+        # ACT & ASSERT
+        assert deletar_texto_canonico("doc-123") is True
+        assert deletar_texto_canonico("doc-123") is False
+        assert obter_texto_canonico("doc-123") is None
+
+    def test_gravacoes_simultaneas_do_mesmo_documento_nao_devem_colidir(self):
+        """
+        CENÁRIO: Várias threads do mesmo processo reprocessam o mesmo documento
+        EXPECTATIVA: Nenhuma gravação falha; o texto final é um dos gravados
+        """
+        # ARRANGE
+        numero_threads = 8
+        barreira = threading.Barrier(numero_threads)
+        erros = []
+
+        def gravar(indice):
+            barreira.wait()
+            for _ in range(20):
+                try:
+                    salvar_texto_canonico("doc-123", f"versão {indice} " * 500)
+                except ErroDeTextoCanonico as erro:
+                    erros.append(erro)
+
+        threads = [threading.Thread(target=gravar, args=(indice,)) for indice in range(numero_threads)]
+
+        # ACT
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # ASSERT
+        assert erros == []
+        assert obter_texto_canonico("doc-123") in {f"versão {indice} " * 500 for indice in range(numero_threads)}
+
+    @pytest.mark.parametrize("documento_id", ["", "..", "../etc/passwd", "a/b"])
+    def test_id_invalido_deve_ser_rejeitado(self, documento_id):
+        """
+        CENÁRIO: IDs vazios ou com separadores de caminho
+        EXPECTATIVA: ErroDeTextoCanonico (nenhum arquivo fora do diretório)
+        """
+        # ACT & ASSERT
+        with pytest.raises(ErroDeTextoCanonico):
+            salvar_texto_canonico(documento_id, "texto")
+
+
+    def test_backend_numpy_deve_manter_textos_em_memoria(self, diretorio_textos_canonicos, monkeypatch):
+        """
+        CENÁRIO: BACKEND_BANCO_VETORIAL=numpy (vetores só em memória)
+        EXPECTATIVA: Nenhum arquivo gravado; o texto não sobrevive ao processo
+        """
+        # ARRANGE
+        monkeypatch.setattr(servico_texto_canonico.configuracoes, "BACKEND_BANCO_VETORIAL", "numpy")
+        monkeypatch.setattr(servico_texto_canonico, "_textos_em_memoria", {})
+
+        # ACT
+        resultado = salvar_texto_canonico("doc-123", "texto")
+
+        # ASSERT
+        assert obter_texto_canonico("doc-123") == "texto"
+        assert resultado["caminho"] is None
+        assert not diretorio_textos_canonicos.exists()
+        assert deletar_texto_canonico("doc-123") is True
+        assert obter_texto_canonico("doc-123") is None
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_texto_canonico.py -v
+# ============================================================================
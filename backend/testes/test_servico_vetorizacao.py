@@ -0,0 +1,304 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - SERVIÇO DE VETORIZAÇÃO E CHUNKING
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Este arquivo contém testes unitários para o servico_vetorizacao.py,
+cobrindo as etapas de preparação de texto que acontecem ANTES da geração
+de embeddings (não dependem da API OpenAI).
+
+ESCOPO DOS TESTES:
+- ✅ Remoção de cabeçalhos/rodapés repetidos entre páginas (boilerplate)
+- ✅ Contabilização de tokens economizados
+- ✅ Chunking por seções jurídicas (DOS FATOS, DO DIREITO, DOS PEDIDOS)
+- ✅ Atribuição de seção e página aos chunks
+
+ESTRATÉGIA DE TESTES:
+- contar_tokens é substituído por contagem de palavras (o tokenizer real
+  do tiktoken baixa o vocabulário da internet na primeira execução)
+- Textos de páginas montados em memória, simulando PDFs de tribunais
+
+REFERÊNCIAS:
+- Código testado: backend/src/servicos/servico_vetorizacao.py
+- Fixtures globais: backend/conftest.py
+============================================================================
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.servicos import servico_vetorizacao
+from src.servicos.servico_vetorizacao import (
+    remover_boilerplate_repetido,
+    normalizar_linha_para_boilerplate,
+    detectar_titulo_secao,
+    dividir_texto_em_chunks_por_secao,
+    processar_texto_completo,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.servico_vetorizacao  # Marca como teste do serviço de vetorização
+]
+
+
+# ============================================================================
+# FIXTURES LOCAIS
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def contar_tokens_por_palavras():
+    """
+    Substitui o tokenizer por contagem de palavras (determinístico e offline).
+    """
+    with patch(
+        "src.servicos.servico_vetorizacao.contar_tokens",
+        side_effect=lambda texto: len(texto.split())
+    ):
+        yield
+
+
+def montar_pagina_tribunal(numero_pagina: int, conteudo: str) -> str:
+    """
+    Monta o texto de uma página com cabeçalho e carimbo típicos do PJe.
+    """
+    return (
+        "PODER JUDICIÁRIO - TRIBUNAL DE JUSTIÇA DO ESTADO DE SÃO PAULO\n"
+        "Processo nº 1001234-56.2024.8.26.0100\n"
+        f"{conteudo}\n"
+        "Assinado eletronicamente por: MARIA DE SOUZA - 12/03/2024 10:22:33\n"
+        f"Num. 98765 - Pág. {numero_pagina}"
+    )
+
+
+# ============================================================================
+# GRUPO DE TESTES: REMOÇÃO DE BOILERPLATE
+# ============================================================================
+
+class TestRemocaoBoilerplate:
+    """
+    Testa a função remover_boilerplate_repetido().
+
+    CONTEXTO:
+    Cabeçalhos e carimbos repetidos em todas as páginas não podem virar
+    chunks; o conteúdo jurídico de cada página deve ser preservado.
+    """
+
+    def test_normalizacao_deve_igualar_linhas_que_diferem_apenas_em_numeros(self):
+        """
+        CENÁRIO: Rodapés de paginação em páginas diferentes
+        EXPECTATIVA: Devem ter a mesma forma normalizada
+        """
+        # ACT & ASSERT
+        assert normalizar_linha_para_boilerplate("Num. 98765 - Pág. 3") == \
+            normalizar_linha_para_boilerplate("Num.  98765 - Pág. 14 ")
+
+    def test_cabecalho_e_carimbo_repetidos_devem_ser_removidos(self):
+        """
+        CENÁRIO: PDF de 5 páginas com cabeçalho e carimbo em todas
+        EXPECTATIVA: Conteúdo preservado, boilerplate removido, tokens economizados > 0
+        """
+        # ARRANGE
+        conteudos = [
+            "DOS FATOS",
+            "O autor foi dispensado sem justa causa.",
+            "DO DIREITO",
+            "Aplica-se o art. 477 da CLT.",
+            "DOS PEDIDOS",
+        ]
+        paginas = [montar_pagina_tribunal(i + 1, c) for i, c in enumerate(conteudos)]
+
+        # ACT
+        resultado = remover_boilerplate_repetido(
+            paginas, fracao_minima_paginas=0.6, manter_uma_ocorrencia=False
+        )
+
+        # ASSERT
+        assert resultado["textos_por_pagina"] == conteudos
+        assert resultado["numero_linhas_removidas"] == 4 * len(conteudos)
+        assert resultado["tokens_economizados"] > 0
+        assert resultado["tokens_originais"] - resultado["tokens_economizados"] == \
+            len(resultado["texto_limpo"].split())
+
+    def test_manter_uma_ocorrencia_deve_preservar_primeiro_cabecalho(self):
+        """
+        CENÁRIO: Remoção com manter_uma_ocorrencia=True
+        EXPECTATIVA: Cabeçalho aparece apenas na primeira página
+        """
+        # ARRANGE
+        conteudos = ["Qualificação das partes", "Dos fatos", "Do direito", "Dos pedidos"]
+        paginas = [montar_pagina_tribunal(i + 1, c) for i, c in enumerate(conteudos)]
+
+        # ACT
+        resultado = remover_boilerplate_repetido(
+            paginas, fracao_minima_paginas=0.6, manter_uma_ocorrencia=True
+        )
+
+        # ASSERT
+        assert resultado["texto_limpo"].count("TRIBUNAL DE JUSTIÇA") == 1
+        assert resultado["textos_por_pagina"][0].startswith("PODER JUDICIÁRIO")
+        assert resultado["textos_por_pagina"][3] == "Dos pedidos"
+
+    def test_marcadores_juridicos_curtos_repetidos_devem_ser_preservados(self):
+        """
+        CENÁRIO: "§ 1º", "Art. 7º" e "DOS PEDIDOS" em todas as páginas
+        EXPECTATIVA: Marcadores preservados; paginação "Pág. N de M" removida
+        """
+        # ARRANGE
+        conteudos = ["Dos fatos.", "Do direito.", "Da prova.", "Da tutela.", "Dos pedidos."]
+        paginas = [
+            f"Art. {i}º\n{conteudo}\n§ 1º\nI - DOS PEDIDOS\nPág. {i} de 5"
+            for i, conteudo in enumerate(conteudos, start=1)
+        ]
+
+        # ACT
+        resultado = remover_boilerplate_repetido(
+            paginas, fracao_minima_paginas=0.6, manter_uma_ocorrencia=False
+        )
+
+        # ASSERT
+        for i, (texto, conteudo) in enumerate(zip(resultado["textos_por_pagina"], conteudos), start=1):
+            assert texto.splitlines() == [f"Art. {i}º", conteudo, "§ 1º", "I - DOS PEDIDOS"]
+        assert resultado["numero_linhas_removidas"] == 5
+
+    def test_documento_com_poucas_paginas_nao_deve_ser_alterado(self):
+        """
+        CENÁRIO: Documento com 2 páginas (repetição não é evidência suficiente)
+        EXPECTATIVA: Nenhuma linha removida
+        """
+        # ARRANGE
+        paginas = [montar_pagina_tribunal(1, "Fatos"), montar_pagina_tribunal(2, "Pedidos")]
+
+        # ACT
+        resultado = remover_boilerplate_repetido(paginas, fracao_minima_paginas=0.6)
+
+        # ASSERT
+        assert resultado["numero_linhas_removidas"] == 0
+        assert resultado["tokens_economizados"] == 0
+        assert resultado["textos_por_pagina"] == paginas
+
+
+# ============================================================================
+# GRUPO DE TESTES: CHUNKING POR SEÇÕES JURÍDICAS
+# ============================================================================
+
+PETICAO_DE_EXEMPLO = """EXCELENTÍSSIMO SENHOR DOUTOR JUIZ DE DIREITO DA VARA DO TRABALHO
+JOÃO DA SILVA, brasileiro, vem propor a presente reclamação trabalhista.
+
+I - DOS FATOS
+O reclamante trabalhou por dez anos na empresa reclamada.
+Foi dispensado sem justa causa e não recebeu as verbas rescisórias.
+
+II - DO DIREITO
+Art. 477 da CLT dispõe sobre o prazo de pagamento das verbas.
+§ 6º O pagamento deve ser efetuado até dez dias do término do contrato.
+
+III - DOS PEDIDOS:
+a) pagamento das verbas rescisórias;
+b) multa do art. 477, § 8º, da CLT.
+"""
+
+
+class TestChunkingPorSecoes:
+    """
+    Testa o chunking que respeita a estrutura de peças jurídicas.
+
+    CONTEXTO:
+    Nenhum chunk pode misturar seções, e cada chunk deve saber de qual
+    seção e página veio (permite buscar "apenas os pedidos").
+    """
+
+    @pytest.mark.parametrize("linha, titulo_esperado", [
+        ("DOS FATOS", "DOS FATOS"),
+        ("III - DOS PEDIDOS:", "DOS PEDIDOS"),
+        ("2. DO VALOR DA CAUSA", "DO VALOR DA CAUSA"),
+        ("PRELIMINARMENTE", "PRELIMINARMENTE"),
+        ("Dos fatos narrados na inicial", None),
+        ("EXCELENTÍSSIMO SENHOR DOUTOR JUIZ", None),
+        ("DA SILVA, BRASILEIRO, CASADO,", None),
+    ])
+    def test_deteccao_de_titulos_de_secao(self, linha, titulo_esperado):
+        """
+        CENÁRIO: Linhas com e sem formato de título de seção
+        EXPECTATIVA: Apenas títulos em maiúsculas no formato jurídico são detectados
+        """
+        # ACT & ASSERT
+        assert detectar_titulo_secao(linha) == titulo_esperado
+
+    def test_chunks_nao_devem_atravessar_secoes(self):
+        """
+        CENÁRIO: Petição com preâmbulo e três seções, chunks pequenos
+        EXPECTATIVA: Cada chunk pertence a uma única seção e é fatia contígua do texto
+        """
+        # ACT
+        chunks = dividir_texto_em_chunks_por_secao(PETICAO_DE_EXEMPLO, tamanho_chunk=20, chunk_overlap=0)
+
+        # ASSERT
+        secoes = [chunk["secao"] for chunk in chunks]
+        assert secoes[0] == "PREÂMBULO"
+        assert {"DOS FATOS", "DO DIREITO", "DOS PEDIDOS"} <= set(secoes)
+        for chunk in chunks:
+            assert PETICAO_DE_EXEMPLO[chunk["inicio"]:chunk["fim"]] == chunk["texto"]
+            assert len(chunk["texto"].split()) <= 20
+        # Seções aparecem em blocos consecutivos (sem voltar a uma seção anterior)
+        assert secoes == sorted(secoes, key=secoes.index)
+
+    def test_corte_deve_preferir_dispositivos_legais(self):
+        """
+        CENÁRIO: Seção DO DIREITO maior que um chunk
+        EXPECTATIVA: O corte acontece antes do "§", não no meio do dispositivo
+        """
+        # ACT
+        chunks = dividir_texto_em_chunks_por_secao(PETICAO_DE_EXEMPLO, tamanho_chunk=20, chunk_overlap=0)
+
+        # ASSERT
+        chunks_direito = [chunk["texto"] for chunk in chunks if chunk["secao"] == "DO DIREITO"]
+        assert any(texto.startswith("§ 6º") for texto in chunks_direito)
+
+    def test_processar_texto_completo_deve_gerar_metadados_de_secao_e_pagina(self):
+        """
+        CENÁRIO: Documento de 2 páginas, pedidos na segunda página
+        EXPECTATIVA: metadados_chunks paralelos aos chunks, com seção, páginas e offsets corretos
+        """
+        # ARRANGE
+        pagina_1, pagina_2 = PETICAO_DE_EXEMPLO.split("III - DOS PEDIDOS:")
+        pagina_2 = "III - DOS PEDIDOS:" + pagina_2
+
+        with patch(
+            "src.servicos.servico_vetorizacao.gerar_embeddings",
+            side_effect=lambda chunks, usar_cache=True: [[0.0]] * len(chunks)
+        ), patch.object(servico_vetorizacao.configuracoes, "ESTRATEGIA_CHUNKING", "secoes_juridicas"):
+            # ACT
+            resultado = processar_texto_completo(
+                texto=PETICAO_DE_EXEMPLO,
+                usar_cache=False,
+                textos_por_pagina=[pagina_1, pagina_2]
+            )
+
+        # ASSERT
+        metadados = resultado["metadados_chunks"]
+        assert len(metadados) == len(resultado["chunks"])
+        assert metadados[-1]["secao"] == "DOS PEDIDOS"
+        assert metadados[-1]["numero_pagina"] == 2
+        assert metadados[0]["numero_pagina"] == 1
+        for chunk, metadados_chunk in zip(resultado["chunks"], metadados):
+            assert metadados_chunk["pagina_inicial"] <= metadados_chunk["pagina_final"]
+            assert resultado["texto_processado"][
+                metadados_chunk["offset_inicio"]:metadados_chunk["offset_fim"]
+            ] == chunk
+
+
+# ============================================================================
+# NOTAS DE EXECUÇÃO:
+# ============================================================================
+# Para executar apenas estes testes:
+#   pytest testes/test_servico_vetorizacao.py -v
+#
+# Para executar apenas testes deste serviço (usando marker):
+#   pytest -m servico_vetorizacao
+# ============================================================================
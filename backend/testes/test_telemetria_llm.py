@@ -0,0 +1,253 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - TELEMETRIA DO LLM
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida a telemetria de memória limitada do GerenciadorLLM: histograma de
+latência (p50/p95/p99), agregados por modelo e por agente (tokens,
+retries, erros por classe), histórico em buffer circular e acesso
+concorrente.
+
+ESTRATÉGIA:
+- Estatísticas montadas diretamente (sem chamadas à API)
+- Fluxo completo com o cliente OpenAI substituído por mock
+============================================================================
+"""
+
+import random
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+from openai.types.chat import ChatCompletion
+
+from src.utilitarios import gerenciador_llm as modulo_gerenciador_llm
+from src.utilitarios.gerenciador_llm import (
+    AGENTE_NAO_IDENTIFICADO,
+    TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM,
+    EstatisticaChamadaLLM,
+    EstatisticasGlobaisLLM,
+    GerenciadorLLM,
+)
+from src.utilitarios.telemetria_llm import AgregadoTelemetriaLLM, HistogramaLatencia
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.gerenciador_llm  # Telemetria do gerenciador de LLM
+]
+
+
+def criar_estatistica(
+    modelo: str = "gpt-4o-mini",
+    agente: str = "Perito Médico",
+    tempo: float = 1.0,
+    sucesso: bool = True,
+    erros=None
+) -> EstatisticaChamadaLLM:
+    """
+    Estatística de uma chamada com 100 tokens de prompt e 20 de resposta.
+    """
+    return EstatisticaChamadaLLM(
+        timestamp="2025-01-01T00:00:00",
+        modelo_utilizado=modelo,
+        tokens_de_prompt=100 if sucesso else 0,
+        tokens_de_resposta=20 if sucesso else 0,
+        tokens_totais=120 if sucesso else 0,
+        custo_estimado_usd=0.001 if sucesso else 0.0,
+        tempo_de_resposta_segundos=tempo,
+        sucesso=sucesso,
+        agente=agente,
+        tokens_de_raciocinio=8 if sucesso else 0,
+        erros_das_tentativas=list(erros or []),
+    )
+
+
+# ============================================================================
+# GRUPO DE TESTES: HISTOGRAMA
+# ============================================================================
+
+class TestHistogramaLatencia:
+    """
+    Testa os percentis aproximados do histograma de buckets fixos.
+    """
+
+    def test_percentis_devem_aproximar_os_exatos(self):
+        # ARRANGE
+        gerador = random.Random(42)
+        amostras = [gerador.lognormvariate(1.0, 0.8) for _ in range(5000)]
+        histograma = HistogramaLatencia()
+
+        # ACT
+        for amostra in amostras:
+            histograma.registrar(amostra)
+
+        # ASSERT: erro relativo menor que a razão entre buckets (25%)
+        ordenadas = sorted(amostras)
+        for fracao in (0.50, 0.95, 0.99):
+            exato = ordenadas[int(fracao * len(ordenadas)) - 1]
+            assert histograma.percentil(fracao) == pytest.approx(exato, rel=0.25)
+
+    def test_histograma_vazio_deve_retornar_zero(self):
+        # ACT / ASSERT
+        assert HistogramaLatencia().percentil(0.95) == 0.0
+        assert HistogramaLatencia().para_dict()["amostras"] == 0
+
+    def test_amostra_acima_do_ultimo_bucket_deve_usar_o_maximo(self):
+        # ARRANGE
+        histograma = HistogramaLatencia(limites_segundos=[1.0, 2.0])
+
+        # ACT
+        histograma.registrar(50.0)
+
+        # ASSERT
+        assert histograma.percentil(0.99) == 50.0
+
+
+# ============================================================================
+# GRUPO DE TESTES: AGREGADO
+# ============================================================================
+
+class TestAgregadoTelemetriaLLM:
+    """
+    Testa a contagem de retries e erros por classe.
+    """
+
+    def test_sucesso_depois_de_falhas_deve_contar_retries(self):
+        # ARRANGE
+        agregado = AgregadoTelemetriaLLM()
+
+        # ACT
+        agregado.registrar(True, 2.0, 100, 20, 8, 0.001, ["RateLimitError", "APITimeoutError"])
+
+        # ASSERT
+        resumo = agregado.para_dict()
+        assert resumo["retries"] == 2
+        assert resumo["chamadas_com_retry"] == 1
+        assert resumo["erros_por_classe"] == {"RateLimitError": 1, "APITimeoutError": 1}
+        assert resumo["tokens_de_raciocinio"] == 8
+
+    def test_falha_nao_deve_contar_a_ultima_tentativa_como_retry(self):
+        # ARRANGE
+        agregado = AgregadoTelemetriaLLM()
+
+        # ACT
+        agregado.registrar(False, 0.1, 0, 0, 0, 0.0, ["BadRequestError"])
+
+        # ASSERT
+        assert agregado.retries == 0
+        assert agregado.chamadas_com_erro == 1
+        assert agregado.erros_por_classe == {"BadRequestError": 1}
+
+
+# ============================================================================
+# GRUPO DE TESTES: ESTATÍSTICAS GLOBAIS
+# ============================================================================
+
+class TestEstatisticasGlobaisLLM:
+    """
+    Testa histórico limitado, agregação por modelo/agente e concorrência.
+    """
+
+    def test_historico_deve_ser_limitado(self):
+        # ARRANGE
+        estatisticas = EstatisticasGlobaisLLM()
+
+        # ACT
+        for _ in range(TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM + 50):
+            estatisticas.adicionar_chamada(criar_estatistica())
+
+        # ASSERT
+        assert len(estatisticas.historico_de_chamadas) == TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM
+        assert estatisticas.total_de_chamadas == TAMANHO_MAXIMO_HISTORICO_CHAMADAS_LLM + 50
+
+    def test_metricas_devem_separar_modelos_e_agentes(self):
+        # ARRANGE
+        estatisticas = EstatisticasGlobaisLLM()
+        estatisticas.adicionar_chamada(criar_estatistica(modelo="gpt-4o", agente="Perito Médico"))
+        estatisticas.adicionar_chamada(criar_estatistica(modelo="gpt-4o-mini", agente="Perito Médico"))
+        estatisticas.adicionar_chamada(criar_estatistica(modelo="gpt-4o-mini", agente=None, sucesso=False, erros=["APIError"]))
+
+        # ACT
+        metricas = estatisticas.obter_metricas(numero_chamadas_recentes=2)
+
+        # ASSERT
+        assert metricas["por_modelo"]["gpt-4o-mini"]["chamadas"] == 2
+        assert metricas["por_modelo"]["gpt-4o"]["chamadas"] == 1
+        assert metricas["por_agente"]["Perito Médico"]["tokens_de_prompt"] == 200
+        assert metricas["por_agente"][AGENTE_NAO_IDENTIFICADO]["erros_por_classe"] == {"APIError": 1}
+        assert metricas["geral"]["chamadas"] == 3
+        assert len(metricas["chamadas_recentes"]) == 2
+        assert metricas["resumo"]["latencia_segundos"]["amostras"] == 3
+
+    def test_registro_concorrente_nao_deve_perder_chamadas(self):
+        # ARRANGE
+        estatisticas = EstatisticasGlobaisLLM()
+
+        def registrar_varias():
+            for _ in range(500):
+                estatisticas.adicionar_chamada(criar_estatistica())
+
+        # ACT
+        threads = [threading.Thread(target=registrar_varias) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # ASSERT
+        assert estatisticas.total_de_chamadas == 4000
+        assert estatisticas.agregado_geral.latencia.total_de_amostras == 4000
+        assert estatisticas.agregados_por_agente["Perito Médico"].tokens_de_resposta == 80000
+
+
+# ============================================================================
+# GRUPO DE TESTES: INTEGRAÇÃO COM O GERENCIADOR
+# ============================================================================
+
+class TestTelemetriaNoGerenciador:
+    """
+    Testa o que chamar_llm() registra na telemetria.
+    """
+
+    def test_chamada_com_retry_deve_registrar_agente_retries_e_raciocinio(self):
+        # ARRANGE
+        gerenciador = GerenciadorLLM(chave_api="sk-teste")
+        gerenciador.resetar_estatisticas()
+        resposta = ChatCompletion.model_validate({
+            "id": "chatcmpl-teste",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Parecer"}}],
+            "usage": {
+                "prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120,
+                "completion_tokens_details": {"reasoning_tokens": 12},
+            },
+        })
+        erro_429 = RateLimitError(
+            "erro 429",
+            response=httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")),
+            body=None
+        )
+        gerenciador.cliente_openai = MagicMock()
+        gerenciador.cliente_openai.chat.completions.create.side_effect = [erro_429, resposta]
+
+        # ACT
+        with patch.object(modulo_gerenciador_llm.time, "sleep"):
+            gerenciador.chamar_llm(prompt="Analise", agente="Perito Médico")
+
+        # ASSERT
+        metricas = modulo_gerenciador_llm.obter_metricas_llm()
+        agente = metricas["por_agente"]["Perito Médico"]
+        assert agente["retries"] == 1
+        assert agente["erros_por_classe"] == {"RateLimitError": 1}
+        assert agente["tokens_de_raciocinio"] == 12
+        assert metricas["chamadas_recentes"][-1]["agente"] == "Perito Médico"
+        assert "cache_de_respostas" in metricas
@@ -0,0 +1,225 @@
+"""
+============================================================================
+TESTES UNITÁRIOS - TRIAGEM DE RELEVÂNCIA DOS AGENTES
+Plataforma Jurídica Multi-Agent
+============================================================================
+CONTEXTO:
+Valida a triagem feita antes das chamadas ao LLM: pontuação do caso contra
+as palavras-chave de cada especialista, decisão relativa ao agente mais
+aderente (executar, rebaixar ou pular) e a integração com a delegação do
+AgenteAdvogadoCoordenador.
+
+ESTRATÉGIA:
+- Agentes falsos (só o perfil de palavras-chave) para a triagem isolada
+- Advogados reais com GerenciadorLLM substituído por mock na delegação
+============================================================================
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.agentes.agente_advogado_coordenador import AgenteAdvogadoCoordenador
+from src.agentes.agente_advogado_trabalhista import AgenteAdvogadoTrabalhista
+from src.agentes.agente_advogado_tributario import AgenteAdvogadoTributario
+from src.configuracao.configuracoes import Configuracoes, obter_configuracoes
+from src.utilitarios import triagem_relevancia
+from src.utilitarios.gerenciador_llm import GerenciadorLLM
+from src.utilitarios.triagem_relevancia import (
+    DECISAO_EXECUTAR,
+    DECISAO_PULAR,
+    DECISAO_REBAIXAR,
+    agentes_ignorados,
+    aplicar_triagem,
+    encontrar_palavras_chave,
+    triar_agentes,
+)
+
+
+# ============================================================================
+# MARKERS PYTEST
+# ============================================================================
+pytestmark = [
+    pytest.mark.unit,  # Marca como teste unitário
+    pytest.mark.orquestrador  # Triagem de relevância dos orquestradores
+]
+
+
+CASO_TRABALHISTA = (
+    "Reclamação trabalhista: dispensa sem justa causa, verbas rescisórias, "
+    "aviso prévio, FGTS e horas extras não pagas. Incide imposto de renda."
+)
+
+
+def agente_com_perfil(*palavras_chave: str) -> SimpleNamespace:
+    return SimpleNamespace(palavras_chave_especializacao=list(palavras_chave))
+
+
+def triar(agentes, texto=CASO_TRABALHISTA, permitir_rebaixamento=True):
+    return triar_agentes(
+        agentes, texto, ativada=True, proporcao_para_pular=0.25,
+        proporcao_para_rebaixar=0.6, modelo_rebaixado="modelo-rapido",
+        permitir_rebaixamento=permitir_rebaixamento,
+    )
+
+
+@pytest.fixture
+def triagem_ativada(monkeypatch):
+    """Liga a triagem (desativada por padrão) sem mexer na cascata de modelos."""
+    configuracoes = obter_configuracoes().model_copy(update={"TRIAGEM_RELEVANCIA_ATIVADA": True})
+    monkeypatch.setattr(triagem_relevancia, "obter_configuracoes", lambda: configuracoes)
+    return configuracoes
+
+
+# ============================================================================
+# GRUPO DE TESTES: TRIAGEM
+# ============================================================================
+
+class TestTriarAgentes:
+    """
+    Testa as decisões da triagem.
+    """
+
+    def test_agente_pouco_aderente_deve_ser_pulado(self):
+        # ARRANGE
+        agentes = {
+            "trabalhista": agente_com_perfil("justa causa", "verbas rescisórias", "FGTS", "horas extras"),
+            "tributario": agente_com_perfil("ICMS", "execução fiscal", "imposto de renda", "alíquota", "IPTU"),
+        }
+
+        # ACT
+        triagem = triar(agentes)
+
+        # ASSERT: 1/5 contra 4/4 → 20% do mais aderente
+        assert triagem["trabalhista"].decisao == DECISAO_EXECUTAR
+        assert triagem["tributario"].decisao == DECISAO_PULAR
+        assert triagem["tributario"].palavras_chave_encontradas == ["imposto de renda"]
+        assert "20%" in triagem["tributario"].razao
+
+    def test_aderencia_parcial_deve_rebaixar_para_o_modelo_rapido(self):
+        # ARRANGE: 2/4 contra 4/4 → 50% do mais aderente
+        agentes = {
+            "trabalhista": agente_com_perfil("justa causa", "verbas rescisórias", "FGTS", "horas extras"),
+            "civel": agente_com_perfil("aviso prévio", "imposto de renda", "contrato", "dano moral"),
+        }
+
+        # ACT
+        triagem = triar(agentes)
+
+        # ASSERT
+        assert triagem["civel"].decisao == DECISAO_REBAIXAR
+        assert triagem["civel"].modelo == "modelo-rapido"
+        assert triagem["trabalhista"].modelo is None
+
+    def test_sem_cascata_aderencia_parcial_deve_executar_com_o_modelo_principal(self):
+        # ARRANGE: mesma aderência parcial do teste anterior
+        agentes = {
+            "trabalhista": agente_com_perfil("justa causa", "verbas rescisórias", "FGTS", "horas extras"),
+            "civel": agente_com_perfil("aviso prévio", "imposto de renda", "contrato", "dano moral"),
+        }
+
+        # ACT
+        triagem = triar(agentes, permitir_rebaixamento=False)
+
+        # ASSERT
+        assert triagem["civel"].decisao == DECISAO_EXECUTAR
+        assert triagem["civel"].modelo is None
+        assert "cascata de modelos desativada" in triagem["civel"].razao
+
+    def test_rebaixamento_deve_seguir_llm_cascata_ativada(self, triagem_ativada):
+        # ARRANGE
+        agentes = {
+            "trabalhista": agente_com_perfil("justa causa", "verbas rescisórias", "FGTS", "horas extras"),
+            "civel": agente_com_perfil("aviso prévio", "imposto de renda", "contrato", "dano moral"),
+        }
+        argumentos = {"proporcao_para_pular": 0.25, "proporcao_para_rebaixar": 0.6}
+
+        # ACT
+        triagem_sem_cascata = triar_agentes(agentes, CASO_TRABALHISTA, **argumentos)
+        triagem_ativada.LLM_CASCATA_ATIVADA = True
+        triagem_com_cascata = triar_agentes(agentes, CASO_TRABALHISTA, **argumentos)
+
+        # ASSERT
+        assert triagem_sem_cascata["civel"].decisao == DECISAO_EXECUTAR
+        assert triagem_com_cascata["civel"].decisao == DECISAO_REBAIXAR
+        assert triagem_com_cascata["civel"].modelo == triagem_ativada.LLM_CASCATA_MODELO_RAPIDO
+
+    def test_agente_sem_perfil_e_caso_sem_palavras_chave_devem_executar(self):
+        # ARRANGE
+        agentes = {"sem_perfil": agente_com_perfil(), "tributario": agente_com_perfil("ICMS")}
+
+        # ACT
+        triagem = triar(agentes, texto="Pergunta genérica sobre o processo")
+
+        # ASSERT: nada a comparar, ninguém é pulado
+        assert {resultado.decisao for resultado in triagem.values()} == {DECISAO_EXECUTAR}
+
+    def test_triagem_desativada_deve_executar_todos(self):
+        # ARRANGE
+        agentes = {"trabalhista": agente_com_perfil("FGTS"), "tributario": agente_com_perfil("ICMS")}
+
+        # ACT
+        triagem = triar_agentes(agentes, CASO_TRABALHISTA, ativada=False)
+
+        # ASSERT
+        assert all(resultado.decisao == DECISAO_EXECUTAR for resultado in triagem.values())
+        assert triagem["tributario"].para_dict()["razao"] == "Triagem de relevância desativada"
+
+    def test_triagem_deve_vir_desativada_por_padrao(self):
+        # ASSERT
+        assert Configuracoes.model_fields["TRIAGEM_RELEVANCIA_ATIVADA"].default is False
+
+    def test_aplicar_triagem_deve_registrar_decisoes_e_listar_ignorados(self, triagem_ativada):
+        # ARRANGE
+        agentes = {"trabalhista": agente_com_perfil("FGTS", "horas extras"), "tributario": agente_com_perfil("ICMS")}
+        triagem_de_relevancia = {}
+
+        # ACT
+        aplicar_triagem(agentes, CASO_TRABALHISTA, "advogado", triagem_de_relevancia)
+
+        # ASSERT
+        assert set(triagem_de_relevancia) == {"advogado_trabalhista", "advogado_tributario"}
+        assert agentes_ignorados(triagem_de_relevancia, "advogado") == ["tributario"]
+        assert agentes_ignorados(triagem_de_relevancia, "perito") == []
+
+    def test_palavras_chave_devem_casar_apenas_palavras_inteiras(self):
+        # ACT
+        encontradas = encontrar_palavras_chave("O piso salarial da emissão; recolhimento do PIS.", ["PIS", "ISS"])
+
+        # ASSERT
+        assert encontradas == ["PIS"]
+
+
+# ============================================================================
+# GRUPO DE TESTES: DELEGAÇÃO DO COORDENADOR
+# ============================================================================
+
+class TestTriagemNaDelegacao:
+    """
+    Testa a triagem em AgenteAdvogadoCoordenador.delegar_para_advogados_especialistas().
+    """
+
+    @pytest.mark.asyncio
+    async def test_advogado_ignorado_nao_deve_chamar_o_llm(self, triagem_ativada):
+        # ARRANGE
+        gerenciador = Mock(spec=GerenciadorLLM)
+        gerenciador.chamar_llm_async = AsyncMock(return_value="Parecer trabalhista")
+        coordenador = AgenteAdvogadoCoordenador(gerenciador_llm=gerenciador, banco_vetorial=(Mock(), Mock()))
+        coordenador.registrar_advogado_especialista("trabalhista", AgenteAdvogadoTrabalhista)
+        coordenador.registrar_advogado_especialista("tributario", AgenteAdvogadoTributario)
+        triagem_de_relevancia = {}
+
+        # ACT
+        pareceres = await coordenador.delegar_para_advogados_especialistas(
+            pergunta="Quais verbas rescisórias são devidas na dispensa sem justa causa?",
+            contexto_de_documentos=[CASO_TRABALHISTA],
+            advogados_selecionados=["trabalhista", "tributario"],
+            triagem_de_relevancia=triagem_de_relevancia,
+        )
+
+        # ASSERT
+        assert list(pareceres) == ["trabalhista"]
+        assert gerenciador.chamar_llm_async.await_count == 1
+        assert triagem_de_relevancia["advogado_tributario"]["decisao"] == DECISAO_PULAR
+        assert triagem_de_relevancia["advogado_trabalhista"]["decisao"] == DECISAO_EXECUTAR